@@ -0,0 +1,62 @@
+"""Materialized resource load index.
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-16
+
+Adds:
+- resource_load_segments table holding constant-load runs of each
+  resource per program, backfilled from existing assignments
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "015"
+down_revision: str | None = "014"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create and backfill the resource load index."""
+    op.create_table(
+        "resource_load_segments",
+        sa.Column("id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("resource_id", UUID(as_uuid=True), sa.ForeignKey("resources.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("program_id", UUID(as_uuid=True), sa.ForeignKey("programs.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("start_date", sa.Date, nullable=False),
+        sa.Column("finish_date", sa.Date, nullable=False),
+        sa.Column("units", sa.Numeric(precision=9, scale=2), nullable=False),
+        sa.Column("assignment_count", sa.Integer, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True),
+        comment="Materialized daily load of resources across programs",
+    )
+
+    op.create_index(
+        "ix_resource_load_segments_resource_dates",
+        "resource_load_segments",
+        ["resource_id", "start_date", "finish_date"],
+    )
+    op.create_index("ix_resource_load_segments_deleted_at", "resource_load_segments", ["deleted_at"])
+
+    # Backfill from current assignments; later changes are kept in step on flush
+    from src.models.resource_load import refresh_resource_loads  # noqa: PLC0415
+
+    bind = op.get_bind()
+    resource_ids = bind.execute(
+        sa.text("SELECT DISTINCT resource_id FROM resource_assignments WHERE deleted_at IS NULL")
+    ).scalars()
+    refresh_resource_loads(bind, list(resource_ids))
+
+
+def downgrade() -> None:
+    """Drop the resource load index."""
+    op.drop_table("resource_load_segments")
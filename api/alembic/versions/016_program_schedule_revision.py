@@ -0,0 +1,41 @@
+"""Program schedule revision.
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-17
+
+Adds:
+- programs.schedule_revision, bumped by activity and dependency writes
+  and used to key cached CPM results
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "016"
+down_revision: str | None = "015"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the schedule revision column."""
+    op.add_column(
+        "programs",
+        sa.Column(
+            "schedule_revision",
+            sa.Integer,
+            nullable=False,
+            server_default="0",
+            comment="Revision of the schedule network, bumped by activity and dependency writes",
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Drop the schedule revision column."""
+    op.drop_column("programs", "schedule_revision")
@@ -1,21 +1,64 @@
 #!/usr/bin/env python
-"""Run performance benchmarks and save results."""
-
+"""Run performance benchmarks and save results.
+
+Database-backed benchmarks (tests/performance/test_resource_benchmarks.py)
+record wall time, query count and peak memory per service and program
+size; they are saved with the current commit to
+benchmark_results/benchmark_<timestamp>.json so runs can be compared
+across commits.
+
+--database-url must name an empty database created for the benchmarks
+(e.g. ``createdb benchmarks``), never a development or production one.
+Every benchmark creates the application schema in it and drops the
+schema again afterwards; a database that already contains tables is
+refused.
+
+Usage:
+    python scripts/run_benchmarks.py
+    python scripts/run_benchmarks.py --sizes small,medium,large
+    python scripts/run_benchmarks.py --database-url postgresql+asyncpg://...
+"""
+
+import argparse
 import json
+import os
 import subprocess
 import sys
 from datetime import datetime
 from pathlib import Path
 
 
-def run_benchmarks() -> bool:
-    """Run pytest benchmarks and save results."""
+def _git_commit() -> str | None:
+    """Current commit hash, None outside a git checkout."""
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD"],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def run_benchmarks(sizes: str | None = None, database_url: str | None = None) -> bool:
+    """Run pytest benchmarks and save results.
+
+    Args:
+        sizes: Synthetic program sizes, comma separated (default small,medium)
+        database_url: Empty, benchmark-only database (default temporary
+            SQLite); its schema is created and dropped by every benchmark
+    """
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     results_dir = Path("benchmark_results")
     results_dir.mkdir(exist_ok=True)
 
     output_file = results_dir / f"benchmark_{timestamp}.json"
 
+    env = dict(os.environ, BENCHMARK_RESULTS_FILE=str(output_file.resolve()))
+    if sizes:
+        env["BENCHMARK_SIZES"] = sizes
+    if database_url:
+        env["BENCHMARK_DATABASE_URL"] = database_url
+
     print("=" * 60)
     print("RUNNING PERFORMANCE BENCHMARKS")
     print("=" * 60)
@@ -34,6 +77,7 @@ def run_benchmarks() -> bool:
         ],
         capture_output=False,
         text=True,
+        env=env,
     )
 
     print()
@@ -41,6 +85,30 @@ def run_benchmarks() -> bool:
     print("BENCHMARK COMPLETE")
     print("=" * 60)
 
+    if output_file.exists():
+        records = json.loads(output_file.read_text())
+        output_file.write_text(
+            json.dumps(
+                {
+                    "timestamp": timestamp,
+                    "commit": _git_commit(),
+                    "database": "custom" if database_url else "sqlite",
+                    "results": records,
+                },
+                indent=2,
+            )
+        )
+
+        print()
+        print(f"{'Benchmark':<28}{'Size':<8}{'Time (ms)':>12}{'Queries':>9}{'Peak KB':>11}")
+        for record in records:
+            print(
+                f"{record['benchmark']:<28}{record['size']:<8}{record['wall_ms']:>12.2f}"
+                f"{record['queries']:>9}{record['peak_memory_kb']:>11.0f}"
+            )
+        print()
+        print(f"Results saved to {output_file}")
+
     return result.returncode == 0
 
 
@@ -97,6 +165,15 @@ def run_benchmarks_with_pytest_benchmark() -> bool:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", help="Synthetic program sizes, e.g. small,medium,large")
+    parser.add_argument(
+        "--database-url",
+        help="Async URL of an empty, benchmark-only database (default temporary SQLite); "
+        "its tables are created and dropped by every benchmark",
+    )
+    args = parser.parse_args()
+
     # Try simple benchmark first
-    success = run_benchmarks()
+    success = run_benchmarks(sizes=args.sizes, database_url=args.database_url)
     sys.exit(0 if success else 1)
@@ -35,7 +35,7 @@ from src.schemas.evms_period import (
 )
 from src.services.dashboard_cache import dashboard_cache
 from src.services.ev_methods import get_ev_method_info, validate_milestone_weights
-from src.services.evms import EVMSCalculator
+from src.services.evms import EVMSCalculator, build_evms_summary
 
 router = APIRouter(tags=["EVMS Periods"])
 
@@ -347,8 +347,8 @@ async def add_period_data(
     await db.commit()
     await db.refresh(period_data)
 
-    # Invalidate EVMS cache for this program
-    await cache_manager.invalidate_evms(str(period.program_id))
+    # Invalidate EVMS and dashboard caches for this program
+    await dashboard_cache.invalidate_on_period_update(period.program_id)
 
     return EVMSPeriodDataResponse.model_validate(period_data)
 
@@ -443,8 +443,8 @@ async def update_period_data(
     await db.commit()
     await db.refresh(updated)
 
-    # Invalidate EVMS cache for this program
-    await cache_manager.invalidate_evms(str(period.program_id))
+    # Invalidate EVMS and dashboard caches for this program
+    await dashboard_cache.invalidate_on_period_update(period.program_id)
 
     return EVMSPeriodDataResponse.model_validate(updated)
 
@@ -492,40 +492,7 @@ async def get_evms_summary(
         period = await period_repo.get_latest_period(program_id)
 
     # Calculate summary metrics
-    bac = program.budget_at_completion
-    bcws = period.cumulative_bcws if period else Decimal("0.00")
-    bcwp = period.cumulative_bcwp if period else Decimal("0.00")
-    acwp = period.cumulative_acwp if period else Decimal("0.00")
-
-    cv = EVMSCalculator.calculate_cost_variance(bcwp, acwp)
-    sv = EVMSCalculator.calculate_schedule_variance(bcwp, bcws)
-    cpi = EVMSCalculator.calculate_cpi(bcwp, acwp)
-    spi = EVMSCalculator.calculate_spi(bcwp, bcws)
-
-    eac = EVMSCalculator.calculate_eac(bac, acwp, bcwp, "cpi") if cpi else None
-    etc = EVMSCalculator.calculate_etc(eac, acwp) if eac else None
-    vac = EVMSCalculator.calculate_vac(bac, eac) if eac else None
-    tcpi = EVMSCalculator.calculate_tcpi(bac, bcwp, acwp, "bac")
-
-    percent_complete = (bcwp / bac * 100).quantize(Decimal("0.01")) if bac > 0 else Decimal("0.00")
-
-    response = EVMSSummaryResponse(
-        program_id=program_id,
-        as_of_date=as_of_date or (period.period_end if period else date.today()),
-        bac=bac,
-        bcws=bcws,
-        bcwp=bcwp,
-        acwp=acwp,
-        cv=cv,
-        sv=sv,
-        cpi=cpi,
-        spi=spi,
-        eac=eac,
-        etc=etc,
-        vac=vac,
-        tcpi=tcpi,
-        percent_complete=percent_complete,
-    )
+    response = build_evms_summary(program_id, program.budget_at_completion, period, as_of_date)
 
     # Cache current summary (not historical as_of_date queries)
     if not as_of_date:
@@ -752,6 +719,7 @@ async def get_enhanced_scurve(
     from src.services.scurve_enhanced import (
         EnhancedSCurveService,
         build_simulation_metrics_from_result,
+        enhanced_scurve_to_dict,
     )
 
     # Verify program exists and user has access
@@ -801,63 +769,7 @@ async def get_enhanced_scurve(
         start_date=program.start_date,
     )
 
-    result = service.generate()
-
-    # Build response
-    response: dict[str, Any] = {
-        "program_id": str(result.program_id),
-        "bac": str(result.bac),
-        "current_period": result.current_period,
-        "percent_complete": str(result.percent_complete),
-        "simulation_available": result.simulation_available,
-        "data_points": [
-            {
-                "period_number": dp.period_number,
-                "period_date": dp.period_date.isoformat(),
-                "period_name": dp.period_name,
-                "bcws": str(dp.bcws),
-                "bcwp": str(dp.bcwp),
-                "acwp": str(dp.acwp),
-                "cumulative_bcws": str(dp.cumulative_bcws),
-                "cumulative_bcwp": str(dp.cumulative_bcwp),
-                "cumulative_acwp": str(dp.cumulative_acwp),
-                "is_forecast": dp.is_forecast,
-            }
-            for dp in result.data_points
-        ],
-    }
-
-    # Add EAC range if available
-    if result.eac_range:
-        response["eac_range"] = {
-            "p10": str(result.eac_range.p10),
-            "p50": str(result.eac_range.p50),
-            "p90": str(result.eac_range.p90),
-            "method": result.eac_range.method,
-        }
-
-    # Add completion range if available
-    if result.completion_range:
-        response["completion_range"] = {
-            "p10_days": result.completion_range.p10_days,
-            "p50_days": result.completion_range.p50_days,
-            "p90_days": result.completion_range.p90_days,
-            "p10_date": (
-                result.completion_range.p10_date.isoformat()
-                if result.completion_range.p10_date
-                else None
-            ),
-            "p50_date": (
-                result.completion_range.p50_date.isoformat()
-                if result.completion_range.p50_date
-                else None
-            ),
-            "p90_date": (
-                result.completion_range.p90_date.isoformat()
-                if result.completion_range.p90_date
-                else None
-            ),
-        }
+    response = enhanced_scurve_to_dict(service.generate())
 
     # Cache the result
     await dashboard_cache.set_scurve(program_id, response, enhanced=True)
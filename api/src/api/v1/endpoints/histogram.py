@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 from datetime import date
+from typing import Annotated
 from uuid import UUID
 
+import numpy as np
 from fastapi import APIRouter, HTTPException, Query
 
 from src.core.deps import CurrentUser, DbSession
@@ -12,11 +14,17 @@ from src.repositories.program import ProgramRepository
 from src.repositories.resource import ResourceRepository
 from src.schemas.histogram import (
     HistogramDataPointResponse,
+    ProgramHistogramMatrixResponse,
     ProgramHistogramResponse,
     ProgramHistogramSummaryResponse,
     ResourceHistogramResponse,
 )
-from src.services.resource_histogram import ResourceHistogram, ResourceHistogramService
+from src.services.resource_histogram import (
+    ProgramHistogramMatrix,
+    ProgramHistogramSummary,
+    ResourceHistogram,
+    ResourceHistogramService,
+)
 
 router = APIRouter(tags=["Histograms"])
 
@@ -53,6 +61,46 @@ def _convert_histogram_to_response(
     )
 
 
+def _convert_summary_to_response(
+    summary: ProgramHistogramSummary,
+) -> ProgramHistogramSummaryResponse:
+    """Convert ProgramHistogramSummary dataclass to response schema."""
+    return ProgramHistogramSummaryResponse(
+        program_id=summary.program_id,
+        start_date=summary.start_date,
+        end_date=summary.end_date,
+        resource_count=summary.resource_count,
+        total_overallocated_days=summary.total_overallocated_days,
+        resources_with_overallocation=summary.resources_with_overallocation,
+    )
+
+
+def _convert_matrix_to_response(
+    data: ProgramHistogramMatrix,
+    granularity: str,
+) -> ProgramHistogramMatrixResponse:
+    """Convert ProgramHistogramMatrix to the columnar response schema."""
+    matrix = data.matrix
+    statistics = data.statistics
+    dates = matrix.dates
+
+    return ProgramHistogramMatrixResponse(
+        summary=_convert_summary_to_response(data.summary),
+        granularity=granularity,
+        dates=dates,
+        resource_ids=[r.id for r in data.resources],
+        resource_codes=[r.code for r in data.resources],
+        available_hours=np.round(matrix.available, 2).tolist(),
+        assigned_hours=np.round(matrix.assigned, 2).tolist(),
+        utilization_percent=np.round(matrix.utilization, 2).tolist(),
+        overallocated=matrix.overallocated.tolist(),
+        peak_utilization=np.round(statistics.peak_utilization, 2).tolist(),
+        peak_dates=[dates[i] if i >= 0 else None for i in statistics.peak_index.tolist()],
+        average_utilization=np.round(statistics.average_utilization, 2).tolist(),
+        overallocated_periods=statistics.overallocated_periods.tolist(),
+    )
+
+
 @router.get(
     "/resources/{resource_id}/histogram",
     response_model=ResourceHistogramResponse,
@@ -66,20 +114,20 @@ async def get_resource_histogram(
     end_date: date = Query(..., description="End date for histogram"),
     granularity: str = Query(
         default="daily",
-        description="Granularity: 'daily' or 'weekly'",
-        pattern="^(daily|weekly)$",
+        description="Granularity: 'daily', 'weekly' or 'monthly'",
+        pattern="^(daily|weekly|monthly)$",
     ),
 ) -> ResourceHistogramResponse:
     """Get histogram data for a single resource.
 
     Returns utilization data points for the specified date range.
-    Supports daily or weekly granularity.
+    Supports daily, weekly or monthly granularity.
 
     Args:
         resource_id: UUID of the resource
         start_date: Start of histogram period
         end_date: End of histogram period
-        granularity: "daily" or "weekly"
+        granularity: "daily", "weekly" or "monthly"
         db: Database session
         current_user: Authenticated user
 
@@ -112,7 +160,7 @@ async def get_resource_histogram(
 
 @router.get(
     "/programs/{program_id}/histogram",
-    response_model=ProgramHistogramResponse,
+    response_model=ProgramHistogramResponse | ProgramHistogramMatrixResponse,
     summary="Get program histogram",
 )
 async def get_program_histogram(
@@ -124,22 +172,42 @@ async def get_program_histogram(
     resource_ids: list[UUID] | None = Query(
         default=None, description="Filter to specific resources"
     ),
-) -> ProgramHistogramResponse:
+    granularity: Annotated[
+        str,
+        Query(
+            description="Granularity: 'daily', 'weekly' or 'monthly'",
+            pattern="^(daily|weekly|monthly)$",
+        ),
+    ] = "daily",
+    layout: Annotated[
+        str,
+        Query(
+            description="'rows' for a data point object per period, "
+            "'columnar' for one array per field",
+            pattern="^(rows|columnar)$",
+        ),
+    ] = "rows",
+) -> ProgramHistogramResponse | ProgramHistogramMatrixResponse:
     """Get histogram data for all resources in a program.
 
     Returns utilization data for all active resources in the program.
-    Optionally filter to specific resources.
+    Optionally filter to specific resources. The columnar layout returns
+    the same data as parallel arrays, which is far smaller for long
+    periods and many resources.
 
     Args:
         program_id: UUID of the program
         start_date: Start of period (defaults to program start)
         end_date: End of period (defaults to program end)
         resource_ids: Optional filter for specific resources
+        granularity: "daily", "weekly" or "monthly"
+        layout: "rows" or "columnar"
         db: Database session
         current_user: Authenticated user
 
     Returns:
-        ProgramHistogramResponse with summary and resource histograms
+        ProgramHistogramResponse with summary and resource histograms, or
+        ProgramHistogramMatrixResponse for the columnar layout
 
     Raises:
         HTTPException: 404 if program not found
@@ -155,25 +223,23 @@ async def get_program_histogram(
     if not program:
         raise HTTPException(status_code=404, detail="Program not found")
 
-    # Generate histograms
     service = ResourceHistogramService(db)
+
+    if layout == "columnar":
+        data = await service.get_program_histogram_matrix(
+            program_id, start_date, end_date, resource_ids, granularity
+        )
+        return _convert_matrix_to_response(data, granularity)
+
+    # Generate histograms
     summary, histograms = await service.get_program_histogram(
-        program_id, start_date, end_date, resource_ids
+        program_id, start_date, end_date, resource_ids, granularity
     )
 
     # Convert to response schemas
     histogram_responses = [_convert_histogram_to_response(h) for h in histograms]
 
-    summary_response = ProgramHistogramSummaryResponse(
-        program_id=summary.program_id,
-        start_date=summary.start_date,
-        end_date=summary.end_date,
-        resource_count=summary.resource_count,
-        total_overallocated_days=summary.total_overallocated_days,
-        resources_with_overallocation=summary.resources_with_overallocation,
-    )
-
     return ProgramHistogramResponse(
-        summary=summary_response,
+        summary=_convert_summary_to_response(summary),
         histograms=histogram_responses,
     )
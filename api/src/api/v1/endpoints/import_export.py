@@ -17,6 +17,7 @@ from src.repositories.activity import ActivityRepository
 from src.repositories.program import ProgramRepository
 from src.repositories.resource import ResourceRepository
 from src.repositories.wbs import WBSElementRepository
+from src.services.dashboard_cache import dashboard_cache
 from src.services.msproject_import import (
     MSProjectImporter,
     import_msproject_to_program,
@@ -156,6 +157,9 @@ async def import_msproject(
             db,
         )
 
+        # Every dashboard artifact depends on the imported schedule
+        await dashboard_cache.invalidate_program(program_id)
+
         return ImportResultResponse(
             success=True,
             program_id=str(program_id),
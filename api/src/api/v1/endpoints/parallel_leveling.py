@@ -13,8 +13,11 @@ from src.schemas.leveling import (
     AlgorithmMetrics,
     LevelingComparisonResponse,
     LevelingOptionsRequest,
+    LevelingWhatIfRequest,
+    LevelingWhatIfResponse,
     ParallelLevelingResultResponse,
 )
+from src.services.leveling_preview import LevelingPreviewService
 from src.services.parallel_leveling import ParallelLevelingResult, ParallelLevelingService
 from src.services.resource_leveling import (
     LevelingOptions,
@@ -59,6 +62,13 @@ def _convert_parallel_result_to_response(
     )
 
 
+def _convert_variant_to_response(result: LevelingResult) -> ParallelLevelingResultResponse:
+    """Convert a serial or parallel leveling result to the parallel response schema."""
+    if isinstance(result, ParallelLevelingResult):
+        return _convert_parallel_result_to_response(result)
+    return ParallelLevelingResultResponse.model_validate(result, from_attributes=True)
+
+
 @router.post(
     "/{program_id}/level-parallel",
     response_model=ParallelLevelingResultResponse,
@@ -260,6 +270,69 @@ async def compare_leveling_algorithms(
     )
 
 
+@router.post(
+    "/{program_id}/level/what-if",
+    response_model=LevelingWhatIfResponse,
+    summary="Preview leveling with several option variants",
+)
+async def preview_leveling_variants(
+    program_id: UUID,
+    request: LevelingWhatIfRequest,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> LevelingWhatIfResponse:
+    """Level a program with several option variants without applying changes.
+
+    The program is read once into a snapshot identified by its content
+    hash. Passing the returned snapshot_id with later requests levels the
+    same snapshot again without reading the program, so trying further
+    variants only costs computation. An unknown or expired snapshot_id
+    reloads the program.
+
+    Args:
+        program_id: UUID of the program to level
+        request: Algorithm, option variants and optional snapshot_id
+        db: Database session
+        current_user: Authenticated user
+
+    Returns:
+        LevelingWhatIfResponse with one result per variant
+
+    Raises:
+        HTTPException: 404 if program not found
+    """
+    program_repo = ProgramRepository(db)
+    program = await program_repo.get_by_id_shallow(program_id)
+
+    if not program:
+        raise HTTPException(status_code=404, detail="Program not found")
+
+    variants = [
+        LevelingOptions(
+            preserve_critical_path=options.preserve_critical_path,
+            max_iterations=options.max_iterations,
+            target_resources=options.target_resources,
+            level_within_float=options.level_within_float,
+        )
+        for options in request.variants
+    ]
+
+    service = LevelingPreviewService(db)
+    preview = await service.preview(
+        program_id,
+        variants,
+        algorithm=request.algorithm,
+        snapshot_id=request.snapshot_id,
+        program=program,
+    )
+
+    return LevelingWhatIfResponse(
+        snapshot_id=preview.snapshot_id,
+        algorithm=preview.algorithm,
+        results=[_convert_variant_to_response(result) for result in preview.results],
+    )
+
+
 def _determine_recommendation(  # noqa: PLR0911
     serial_result: LevelingResult,
     parallel_result: ParallelLevelingResult,
@@ -5,7 +5,7 @@ from uuid import UUID
 
 from fastapi import APIRouter, Query
 
-from src.core.cache import CacheKeys, cache_manager, compute_activities_hash
+from src.core.cache import CacheKeys, cache_manager
 from src.core.deps import CurrentUser, DbSession
 from src.core.exceptions import AuthorizationError, NotFoundError
 from src.repositories.activity import ActivityRepository
@@ -14,9 +14,11 @@ from src.repositories.program import ProgramRepository
 from src.schemas.activity import (
     ActivityBriefResponse,
     CriticalPathResponse,
+    IncrementalScheduleResponse,
     ScheduleResult,
 )
-from src.services.cpm import CPMEngine
+from src.services.cpm import CPMEngine, apply_schedule_results, schedule_results_to_schema
+from src.services.cpm_incremental import schedule_state_store
 
 router = APIRouter(tags=["Schedule"])
 
@@ -39,21 +41,32 @@ async def calculate_schedule(
     - Total Float and Free Float
     - Critical Path
 
-    Results are cached based on activity/dependency hash.
+    Results are cached under the program's schedule revision, which
+    activity and dependency writes bump, so a cache hit loads no activities.
     Returns schedule results for all activities.
     """
     # Verify program exists and user has access
     program_repo = ProgramRepository(db)
-    program = await program_repo.get_by_id(program_id)
-    if not program:
+    schedule_state = await program_repo.get_schedule_revision(program_id)
+    if schedule_state is None:
         raise NotFoundError(f"Program {program_id} not found", "PROGRAM_NOT_FOUND")
 
-    if program.owner_id != current_user.id and not current_user.is_admin:
+    owner_id, schedule_revision = schedule_state
+    if owner_id != current_user.id and not current_user.is_admin:
         raise AuthorizationError(
             "Not authorized to calculate schedule for this program",
             "NOT_AUTHORIZED",
         )
 
+    cache_key = CacheKeys.cpm_key(str(program_id), schedule_revision)
+
+    # Try to get from cache (unless force_recalculate)
+    if not force_recalculate:
+        cached = await cache_manager.get(cache_key)
+        if cached:
+            # Return cached results (already in schema format)
+            return [ScheduleResult(**r) for r in cached]
+
     # Get all activities for the program
     activity_repo = ActivityRepository(db)
     activities = await activity_repo.get_by_program(program_id, limit=10000)
@@ -65,72 +78,106 @@ async def calculate_schedule(
     dep_repo = DependencyRepository(db)
     all_dependencies = await dep_repo.get_by_program(program_id)
 
-    # Compute hash for cache key
-    activities_data = [
-        {
-            "id": str(a.id),
-            "duration": a.duration,
-        }
-        for a in activities
-    ]
-    deps_data = [
-        {
-            "pred": str(d.predecessor_id),
-            "succ": str(d.successor_id),
-            "type": d.dependency_type,
-            "lag": d.lag,
-        }
-        for d in all_dependencies
-    ]
-    data_hash = compute_activities_hash(activities_data + deps_data)
-    cache_key = CacheKeys.cpm_key(str(program_id), data_hash)
-
-    # Try to get from cache (unless force_recalculate)
-    if not force_recalculate:
-        cached = await cache_manager.get(cache_key)
-        if cached:
-            # Return cached results (already in schema format)
-            return [ScheduleResult(**r) for r in cached]
-
     # Run CPM calculation
     engine = CPMEngine(activities, all_dependencies)
     results = engine.calculate()
 
     # Update activities with calculated values
-    for activity in activities:
-        if activity.id in results:
-            result = results[activity.id]
-            activity.total_float = result.total_float
-            activity.free_float = result.free_float
-            activity.is_critical = result.is_critical
-
+    apply_schedule_results(activities, results)
     await db.commit()
 
     # Convert results to schema objects
-    result_list = [
-        ScheduleResult(
-            activity_id=r.activity_id,
-            early_start=r.early_start,
-            early_finish=r.early_finish,
-            late_start=r.late_start,
-            late_finish=r.late_finish,
-            total_float=r.total_float,
-            free_float=r.free_float,
-            is_critical=r.is_critical,
-        )
-        for r in results.values()
-    ]
+    result_list = schedule_results_to_schema(results)
 
     # Cache the results
     await cache_manager.set(
         cache_key,
         [r.model_dump() for r in result_list],
         ttl=CacheKeys.CPM_TTL,
+        tags=[CacheKeys.cpm_tag(str(program_id))],
     )
 
     return result_list
 
 
+@router.post("/recalculate/{program_id}", response_model=IncrementalScheduleResponse)
+async def recalculate_schedule(
+    program_id: UUID,
+    db: DbSession,
+    current_user: CurrentUser,
+) -> IncrementalScheduleResponse:
+    """
+    Incrementally recalculate the CPM schedule after edits.
+
+    The last solved network for the program is kept in memory together
+    with the program's schedule revision. If the revision has not moved
+    since, nothing is loaded and the delta is empty. Otherwise duration,
+    lag and dependency changes are diffed against the stored network and
+    re-propagated through the affected part only. The first call for a
+    program, or a call after activities were added or removed, solves the
+    full network.
+
+    Solved networks are kept per API worker process (see
+    ScheduleStateStore): with several workers, a call routed to a worker
+    that has not solved the program yet runs a full calculation.
+
+    Returns only the activities whose dates or float changed.
+    """
+    # Verify program exists and user has access, without loading it
+    program_repo = ProgramRepository(db)
+    revision_info = await program_repo.get_schedule_revision(program_id)
+    if revision_info is None:
+        raise NotFoundError(f"Program {program_id} not found", "PROGRAM_NOT_FOUND")
+
+    owner_id, schedule_revision = revision_info
+    if owner_id != current_user.id and not current_user.is_admin:
+        raise AuthorizationError(
+            "Not authorized to calculate schedule for this program",
+            "NOT_AUTHORIZED",
+        )
+
+    # No activity or dependency edit since the stored network was solved
+    current = schedule_state_store.get_current(program_id, schedule_revision)
+    if current is not None:
+        return IncrementalScheduleResponse(
+            changed=[],
+            project_duration=current.project_duration,
+            total_activities=len(current.activity_ids),
+            full_recalculation=False,
+        )
+
+    activity_repo = ActivityRepository(db)
+    activities = await activity_repo.get_by_program(program_id, limit=10000)
+
+    if not activities:
+        schedule_state_store.discard(program_id)
+        return IncrementalScheduleResponse(
+            changed=[],
+            project_duration=0,
+            total_activities=0,
+            full_recalculation=True,
+        )
+
+    dep_repo = DependencyRepository(db)
+    all_dependencies = await dep_repo.get_by_program(program_id)
+
+    engine, changed, full = schedule_state_store.recalculate(
+        program_id, activities, all_dependencies, revision=schedule_revision
+    )
+
+    # Only write back activities whose float changed
+    if changed:
+        apply_schedule_results(activities, changed)
+        await db.commit()
+
+    return IncrementalScheduleResponse(
+        changed=schedule_results_to_schema(changed),
+        project_duration=engine.project_duration,
+        total_activities=len(activities),
+        full_recalculation=full,
+    )
+
+
 @router.get("/critical-path/{program_id}", response_model=CriticalPathResponse)
 async def get_critical_path(
     program_id: UUID,
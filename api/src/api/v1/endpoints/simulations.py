@@ -5,8 +5,9 @@ from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query, status
 
+from src.config import settings
 from src.core.deps import CurrentUser, DbSession
-from src.core.exceptions import AuthorizationError, NotFoundError
+from src.core.exceptions import AuthorizationError, ConflictError, NotFoundError
 from src.models.simulation import SimulationStatus
 from src.repositories.activity import ActivityRepository
 from src.repositories.dependency import DependencyRepository
@@ -35,8 +36,15 @@ from src.services.monte_carlo import (
     SimulationInput,
     parse_distribution_params,
 )
-from src.services.monte_carlo_optimized import OptimizedNetworkMonteCarloEngine
+from src.services.monte_carlo_streaming import DEFAULT_CHUNK_SIZE
 from src.services.simulation_cache import simulation_cache
+from src.services.simulation_jobs import (
+    JobActivity,
+    JobDependency,
+    MonteCarloJob,
+    NetworkMonteCarloJob,
+    simulation_job_runner,
+)
 from src.services.tornado_chart import TornadoChartService
 
 router = APIRouter(tags=["Simulations"])
@@ -494,8 +502,9 @@ async def run_simulation(
     """
     Run a Monte Carlo simulation.
 
-    Executes the simulation synchronously and returns results.
-    For large simulations (>10000 iterations), consider using async endpoint.
+    Executes the simulation in the simulation worker pool and returns
+    results once it finishes. For large simulations (>10000 iterations),
+    prefer POST /{config_id}/submit, which returns immediately.
     """
     config_repo = SimulationConfigRepository(db)
     config = await config_repo.get_by_id(config_id)
@@ -508,6 +517,8 @@ async def run_simulation(
     # Parse seed from request
     seed = run_request.seed if run_request else None
     include_activity_stats = run_request.include_activity_stats if run_request else False
+    chunk_size = run_request.chunk_size if run_request else None
+    convergence_tolerance = run_request.convergence_tolerance if run_request else None
 
     # Create result record
     result_repo = SimulationResultRepository(db)
@@ -515,72 +526,23 @@ async def run_simulation(
     await result_repo.mark_running(result.id)
     await db.commit()
 
-    try:
-        # Parse distributions from config
-        activity_distributions = {}
-        for activity_id, dist_data in config.activity_distributions.items():
-            activity_distributions[UUID(activity_id)] = parse_distribution_params(dist_data)
-
-        cost_distributions = None
-        if config.cost_distributions:
-            cost_distributions = {}
-            for activity_id, dist_data in config.cost_distributions.items():
-                cost_distributions[UUID(activity_id)] = parse_distribution_params(dist_data)
-
-        # Run simulation
-        engine = MonteCarloEngine(seed=seed)
-        sim_input = SimulationInput(
-            activity_durations=activity_distributions,
-            activity_costs=cost_distributions,
-            iterations=config.iterations,
-            seed=seed,
-            include_activity_stats=include_activity_stats,
-        )
-
-        output = engine.simulate(sim_input)
-
-        # Convert output to storage format
-        duration_results: dict[str, float] = {
-            "p10": output.duration_p10,
-            "p50": output.duration_p50,
-            "p80": output.duration_p80,
-            "p90": output.duration_p90,
-            "mean": output.duration_mean,
-            "std": output.duration_std,
-            "min": output.duration_min,
-            "max": output.duration_max,
-        }
-
-        cost_results: dict[str, float] | None = None
-        if output.cost_p50 is not None:
-            cost_results = {
-                "p10": output.cost_p10 or 0.0,
-                "p50": output.cost_p50,
-                "p80": output.cost_p80 or 0.0,
-                "p90": output.cost_p90 or 0.0,
-                "mean": output.cost_mean or 0.0,
-                "std": output.cost_std or 0.0,
-                "min": output.cost_min or 0.0,
-                "max": output.cost_max or 0.0,
-            }
-
-        duration_histogram = None
-        if output.duration_histogram_bins is not None:
-            duration_histogram = {
-                "bins": output.duration_histogram_bins.tolist(),
-                "counts": output.duration_histogram_counts.tolist()
-                if output.duration_histogram_counts is not None
-                else [],
-            }
+    job = MonteCarloJob(
+        activity_distributions=dict(config.activity_distributions),
+        cost_distributions=dict(config.cost_distributions) if config.cost_distributions else None,
+        iterations=config.iterations,
+        seed=seed,
+        include_activity_stats=include_activity_stats,
+        chunk_size=chunk_size,
+        convergence_tolerance=convergence_tolerance,
+    )
 
-        cost_histogram = None
-        if output.cost_histogram_bins is not None:
-            cost_histogram = {
-                "bins": output.cost_histogram_bins.tolist(),
-                "counts": output.cost_histogram_counts.tolist()
-                if output.cost_histogram_counts is not None
-                else [],
-            }
+    try:
+        # Run in the simulation worker pool so the event loop stays free
+        output = await simulation_job_runner.run(job)
+        duration_results = output.duration_results
+        cost_results = output.cost_results
+        duration_histogram = output.duration_histogram
+        cost_histogram = output.cost_histogram
 
         # Mark completed
         updated_result = await result_repo.mark_completed(
@@ -589,7 +551,7 @@ async def run_simulation(
             cost_results=cost_results,
             duration_histogram=duration_histogram,
             cost_histogram=cost_histogram,
-            activity_results=output.activity_stats,
+            activity_results=output.activity_results,
             iterations_completed=output.iterations,
         )
         await db.commit()
@@ -622,7 +584,7 @@ async def run_simulation(
             )
             if cost_histogram
             else None,
-            activity_stats=output.activity_stats,
+            activity_stats=output.activity_results,
             random_seed=updated_result.random_seed,
             duration_seconds=output.elapsed_seconds,
             progress_percent=100.0,
@@ -661,6 +623,10 @@ async def run_network_simulation(
     """
     Run a network-aware Monte Carlo simulation using optimized engine.
 
+    The simulation executes in the simulation worker pool and the results
+    are returned once it finishes. For large programs prefer
+    POST /{config_id}/submit-network, which returns immediately.
+
     This endpoint uses the OptimizedNetworkMonteCarloEngine which:
     - Pre-computes network topology once
     - Vectorizes CPM forward pass across all iterations
@@ -691,6 +657,8 @@ async def run_network_simulation(
 
     # Parse seed from request
     seed = run_request.seed if run_request else None
+    chunk_size = run_request.chunk_size if run_request else None
+    convergence_tolerance = run_request.convergence_tolerance if run_request else None
 
     # Create result record
     result_repo = SimulationResultRepository(db)
@@ -712,53 +680,24 @@ async def run_network_simulation(
                 detail="No activities found for program. Network simulation requires activities.",
             )
 
-        # Parse distributions from config
-        distributions = {}
-        for activity_id, dist_data in config.activity_distributions.items():
-            distributions[UUID(activity_id)] = parse_distribution_params(dist_data)
-
-        # Run optimized network simulation
-        engine = OptimizedNetworkMonteCarloEngine(seed=seed)
-        output = engine.simulate(
-            activities=cast("Any", activities),
-            dependencies=cast("Any", dependencies),
-            distributions=distributions,
+        job = NetworkMonteCarloJob(
+            activities=tuple(JobActivity(a.id, a.duration) for a in activities),
+            dependencies=tuple(
+                JobDependency(d.predecessor_id, d.successor_id, d.dependency_type, d.lag)
+                for d in dependencies
+            ),
+            activity_distributions=dict(config.activity_distributions),
             iterations=config.iterations,
+            seed=seed,
+            chunk_size=chunk_size,
+            convergence_tolerance=convergence_tolerance,
         )
 
-        # Convert output to storage format
-        duration_results = {
-            "p10": output.project_duration_p10,
-            "p50": output.project_duration_p50,
-            "p80": output.project_duration_p80,
-            "p90": output.project_duration_p90,
-            "mean": output.project_duration_mean,
-            "std": output.project_duration_std,
-            "min": output.project_duration_min,
-            "max": output.project_duration_max,
-        }
-
-        duration_histogram = None
-        if output.duration_histogram_bins is not None:
-            duration_histogram = {
-                "bins": output.duration_histogram_bins.tolist(),
-                "counts": output.duration_histogram_counts.tolist()
-                if output.duration_histogram_counts is not None
-                else [],
-            }
-
-        # Build activity stats from criticality and sensitivity
-        activity_stats: dict[str, dict[str, Any]] = {}
-        for act_id in output.activity_criticality:
-            act_id_str = str(act_id)
-            activity_stats[act_id_str] = {
-                "criticality": output.activity_criticality.get(act_id, 0.0),
-                "sensitivity": output.sensitivity.get(act_id, 0.0),
-            }
-            if act_id in output.activity_finish_distributions:
-                activity_stats[act_id_str]["finish_distribution"] = (
-                    output.activity_finish_distributions[act_id]
-                )
+        # Run in the simulation worker pool so the event loop stays free
+        output = await simulation_job_runner.run(job)
+        duration_results = output.duration_results
+        duration_histogram = output.duration_histogram
+        activity_stats = output.activity_results or {}
 
         # Mark completed
         completed_result = await result_repo.mark_completed(
@@ -813,6 +752,173 @@ async def run_network_simulation(
         ) from e
 
 
+def _pending_response(result: Any) -> SimulationResultResponse:
+    """Build the response for a freshly submitted simulation run."""
+    return SimulationResultResponse(
+        id=result.id,
+        config_id=result.config_id,
+        status=SimulationStatus.PENDING,
+        started_at=None,
+        completed_at=None,
+        iterations_completed=0,
+        random_seed=result.random_seed,
+        duration_seconds=None,
+        progress_percent=0.0,
+    )
+
+
+@router.post(
+    "/{config_id}/submit",
+    response_model=SimulationResultResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit Simulation",
+    responses={
+        202: {"description": "Simulation queued"},
+        401: {"model": AuthenticationErrorResponse, "description": "Not authenticated"},
+        404: {"model": NotFoundErrorResponse, "description": "Config not found"},
+        409: {"description": "Simulation queue is full"},
+        429: {"model": RateLimitErrorResponse, "description": "Rate limit exceeded"},
+    },
+)
+async def submit_simulation(
+    db: DbSession,
+    current_user: CurrentUser,
+    config_id: UUID,
+    run_request: SimulationRunRequest | None = None,
+) -> SimulationResultResponse:
+    """
+    Queue a Monte Carlo simulation and return immediately.
+
+    The simulation runs in a background worker process in chunks of
+    ``chunk_size`` iterations (default 1000), updating progress_percent
+    after each chunk. Poll GET /{config_id}/results/{result_id} until the
+    status is completed or failed. With ``convergence_tolerance`` set the
+    run may complete with fewer iterations once P80 has converged.
+    """
+    config_repo = SimulationConfigRepository(db)
+    config = await config_repo.get_by_id(config_id)
+
+    if not config:
+        raise NotFoundError(
+            f"SimulationConfig {config_id} not found", "SIMULATION_CONFIG_NOT_FOUND"
+        )
+
+    seed = run_request.seed if run_request else None
+    include_activity_stats = run_request.include_activity_stats if run_request else False
+
+    job = MonteCarloJob(
+        activity_distributions=dict(config.activity_distributions),
+        cost_distributions=dict(config.cost_distributions) if config.cost_distributions else None,
+        iterations=config.iterations,
+        seed=seed,
+        include_activity_stats=include_activity_stats,
+        chunk_size=(run_request.chunk_size if run_request else None) or DEFAULT_CHUNK_SIZE,
+        convergence_tolerance=run_request.convergence_tolerance if run_request else None,
+    )
+
+    result_repo = SimulationResultRepository(db)
+    result = await result_repo.create_result(config_id, seed=seed)
+    await db.commit()
+
+    try:
+        simulation_job_runner.submit(result.id, job)
+    except ConflictError:
+        await result_repo.mark_failed(result.id, "Simulation queue is full")
+        await db.commit()
+        raise
+
+    return _pending_response(result)
+
+
+@router.post(
+    "/{config_id}/submit-network",
+    response_model=SimulationResultResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Submit Network Simulation",
+    responses={
+        202: {"description": "Network simulation queued"},
+        400: {"description": "No activities found for program"},
+        401: {"model": AuthenticationErrorResponse, "description": "Not authenticated"},
+        403: {"model": AuthorizationErrorResponse, "description": "Not authorized"},
+        404: {"model": NotFoundErrorResponse, "description": "Config or program not found"},
+        409: {"description": "Simulation queue is full"},
+        429: {"model": RateLimitErrorResponse, "description": "Rate limit exceeded"},
+    },
+)
+async def submit_network_simulation(
+    db: DbSession,
+    current_user: CurrentUser,
+    config_id: UUID,
+    run_request: SimulationRunRequest | None = None,
+) -> SimulationResultResponse:
+    """
+    Queue a network-aware Monte Carlo simulation and return immediately.
+
+    The program's activities and dependencies are snapshotted at submit
+    time and simulated with OptimizedNetworkMonteCarloEngine in a
+    background worker process. Poll GET /{config_id}/results/{result_id}
+    for status and results.
+    """
+    config_repo = SimulationConfigRepository(db)
+    config = await config_repo.get_by_id(config_id)
+
+    if not config:
+        raise NotFoundError(
+            f"SimulationConfig {config_id} not found", "SIMULATION_CONFIG_NOT_FOUND"
+        )
+
+    # Verify program access
+    program_repo = ProgramRepository(db)
+    program = await program_repo.get_by_id(config.program_id)
+
+    if not program:
+        raise NotFoundError(f"Program {config.program_id} not found", "PROGRAM_NOT_FOUND")
+
+    if program.owner_id != current_user.id and not current_user.is_admin:
+        raise AuthorizationError("Access denied to this program")
+
+    activity_repo = ActivityRepository(db)
+    dependency_repo = DependencyRepository(db)
+
+    activities = await activity_repo.get_by_program(config.program_id)
+    dependencies = await dependency_repo.get_by_program(config.program_id)
+
+    if not activities:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No activities found for program. Network simulation requires activities.",
+        )
+
+    seed = run_request.seed if run_request else None
+
+    job = NetworkMonteCarloJob(
+        activities=tuple(JobActivity(a.id, a.duration) for a in activities),
+        dependencies=tuple(
+            JobDependency(d.predecessor_id, d.successor_id, d.dependency_type, d.lag)
+            for d in dependencies
+        ),
+        activity_distributions=dict(config.activity_distributions),
+        iterations=config.iterations,
+        seed=seed,
+        chunk_size=(run_request.chunk_size if run_request else None) or DEFAULT_CHUNK_SIZE,
+        convergence_tolerance=run_request.convergence_tolerance if run_request else None,
+        workers=settings.SIMULATION_PROCESSES_PER_JOB,
+    )
+
+    result_repo = SimulationResultRepository(db)
+    result = await result_repo.create_result(config_id, seed=seed)
+    await db.commit()
+
+    try:
+        simulation_job_runner.submit(result.id, job)
+    except ConflictError:
+        await result_repo.mark_failed(result.id, "Simulation queue is full")
+        await db.commit()
+        raise
+
+    return _pending_response(result)
+
+
 @router.get(
     "/{config_id}/results",
     response_model=list[SimulationSummaryResponse],
@@ -853,7 +959,9 @@ async def list_simulation_results(
             status=r.status,
             iterations_completed=r.iterations_completed,
             total_iterations=config.iterations,
-            progress_percent=(r.iterations_completed / config.iterations * 100)
+            progress_percent=100.0
+            if r.status == SimulationStatus.COMPLETED
+            else (r.iterations_completed / config.iterations * 100)
             if config.iterations > 0
             else 0,
             duration_p50=r.duration_results.get("p50") if r.duration_results else None,
@@ -886,7 +994,8 @@ async def get_simulation_result(
 ) -> SimulationResultResponse:
     """Get detailed results for a specific simulation run.
 
-    Results are cached for 24 hours to improve performance.
+    Use this endpoint to poll runs queued via the submit endpoints.
+    Finished results are cached for 24 hours to improve performance.
     Set use_cache=false to bypass the cache and get fresh data.
     """
     # Try to get from cache first
@@ -908,11 +1017,13 @@ async def get_simulation_result(
     config_repo = SimulationConfigRepository(db)
     config = await config_repo.get_by_id(config_id)
 
-    progress = (
-        (result.iterations_completed / config.iterations * 100)
-        if config and config.iterations > 0
-        else 0
-    )
+    # Runs that converged early complete with fewer than config.iterations
+    if result.status == SimulationStatus.COMPLETED:
+        progress = 100.0
+    elif config and config.iterations > 0:
+        progress = min(result.iterations_completed / config.iterations * 100, 100.0)
+    else:
+        progress = 0.0
 
     response_data = {
         "id": result.id,
@@ -932,8 +1043,11 @@ async def get_simulation_result(
         "progress_percent": progress,
     }
 
-    # Cache the result for future requests
-    if simulation_cache.is_available:
+    # Cache finished results only; queued and running jobs are still changing
+    if simulation_cache.is_available and result.status in (
+        SimulationStatus.COMPLETED,
+        SimulationStatus.FAILED,
+    ):
         await simulation_cache.set_result(config_id, response_data, result_id)
 
     return SimulationResultResponse(
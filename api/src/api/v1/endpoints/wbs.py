@@ -22,6 +22,7 @@ from src.schemas.wbs import (
     WBSElementUpdate,
     WBSListResponse,
 )
+from src.services.dashboard_cache import dashboard_cache
 
 router = APIRouter(tags=["WBS"])
 
@@ -67,10 +68,19 @@ async def get_wbs_tree(
     program_id: Annotated[UUID, Query(description="Program ID")],
 ) -> list[WBSElementTreeResponse]:
     """Get WBS elements as a hierarchical tree structure."""
+    cached = await dashboard_cache.get_wbs_tree(program_id)
+    if cached:
+        return [WBSElementTreeResponse.model_validate(e) for e in cached["items"]]
+
     repo = WBSElementRepository(db)
     tree = await repo.get_tree(program_id)
+    response = [WBSElementTreeResponse.model_validate(e) for e in tree]
+
+    await dashboard_cache.set_wbs_tree(
+        program_id, {"items": [e.model_dump(mode="json") for e in response]}
+    )
 
-    return [WBSElementTreeResponse.model_validate(e) for e in tree]
+    return response
 
 
 @router.get(
@@ -154,6 +164,8 @@ async def create_wbs_element(
     element = await wbs_repo.create(element_data)
     await db.commit()
 
+    await dashboard_cache.invalidate_on_wbs_update(element_in.program_id)
+
     return WBSElementResponse.model_validate(element)
 
 
@@ -187,6 +199,8 @@ async def update_wbs_element(
     )
     await db.commit()
 
+    await dashboard_cache.invalidate_on_wbs_update(updated.program_id)
+
     return WBSElementResponse.model_validate(updated)
 
 
@@ -212,9 +226,12 @@ async def delete_wbs_element(
     if not element:
         raise NotFoundError(f"WBS element {element_id} not found", "WBS_NOT_FOUND")
 
+    program_id = element.program_id
     await repo.delete(element.id)
     await db.commit()
 
+    await dashboard_cache.invalidate_on_wbs_update(program_id)
+
 
 async def _generate_wbs_code(
     repo: WBSElementRepository,
@@ -48,6 +48,10 @@ class Settings(BaseSettings):
 
     # Redis
     REDIS_URL: RedisDsn = "redis://localhost:6379/0"  # type: ignore[assignment]
+    CACHE_L1_MAX_ENTRIES: int = 1024  # In-process cache entries per worker (0 = disabled)
+    CACHE_L1_TTL_SECONDS: float = 30.0  # Longest time a worker serves a value without Redis
+    CACHE_CODEC: Literal["msgpack", "json"] = "msgpack"  # Serialization of cached values
+    CACHE_COMPRESS_MIN_BYTES: int = 4096  # Compress cached values from this size (0 = never)
 
     # Authentication - SECRET_KEY is required in production
     SECRET_KEY: str = ""
@@ -91,6 +95,21 @@ class Settings(BaseSettings):
     # Rate Limiting
     RATE_LIMIT_ENABLED: bool = True
 
+    # Background simulation jobs
+    SIMULATION_MAX_WORKERS: int = 2  # Worker processes for simulation runs
+    SIMULATION_MAX_CONCURRENT_JOBS: int = 2  # Jobs executing at once
+    SIMULATION_MAX_QUEUED_JOBS: int = 32  # Running plus waiting jobs per API process
+    SIMULATION_PROCESSES_PER_JOB: int = 1  # >1 splits a network job across processes
+
+    # Resource leveling
+    LEVELING_MAX_WORKERS: int = 2  # Shared worker processes per API process (1 = inline)
+
+    # Dashboard cache warm-up
+    DASHBOARD_WARMUP_ENABLED: bool = True  # Recompute invalidated dashboard caches
+    DASHBOARD_WARMUP_DEBOUNCE_SECONDS: float = 2.0  # Edits within this window share a run
+    DASHBOARD_WARMUP_MAX_CONCURRENT: int = 2  # Programs recomputed at once
+    DASHBOARD_WARMUP_STARTUP_PROGRAMS: int = 20  # Recently active programs warmed at startup
+
     @field_validator("CORS_ORIGINS", mode="before")
     @classmethod
     def parse_cors_origins(cls, v: str | list[str]) -> list[str]:
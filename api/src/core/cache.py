@@ -1,20 +1,74 @@
-"""Redis caching utilities for the Defense PM Tool."""
+"""Redis caching utilities for the Defense PM Tool.
+
+CacheManager can keep a LocalCache (L1) in front of Redis in each worker
+process. Hot keys are then served from memory without a Redis round trip
+or JSON decoding. Every write, delete and invalidation is published on
+the INVALIDATION_CHANNEL pub/sub channel, and each worker's listener
+evicts the matching L1 entries. L1 entries also expire after
+CACHE_L1_TTL_SECONDS, which bounds staleness if a message is missed.
+
+Keys whose names are not known up front (e.g. CPM results keyed by a
+schedule revision) are registered in tag sets when they are written.
+invalidate_tags deletes a tag's members without scanning the keyspace,
+so invalidation cost depends on the tag's size, not on the cache's.
+
+get_or_set and fill compute a missing value once: concurrent misses on a
+key in one worker await the same computation, and a short Redis lock
+makes other workers wait for that fill instead of computing it again.
+With stale_ttl, the last value keeps being served while a background
+task recomputes it.
+"""
 
 from __future__ import annotations
 
-import hashlib
+import asyncio
+import contextlib
 import json
-from typing import Any, TypeVar
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING, Any, TypeVar
+from uuid import uuid4
 
 import redis.asyncio as aioredis
 import structlog
 
 from src.config import settings
+from src.core.cache_codec import CodecError, JsonCodec, create_codec
+from src.core.metrics import record_cache_hit, record_cache_miss
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterable
+
+    from src.core.cache_codec import CacheCodec
 
 logger = structlog.get_logger(__name__)
 
 T = TypeVar("T")
 
+# Pub/sub channel carrying L1 invalidations between workers
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Metrics label of the in-process cache
+L1_CACHE_NAME = "l1"
+
+# Seconds between reconnect attempts of the invalidation listener
+_LISTENER_RETRY_SECONDS = 1.0
+
+# Longest a fill lock is held, and so how long other workers wait for it
+FILL_LOCK_TIMEOUT_SECONDS = 30.0
+
+# Seconds between checks of a fill running in another worker
+_FILL_POLL_SECONDS = 0.05
+
+# Deletes a lock only if it still holds this worker's token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 class CacheKeys:
     """Cache key prefixes and generation utilities."""
@@ -24,6 +78,9 @@ class CacheKeys:
     EVMS_SUMMARY = "evms:summary"
     WBS_TREE = "wbs:tree"
     PROGRAM_STATS = "program:stats"
+    TAG = "tag"
+    LOCK = "lock"
+    STALE = "stale"
 
     # Default TTLs in seconds
     CPM_TTL = 3600  # 1 hour - CPM results don't change unless activities do
@@ -32,9 +89,9 @@ class CacheKeys:
     STATS_TTL = 60  # 1 minute - Stats refresh frequently
 
     @staticmethod
-    def cpm_key(program_id: str, activities_hash: str) -> str:
-        """Generate CPM result cache key."""
-        return f"{CacheKeys.CPM_RESULT}:{program_id}:{activities_hash}"
+    def cpm_key(program_id: str, schedule_revision: int | str) -> str:
+        """Generate CPM result cache key for a schedule revision of a program."""
+        return f"{CacheKeys.CPM_RESULT}:{program_id}:{schedule_revision}"
 
     @staticmethod
     def evms_summary_key(program_id: str) -> str:
@@ -51,23 +108,173 @@ class CacheKeys:
         """Generate program stats cache key."""
         return f"{CacheKeys.PROGRAM_STATS}:{program_id}"
 
+    @staticmethod
+    def cpm_tag(program_id: str) -> str:
+        """Generate tag of a program's CPM result keys."""
+        return f"{CacheKeys.TAG}:{CacheKeys.CPM_RESULT}:{program_id}"
+
+    @staticmethod
+    def lock_key(key: str) -> str:
+        """Generate fill lock key of a cache key."""
+        return f"{CacheKeys.LOCK}:{key}"
+
+    @staticmethod
+    def stale_key(key: str) -> str:
+        """Generate key of the stale copy of a cache key."""
+        return f"{CacheKeys.STALE}:{key}"
+
+
+class LocalCache:
+    """
+    Size-bounded, TTL-aware LRU cache of decoded values for one process.
+
+    Dicts and lists are returned as shallow copies, so callers may set
+    top-level keys such as ``from_cache``; nested values are shared between
+    callers and must be treated as read-only. The generation counter
+    increases on every eviction by key, pattern or clear, so a caller that
+    read a value from Redis can skip storing it if an invalidation arrived
+    in the meantime.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize local cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is dropped
+            ttl: Longest lifetime of an entry in seconds
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._clock = clock
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of entries, including expired ones not yet dropped."""
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        """
+        Get a live value.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value (a shallow copy for dicts and lists) or None if
+            missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        if isinstance(value, dict | list):
+            return value.copy()
+        return value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: float | None = None,
+        generation: int | None = None,
+    ) -> None:
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Decoded value
+            ttl: Lifetime in seconds, capped at the cache TTL
+            generation: Generation observed before the value was read;
+                the value is not stored if entries were evicted since
+        """
+        if generation is not None and generation != self.generation:
+            return
+
+        lifetime = min(ttl, self.ttl) if ttl else self.ttl
+        self._entries[key] = (self._clock() + lifetime, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Evict one key."""
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        Evict all keys matching a Redis-style glob pattern.
+
+        Args:
+            pattern: Key pattern with wildcards (e.g., "cpm:result:*")
+
+        Returns:
+            Number of entries evicted
+        """
+        self.generation += 1
+        matches = [key for key in self._entries if fnmatchcase(key, pattern)]
+        for key in matches:
+            del self._entries[key]
+        return len(matches)
+
+    def clear(self) -> None:
+        """Evict everything."""
+        self.generation += 1
+        self._entries.clear()
+
 
 class CacheManager:
     """
     Redis cache manager with async support.
 
     Provides methods for caching and invalidation of application data.
+    With a LocalCache, reads are served from process memory when
+    possible. Writes and deletes are then published on
+    INVALIDATION_CHANNEL so that other workers evict their copies.
+    Those workers must run start_invalidation_listener for this to work.
     """
 
-    def __init__(self, redis_client: aioredis.Redis[bytes] | None = None) -> None:
+    def __init__(
+        self,
+        redis_client: aioredis.Redis[bytes] | None = None,
+        local_cache: LocalCache | None = None,
+        codec: CacheCodec | None = None,
+    ) -> None:
         """
         Initialize cache manager.
 
         Args:
             redis_client: Optional Redis client. If not provided, will be set later.
+            local_cache: Optional in-process cache in front of Redis
+            codec: Serialization of cached values (default JSON)
         """
         self._redis: aioredis.Redis[bytes] | None = redis_client
         self._enabled = True
+        self._local = local_cache
+        self._codec: CacheCodec = codec or JsonCodec()
+        self._instance_id = uuid4().hex
+        self._listener: asyncio.Task[None] | None = None
+        self._fills: dict[str, asyncio.Task[Any]] = {}
+
+    @property
+    def local_cache(self) -> LocalCache | None:
+        """Get the in-process cache."""
+        return self._local
 
     @property
     def redis(self) -> aioredis.Redis[bytes] | None:
@@ -108,17 +315,31 @@ class CacheManager:
         redis = self._redis
         assert redis is not None  # guarded by is_available above
 
+        local = self._local
+        generation = None
+        if local is not None:
+            value = local.get(key)
+            if value is not None:
+                record_cache_hit(L1_CACHE_NAME)
+                return value
+            record_cache_miss(L1_CACHE_NAME)
+            generation = local.generation
+
         try:
             data = await redis.get(key)
             if data:
                 logger.debug("cache_hit", key=key)
-                return json.loads(data)
+                value = self._codec.decode(data)
+                if local is not None:
+                    local.set(key, value, generation=generation)
+                return value
             logger.debug("cache_miss", key=key)
             return None
         except aioredis.RedisError as e:
             logger.warning("cache_get_error", key=key, error=str(e))
             return None
-        except json.JSONDecodeError as e:
+        except CodecError as e:
+            # Written by another codec or format version; recomputed as a miss
             logger.warning("cache_decode_error", key=key, error=str(e))
             return None
 
@@ -127,14 +348,19 @@ class CacheManager:
         key: str,
         value: Any,
         ttl: int | None = None,
+        tags: Iterable[str] = (),
     ) -> bool:
         """
         Set value in cache.
 
+        The value and its tag registrations are written in one transaction.
+        A tag set expires no earlier than its longest-lived member.
+
         Args:
             key: Cache key
-            value: Value to cache (must be JSON serializable)
+            value: Value to cache (must be serializable by the codec)
             ttl: Time-to-live in seconds (optional)
+            tags: Tag set keys to register the key in, for invalidate_tags
 
         Returns:
             True if successful, False otherwise
@@ -145,18 +371,216 @@ class CacheManager:
         redis = self._redis
         assert redis is not None  # guarded by is_available above
 
+        tags = list(tags)
         try:
-            serialized = json.dumps(value, default=str)
-            if ttl:
+            serialized = self._codec.encode(value)
+            if tags:
+                pipe = redis.pipeline(transaction=True)
+                if ttl:
+                    pipe.setex(key, ttl, serialized)
+                else:
+                    pipe.set(key, serialized)
+                for tag in tags:
+                    pipe.sadd(tag, key)
+                    if ttl:
+                        pipe.expire(tag, ttl, nx=True)
+                        pipe.expire(tag, ttl, gt=True)
+                    else:
+                        pipe.persist(tag)
+                await pipe.execute()
+            elif ttl:
                 await redis.setex(key, ttl, serialized)
             else:
                 await redis.set(key, serialized)
-            logger.debug("cache_set", key=key, ttl=ttl)
-            return True
+            logger.debug("cache_set", key=key, ttl=ttl, tags=tags)
         except (aioredis.RedisError, TypeError, ValueError) as e:
             logger.warning("cache_set_error", key=key, error=str(e))
             return False
 
+        if self._local is not None:
+            # Other workers drop their copy; this one keeps what readers would decode
+            self._local.delete(key)
+            self._local.set(key, self._codec.decode(serialized), ttl)
+            await self._publish_invalidation(keys=[key])
+        return True
+
+    async def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int | None = None,
+        *,
+        tags: Iterable[str] = (),
+        stale_ttl: int | None = None,
+    ) -> Any:
+        """
+        Get a value, computing and caching it on a miss.
+
+        Args:
+            key: Cache key
+            compute: Async function producing the value (must be serializable by the codec)
+            ttl: Time-to-live in seconds (optional)
+            tags: Tag set keys to register the key in
+            stale_ttl: Seconds the last value may still be served after it
+                expired or was invalidated, while it is recomputed (optional)
+
+        Returns:
+            Cached or computed value
+        """
+        value = await self.get(key)
+        if value is not None:
+            return value
+        return await self.fill(key, compute, ttl, tags=tags, stale_ttl=stale_ttl)
+
+    async def fill(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: int | None = None,
+        *,
+        tags: Iterable[str] = (),
+        stale_ttl: int | None = None,
+    ) -> Any:
+        """
+        Resolve a cache miss, computing the value at most once.
+
+        Concurrent calls for a key in this worker share one computation.
+        Across workers, the first to take the key's fill lock computes and
+        the others wait for its value, computing it themselves only if the
+        lock expires without one. With stale_ttl, a stale copy is returned
+        immediately when there is one and the value is recomputed in the
+        background.
+
+        Args:
+            key: Cache key that missed
+            compute: Async function producing the value (must be serializable by the codec)
+            ttl: Time-to-live in seconds (optional)
+            tags: Tag set keys to register the key in
+            stale_ttl: Seconds the last value may still be served after it
+                expired or was invalidated, while it is recomputed (optional)
+
+        Returns:
+            Computed, filled or stale value
+
+        Raises:
+            Exception: Whatever compute raises, in every caller sharing it
+        """
+        if not self.is_available:
+            return await compute()
+
+        tags = list(tags)
+        if stale_ttl:
+            stale = await self.get(CacheKeys.stale_key(key))
+            if stale is not None:
+                self._start_fill(key, compute, ttl=ttl, tags=tags, stale_ttl=stale_ttl)
+                return stale
+
+        fill = self._start_fill(key, compute, ttl=ttl, tags=tags, stale_ttl=stale_ttl)
+        # One caller giving up must not cancel the fill for the others
+        return await asyncio.shield(fill)
+
+    def _start_fill(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        ttl: int | None,
+        tags: list[str],
+        stale_ttl: int | None,
+    ) -> asyncio.Task[Any]:
+        """Running fill of a key, starting one if there is none."""
+        fill = self._fills.get(key)
+        if fill is None:
+            fill = asyncio.create_task(
+                self._fill(key, compute, ttl=ttl, tags=tags, stale_ttl=stale_ttl)
+            )
+            self._fills[key] = fill
+            fill.add_done_callback(lambda task: self._fill_done(key, task))
+        return fill
+
+    def _fill_done(self, key: str, fill: asyncio.Task[Any]) -> None:
+        """Forget a finished fill, logging its failure."""
+        if self._fills.get(key) is fill:
+            del self._fills[key]
+        if not fill.cancelled() and fill.exception() is not None:
+            logger.warning("cache_fill_error", key=key, error=str(fill.exception()))
+
+    async def _fill(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        *,
+        ttl: int | None,
+        tags: list[str],
+        stale_ttl: int | None,
+    ) -> Any:
+        """Compute and store a value under the key's fill lock."""
+        lock_key = CacheKeys.lock_key(key)
+        token = uuid4().hex
+        locked = await self._acquire_lock(lock_key, token)
+        if not locked:
+            value = await self._wait_for_fill(key, lock_key)
+            if value is not None:
+                return value
+
+        try:
+            value = await compute()
+            await self.set(key, value, ttl, tags=tags)
+            if stale_ttl:
+                await self.set(CacheKeys.stale_key(key), value, (ttl or 0) + stale_ttl)
+        finally:
+            if locked:
+                await self._release_lock(lock_key, token)
+        return value
+
+    async def _acquire_lock(self, lock_key: str, token: str) -> bool:
+        """Take a fill lock; True also when Redis fails, so the caller computes."""
+        redis = self._redis
+        if redis is None:
+            return True
+        try:
+            return bool(
+                await redis.set(lock_key, token, nx=True, px=int(FILL_LOCK_TIMEOUT_SECONDS * 1000))
+            )
+        except aioredis.RedisError as e:
+            logger.warning("cache_lock_error", key=lock_key, error=str(e))
+            return True
+
+    async def _release_lock(self, lock_key: str, token: str) -> None:
+        """Release a fill lock unless it expired and was taken by another worker."""
+        redis = self._redis
+        if redis is None:
+            return
+        try:
+            await redis.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+        except aioredis.RedisError as e:
+            logger.warning("cache_unlock_error", key=lock_key, error=str(e))
+
+    async def _wait_for_fill(self, key: str, lock_key: str) -> Any | None:
+        """
+        Wait for another worker's fill of a key.
+
+        Returns:
+            The filled value, or None if the lock was released or expired
+            without one
+        """
+        redis = self._redis
+        assert redis is not None  # a lock was found, so Redis is configured
+
+        deadline = time.monotonic() + FILL_LOCK_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            await asyncio.sleep(_FILL_POLL_SECONDS)
+            value = await self.get(key)
+            if value is not None:
+                return value
+            try:
+                if not await redis.exists(lock_key):
+                    return await self.get(key)
+            except aioredis.RedisError as e:
+                logger.warning("cache_lock_error", key=lock_key, error=str(e))
+                return None
+        return None
+
     async def delete(self, key: str) -> bool:
         """
         Delete value from cache.
@@ -173,18 +597,104 @@ class CacheManager:
         redis = self._redis
         assert redis is not None  # guarded by is_available above
 
+        if self._local is not None:
+            self._local.delete(key)
+
         try:
             await redis.delete(key)
             logger.debug("cache_delete", key=key)
-            return True
         except aioredis.RedisError as e:
             logger.warning("cache_delete_error", key=key, error=str(e))
             return False
 
+        await self._publish_invalidation(keys=[key])
+        return True
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """
+        Delete several keys in one call.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Number of keys deleted
+        """
+        keys = list(keys)
+        if not self.is_available or not keys:
+            return 0
+
+        redis = self._redis
+        assert redis is not None  # guarded by is_available above
+
+        if self._local is not None:
+            for key in keys:
+                self._local.delete(key)
+
+        try:
+            deleted: int = await redis.delete(*keys)
+            logger.debug("cache_delete_many", count=deleted)
+        except aioredis.RedisError as e:
+            logger.warning("cache_delete_many_error", error=str(e))
+            return 0
+
+        await self._publish_invalidation(keys=keys)
+        return deleted
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Delete every key registered in the given tag sets.
+
+        Reads the members of all tags in one pipeline, then deletes them and
+        removes them from their tags in one transaction. Only the members
+        read are removed, so keys registered in between stay tagged.
+
+        Args:
+            tags: Tag set keys
+
+        Returns:
+            Number of keys deleted
+        """
+        if not self.is_available or not tags:
+            return 0
+
+        redis = self._redis
+        assert redis is not None  # guarded by is_available above
+
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for tag in tags:
+                pipe.smembers(tag)
+            memberships = await pipe.execute()
+
+            keys: set[str] = set()
+            pipe = redis.pipeline(transaction=True)
+            for tag, members in zip(tags, memberships, strict=True):
+                if members:
+                    pipe.srem(tag, *members)
+                    keys.update(m.decode() if isinstance(m, bytes) else m for m in members)
+            if not keys:
+                return 0
+            pipe.delete(*keys)
+            deleted: int = (await pipe.execute())[-1]
+            logger.debug("cache_invalidate_tags", tags=tags, count=deleted)
+        except aioredis.RedisError as e:
+            logger.warning("cache_invalidate_tags_error", tags=tags, error=str(e))
+            return 0
+
+        if self._local is not None:
+            for key in keys:
+                self._local.delete(key)
+        await self._publish_invalidation(keys=sorted(keys))
+        return deleted
+
     async def delete_pattern(self, pattern: str) -> int:
         """
         Delete all keys matching a pattern.
 
+        This scans the whole keyspace; invalidation on writes should use
+        invalidate_tags or delete_many instead.
+
         Args:
             pattern: Key pattern with wildcards (e.g., "cpm:result:*")
 
@@ -197,20 +707,25 @@ class CacheManager:
         redis = self._redis
         assert redis is not None  # guarded by is_available above
 
+        if self._local is not None:
+            self._local.delete_pattern(pattern)
+
         try:
             keys = []
             async for key in redis.scan_iter(match=pattern):
                 keys.append(key)
 
+            deleted = 0
             if keys:
                 deleted = await redis.delete(*keys)
                 logger.debug("cache_delete_pattern", pattern=pattern, count=deleted)
-                return deleted
-            return 0
         except aioredis.RedisError as e:
             logger.warning("cache_delete_pattern_error", pattern=pattern, error=str(e))
             return 0
 
+        await self._publish_invalidation(patterns=[pattern])
+        return deleted
+
     async def invalidate_program(self, program_id: str) -> None:
         """
         Invalidate all caches for a program.
@@ -218,15 +733,14 @@ class CacheManager:
         Args:
             program_id: Program ID to invalidate
         """
-        patterns = [
-            f"{CacheKeys.CPM_RESULT}:{program_id}:*",
-            f"{CacheKeys.EVMS_SUMMARY}:{program_id}",
-            f"{CacheKeys.WBS_TREE}:{program_id}",
-            f"{CacheKeys.PROGRAM_STATS}:{program_id}",
-        ]
-
-        for pattern in patterns:
-            await self.delete_pattern(pattern)
+        await self.invalidate_tags(CacheKeys.cpm_tag(program_id))
+        await self.delete_many(
+            [
+                CacheKeys.evms_summary_key(program_id),
+                CacheKeys.wbs_tree_key(program_id),
+                CacheKeys.program_stats_key(program_id),
+            ]
+        )
 
         logger.info("cache_invalidate_program", program_id=program_id)
 
@@ -237,8 +751,7 @@ class CacheManager:
         Args:
             program_id: Program ID to invalidate
         """
-        pattern = f"{CacheKeys.CPM_RESULT}:{program_id}:*"
-        await self.delete_pattern(pattern)
+        await self.invalidate_tags(CacheKeys.cpm_tag(program_id))
         logger.info("cache_invalidate_cpm", program_id=program_id)
 
     async def invalidate_evms(self, program_id: str) -> None:
@@ -261,6 +774,93 @@ class CacheManager:
         await self.delete(CacheKeys.wbs_tree_key(program_id))
         logger.info("cache_invalidate_wbs", program_id=program_id)
 
+    async def _publish_invalidation(
+        self,
+        keys: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+    ) -> None:
+        """
+        Tell other workers to evict keys from their local caches.
+
+        Args:
+            keys: Exact keys to evict
+            patterns: Key patterns to evict
+        """
+        if self._local is None or self._redis is None:
+            return
+
+        message = json.dumps(
+            {"origin": self._instance_id, "keys": list(keys), "patterns": list(patterns)}
+        )
+        try:
+            await self._redis.publish(INVALIDATION_CHANNEL, message)
+        except aioredis.RedisError as e:
+            logger.warning("cache_publish_invalidation_error", error=str(e))
+
+    def apply_invalidation(self, message: str | bytes) -> None:
+        """
+        Evict local entries named by an invalidation message.
+
+        Messages published by this manager are ignored, since it already
+        evicted its own entries.
+
+        Args:
+            message: JSON message from INVALIDATION_CHANNEL
+        """
+        local = self._local
+        if local is None:
+            return
+
+        try:
+            payload = json.loads(message)
+        except json.JSONDecodeError as e:
+            logger.warning("cache_invalidation_decode_error", error=str(e))
+            return
+
+        if payload.get("origin") == self._instance_id:
+            return
+        for key in payload.get("keys", []):
+            local.delete(key)
+        for pattern in payload.get("patterns", []):
+            local.delete_pattern(pattern)
+
+    def start_invalidation_listener(self) -> None:
+        """Start applying other workers' invalidations to the local cache."""
+        if self._local is None or self._redis is None or self._listener is not None:
+            return
+        self._listener = asyncio.create_task(self._listen_for_invalidations())
+
+    async def stop_invalidation_listener(self) -> None:
+        """Stop the invalidation listener."""
+        listener, self._listener = self._listener, None
+        if listener is None:
+            return
+        listener.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await listener
+
+    async def _listen_for_invalidations(self) -> None:
+        """Subscribe to INVALIDATION_CHANNEL, resubscribing after errors."""
+        local = self._local
+        assert local is not None  # checked by start_invalidation_listener
+
+        while True:
+            redis = self._redis
+            if redis is None:
+                return
+            try:
+                async with redis.pubsub() as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    # Invalidations sent while unsubscribed were missed
+                    local.clear()
+                    logger.info("cache_invalidation_listener_subscribed")
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.apply_invalidation(message["data"])
+            except aioredis.RedisError as e:
+                logger.warning("cache_invalidation_listener_error", error=str(e))
+            await asyncio.sleep(_LISTENER_RETRY_SECONDS)
+
     async def health_check(self) -> dict[str, Any]:
         """
         Check Redis health.
@@ -283,30 +883,6 @@ class CacheManager:
             return {"status": "unhealthy", "error": str(e)}
 
 
-def compute_activities_hash(activities_data: list[dict[str, Any]]) -> str:
-    """
-    Compute a hash of activities for cache key generation.
-
-    The hash captures the essential scheduling data: IDs, durations,
-    and dependency information.
-
-    Args:
-        activities_data: List of activity dictionaries
-
-    Returns:
-        SHA256 hash string (first 16 characters)
-    """
-    # Sort for consistency
-    sorted_data = sorted(activities_data, key=lambda x: str(x.get("id", "")))
-
-    # Create a normalized string representation
-    normalized = json.dumps(sorted_data, sort_keys=True, default=str)
-
-    # Compute SHA256 hash
-    hash_obj = hashlib.sha256(normalized.encode())
-    return hash_obj.hexdigest()[:16]
-
-
 async def init_redis() -> aioredis.Redis[bytes]:
     """
     Initialize Redis connection.
@@ -315,12 +891,9 @@ async def init_redis() -> aioredis.Redis[bytes]:
         Redis client instance
     """
     redis_url = str(settings.REDIS_URL)
-    client = aioredis.from_url(
-        redis_url,
-        encoding="utf-8",
-        decode_responses=True,
-    )
-    logger.info("redis_initialized", url=redis_url.split("@")[-1])
+    # Raw bytes: cached values may be binary codec frames
+    client = aioredis.from_url(redis_url)
+    logger.info("redis_initialized", url=redis_url.rsplit("@", maxsplit=1)[-1])
     return client
 
 
@@ -336,4 +909,11 @@ async def close_redis(client: aioredis.Redis[bytes]) -> None:
 
 
 # Global cache manager instance
-cache_manager = CacheManager()
+cache_manager = CacheManager(
+    local_cache=(
+        LocalCache(settings.CACHE_L1_MAX_ENTRIES, settings.CACHE_L1_TTL_SECONDS)
+        if settings.CACHE_L1_MAX_ENTRIES > 0
+        else None
+    ),
+    codec=create_codec(settings.CACHE_CODEC, settings.CACHE_COMPRESS_MIN_BYTES),
+)
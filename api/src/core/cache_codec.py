@@ -0,0 +1,217 @@
+"""Serialization of cached values.
+
+A CacheCodec turns values into the bytes stored in Redis and back.
+
+JsonCodec is the original format: plain JSON with every unknown type
+turned into a string.
+
+MsgpackCodec writes compact MessagePack frames. They keep UUID, Decimal,
+date, datetime and NumPy arrays as their own types, and are compressed
+with zlib above a size threshold. Each frame starts with a header:
+
+    MAGIC (2 bytes) | FORMAT_VERSION (1 byte) | compression (1 byte)
+
+decode raises CodecError on anything without a known header, including
+entries written by JsonCodec or a future format version. CacheManager
+treats that as a cache miss, so a codec or format change needs no flush.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Protocol
+from uuid import UUID
+
+import msgpack
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+# First bytes of every MsgpackCodec frame
+MAGIC = b"\xc1\xdb"
+
+# Incremented on incompatible frame changes; other versions read as misses
+FORMAT_VERSION = 1
+
+# Compression byte of the frame header
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+
+# MessagePack extension type codes
+_EXT_UUID = 1
+_EXT_DECIMAL = 2
+_EXT_DATE = 3
+_EXT_DATETIME = 4
+_EXT_NDARRAY = 5
+
+_HEADER_SIZE = len(MAGIC) + 2
+
+
+class CodecError(ValueError):
+    """Raised when cached bytes cannot be decoded by a codec."""
+
+
+class CacheCodec(Protocol):
+    """Encoding of cached values."""
+
+    name: str
+
+    def encode(self, value: Any) -> bytes | str:
+        """Encode a value for storage."""
+        ...
+
+    def decode(self, data: bytes | str) -> Any:
+        """Decode stored data, raising CodecError if it is not in this codec's format."""
+        ...
+
+
+class JsonCodec:
+    """JSON with unknown types stored as strings (the original cache format)."""
+
+    name = "json"
+
+    def encode(self, value: Any) -> str:
+        """Encode a value as JSON."""
+        return json.dumps(value, default=str)
+
+    def decode(self, data: bytes | str) -> Any:
+        """Decode JSON."""
+        try:
+            return json.loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise CodecError(f"Not a JSON cache entry: {e}") from e
+
+
+def _pack_ndarray(array: np.ndarray) -> bytes:
+    """Pack an array as [dtype, shape, raw data]."""
+    packed: bytes = msgpack.packb(
+        [array.dtype.str, list(array.shape), np.ascontiguousarray(array).tobytes()]
+    )
+    return packed
+
+
+def _unpack_ndarray(data: bytes) -> np.ndarray:
+    """Unpack an array packed by _pack_ndarray."""
+    dtype, shape, buffer = msgpack.unpackb(data)
+    return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape).copy()
+
+
+# Extension code and packer by type; datetime precedes its base class date
+_EXT_ENCODERS: dict[type, tuple[int, Callable[[Any], bytes]]] = {
+    UUID: (_EXT_UUID, lambda value: value.bytes),
+    Decimal: (_EXT_DECIMAL, lambda value: str(value).encode()),
+    datetime: (_EXT_DATETIME, lambda value: value.isoformat().encode()),
+    date: (_EXT_DATE, lambda value: value.isoformat().encode()),
+    np.ndarray: (_EXT_NDARRAY, _pack_ndarray),
+}
+
+_EXT_DECODERS: dict[int, Callable[[bytes], Any]] = {
+    _EXT_UUID: lambda data: UUID(bytes=data),
+    _EXT_DECIMAL: lambda data: Decimal(data.decode()),
+    _EXT_DATETIME: lambda data: datetime.fromisoformat(data.decode()),
+    _EXT_DATE: lambda data: date.fromisoformat(data.decode()),
+    _EXT_NDARRAY: _unpack_ndarray,
+}
+
+
+def _encode_ext(obj: Any) -> Any:
+    """Encode a non-MessagePack type as an extension."""
+    # Exact type first: called once per value, so the common case must be cheap
+    encoder = _EXT_ENCODERS.get(type(obj))
+    if encoder is None:
+        encoder = next(
+            (enc for value_type, enc in _EXT_ENCODERS.items() if isinstance(obj, value_type)),
+            None,
+        )
+    if encoder is not None:
+        code, to_bytes = encoder
+        return msgpack.ExtType(code, to_bytes(obj))
+    if isinstance(obj, np.generic):
+        return obj.item()
+    # Same fallback as JsonCodec
+    return str(obj)
+
+
+def _decode_ext(code: int, data: bytes) -> Any:
+    """Decode an extension written by _encode_ext."""
+    decoder = _EXT_DECODERS.get(code)
+    if decoder is None:
+        raise CodecError(f"Unknown cache extension type {code}")
+    return decoder(data)
+
+
+class MsgpackCodec:
+    """Versioned MessagePack frames, zlib-compressed when large.
+
+    Tuples decode as lists and sets are not supported, as with JSON.
+    """
+
+    name = "msgpack"
+
+    def __init__(self, compress_min_bytes: int = 4096, compress_level: int = 1) -> None:
+        """
+        Initialize codec.
+
+        Args:
+            compress_min_bytes: Packed size from which frames are compressed
+                (0 = never compress)
+            compress_level: zlib level; low levels favour encode speed
+        """
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+
+    def encode(self, value: Any) -> bytes:
+        """Encode a value as a frame."""
+        packed: bytes = msgpack.packb(value, default=_encode_ext, datetime=False)
+        compression = COMPRESSION_NONE
+        if self.compress_min_bytes and len(packed) >= self.compress_min_bytes:
+            packed = zlib.compress(packed, self.compress_level)
+            compression = COMPRESSION_ZLIB
+        return MAGIC + bytes((FORMAT_VERSION, compression)) + packed
+
+    def decode(self, data: bytes | str) -> Any:
+        """Decode a frame written by any codec instance of this format version."""
+        if isinstance(data, str) or not data.startswith(MAGIC):
+            raise CodecError("Not a MessagePack cache entry")
+
+        version, compression = data[len(MAGIC)], data[len(MAGIC) + 1]
+        if version != FORMAT_VERSION:
+            raise CodecError(f"Unsupported cache format version {version}")
+
+        if compression not in {COMPRESSION_NONE, COMPRESSION_ZLIB}:
+            raise CodecError(f"Unknown cache compression {compression}")
+
+        payload = data[_HEADER_SIZE:]
+        try:
+            if compression == COMPRESSION_ZLIB:
+                payload = zlib.decompress(payload)
+            return msgpack.unpackb(payload, ext_hook=_decode_ext, strict_map_key=False)
+        except CodecError:
+            raise
+        except (zlib.error, ValueError, msgpack.UnpackException) as e:
+            raise CodecError(f"Corrupt cache entry: {e}") from e
+
+
+def create_codec(name: str, compress_min_bytes: int = 4096) -> CacheCodec:
+    """
+    Create a codec by name.
+
+    Args:
+        name: "msgpack" or "json"
+        compress_min_bytes: Compression threshold of the msgpack codec
+
+    Returns:
+        Codec instance
+
+    Raises:
+        ValueError: If the name is unknown
+    """
+    if name == "msgpack":
+        return MsgpackCodec(compress_min_bytes)
+    if name == "json":
+        return JsonCodec()
+    raise ValueError(f"Unknown cache codec: {name}")
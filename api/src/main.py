@@ -26,6 +26,9 @@ from src.core.exceptions import (
 )
 from src.core.middleware import RequestTracingMiddleware, SecurityHeadersMiddleware
 from src.core.rate_limit import limiter, rate_limit_exceeded_handler
+from src.services.dashboard_warmup import dashboard_warmer
+from src.services.leveling_pool import leveling_pool
+from src.services.simulation_jobs import simulation_job_runner
 
 # Configure structured logging
 structlog.configure(
@@ -71,22 +74,34 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     try:
         redis_client = await init_redis()
         cache_manager.redis = redis_client
+        cache_manager.start_invalidation_listener()
         app.state.redis = redis_client
         logger.info("redis_initialized")
     except Exception as e:
         logger.warning("redis_init_failed", error=str(e))
         cache_manager.disable()
 
+    # Recompute dashboard caches in the background after edits
+    if settings.DASHBOARD_WARMUP_ENABLED and cache_manager.is_available:
+        dashboard_warmer.start(warm_programs=settings.DASHBOARD_WARMUP_STARTUP_PROGRAMS)
+
     yield
 
     # Shutdown
     logger.info("application_shutdown")
 
+    # Stop background simulations before the database goes away
+    await simulation_job_runner.shutdown()
+    logger.info("simulation_jobs_stopped")
+    await dashboard_warmer.shutdown()
+    leveling_pool.shutdown()
+
     # Close database connections
     await dispose_engine()
     logger.info("database_connections_closed")
 
     # Close Redis connections
+    await cache_manager.stop_invalidation_listener()
     if hasattr(app.state, "redis") and app.state.redis:
         await close_redis(app.state.redis)
         logger.info("redis_connections_closed")
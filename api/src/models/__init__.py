@@ -49,6 +49,9 @@ from src.models.resource import Resource, ResourceAssignment, ResourceCalendar
 # Week 17: Resource cost tracking
 from src.models.resource_cost import ResourceCostEntry
 
+# Materialized cross-program resource load index
+from src.models.resource_load import ResourceLoadSegment
+
 # Week 20: Resource pools for cross-program sharing
 from src.models.resource_pool import (
     PoolAccessLevel,
@@ -57,6 +60,9 @@ from src.models.resource_pool import (
     ResourcePoolMember,
 )
 
+# Schedule revision maintained on flush, keying cached CPM results
+from src.models.schedule_revision import bump_schedule_revisions
+
 # v1.3.0: Resource skills and certification tracking
 from src.models.skill import ResourceSkill, Skill, SkillRequirement
 
@@ -97,11 +103,13 @@ __all__ = [
     "ResourceCalendar",
     # Week 17: Resource cost tracking
     "ResourceCostEntry",
+    "ResourceLoadSegment",
     # Week 20: Resource pools
     "ResourcePool",
     "ResourcePoolAccess",
     "ResourcePoolMember",
     "PoolAccessLevel",
+    "bump_schedule_revisions",
     # v1.3.0: Resource skills
     "Skill",
     "ResourceSkill",
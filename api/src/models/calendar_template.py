@@ -105,31 +105,18 @@ class CalendarTemplate(Base):
     def is_working_day(self, check_date: date) -> bool:
         """Check if a date is a working day according to this template.
 
+        Looks the date up in the template's compiled calendar (see
+        src.services.working_calendar), cached per template version.
+
         Args:
             check_date: The date to check
 
         Returns:
             True if the date is a working day (not a weekend or holiday)
         """
-        # Check if day of week is in working_days (ISO: Monday=1, Sunday=7)
-        # Python's weekday() returns Monday=0, Sunday=6, so we add 1
-        day_of_week = check_date.weekday() + 1
-        if day_of_week not in self.working_days:
-            return False
-
-        # Check if it's a holiday
-        for holiday in self.holidays:
-            if holiday.recurring_yearly:
-                # Check month and day only
-                if (
-                    check_date.month == holiday.holiday_date.month
-                    and check_date.day == holiday.holiday_date.day
-                ):
-                    return False
-            elif check_date == holiday.holiday_date:
-                return False
-
-        return True
+        from src.services.working_calendar import get_template_calendar  # noqa: PLC0415
+
+        return get_template_calendar(self).is_working_day(check_date)
 
     def get_available_hours(self, check_date: date) -> Decimal:
         """Get available working hours for a specific date.
@@ -140,9 +127,9 @@ class CalendarTemplate(Base):
         Returns:
             Available hours (0 if not a working day, hours_per_day otherwise)
         """
-        if self.is_working_day(check_date):
-            return self.hours_per_day
-        return Decimal("0")
+        from src.services.working_calendar import get_template_calendar  # noqa: PLC0415
+
+        return get_template_calendar(self).hours_on(check_date)
 
 
 class CalendarTemplateHoliday(Base):
@@ -5,7 +5,7 @@ from decimal import Decimal
 from typing import TYPE_CHECKING
 from uuid import UUID
 
-from sqlalchemy import Date, ForeignKey, Index, Numeric, String, Text, text
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, String, Text, text
 from sqlalchemy.dialects.postgresql import ENUM as PgEnum
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
@@ -43,6 +43,8 @@ class Program(Base):
         status: Current program status
         owner_id: FK to the User who owns this program
         budget_at_completion: Total authorized budget (BAC)
+        schedule_revision: Revision of the schedule network, bumped by
+            activity and dependency writes
     """
 
     # Override auto-generated table name
@@ -121,6 +123,15 @@ class Program(Base):
         comment="Total authorized budget (BAC)",
     )
 
+    # Maintained on flush by src.models.schedule_revision; keys cached CPM results
+    schedule_revision: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+        comment="Revision of the schedule network, bumped by activity and dependency writes",
+    )
+
     # Relationships
     owner: Mapped["User"] = relationship(
         "User",
@@ -166,6 +166,7 @@ class Resource(Base):
         "CalendarTemplate",
         back_populates="resources",
         foreign_keys=[calendar_template_id],
+        lazy="selectin",
     )
 
     # v1.3.0: Resource skills
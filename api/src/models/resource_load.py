@@ -0,0 +1,249 @@
+"""Materialized per-resource load index for cross-program availability.
+
+Each ResourceLoadSegment row is a run of consecutive days on which one
+program loads one resource with the same total units, so the daily load
+of a resource across every program over any date range is a single
+indexed range read.
+
+Segments are rebuilt for the affected resources in the same flush that
+adds, changes or deletes a ResourceAssignment or moves the CPM dates of
+an activity, so the index commits and rolls back with the change.
+"""
+
+from collections import defaultdict
+from collections.abc import Collection, Iterable
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import chain
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import (
+    Date,
+    ForeignKey,
+    Index,
+    Integer,
+    Numeric,
+    delete,
+    event,
+    func,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Mapped, Session, mapped_column
+
+from src.models.activity import Activity
+from src.models.base import Base
+from src.models.resource import ResourceAssignment
+
+# Attributes whose changes move an assignment's load
+_ASSIGNMENT_LOAD_FIELDS = ("resource_id", "units", "start_date", "finish_date", "deleted_at")
+
+# Activity dates that assignments without their own dates fall back to
+_ACTIVITY_DATE_FIELDS = ("early_start", "early_finish")
+
+
+class ResourceLoadSegment(Base):
+    """
+    Run of days with constant load of one resource by one program.
+
+    Attributes:
+        resource_id: FK to loaded resource
+        program_id: FK to program of the assigned activities
+        start_date: First day of the run
+        finish_date: Last day of the run (inclusive)
+        units: Total allocation units on each day of the run
+        assignment_count: Number of assignments active on each day
+    """
+
+    __tablename__ = "resource_load_segments"
+
+    resource_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("resources.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="FK to loaded resource",
+    )
+
+    program_id: Mapped[UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("programs.id", ondelete="CASCADE"),
+        nullable=False,
+        comment="FK to program of the assigned activities",
+    )
+
+    start_date: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+        comment="First day of the run",
+    )
+
+    finish_date: Mapped[date] = mapped_column(
+        Date,
+        nullable=False,
+        comment="Last day of the run (inclusive)",
+    )
+
+    units: Mapped[Decimal] = mapped_column(
+        Numeric(precision=9, scale=2),
+        nullable=False,
+        comment="Total allocation units on each day of the run",
+    )
+
+    assignment_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        comment="Number of assignments active on each day of the run",
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_resource_load_segments_resource_dates",
+            "resource_id",
+            "start_date",
+            "finish_date",
+        ),
+        {"comment": "Materialized daily load of resources across programs"},
+    )
+
+    def __repr__(self) -> str:
+        """Return string representation."""
+        return (
+            f"<ResourceLoadSegment(resource_id={self.resource_id}, "
+            f"program_id={self.program_id}, {self.start_date}..{self.finish_date}, "
+            f"units={self.units})>"
+        )
+
+
+def build_load_segments(
+    rows: Iterable[tuple[UUID, UUID, date, date, Decimal]],
+) -> list[dict[str, Any]]:
+    """Compress assignment ranges into constant-load runs.
+
+    Args:
+        rows: (resource_id, program_id, start, finish, units) per
+            assignment, with inclusive dates
+
+    Returns:
+        Segment column values, one dict per run with at least one
+        active assignment
+    """
+    # (resource, program) -> day ordinal -> [units delta, count delta]
+    changes: defaultdict[tuple[UUID, UUID], defaultdict[int, list[Any]]] = defaultdict(
+        lambda: defaultdict(lambda: [Decimal("0"), 0])
+    )
+    for resource_id, program_id, start, finish, units in rows:
+        if finish < start:
+            continue
+        deltas = changes[resource_id, program_id]
+        deltas[start.toordinal()][0] += units
+        deltas[start.toordinal()][1] += 1
+        deltas[finish.toordinal() + 1][0] -= units
+        deltas[finish.toordinal() + 1][1] -= 1
+
+    segments: list[dict[str, Any]] = []
+    for (resource_id, program_id), deltas in changes.items():
+        units = Decimal("0")
+        count = 0
+        run_start: int | None = None
+        for ordinal in sorted(deltas):
+            units_delta, count_delta = deltas[ordinal]
+            if units_delta == 0 and count_delta == 0:
+                continue
+            if run_start is not None and count:
+                segments.append(
+                    {
+                        "resource_id": resource_id,
+                        "program_id": program_id,
+                        "start_date": date.fromordinal(run_start),
+                        "finish_date": date.fromordinal(ordinal) - timedelta(days=1),
+                        "units": units,
+                        "assignment_count": count,
+                    }
+                )
+            units += units_delta
+            count += count_delta
+            run_start = ordinal
+    return segments
+
+
+def refresh_resource_loads(connection: Connection, resource_ids: Collection[UUID]) -> None:
+    """Rebuild the load segments of some resources from their assignments.
+
+    Assignments use their own dates, falling back to the early dates of
+    their activity; assignments without both dates add no load.
+
+    Args:
+        connection: Connection inside the current transaction
+        resource_ids: Resources to rebuild
+    """
+    if not resource_ids:
+        return
+
+    ids = list(resource_ids)
+    start = func.coalesce(ResourceAssignment.start_date, Activity.early_start)
+    finish = func.coalesce(ResourceAssignment.finish_date, Activity.early_finish)
+    rows = connection.execute(
+        select(
+            ResourceAssignment.resource_id,
+            Activity.program_id,
+            start,
+            finish,
+            ResourceAssignment.units,
+        )
+        .join(Activity, Activity.id == ResourceAssignment.activity_id)
+        .where(ResourceAssignment.resource_id.in_(ids))
+        .where(ResourceAssignment.deleted_at.is_(None))
+        .where(start.is_not(None))
+        .where(finish.is_not(None))
+    )
+    segments = build_load_segments(rows.all())
+
+    connection.execute(delete(ResourceLoadSegment).where(ResourceLoadSegment.resource_id.in_(ids)))
+    if segments:
+        connection.execute(insert(ResourceLoadSegment), segments)
+
+
+def _changed(target: Any, fields: Iterable[str]) -> bool:
+    """Whether any of the attributes has pending changes."""
+    attrs = inspect(target).attrs
+    return any(attrs[field].history.has_changes() for field in fields)
+
+
+# Event listener to keep the load index in step with assignments
+@event.listens_for(Session, "after_flush")
+def receive_after_flush(session: Session, _flush_context: Any) -> None:
+    """Rebuild load segments of resources whose assignments were flushed."""
+    resource_ids: set[UUID] = set()
+    activity_ids: set[UUID] = set()
+
+    for target in chain(session.new, session.deleted):
+        if isinstance(target, ResourceAssignment):
+            resource_ids.add(target.resource_id)
+
+    for target in session.dirty:
+        if isinstance(target, ResourceAssignment) and _changed(target, _ASSIGNMENT_LOAD_FIELDS):
+            history = inspect(target).attrs.resource_id.history
+            resource_ids.update(history.sum())
+        elif isinstance(target, Activity) and _changed(target, _ACTIVITY_DATE_FIELDS):
+            activity_ids.add(target.id)
+
+    if not resource_ids and not activity_ids:
+        return
+
+    connection = session.connection()
+    if activity_ids:
+        resource_ids.update(
+            connection.execute(
+                select(ResourceAssignment.resource_id)
+                .where(ResourceAssignment.activity_id.in_(activity_ids))
+                .distinct()
+            ).scalars()
+        )
+
+    # Attribute history can hold an unset foreign key
+    resource_ids.discard(None)
+    refresh_resource_loads(connection, resource_ids)
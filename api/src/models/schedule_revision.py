@@ -0,0 +1,96 @@
+"""Per-program schedule revision maintained on flush.
+
+Program.schedule_revision is bumped whenever the network the CPM engine
+schedules changes: activities added, deleted or given a new duration, and
+dependencies added, deleted or changed. CPM results are cached under the
+revision, so checking the cache reads one column instead of loading and
+hashing the whole network.
+
+The revision is bumped in the same flush as the change, so it commits and
+rolls back with it. Bulk UPDATE and DELETE statements on activities or
+dependencies bypass flush events and must call bump_schedule_revisions.
+"""
+
+from collections.abc import Collection, Iterable
+from itertools import chain
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from src.models.activity import Activity
+from src.models.dependency import Dependency
+from src.models.program import Program
+
+# Activity attributes the CPM network is built from
+_ACTIVITY_SCHEDULE_FIELDS = ("program_id", "duration", "deleted_at")
+
+# Dependency attributes the CPM network is built from
+_DEPENDENCY_SCHEDULE_FIELDS = (
+    "predecessor_id",
+    "successor_id",
+    "dependency_type",
+    "lag",
+    "deleted_at",
+)
+
+
+def bump_schedule_revisions(connection: Connection, program_ids: Collection[UUID]) -> None:
+    """Increment the schedule revision of some programs.
+
+    Args:
+        connection: Connection inside the current transaction
+        program_ids: Programs whose schedule network changed
+    """
+    if not program_ids:
+        return
+
+    connection.execute(
+        update(Program)
+        .where(Program.id.in_(list(program_ids)))
+        .values(schedule_revision=Program.schedule_revision + 1)
+    )
+
+
+def _changed(target: Any, fields: Iterable[str]) -> bool:
+    """Whether any of the attributes has pending changes."""
+    attrs = inspect(target).attrs
+    return any(attrs[field].history.has_changes() for field in fields)
+
+
+# Event listener to bump schedule revisions with network changes
+@event.listens_for(Session, "after_flush")
+def receive_after_flush(session: Session, _flush_context: Any) -> None:
+    """Bump the revision of programs whose activities or dependencies were flushed."""
+    program_ids: set[UUID] = set()
+    predecessor_ids: set[UUID] = set()
+
+    for target in chain(session.new, session.deleted):
+        if isinstance(target, Activity):
+            program_ids.add(target.program_id)
+        elif isinstance(target, Dependency):
+            predecessor_ids.add(target.predecessor_id)
+
+    for target in session.dirty:
+        if isinstance(target, Activity) and _changed(target, _ACTIVITY_SCHEDULE_FIELDS):
+            program_ids.update(inspect(target).attrs.program_id.history.sum())
+        elif isinstance(target, Dependency) and _changed(target, _DEPENDENCY_SCHEDULE_FIELDS):
+            predecessor_ids.update(inspect(target).attrs.predecessor_id.history.sum())
+
+    if not program_ids and not predecessor_ids:
+        return
+
+    connection = session.connection()
+    if predecessor_ids:
+        # Both ends of a dependency belong to the same program
+        program_ids.update(
+            connection.execute(
+                select(Activity.program_id).where(Activity.id.in_(predecessor_ids)).distinct()
+            ).scalars()
+        )
+
+    # Attribute history can hold an unset foreign key
+    program_ids.discard(None)
+    bump_schedule_revisions(connection, program_ids)
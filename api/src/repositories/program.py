@@ -2,9 +2,12 @@
 
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import func, select, union_all
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 
+from src.models.activity import Activity
+from src.models.evms_period import EVMSPeriod
 from src.models.program import Program
 from src.repositories.base import BaseRepository
 
@@ -113,3 +116,79 @@ class ProgramRepository(BaseRepository[Program]):
             return await self.get_all(skip=skip, limit=limit, order_by="-created_at")
 
         return await self.get_by_owner(user_id, skip=skip, limit=limit)
+
+    async def get_by_id_shallow(self, program_id: UUID) -> Program | None:
+        """
+        Get a program's own columns without loading its relationships.
+
+        Accessing a relationship of the returned program raises instead of
+        loading it.
+
+        Args:
+            program_id: Program UUID
+
+        Returns:
+            Program, or None if it does not exist
+        """
+        result = await self.session.execute(
+            select(Program)
+            .where(Program.id == program_id)
+            .where(Program.deleted_at.is_(None))
+            .options(raiseload("*"))
+        )
+        return result.scalar_one_or_none()
+
+    async def get_schedule_revision(self, program_id: UUID) -> tuple[UUID, int] | None:
+        """
+        Get a program's owner and schedule revision without loading the program.
+
+        Loading a Program also loads its activities and WBS, which is what
+        the CPM cache check avoids.
+
+        Args:
+            program_id: Program UUID
+
+        Returns:
+            (owner_id, schedule_revision), or None if the program does not exist
+        """
+        result = await self.session.execute(
+            select(Program.owner_id, Program.schedule_revision)
+            .where(Program.id == program_id)
+            .where(Program.deleted_at.is_(None))
+        )
+        row = result.one_or_none()
+        return (row.owner_id, row.schedule_revision) if row else None
+
+    async def get_recently_active_ids(self, limit: int = 20) -> list[UUID]:
+        """
+        Get IDs of the programs whose data changed most recently.
+
+        A program's last activity is the latest update of the program
+        itself, its activities or its EVMS periods.
+
+        Args:
+            limit: Maximum number of program IDs to return
+
+        Returns:
+            Program IDs, most recently active first
+        """
+        changes = union_all(
+            select(Program.id.label("program_id"), Program.updated_at.label("updated_at")),
+            select(Activity.program_id, func.max(Activity.updated_at)).group_by(
+                Activity.program_id
+            ),
+            select(EVMSPeriod.program_id, func.max(EVMSPeriod.updated_at)).group_by(
+                EVMSPeriod.program_id
+            ),
+        ).subquery()
+
+        query = (
+            select(Program.id)
+            .join(changes, changes.c.program_id == Program.id)
+            .where(Program.deleted_at.is_(None))
+            .group_by(Program.id)
+            .order_by(func.max(changes.c.updated_at).desc())
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
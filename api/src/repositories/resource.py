@@ -5,10 +5,11 @@ from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import delete, func, select
+from sqlalchemy import delete, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from src.models.activity import Activity
 from src.models.enums import ResourceType
 from src.models.resource import Resource, ResourceAssignment, ResourceCalendar
 from src.repositories.base import BaseRepository
@@ -320,6 +321,85 @@ class ResourceAssignmentRepository(BaseRepository[ResourceAssignment]):
         result = await self.session.execute(query)
         return list(result.unique().scalars().all())
 
+    async def get_assignments_for_resources(
+        self,
+        resource_ids: list[UUID],
+    ) -> list[ResourceAssignment]:
+        """
+        Get all assignments for several resources with activities eagerly loaded.
+
+        Batch form of get_assignments_with_activities, used by program-wide
+        over-allocation detection to load every resource in one query.
+
+        Args:
+            resource_ids: Resource UUIDs
+
+        Returns:
+            List of assignments with activities eagerly loaded
+        """
+        if not resource_ids:
+            return []
+
+        query = (
+            select(ResourceAssignment)
+            .where(ResourceAssignment.resource_id.in_(resource_ids))
+            .options(
+                joinedload(ResourceAssignment.resource),
+                joinedload(ResourceAssignment.activity),
+            )
+        )
+        query = self._apply_soft_delete_filter(query)
+
+        result = await self.session.execute(query)
+        return list(result.unique().scalars().all())
+
+    async def get_for_program_resources(
+        self,
+        program_id: UUID,
+    ) -> list[ResourceAssignment]:
+        """
+        Get every assignment on the resources a program uses, in one query.
+
+        Covers resources owned by the program and resources assigned to
+        any of its activities, including assignments from other programs
+        that share those resources. Used by resource leveling to load a
+        program snapshot without per-activity queries.
+
+        Args:
+            program_id: Program UUID
+
+        Returns:
+            List of assignments with activities and resources eagerly
+            loaded; assignments on deleted resources are excluded
+        """
+        program_activity_ids = select(Activity.id).where(Activity.program_id == program_id)
+        assigned_resource_ids = self._apply_soft_delete_filter(
+            select(ResourceAssignment.resource_id).where(
+                ResourceAssignment.activity_id.in_(program_activity_ids)
+            )
+        )
+        owned_resource_ids = select(Resource.id).where(Resource.program_id == program_id)
+
+        query = (
+            select(ResourceAssignment)
+            .join(Resource, ResourceAssignment.resource_id == Resource.id)
+            .where(Resource.deleted_at.is_(None))
+            .where(
+                or_(
+                    ResourceAssignment.resource_id.in_(assigned_resource_ids),
+                    ResourceAssignment.resource_id.in_(owned_resource_ids),
+                )
+            )
+            .options(
+                joinedload(ResourceAssignment.resource),
+                joinedload(ResourceAssignment.activity),
+            )
+        )
+        query = self._apply_soft_delete_filter(query)
+
+        result = await self.session.execute(query)
+        return list(result.unique().scalars().all())
+
     async def get_total_units_for_resource(
         self,
         resource_id: UUID,
@@ -394,6 +474,38 @@ class ResourceCalendarRepository(BaseRepository[ResourceCalendar]):
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def get_for_resources_date_range(
+        self,
+        resource_ids: list[UUID],
+        start_date: date,
+        end_date: date,
+    ) -> list[ResourceCalendar]:
+        """
+        Get calendar entries for several resources within a date range.
+
+        Args:
+            resource_ids: Resource UUIDs
+            start_date: Range start date (inclusive)
+            end_date: Range end date (inclusive)
+
+        Returns:
+            List of calendar entries ordered by resource and date
+        """
+        if not resource_ids:
+            return []
+
+        query = (
+            select(ResourceCalendar)
+            .where(ResourceCalendar.resource_id.in_(resource_ids))
+            .where(ResourceCalendar.calendar_date >= start_date)
+            .where(ResourceCalendar.calendar_date <= end_date)
+            .order_by(ResourceCalendar.resource_id, ResourceCalendar.calendar_date)
+        )
+        query = self._apply_soft_delete_filter(query)
+
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
     async def get_by_date(
         self,
         resource_id: UUID,
@@ -23,6 +23,7 @@ from src.schemas.activity import (
     ActivityResponse,
     ActivityUpdate,
     CriticalPathResponse,
+    IncrementalScheduleResponse,
     ScheduleResult,
 )
 from src.schemas.common import (
@@ -163,6 +164,7 @@ __all__ = [
     "ErrorResponse",
     "FieldError",
     "HealthResponse",
+    "IncrementalScheduleResponse",
     "MessageResponse",
     # Common
     "PaginatedResponse",
@@ -694,5 +694,56 @@ class CriticalPathResponse(BaseModel):
     )
 
 
+class IncrementalScheduleResponse(BaseModel):
+    """
+    Schema for incremental CPM recalculation results.
+
+    Only activities whose dates or float changed since the
+    last calculation are returned.
+    """
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "changed": [
+                    {
+                        "activity_id": "770e8400-e29b-41d4-a716-446655440003",
+                        "early_start": 5,
+                        "early_finish": 12,
+                        "late_start": 5,
+                        "late_finish": 12,
+                        "total_float": 0,
+                        "free_float": 0,
+                        "is_critical": True,
+                    }
+                ],
+                "project_duration": 120,
+                "total_activities": 50,
+                "full_recalculation": False,
+            }
+        }
+    )
+
+    changed: list[ScheduleResult] = Field(
+        ...,
+        description="Schedule results that changed since the last calculation",
+    )
+    project_duration: int = Field(
+        ...,
+        description="Total project duration in working days",
+        examples=[120],
+    )
+    total_activities: int = Field(
+        ...,
+        description="Total number of activities",
+        examples=[50],
+    )
+    full_recalculation: bool = Field(
+        ...,
+        description="True if the whole network was recalculated",
+        examples=[False],
+    )
+
+
 # Type alias for paginated activity lists
 ActivityListResponse = PaginatedResponse[ActivityResponse]
@@ -97,3 +97,41 @@ class ProgramHistogramResponse(BaseModel):
 
     summary: ProgramHistogramSummaryResponse
     histograms: list[ResourceHistogramResponse] = Field(default_factory=list)
+
+
+class ProgramHistogramMatrixResponse(BaseModel):
+    """Columnar response schema for program-wide histogram.
+
+    Per-period values are nested lists indexed [resource][period], in the
+    order of resource_ids and dates. Hours and percentages are rounded to
+    hundredths.
+
+    Attributes:
+        summary: Summary statistics for the program
+        granularity: Period length: daily, weekly or monthly
+        dates: First day of each period
+        resource_ids: Resource UUIDs, one per row
+        resource_codes: Resource codes, one per row
+        available_hours: Available hours per resource and period
+        assigned_hours: Assigned hours per resource and period
+        utilization_percent: Utilization per resource and period
+        overallocated: Over-allocation flags per resource and period
+        peak_utilization: Maximum utilization of each resource
+        peak_dates: Period of each resource's peak utilization
+        average_utilization: Average utilization of each resource
+        overallocated_periods: Over-allocated periods of each resource
+    """
+
+    summary: ProgramHistogramSummaryResponse
+    granularity: str
+    dates: list[date]
+    resource_ids: list[UUID]
+    resource_codes: list[str]
+    available_hours: list[list[float]]
+    assigned_hours: list[list[float]]
+    utilization_percent: list[list[float]]
+    overallocated: list[list[bool]]
+    peak_utilization: list[float]
+    peak_dates: list[date | None]
+    average_utilization: list[float]
+    overallocated_periods: list[int]
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from datetime import date  # noqa: TC003
+from typing import Literal
 from uuid import UUID  # noqa: TC003
 
 from pydantic import BaseModel, Field
@@ -150,3 +151,32 @@ class LevelingComparisonResponse(BaseModel):
     parallel: AlgorithmMetrics
     recommendation: str
     improvement: dict[str, int] = Field(default_factory=dict)
+
+
+class LevelingWhatIfRequest(BaseModel):
+    """Request schema for a what-if leveling preview.
+
+    Attributes:
+        algorithm: Leveling algorithm every variant runs
+        variants: Leveling options to try (1-20)
+        snapshot_id: Snapshot id from an earlier preview, to level the
+            same program data again without reloading it
+    """
+
+    algorithm: Literal["serial", "parallel"] = "parallel"
+    variants: list[LevelingOptionsRequest] = Field(min_length=1, max_length=20)
+    snapshot_id: str | None = None
+
+
+class LevelingWhatIfResponse(BaseModel):
+    """Response schema for a what-if leveling preview.
+
+    Attributes:
+        snapshot_id: Content hash of the leveled snapshot
+        algorithm: Leveling algorithm every variant ran
+        results: One result per variant, in request order
+    """
+
+    snapshot_id: str
+    algorithm: str
+    results: list[ParallelLevelingResultResponse]
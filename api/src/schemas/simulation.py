@@ -129,6 +129,24 @@ class SimulationRunRequest(BaseModel):
         default=False,
         description="Include per-activity statistics",
     )
+    chunk_size: int | None = Field(
+        None,
+        ge=100,
+        le=100000,
+        description=(
+            "Evaluate iterations in batches of this size to bound memory and "
+            "report progress (submitted runs default to 1000)"
+        ),
+    )
+    convergence_tolerance: float | None = Field(
+        None,
+        gt=0,
+        lt=1,
+        description=(
+            "Stop early once the 95% confidence interval of P80 is within this "
+            "fraction of P80 (e.g. 0.005 for +/-0.5%)"
+        ),
+    )
 
 
 class DurationResultsSchema(BaseModel):
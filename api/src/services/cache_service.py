@@ -155,6 +155,38 @@ class CacheService:
 
         return success
 
+    async def fill(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[T]],
+        ttl: timedelta | None = None,
+        cache_name: str = "default",
+        *,
+        stale_ttl: timedelta | None = None,
+    ) -> T:
+        """Resolve a cache miss, computing the value at most once.
+
+        Concurrent misses on the key share one computation, also across
+        workers (see CacheManager.fill).
+
+        Args:
+            key: Cache key that missed
+            compute: Async function producing the value (must be JSON serializable)
+            ttl: Time-to-live (optional)
+            cache_name: Name for logging
+            stale_ttl: How long the last value may still be served while it
+                is recomputed in the background (optional)
+
+        Returns:
+            Computed, filled or stale value
+        """
+        ttl_seconds = int(ttl.total_seconds()) if ttl else None
+        stale_seconds = int(stale_ttl.total_seconds()) if stale_ttl else None
+        value: T = await self._manager.fill(key, compute, ttl_seconds, stale_ttl=stale_seconds)
+
+        logger.debug("cache_service_fill", key=key, cache_name=cache_name)
+        return value
+
     async def delete(self, key: str) -> bool:
         """Delete value from cache.
 
@@ -226,17 +258,22 @@ def cached(
     ttl: timedelta | None = None,
     key_prefix: str | None = None,
     skip_first_arg: bool = True,
+    stale_ttl: timedelta | None = None,
 ) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
     """Decorator to cache async function results.
 
     Caches the return value of an async function using the function name
-    and arguments as the cache key.
+    and arguments as the cache key. Concurrent misses on the same key run
+    the function once.
 
     Args:
         cache_name: Name for cache TTL lookup and metrics
         ttl: Optional TTL override (defaults to CACHE_TTL[cache_name])
         key_prefix: Optional key prefix (defaults to function name)
         skip_first_arg: Skip first argument (self) in key generation
+        stale_ttl: Optional time the last result is still returned after it
+            expired or was invalidated, while the function reruns in the
+            background
 
     Returns:
         Decorated function
@@ -271,14 +308,15 @@ def cached(
             if cached_value is not None:
                 return cached_value  # type: ignore[no-any-return]
 
-            # Call function
-            result = await func(*args, **kwargs)
-
-            # Store in cache
+            # Call function once for all concurrent misses, and store the result
             cache_ttl = ttl or CACHE_TTL.get(cache_name, timedelta(minutes=5))
-            await cache.set(cache_key, result, cache_ttl, cache_name)
-
-            return result
+            return await cache.fill(
+                cache_key,
+                lambda: func(*args, **kwargs),
+                cache_ttl,
+                cache_name,
+                stale_ttl=stale_ttl,
+            )
 
         return wrapper
 
@@ -10,17 +10,54 @@ Key concepts:
 - CorrelationMatrix: Full correlation matrix with construction methods
 - CorrelatedSampler: Generate correlated samples using Cholesky decomposition
 
+Correlation matrices are factorized block by block: activities split into
+mutually uncorrelated groups (WBS-derived correlation splits along parent
+WBS elements), each group gets its own Cholesky factor, and factors are
+cached per process by a hash of the block's contents, so re-running the
+same configuration skips the O(n^3) factorization.
+
+CorrelatedSampler.generate_samples can fill the sample matrix from several
+worker processes: rows are produced in fixed-size blocks, each from its
+own SeedSequence child, and written straight into a shared memory output.
+
+transform_to_distributions works on whole blocks of columns of the same
+distribution type. Triangular, uniform and normal transforms are exact.
+PERT quantiles are linearly interpolated from a 513-point table per
+unique (alpha, beta) pair; for modes inside [min, max] they are within
+2e-5 * (max - min) of scipy.stats.beta.ppf.
+
 Per architecture: Probabilistic Analysis Module correlation modeling.
 """
 
+import hashlib
+from collections import OrderedDict, defaultdict
 from collections.abc import Sequence
 from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
 from typing import Any
 from uuid import UUID
 
 import numpy as np
 from numpy.typing import NDArray
-from scipy import stats
+from scipy import special
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from src.services.monte_carlo_parallel import (
+    SharedArrays,
+    SharedArraySpec,
+    attach_shared_arrays,
+    process_pool,
+    resolve_workers,
+    spawn_task_seeds,
+)
+from src.services.monte_carlo_streaming import DEFAULT_CHUNK_SIZE, chunk_sizes
+
+Distributions = dict[UUID, tuple[str, dict[str, Any]]]
+
+# Normal scores at which PERT (beta) quantiles are tabulated; scores
+# beyond the grid clamp to its end points (|z| > 8.5 has probability ~1e-17)
+PERT_QUANTILE_GRID = np.linspace(-8.5, 8.5, 513)
 
 
 @dataclass
@@ -135,27 +172,25 @@ class CorrelationMatrix:
         Returns:
             CorrelationMatrix based on WBS structure
         """
-        n = len(activity_ids)
         activity_ids_list = list(activity_ids)
-        matrix = np.eye(n)
-
-        for i, aid_i in enumerate(activity_ids_list):
-            wbs_i = activity_wbs.get(aid_i, "")
-            for j, aid_j in enumerate(activity_ids_list):
-                if i >= j:
-                    continue
-
-                wbs_j = activity_wbs.get(aid_j, "")
-
-                # Check if same WBS
-                if wbs_i and wbs_j:
-                    if wbs_i == wbs_j:
-                        matrix[i, j] = same_wbs_correlation
-                        matrix[j, i] = same_wbs_correlation
-                    elif _get_parent_wbs(wbs_i) == _get_parent_wbs(wbs_j):
-                        # Siblings under same parent
-                        matrix[i, j] = sibling_wbs_correlation
-                        matrix[j, i] = sibling_wbs_correlation
+        matrix = np.eye(len(activity_ids_list))
+
+        # Group indices by WBS element and by parent element; activities
+        # without a WBS path are uncorrelated
+        by_parent: dict[str, list[int]] = defaultdict(list)
+        by_wbs: dict[str, list[int]] = defaultdict(list)
+        for i, aid in enumerate(activity_ids_list):
+            wbs_path = activity_wbs.get(aid, "")
+            if wbs_path:
+                by_parent[_get_parent_wbs(wbs_path)].append(i)
+                by_wbs[wbs_path].append(i)
+
+        # Siblings under the same parent, then the stronger same-WBS value
+        for members in by_parent.values():
+            matrix[np.ix_(members, members)] = sibling_wbs_correlation
+        for members in by_wbs.values():
+            matrix[np.ix_(members, members)] = same_wbs_correlation
+        np.fill_diagonal(matrix, 1.0)
 
         return cls(activity_ids=activity_ids_list, matrix=matrix)
 
@@ -179,26 +214,27 @@ class CorrelationMatrix:
         Returns:
             CorrelationMatrix based on resource sharing
         """
-        n = len(activity_ids)
         activity_ids_list = list(activity_ids)
-        matrix = np.eye(n)
-
-        for i, aid_i in enumerate(activity_ids_list):
-            resources_i = activity_resources.get(aid_i, set())
-            for j, aid_j in enumerate(activity_ids_list):
-                if i >= j:
-                    continue
-
-                resources_j = activity_resources.get(aid_j, set())
-
-                # Check for shared resources
-                if resources_i and resources_j and resources_i & resources_j:
-                    # Scale correlation by number of shared resources
-                    shared_count = len(resources_i & resources_j)
-                    total_count = len(resources_i | resources_j)
-                    correlation = shared_resource_correlation * (shared_count / total_count)
-                    matrix[i, j] = correlation
-                    matrix[j, i] = correlation
+        resource_sets = [activity_resources.get(aid, set()) for aid in activity_ids_list]
+        columns = {name: k for k, name in enumerate(sorted(set().union(*resource_sets)))}
+
+        # Activity x resource incidence; shared and total counts for every
+        # pair come from one matrix product
+        incidence = np.zeros((len(activity_ids_list), len(columns)))
+        for i, resources in enumerate(resource_sets):
+            incidence[i, [columns[name] for name in resources]] = 1.0
+        shared_count = incidence @ incidence.T
+        resource_count = incidence.sum(axis=1)
+        total_count = resource_count[:, np.newaxis] + resource_count - shared_count
+
+        # Scale correlation by the share of resources in common
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix = np.where(
+                shared_count > 0,
+                shared_resource_correlation * (shared_count / total_count),
+                0.0,
+            )
+        np.fill_diagonal(matrix, 1.0)
 
         return cls(activity_ids=activity_ids_list, matrix=matrix)
 
@@ -228,20 +264,26 @@ class CorrelationMatrix:
         Returns:
             New CorrelationMatrix that is positive definite
         """
-        # Eigenvalue decomposition
-        eigenvalues, eigenvectors = np.linalg.eigh(self.matrix)
-
-        # Adjust negative eigenvalues
-        eigenvalues = np.maximum(eigenvalues, epsilon)
+        return CorrelationMatrix(
+            activity_ids=self.activity_ids.copy(),
+            matrix=_nearest_positive_definite(self.matrix, epsilon),
+        )
 
-        # Reconstruct matrix
-        adjusted = eigenvectors @ np.diag(eigenvalues) @ eigenvectors.T
+    def blocks(self) -> list[NDArray[np.intp]]:
+        """Split activities into mutually uncorrelated groups.
 
-        # Normalize to ensure diagonal is 1.0
-        d = np.sqrt(np.diag(adjusted))
-        adjusted = adjusted / np.outer(d, d)
+        Two activities share a group when they are correlated directly or
+        through a chain of correlated activities, so the matrix is block
+        diagonal over the groups. WBS-derived matrices split along parent
+        WBS elements; activities without correlations form their own group.
 
-        return CorrelationMatrix(activity_ids=self.activity_ids.copy(), matrix=adjusted)
+        Returns:
+            Sorted index arrays, one per group, in order of first activity
+        """
+        _, labels = connected_components(csr_matrix(self.matrix != 0), directed=False)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.cumsum(np.bincount(labels))[:-1]
+        return sorted(np.split(order, bounds), key=lambda members: int(members[0]))
 
     def get_correlation(self, activity_1_id: UUID, activity_2_id: UUID) -> float:
         """Get correlation between two activities.
@@ -299,20 +341,18 @@ class CorrelatedSampler:
             seed: Optional random seed for reproducibility
         """
         self.correlation = correlation_matrix
+        self.seed = seed
         self.rng = np.random.default_rng(seed)
 
-        # Ensure positive definiteness and compute Cholesky decomposition
-        matrix = correlation_matrix.matrix.copy()
+        # Factor each uncorrelated block separately; repeated blocks (same
+        # config re-run, scenario variants, equal-sized WBS groups) come
+        # from the factor cache instead of being refactorized
+        self.factor = factorize_correlation(correlation_matrix)
 
-        # Add small diagonal for numerical stability
-        matrix = matrix + np.eye(len(correlation_matrix.activity_ids)) * 1e-10
-
-        try:
-            self.cholesky = np.linalg.cholesky(matrix)
-        except np.linalg.LinAlgError:
-            # Matrix not positive definite, adjust it
-            adjusted = correlation_matrix.make_positive_definite()
-            self.cholesky = np.linalg.cholesky(adjusted.matrix)
+    @property
+    def cholesky(self) -> NDArray[np.float64]:
+        """Dense lower Cholesky factor (assembled from the block factors)."""
+        return self.factor.dense()
 
     def generate_correlated_samples(
         self,
@@ -333,10 +373,8 @@ class CorrelatedSampler:
         independent = self.rng.standard_normal((n_samples, n_activities))
 
         # Apply Cholesky transformation to induce correlations
-        # correlated = independent @ cholesky.T
-        correlated = independent @ self.cholesky.T
-
-        return correlated
+        # correlated = independent @ cholesky.T, one block at a time
+        return self.factor.apply(independent)
 
     def transform_to_distributions(
         self,
@@ -358,90 +396,411 @@ class CorrelatedSampler:
         Returns:
             Samples transformed to target distributions
         """
-        samples = np.zeros_like(correlated_normals)
-
-        for j, activity_id in enumerate(self.correlation.activity_ids):
-            dist_info = distributions.get(activity_id, ("triangular", {}))
-            dist_type, params = dist_info
-
-            # Convert normal to uniform via normal CDF
-            uniform = stats.norm.cdf(correlated_normals[:, j])
-
-            # Convert uniform to target distribution via inverse CDF
-            if dist_type == "triangular":
-                min_val = params.get("min_value", 0)
-                mode = params.get("mode", 5)
-                max_val = params.get("max_value", 10)
-
-                # Handle edge case where min == max
-                if max_val <= min_val:
-                    samples[:, j] = min_val
-                else:
-                    c = (mode - min_val) / (max_val - min_val)
-                    samples[:, j] = stats.triang.ppf(
-                        uniform, c, loc=min_val, scale=max_val - min_val
-                    )
-
-            elif dist_type == "normal":
-                mean = params.get("mean", 10)
-                std = params.get("std", 2)
-                samples[:, j] = stats.norm.ppf(uniform, loc=mean, scale=std)
-
-            elif dist_type == "uniform":
-                min_val = params.get("min_value", 0)
-                max_val = params.get("max_value", 10)
-
-                if max_val <= min_val:
-                    samples[:, j] = min_val
-                else:
-                    samples[:, j] = stats.uniform.ppf(uniform, loc=min_val, scale=max_val - min_val)
-
-            elif dist_type == "pert":
-                # PERT uses beta distribution
-                min_val = params.get("min_value", 0)
-                mode = params.get("mode", 5)
-                max_val = params.get("max_value", 10)
-                lambda_param = params.get("lambda", 4.0)
-
-                if max_val <= min_val:
-                    samples[:, j] = min_val
-                else:
-                    range_val = max_val - min_val
-                    alpha = 1 + lambda_param * (mode - min_val) / range_val
-                    beta_param = 1 + lambda_param * (max_val - mode) / range_val
-
-                    # Ensure positive shape parameters
-                    alpha = max(alpha, 0.01)
-                    beta_param = max(beta_param, 0.01)
-
-                    samples[:, j] = stats.beta.ppf(uniform, alpha, beta_param)
-                    samples[:, j] = min_val + samples[:, j] * range_val
-
-            else:
-                # Default to uniform [5, 15]
-                samples[:, j] = uniform * 10 + 5
-
-        return samples
+        return _transform_normals(correlated_normals, self.correlation.activity_ids, distributions)
 
     def generate_samples(
         self,
         n_samples: int,
         distributions: dict[UUID, tuple[str, dict[str, Any]]],
+        *,
+        workers: int | None = None,
+        block_size: int = DEFAULT_CHUNK_SIZE,
     ) -> NDArray[np.float64]:
         """Generate correlated samples directly in target distributions.
 
         Convenience method combining generate_correlated_samples and
         transform_to_distributions.
 
+        With workers set, rows are generated in blocks of block_size, block
+        k drawing from child k of SeedSequence(seed). Workers receive the
+        block Cholesky factors once and write their rows into one shared
+        memory matrix, so a seeded call returns the same samples for any worker
+        count (but not the same as the single-stream workers=None path).
+
         Args:
             n_samples: Number of samples to generate
             distributions: Map of activity_id to (dist_type, params)
+            workers: Worker processes (0 = one per CPU, 1 = this process)
+            block_size: Rows per block when workers is set
 
         Returns:
             Samples in target distributions with specified correlations
         """
-        normals = self.generate_correlated_samples(n_samples)
-        return self.transform_to_distributions(normals, distributions)
+        if workers is None:
+            normals = self.generate_correlated_samples(n_samples)
+            return self.transform_to_distributions(normals, distributions)
+
+        workers = resolve_workers(workers)
+        sizes = chunk_sizes(n_samples, block_size)
+        starts = np.concatenate(([0], np.cumsum(sizes, dtype=np.int64))).tolist()
+        row_blocks = list(
+            zip(spawn_task_seeds(self.seed, len(sizes)), starts[:-1], starts[1:], strict=True)
+        )
+        activity_ids = self.correlation.activity_ids
+
+        if workers == 1 or len(row_blocks) < 2:
+            samples = np.empty((n_samples, len(activity_ids)))
+            for seed_sequence, start, stop in row_blocks:
+                _fill_block(
+                    samples, self.factor, activity_ids, distributions, seed_sequence, start, stop
+                )
+            return samples
+
+        with SharedArrays({"samples": np.empty((n_samples, len(activity_ids)))}) as shared:
+            pool = process_pool(
+                min(workers, len(row_blocks)),
+                _init_sampler_worker,
+                (shared.spec, self.factor, activity_ids, distributions),
+            )
+            try:
+                for future in [pool.submit(_sample_block, *block) for block in row_blocks]:
+                    future.result()
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+            return shared.arrays["samples"].copy()
+
+
+@dataclass
+class _SamplerWorkerState:
+    """Per-process inputs of a parallel generate_samples call."""
+
+    shm: SharedMemory
+    factor: "BlockCholesky"
+    samples: NDArray[np.float64]
+    activity_ids: list[UUID]
+    distributions: Distributions
+
+
+_sampler_worker_state: _SamplerWorkerState | None = None
+
+
+def _init_sampler_worker(
+    spec: SharedArraySpec,
+    factor: "BlockCholesky",
+    activity_ids: list[UUID],
+    distributions: Distributions,
+) -> None:
+    """Attach a pool process to the shared output matrix."""
+    global _sampler_worker_state
+    shm, arrays = attach_shared_arrays(spec)
+    _sampler_worker_state = _SamplerWorkerState(
+        shm=shm,
+        factor=factor,
+        samples=arrays["samples"],
+        activity_ids=activity_ids,
+        distributions=distributions,
+    )
+
+
+def _sample_block(seed_sequence: np.random.SeedSequence, start: int, stop: int) -> None:
+    """Generate one block of rows inside a pool process."""
+    state = _sampler_worker_state
+    if state is None:
+        raise RuntimeError("correlated sampler worker was not initialized")
+    _fill_block(
+        state.samples,
+        state.factor,
+        state.activity_ids,
+        state.distributions,
+        seed_sequence,
+        start,
+        stop,
+    )
+
+
+def _fill_block(  # noqa: PLR0917 - mirrors one task's fields
+    samples: NDArray[np.float64],
+    factor: "BlockCholesky",
+    activity_ids: list[UUID],
+    distributions: Distributions,
+    seed_sequence: np.random.SeedSequence,
+    start: int,
+    stop: int,
+) -> None:
+    """Write rows start:stop of samples from the block's own seed stream."""
+    rng = np.random.default_rng(seed_sequence)
+    normals = factor.apply(rng.standard_normal((stop - start, len(activity_ids))))
+    samples[start:stop] = _transform_normals(normals, activity_ids, distributions)
+
+
+def _transform_normals(
+    correlated_normals: NDArray[np.float64],
+    activity_ids: Sequence[UUID],
+    distributions: Distributions,
+) -> NDArray[np.float64]:
+    """Map correlated normals to target distributions, one distribution type at a time.
+
+    Columns are grouped by distribution type and each group is transformed
+    as one block (see the module docstring for the PERT tolerance):
+    - triangular and uniform: closed-form inverse CDFs of the normal CDF
+    - normal: mean + std * z, the exact composition of ppf and cdf
+    - pert: beta quantiles interpolated from one table per unique
+      (alpha, beta) pair, or computed directly for small sample counts
+
+    See CorrelatedSampler.transform_to_distributions.
+    """
+    samples = np.empty_like(correlated_normals)
+    columns: dict[str, list[int]] = defaultdict(list)
+    parameters: dict[str, list[tuple[float, ...]]] = defaultdict(list)
+
+    for j, activity_id in enumerate(activity_ids):
+        dist_type, params = distributions.get(activity_id, ("triangular", {}))
+        if dist_type in {"triangular", "pert"}:
+            values: tuple[float, ...] = (
+                params.get("min_value", 0),
+                params.get("mode", 5),
+                params.get("max_value", 10),
+                params.get("lambda", 4.0),
+            )
+        elif dist_type == "normal":
+            values = (params.get("mean", 10), params.get("std", 2))
+        elif dist_type == "uniform":
+            values = (params.get("min_value", 0), params.get("max_value", 10))
+        else:
+            # Default to uniform [5, 15]
+            dist_type, values = "uniform", (5, 15)
+        columns[dist_type].append(j)
+        parameters[dist_type].append(values)
+
+    for dist_type, cols in columns.items():
+        z = correlated_normals[:, cols]
+        params_t = np.array(parameters[dist_type], dtype=np.float64).T
+        if dist_type == "normal":
+            samples[:, cols] = params_t[0] + params_t[1] * z
+        elif dist_type == "uniform":
+            low, high = params_t
+            samples[:, cols] = low + special.ndtr(z) * np.maximum(high - low, 0.0)
+        elif dist_type == "triangular":
+            samples[:, cols] = _triangular_ppf(special.ndtr(z), *params_t[:3])
+        else:
+            samples[:, cols] = _pert_ppf(z, *params_t)
+
+    return samples
+
+
+def _triangular_ppf(
+    uniform: NDArray[np.float64],
+    low: NDArray[np.float64],
+    mode: NDArray[np.float64],
+    high: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """Closed-form triangular inverse CDF, one column per parameter set."""
+    width = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mode_quantile = (mode - low) / width
+        rising = low + np.sqrt(uniform * width * (mode - low))
+        falling = high - np.sqrt((1.0 - uniform) * width * (high - mode))
+    values: NDArray[np.float64] = np.where(uniform < mode_quantile, rising, falling)
+    # Degenerate ranges collapse to the minimum
+    return np.where(width > 0, values, low)
+
+
+def _pert_ppf(
+    normals: NDArray[np.float64],
+    low: NDArray[np.float64],
+    mode: NDArray[np.float64],
+    high: NDArray[np.float64],
+    lambda_param: NDArray[np.float64],
+) -> NDArray[np.float64]:
+    """PERT inverse CDF evaluated at the normal CDF of each column.
+
+    Beta shape parameters only depend on where the mode sits in the range,
+    so activities often share them; each unique (alpha, beta) pair gets
+    one quantile table over PERT_QUANTILE_GRID, indexed by the normal
+    score directly so no CDF has to be evaluated per sample.
+    """
+    width = high - low
+    with np.errstate(divide="ignore", invalid="ignore"):
+        alpha = np.maximum(1 + lambda_param * (mode - low) / width, 0.01)
+        beta = np.maximum(1 + lambda_param * (high - mode) / width, 0.01)
+
+    degenerate = ~(width > 0)
+    alpha[degenerate] = beta[degenerate] = 1.0
+
+    if normals.shape[0] <= len(PERT_QUANTILE_GRID):
+        unit = special.betaincinv(alpha, beta, special.ndtr(normals))
+    else:
+        pairs, pair_of_column = np.unique(
+            np.column_stack((alpha, beta)), axis=0, return_inverse=True
+        )
+        tables = special.betaincinv(
+            pairs[:, :1], pairs[:, 1:], special.ndtr(PERT_QUANTILE_GRID)[np.newaxis, :]
+        )
+        unit = np.empty_like(normals)
+        for k, table in enumerate(tables):
+            cols = np.flatnonzero(pair_of_column.ravel() == k)
+            unit[:, cols] = np.interp(normals[:, cols], PERT_QUANTILE_GRID, table)
+
+    return np.where(degenerate, low, low + unit * width)
+
+
+@dataclass(frozen=True)
+class BlockCholesky:
+    """Lower Cholesky factor of a block-diagonal correlation matrix.
+
+    Only blocks of two or more activities carry a factor; every other
+    activity is uncorrelated and passes through unchanged.
+
+    Attributes:
+        size: Number of activities
+        blocks: Activity indices of each correlated block
+        factors: Lower Cholesky factor of each block, in block order
+    """
+
+    size: int
+    blocks: tuple[NDArray[np.intp], ...]
+    factors: tuple[NDArray[np.float64], ...]
+
+    def apply(self, normals: NDArray[np.float64]) -> NDArray[np.float64]:
+        """Correlate independent normals, i.e. compute normals @ L.T.
+
+        Args:
+            normals: Independent standard normals, shape (n_samples, size)
+
+        Returns:
+            Correlated normals of the same shape
+        """
+        correlated = normals.copy()
+        for members, factor in zip(self.blocks, self.factors, strict=True):
+            correlated[:, members] = normals[:, members] @ factor.T
+        return correlated
+
+    def dense(self) -> NDArray[np.float64]:
+        """Assemble the full lower-triangular factor."""
+        lower = np.eye(self.size)
+        for members, factor in zip(self.blocks, self.factors, strict=True):
+            lower[np.ix_(members, members)] = factor
+        return lower
+
+
+class CholeskyFactorCache:
+    """
+    LRU cache of Cholesky factors keyed by a hash of the factored block.
+
+    The key covers the block's shape and values in activity order, so the
+    same correlation structure (a re-run config, an unchanged part of a
+    scenario variant, equal WBS groups) is factorized once per process.
+    Entries are evicted least recently used first once their total size
+    exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: Maximum total size of cached factors
+        """
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._factors: OrderedDict[str, NDArray[np.float64]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Number of cached factors."""
+        return len(self._factors)
+
+    @staticmethod
+    def key(block: NDArray[np.float64]) -> str:
+        """Content hash of a correlation block."""
+        digest = hashlib.sha256(str(block.shape).encode())
+        digest.update(np.ascontiguousarray(block, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> NDArray[np.float64] | None:
+        """Get a cached factor, marking it recently used."""
+        factor = self._factors.get(key)
+        if factor is not None:
+            self._factors.move_to_end(key)
+        return factor
+
+    def put(self, key: str, factor: NDArray[np.float64]) -> None:
+        """Store a factor, evicting the least recently used over the size limit."""
+        previous = self._factors.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._factors[key] = factor
+        self._bytes += factor.nbytes
+        while self._bytes > self._max_bytes and len(self._factors) > 1:
+            _, evicted = self._factors.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Drop all cached factors."""
+        self._factors.clear()
+        self._bytes = 0
+
+
+# Global per-process factor cache
+cholesky_factor_cache = CholeskyFactorCache()
+
+
+def factorize_correlation(
+    correlation: CorrelationMatrix,
+    cache: CholeskyFactorCache | None = None,
+) -> BlockCholesky:
+    """Cholesky-factor a correlation matrix block by block.
+
+    Each block from CorrelationMatrix.blocks() is factorized on its own,
+    costing O(sum of block sizes cubed) instead of O(n^3). Blocks that are
+    not positive definite are adjusted as in make_positive_definite, which
+    per block gives the same result as adjusting the whole matrix.
+
+    Args:
+        correlation: Correlation matrix to factor
+        cache: Factor cache (defaults to the global cholesky_factor_cache)
+
+    Returns:
+        BlockCholesky for the matrix
+    """
+    if cache is None:
+        cache = cholesky_factor_cache
+
+    blocks: list[NDArray[np.intp]] = []
+    factors: list[NDArray[np.float64]] = []
+    for members in correlation.blocks():
+        if len(members) < 2:
+            continue
+        block = correlation.matrix[np.ix_(members, members)]
+        key = cache.key(block)
+        factor = cache.get(key)
+        if factor is None:
+            factor = _cholesky_factor(block)
+            cache.put(key, factor)
+        blocks.append(members)
+        factors.append(factor)
+
+    return BlockCholesky(
+        size=len(correlation.activity_ids),
+        blocks=tuple(blocks),
+        factors=tuple(factors),
+    )
+
+
+def _cholesky_factor(block: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Lower Cholesky factor of one block, adjusting it if not positive definite."""
+    try:
+        # Add small diagonal for numerical stability
+        factor = np.linalg.cholesky(block + np.eye(len(block)) * 1e-10)
+    except np.linalg.LinAlgError:
+        factor = np.linalg.cholesky(_nearest_positive_definite(block, 1e-6))
+    return np.asarray(factor, dtype=np.float64)
+
+
+def _nearest_positive_definite(matrix: NDArray[np.float64], epsilon: float) -> NDArray[np.float64]:
+    """Clip eigenvalues to epsilon and rescale to a unit diagonal."""
+    # Eigenvalue decomposition
+    eigenvalues, eigenvectors = np.linalg.eigh(matrix)
+
+    # Adjust negative eigenvalues
+    eigenvalues = np.maximum(eigenvalues, epsilon)
+
+    # Reconstruct matrix
+    adjusted = eigenvectors @ np.diag(eigenvalues) @ eigenvectors.T
+
+    # Normalize to ensure diagonal is 1.0
+    d = np.sqrt(np.diag(adjusted))
+    normalized: NDArray[np.float64] = adjusted / np.outer(d, d)
+    return normalized
 
 
 def _get_parent_wbs(wbs_path: str) -> str:
@@ -1,16 +1,25 @@
 """Critical Path Method (CPM) scheduling engine."""
 
+import operator
+from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
+from typing import Any
 from uuid import UUID
 
-import networkx as nx
-
-from src.core.exceptions import CircularDependencyError, ScheduleCalculationError
+from src.core.exceptions import CircularDependencyError
 from src.models.activity import Activity
-from src.models.dependency import Dependency, DependencyType
-
-
-@dataclass
+from src.models.dependency import Dependency
+from src.schemas.activity import ScheduleResult as ScheduleResultSchema
+from src.services.cpm_network import (
+    DEP_FF,
+    DEP_FS,
+    DEP_SS,
+    CompiledNetwork,
+    compile_network,
+)
+
+
+@dataclass(slots=True)
 class ScheduleResult:
     """Result of CPM calculation for a single activity."""
 
@@ -28,6 +37,57 @@ class ScheduleResult:
         return self.total_float == 0
 
 
+def schedule_results_to_schema(results: dict[UUID, ScheduleResult]) -> list[ScheduleResultSchema]:
+    """
+    Convert CPM results to their API and cached form.
+
+    Used by the schedule endpoint and by dashboard cache warm-up, so both
+    produce the same cached entry.
+
+    Args:
+        results: CPMEngine.calculate() results
+
+    Returns:
+        One ScheduleResult schema per activity
+    """
+    return [
+        ScheduleResultSchema(
+            activity_id=r.activity_id,
+            early_start=r.early_start,
+            early_finish=r.early_finish,
+            late_start=r.late_start,
+            late_finish=r.late_finish,
+            total_float=r.total_float,
+            free_float=r.free_float,
+            is_critical=r.is_critical,
+        )
+        for r in results.values()
+    ]
+
+
+def apply_schedule_results(
+    activities: Iterable[Activity], results: Mapping[UUID, ScheduleResult]
+) -> None:
+    """
+    Write total float, free float and criticality back to activities.
+
+    Leveling and over-allocation detection read these columns, so every
+    path that produces CPM results for a program (the schedule endpoints
+    and dashboard cache warm-up) stores them. Activities without a result
+    are left unchanged. The caller commits.
+
+    Args:
+        activities: Activities of the calculated program
+        results: CPM results by activity ID
+    """
+    for activity in activities:
+        result = results.get(activity.id)
+        if result is not None:
+            activity.total_float = result.total_float
+            activity.free_float = result.free_float
+            activity.is_critical = result.is_critical
+
+
 class CPMEngine:
     """
     Critical Path Method scheduling engine.
@@ -51,41 +111,29 @@ class CPMEngine:
         """
         Initialize CPM engine with activities and dependencies.
 
+        The network is compiled once into integer-indexed CSR arrays
+        (see cpm_network) and reused by every pass.
+
         Args:
             activities: List of activities to schedule
             dependencies: List of dependencies between activities
         """
         self.activities = {a.id: a for a in activities}
         self.dependencies = dependencies
-        self.graph = self._build_graph()
+        self.network: CompiledNetwork = compile_network(list(self.activities), dependencies)
+        self.durations: list[Any] = [a.duration for a in self.activities.values()]
         self.results: dict[UUID, ScheduleResult] = {}
 
-    def _build_graph(self) -> nx.DiGraph:
-        """Build directed graph from activities and dependencies."""
-        graph = nx.DiGraph()
-
-        # Add all activities as nodes
-        for activity_id, activity in self.activities.items():
-            graph.add_node(activity_id, duration=activity.duration)
-
-        # Add dependencies as edges
-        for dep in self.dependencies:
-            graph.add_edge(
-                dep.predecessor_id,
-                dep.successor_id,
-                dependency_type=dep.dependency_type,
-                lag=dep.lag,
-            )
-
-        return graph
+        # Per-node pass results, indexed like network.activity_ids
+        self._es: list[Any] = []
+        self._ef: list[Any] = []
+        self._ls: list[Any] = []
+        self._lf: list[Any] = []
+        self._fs_successor_es: list[Any] = []
 
     def _detect_cycles(self) -> list[UUID]:
         """Detect and return cycle path if present."""
-        try:
-            cycle = nx.find_cycle(self.graph)
-            return [edge[0] for edge in cycle] + [cycle[-1][1]]
-        except nx.NetworkXNoCycle:
-            return []
+        return list(self.network.cycle)
 
     def calculate(self) -> dict[UUID, ScheduleResult]:
         """
@@ -96,13 +144,15 @@ class CPMEngine:
 
         Raises:
             CircularDependencyError: If dependency graph contains cycles
-            ScheduleCalculationError: If calculation fails
         """
         # Check for cycles
         cycle_path = self._detect_cycles()
         if cycle_path:
             raise CircularDependencyError(cycle_path)
 
+        if not self.activities:
+            return self.results
+
         # Perform forward and backward passes
         self._forward_pass()
         self._backward_pass()
@@ -117,63 +167,42 @@ class CPMEngine:
         Processes activities in topological order to ensure predecessors
         are calculated before successors.
         """
-        # Initialize results with zero ES for all activities
-        for activity_id, activity in self.activities.items():
-            self.results[activity_id] = ScheduleResult(
-                activity_id=activity_id,
-                early_start=0,
-                early_finish=activity.duration,
-                late_start=0,
-                late_finish=0,
-                total_float=0,
-                free_float=0,
-            )
-
-        # Process in topological order
-        try:
-            order = list(nx.topological_sort(self.graph))
-        except nx.NetworkXUnfeasible as e:
-            raise ScheduleCalculationError(
-                "Could not determine activity order",
-                "TOPOLOGICAL_SORT_FAILED",
-            ) from e
-
-        for activity_id in order:
-            activity = self.activities[activity_id]
+        net = self.network.lists
+        ptr, idx, types, lags = net.pred_ptr, net.pred_idx, net.pred_type, net.pred_lag
+        durations = self.durations
+        es: list[Any] = [0] * len(durations)
+        ef: list[Any] = list(durations)
+
+        for v in net.order:
+            duration = durations[v]
             max_es = 0
 
-            # Check all predecessor dependencies
-            for pred_id in self.graph.predecessors(activity_id):
-                edge_data = self.graph.edges[pred_id, activity_id]
-                dep_type = edge_data["dependency_type"]
-                lag = edge_data["lag"]
-
-                pred_result = self.results[pred_id]
+            for k in range(ptr[v], ptr[v + 1]):
+                u = idx[k]
+                dep_type = types[k]
 
                 # Calculate ES based on dependency type
-                match dep_type:
-                    case DependencyType.FS.value:
-                        # Successor starts after predecessor finishes
-                        es = pred_result.early_finish + lag
-                    case DependencyType.SS.value:
-                        # Successor starts after predecessor starts
-                        es = pred_result.early_start + lag
-                    case DependencyType.FF.value:
-                        # Successor finishes after predecessor finishes (adjust for duration)
-                        es = pred_result.early_finish + lag - activity.duration
-                    case DependencyType.SF.value:
-                        # Successor finishes after predecessor starts (adjust for duration)
-                        es = pred_result.early_start + lag - activity.duration
-                    case _:
-                        es = pred_result.early_finish + lag
-
-                max_es = max(max_es, es)
-
-            # Ensure ES is not negative
-            max_es = max(0, max_es)
-
-            self.results[activity_id].early_start = max_es
-            self.results[activity_id].early_finish = max_es + activity.duration
+                if dep_type == DEP_FS:
+                    # Successor starts after predecessor finishes
+                    start = ef[u] + lags[k]
+                elif dep_type == DEP_SS:
+                    # Successor starts after predecessor starts
+                    start = es[u] + lags[k]
+                elif dep_type == DEP_FF:
+                    # Successor finishes after predecessor finishes (adjust for duration)
+                    start = ef[u] + lags[k] - duration
+                else:
+                    # Successor finishes after predecessor starts (adjust for duration)
+                    start = es[u] + lags[k] - duration
+
+                if start > max_es:  # noqa: PLR1730 - avoids a max() call per edge
+                    max_es = start
+
+            es[v] = max_es
+            ef[v] = max_es + duration
+
+        self._es = es
+        self._ef = ef
 
     def _backward_pass(self) -> None:
         """
@@ -181,79 +210,78 @@ class CPMEngine:
 
         Processes activities in reverse topological order.
         """
-        # Find project end (maximum EF)
-        project_end = max(r.early_finish for r in self.results.values())
-
-        # Initialize LF for all activities to project end
-        for result in self.results.values():
-            result.late_finish = project_end
-            activity = self.activities[result.activity_id]
-            result.late_start = project_end - activity.duration
+        net = self.network.lists
+        ptr, idx, types, lags = net.succ_ptr, net.succ_idx, net.succ_type, net.succ_lag
+        durations = self.durations
 
-        # Process in reverse topological order
-        order = list(reversed(list(nx.topological_sort(self.graph))))
+        # Find project end (maximum EF)
+        project_end = max(self._ef)
 
-        for activity_id in order:
-            activity = self.activities[activity_id]
-            min_lf = self.results[activity_id].late_finish
+        lf: list[Any] = [project_end] * len(durations)
+        ls: list[Any] = [project_end - d for d in durations]
+        es = self._es
+        # Earliest FS successor start (less lag), collected for free float
+        fs_successor_es: list[Any] = [None] * len(durations)
 
-            # Check all successor dependencies
-            for succ_id in self.graph.successors(activity_id):
-                edge_data = self.graph.edges[activity_id, succ_id]
-                dep_type = edge_data["dependency_type"]
-                lag = edge_data["lag"]
+        for u in reversed(net.order):
+            duration = durations[u]
+            min_lf = project_end
+            min_successor_es = None
 
-                succ_result = self.results[succ_id]
+            for k in range(ptr[u], ptr[u + 1]):
+                v = idx[k]
+                dep_type = types[k]
 
                 # Calculate LF based on dependency type
-                match dep_type:
-                    case DependencyType.FS.value:
-                        # Predecessor finishes before successor starts
-                        lf = succ_result.late_start - lag
-                    case DependencyType.SS.value:
-                        # Predecessor starts before successor starts (adjust for duration)
-                        lf = succ_result.late_start - lag + activity.duration
-                    case DependencyType.FF.value:
-                        # Predecessor finishes before successor finishes
-                        lf = succ_result.late_finish - lag
-                    case DependencyType.SF.value:
-                        # Predecessor starts before successor finishes (adjust for duration)
-                        lf = succ_result.late_finish - lag + activity.duration
-                    case _:
-                        lf = succ_result.late_start - lag
-
-                min_lf = min(min_lf, lf)
-
-            self.results[activity_id].late_finish = min_lf
-            self.results[activity_id].late_start = min_lf - activity.duration
+                if dep_type == DEP_FS:
+                    # Predecessor finishes before successor starts
+                    finish = ls[v] - lags[k]
+                    candidate = es[v] - lags[k]
+                    if min_successor_es is None or candidate < min_successor_es:
+                        min_successor_es = candidate
+                elif dep_type == DEP_SS:
+                    # Predecessor starts before successor starts (adjust for duration)
+                    finish = ls[v] - lags[k] + duration
+                elif dep_type == DEP_FF:
+                    # Predecessor finishes before successor finishes
+                    finish = lf[v] - lags[k]
+                else:
+                    # Predecessor starts before successor finishes (adjust for duration)
+                    finish = lf[v] - lags[k] + duration
+
+                if finish < min_lf:  # noqa: PLR1730 - avoids a min() call per edge
+                    min_lf = finish
+
+            lf[u] = min_lf
+            ls[u] = min_lf - duration
+            fs_successor_es[u] = min_successor_es
+
+        self._ls = ls
+        self._lf = lf
+        self._fs_successor_es = fs_successor_es
 
     def _calculate_float(self) -> None:
-        """Calculate total float and free float for all activities."""
-        for activity_id, result in self.results.items():
-            # Total float = LS - ES = LF - EF
-            result.total_float = result.late_start - result.early_start
-
-            # Free float = min(successor.ES) - EF (for FS dependencies)
-            min_successor_es = float("inf")
-
-            for succ_id in self.graph.successors(activity_id):
-                edge_data = self.graph.edges[activity_id, succ_id]
-                dep_type = edge_data["dependency_type"]
-                lag = edge_data["lag"]
-
-                succ_result = self.results[succ_id]
-
-                if dep_type == DependencyType.FS.value:
-                    min_successor_es = min(
-                        min_successor_es,
-                        succ_result.early_start - lag,
-                    )
-
-            if min_successor_es == float("inf"):
-                # No successors, free float equals total float
-                result.free_float = result.total_float
-            else:
-                result.free_float = int(min_successor_es) - result.early_finish
+        """Calculate total float and free float and build ScheduleResults."""
+        es, ef, ls, lf = self._es, self._ef, self._ls, self._lf
+        ids = self.network.activity_ids
+
+        # Total float = LS - ES = LF - EF
+        total_float = list(map(operator.sub, ls, es))
+
+        # Free float = min(successor.ES) - EF (for FS dependencies);
+        # with no FS successors, free float equals total float
+        free_float = [
+            tf if succ_es is None else succ_es - finish
+            for tf, succ_es, finish in zip(total_float, self._fs_successor_es, ef, strict=True)
+        ]
+
+        self.results = dict(
+            zip(
+                ids,
+                map(ScheduleResult, ids, es, ef, ls, lf, total_float, free_float),
+                strict=True,
+            )
+        )
 
     def get_critical_path(self) -> list[UUID]:
         """
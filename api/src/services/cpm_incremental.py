@@ -0,0 +1,627 @@
+"""Incremental CPM recalculation for single-activity and single-dependency edits.
+
+A full CPM run visits every activity and dependency twice. After a single
+duration, lag or edge change, only the downstream cone of the edit can see
+different early dates and only the upstream cone can see different late
+dates (unless the project end moves). IncrementalCPMEngine keeps the last
+solved network for a program and re-propagates through those cones only,
+returning just the activities whose ES/EF/LS/LF/float changed.
+
+ScheduleStateStore keeps one solved engine per program in process memory so
+repeated edits from the UI reuse it, together with the program's schedule
+revision at the time it was solved, so an unchanged program can be
+answered without reading its network.
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from src.core.exceptions import CircularDependencyError
+from src.services.cpm import CPMEngine, ScheduleResult
+from src.services.cpm_network import (
+    DEP_FF,
+    DEP_FS,
+    DEP_SS,
+    dependency_type_code,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from uuid import UUID
+
+logger = structlog.get_logger(__name__)
+
+# Edge attributes stored per adjacency entry: (dependency type code, lag)
+Edge = tuple[int, Any]
+
+
+class IncrementalCPMEngine:
+    """
+    CPM engine that keeps its solved state and updates it incrementally.
+
+    The initial solve is a normal CPMEngine run. Afterwards:
+    - set_duration / set_dependency / remove_dependency apply one edit
+      and re-propagate only through the affected cones
+    - apply_snapshot diffs a freshly loaded program against the stored
+      state and applies the differences as incremental edits
+
+    Each edit returns only the ScheduleResults that changed.
+
+    Example:
+        engine = IncrementalCPMEngine(activities, dependencies)
+        changed = engine.set_duration(activity_id, 12)
+    """
+
+    def __init__(
+        self,
+        activities: Sequence[Any],
+        dependencies: Iterable[Any],
+    ) -> None:
+        """
+        Solve the network from scratch and keep the solved state.
+
+        Args:
+            activities: Activities with id and duration
+            dependencies: Dependencies between the activities
+
+        Raises:
+            CircularDependencyError: If the network contains a cycle
+        """
+        engine = CPMEngine(list(activities), list(dependencies))
+        engine.calculate()
+        self._load(engine)
+
+    @classmethod
+    def from_engine(cls, engine: CPMEngine) -> IncrementalCPMEngine:
+        """
+        Build an incremental engine from an already calculated CPMEngine.
+
+        Args:
+            engine: CPMEngine whose calculate() has been run
+
+        Returns:
+            IncrementalCPMEngine sharing the engine's solved values
+        """
+        if not engine.results and engine.activities:
+            engine.calculate()
+        instance = cls.__new__(cls)
+        instance._load(engine)
+        return instance
+
+    def _load(self, engine: CPMEngine) -> None:
+        """Copy the solved state out of a calculated CPMEngine."""
+        network = engine.network
+        net = network.lists
+        n = network.size
+
+        self._ids: list[UUID] = list(network.activity_ids)
+        self._index: dict[UUID, int] = dict(network.index)
+        self._durations: list[Any] = list(engine.durations)
+
+        # Mutable adjacency: node -> {neighbour: (type code, lag)}
+        self._preds: list[dict[int, Edge]] = [{} for _ in range(n)]
+        self._succs: list[dict[int, Edge]] = [{} for _ in range(n)]
+        for v in range(n):
+            for k in range(net.pred_ptr[v], net.pred_ptr[v + 1]):
+                u = net.pred_idx[k]
+                edge = (net.pred_type[k], net.pred_lag[k])
+                self._preds[v][u] = edge
+                self._succs[u][v] = edge
+
+        self._order: list[int] = list(net.order)
+        self._pos: list[int] = [0] * n
+        for rank, v in enumerate(self._order):
+            self._pos[v] = rank
+
+        if n:
+            self._es = list(engine._es)
+            self._ef = list(engine._ef)
+            self._ls = list(engine._ls)
+            self._lf = list(engine._lf)
+            self._project_end = max(self._ef)
+        else:
+            self._es, self._ef, self._ls, self._lf = [], [], [], []
+            self._project_end = 0
+
+        self._results: dict[UUID, ScheduleResult] = dict(engine.results)
+
+    @property
+    def results(self) -> dict[UUID, ScheduleResult]:
+        """Current schedule results for every activity."""
+        return self._results
+
+    @property
+    def project_duration(self) -> Any:
+        """Current project duration (maximum early finish)."""
+        return self._project_end
+
+    @property
+    def activity_ids(self) -> list[UUID]:
+        """Activity IDs in node order."""
+        return self._ids
+
+    # ------------------------------------------------------------------
+    # Single edits
+    # ------------------------------------------------------------------
+
+    def set_duration(self, activity_id: UUID, duration: Any) -> dict[UUID, ScheduleResult]:
+        """
+        Change one activity's duration.
+
+        Args:
+            activity_id: Activity to change
+            duration: New duration in working days
+
+        Returns:
+            ScheduleResults that changed, keyed by activity ID
+        """
+        v = self._index[activity_id]
+        if self._durations[v] == duration:
+            return {}
+        self._durations[v] = duration
+        return self._propagate(forward_seeds={v}, backward_seeds={v})
+
+    def set_dependency(
+        self,
+        predecessor_id: UUID,
+        successor_id: UUID,
+        dependency_type: Any = DEP_FS,
+        lag: Any = 0,
+    ) -> dict[UUID, ScheduleResult]:
+        """
+        Add a dependency, or change the type/lag of an existing one.
+
+        Args:
+            predecessor_id: Predecessor activity
+            successor_id: Successor activity
+            dependency_type: DependencyType, its string value, or a type code
+            lag: Lag in working days (negative for lead)
+
+        Returns:
+            ScheduleResults that changed, keyed by activity ID
+
+        Raises:
+            CircularDependencyError: If the edge would create a cycle; the
+                stored state is left unchanged
+        """
+        u = self._index[predecessor_id]
+        v = self._index[successor_id]
+        code = dependency_type if isinstance(dependency_type, int) else None
+        edge = (code if code is not None else dependency_type_code(dependency_type), lag)
+
+        existing = self._succs[u].get(v)
+        if existing == edge:
+            return {}
+
+        if existing is None:
+            self._check_new_edge(u, v)
+
+        self._succs[u][v] = edge
+        self._preds[v][u] = edge
+
+        if existing is None and self._pos[u] > self._pos[v]:
+            self._reorder()
+
+        return self._propagate(forward_seeds={v}, backward_seeds={u}, free_float_seeds={u})
+
+    def remove_dependency(
+        self,
+        predecessor_id: UUID,
+        successor_id: UUID,
+    ) -> dict[UUID, ScheduleResult]:
+        """
+        Remove a dependency.
+
+        Args:
+            predecessor_id: Predecessor activity
+            successor_id: Successor activity
+
+        Returns:
+            ScheduleResults that changed, keyed by activity ID
+        """
+        u = self._index[predecessor_id]
+        v = self._index[successor_id]
+        if v not in self._succs[u]:
+            return {}
+
+        del self._succs[u][v]
+        del self._preds[v][u]
+        # Removing an edge never invalidates the topological order
+        return self._propagate(forward_seeds={v}, backward_seeds={u}, free_float_seeds={u})
+
+    # ------------------------------------------------------------------
+    # Snapshot diff
+    # ------------------------------------------------------------------
+
+    def apply_snapshot(
+        self,
+        activities: Sequence[Any],
+        dependencies: Iterable[Any],
+    ) -> tuple[dict[UUID, ScheduleResult], bool]:
+        """
+        Bring the stored state in line with a freshly loaded program.
+
+        Duration and dependency differences are applied as incremental
+        edits. If activities were added or removed, the network is solved
+        from scratch instead.
+
+        Args:
+            activities: Current activities of the program
+            dependencies: Current dependencies of the program
+
+        Returns:
+            Tuple of (changed results, whether a full recalculation ran)
+
+        Raises:
+            CircularDependencyError: If the new network contains a cycle
+        """
+        activities = list(activities)
+        if len(activities) != len(self._ids) or any(a.id not in self._index for a in activities):
+            return self._rebuild(activities, dependencies), True
+
+        changed: dict[UUID, ScheduleResult] = {}
+
+        # Edge diff: (pred, succ) -> (type code, lag)
+        new_edges: dict[tuple[int, int], Edge] = {}
+        index = self._index
+        for dep in dependencies:
+            u = index.get(dep.predecessor_id)
+            v = index.get(dep.successor_id)
+            if u is None or v is None:
+                continue
+            new_edges[(u, v)] = (dependency_type_code(dep.dependency_type), dep.lag)
+
+        ids = self._ids
+        removed = [
+            (u, v) for u, succs in enumerate(self._succs) for v in succs if (u, v) not in new_edges
+        ]
+        for u, v in removed:
+            changed.update(self.remove_dependency(ids[u], ids[v]))
+
+        for (u, v), (code, lag) in new_edges.items():
+            if self._succs[u].get(v) != (code, lag):
+                changed.update(self.set_dependency(ids[u], ids[v], code, lag))
+
+        for activity in activities:
+            if self._durations[index[activity.id]] != activity.duration:
+                changed.update(self.set_duration(activity.id, activity.duration))
+
+        # An activity may have changed and then changed back across edits
+        changed = {aid: self._results[aid] for aid in changed}
+        return changed, False
+
+    def _rebuild(
+        self,
+        activities: Sequence[Any],
+        dependencies: Iterable[Any],
+    ) -> dict[UUID, ScheduleResult]:
+        """Solve from scratch and return results that differ from before."""
+        previous = self._results
+        engine = CPMEngine(list(activities), list(dependencies))
+        engine.calculate()
+        self._load(engine)
+        return {aid: result for aid, result in self._results.items() if previous.get(aid) != result}
+
+    # ------------------------------------------------------------------
+    # Propagation
+    # ------------------------------------------------------------------
+
+    def _propagate(
+        self,
+        forward_seeds: set[int],
+        backward_seeds: set[int],
+        free_float_seeds: set[int] | None = None,
+    ) -> dict[UUID, ScheduleResult]:
+        """
+        Re-propagate early dates downstream and late dates upstream.
+
+        Args:
+            forward_seeds: Nodes whose early dates must be recomputed
+            backward_seeds: Nodes whose late dates must be recomputed
+            free_float_seeds: Extra nodes whose free float may have changed
+
+        Returns:
+            ScheduleResults that changed, keyed by activity ID
+        """
+        forward_changed = self._forward(forward_seeds)
+
+        new_end = max(self._ef)
+        if new_end != self._project_end:
+            # Every late date is anchored to the project end
+            self._project_end = new_end
+            backward_changed = self._full_backward()
+        else:
+            backward_changed = self._backward(backward_seeds)
+
+        # Free float of a node depends on its FS successors' early start
+        touched = forward_changed | backward_changed | (free_float_seeds or set())
+        for v in forward_changed:
+            touched.update(self._preds[v])
+
+        return self._refresh_results(touched)
+
+    def _forward(self, seeds: set[int]) -> set[int]:
+        """Forward pass limited to the downstream cone of the seeds."""
+        es, ef, durations, pos = self._es, self._ef, self._durations, self._pos
+        heap = [(pos[v], v) for v in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        changed: set[int] = set()
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            duration = durations[v]
+            max_es = 0
+            for u, (dep_type, lag) in self._preds[v].items():
+                if dep_type == DEP_FS:
+                    start = ef[u] + lag
+                elif dep_type == DEP_SS:
+                    start = es[u] + lag
+                elif dep_type == DEP_FF:
+                    start = ef[u] + lag - duration
+                else:
+                    start = es[u] + lag - duration
+                if start > max_es:  # noqa: PLR1730 - avoids a max() call per edge
+                    max_es = start
+
+            if max_es == es[v] and max_es + duration == ef[v]:
+                continue
+
+            es[v] = max_es
+            ef[v] = max_es + duration
+            changed.add(v)
+            for w in self._succs[v]:
+                if w not in queued:
+                    queued.add(w)
+                    heapq.heappush(heap, (pos[w], w))
+
+        return changed
+
+    def _backward(self, seeds: set[int]) -> set[int]:
+        """Backward pass limited to the upstream cone of the seeds."""
+        ls, lf, durations, pos = self._ls, self._lf, self._durations, self._pos
+        heap = [(-pos[u], u) for u in seeds]
+        heapq.heapify(heap)
+        queued = set(seeds)
+        changed: set[int] = set()
+
+        while heap:
+            _, u = heapq.heappop(heap)
+            min_lf = self._late_finish(u)
+            if min_lf == lf[u] and min_lf - durations[u] == ls[u]:
+                continue
+
+            lf[u] = min_lf
+            ls[u] = min_lf - durations[u]
+            changed.add(u)
+            for p in self._preds[u]:
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, (-pos[p], p))
+
+        return changed
+
+    def _full_backward(self) -> set[int]:
+        """Backward pass over every node, used when the project end moves."""
+        ls, lf, durations = self._ls, self._lf, self._durations
+        changed: set[int] = set()
+        for u in reversed(self._order):
+            min_lf = self._late_finish(u)
+            if min_lf != lf[u] or min_lf - durations[u] != ls[u]:
+                lf[u] = min_lf
+                ls[u] = min_lf - durations[u]
+                changed.add(u)
+        return changed
+
+    def _late_finish(self, u: int) -> Any:
+        """Late finish of node u from its successors' late dates."""
+        ls, lf = self._ls, self._lf
+        duration = self._durations[u]
+        min_lf = self._project_end
+        for v, (dep_type, lag) in self._succs[u].items():
+            if dep_type == DEP_FS:
+                finish = ls[v] - lag
+            elif dep_type == DEP_SS:
+                finish = ls[v] - lag + duration
+            elif dep_type == DEP_FF:
+                finish = lf[v] - lag
+            else:
+                finish = lf[v] - lag + duration
+            if finish < min_lf:  # noqa: PLR1730 - avoids a min() call per edge
+                min_lf = finish
+        return min_lf
+
+    def _refresh_results(self, nodes: set[int]) -> dict[UUID, ScheduleResult]:
+        """Rebuild ScheduleResults for nodes and return those that changed."""
+        es, ef, ls, lf = self._es, self._ef, self._ls, self._lf
+        changed: dict[UUID, ScheduleResult] = {}
+
+        for u in nodes:
+            total_float = ls[u] - es[u]
+            min_successor_es = None
+            for v, (dep_type, lag) in self._succs[u].items():
+                if dep_type == DEP_FS:
+                    candidate = es[v] - lag
+                    if min_successor_es is None or candidate < min_successor_es:
+                        min_successor_es = candidate
+            free_float = total_float if min_successor_es is None else int(min_successor_es) - ef[u]
+
+            activity_id = self._ids[u]
+            result = ScheduleResult(
+                activity_id=activity_id,
+                early_start=es[u],
+                early_finish=ef[u],
+                late_start=ls[u],
+                late_finish=lf[u],
+                total_float=total_float,
+                free_float=free_float,
+            )
+            if self._results.get(activity_id) != result:
+                self._results[activity_id] = result
+                changed[activity_id] = result
+
+        return changed
+
+    # ------------------------------------------------------------------
+    # Topological order maintenance
+    # ------------------------------------------------------------------
+
+    def _check_new_edge(self, u: int, v: int) -> None:
+        """
+        Raise CircularDependencyError if adding u -> v closes a cycle.
+
+        Only nodes ranked no later than u can reach u, so the search from
+        v is bounded by u's position in the current order.
+        """
+        if u == v:
+            raise CircularDependencyError([self._ids[u], self._ids[u]])
+        if self._pos[u] > self._pos[v]:
+            limit = self._pos[u]
+            parent: dict[int, int] = {v: v}
+            stack = [v]
+            while stack:
+                node = stack.pop()
+                if node == u:
+                    path = [u]
+                    while path[-1] != v:
+                        path.append(parent[path[-1]])
+                    cycle = [u, *reversed(path)]
+                    raise CircularDependencyError([self._ids[i] for i in cycle])
+                for w in self._succs[node]:
+                    if w not in parent and self._pos[w] <= limit:
+                        parent[w] = node
+                        stack.append(w)
+
+    def _reorder(self) -> None:
+        """Recompute the topological order after an out-of-order edge insert."""
+        n = len(self._ids)
+        in_degree = [len(preds) for preds in self._preds]
+        order = [v for v in range(n) if in_degree[v] == 0]
+        head = 0
+        while head < len(order):
+            u = order[head]
+            head += 1
+            for v in self._succs[u]:
+                in_degree[v] -= 1
+                if in_degree[v] == 0:
+                    order.append(v)
+
+        self._order = order
+        for rank, v in enumerate(order):
+            self._pos[v] = rank
+
+
+class ScheduleStateStore:
+    """
+    In-process LRU store of solved IncrementalCPMEngine instances.
+
+    Keyed by program ID. Each worker keeps its own store. An engine is
+    stored with the schedule revision (Program.schedule_revision) read
+    before its network was loaded; the revision is bumped by every edit
+    in any worker, so get_current only returns engines no edit has
+    outdated, and apply_snapshot picks up the rest by diffing against the
+    database.
+    """
+
+    def __init__(self, max_programs: int = 32) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            max_programs: Maximum number of programs kept in memory
+        """
+        self._max_programs = max_programs
+        self._engines: OrderedDict[UUID, IncrementalCPMEngine] = OrderedDict()
+        self._revisions: dict[UUID, int] = {}
+
+    def __len__(self) -> int:
+        """Number of programs currently stored."""
+        return len(self._engines)
+
+    def get(self, program_id: UUID) -> IncrementalCPMEngine | None:
+        """Get the stored engine for a program, marking it recently used."""
+        engine = self._engines.get(program_id)
+        if engine is not None:
+            self._engines.move_to_end(program_id)
+        return engine
+
+    def get_current(self, program_id: UUID, revision: int) -> IncrementalCPMEngine | None:
+        """Get the stored engine for a program if it was solved at this revision."""
+        if self._revisions.get(program_id) != revision:
+            return None
+        return self.get(program_id)
+
+    def put(
+        self, program_id: UUID, engine: IncrementalCPMEngine, revision: int | None = None
+    ) -> None:
+        """Store an engine for a program, evicting the least recently used."""
+        self._engines[program_id] = engine
+        self._engines.move_to_end(program_id)
+        self._set_revision(program_id, revision)
+        while len(self._engines) > self._max_programs:
+            evicted, _ = self._engines.popitem(last=False)
+            self._revisions.pop(evicted, None)
+            logger.debug("schedule_state_evicted", program_id=str(evicted))
+
+    def discard(self, program_id: UUID) -> None:
+        """Drop the stored engine for a program, if any."""
+        self._engines.pop(program_id, None)
+        self._revisions.pop(program_id, None)
+
+    def clear(self) -> None:
+        """Drop all stored engines."""
+        self._engines.clear()
+        self._revisions.clear()
+
+    def _set_revision(self, program_id: UUID, revision: int | None) -> None:
+        """Record the revision an engine was solved at (None = unknown)."""
+        if revision is None:
+            self._revisions.pop(program_id, None)
+        else:
+            self._revisions[program_id] = revision
+
+    def recalculate(
+        self,
+        program_id: UUID,
+        activities: Sequence[Any],
+        dependencies: Iterable[Any],
+        revision: int | None = None,
+    ) -> tuple[IncrementalCPMEngine, dict[UUID, ScheduleResult], bool]:
+        """
+        Recalculate a program's schedule, incrementally when possible.
+
+        Args:
+            program_id: Program being scheduled
+            activities: Current activities of the program
+            dependencies: Current dependencies of the program
+            revision: Schedule revision read before loading the network
+
+        Returns:
+            Tuple of (engine, changed results, whether a full calculation ran)
+
+        Raises:
+            CircularDependencyError: If the network contains a cycle
+        """
+        engine = self.get(program_id)
+        if engine is None:
+            engine = IncrementalCPMEngine(activities, dependencies)
+            self.put(program_id, engine, revision)
+            return engine, dict(engine.results), True
+
+        try:
+            changed, full = engine.apply_snapshot(activities, dependencies)
+        except CircularDependencyError:
+            # Stored state may be partially updated; start over next time
+            self.discard(program_id)
+            raise
+        self._set_revision(program_id, revision)
+        return engine, changed, full
+
+
+# Global store instance
+schedule_state_store = ScheduleStateStore()
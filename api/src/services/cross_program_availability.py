@@ -1,17 +1,27 @@
 """Service for cross-program resource availability."""
 
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
+import numpy as np
+from numpy.typing import NDArray
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.models.resource import Resource, ResourceAssignment
+from src.models.resource import Resource
+from src.models.resource_load import ResourceLoadSegment
 from src.models.resource_pool import ResourcePool, ResourcePoolMember
+from src.services.loading_kernel import (
+    FULL_ALLOCATION,
+    LoadIntervals,
+    from_hundredths,
+    to_hundredths,
+)
 
 
 @dataclass
@@ -47,6 +57,9 @@ class CrossProgramAvailabilityService:
     - Checking resource availability across multiple programs
     - Detecting conflicts when multiple programs use shared resources
     - Allocation percentage-based availability calculations
+
+    Loads are range reads of the materialized ResourceLoadSegment index
+    rather than recomputed from assignments and activities.
     """
 
     def __init__(self, db: AsyncSession):
@@ -74,26 +87,25 @@ class CrossProgramAvailabilityService:
         if not pool:
             raise ValueError(f"Pool {pool_id} not found")
 
+        members = [member for member in pool.members if member.is_active]
+
+        # Load of every member across all programs in one range read
+        segments = await self._get_load_segments(
+            [member.resource.id for member in members],
+            start_date,
+            end_date,
+        )
+
         resources = []
         all_conflicts: list[CrossProgramConflict] = []
 
-        for member in pool.members:
-            if not member.is_active:
-                continue
-
+        for member in members:
             resource = member.resource
 
-            # Get all assignments for this resource across all programs
-            assignments = await self._get_cross_program_assignments(
-                resource.id,
-                start_date,
-                end_date,
-            )
-
             # Calculate daily availability and detect conflicts
             resource_conflicts = await self._detect_conflicts(
                 resource,
-                assignments,
+                segments.get(resource.id, []),
                 start_date,
                 end_date,
                 member.allocation_percentage,
@@ -142,156 +154,156 @@ class CrossProgramAvailabilityService:
         if not resource:
             raise ValueError(f"Resource {resource_id} not found")
 
-        # Get existing assignments
-        assignments = await self._get_cross_program_assignments(
-            resource_id,
+        # Get existing load
+        segments = await self._get_load_segments(
+            [resource_id],
+            assignment_start,
+            assignment_end,
+        )
+        programs, daily_units, _ = _daily_program_units(
+            segments.get(resource_id, []),
             assignment_start,
             assignment_end,
         )
 
-        # Add proposed assignment
-        proposed = {
-            "program_id": program_id,
-            "start_date": assignment_start,
-            "end_date": assignment_end,
-            "units": units,
-        }
+        # Over capacity wherever existing plus proposed units exceed 1.0
+        proposed = to_hundredths(units)
+        over = daily_units.sum(axis=0) + proposed > FULL_ALLOCATION
+        if resource.capacity_per_day <= 0:
+            over[:] = False
 
-        # Check for conflicts
         conflicts = []
-        current = assignment_start
-
-        while current <= assignment_end:
-            # Get all assignments active on this date
-            daily_assignments = [
-                a
-                for a in assignments
-                if a["start_date"] and a["end_date"] and a["start_date"] <= current <= a["end_date"]
-            ]
-            daily_assignments.append(proposed)
-
-            # Calculate total allocation
-            total_hours = sum(
-                (Decimal(str(a["units"])) * resource.capacity_per_day for a in daily_assignments),
-                Decimal("0"),
-            )
-
-            available = resource.capacity_per_day
-
-            if total_hours > available:
-                conflicts.append(
-                    CrossProgramConflict(
-                        resource_id=resource.id,
-                        resource_name=resource.name,
-                        conflict_date=current,
-                        programs_involved=[
-                            {
-                                "program_id": str(a["program_id"]),
-                                "assigned_hours": float(
-                                    Decimal(str(a["units"])) * resource.capacity_per_day
-                                ),
-                            }
-                            for a in daily_assignments
-                        ],
-                        total_assigned=total_hours,
-                        available_hours=available,
-                        overallocation=total_hours - available,
-                    )
+        for offset in np.flatnonzero(over):
+            involved = _involved_programs(programs, daily_units[:, offset])
+            involved.append((program_id, proposed))
+            conflicts.append(
+                _conflict(
+                    resource,
+                    assignment_start + timedelta(days=int(offset)),
+                    involved,
+                    resource.capacity_per_day,
                 )
-
-            current += timedelta(days=1)
+            )
 
         return conflicts
 
-    async def _get_cross_program_assignments(
+    async def _get_load_segments(
         self,
-        resource_id: UUID,
+        resource_ids: list[UUID],
         start_date: date,
         end_date: date,
-    ) -> list[dict[str, Any]]:
-        """Get all assignments for a resource across all programs."""
+    ) -> dict[UUID, list[ResourceLoadSegment]]:
+        """Get the load index segments of resources overlapping a date range."""
+        if not resource_ids:
+            return {}
+
         query = (
-            select(ResourceAssignment)
-            .options(selectinload(ResourceAssignment.activity))
-            .where(ResourceAssignment.resource_id == resource_id)
-            .where(ResourceAssignment.deleted_at.is_(None))
-            .where(
-                (ResourceAssignment.start_date <= end_date)
-                | (ResourceAssignment.start_date.is_(None))
-            )
-            .where(
-                (ResourceAssignment.finish_date >= start_date)
-                | (ResourceAssignment.finish_date.is_(None))
-            )
+            select(ResourceLoadSegment)
+            .where(ResourceLoadSegment.resource_id.in_(resource_ids))
+            .where(ResourceLoadSegment.start_date <= end_date)
+            .where(ResourceLoadSegment.finish_date >= start_date)
         )
         result = await self.db.execute(query)
-        assignments = result.scalars().all()
 
-        return [
-            {
-                "program_id": a.activity.program_id if a.activity else None,
-                "activity_id": a.activity_id,
-                "start_date": a.start_date or (a.activity.early_start if a.activity else None),
-                "end_date": a.finish_date or (a.activity.early_finish if a.activity else None),
-                "units": a.units,
-            }
-            for a in assignments
-        ]
+        segments: dict[UUID, list[ResourceLoadSegment]] = defaultdict(list)
+        for segment in result.scalars().all():
+            segments[segment.resource_id].append(segment)
+        return segments
 
     async def _detect_conflicts(
         self,
         resource: Resource,
-        assignments: list[dict[str, Any]],
+        segments: list[ResourceLoadSegment],
         start_date: date,
         end_date: date,
         allocation_percentage: Decimal = Decimal("100.00"),
     ) -> list[CrossProgramConflict]:
         """Detect all conflicts for a resource in date range."""
-        conflicts = []
-        current = start_date
-
         # Adjust available capacity by allocation percentage
         pool_available = resource.capacity_per_day * (allocation_percentage / Decimal("100"))
 
-        while current <= end_date:
-            # Get assignments active on this date
-            daily = [
-                a
-                for a in assignments
-                if a["start_date"] and a["end_date"] and a["start_date"] <= current <= a["end_date"]
-            ]
-
-            if len(daily) <= 1:
-                current += timedelta(days=1)
-                continue
-
-            # Check for overallocation
-            total = sum(
-                (Decimal(str(a["units"])) * resource.capacity_per_day for a in daily),
-                Decimal("0"),
+        programs, daily_units, counts = _daily_program_units(segments, start_date, end_date)
+
+        # Conflicts need two or more assignments; units * capacity exceeds
+        # capacity * percentage / 100 exactly when units * 100 > percentage
+        over = (counts > 1) & (
+            daily_units.sum(axis=0) * FULL_ALLOCATION > to_hundredths(allocation_percentage)
+        )
+        if resource.capacity_per_day <= 0:
+            over[:] = False
+
+        return [
+            _conflict(
+                resource,
+                start_date + timedelta(days=int(offset)),
+                _involved_programs(programs, daily_units[:, offset]),
+                pool_available,
             )
+            for offset in np.flatnonzero(over)
+        ]
 
-            if total > pool_available:
-                conflicts.append(
-                    CrossProgramConflict(
-                        resource_id=resource.id,
-                        resource_name=resource.name,
-                        conflict_date=current,
-                        programs_involved=[
-                            {
-                                "program_id": str(a["program_id"]),
-                                "assigned_hours": float(
-                                    Decimal(str(a["units"])) * resource.capacity_per_day
-                                ),
-                            }
-                            for a in daily
-                        ],
-                        total_assigned=total,
-                        available_hours=pool_available,
-                        overallocation=total - pool_available,
-                    )
-                )
 
-            current += timedelta(days=1)
+def _daily_program_units(
+    segments: list[ResourceLoadSegment],
+    start_date: date,
+    end_date: date,
+) -> tuple[list[UUID], NDArray[np.int64], NDArray[np.int64]]:
+    """Daily units per program and assignment counts over a date range.
 
-        return conflicts
+    Returns:
+        Programs in order of first appearance, a (programs x days) array
+        of units in hundredths, and the number of assignments per day
+    """
+    programs = list(dict.fromkeys(segment.program_id for segment in segments))
+    days = max((end_date - start_date).days + 1, 0)
+
+    daily_units = np.zeros((len(programs), days), dtype=np.int64)
+    for row, program_id in enumerate(programs):
+        daily_units[row] = LoadIntervals.from_ranges(
+            (segment.start_date, segment.finish_date, to_hundredths(segment.units))
+            for segment in segments
+            if segment.program_id == program_id
+        ).daily_totals(start_date, end_date)
+
+    counts = LoadIntervals.from_ranges(
+        (segment.start_date, segment.finish_date, segment.assignment_count) for segment in segments
+    ).daily_totals(start_date, end_date)
+    return programs, daily_units, counts
+
+
+def _involved_programs(
+    programs: list[UUID],
+    day_units: NDArray[np.int64],
+) -> list[tuple[UUID, int]]:
+    """Programs with load on a day and their units in hundredths."""
+    return [
+        (program_id, int(units))
+        for program_id, units in zip(programs, day_units, strict=True)
+        if units > 0
+    ]
+
+
+def _conflict(
+    resource: Resource,
+    conflict_date: date,
+    involved: list[tuple[UUID, int]],
+    available: Decimal,
+) -> CrossProgramConflict:
+    """Conflict on one day from the units each program assigns."""
+    hours = [
+        (program_id, from_hundredths(units) * resource.capacity_per_day)
+        for program_id, units in involved
+    ]
+    total = sum((assigned for _, assigned in hours), Decimal("0"))
+    return CrossProgramConflict(
+        resource_id=resource.id,
+        resource_name=resource.name,
+        conflict_date=conflict_date,
+        programs_involved=[
+            {"program_id": str(program_id), "assigned_hours": float(assigned)}
+            for program_id, assigned in hours
+        ],
+        total_assigned=total,
+        available_hours=available,
+        overallocation=total - available,
+    )
@@ -11,17 +11,32 @@ Cache TTLs:
 - EVMS metrics: 5 minutes (data changes with period updates)
 - S-curve: 15 minutes (includes simulation data, less frequent changes)
 - WBS tree: 1 hour (structural changes are rare)
+
+Invalidation listeners (see add_invalidation_listener) are told which
+dashboard artifacts of a program each invalidation made stale, so they can
+be recomputed in the background (src/services/dashboard_warmup.py).
 """
 
+from collections.abc import Callable
 from typing import Any
 from uuid import UUID
 
 import structlog
 
-from src.core.cache import CacheManager, cache_manager
+from src.core.cache import CacheKeys, CacheManager, cache_manager
 
 logger = structlog.get_logger(__name__)
 
+# Dashboard artifacts named in invalidation notifications
+ARTIFACT_CPM = "cpm"
+ARTIFACT_EVMS_SUMMARY = "evms_summary"
+ARTIFACT_SCURVE = "scurve"
+ARTIFACT_WBS = "wbs"
+ALL_ARTIFACTS = frozenset({ARTIFACT_CPM, ARTIFACT_EVMS_SUMMARY, ARTIFACT_SCURVE, ARTIFACT_WBS})
+
+# Called with the program and the artifacts an invalidation made stale
+InvalidationListener = Callable[[UUID, frozenset[str]], None]
+
 
 class DashboardCacheKeys:
     """Cache key prefixes for dashboard components."""
@@ -100,12 +115,38 @@ class DashboardCache:
             manager: Optional CacheManager instance. Uses global if not provided.
         """
         self._manager = manager or cache_manager
+        self._listeners: list[InvalidationListener] = []
 
     @property
     def is_available(self) -> bool:
         """Check if cache is available."""
         return self._manager.is_available
 
+    def add_invalidation_listener(self, listener: InvalidationListener) -> None:
+        """Call a listener after each invalidation with the stale artifacts.
+
+        Listeners run synchronously inside the invalidating request, so they
+        must only schedule work.
+        """
+        self._listeners.append(listener)
+
+    def remove_invalidation_listener(self, listener: InvalidationListener) -> None:
+        """Stop calling a listener added with add_invalidation_listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, program_id: UUID, artifacts: frozenset[str]) -> None:
+        """Tell listeners which artifacts of a program are stale."""
+        for listener in self._listeners:
+            try:
+                listener(program_id, artifacts)
+            except Exception as e:
+                logger.warning(
+                    "dashboard_invalidation_listener_error",
+                    program_id=str(program_id),
+                    error=str(e),
+                )
+
     # =========================================================================
     # EVMS Metrics
     # =========================================================================
@@ -402,40 +443,36 @@ class DashboardCache:
         Returns:
             Number of keys deleted
         """
-        patterns = [
-            f"{DashboardCacheKeys.DASHBOARD_METRICS}:{program_id}",
-            f"{DashboardCacheKeys.DASHBOARD_SCURVE}:{program_id}:*",
-            f"{DashboardCacheKeys.DASHBOARD_WBS}:{program_id}",
-            f"{DashboardCacheKeys.DASHBOARD_ACTIVITIES}:{program_id}",
-            f"{DashboardCacheKeys.DASHBOARD_SCHEDULE}:{program_id}",
-        ]
-
-        total_deleted = 0
-        for pattern in patterns:
-            if "*" in pattern:
-                deleted = await self._manager.delete_pattern(pattern)
-            else:
-                success = await self._manager.delete(pattern)
-                deleted = 1 if success else 0
-            total_deleted += deleted
+        total_deleted = await self._manager.delete_many(
+            [
+                DashboardCacheKeys.metrics_key(str(program_id)),
+                DashboardCacheKeys.scurve_key(str(program_id), enhanced=False),
+                DashboardCacheKeys.scurve_key(str(program_id), enhanced=True),
+                DashboardCacheKeys.wbs_key(str(program_id)),
+                DashboardCacheKeys.activities_key(str(program_id)),
+                DashboardCacheKeys.schedule_key(str(program_id)),
+            ]
+        )
 
         logger.info(
             "dashboard_cache_invalidate_program",
             program_id=str(program_id),
             keys_deleted=total_deleted,
         )
+        self._notify(program_id, ALL_ARTIFACTS)
 
         return total_deleted
 
     async def invalidate_on_period_update(self, program_id: UUID) -> None:
         """Invalidate caches affected by EVMS period changes.
 
-        Invalidates metrics and S-curve but keeps WBS tree.
+        Invalidates the EVMS summary, metrics and S-curve but keeps WBS tree.
 
         Args:
             program_id: Program UUID
         """
         keys_to_delete = [
+            CacheKeys.evms_summary_key(str(program_id)),
             DashboardCacheKeys.metrics_key(str(program_id)),
             DashboardCacheKeys.scurve_key(str(program_id), enhanced=False),
             DashboardCacheKeys.scurve_key(str(program_id), enhanced=True),
@@ -448,6 +485,7 @@ class DashboardCache:
             "dashboard_cache_invalidate_period",
             program_id=str(program_id),
         )
+        self._notify(program_id, frozenset({ARTIFACT_EVMS_SUMMARY, ARTIFACT_SCURVE}))
 
     async def invalidate_on_activity_update(self, program_id: UUID) -> None:
         """Invalidate caches affected by activity changes.
@@ -471,6 +509,7 @@ class DashboardCache:
             "dashboard_cache_invalidate_activity",
             program_id=str(program_id),
         )
+        self._notify(program_id, frozenset({ARTIFACT_CPM, ARTIFACT_SCURVE}))
 
     async def invalidate_on_wbs_update(self, program_id: UUID) -> None:
         """Invalidate caches affected by WBS changes.
@@ -492,6 +531,7 @@ class DashboardCache:
             "dashboard_cache_invalidate_wbs",
             program_id=str(program_id),
         )
+        self._notify(program_id, frozenset({ARTIFACT_WBS}))
 
     async def invalidate_on_simulation_update(self, program_id: UUID) -> None:
         """Invalidate caches affected by simulation result changes.
@@ -508,6 +548,7 @@ class DashboardCache:
             "dashboard_cache_invalidate_simulation",
             program_id=str(program_id),
         )
+        self._notify(program_id, frozenset({ARTIFACT_SCURVE}))
 
 
 # Global dashboard cache instance
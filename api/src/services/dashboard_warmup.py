@@ -0,0 +1,300 @@
+"""Background recomputation of dashboard caches after data changes.
+
+DashboardCache invalidations drop cached dashboard artifacts, so without
+warm-up the next viewer pays for recomputing them. DashboardWarmer listens
+to those invalidations and recomputes the stale artifacts of the program
+in the background, writing the same cache entries the endpoints read:
+
+- cpm: CPM results of the schedule calculate endpoint
+- evms_summary: current EVMS summary
+- scurve: enhanced S-curve
+- wbs: WBS tree
+
+Invalidations are debounced per program: the first one starts a run after
+``debounce_seconds`` and later ones only add artifacts to it, so a burst of
+edits is recomputed once. Edits made while a run executes start another
+run once it finishes, so a program is never recomputed by two runs at once
+and an older run cannot overwrite a newer one. Runs use their own database
+session; CPM executes on a worker thread.
+
+On startup the most recently active programs are warmed as well.
+
+Example:
+    dashboard_warmer.start(warm_programs=20)
+    ...
+    await dashboard_warmer.shutdown()
+"""
+
+import asyncio
+from collections.abc import Callable
+from decimal import Decimal
+from uuid import UUID
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.core.cache import CacheKeys, CacheManager, cache_manager
+from src.core.database import get_session_maker
+from src.models.program import Program
+from src.repositories.activity import ActivityRepository
+from src.repositories.dependency import DependencyRepository
+from src.repositories.evms_period import EVMSPeriodRepository
+from src.repositories.program import ProgramRepository
+from src.repositories.simulation import SimulationConfigRepository, SimulationResultRepository
+from src.repositories.wbs import WBSElementRepository
+from src.schemas.wbs import WBSElementTreeResponse
+from src.services.cpm import CPMEngine, apply_schedule_results, schedule_results_to_schema
+from src.services.dashboard_cache import (
+    ALL_ARTIFACTS,
+    ARTIFACT_CPM,
+    ARTIFACT_EVMS_SUMMARY,
+    ARTIFACT_SCURVE,
+    ARTIFACT_WBS,
+    DashboardCache,
+    dashboard_cache,
+)
+from src.services.evms import build_evms_summary
+from src.services.scurve_enhanced import (
+    EnhancedSCurveService,
+    build_simulation_metrics_from_result,
+    enhanced_scurve_to_dict,
+)
+
+logger = structlog.get_logger(__name__)
+
+# Upper bound on activities loaded for CPM, as in the schedule endpoint
+_MAX_ACTIVITIES = 10000
+
+
+class DashboardWarmer:
+    """
+    Recomputes invalidated dashboard artifacts in the background.
+
+    Registered as a DashboardCache invalidation listener by start(). At
+    most ``max_concurrent`` programs are recomputed at once.
+    """
+
+    def __init__(
+        self,
+        debounce_seconds: float = 2.0,
+        max_concurrent: int = 2,
+        *,
+        dashboard: DashboardCache | None = None,
+        manager: CacheManager | None = None,
+        session_maker_factory: Callable[[], async_sessionmaker[AsyncSession]] = get_session_maker,
+    ) -> None:
+        """
+        Initialize the warmer.
+
+        Args:
+            debounce_seconds: Delay between the first invalidation of a
+                program and its recomputation
+            max_concurrent: Programs recomputed at once
+            dashboard: DashboardCache to listen to and write (defaults to global)
+            manager: CacheManager for CPM and EVMS summary entries (defaults to global)
+            session_maker_factory: Returns the session maker for reads
+        """
+        self.debounce_seconds = debounce_seconds
+        self.max_concurrent = max_concurrent
+        self._dashboard = dashboard or dashboard_cache
+        self._manager = manager or cache_manager
+        self._session_maker_factory = session_maker_factory
+        self._semaphore: asyncio.Semaphore | None = None
+        self._pending: dict[UUID, set[str]] = {}
+        self._tasks: dict[UUID, asyncio.Task[None]] = {}
+        self._startup_task: asyncio.Task[None] | None = None
+
+    @property
+    def scheduled_programs(self) -> int:
+        """Number of programs waiting for or undergoing recomputation."""
+        return len(self._tasks)
+
+    def start(self, warm_programs: int = 0) -> None:
+        """
+        Listen for dashboard invalidations and warm recent programs.
+
+        Args:
+            warm_programs: Most recently active programs to warm now (0 = none)
+        """
+        self._dashboard.add_invalidation_listener(self.schedule)
+        if warm_programs > 0:
+            self._startup_task = asyncio.create_task(self._warm_recent(warm_programs))
+
+    def schedule(self, program_id: UUID, artifacts: frozenset[str] = ALL_ARTIFACTS) -> None:
+        """
+        Recompute artifacts of a program after the debounce delay.
+
+        Args:
+            program_id: Program whose artifacts are stale
+            artifacts: Artifact names (see src.services.dashboard_cache)
+        """
+        if not self._manager.is_available:
+            return
+
+        self._pending.setdefault(program_id, set()).update(artifacts)
+        if program_id not in self._tasks:
+            self._tasks[program_id] = asyncio.create_task(self._run(program_id))
+
+    async def _warm_recent(self, limit: int) -> None:
+        """Schedule all artifacts of the most recently active programs."""
+        try:
+            async with self._session_maker_factory()() as session:
+                program_ids = await ProgramRepository(session).get_recently_active_ids(limit)
+        except Exception as e:
+            logger.warning("dashboard_warmup_startup_failed", error=str(e))
+            return
+
+        for program_id in program_ids:
+            self.schedule(program_id)
+        logger.info("dashboard_warmup_startup", programs=len(program_ids))
+
+    async def _run(self, program_id: UUID) -> None:
+        """Recompute a program's pending artifacts until none are left."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        while True:
+            await asyncio.sleep(self.debounce_seconds)
+
+            artifacts = self._pending.pop(program_id, set())
+            try:
+                async with self._semaphore:
+                    await self._warm(program_id, artifacts)
+            except Exception as e:
+                logger.warning("dashboard_warmup_failed", program_id=str(program_id), error=str(e))
+
+            # No await between the check and the removal, so a concurrent
+            # schedule() either sees this task or starts a new one
+            if program_id not in self._pending:
+                del self._tasks[program_id]
+                return
+
+    async def _warm(self, program_id: UUID, artifacts: set[str]) -> None:
+        """Recompute artifacts of a program from a fresh session."""
+        warmers = {
+            ARTIFACT_CPM: self._warm_cpm,
+            ARTIFACT_EVMS_SUMMARY: self._warm_evms_summary,
+            ARTIFACT_SCURVE: self._warm_scurve,
+            ARTIFACT_WBS: self._warm_wbs,
+        }
+
+        async with self._session_maker_factory()() as session:
+            program = await ProgramRepository(session).get_by_id_shallow(program_id)
+            if program is None:
+                return
+
+            for artifact in sorted(artifacts):
+                try:
+                    await warmers[artifact](session, program)
+                except Exception as e:
+                    logger.warning(
+                        "dashboard_warmup_failed",
+                        program_id=str(program_id),
+                        artifact=artifact,
+                        error=str(e),
+                    )
+
+        logger.info(
+            "dashboard_warmup_completed",
+            program_id=str(program_id),
+            artifacts=sorted(artifacts),
+        )
+
+    async def _warm_cpm(self, session: AsyncSession, program: Program) -> None:
+        """Cache CPM results under the schedule endpoint's key.
+
+        The revision was read with the program, before the network, so the
+        results are never older than the revision they are cached under.
+        Floats and criticality are written back to the activities before
+        caching, as the endpoint does, because a cache hit skips that write.
+        """
+        activities = await ActivityRepository(session).get_by_program(
+            program.id, limit=_MAX_ACTIVITIES
+        )
+        if not activities:
+            return
+        dependencies = await DependencyRepository(session).get_by_program(program.id)
+
+        results = await asyncio.to_thread(lambda: CPMEngine(activities, dependencies).calculate())
+
+        apply_schedule_results(activities, results)
+        await session.commit()
+
+        await self._manager.set(
+            CacheKeys.cpm_key(str(program.id), program.schedule_revision),
+            [r.model_dump() for r in schedule_results_to_schema(results)],
+            ttl=CacheKeys.CPM_TTL,
+            tags=[CacheKeys.cpm_tag(str(program.id))],
+        )
+
+    async def _warm_evms_summary(self, session: AsyncSession, program: Program) -> None:
+        """Cache the current EVMS summary under the summary endpoint's key."""
+        period = await EVMSPeriodRepository(session).get_latest_period(program.id)
+        summary = build_evms_summary(program.id, program.budget_at_completion, period)
+
+        await self._manager.set(
+            CacheKeys.evms_summary_key(str(program.id)),
+            summary.model_dump(mode="json"),
+            ttl=CacheKeys.EVMS_TTL,
+        )
+
+    async def _warm_scurve(self, session: AsyncSession, program: Program) -> None:
+        """Cache the enhanced S-curve."""
+        periods = await EVMSPeriodRepository(session).get_by_program(program.id, limit=1000)
+
+        simulation_metrics = None
+        configs = await SimulationConfigRepository(session).get_by_program(program.id, limit=1)
+        if configs:
+            latest_result = await SimulationResultRepository(session).get_completed_by_config(
+                configs[0].id
+            )
+            if latest_result:
+                simulation_metrics = build_simulation_metrics_from_result(latest_result)
+
+        service = EnhancedSCurveService(
+            program_id=program.id,
+            periods=sorted(periods, key=lambda p: p.period_end),
+            bac=program.budget_at_completion or Decimal("0"),
+            simulation_metrics=simulation_metrics,
+            start_date=program.start_date,
+        )
+
+        await self._dashboard.set_scurve(
+            program.id, enhanced_scurve_to_dict(service.generate()), enhanced=True
+        )
+
+    async def _warm_wbs(self, session: AsyncSession, program: Program) -> None:
+        """Cache the WBS tree."""
+        tree = await WBSElementRepository(session).get_tree(program.id)
+        await self._dashboard.set_wbs_tree(
+            program.id,
+            {
+                "items": [
+                    WBSElementTreeResponse.model_validate(e).model_dump(mode="json") for e in tree
+                ]
+            },
+        )
+
+    async def shutdown(self) -> None:
+        """Stop listening and cancel scheduled recomputations."""
+        self._dashboard.remove_invalidation_listener(self.schedule)
+
+        tasks = list(self._tasks.values())
+        if self._startup_task is not None:
+            tasks.append(self._startup_task)
+            self._startup_task = None
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._tasks.clear()
+        self._pending.clear()
+
+
+# Global warmer instance
+dashboard_warmer = DashboardWarmer(
+    debounce_seconds=settings.DASHBOARD_WARMUP_DEBOUNCE_SECONDS,
+    max_concurrent=settings.DASHBOARD_WARMUP_MAX_CONCURRENT,
+)
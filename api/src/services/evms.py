@@ -10,8 +10,16 @@ Enhanced EVMS Calculator with advanced EAC methods per GL 27:
 """
 
 from dataclasses import dataclass
+from datetime import date
 from decimal import ROUND_HALF_UP, Decimal
 from enum import Enum
+from typing import TYPE_CHECKING
+from uuid import UUID
+
+from src.schemas.evms_period import EVMSSummaryResponse
+
+if TYPE_CHECKING:
+    from src.models.evms_period import EVMSPeriod
 
 
 class EVMethod(str, Enum):
@@ -579,3 +587,52 @@ class EVMSCalculator:
                 continue
 
         return results
+
+
+def build_evms_summary(
+    program_id: UUID,
+    bac: Decimal,
+    period: "EVMSPeriod | None",
+    as_of_date: date | None = None,
+) -> EVMSSummaryResponse:
+    """
+    Build the EVMS summary of a program from its cumulative period values.
+
+    Used by the summary endpoint and by dashboard cache warm-up, so both
+    produce the same cached entry.
+
+    Args:
+        program_id: Program UUID
+        bac: Budget at completion
+        period: Latest period up to the as-of date (None if there is none)
+        as_of_date: Requested as-of date (defaults to the period end, or today)
+
+    Returns:
+        EVMSSummaryResponse with variances, indices and estimates
+    """
+    bcws = period.cumulative_bcws if period else Decimal("0.00")
+    bcwp = period.cumulative_bcwp if period else Decimal("0.00")
+    acwp = period.cumulative_acwp if period else Decimal("0.00")
+
+    cpi = EVMSCalculator.calculate_cpi(bcwp, acwp)
+    eac = EVMSCalculator.calculate_eac(bac, acwp, bcwp, "cpi") if cpi else None
+
+    return EVMSSummaryResponse(
+        program_id=program_id,
+        as_of_date=as_of_date or (period.period_end if period else date.today()),
+        bac=bac,
+        bcws=bcws,
+        bcwp=bcwp,
+        acwp=acwp,
+        cv=EVMSCalculator.calculate_cost_variance(bcwp, acwp),
+        sv=EVMSCalculator.calculate_schedule_variance(bcwp, bcws),
+        cpi=cpi,
+        spi=EVMSCalculator.calculate_spi(bcwp, bcws),
+        eac=eac,
+        etc=EVMSCalculator.calculate_etc(eac, acwp) if eac else None,
+        vac=EVMSCalculator.calculate_vac(bac, eac) if eac else None,
+        tcpi=EVMSCalculator.calculate_tcpi(bac, bcwp, acwp, "bac"),
+        percent_complete=(
+            (bcwp / bac * 100).quantize(Decimal("0.01")) if bac > 0 else Decimal("0.00")
+        ),
+    )
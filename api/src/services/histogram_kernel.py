@@ -0,0 +1,172 @@
+"""Array kernel for resource histograms.
+
+A HistogramMatrix holds the available and assigned hours of several
+resources over consecutive periods as (resources x periods) float
+arrays, so rollups to weeks or months, utilization, peaks and totals
+are array reductions instead of loops over per-day objects.
+
+Daily matrices are built from the integer hundredths of the loading
+kernel; hours are exact to the hundredth, and over-allocation is
+decided on those integers before anything is converted to floats.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from datetime import date
+
+    from numpy.typing import NDArray
+
+# Supported period lengths for histogram columns
+GRANULARITIES = ("daily", "weekly", "monthly")
+
+# 1970-01-01, day zero of datetime64[D], was a Thursday
+_EPOCH_WEEKDAY = 3
+
+
+@dataclass(frozen=True)
+class HistogramStatistics:
+    """Per-resource statistics of a histogram matrix.
+
+    Every attribute has one entry per matrix row.
+
+    Attributes:
+        peak_utilization: Highest period utilization percentage
+        peak_index: Column of the first peak, -1 if utilization is never above 0
+        average_utilization: Mean of the period utilization percentages
+        overallocated_periods: Number of over-allocated periods
+        total_available: Sum of available hours
+        total_assigned: Sum of assigned hours
+    """
+
+    peak_utilization: NDArray[np.float64]
+    peak_index: NDArray[np.intp]
+    average_utilization: NDArray[np.float64]
+    overallocated_periods: NDArray[np.int64]
+    total_available: NDArray[np.float64]
+    total_assigned: NDArray[np.float64]
+
+
+@dataclass(frozen=True)
+class HistogramMatrix:
+    """Hours of several resources over consecutive periods.
+
+    Attributes:
+        periods: First day of each period (column), as datetime64[D]
+        available: Available hours per resource and period
+        assigned: Assigned hours per resource and period
+        overallocated: True where the period has an over-allocated day
+    """
+
+    periods: NDArray[np.datetime64]
+    available: NDArray[np.float64]
+    assigned: NDArray[np.float64]
+    overallocated: NDArray[np.bool_]
+
+    @classmethod
+    def from_hundredths(
+        cls,
+        start: date,
+        available: NDArray[np.int64],
+        assigned: NDArray[np.int64],
+    ) -> HistogramMatrix:
+        """Daily matrix from hours in hundredths.
+
+        Args:
+            start: Date of the first column
+            available: (resources x days) available hours in hundredths
+            assigned: (resources x days) assigned hours in hundredths
+
+        Returns:
+            HistogramMatrix with one column per day
+        """
+        days = available.shape[1]
+        return cls(
+            periods=np.datetime64(start, "D") + np.arange(days),
+            available=available / 100,
+            assigned=assigned / 100,
+            overallocated=assigned > available,
+        )
+
+    @property
+    def dates(self) -> list[date]:
+        """Period start dates."""
+        return self.periods.tolist()  # type: ignore[no-any-return]
+
+    @property
+    def utilization(self) -> NDArray[np.float64]:
+        """Assigned hours as a percentage of available, 0 where none are available."""
+        utilization = np.zeros_like(self.assigned)
+        np.divide(self.assigned * 100, self.available, out=utilization, where=self.available > 0)
+        return utilization
+
+    def rollup(self, granularity: str) -> HistogramMatrix:
+        """Sum a daily matrix into weekly or monthly periods.
+
+        Weeks start on Monday and months on the first; a period is
+        labelled with that day even if the matrix starts later in it.
+        Utilization of a period is its assigned total over its available
+        total, and it is over-allocated if any of its days is.
+
+        Args:
+            granularity: "daily", "weekly" or "monthly"
+
+        Returns:
+            HistogramMatrix with one column per period
+
+        Raises:
+            ValueError: If granularity is not supported
+        """
+        if granularity == "daily":
+            return self
+        if granularity == "weekly":
+            weekday = (self.periods.astype(np.int64) + _EPOCH_WEEKDAY) % 7
+            keys = self.periods - weekday.astype("timedelta64[D]")
+        elif granularity == "monthly":
+            keys = self.periods.astype("datetime64[M]").astype("datetime64[D]")
+        else:
+            msg = f"Unsupported granularity: {granularity}"
+            raise ValueError(msg)
+
+        if len(keys) == 0:
+            return HistogramMatrix(keys, self.available, self.assigned, self.overallocated)
+
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        return HistogramMatrix(
+            periods=keys[starts],
+            available=np.add.reduceat(self.available, starts, axis=1),
+            assigned=np.add.reduceat(self.assigned, starts, axis=1),
+            overallocated=np.logical_or.reduceat(self.overallocated, starts, axis=1),
+        )
+
+    def statistics(self) -> HistogramStatistics:
+        """Peak, average, over-allocation and totals of every resource."""
+        utilization = self.utilization
+        resources, periods = utilization.shape
+
+        if periods == 0:
+            zeros = np.zeros(resources)
+            return HistogramStatistics(
+                peak_utilization=zeros,
+                peak_index=np.full(resources, -1, dtype=np.intp),
+                average_utilization=zeros,
+                overallocated_periods=np.zeros(resources, dtype=np.int64),
+                total_available=zeros,
+                total_assigned=zeros,
+            )
+
+        peak_index = utilization.argmax(axis=1)
+        peak = utilization[np.arange(resources), peak_index]
+        return HistogramStatistics(
+            peak_utilization=peak,
+            peak_index=np.where(peak > 0, peak_index, -1),
+            average_utilization=utilization.mean(axis=1),
+            overallocated_periods=self.overallocated.sum(axis=1),
+            total_available=self.available.sum(axis=1),
+            total_assigned=self.assigned.sum(axis=1),
+        )
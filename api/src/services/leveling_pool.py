@@ -0,0 +1,102 @@
+"""Shared process pool for CPU-bound leveling work.
+
+Leveling components and preview variants are independent CPU-bound runs.
+They execute on one bounded process pool per API process, created on
+first use and shared by every request, so a request neither starts
+processes nor waits for a pool to shut down. Results are awaited on the
+event loop; if the awaiting request is cancelled, work that has not
+started is dropped and running work finishes in the background.
+
+If a worker process dies (for example killed for running out of memory)
+the pool is broken; it is replaced and the call retried once, so one lost
+worker does not break leveling until the API restarts.
+
+Example:
+    results = await leveling_pool.map(level_component, [(component, options), ...])
+    ...
+    leveling_pool.shutdown()
+"""
+
+import asyncio
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, TypeVar
+
+from src.config import settings
+from src.services.monte_carlo_parallel import resolve_workers
+
+T = TypeVar("T")
+
+
+class LevelingPool:
+    """
+    Lazily created process pool of ``max_workers`` processes.
+
+    With a single worker nothing is sent to other processes: callers run
+    the work inline instead (see ``parallel``).
+    """
+
+    def __init__(self, max_workers: int = 0) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            max_workers: Worker processes (0 = one per CPU, 1 = no pool)
+        """
+        self.max_workers = resolve_workers(max_workers)
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def parallel(self) -> bool:
+        """Whether work can run in worker processes."""
+        return self.max_workers > 1
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Create the process pool on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def map(self, func: Callable[..., T], args: Iterable[tuple[Any, ...]]) -> list[T]:
+        """
+        Run func(*a) for each argument tuple in the worker processes.
+
+        Args:
+            func: Module-level, picklable function
+            args: Argument tuples, in submission order
+
+        Returns:
+            Results in the order of args
+
+        Raises:
+            BrokenProcessPool: If the replacement pool breaks as well
+        """
+        calls = list(args)
+        try:
+            return await self._map(func, calls)
+        except BrokenProcessPool:
+            return await self._map(func, calls)
+
+    async def _map(self, func: Callable[..., T], calls: list[tuple[Any, ...]]) -> list[T]:
+        """Run the calls on the current pool, dropping it if it is broken."""
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        futures = [loop.run_in_executor(executor, func, *call_args) for call_args in calls]
+        try:
+            return list(await asyncio.gather(*futures))
+        except BrokenProcessPool:
+            if self._executor is executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            raise
+
+    def shutdown(self) -> None:
+        """Stop the worker processes without waiting for running work."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global pool instance
+leveling_pool = LevelingPool(max_workers=settings.LEVELING_MAX_WORKERS)
@@ -0,0 +1,320 @@
+"""Side-effect-free leveling previews over cached program snapshots.
+
+A what-if preview levels a LevelingSnapshot with several LevelingOptions
+variants and returns every result without writing anything. The snapshot
+is read from the database once, identified by a content hash and kept in
+an in-process LRU cache, so later previews that pass the returned
+snapshot_id cost only CPU: no query runs and the session is not used.
+
+Variants are independent runs over the same immutable snapshot; when
+there is enough work they run concurrently in the shared leveling
+process pool (see src.services.leveling_pool).
+
+Example usage:
+    service = LevelingPreviewService(session)
+    preview = await service.preview(
+        program_id,
+        [LevelingOptions(), LevelingOptions(preserve_critical_path=False)],
+    )
+    again = await service.preview(program_id, variants, snapshot_id=preview.snapshot_id)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass
+from datetime import date
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+from uuid import UUID
+
+from src.repositories.program import ProgramRepository
+from src.services.leveling_pool import LevelingPool, leveling_pool
+from src.services.parallel_leveling import PARALLEL_MIN_ACTIVITIES, level_snapshot
+from src.services.resource_leveling import ResourceLevelingService, SerialLevelingEngine
+from src.services.working_calendar import WorkingCalendar
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.models.program import Program
+    from src.services.leveling_snapshot import LevelingSnapshot
+    from src.services.resource_leveling import LevelingOptions, LevelingResult
+
+# Algorithms a preview variant can run
+LEVELING_ALGORITHMS = ("serial", "parallel")
+
+# Snapshots kept for reuse by later previews, bounded by count and by the
+# size of their canonical serialization (well below their size in memory)
+_SNAPSHOT_CACHE_SIZE = 8
+_SNAPSHOT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+_snapshot_cache: OrderedDict[str, tuple[LevelingSnapshot, int]] = OrderedDict()
+_snapshot_cache_bytes = 0
+_snapshot_cache_lock = threading.Lock()
+
+
+def _canonical(value: Any) -> Any:
+    """JSON-compatible form of a snapshot value for hashing."""
+    if isinstance(value, WorkingCalendar):
+        # Calendars compare by their work pattern, not by identity
+        return {
+            "hours_per_day": _canonical(value.hours_per_day),
+            "working_days": sorted(value.working_days),
+            "holidays": sorted(day.isoformat() for day in value.holidays),
+            "recurring_holidays": sorted(list(day) for day in value.recurring_holidays),
+            "overrides": {
+                day.isoformat(): _canonical(hours) for day, hours in value.overrides.items()
+            },
+        }
+    if is_dataclass(value) and not isinstance(value, type):
+        return {f.name: _canonical(getattr(value, f.name)) for f in fields(value)}
+    if isinstance(value, tuple | list):
+        return [_canonical(item) for item in value]
+    if isinstance(value, Decimal):
+        # 8.0 and 8.00 level identically
+        return str(value.normalize())
+    if isinstance(value, date | UUID):
+        return str(value)
+    return value
+
+
+def _serialize(snapshot: LevelingSnapshot) -> bytes:
+    """Canonical serialization: sorted-key JSON of the snapshot content."""
+    return json.dumps(_canonical(snapshot), sort_keys=True, separators=(",", ":")).encode()
+
+
+def snapshot_digest(snapshot: LevelingSnapshot) -> str:
+    """Content hash of a snapshot.
+
+    Snapshots with the same program data in the same order have the same
+    digest, whichever load produced them.
+
+    Args:
+        snapshot: Snapshot to hash
+
+    Returns:
+        Hex SHA-256 digest of its canonical serialization
+    """
+    return hashlib.sha256(_serialize(snapshot)).hexdigest()
+
+
+def cache_snapshot(snapshot: LevelingSnapshot) -> str:
+    """Keep a snapshot for later previews.
+
+    Least recently used snapshots are dropped once the cache holds more
+    than _SNAPSHOT_CACHE_SIZE snapshots or _SNAPSHOT_CACHE_MAX_BYTES of
+    serialized content; the newest snapshot is always kept.
+
+    Args:
+        snapshot: Snapshot to cache
+
+    Returns:
+        Its digest, the id to look it up by
+    """
+    global _snapshot_cache_bytes
+
+    serialized = _serialize(snapshot)
+    snapshot_id = hashlib.sha256(serialized).hexdigest()
+    with _snapshot_cache_lock:
+        if snapshot_id in _snapshot_cache:
+            _snapshot_cache.move_to_end(snapshot_id)
+            return snapshot_id
+
+        _snapshot_cache[snapshot_id] = (snapshot, len(serialized))
+        _snapshot_cache_bytes += len(serialized)
+        while len(_snapshot_cache) > 1 and (
+            len(_snapshot_cache) > _SNAPSHOT_CACHE_SIZE
+            or _snapshot_cache_bytes > _SNAPSHOT_CACHE_MAX_BYTES
+        ):
+            _, (_, size) = _snapshot_cache.popitem(last=False)
+            _snapshot_cache_bytes -= size
+    return snapshot_id
+
+
+def get_cached_snapshot(snapshot_id: str) -> LevelingSnapshot | None:
+    """Cached snapshot by digest, None if it was never cached or was evicted."""
+    with _snapshot_cache_lock:
+        entry = _snapshot_cache.get(snapshot_id)
+        if entry is None:
+            return None
+        _snapshot_cache.move_to_end(snapshot_id)
+        return entry[0]
+
+
+def clear_snapshot_cache() -> None:
+    """Drop all cached preview snapshots."""
+    global _snapshot_cache_bytes
+
+    with _snapshot_cache_lock:
+        _snapshot_cache.clear()
+        _snapshot_cache_bytes = 0
+
+
+def preview_variant(
+    snapshot: LevelingSnapshot,
+    options: LevelingOptions,
+    algorithm: str = "parallel",
+) -> LevelingResult:
+    """Level a snapshot with one set of options; module level so worker processes can run it.
+
+    Args:
+        snapshot: Program snapshot to level
+        options: Leveling options of the variant
+        algorithm: "serial" or "parallel"
+
+    Returns:
+        LevelingResult (ParallelLevelingResult for "parallel")
+
+    Raises:
+        ValueError: If the algorithm is unknown
+    """
+    if algorithm == "serial":
+        return SerialLevelingEngine(snapshot, options).run()
+    if algorithm == "parallel":
+        return level_snapshot(snapshot, options)
+    raise ValueError(f"Unknown leveling algorithm: {algorithm}")
+
+
+@dataclass
+class LevelingPreview:
+    """Results of leveling one snapshot with several option variants.
+
+    Attributes:
+        snapshot_id: Digest of the leveled snapshot, for reuse
+        algorithm: Algorithm every variant ran
+        results: One result per variant, in request order
+    """
+
+    snapshot_id: str
+    algorithm: str
+    results: list[LevelingResult]
+
+
+class LevelingPreviewService:
+    """What-if resource leveling that never writes.
+
+    The first preview of a program loads its snapshot with the same bulk
+    queries as leveling and caches it by digest. Passing that digest back
+    as snapshot_id reuses the cached snapshot, so the variants are leveled
+    against exactly the same data without touching the database; an
+    unknown or evicted snapshot_id falls back to a fresh load.
+
+    Example usage:
+        service = LevelingPreviewService(session)
+        preview = await service.preview(program_id, variants, algorithm="serial")
+        for result in preview.results:
+            print(result.schedule_extension_days)
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        pool: LevelingPool | None = None,
+    ) -> None:
+        """Initialize LevelingPreviewService.
+
+        Args:
+            session: Database session, used only to load uncached snapshots
+            pool: Worker pool for leveling variants concurrently
+                (defaults to the shared leveling_pool)
+        """
+        self.session = session
+        self.pool = pool or leveling_pool
+        self._program_repo = ProgramRepository(session)
+        self._snapshot_loader = ResourceLevelingService(session)
+
+    async def get_snapshot(
+        self,
+        program_id: UUID,
+        snapshot_id: str | None = None,
+        *,
+        program: Program | None = None,
+    ) -> tuple[str, LevelingSnapshot]:
+        """Cached snapshot of a program, loading it if needed.
+
+        Args:
+            program_id: Program to preview
+            snapshot_id: Digest returned by an earlier preview
+            program: The program, if the caller already loaded it
+
+        Returns:
+            (snapshot_id, snapshot)
+
+        Raises:
+            ValueError: If the snapshot must be loaded and the program does not exist
+        """
+        if snapshot_id is not None:
+            snapshot = get_cached_snapshot(snapshot_id)
+            if snapshot is not None and snapshot.program_id == program_id:
+                return snapshot_id, snapshot
+
+        if program is None:
+            program = await self._program_repo.get_by_id_shallow(program_id)
+        if not program:
+            raise ValueError(f"Program {program_id} not found")
+
+        snapshot = await self._snapshot_loader.load_snapshot(program)
+        return cache_snapshot(snapshot), snapshot
+
+    async def preview(
+        self,
+        program_id: UUID,
+        variants: Sequence[LevelingOptions],
+        *,
+        algorithm: str = "parallel",
+        snapshot_id: str | None = None,
+        program: Program | None = None,
+    ) -> LevelingPreview:
+        """Level a program with each option variant without applying anything.
+
+        Args:
+            program_id: Program to preview
+            variants: Leveling options to try
+            algorithm: "serial" or "parallel"
+            snapshot_id: Digest returned by an earlier preview, to level
+                the same snapshot again
+            program: The program, if the caller already loaded it
+
+        Returns:
+            LevelingPreview with one result per variant
+
+        Raises:
+            ValueError: If the algorithm is unknown or the program does not exist
+        """
+        if algorithm not in LEVELING_ALGORITHMS:
+            raise ValueError(f"Unknown leveling algorithm: {algorithm}")
+
+        snapshot_id, snapshot = await self.get_snapshot(program_id, snapshot_id, program=program)
+        results = await self._run_variants(snapshot, variants, algorithm)
+        return LevelingPreview(snapshot_id=snapshot_id, algorithm=algorithm, results=results)
+
+    async def _run_variants(
+        self,
+        snapshot: LevelingSnapshot,
+        variants: Sequence[LevelingOptions],
+        algorithm: str,
+    ) -> list[LevelingResult]:
+        """Level the variants, in the shared process pool when it pays off.
+
+        Args:
+            snapshot: Program snapshot
+            variants: Leveling options to try
+            algorithm: "serial" or "parallel"
+
+        Returns:
+            One result per variant, in variant order
+        """
+        work = len(snapshot.activities) * len(variants)
+        if not self.pool.parallel or work < PARALLEL_MIN_ACTIVITIES:
+            return [preview_variant(snapshot, options, algorithm) for options in variants]
+
+        return await self.pool.map(
+            preview_variant, [(snapshot, options, algorithm) for options in variants]
+        )
@@ -0,0 +1,220 @@
+"""In-memory snapshot of everything resource leveling reads.
+
+A LevelingSnapshot holds the activities, resource assignments, resources
+and dependencies of one program as plain frozen records, loaded by a
+handful of bulk queries. Leveling engines run entirely against the
+snapshot, so no database round trip happens inside a leveling loop, and
+the snapshot can be pickled to worker processes.
+
+Assignments on shared resources that belong to activities outside the
+program are reduced to ExternalLoad records with fixed dates: leveling
+never moves them, but they still consume resource capacity.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from datetime import date
+    from decimal import Decimal
+    from uuid import UUID
+
+    from src.services.working_calendar import WorkingCalendar
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class LevelingActivity:
+    """Schedule fields of one activity.
+
+    Attributes:
+        id: Activity UUID
+        code: Activity code for display
+        start: Early start, falling back to planned start
+        finish: Early finish, falling back to planned finish
+        total_float: Total float in days (None if not calculated)
+        is_critical: Whether the activity is on the critical path
+    """
+
+    id: UUID
+    code: str
+    start: date | None
+    finish: date | None
+    total_float: int | None
+    is_critical: bool
+
+
+@dataclass(frozen=True)
+class LevelingAssignment:
+    """Assignment of a resource to an activity of the leveled program.
+
+    Attributes:
+        activity_id: Assigned activity
+        resource_id: Assigned resource
+        units: Allocation units (1.0 = 100%)
+    """
+
+    activity_id: UUID
+    resource_id: UUID
+    units: Decimal
+
+
+@dataclass(frozen=True)
+class ExternalLoad:
+    """Fixed-date allocation of a shared resource by another program.
+
+    Attributes:
+        resource_id: Allocated resource
+        start: First allocated day
+        finish: Last allocated day (inclusive)
+        units: Allocation units (1.0 = 100%)
+    """
+
+    resource_id: UUID
+    start: date
+    finish: date
+    units: Decimal
+
+
+@dataclass(frozen=True)
+class LevelingResource:
+    """Capacity of one resource.
+
+    Attributes:
+        id: Resource UUID
+        code: Resource code for display
+        capacity_per_day: Available hours per day
+        calendar: Compiled calendar template (None for Monday to Friday)
+    """
+
+    id: UUID
+    code: str
+    capacity_per_day: Decimal
+    calendar: WorkingCalendar | None = None
+
+
+@dataclass(frozen=True)
+class LevelingDependency:
+    """Dependency between two activities.
+
+    Attributes:
+        predecessor_id: Predecessor activity
+        successor_id: Successor activity
+        dependency_type: FS, SS, FF or SF
+        lag: Lag in days
+    """
+
+    predecessor_id: UUID
+    successor_id: UUID
+    dependency_type: str
+    lag: int
+
+
+@dataclass(frozen=True)
+class LevelingSnapshot:
+    """Read-only view of a program for resource leveling.
+
+    Attributes:
+        program_id: Program UUID
+        start_date: Program start (default activity start)
+        end_date: Program end (default activity finish)
+        activities: Program activities
+        assignments: Assignments on program activities
+        external_loads: Allocations of shared resources by other programs
+        resources: Every resource referenced by an assignment
+        program_resource_ids: Active resources owned by the program
+        dependencies: Dependencies whose predecessor is in the program
+    """
+
+    program_id: UUID
+    start_date: date
+    end_date: date
+    activities: tuple[LevelingActivity, ...]
+    assignments: tuple[LevelingAssignment, ...]
+    external_loads: tuple[ExternalLoad, ...]
+    resources: tuple[LevelingResource, ...]
+    program_resource_ids: tuple[UUID, ...]
+    dependencies: tuple[LevelingDependency, ...]
+
+
+def split_components(snapshot: LevelingSnapshot) -> list[LevelingSnapshot]:
+    """Split a snapshot into independently levelable parts.
+
+    Two activities belong to the same component when they share a
+    resource or are linked by a dependency, directly or through other
+    activities. Leveling one component never moves an activity or
+    changes a resource load of another, so components can be leveled
+    separately and their shifts combined.
+
+    Args:
+        snapshot: Program snapshot
+
+    Returns:
+        One snapshot per component, ordered by their first activity in
+        snapshot.activities. Each keeps the program's id and dates and
+        the assignments, external loads, resources and dependencies of
+        its own activities.
+    """
+    parent = {activity.id: activity.id for activity in snapshot.activities}
+
+    def find(activity_id: UUID) -> UUID:
+        root = activity_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[activity_id] != root:
+            parent[activity_id], activity_id = root, parent[activity_id]
+        return root
+
+    def union(first: UUID, second: UUID) -> None:
+        parent[find(first)] = find(second)
+
+    first_user: dict[UUID, UUID] = {}
+    for assignment in snapshot.assignments:
+        if assignment.activity_id not in parent:
+            continue
+        user = first_user.setdefault(assignment.resource_id, assignment.activity_id)
+        union(assignment.activity_id, user)
+    for dependency in snapshot.dependencies:
+        if dependency.predecessor_id in parent and dependency.successor_id in parent:
+            union(dependency.predecessor_id, dependency.successor_id)
+
+    def group(items: Iterable[_T], root_of: Callable[[_T], UUID | None]) -> dict[UUID, list[_T]]:
+        groups: dict[UUID, list[_T]] = defaultdict(list)
+        for item in items:
+            root = root_of(item)
+            if root is not None:
+                groups[root].append(item)
+        return groups
+
+    resource_root = {resource_id: find(user) for resource_id, user in first_user.items()}
+    members = group(snapshot.activities, lambda a: find(a.id))
+    assignments = group(
+        snapshot.assignments, lambda a: find(a.activity_id) if a.activity_id in parent else None
+    )
+    external_loads = group(snapshot.external_loads, lambda e: resource_root.get(e.resource_id))
+    resources = group(snapshot.resources, lambda r: resource_root.get(r.id))
+    program_resource_ids = group(snapshot.program_resource_ids, resource_root.get)
+    dependencies = group(
+        snapshot.dependencies,
+        lambda d: find(d.predecessor_id) if d.predecessor_id in parent else None,
+    )
+
+    return [
+        LevelingSnapshot(
+            program_id=snapshot.program_id,
+            start_date=snapshot.start_date,
+            end_date=snapshot.end_date,
+            activities=tuple(activities),
+            assignments=tuple(assignments[root]),
+            external_loads=tuple(external_loads[root]),
+            resources=tuple(resources[root]),
+            program_resource_ids=tuple(program_resource_ids[root]),
+            dependencies=tuple(dependencies[root]),
+        )
+        for root, activities in members.items()
+    ]
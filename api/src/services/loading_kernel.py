@@ -0,0 +1,221 @@
+"""Sweep-line resource loading kernel.
+
+Resource load per day is computed from assignment intervals in
+O(assignments + days) instead of checking every assignment on every
+day: each interval adds its weight at its first day and removes it after
+its last day, and a prefix sum over that delta array gives the load on
+every day of the range.
+
+Loads are integers. Allocation units are held in hundredths (1.0 units
+= 100) and hours in hundredths of an hour, so sums are exact and
+comparisons agree with the Decimal arithmetic of the models, whose
+units and capacities have two decimal places.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from numpy.typing import NDArray
+
+# Allocation units are tracked in hundredths (1.0 units = 100)
+FULL_ALLOCATION = 100
+
+# Number of weekday candidates tried when searching for a free slot
+MAX_SEARCH_DAYS = 365
+
+# Ordinals standing in for open-ended interval bounds
+_OPEN_START = 0
+_OPEN_FINISH = date.max.toordinal() + 1
+
+
+def to_hundredths(value: Decimal) -> int:
+    """Convert a two-decimal quantity (units or hours) to hundredths.
+
+    Args:
+        value: Quantity to convert
+
+    Returns:
+        Value in hundredths, rounded half up
+    """
+    return int((Decimal(value) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_hundredths(value: int) -> Decimal:
+    """Convert hundredths back to a two-decimal Decimal."""
+    return Decimal(int(value)).scaleb(-2)
+
+
+def hours_from_units(units: NDArray[np.int64], capacity: Decimal) -> NDArray[np.int64]:
+    """Hours in hundredths for daily units at a resource capacity.
+
+    units * capacity has four decimal places; the result is rounded half
+    up to hundredths, as Decimal quantize(ROUND_HALF_UP) would.
+
+    Args:
+        units: Non-negative daily allocation in hundredths of a unit
+        capacity: Resource capacity in hours per day
+
+    Returns:
+        Daily hours in hundredths of an hour
+    """
+    return (units * to_hundredths(capacity) + 50) // 100
+
+
+def weekday_mask(start: date, days: int) -> NDArray[np.bool_]:
+    """Flags for Monday to Friday over days consecutive days from start."""
+    return np.asarray((start.weekday() + np.arange(days)) % 7 < 5)
+
+
+def slot_window_days(duration: int, candidates: int = MAX_SEARCH_DAYS) -> int:
+    """Calendar days first_fit needs to see to try every candidate.
+
+    Args:
+        duration: Calendar days from start to finish of the work placed
+        candidates: Weekday starts to try
+
+    Returns:
+        Length of the blocked array to pass to first_fit
+    """
+    return candidates * 7 // 5 + 7 + max(duration, 0) + 1
+
+
+def first_fit(
+    start: date,
+    blocked: NDArray[np.bool_],
+    duration: int,
+    candidates: int = MAX_SEARCH_DAYS,
+    working: NDArray[np.bool_] | None = None,
+) -> int | None:
+    """Find the first working-day start whose whole span is free.
+
+    Candidates are the first `candidates` working days from start. A
+    candidate fits when no day of [candidate, candidate + duration] is
+    blocked; blocked should already exclude non-working days if they do
+    not count.
+
+    Args:
+        start: Date of blocked[0]
+        blocked: Per-day flags, at least slot_window_days(duration) long
+        duration: Calendar days from start to finish of the work placed
+        candidates: Working-day starts to try
+        working: Per-day working flags aligned with blocked (default
+            Monday to Friday)
+
+    Returns:
+        Day offset of the first fitting start, or None if none fits
+    """
+    if working is None:
+        working = weekday_mask(start, len(blocked))
+    prefix = np.concatenate(([0], np.cumsum(blocked, dtype=np.int64)))
+    starts = np.flatnonzero(working)[:candidates]
+    ends = starts + max(duration, -1) + 1
+    fits = np.flatnonzero(prefix[ends] == prefix[starts])
+    if len(fits) == 0:
+        return None
+    return int(starts[fits[0]])
+
+
+class LoadIntervals:
+    """Weighted, inclusive date intervals on one resource.
+
+    Intervals with an open start or finish (None) extend past either
+    edge of any queried range.
+
+    Example usage:
+        intervals = LoadIntervals.from_ranges(
+            (start, finish, to_hundredths(units)) for start, finish, units in rows
+        )
+        units = intervals.daily_totals(date(2024, 1, 1), date(2024, 12, 31))
+    """
+
+    def __init__(
+        self,
+        starts: NDArray[np.int64],
+        finishes: NDArray[np.int64],
+        weights: NDArray[np.int64],
+    ) -> None:
+        """Initialize from date ordinals.
+
+        Args:
+            starts: First day of each interval (date ordinal)
+            finishes: Last day of each interval (date ordinal, inclusive)
+            weights: Integer weight of each interval
+        """
+        self.starts = starts
+        self.finishes = finishes
+        self.weights = weights
+
+    @classmethod
+    def from_ranges(
+        cls,
+        ranges: Iterable[tuple[date | None, date | None, int]],
+    ) -> LoadIntervals:
+        """Build intervals from (start, finish, weight) tuples.
+
+        Args:
+            ranges: Inclusive date ranges with their weights; None bounds
+                are open
+
+        Returns:
+            LoadIntervals over the ranges
+        """
+        starts: list[int] = []
+        finishes: list[int] = []
+        weights: list[int] = []
+        for start, finish, weight in ranges:
+            starts.append(start.toordinal() if start is not None else _OPEN_START)
+            finishes.append(finish.toordinal() if finish is not None else _OPEN_FINISH)
+            weights.append(weight)
+        return cls(
+            np.array(starts, dtype=np.int64),
+            np.array(finishes, dtype=np.int64),
+            np.array(weights, dtype=np.int64),
+        )
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def daily_totals(self, start: date, end: date) -> NDArray[np.int64]:
+        """Sum of the weights of intervals active on each day.
+
+        Args:
+            start: First day (inclusive)
+            end: Last day (inclusive)
+
+        Returns:
+            Array with one total per day of [start, end]
+        """
+        return self._sweep(start, end, self.weights)
+
+    def daily_counts(self, start: date, end: date) -> NDArray[np.int64]:
+        """Number of intervals active on each day of [start, end]."""
+        return self._sweep(start, end, np.ones(len(self), dtype=np.int64))
+
+    def active_on(self, day: date) -> NDArray[np.intp]:
+        """Indices, in input order, of the intervals active on a day."""
+        ordinal = day.toordinal()
+        return np.flatnonzero((self.starts <= ordinal) & (self.finishes >= ordinal))
+
+    def _sweep(self, start: date, end: date, weights: NDArray[np.int64]) -> NDArray[np.int64]:
+        """Prefix-sum the interval deltas over [start, end]."""
+        days = (end - start).days + 1
+        if days <= 0:
+            return np.zeros(0, dtype=np.int64)
+
+        origin = start.toordinal()
+        first = np.clip(self.starts - origin, 0, days)
+        after = np.clip(self.finishes - origin + 1, 0, days)
+        inside = first < after
+
+        delta = np.zeros(days + 1, dtype=np.int64)
+        np.add.at(delta, first[inside], weights[inside])
+        np.add.at(delta, after[inside], -weights[inside])
+        return np.cumsum(delta[:-1])
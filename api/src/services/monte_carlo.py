@@ -9,6 +9,9 @@ Supported probability distributions:
 - PERT: min, mode, max (beta distribution with better central tendency)
 - Normal: mean, std (Gaussian distribution)
 - Uniform: min, max (equal probability across range)
+
+Large runs can be evaluated in chunks (see monte_carlo_streaming) to
+bound memory, report progress and stop once P80 has converged.
 """
 
 import time
@@ -20,6 +23,15 @@ from uuid import UUID
 import numpy as np
 from numpy.typing import NDArray
 
+from src.services.monte_carlo_streaming import (
+    ACTIVITY_HISTOGRAM_BINS,
+    DEFAULT_CHUNK_SIZE,
+    ProgressCallback,
+    QuantileHistogram,
+    chunk_sizes,
+    progress_from_histogram,
+)
+
 
 class DistributionType(str, Enum):
     """Supported probability distributions."""
@@ -83,6 +95,9 @@ class SimulationInput:
         iterations: Number of simulation iterations
         seed: Optional random seed for reproducibility
         include_activity_stats: Whether to compute per-activity statistics
+        chunk_size: Evaluate iterations in batches of this size
+        convergence_tolerance: Stop early once the 95% interval of P80 is
+            within this fraction of P80 (implies chunking)
     """
 
     activity_durations: dict[UUID, DistributionParams]
@@ -90,6 +105,8 @@ class SimulationInput:
     iterations: int = 1000
     seed: int | None = None
     include_activity_stats: bool = False
+    chunk_size: int | None = None
+    convergence_tolerance: float | None = None
 
 
 @dataclass
@@ -100,7 +117,7 @@ class SimulationOutput:
     and optional histogram data for visualization.
 
     Attributes:
-        duration_samples: Raw duration samples (iterations,)
+        duration_samples: Raw duration samples (iterations,); empty when chunked
         duration_p10-p90: Duration percentiles
         duration_mean/std/min/max: Duration statistics
         cost_*: Cost metrics (if cost distributions provided)
@@ -108,6 +125,7 @@ class SimulationOutput:
         histogram_bins/counts: Histogram data for visualization
         iterations: Number of iterations completed
         elapsed_seconds: Computation time
+        converged: Whether a chunked run stopped early on P80 convergence
     """
 
     # Duration results
@@ -145,6 +163,7 @@ class SimulationOutput:
     iterations: int = 0
     elapsed_seconds: float = 0.0
     seed: int | None = None
+    converged: bool = False
 
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary for JSON serialization."""
@@ -238,7 +257,11 @@ class MonteCarloEngine:
         self.seed = seed
         self.rng = np.random.default_rng(seed)
 
-    def simulate(self, input_data: SimulationInput) -> SimulationOutput:
+    def simulate(
+        self,
+        input_data: SimulationInput,
+        progress_callback: ProgressCallback | None = None,
+    ) -> SimulationOutput:
         """
         Run Monte Carlo simulation.
 
@@ -249,8 +272,13 @@ class MonteCarloEngine:
         For a more accurate simulation with dependencies, the CPM
         network would need to be simulated for each iteration.
 
+        When chunk_size or convergence_tolerance is set, iterations are
+        evaluated in batches with streaming statistics instead (see
+        _simulate_chunked).
+
         Args:
             input_data: Simulation parameters and distributions
+            progress_callback: Called with running estimates after each chunk
 
         Returns:
             SimulationOutput with percentiles, statistics, and histograms
@@ -275,6 +303,9 @@ class MonteCarloEngine:
         else:
             used_seed = self.seed
 
+        if input_data.chunk_size is not None or input_data.convergence_tolerance is not None:
+            return self._simulate_chunked(input_data, used_seed, progress_callback, start_time)
+
         # Generate duration samples for all activities
         duration_matrix = self._generate_samples(
             input_data.activity_durations,
@@ -306,7 +337,7 @@ class MonteCarloEngine:
         elapsed = time.perf_counter() - start_time
 
         # Build output with statistics and histograms
-        return self._build_output(
+        output = self._build_output(
             total_durations=total_durations,
             total_costs=total_costs,
             activity_stats=activity_stats,
@@ -315,6 +346,136 @@ class MonteCarloEngine:
             seed=used_seed,
         )
 
+        if progress_callback is not None:
+            histogram = QuantileHistogram()
+            histogram.update(total_durations)
+            progress_callback(progress_from_histogram(histogram, iterations))
+
+        return output
+
+    def _simulate_chunked(
+        self,
+        input_data: SimulationInput,
+        seed: int | None,
+        progress_callback: ProgressCallback | None,
+        start_time: float,
+    ) -> SimulationOutput:
+        """
+        Run the simulation in fixed-size batches with streaming statistics.
+
+        Each batch draws from its own generator spawned from
+        SeedSequence(seed), so results depend only on the seed and chunk
+        size. Totals and per-activity samples are folded into mergeable
+        histograms; only one batch of samples is alive at a time. After
+        each batch the running percentiles are published, and the run
+        stops early once the P80 interval meets convergence_tolerance.
+
+        Percentiles are histogram estimates (see monte_carlo_streaming);
+        mean, std, min and max are exact.
+        """
+        iterations = input_data.iterations
+        tolerance = input_data.convergence_tolerance
+        seed_sequence = np.random.SeedSequence(seed)
+
+        durations_hist = QuantileHistogram()
+        costs_hist = QuantileHistogram() if input_data.activity_costs else None
+        activity_hist = (
+            QuantileHistogram(len(input_data.activity_durations), ACTIVITY_HISTOGRAM_BINS)
+            if input_data.include_activity_stats
+            else None
+        )
+
+        converged = False
+        for size in chunk_sizes(iterations, input_data.chunk_size or DEFAULT_CHUNK_SIZE):
+            self.rng = np.random.default_rng(seed_sequence.spawn(1)[0])
+
+            duration_matrix = self._generate_samples(input_data.activity_durations, size)
+            durations_hist.update(np.sum(duration_matrix, axis=1))
+            if activity_hist is not None:
+                activity_hist.update(duration_matrix.T)
+            if costs_hist is not None and input_data.activity_costs:
+                cost_matrix = self._generate_samples(input_data.activity_costs, size)
+                costs_hist.update(np.sum(cost_matrix, axis=1))
+
+            progress = progress_from_histogram(durations_hist, iterations)
+            if progress_callback is not None:
+                progress_callback(progress)
+
+            if (
+                tolerance is not None
+                and durations_hist.count < iterations
+                and progress.has_converged(tolerance)
+            ):
+                converged = True
+                break
+
+        activity_stats: dict[str, dict[str, float]] | None = None
+        if activity_hist is not None:
+            activity_stats = self._summarize_histogram(
+                [str(a) for a in input_data.activity_durations], activity_hist
+            )
+
+        duration_stats = self._summarize_histogram(["total"], durations_hist)["total"]
+        dur_bins, dur_counts = durations_hist.histogram()
+        output = SimulationOutput(
+            duration_samples=np.empty(0),
+            duration_p10=duration_stats["p10"],
+            duration_p50=duration_stats["p50"],
+            duration_p80=duration_stats["p80"],
+            duration_p90=duration_stats["p90"],
+            duration_mean=duration_stats["mean"],
+            duration_std=duration_stats["std"],
+            duration_min=duration_stats["min"],
+            duration_max=duration_stats["max"],
+            duration_histogram_bins=dur_bins,
+            duration_histogram_counts=dur_counts,
+            activity_stats=activity_stats,
+            iterations=durations_hist.count,
+            seed=seed,
+            converged=converged,
+        )
+
+        if costs_hist is not None:
+            cost_stats = self._summarize_histogram(["total"], costs_hist)["total"]
+            output.cost_samples = np.empty(0)
+            output.cost_p10 = cost_stats["p10"]
+            output.cost_p50 = cost_stats["p50"]
+            output.cost_p80 = cost_stats["p80"]
+            output.cost_p90 = cost_stats["p90"]
+            output.cost_mean = cost_stats["mean"]
+            output.cost_std = cost_stats["std"]
+            output.cost_min = cost_stats["min"]
+            output.cost_max = cost_stats["max"]
+            output.cost_histogram_bins, output.cost_histogram_counts = costs_hist.histogram()
+
+        output.elapsed_seconds = time.perf_counter() - start_time
+        return output
+
+    @staticmethod
+    def _summarize_histogram(
+        keys: list[str], histogram: QuantileHistogram
+    ) -> dict[str, dict[str, float]]:
+        """Convert streaming histograms to percentile/moment dicts per series."""
+        p10, p50, p80, p90 = histogram.quantiles([0.1, 0.5, 0.8, 0.9]).T.tolist()
+        means = histogram.mean.tolist()
+        stds = histogram.std.tolist()
+        mins = histogram.minimum.tolist()
+        maxs = histogram.maximum.tolist()
+
+        return {
+            key: {
+                "mean": means[j],
+                "std": stds[j],
+                "min": mins[j],
+                "max": maxs[j],
+                "p10": p10[j],
+                "p50": p50[j],
+                "p80": p80[j],
+                "p90": p90[j],
+            }
+            for j, key in enumerate(keys)
+        }
+
     def _generate_samples(
         self,
         distributions: dict[UUID, DistributionParams],
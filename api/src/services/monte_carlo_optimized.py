@@ -4,29 +4,88 @@ This module provides a high-performance Monte Carlo simulation engine
 that uses vectorized operations to achieve <5s for 1000 iterations.
 
 Key optimizations:
-1. Pre-compute network topology once (adjacency matrix, topological order)
-2. Vectorize forward pass across all iterations using NumPy
-3. Avoid Python loops where possible
+1. Pre-compute network topology once (CSR edge arrays, O(n + e) memory)
+2. Vectorize forward and backward passes across all iterations using NumPy
+3. Level scheduling: all activities at one topological depth per step
 4. Use NumPy broadcasting for parallel computation
 
 The optimization avoids creating a new CPMEngine for each iteration,
-instead performing the forward pass using matrix operations.
+instead performing the CPM passes using matrix operations. All four
+dependency types (FS, SS, FF, SF) with lags are supported, and
+criticality is derived from per-iteration total float.
+
+With chunk_size (or convergence_tolerance) set, iterations are evaluated
+in batches folded into streaming statistics, bounding memory by the
+chunk size and allowing progress reporting and early stopping. With
+workers set, the batches are evaluated in a process pool that reads the
+compiled network from shared memory and returns only mergeable partial
+statistics.
 """
 
 import time
+from collections import deque
 from collections.abc import Sequence
 from dataclasses import dataclass, field
-from typing import Protocol
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Protocol
 from uuid import UUID
 
 import numpy as np
 from numpy.typing import NDArray
 
+from src.core.exceptions import CircularDependencyError
+from src.services.cpm_network import (
+    DEP_FF,
+    DEP_FS,
+    DEP_SF,
+    DEP_SS,
+    CompiledNetwork,
+    compile_network,
+)
 from src.services.monte_carlo import (
     DistributionParams,
     DistributionType,
     MonteCarloEngine,
 )
+from src.services.monte_carlo_parallel import (
+    SharedArrays,
+    SharedArraySpec,
+    attach_shared_arrays,
+    process_pool,
+    resolve_workers,
+    spawn_task_seeds,
+)
+from src.services.monte_carlo_streaming import (
+    ACTIVITY_HISTOGRAM_BINS,
+    DEFAULT_CHUNK_SIZE,
+    CorrelationAccumulator,
+    ProgressCallback,
+    QuantileHistogram,
+    chunk_sizes,
+    progress_from_histogram,
+)
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+# Activities with total float at or below this many days count as critical
+CRITICAL_FLOAT_TOLERANCE = 1e-3
+
+# Tasks queued per worker process ahead of the one being merged
+PARALLEL_TASKS_PER_WORKER = 2
+
+# CompiledNetwork arrays placed in shared memory for worker processes
+_SHARED_NETWORK_ARRAYS = (
+    "pred_ptr",
+    "pred_idx",
+    "pred_type",
+    "pred_lag",
+    "succ_ptr",
+    "succ_idx",
+    "succ_type",
+    "succ_lag",
+    "order",
+)
 
 
 class ActivityProtocol(Protocol):
@@ -50,13 +109,15 @@ class OptimizedNetworkSimulationOutput:
     """Output from optimized network Monte Carlo simulation.
 
     Attributes:
-        project_duration_samples: Raw samples of project duration
+        project_duration_samples: Raw samples of project duration; empty when chunked
         project_duration_p10-p90: Duration percentiles
         project_duration_mean/std: Duration statistics
         activity_criticality: % of iterations each activity was critical
+        activity_float_distributions: Total float stats per activity
         sensitivity: Correlation of each activity with project duration
         iterations: Number of iterations completed
         elapsed_seconds: Computation time
+        converged: Whether a chunked run stopped early on P80 convergence
     """
 
     # Project duration distribution
@@ -76,6 +137,9 @@ class OptimizedNetworkSimulationOutput:
     # Finish date distribution by activity
     activity_finish_distributions: dict[UUID, dict[str, float]] = field(default_factory=dict)
 
+    # Total float distribution by activity
+    activity_float_distributions: dict[UUID, dict[str, float]] = field(default_factory=dict)
+
     # Sensitivity (correlation with project duration)
     sensitivity: dict[UUID, float] = field(default_factory=dict)
 
@@ -87,6 +151,124 @@ class OptimizedNetworkSimulationOutput:
     iterations: int = 0
     elapsed_seconds: float = 0.0
     seed: int | None = None
+    converged: bool = False
+
+
+@dataclass
+class _ActivityDuration:
+    """Activity stand-in rebuilt inside worker processes."""
+
+    id: UUID
+    duration: int
+
+
+@dataclass
+class _ChunkStatistics:
+    """Mergeable statistics for a batch of iterations.
+
+    Holds everything a chunked or parallel run reports, so batches can be
+    evaluated anywhere and combined without their sample matrices.
+    """
+
+    project: QuantileHistogram
+    finish: QuantileHistogram
+    total_float: QuantileHistogram
+    sensitivity: CorrelationAccumulator
+    critical_counts: NDArray[np.int64]
+
+    @classmethod
+    def empty(cls, n_activities: int) -> "_ChunkStatistics":
+        """Statistics with no iterations recorded."""
+        return cls(
+            project=QuantileHistogram(),
+            finish=QuantileHistogram(n_activities, ACTIVITY_HISTOGRAM_BINS),
+            total_float=QuantileHistogram(n_activities, ACTIVITY_HISTOGRAM_BINS),
+            sensitivity=CorrelationAccumulator(n_activities),
+            critical_counts=np.zeros(n_activities, dtype=np.int64),
+        )
+
+    @property
+    def iterations(self) -> int:
+        """Iterations recorded."""
+        return self.project.count
+
+    def add(
+        self,
+        durations_t: NDArray[np.float64],
+        early_finish_t: NDArray[np.float64],
+        total_float_t: NDArray[np.float64],
+        project_durations: NDArray[np.float64],
+    ) -> None:
+        """Fold one evaluated batch (activity-major arrays) into the statistics."""
+        self.critical_counts += np.count_nonzero(
+            np.less_equal(total_float_t, CRITICAL_FLOAT_TOLERANCE), axis=1
+        )
+        self.project.update(project_durations)
+        self.finish.update(early_finish_t)
+        self.total_float.update(total_float_t)
+        self.sensitivity.update(durations_t, project_durations)
+
+    def merge(self, other: "_ChunkStatistics") -> None:
+        """Combine statistics recorded for a disjoint batch."""
+        self.critical_counts += other.critical_counts
+        self.project.merge(other.project)
+        self.finish.merge(other.finish)
+        self.total_float.merge(other.total_float)
+        self.sensitivity.merge(other.sensitivity)
+
+
+@dataclass
+class _ParallelWorkerState:
+    """Per-process inputs of a parallel run, set up by the pool initializer."""
+
+    shm: SharedMemory
+    engine: "OptimizedNetworkMonteCarloEngine"
+    activities: list[_ActivityDuration]
+    distributions: dict[UUID, DistributionParams]
+    network: CompiledNetwork
+
+
+_worker_state: _ParallelWorkerState | None = None
+
+
+def _init_parallel_worker(
+    spec: SharedArraySpec,
+    activities: list[_ActivityDuration],
+    distributions: dict[UUID, DistributionParams],
+) -> None:
+    """Attach a pool process to the shared network of a parallel run."""
+    global _worker_state
+    shm, arrays = attach_shared_arrays(spec)
+    activity_ids = [a.id for a in activities]
+    network = CompiledNetwork(
+        activity_ids=activity_ids,
+        pred_ptr=arrays["pred_ptr"],
+        pred_idx=arrays["pred_idx"],
+        pred_type=arrays["pred_type"],
+        pred_lag=arrays["pred_lag"],
+        succ_ptr=arrays["succ_ptr"],
+        succ_idx=arrays["succ_idx"],
+        succ_type=arrays["succ_type"],
+        succ_lag=arrays["succ_lag"],
+        order=arrays["order"],
+    )
+    _worker_state = _ParallelWorkerState(
+        shm=shm,
+        engine=OptimizedNetworkMonteCarloEngine(),
+        activities=activities,
+        distributions=distributions,
+        network=network,
+    )
+
+
+def _run_parallel_task(seed_sequence: np.random.SeedSequence, size: int) -> _ChunkStatistics:
+    """Evaluate one task inside a pool process."""
+    state = _worker_state
+    if state is None:
+        raise RuntimeError("parallel Monte Carlo worker was not initialized")
+    return state.engine._evaluate_task(
+        state.activities, state.distributions, state.network, seed_sequence, size
+    )
 
 
 class OptimizedNetworkMonteCarloEngine:
@@ -95,9 +277,14 @@ class OptimizedNetworkMonteCarloEngine:
 
     Key optimizations over standard NetworkMonteCarloEngine:
     1. Pre-compute network topology once (O(1) per iteration instead of O(n))
-    2. Vectorized forward pass across iterations (NumPy broadcasting)
+    2. Vectorized forward and backward passes across iterations (NumPy broadcasting)
     3. Avoid creating CPMEngine objects per iteration
-    4. Use adjacency matrix instead of graph library
+    4. Compiled CSR network (see cpm_network) instead of dense n x n matrices,
+       processed one topological depth at a time
+
+    Supports FS, SS, FF and SF dependencies with lags. An activity is
+    counted as critical in an iteration when its total float is zero
+    (within CRITICAL_FLOAT_TOLERANCE).
 
     Performance target: <5s for 1000 iterations with 100 activities.
 
@@ -129,82 +316,110 @@ class OptimizedNetworkMonteCarloEngine:
         dependencies: Sequence[DependencyProtocol],
         distributions: dict[UUID, DistributionParams],
         iterations: int = 1000,
+        *,
+        chunk_size: int | None = None,
+        convergence_tolerance: float | None = None,
+        progress_callback: ProgressCallback | None = None,
+        workers: int | None = None,
     ) -> OptimizedNetworkSimulationOutput:
         """
         Run optimized Monte Carlo simulation.
 
-        Uses vectorized CPM forward pass for better performance.
+        Uses vectorized CPM forward and backward passes for better performance.
+
+        With workers set, iterations are split into chunk_size tasks
+        evaluated by that many processes. Task k always uses child k of
+        SeedSequence(seed), so a seeded run gives the same output for any
+        worker count.
 
         Args:
             activities: List of activities with id and duration
             dependencies: List of dependencies between activities
             distributions: Map of activity ID to distribution params
             iterations: Number of simulation iterations
+            chunk_size: Evaluate iterations in batches of this size
+            convergence_tolerance: Stop early once the 95% interval of P80 is
+                within this fraction of P80 (implies chunking)
+            progress_callback: Called with running estimates after each chunk
+            workers: Worker processes for a parallel run (0 = one per CPU,
+                1 = run the tasks in this process)
 
         Returns:
             OptimizedNetworkSimulationOutput with distributions and metrics
+
+        Raises:
+            CircularDependencyError: If the dependency network contains a cycle
         """
         start_time = time.perf_counter()
 
-        n_activities = len(activities)
         activity_ids = [a.id for a in activities]
-        activity_index = {aid: i for i, aid in enumerate(activity_ids)}
+
+        # Compile the network once into O(n + e) CSR arrays
+        network = compile_network(activity_ids, dependencies)
+        if network.has_cycle:
+            raise CircularDependencyError(network.cycle)
+
+        if workers is not None:
+            return self._simulate_parallel(
+                activities,
+                distributions,
+                network,
+                iterations,
+                workers=resolve_workers(workers),
+                chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                convergence_tolerance=convergence_tolerance,
+                progress_callback=progress_callback,
+                start_time=start_time,
+            )
+
+        if chunk_size is not None or convergence_tolerance is not None:
+            return self._simulate_chunked(
+                activities,
+                distributions,
+                network,
+                iterations,
+                chunk_size=chunk_size or DEFAULT_CHUNK_SIZE,
+                convergence_tolerance=convergence_tolerance,
+                progress_callback=progress_callback,
+                start_time=start_time,
+            )
 
         # Pre-generate all random samples (vectorized)
         # Shape: (iterations, n_activities)
         duration_samples = self._generate_all_samples(activities, distributions, iterations)
 
-        # Build adjacency structures for network
-        # predecessor_matrix[i, j] = True if j is predecessor of i
-        # lag_matrix[i, j] = lag from j to i
-        predecessor_matrix = np.zeros((n_activities, n_activities), dtype=bool)
-        lag_matrix = np.zeros((n_activities, n_activities), dtype=np.float64)
-
-        for dep in dependencies:
-            # Currently only support FS (Finish-to-Start) for vectorized version
-            if dep.dependency_type == "FS":
-                pred_idx = activity_index.get(dep.predecessor_id)
-                succ_idx = activity_index.get(dep.successor_id)
-                if pred_idx is not None and succ_idx is not None:
-                    predecessor_matrix[succ_idx, pred_idx] = True
-                    lag_matrix[succ_idx, pred_idx] = dep.lag
-
-        # Compute topological order once
-        topo_order = self._topological_sort(predecessor_matrix)
-
-        # Vectorized forward pass - compute all iterations at once
-        # early_finish[iter, activity] = early finish for that activity
-        early_finish = self._vectorized_forward_pass(
-            duration_samples, predecessor_matrix, lag_matrix, topo_order, iterations
-        )
+        # The passes gather whole activity rows, so work activity-major:
+        # shape (n_activities, iterations)
+        durations_t = np.ascontiguousarray(duration_samples.T)
 
-        # Project duration = max early finish per iteration
-        project_durations = np.max(early_finish, axis=1)
-
-        # Calculate criticality using vectorized approach
-        # An activity is critical if it's on the longest path
-        activity_criticality = self._calculate_criticality_vectorized(
-            early_finish,
-            duration_samples,
-            predecessor_matrix,
-            project_durations,
-            activity_ids,
-            iterations,
+        early_finish_t, total_float_t, project_durations = self._evaluate_iterations(
+            durations_t, network
         )
 
-        # Calculate activity finish distributions
+        # An activity is critical in an iteration when it has no total float
+        activity_criticality = self._calculate_criticality_from_float(total_float_t, activity_ids)
+
+        # Calculate activity finish and float distributions
         activity_finish_distributions = self._calculate_finish_distributions(
-            early_finish, activity_ids
+            early_finish_t, activity_ids
+        )
+        activity_float_distributions = self._calculate_finish_distributions(
+            total_float_t, activity_ids
         )
 
         # Calculate sensitivity (correlation with project duration)
-        sensitivity = self._calculate_sensitivity(duration_samples, project_durations, activity_ids)
+        sensitivity = self._calculate_sensitivity(durations_t, project_durations, activity_ids)
 
         # Calculate histogram
         hist_counts, hist_bins = np.histogram(project_durations, bins="auto")
 
         elapsed = time.perf_counter() - start_time
 
+        if progress_callback is not None:
+            histogram = QuantileHistogram()
+            histogram.update(project_durations)
+            progress_callback(progress_from_histogram(histogram, iterations))
+
         return OptimizedNetworkSimulationOutput(
             project_duration_samples=project_durations,
             project_duration_p10=float(np.percentile(project_durations, 10)),
@@ -217,6 +432,7 @@ class OptimizedNetworkMonteCarloEngine:
             project_duration_max=float(np.max(project_durations)),
             activity_criticality=activity_criticality,
             activity_finish_distributions=activity_finish_distributions,
+            activity_float_distributions=activity_float_distributions,
             sensitivity=sensitivity,
             duration_histogram_bins=hist_bins,
             duration_histogram_counts=hist_counts,
@@ -225,6 +441,232 @@ class OptimizedNetworkMonteCarloEngine:
             seed=self.seed,
         )
 
+    def _evaluate_iterations(
+        self,
+        durations_t: NDArray[np.float64],
+        network: CompiledNetwork,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64], NDArray[np.float64]]:
+        """Run both CPM passes for a block of iterations.
+
+        Args:
+            durations_t: Shape (n_activities, iterations)
+            network: Compiled activity network
+
+        Returns:
+            Tuple of (early finish, total float), each shape
+            (n_activities, iterations), and project durations (iterations,)
+        """
+        # Vectorized forward pass - all iterations, one step per depth
+        early_start_t, early_finish_t = self._vectorized_forward_pass(durations_t, network)
+
+        # Project duration = max early finish per iteration
+        project_durations = np.max(early_finish_t, axis=0)
+
+        # Vectorized backward pass gives per-iteration total float
+        late_start_t = self._vectorized_backward_pass(durations_t, project_durations, network)
+        total_float_t = np.subtract(late_start_t, early_start_t, out=late_start_t)
+
+        return early_finish_t, total_float_t, project_durations
+
+    def _simulate_chunked(
+        self,
+        activities: Sequence[ActivityProtocol],
+        distributions: dict[UUID, DistributionParams],
+        network: CompiledNetwork,
+        iterations: int,
+        *,
+        chunk_size: int,
+        convergence_tolerance: float | None,
+        progress_callback: ProgressCallback | None,
+        start_time: float,
+    ) -> OptimizedNetworkSimulationOutput:
+        """Run the simulation in fixed-size batches with streaming statistics.
+
+        Each batch draws from its own generator spawned from
+        SeedSequence(seed) and runs both CPM passes; only one batch of
+        (n_activities, chunk_size) arrays is alive at a time. Project
+        duration, finish dates and float are folded into mergeable
+        histograms, criticality into per-activity counts and sensitivity
+        into co-moments. Running percentiles are published after each
+        batch, and the run stops early once the P80 interval meets
+        convergence_tolerance.
+
+        Percentiles are histogram estimates (see monte_carlo_streaming);
+        criticality, sensitivity, mean, std, min and max are exact.
+        """
+        statistics = _ChunkStatistics.empty(len(activities))
+        seed_sequence = np.random.SeedSequence(self.seed)
+
+        converged = False
+        for size in chunk_sizes(iterations, chunk_size):
+            self.rng = np.random.default_rng(seed_sequence.spawn(1)[0])
+
+            samples = self._generate_all_samples(activities, distributions, size)
+            durations_t = np.ascontiguousarray(samples.T)
+            statistics.add(durations_t, *self._evaluate_iterations(durations_t, network))
+
+            if self._should_stop(statistics, iterations, convergence_tolerance, progress_callback):
+                converged = True
+                break
+
+        return self._output_from_statistics(
+            statistics,
+            [a.id for a in activities],
+            start_time=start_time,
+            converged=converged,
+        )
+
+    def _simulate_parallel(
+        self,
+        activities: Sequence[ActivityProtocol],
+        distributions: dict[UUID, DistributionParams],
+        network: CompiledNetwork,
+        iterations: int,
+        *,
+        workers: int,
+        chunk_size: int,
+        convergence_tolerance: float | None,
+        progress_callback: ProgressCallback | None,
+        start_time: float,
+    ) -> OptimizedNetworkSimulationOutput:
+        """Run chunk_size tasks across worker processes and merge their statistics.
+
+        The CSR arrays of the compiled network are copied once into a
+        shared memory block that every worker attaches to; tasks only
+        carry their seed and size, and return _ChunkStatistics rather than
+        sample matrices. Partial statistics are merged in task order, with
+        at most PARALLEL_TASKS_PER_WORKER tasks per worker in flight, so
+        output, progress and early stopping are independent of the worker
+        count. workers=1 (or a single task) evaluates the same tasks in this
+        process.
+        """
+        sizes = chunk_sizes(iterations, chunk_size)
+        seeds = spawn_task_seeds(self.seed, len(sizes))
+        statistics = _ChunkStatistics.empty(len(activities))
+        converged = False
+
+        def merge(partial: _ChunkStatistics) -> bool:
+            statistics.merge(partial)
+            return self._should_stop(
+                statistics, iterations, convergence_tolerance, progress_callback
+            )
+
+        if workers == 1 or len(sizes) < 2:
+            for seed_sequence, size in zip(seeds, sizes, strict=True):
+                partial = self._evaluate_task(
+                    activities, distributions, network, seed_sequence, size
+                )
+                if merge(partial):
+                    converged = True
+                    break
+        else:
+            worker_activities = [_ActivityDuration(a.id, a.duration) for a in activities]
+            shared_arrays = {name: getattr(network, name) for name in _SHARED_NETWORK_ARRAYS}
+            with SharedArrays(shared_arrays) as shared:
+                pool = process_pool(
+                    min(workers, len(sizes)),
+                    _init_parallel_worker,
+                    (shared.spec, worker_activities, distributions),
+                )
+                try:
+                    tasks = iter(zip(seeds, sizes, strict=True))
+                    pending: deque[Future[_ChunkStatistics]] = deque()
+                    for seed_sequence, size in tasks:
+                        pending.append(pool.submit(_run_parallel_task, seed_sequence, size))
+                        if len(pending) < workers * PARALLEL_TASKS_PER_WORKER:
+                            continue
+                        if merge(pending.popleft().result()):
+                            converged = True
+                            break
+                    while pending and not converged:
+                        converged = merge(pending.popleft().result())
+                finally:
+                    pool.shutdown(wait=True, cancel_futures=True)
+
+        return self._output_from_statistics(
+            statistics,
+            [a.id for a in activities],
+            start_time=start_time,
+            converged=converged,
+        )
+
+    def _evaluate_task(
+        self,
+        activities: Sequence[ActivityProtocol],
+        distributions: dict[UUID, DistributionParams],
+        network: CompiledNetwork,
+        seed_sequence: np.random.SeedSequence,
+        size: int,
+    ) -> _ChunkStatistics:
+        """Sample and evaluate one parallel task from its own seed stream."""
+        self.rng = np.random.default_rng(seed_sequence)
+        samples = self._generate_all_samples(activities, distributions, size)
+        durations_t = np.ascontiguousarray(samples.T)
+
+        statistics = _ChunkStatistics.empty(len(activities))
+        statistics.add(durations_t, *self._evaluate_iterations(durations_t, network))
+        return statistics
+
+    @staticmethod
+    def _should_stop(
+        statistics: _ChunkStatistics,
+        iterations: int,
+        convergence_tolerance: float | None,
+        progress_callback: ProgressCallback | None,
+    ) -> bool:
+        """Publish progress after a batch and check for early stopping."""
+        progress = progress_from_histogram(statistics.project, iterations)
+        if progress_callback is not None:
+            progress_callback(progress)
+
+        return (
+            convergence_tolerance is not None
+            and statistics.iterations < iterations
+            and progress.has_converged(convergence_tolerance)
+        )
+
+    def _output_from_statistics(
+        self,
+        statistics: _ChunkStatistics,
+        activity_ids: list[UUID],
+        *,
+        start_time: float,
+        converged: bool,
+    ) -> OptimizedNetworkSimulationOutput:
+        """Build the simulation output from merged batch statistics."""
+        project_hist = statistics.project
+        completed = project_hist.count
+        p10, p50, p80, p90 = project_hist.quantiles([0.1, 0.5, 0.8, 0.9])[0].tolist()
+        hist_bins, hist_counts = project_hist.histogram()
+        percentages = statistics.critical_counts / completed * 100
+        sensitivity = statistics.sensitivity.correlation()
+
+        return OptimizedNetworkSimulationOutput(
+            project_duration_samples=np.empty(0),
+            project_duration_p10=p10,
+            project_duration_p50=p50,
+            project_duration_p80=p80,
+            project_duration_p90=p90,
+            project_duration_mean=float(project_hist.mean[0]),
+            project_duration_std=float(project_hist.std[0]),
+            project_duration_min=float(project_hist.minimum[0]),
+            project_duration_max=float(project_hist.maximum[0]),
+            activity_criticality=dict(zip(activity_ids, percentages.tolist(), strict=True)),
+            activity_finish_distributions=self._summarize_histogram(
+                statistics.finish, activity_ids
+            ),
+            activity_float_distributions=self._summarize_histogram(
+                statistics.total_float, activity_ids
+            ),
+            sensitivity=dict(zip(activity_ids, sensitivity.tolist(), strict=True)),
+            duration_histogram_bins=hist_bins,
+            duration_histogram_counts=hist_counts,
+            iterations=completed,
+            elapsed_seconds=time.perf_counter() - start_time,
+            seed=self.seed,
+            converged=converged,
+        )
+
     def _generate_all_samples(
         self,
         activities: Sequence[ActivityProtocol],
@@ -254,208 +696,253 @@ class OptimizedNetworkMonteCarloEngine:
 
         return samples
 
-    def _topological_sort(self, predecessor_matrix: NDArray[np.bool_]) -> list[int]:
-        """Compute topological order using Kahn's algorithm.
+    def _vectorized_forward_pass(
+        self,
+        durations_t: NDArray[np.float64],
+        network: CompiledNetwork,
+    ) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Perform vectorized forward pass for all iterations.
+
+        This is the key optimization - instead of running CPM for each
+        iteration, we compute the forward pass for all iterations at once.
+        Activities are level-scheduled: every activity at the same
+        topological depth is computed in one vectorized step, reducing
+        over its incoming edges with ``np.maximum.reduceat``.
+
+        For each predecessor edge the successor's start is constrained by:
+        - FS: ES >= pred.EF + lag
+        - SS: ES >= pred.ES + lag
+        - FF: ES >= pred.EF + lag - duration
+        - SF: ES >= pred.ES + lag - duration
 
         Args:
-            predecessor_matrix: Boolean matrix where [i,j]=True means j precedes i
+            durations_t: Shape (n_activities, iterations)
+            network: Compiled activity network
 
         Returns:
-            List of activity indices in topological order
+            Tuple of (early start, early finish), each shape (n_activities, iterations)
         """
-        in_degree = predecessor_matrix.sum(axis=1).astype(int)
-        queue = list(np.where(in_degree == 0)[0])
-        order = []
-
-        while queue:
-            node = queue.pop(0)
-            order.append(node)
-
-            # Find successors (rows where this node is a predecessor)
-            successors = np.where(predecessor_matrix[:, node])[0]
-
-            for succ in successors:
-                in_degree[succ] -= 1
-                if in_degree[succ] == 0:
-                    queue.append(succ)
-
-        return order
-
-    def _vectorized_forward_pass(
+        n_activities = network.size
+        # Rows 0..n-1 hold early start, rows n..2n-1 early finish, so each
+        # edge's anchor (start or finish of its predecessor) is one gather
+        schedule = np.zeros((2 * n_activities, durations_t.shape[1]))
+        early_start = schedule[:n_activities]
+        early_finish = schedule[n_activities:]
+        early_finish[:] = durations_t
+
+        types = network.pred_type
+        from_finish = (types == DEP_FS) | (types == DEP_FF)
+        to_finish = (types == DEP_FF) | (types == DEP_SF)
+        anchor_rows = network.pred_idx + n_activities * from_finish
+        lags = network.pred_lag.astype(np.float64)
+
+        for level in network.levels.forward:
+            edges = level.edges
+            # Shape: (n_edges, iterations)
+            candidates = schedule[anchor_rows[edges]]
+            candidates += lags[edges, np.newaxis]
+
+            # FF/SF edges constrain the successor's finish
+            finish_mask = to_finish[edges]
+            if finish_mask.any():
+                candidates[finish_mask] -= durations_t[level.edge_nodes[finish_mask]]
+
+            start = np.maximum.reduceat(candidates, level.offsets, axis=0)
+            # Activities never start before the project start
+            np.maximum(start, 0.0, out=start)
+            early_start[level.nodes] = start
+            early_finish[level.nodes] = start + durations_t[level.nodes]
+
+        return early_start, early_finish
+
+    def _vectorized_backward_pass(
         self,
-        duration_samples: NDArray[np.float64],
-        predecessor_matrix: NDArray[np.bool_],
-        lag_matrix: NDArray[np.float64],
-        topo_order: list[int],
-        iterations: int,
+        durations_t: NDArray[np.float64],
+        project_durations: NDArray[np.float64],
+        network: CompiledNetwork,
     ) -> NDArray[np.float64]:
-        """Perform vectorized forward pass for all iterations.
+        """Perform vectorized backward pass for all iterations.
 
-        This is the key optimization - instead of running CPM for each
-        iteration, we compute the forward pass for all iterations at once
-        using NumPy broadcasting.
+        Mirrors the forward pass by decreasing depth, reducing over each
+        activity's outgoing edges with ``np.minimum.reduceat``. For each
+        successor edge the predecessor's finish is constrained by:
+        - FS: LF <= succ.LS - lag
+        - SS: LF <= succ.LS - lag + duration
+        - FF: LF <= succ.LF - lag
+        - SF: LF <= succ.LF - lag + duration
 
         Args:
-            duration_samples: Shape (iterations, n_activities)
-            predecessor_matrix: Shape (n_activities, n_activities)
-            lag_matrix: Shape (n_activities, n_activities)
-            topo_order: Activities in topological order
-            iterations: Number of iterations
+            durations_t: Shape (n_activities, iterations)
+            project_durations: Shape (iterations,)
+            network: Compiled activity network
 
         Returns:
-            Early finish times, shape (iterations, n_activities)
+            Late start times, shape (n_activities, iterations)
         """
-        n_activities = duration_samples.shape[1]
-        early_finish = np.zeros((iterations, n_activities))
+        n_activities = network.size
+        # Rows 0..n-1 hold late start, rows n..2n-1 late finish.
+        # Activities without successors finish at the project end.
+        schedule = np.empty((2 * n_activities, durations_t.shape[1]))
+        late_start = schedule[:n_activities]
+        late_finish = schedule[n_activities:]
+        late_finish[:] = project_durations
+        np.subtract(late_finish, durations_t, out=late_start)
+
+        types = network.succ_type
+        to_finish = (types == DEP_FF) | (types == DEP_SF)
+        from_start = (types == DEP_SS) | (types == DEP_SF)
+        anchor_rows = network.succ_idx + n_activities * to_finish
+        lags = network.succ_lag.astype(np.float64)
+
+        for level in network.levels.backward:
+            edges = level.edges
+            # Shape: (n_edges, iterations)
+            candidates = schedule[anchor_rows[edges]]
+            candidates -= lags[edges, np.newaxis]
+
+            # SS/SF edges constrain the predecessor's start
+            start_mask = from_start[edges]
+            if start_mask.any():
+                candidates[start_mask] += durations_t[level.edge_nodes[start_mask]]
+
+            finish = np.minimum.reduceat(candidates, level.offsets, axis=0)
+            np.minimum(finish, project_durations, out=finish)
+            late_finish[level.nodes] = finish
+            late_start[level.nodes] = finish - durations_t[level.nodes]
+
+        return late_start
+
+    def _calculate_criticality_from_float(
+        self,
+        total_float_t: NDArray[np.float64],
+        activity_ids: list[UUID],
+    ) -> dict[UUID, float]:
+        """Calculate activity criticality from per-iteration total float.
 
-        for act_idx in topo_order:
-            # Get all predecessors of this activity
-            pred_indices = np.where(predecessor_matrix[act_idx])[0]
+        An activity is critical in an iteration when its total float is
+        zero (within CRITICAL_FLOAT_TOLERANCE), matching CPMEngine. The
+        backward pass already swept the network in reverse topological
+        order for every iteration, so criticality is a single boolean
+        mask over all iterations and activities.
 
-            if len(pred_indices) == 0:
-                # No predecessors - starts at 0
-                early_start = np.zeros(iterations)
-            else:
-                # For FS dependencies: ES = max(EF of predecessors + lag)
-                # Shape: (iterations, n_predecessors)
-                pred_ef = early_finish[:, pred_indices]
-                pred_lags = lag_matrix[act_idx, pred_indices]
+        On FS-only networks without lags this marks exactly the activities
+        reachable from a project-finishing activity through edges where
+        predecessor EF equals successor ES, i.e. the critical path trace.
 
-                # Add lags and take max across predecessors
-                early_start = np.max(pred_ef + pred_lags, axis=1)
+        Args:
+            total_float_t: Shape (n_activities, iterations)
+            activity_ids: List of activity UUIDs
 
-            # Early finish = early start + duration
-            early_finish[:, act_idx] = early_start + duration_samples[:, act_idx]
+        Returns:
+            Dict mapping activity ID to criticality percentage
+        """
+        iterations = total_float_t.shape[1]
+        critical = np.less_equal(total_float_t, CRITICAL_FLOAT_TOLERANCE)
+        percentages = np.count_nonzero(critical, axis=1) / iterations * 100
 
-        return early_finish
+        return dict(zip(activity_ids, percentages.tolist(), strict=True))
 
-    def _calculate_criticality_vectorized(
+    def _calculate_finish_distributions(
         self,
-        early_finish: NDArray[np.float64],
-        duration_samples: NDArray[np.float64],
-        predecessor_matrix: NDArray[np.bool_],
-        project_durations: NDArray[np.float64],
+        values_t: NDArray[np.float64],
         activity_ids: list[UUID],
-        iterations: int,
-    ) -> dict[UUID, float]:
-        """Calculate activity criticality using vectorized operations.
+    ) -> dict[UUID, dict[str, float]]:
+        """Calculate per-activity distributions of finish dates (or float).
 
-        An activity is critical if it's on the longest path from start to end.
-        We use a simplified approach: activities whose early finish equals
-        project duration are on the critical path to the end.
+        Statistics are reduced along the iteration axis for all activities
+        at once rather than one activity at a time.
 
         Args:
-            early_finish: Shape (iterations, n_activities)
-            duration_samples: Shape (iterations, n_activities)
-            predecessor_matrix: Shape (n_activities, n_activities)
-            project_durations: Shape (iterations,)
+            values_t: Early finish or total float, shape (n_activities, iterations)
             activity_ids: List of activity UUIDs
-            iterations: Number of iterations
 
         Returns:
-            Dict mapping activity ID to criticality percentage
+            Dict mapping activity ID to distribution statistics
         """
-        n_activities = len(activity_ids)
-        critical_counts = np.zeros(n_activities)
-
-        # Calculate early start for each activity
-        early_start = early_finish - duration_samples
-
-        # For each iteration, find activities on critical path
-        for iter_idx in range(iterations):
-            proj_dur = project_durations[iter_idx]
-            ef_iter = early_finish[iter_idx]
-            es_iter = early_start[iter_idx]
-
-            # Find activities that finish at project end (end of critical path)
-            final_activities = np.where(np.abs(ef_iter - proj_dur) < 0.001)[0]
-
-            # Trace back through critical path
-            visited = set()
-            stack = list(final_activities)
-
-            while stack:
-                act_idx = stack.pop()
-                if act_idx in visited:
-                    continue
-                visited.add(act_idx)
-                critical_counts[act_idx] += 1
-
-                # Find critical predecessors
-                # A predecessor is critical if its EF + lag = this activity's ES
-                pred_indices = np.where(predecessor_matrix[act_idx])[0]
-                my_es = es_iter[act_idx]
-
-                for pred_idx in pred_indices:
-                    pred_ef = ef_iter[pred_idx]
-                    # Check if predecessor is on critical path to this activity
-                    if abs(pred_ef - my_es) < 0.001:
-                        stack.append(pred_idx)
-
-        # Convert to percentages
+        p10, p50, p90 = np.percentile(values_t, [10, 50, 90], axis=1).tolist()
+        means = np.mean(values_t, axis=1).tolist()
+        stds = np.std(values_t, axis=1).tolist()
+        mins = np.min(values_t, axis=1).tolist()
+        maxs = np.max(values_t, axis=1).tolist()
+
         return {
-            activity_ids[j]: float(critical_counts[j] / iterations * 100)
-            for j in range(n_activities)
+            act_id: {
+                "p10": p10[j],
+                "p50": p50[j],
+                "p90": p90[j],
+                "mean": means[j],
+                "std": stds[j],
+                "min": mins[j],
+                "max": maxs[j],
+            }
+            for j, act_id in enumerate(activity_ids)
         }
 
-    def _calculate_finish_distributions(
+    def _summarize_histogram(
         self,
-        early_finish: NDArray[np.float64],
+        histogram: QuantileHistogram,
         activity_ids: list[UUID],
     ) -> dict[UUID, dict[str, float]]:
-        """Calculate finish date distributions for each activity.
+        """Streaming counterpart of _calculate_finish_distributions.
 
         Args:
-            early_finish: Shape (iterations, n_activities)
+            histogram: Per-activity histogram of finish dates (or float)
             activity_ids: List of activity UUIDs
 
         Returns:
             Dict mapping activity ID to distribution statistics
         """
-        distributions: dict[UUID, dict[str, float]] = {}
-
-        for j, act_id in enumerate(activity_ids):
-            finishes = early_finish[:, j]
-            distributions[act_id] = {
-                "p10": float(np.percentile(finishes, 10)),
-                "p50": float(np.percentile(finishes, 50)),
-                "p90": float(np.percentile(finishes, 90)),
-                "mean": float(np.mean(finishes)),
-                "std": float(np.std(finishes)),
-                "min": float(np.min(finishes)),
-                "max": float(np.max(finishes)),
-            }
+        p10, p50, p90 = histogram.quantiles([0.1, 0.5, 0.9]).T.tolist()
+        means = histogram.mean.tolist()
+        stds = histogram.std.tolist()
+        mins = histogram.minimum.tolist()
+        maxs = histogram.maximum.tolist()
 
-        return distributions
+        return {
+            act_id: {
+                "p10": p10[j],
+                "p50": p50[j],
+                "p90": p90[j],
+                "mean": means[j],
+                "std": stds[j],
+                "min": mins[j],
+                "max": maxs[j],
+            }
+            for j, act_id in enumerate(activity_ids)
+        }
 
     def _calculate_sensitivity(
         self,
-        duration_samples: NDArray[np.float64],
+        durations_t: NDArray[np.float64],
         project_durations: NDArray[np.float64],
         activity_ids: list[UUID],
     ) -> dict[UUID, float]:
         """Calculate sensitivity (correlation with project duration).
 
+        Pearson correlation of every activity's duration samples with the
+        project duration, computed as one matrix-vector product.
+
         Args:
-            duration_samples: Shape (iterations, n_activities)
+            durations_t: Shape (n_activities, iterations)
             project_durations: Shape (iterations,)
             activity_ids: List of activity UUIDs
 
         Returns:
             Dict mapping activity ID to correlation coefficient
         """
-        sensitivity: dict[UUID, float] = {}
-
-        for j, act_id in enumerate(activity_ids):
-            act_durations = duration_samples[:, j]
-            if np.std(act_durations) > 0:
-                corr_matrix = np.corrcoef(act_durations, project_durations)
-                corr = corr_matrix[0, 1]
-                sensitivity[act_id] = float(corr) if not np.isnan(corr) else 0.0
-            else:
-                sensitivity[act_id] = 0.0
+        centered = durations_t - durations_t.mean(axis=1, keepdims=True)
+        project_centered = project_durations - project_durations.mean()
+
+        norms = np.sqrt(np.einsum("ij,ij->i", centered, centered))
+        norms *= np.sqrt(project_centered @ project_centered)
+        covariance = centered @ project_centered
+
+        # Constant activities (or a constant project duration) get 0.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = np.where(norms > 0, covariance / norms, 0.0)
+        corr = np.nan_to_num(np.clip(corr, -1.0, 1.0))
 
-        return sensitivity
+        return dict(zip(activity_ids, corr.tolist(), strict=True))
 
     def _sample_distribution(
         self,
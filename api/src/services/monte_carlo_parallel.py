@@ -0,0 +1,172 @@
+"""Process-parallel helpers for Monte Carlo simulation.
+
+Parallel simulation splits the requested iterations into fixed-size
+tasks. Task ``k`` always draws from child ``k`` of
+``SeedSequence(seed)``, so a seeded run produces the same numbers no
+matter how many worker processes evaluate the tasks. Results are merged
+in task order, never in completion order.
+
+Large read-only inputs (the compiled network, a Cholesky factor) and
+large outputs (sample matrices) are exchanged through one shared memory
+block per run instead of being pickled to every task. SharedArrays packs
+named arrays into the block in the parent; workers attach to it once,
+from the pool initializer, with attach_shared_arrays.
+"""
+
+import os
+from collections.abc import Callable, Mapping
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from types import TracebackType
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+# Array offsets inside a shared block are aligned to this many bytes
+_ALIGNMENT = 64
+
+
+@dataclass(frozen=True)
+class SharedArrayField:
+    """Location of one array inside a shared memory block."""
+
+    name: str
+    dtype: str
+    shape: tuple[int, ...]
+    offset: int
+
+
+@dataclass(frozen=True)
+class SharedArraySpec:
+    """Picklable description of a shared memory block and its arrays."""
+
+    block_name: str
+    fields: tuple[SharedArrayField, ...]
+
+
+class SharedArrays:
+    """Named NumPy arrays packed into one shared memory block.
+
+    The block is created (and the arrays copied into it) on construction
+    and unlinked by close(). Use as a context manager around the lifetime
+    of the worker pool:
+
+        with SharedArrays({"pred_ptr": network.pred_ptr}) as shared:
+            pool = process_pool(workers, _init_worker, (shared.spec,))
+            ...
+    """
+
+    def __init__(self, arrays: Mapping[str, NDArray[Any]]) -> None:
+        """Create the block and copy arrays into it.
+
+        Args:
+            arrays: Arrays to share, by name
+        """
+        fields: list[SharedArrayField] = []
+        offset = 0
+        for name, array in arrays.items():
+            fields.append(SharedArrayField(name, array.dtype.str, array.shape, offset))
+            offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+
+        # Zero-size blocks are not allowed
+        self._shm = SharedMemory(create=True, size=max(offset, 1))
+        self.spec = SharedArraySpec(self._shm.name, tuple(fields))
+        self.arrays = _views(self._shm, self.spec)
+        for name, array in arrays.items():
+            self.arrays[name][...] = array
+
+    def close(self) -> None:
+        """Release and unlink the shared block."""
+        self.arrays = {}
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def attach_shared_arrays(
+    spec: SharedArraySpec,
+) -> tuple[SharedMemory, dict[str, NDArray[Any]]]:
+    """Attach to a block created by SharedArrays.
+
+    The returned SharedMemory must stay referenced for as long as the
+    array views are used.
+
+    Args:
+        spec: Spec of the block, as published by SharedArrays.spec
+
+    Returns:
+        Tuple of (shared memory handle, arrays by name)
+    """
+    shm = SharedMemory(name=spec.block_name)
+    return shm, _views(shm, spec)
+
+
+def _views(shm: SharedMemory, spec: SharedArraySpec) -> dict[str, NDArray[Any]]:
+    """Build array views over a shared block."""
+    return {
+        field.name: np.ndarray(field.shape, dtype=field.dtype, buffer=shm.buf, offset=field.offset)
+        for field in spec.fields
+    }
+
+
+def spawn_task_seeds(seed: int | None, tasks: int) -> list[np.random.SeedSequence]:
+    """Seed sequences for each task of a parallel run.
+
+    Child k of SeedSequence(seed) is the same object whether the children
+    are spawned one at a time or all at once, so chunked and parallel
+    runs with the same seed and task sizes draw identical streams.
+
+    Args:
+        seed: Run seed (None for fresh entropy)
+        tasks: Number of tasks
+
+    Returns:
+        One SeedSequence per task
+    """
+    return np.random.SeedSequence(seed).spawn(tasks)
+
+
+def resolve_workers(workers: int) -> int:
+    """Clamp a requested worker count to at least one process.
+
+    Args:
+        workers: Requested worker processes; 0 means one per CPU
+
+    Returns:
+        Number of worker processes to start
+    """
+    if workers < 0:
+        raise ValueError("workers must be non-negative")
+    if workers == 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def process_pool(
+    workers: int,
+    initializer: Callable[..., None],
+    initargs: tuple[Any, ...],
+) -> ProcessPoolExecutor:
+    """Start a worker pool whose processes run initializer(*initargs) once.
+
+    Args:
+        workers: Number of worker processes
+        initializer: Per-process setup, typically attaching shared arrays
+        initargs: Arguments for initializer
+
+    Returns:
+        ProcessPoolExecutor; the caller shuts it down
+    """
+    return ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
@@ -0,0 +1,435 @@
+"""Streaming statistics for chunked Monte Carlo simulation.
+
+Chunked simulation generates and evaluates iterations in fixed-size
+batches and folds every batch into running statistics, so peak memory
+depends on the chunk size rather than the iteration count. All
+accumulators here are mergeable: combining accumulators built from
+disjoint batches gives the same moments, minimum and maximum as one
+accumulator fed every batch, and the same quantiles up to one bin width.
+
+Quantiles come from fixed-size histograms whose range doubles whenever a
+value falls outside it, so resolution is about (max - min) / bins.
+Project-level histograms use PROJECT_HISTOGRAM_BINS (error below ~0.1%
+of the sampled range); per-activity histograms use the coarser
+ACTIVITY_HISTOGRAM_BINS to keep memory at O(activities) per statistic.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
+# Iterations evaluated per batch when chunking is requested
+DEFAULT_CHUNK_SIZE = 1000
+
+# Histogram resolution for project-level and per-activity distributions
+PROJECT_HISTOGRAM_BINS = 2048
+ACTIVITY_HISTOGRAM_BINS = 256
+
+# Two-sided 95% normal quantile for the P80 confidence interval
+P80_CONFIDENCE_Z = 1.96
+
+# Never stop early before this many iterations have been evaluated
+MIN_ITERATIONS_BEFORE_STOP = 1000
+
+
+@dataclass
+class SimulationProgress:
+    """Running estimates published after each chunk.
+
+    Attributes:
+        iterations_completed: Iterations evaluated so far
+        total_iterations: Iterations requested
+        p10-p90: Current project duration (or total) percentile estimates
+        p80_ci_low/p80_ci_high: 95% confidence interval for P80
+    """
+
+    iterations_completed: int
+    total_iterations: int
+    p10: float
+    p50: float
+    p80: float
+    p90: float
+    p80_ci_low: float
+    p80_ci_high: float
+
+    @property
+    def progress_percent(self) -> float:
+        """Share of requested iterations completed (0-100)."""
+        if self.total_iterations <= 0:
+            return 100.0
+        return min(self.iterations_completed / self.total_iterations * 100, 100.0)
+
+    @property
+    def p80_relative_half_width(self) -> float:
+        """Half-width of the P80 confidence interval relative to P80."""
+        half_width = (self.p80_ci_high - self.p80_ci_low) / 2
+        if self.p80 == 0:
+            return 0.0 if half_width == 0 else float("inf")
+        return half_width / abs(self.p80)
+
+    def has_converged(self, tolerance: float) -> bool:
+        """Check whether P80 is estimated tightly enough to stop.
+
+        Args:
+            tolerance: Maximum relative half-width of the P80 interval
+
+        Returns:
+            True once enough iterations ran and the interval is tight enough
+        """
+        if self.iterations_completed < MIN_ITERATIONS_BEFORE_STOP:
+            return False
+        return self.p80_relative_half_width <= tolerance
+
+
+ProgressCallback = Callable[[SimulationProgress], None]
+
+
+def chunk_sizes(iterations: int, chunk_size: int) -> list[int]:
+    """Split iterations into batches of at most chunk_size.
+
+    Args:
+        iterations: Total iterations
+        chunk_size: Maximum batch size
+
+    Returns:
+        Batch sizes summing to iterations
+
+    Raises:
+        ValueError: If chunk_size is not positive
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    full, rest = divmod(iterations, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+class QuantileHistogram:
+    """
+    Mergeable histograms for one or more series of equal length.
+
+    Each series keeps ``bins`` equal-width bins. The range is taken from
+    the first batch (with margin) and doubled whenever later values fall
+    outside it, so no value is ever clipped. Mean and variance are
+    tracked exactly with Chan's parallel update.
+
+    Example:
+        hist = QuantileHistogram()
+        for batch in batches:
+            hist.update(batch)
+        p10, p50, p90 = hist.quantiles([0.1, 0.5, 0.9])[0]
+    """
+
+    def __init__(self, n_series: int = 1, bins: int = PROJECT_HISTOGRAM_BINS) -> None:
+        """Initialize empty histograms.
+
+        Args:
+            n_series: Number of series tracked side by side
+            bins: Bins per series (even, at least 2)
+        """
+        if bins < 2 or bins % 2:
+            raise ValueError("bins must be an even number >= 2")
+
+        self.n_series = n_series
+        self.bins = bins
+        self.count = 0
+        self.counts = np.zeros((n_series, bins), dtype=np.int64)
+        self.lower = np.zeros(n_series)
+        self.width = np.ones(n_series)
+        self.mean = np.zeros(n_series)
+        self.m2 = np.zeros(n_series)
+        self.minimum = np.full(n_series, np.inf)
+        self.maximum = np.full(n_series, -np.inf)
+
+    @property
+    def std(self) -> NDArray[np.float64]:
+        """Population standard deviation per series."""
+        if self.count == 0:
+            return np.zeros(self.n_series)
+        return np.sqrt(self.m2 / self.count)
+
+    def update(self, values: ArrayLike) -> None:
+        """Add a batch of observations.
+
+        Args:
+            values: Shape (n_series, k), or (k,) for a single series
+        """
+        batch = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        size = batch.shape[1]
+        if size == 0:
+            return
+
+        batch_min = batch.min(axis=1)
+        batch_max = batch.max(axis=1)
+        if self.count == 0:
+            self._init_range(batch_min, batch_max)
+        else:
+            self._cover(batch_min, batch_max)
+
+        self._add(batch, None)
+
+        batch_mean = batch.mean(axis=1)
+        centered = batch - batch_mean[:, None]
+        batch_m2 = np.einsum("ij,ij->i", centered, centered)
+        self._merge_moments(size, batch_mean, batch_m2, batch_min, batch_max)
+
+    def merge(self, other: "QuantileHistogram") -> None:
+        """Fold another histogram built from disjoint observations into this one.
+
+        Args:
+            other: Histogram with the same series count and bin count
+        """
+        if other.n_series != self.n_series or other.bins != self.bins:
+            raise ValueError("Cannot merge histograms of different shapes")
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.counts = other.counts.copy()
+            self.lower = other.lower.copy()
+            self.width = other.width.copy()
+            self.count = other.count
+            self.mean = other.mean.copy()
+            self.m2 = other.m2.copy()
+            self.minimum = other.minimum.copy()
+            self.maximum = other.maximum.copy()
+            return
+
+        self._cover(other.minimum, other.maximum)
+        # Re-bin the other histogram's mass at its bin centres
+        centres = other.lower[:, None] + (np.arange(other.bins) + 0.5) * other.width[:, None]
+        self._add(centres, other.counts)
+        self._merge_moments(other.count, other.mean, other.m2, other.minimum, other.maximum)
+
+    def quantiles(self, qs: ArrayLike) -> NDArray[np.float64]:
+        """Estimate quantiles for every series.
+
+        Values are interpolated linearly within the bin holding the
+        target rank and clamped to the observed minimum and maximum.
+
+        Args:
+            qs: Quantiles in [0, 1]
+
+        Returns:
+            Shape (n_series, len(qs))
+        """
+        q = np.atleast_1d(np.asarray(qs, dtype=np.float64))
+        if self.count == 0:
+            return np.full((self.n_series, q.size), np.nan)
+
+        cumulative = np.cumsum(self.counts, axis=1)
+        target = q * self.count
+        # First bin whose cumulative count reaches the target rank
+        idx = np.count_nonzero(cumulative[:, None, :] < target[None, :, None], axis=2)
+        np.minimum(idx, self.bins - 1, out=idx)
+
+        in_bin = np.take_along_axis(self.counts, idx, axis=1)
+        below = np.where(idx > 0, np.take_along_axis(cumulative, np.maximum(idx - 1, 0), axis=1), 0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frac = np.where(in_bin > 0, (target[None, :] - below) / in_bin, 0.5)
+
+        values: NDArray[np.float64] = self.lower[:, None] + (idx + frac) * self.width[:, None]
+        np.clip(values, self.minimum[:, None], self.maximum[:, None], out=values)
+        return values
+
+    def histogram(
+        self, series: int = 0, max_bins: int = 50
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """Coarsen one series to at most max_bins over its populated range.
+
+        Args:
+            series: Series index
+            max_bins: Maximum number of output bins
+
+        Returns:
+            Tuple of (bin edges, counts) as from np.histogram
+        """
+        counts = self.counts[series]
+        populated = np.flatnonzero(counts)
+        if populated.size == 0:
+            return np.array([0.0, 1.0]), np.zeros(1, dtype=np.int64)
+
+        first, last = int(populated[0]), int(populated[-1])
+        segment = counts[first : last + 1]
+        factor = -(-segment.size // max_bins)
+        padded = np.zeros(-(-segment.size // factor) * factor, dtype=np.int64)
+        padded[: segment.size] = segment
+        grouped = padded.reshape(-1, factor).sum(axis=1)
+
+        edges = (
+            self.lower[series]
+            + (first + np.arange(grouped.size + 1) * factor) * (self.width[series])
+        )
+        return edges, grouped
+
+    def _init_range(self, batch_min: NDArray[np.float64], batch_max: NDArray[np.float64]) -> None:
+        """Size each series' range from the first batch with 25% margin."""
+        span = batch_max - batch_min
+        margin = np.where(span > 0, span * 0.25, np.maximum(np.abs(batch_min) * 1e-3, 1e-6))
+        self.lower = batch_min - margin
+        self.width = (span + 2 * margin) / self.bins
+
+    def _cover(self, low: NDArray[np.float64], high: NDArray[np.float64]) -> None:
+        """Double the range of every series until [low, high] fits."""
+        upper = self.lower + self.width * self.bins
+        for row in np.flatnonzero((low < self.lower) | (high >= upper)).tolist():
+            while low[row] < self.lower[row] or high[row] >= (
+                self.lower[row] + self.width[row] * self.bins
+            ):
+                self._double(row, downward=bool(low[row] < self.lower[row]))
+
+    def _double(self, row: int, *, downward: bool) -> None:
+        """Halve the resolution of one series, extending its range one way."""
+        half = self.bins // 2
+        pairs = self.counts[row].reshape(half, 2).sum(axis=1)
+        self.counts[row] = 0
+        if downward:
+            self.counts[row, half:] = pairs
+            self.lower[row] -= self.width[row] * self.bins
+        else:
+            self.counts[row, :half] = pairs
+        self.width[row] *= 2
+
+    def _add(self, values: NDArray[np.float64], weights: NDArray[np.int64] | None) -> None:
+        """Bin values (shape (n_series, k)) into the counts."""
+        idx = ((values - self.lower[:, None]) / self.width[:, None]).astype(np.int64)
+        np.clip(idx, 0, self.bins - 1, out=idx)
+        idx += (np.arange(self.n_series) * self.bins)[:, None]
+
+        flat_weights = None if weights is None else weights.ravel()
+        added = np.bincount(idx.ravel(), weights=flat_weights, minlength=self.counts.size)
+        self.counts += added.reshape(self.counts.shape).astype(np.int64)
+
+    def _merge_moments(
+        self,
+        size: int,
+        mean: NDArray[np.float64],
+        m2: NDArray[np.float64],
+        low: NDArray[np.float64],
+        high: NDArray[np.float64],
+    ) -> None:
+        """Combine running moments with a batch's (Chan et al.)."""
+        total = self.count + size
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (size / total)
+        self.m2 = self.m2 + m2 + delta * delta * (self.count * size / total)
+        self.minimum = np.minimum(self.minimum, low)
+        self.maximum = np.maximum(self.maximum, high)
+        self.count = total
+
+
+class CorrelationAccumulator:
+    """
+    Mergeable Pearson correlation of many series against one target.
+
+    Tracks means, second moments and co-moments per series, so batches
+    can be folded in one at a time or accumulated separately and merged.
+    """
+
+    def __init__(self, n_series: int) -> None:
+        """Initialize empty accumulators.
+
+        Args:
+            n_series: Number of series correlated with the target
+        """
+        self.n_series = n_series
+        self.count = 0
+        self.mean_x = np.zeros(n_series)
+        self.mean_y = 0.0
+        self.m2_x = np.zeros(n_series)
+        self.m2_y = 0.0
+        self.c_xy = np.zeros(n_series)
+
+    def update(self, x: NDArray[np.float64], y: NDArray[np.float64]) -> None:
+        """Add a batch of observations.
+
+        Args:
+            x: Shape (n_series, k)
+            y: Shape (k,)
+        """
+        size = y.shape[0]
+        if size == 0:
+            return
+
+        mean_x = x.mean(axis=1)
+        mean_y = float(y.mean())
+        dx = x - mean_x[:, None]
+        dy = y - mean_y
+        self._merge(
+            size,
+            mean_x,
+            mean_y,
+            np.einsum("ij,ij->i", dx, dx),
+            float(dy @ dy),
+            dx @ dy,
+        )
+
+    def merge(self, other: "CorrelationAccumulator") -> None:
+        """Fold another accumulator built from disjoint observations into this one."""
+        if other.n_series != self.n_series:
+            raise ValueError("Cannot merge accumulators of different shapes")
+        if other.count == 0:
+            return
+        self._merge(other.count, other.mean_x, other.mean_y, other.m2_x, other.m2_y, other.c_xy)
+
+    def correlation(self) -> NDArray[np.float64]:
+        """Pearson correlation per series; constant series give 0.0."""
+        norms = np.sqrt(self.m2_x * self.m2_y)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr: NDArray[np.float64] = np.where(norms > 0, self.c_xy / norms, 0.0)
+        np.clip(corr, -1.0, 1.0, out=corr)
+        return np.nan_to_num(corr, copy=False)
+
+    def _merge(  # noqa: PLR0917 - one argument per tracked moment
+        self,
+        size: int,
+        mean_x: NDArray[np.float64],
+        mean_y: float,
+        m2_x: NDArray[np.float64],
+        m2_y: float,
+        c_xy: NDArray[np.float64],
+    ) -> None:
+        """Combine running co-moments with a batch's."""
+        total = self.count + size
+        weight = self.count * size / total
+        dx = mean_x - self.mean_x
+        dy = mean_y - self.mean_y
+
+        self.mean_x = self.mean_x + dx * (size / total)
+        self.mean_y += dy * (size / total)
+        self.m2_x = self.m2_x + m2_x + dx * dx * weight
+        self.m2_y += m2_y + dy * dy * weight
+        self.c_xy = self.c_xy + c_xy + dx * dy * weight
+        self.count = total
+
+
+def progress_from_histogram(
+    histogram: QuantileHistogram, total_iterations: int
+) -> SimulationProgress:
+    """Summarize a project-level histogram as a progress update.
+
+    The P80 interval is the distribution-free order-statistic interval:
+    ranks 0.8 n +/- z sqrt(0.8 * 0.2 * n).
+
+    Args:
+        histogram: Single-series histogram of project durations or totals
+        total_iterations: Iterations requested
+
+    Returns:
+        SimulationProgress with current estimates
+    """
+    half = P80_CONFIDENCE_Z * np.sqrt(0.8 * 0.2 / max(histogram.count, 1))
+    p10, p50, p80, p90, ci_low, ci_high = histogram.quantiles(
+        [0.1, 0.5, 0.8, 0.9, max(0.8 - half, 0.0), min(0.8 + half, 1.0)]
+    )[0].tolist()
+
+    return SimulationProgress(
+        iterations_completed=histogram.count,
+        total_iterations=total_iterations,
+        p10=p10,
+        p50=p50,
+        p80=p80,
+        p90=p90,
+        p80_ci_low=ci_low,
+        p80_ci_high=ci_high,
+    )
@@ -6,21 +6,36 @@ hours, supporting resource leveling decisions.
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from src.repositories.activity import ActivityRepository
 from src.repositories.program import ProgramRepository
-from src.repositories.resource import ResourceAssignmentRepository, ResourceRepository
+from src.repositories.resource import (
+    ResourceAssignmentRepository,
+    ResourceCalendarRepository,
+    ResourceRepository,
+)
+from src.services.loading_kernel import (
+    LoadIntervals,
+    from_hundredths,
+    hours_from_units,
+    to_hundredths,
+)
 from src.services.resource_loading import ResourceLoadingService
+from src.services.working_calendar import resource_calendar
 
 if TYPE_CHECKING:
     from uuid import UUID
 
     from sqlalchemy.ext.asyncio import AsyncSession
 
+    from src.models.resource import Resource, ResourceAssignment, ResourceCalendar
     from src.services.cache_service import CacheService
     from src.services.resource import ResourceLoadingDay
 
@@ -140,6 +155,7 @@ class OverallocationService:
         self._loading_service = ResourceLoadingService(session, cache)
         self._resource_repo = ResourceRepository(session)
         self._assignment_repo = ResourceAssignmentRepository(session)
+        self._calendar_repo = ResourceCalendarRepository(session)
         self._activity_repo = ActivityRepository(session)
 
     async def detect_resource_overallocations(
@@ -161,88 +177,93 @@ class OverallocationService:
         Returns:
             List of OverallocationPeriod objects, merged for adjacent days
         """
-        # Get resource info
         resource = await self._resource_repo.get_by_id(resource_id)
         if not resource:
             return []
 
-        # Calculate daily loading
-        loading = await self._loading_service.calculate_daily_loading(
+        calendar_entries = await self._calendar_repo.get_for_date_range(
             resource_id, start_date, end_date
         )
+        assignments = await self._assignment_repo.get_assignments_with_activities(resource_id)
+
+        return self._find_periods(resource, assignments, calendar_entries, start_date, end_date)
+
+    def _find_periods(
+        self,
+        resource: Resource,
+        assignments: list[ResourceAssignment],
+        calendar_entries: list[ResourceCalendar],
+        start_date: date,
+        end_date: date,
+    ) -> list[OverallocationPeriod]:
+        """Find over-allocated periods of one resource from loaded rows.
 
-        if not loading:
+        Daily assigned and available hours are computed as integer arrays
+        (see loading_kernel), matching ResourceLoadingService day for day,
+        so no queries run here.
+
+        Args:
+            resource: The resource to analyze
+            assignments: All assignments of the resource, activities loaded
+            calendar_entries: Calendar entries of the resource in the range
+            start_date: Start of analysis period (inclusive)
+            end_date: End of analysis period (inclusive)
+
+        Returns:
+            List of OverallocationPeriod objects, merged for adjacent days
+        """
+        days = (end_date - start_date).days + 1
+        if days <= 0:
             return []
 
-        # Find over-allocated days
-        overallocated_days: list[tuple[date, Decimal, Decimal]] = []
-        for day_date, day_loading in sorted(loading.items()):
-            if day_loading.is_overallocated:
-                overallocated_days.append(
-                    (day_date, day_loading.assigned_hours, day_loading.available_hours)
-                )
+        capacity = resource.capacity_per_day
+        intervals = LoadIntervals.from_ranges(
+            (
+                *self._loading_service.get_assignment_date_range(assignment),
+                to_hundredths(assignment.units),
+            )
+            for assignment in assignments
+        )
+        assigned = hours_from_units(intervals.daily_totals(start_date, end_date), capacity)
 
-        if not overallocated_days:
+        # Available hours: calendar entries over the template (or Monday-Friday)
+        calendar = resource_calendar(capacity, resource.calendar_template, calendar_entries)
+        available = calendar.hours(start_date, end_date)
+
+        overallocated = np.flatnonzero(assigned > available)
+        if len(overallocated) == 0:
             return []
 
         # Group consecutive days into periods
+        breaks = np.flatnonzero(np.diff(overallocated) != 1) + 1
         periods: list[OverallocationPeriod] = []
-        current_start = overallocated_days[0][0]
-        current_end = overallocated_days[0][0]
-        peak_assigned = overallocated_days[0][1]
-        peak_available = overallocated_days[0][2]
-        peak_excess = peak_assigned - peak_available
-
-        for i in range(1, len(overallocated_days)):
-            day_date, assigned, available = overallocated_days[i]
-            excess = assigned - available
-
-            # Check if consecutive day
-            if day_date == current_end + timedelta(days=1):
-                current_end = day_date
-                if excess > peak_excess:
-                    peak_assigned = assigned
-                    peak_available = available
-                    peak_excess = excess
-            else:
-                # Save current period and start new one
-                affected = await self.get_affected_activities(
-                    resource_id, current_start, current_end
-                )
-                periods.append(
-                    OverallocationPeriod(
-                        resource_id=resource_id,
-                        resource_code=resource.code,
-                        resource_name=resource.name,
-                        start_date=current_start,
-                        end_date=current_end,
-                        peak_assigned=peak_assigned,
-                        peak_available=peak_available,
-                        peak_excess=peak_excess,
-                        affected_activities=affected,
-                    )
+        for run in np.split(overallocated, breaks):
+            excess = assigned[run] - available[run]
+            peak = int(run[int(np.argmax(excess))])
+            peak_available = calendar.hours_on(start_date + timedelta(days=peak))
+            peak_assigned = from_hundredths(assigned[peak])
+
+            period_start = start_date + timedelta(days=int(run[0]))
+            period_end = start_date + timedelta(days=int(run[-1]))
+            active = np.flatnonzero(
+                (intervals.starts <= period_end.toordinal())
+                & (intervals.finishes >= period_start.toordinal())
+            )
+            periods.append(
+                OverallocationPeriod(
+                    resource_id=resource.id,
+                    resource_code=resource.code,
+                    resource_name=resource.name,
+                    start_date=period_start,
+                    end_date=period_end,
+                    peak_assigned=peak_assigned,
+                    peak_available=peak_available,
+                    peak_excess=peak_assigned - peak_available,
+                    affected_activities=list(
+                        {assignments[index].activity_id for index in active.tolist()}
+                    ),
                 )
-                current_start = day_date
-                current_end = day_date
-                peak_assigned = assigned
-                peak_available = available
-                peak_excess = excess
-
-        # Don't forget the last period
-        affected = await self.get_affected_activities(resource_id, current_start, current_end)
-        periods.append(
-            OverallocationPeriod(
-                resource_id=resource_id,
-                resource_code=resource.code,
-                resource_name=resource.name,
-                start_date=current_start,
-                end_date=current_end,
-                peak_assigned=peak_assigned,
-                peak_available=peak_available,
-                peak_excess=peak_excess,
-                affected_activities=affected,
             )
-        )
 
         return periods
 
@@ -255,7 +276,9 @@ class OverallocationService:
         """Analyze entire program for over-allocations.
 
         Examines all active resources in the program and identifies
-        over-allocation periods for each.
+        over-allocation periods for each. Assignments and calendars of
+        all resources are loaded with one query each, so the number of
+        queries does not grow with the number of resources or periods.
 
         Args:
             program_id: The program to analyze
@@ -289,19 +312,44 @@ class OverallocationService:
             program_id, is_active=True, skip=0, limit=10000
         )
 
+        # Load assignments and calendars of every resource in one query each
+        resource_ids = [resource.id for resource in resources]
+        assignments_by_resource: dict[UUID, list[ResourceAssignment]] = defaultdict(list)
+        for assignment in await self._assignment_repo.get_assignments_for_resources(resource_ids):
+            assignments_by_resource[assignment.resource_id].append(assignment)
+        calendar_by_resource: dict[UUID, list[ResourceCalendar]] = defaultdict(list)
+        for entry in await self._calendar_repo.get_for_resources_date_range(
+            resource_ids, analysis_start, analysis_end
+        ):
+            calendar_by_resource[entry.resource_id].append(entry)
+
         all_periods: list[OverallocationPeriod] = []
         resources_with_overallocations: set[UUID] = set()
 
         for resource in resources:
-            periods = await self.detect_resource_overallocations(
-                resource.id, analysis_start, analysis_end
+            periods = self._find_periods(
+                resource,
+                assignments_by_resource[resource.id],
+                calendar_by_resource[resource.id],
+                analysis_start,
+                analysis_end,
             )
             if periods:
                 all_periods.extend(periods)
                 resources_with_overallocations.add(resource.id)
 
-        # Check if critical path is affected
-        critical_path_affected = await self.check_critical_path_impact(program_id, all_periods)
+        # Check if critical path is affected, using the loaded activities
+        affected_ids = {
+            activity_id for period in all_periods for activity_id in period.affected_activities
+        }
+        critical_path_affected = any(
+            assignment.activity is not None
+            and assignment.activity_id in affected_ids
+            and not assignment.activity.is_deleted
+            and assignment.activity.is_critical
+            for assignments in assignments_by_resource.values()
+            for assignment in assignments
+        )
 
         return ProgramOverallocationReport(
             program_id=program_id,
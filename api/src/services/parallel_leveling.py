@@ -3,30 +3,63 @@
 Unlike serial leveling which processes activities one at a time,
 parallel leveling considers all resources and activities simultaneously
 to find a globally better (often optimal) solution.
+
+The program is loaded once into a LevelingSnapshot and split into
+components that share no resource or dependency (see split_components).
+Each component is leveled in memory by ParallelLevelingEngine; large
+programs with several components level them concurrently in the shared
+leveling process pool (see src.services.leveling_pool), and the
+per-component results are merged.
 """
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import date, timedelta
-from decimal import Decimal
 from heapq import heappop, heappush
 from typing import TYPE_CHECKING, Any
 
+import numpy as np
+
 from src.repositories.activity import ActivityRepository
-from src.repositories.dependency import DependencyRepository
 from src.repositories.program import ProgramRepository
-from src.repositories.resource import ResourceAssignmentRepository, ResourceRepository
-from src.services.resource_leveling import ActivityShift, LevelingOptions, LevelingResult
-from src.services.resource_loading import ResourceLoadingService
+from src.services.leveling_pool import LevelingPool, leveling_pool
+from src.services.leveling_snapshot import split_components
+from src.services.loading_kernel import (
+    FULL_ALLOCATION,
+    MAX_SEARCH_DAYS,
+    LoadIntervals,
+    first_fit,
+    from_hundredths,
+    slot_window_days,
+    to_hundredths,
+)
+from src.services.resource_leveling import (
+    ActivityShift,
+    LevelingOptions,
+    LevelingResult,
+    ResourceLevelingService,
+)
+from src.services.working_calendar import standard_calendar
 
 if TYPE_CHECKING:
+    from decimal import Decimal
     from uuid import UUID
 
     from sqlalchemy.ext.asyncio import AsyncSession
 
-    from src.models.activity import Activity
     from src.services.cache_service import CacheService
+    from src.services.leveling_snapshot import (
+        LevelingAssignment,
+        LevelingDependency,
+        LevelingResource,
+        LevelingSnapshot,
+    )
+    from src.services.working_calendar import WorkingCalendar
+
+# Fewest activities in independent components worth a process pool
+PARALLEL_MIN_ACTIVITIES = 500
 
 
 @dataclass
@@ -110,12 +143,8 @@ class ParallelLevelingResult(LevelingResult):
     comparison_with_serial: dict[str, Any] = field(default_factory=dict)
 
 
-class ParallelLevelingService:
-    """Parallel resource leveling service.
-
-    Unlike serial leveling which processes activities one at a time,
-    parallel leveling considers all resources and activities simultaneously
-    to find a globally better (often optimal) solution.
+class ParallelLevelingEngine:
+    """Conflict-matrix leveling over an in-memory program snapshot.
 
     Algorithm:
     1. Build conflict matrix: all (resource, date, activities) tuples
@@ -124,127 +153,71 @@ class ParallelLevelingService:
     4. Update all affected resources and propagate to successors
     5. Repeat until no conflicts or max iterations
 
-    Key Improvements over Serial:
-    - Considers multi-resource activities holistically
-    - Better handling of shared resources across activities
-    - Finds solutions serial method might miss
+    Successors are looked up in a dependency index built from the
+    snapshot, so a run issues no queries and can execute in a worker
+    process.
 
     Example usage:
-        service = ParallelLevelingService(session)
-        options = LevelingOptions(preserve_critical_path=True)
-        result = await service.level_program(program_id, options)
-
-        if result.success:
-            print(f"Resolved {result.conflicts_resolved} conflicts")
-            print(f"Processed {result.resources_processed} resources")
+        for component in split_components(snapshot):
+            result = ParallelLevelingEngine(component, LevelingOptions()).run()
     """
 
     def __init__(
         self,
-        session: AsyncSession,
-        cache: CacheService | None = None,
+        snapshot: LevelingSnapshot,
+        options: LevelingOptions | None = None,
     ) -> None:
-        """Initialize ParallelLevelingService.
+        """Initialize the engine.
 
         Args:
-            session: Database session for queries
-            cache: Optional cache service
+            snapshot: Program (or component) data to level
+            options: Leveling options (uses defaults if None)
         """
-        self.session = session
-        self.cache = cache
-        self._activity_repo = ActivityRepository(session)
-        self._resource_repo = ResourceRepository(session)
-        self._assignment_repo = ResourceAssignmentRepository(session)
-        self._dependency_repo = DependencyRepository(session)
-        self._program_repo = ProgramRepository(session)
-        self._loading_service = ResourceLoadingService(session, cache)
-
-    async def level_program(
-        self,
-        program_id: UUID,
-        options: LevelingOptions | None = None,
-    ) -> ParallelLevelingResult:
-        """Execute parallel resource leveling.
-
-        Args:
-            program_id: Program to level
-            options: Leveling options
+        self.snapshot = snapshot
+        self.options = options or LevelingOptions()
+        self._activities = {a.id: a for a in snapshot.activities}
+        self._resources = {r.id: r for r in snapshot.resources}
+        self._assignments: dict[UUID, list[LevelingAssignment]] = defaultdict(list)
+        self._resource_counts: dict[UUID, int] = defaultdict(int)
+        for assignment in snapshot.assignments:
+            self._assignments[assignment.resource_id].append(assignment)
+            self._resource_counts[assignment.activity_id] += 1
+        self._successors: dict[UUID, list[LevelingDependency]] = defaultdict(list)
+        for dependency in snapshot.dependencies:
+            self._successors[dependency.predecessor_id].append(dependency)
+
+    def run(self) -> ParallelLevelingResult:
+        """Level the snapshot.
 
         Returns:
             ParallelLevelingResult with all changes and metrics
         """
-        if options is None:
-            options = LevelingOptions()
-
+        options = self.options
+        snapshot = self.snapshot
         warnings: list[str] = []
         shifts: list[ActivityShift] = []
 
-        # Get program and validate
-        program = await self._program_repo.get_by_id(program_id)
-        if not program:
-            return ParallelLevelingResult(
-                program_id=program_id,
-                success=False,
-                iterations_used=0,
-                activities_shifted=0,
-                shifts=[],
-                remaining_overallocations=0,
-                new_project_finish=date.today(),
-                original_project_finish=date.today(),
-                schedule_extension_days=0,
-                warnings=["Program not found"],
-            )
-
-        # Get original finish date
-        original_finish = await self._get_project_finish(program_id)
-
-        # Get all activities with their priorities
-        activities = await self._get_activities_with_schedule(program_id)
-        if not activities:
-            return ParallelLevelingResult(
-                program_id=program_id,
-                success=True,
-                iterations_used=0,
-                activities_shifted=0,
-                shifts=[],
-                remaining_overallocations=0,
-                new_project_finish=original_finish,
-                original_project_finish=original_finish,
-                schedule_extension_days=0,
-            )
+        original_finish = project_finish(snapshot)
+        if not snapshot.activities:
+            return self._unchanged_result(original_finish)
 
         # Initialize working dates from activities
-        activity_dates: dict[UUID, tuple[date, date]] = {}
-        for activity in activities:
-            start = activity.early_start or activity.planned_start or program.start_date
-            finish = activity.early_finish or activity.planned_finish or program.end_date
-            activity_dates[activity.id] = (start, finish)
+        activity_dates = initial_dates(snapshot)
 
         # Calculate activity priorities
-        priority_map = await self._calculate_priorities(activities)
+        priority_map = self._calculate_priorities()
 
         # Build initial conflict matrix
-        conflicts = await self._build_conflict_matrix(program_id, activity_dates, options)
+        conflicts = self._build_conflict_matrix(activity_dates)
 
         initial_conflict_count = len(conflicts)
         unique_resources: set[UUID] = set()
 
         if not conflicts:
-            return ParallelLevelingResult(
-                program_id=program_id,
-                success=True,
-                iterations_used=0,
-                activities_shifted=0,
-                shifts=[],
-                remaining_overallocations=0,
-                new_project_finish=original_finish,
-                original_project_finish=original_finish,
-                schedule_extension_days=0,
-            )
+            return self._unchanged_result(original_finish)
 
         # Main leveling loop
         iteration = 0
-        activity_lookup = {a.id: a for a in activities}
 
         while conflicts and iteration < options.max_iterations:
             iteration += 1
@@ -258,20 +231,17 @@ class ParallelLevelingService:
                 conflict,
                 priority_map,
                 activity_dates,
-                options,
             )
 
             if activity_to_delay is None:
-                resource = await self._resource_repo.get_by_id(conflict.resource_id)
-                resource_name = resource.code if resource else str(conflict.resource_id)
                 warnings.append(
                     f"Could not resolve conflict on {conflict.conflict_date} "
-                    f"for resource {resource_name}"
+                    f"for resource {self._resource_name(conflict.resource_id)}"
                 )
                 continue
 
             # Calculate delay needed
-            delay_days = await self._calculate_minimum_delay(
+            delay_days = self._calculate_minimum_delay(
                 activity_to_delay,
                 conflict.resource_id,
                 conflict.conflict_date,
@@ -288,14 +258,12 @@ class ParallelLevelingService:
             activity_dates[activity_to_delay] = (new_start, new_finish)
 
             # Record shift
-            activity = activity_lookup[activity_to_delay]
-            resource = await self._resource_repo.get_by_id(conflict.resource_id)
+            resource = self._resources.get(conflict.resource_id)
             resource_name = resource.code if resource else "Unknown"
-
             shifts.append(
                 ActivityShift(
                     activity_id=activity_to_delay,
-                    activity_code=activity.code,
+                    activity_code=self._activities[activity_to_delay].code,
                     original_start=old_start,
                     original_finish=old_finish,
                     new_start=new_start,
@@ -306,14 +274,10 @@ class ParallelLevelingService:
             )
 
             # Propagate to successors
-            await self._propagate_to_successors(
-                activity_to_delay,
-                activity_dates,
-                activity_lookup,
-            )
+            self._propagate_to_successors(activity_to_delay, activity_dates)
 
             # Rebuild conflict matrix with new dates
-            conflicts = await self._build_conflict_matrix(program_id, activity_dates, options)
+            conflicts = self._build_conflict_matrix(activity_dates)
 
         # Calculate final metrics
         new_finish = max(dates[1] for dates in activity_dates.values())
@@ -321,7 +285,7 @@ class ParallelLevelingService:
         extension_days = max(0, (new_finish - original_finish).days)
 
         return ParallelLevelingResult(
-            program_id=program_id,
+            program_id=snapshot.program_id,
             success=remaining == 0,
             iterations_used=iteration,
             activities_shifted=len({s.activity_id for s in shifts}),
@@ -335,101 +299,66 @@ class ParallelLevelingService:
             resources_processed=len(unique_resources),
         )
 
-    async def _get_project_finish(self, program_id: UUID) -> date:
-        """Get the current project finish date.
-
-        Args:
-            program_id: Program to check
-
-        Returns:
-            Latest activity finish date in the program
-        """
-        activities = await self._activity_repo.get_by_program(program_id, skip=0, limit=100000)
-
-        if not activities:
-            program = await self._program_repo.get_by_id(program_id)
-            return program.end_date if program else date.today()
-
-        max_finish = date.min
-        for activity in activities:
-            finish = activity.early_finish or activity.planned_finish
-            if finish and finish > max_finish:
-                max_finish = finish
-
-        return max_finish if max_finish > date.min else date.today()
-
-    async def _get_activities_with_schedule(
-        self,
-        program_id: UUID,
-    ) -> list[Activity]:
-        """Get all activities with their schedule dates.
-
-        Args:
-            program_id: Program to get activities for
+    def _unchanged_result(self, original_finish: date) -> ParallelLevelingResult:
+        """Successful result for a snapshot that needs no changes."""
+        return ParallelLevelingResult(
+            program_id=self.snapshot.program_id,
+            success=True,
+            iterations_used=0,
+            activities_shifted=0,
+            shifts=[],
+            remaining_overallocations=0,
+            new_project_finish=original_finish,
+            original_project_finish=original_finish,
+            schedule_extension_days=0,
+        )
 
-        Returns:
-            List of activities with schedule information
-        """
-        return await self._activity_repo.get_by_program(program_id, skip=0, limit=100000)
+    def _resource_name(self, resource_id: UUID) -> str:
+        """Resource code for messages, the id if the resource is unknown."""
+        resource = self._resources.get(resource_id)
+        return resource.code if resource else str(resource_id)
 
-    async def _calculate_priorities(
-        self,
-        activities: list[Activity],
-    ) -> dict[UUID, ActivityPriority]:
+    def _calculate_priorities(self) -> dict[UUID, ActivityPriority]:
         """Calculate priority scores for all activities.
 
-        Args:
-            activities: List of activities to prioritize
-
         Returns:
             Dictionary mapping activity IDs to their priorities
         """
         priorities: dict[UUID, ActivityPriority] = {}
 
-        for activity in activities:
-            # Get resource count for this activity
-            assignments = await self._assignment_repo.get_by_activity(activity.id)
-            resource_count = len(assignments)
-
-            early_start = activity.early_start or activity.planned_start or date.max
+        for activity in self.snapshot.activities:
+            early_start = activity.start or date.max
             total_float = activity.total_float if activity.total_float is not None else 9999
 
             priorities[activity.id] = ActivityPriority(
                 activity_id=activity.id,
                 early_start=early_start,
                 total_float=total_float,
-                is_critical=activity.is_critical or False,
-                resource_count=resource_count,
+                is_critical=activity.is_critical,
+                resource_count=self._resource_counts[activity.id],
             )
 
         return priorities
 
-    async def _build_conflict_matrix(
+    def _build_conflict_matrix(
         self,
-        program_id: UUID,
         activity_dates: dict[UUID, tuple[date, date]],
-        options: LevelingOptions,
     ) -> list[ResourceConflict]:
         """Build matrix of all resource conflicts.
 
-        Scans all resources for overallocation periods and identifies
-        which activities are competing for each overallocated slot.
+        Scans the program's active resources for overallocated working
+        days and identifies which activities are competing for each
+        overallocated slot.
 
         Args:
-            program_id: Program to analyze
             activity_dates: Current working dates for activities
-            options: Leveling options
 
         Returns:
             Heap-ordered list of ResourceConflict objects
         """
         conflicts: list[ResourceConflict] = []
-
-        # Get all resources
-        resources, _ = await self._resource_repo.get_by_program(
-            program_id, is_active=True, skip=0, limit=10000
-        )
-        target_ids = set(options.target_resources) if options.target_resources else None
+        target_resources = self.options.target_resources
+        target_ids = set(target_resources) if target_resources else None
 
         # Find date range from activity dates
         if not activity_dates:
@@ -438,55 +367,51 @@ class ParallelLevelingService:
         min_date = min(d[0] for d in activity_dates.values())
         max_date = max(d[1] for d in activity_dates.values())
 
-        for resource in resources:
-            if target_ids is not None and resource.id not in target_ids:
-                continue
+        days = (max_date - min_date).days + 1
 
-            # Get all assignments for this resource
-            assignments = await self._assignment_repo.get_assignments_with_activities(resource.id)
+        for resource_id in self.snapshot.program_resource_ids:
+            if target_ids is not None and resource_id not in target_ids:
+                continue
 
-            if not assignments:
+            resource = self._resources.get(resource_id)
+            assignments = [
+                a for a in self._assignments[resource_id] if a.activity_id in activity_dates
+            ]
+            if resource is None or not assignments:
                 continue
 
             capacity = resource.capacity_per_day
+            capacity_hundredths = to_hundredths(capacity)
+            working = _calendar(resource).working_mask(min_date, days)
 
-            # Check each day in the range
-            current = min_date
-            while current <= max_date:
-                # Skip weekends
-                if current.weekday() >= 5:
-                    current += timedelta(days=1)
-                    continue
-
-                # Calculate total load and identify activities on this day
-                total_load = Decimal("0")
-                activities_on_day: list[UUID] = []
-
-                for assignment in assignments:
-                    activity_id = assignment.activity_id
-                    if activity_id not in activity_dates:
-                        continue
-
-                    act_start, act_finish = activity_dates[activity_id]
-
-                    # Check if assignment is active on this day
-                    if act_start <= current <= act_finish:
-                        total_load += assignment.units * capacity
-                        activities_on_day.append(activity_id)
-
-                # Check for overallocation with multiple activities
-                if total_load > capacity and len(activities_on_day) > 1:
-                    heappush(
-                        conflicts,
-                        ResourceConflict(
-                            resource_id=resource.id,
-                            conflict_date=current,
-                            overallocation_hours=total_load - capacity,
-                            activities=activities_on_day,
-                        ),
-                    )
+            # Daily units and active assignment counts over the whole range
+            intervals = LoadIntervals.from_ranges(
+                (*activity_dates[a.activity_id], to_hundredths(a.units)) for a in assignments
+            )
+            units = intervals.daily_totals(min_date, max_date)
+            active = intervals.daily_counts(min_date, max_date)
+
+            # Overallocated working days with more than one activity competing
+            overallocated = (
+                working
+                & (active > 1)
+                & (units * capacity_hundredths > FULL_ALLOCATION * capacity_hundredths)
+            )
 
-                current += timedelta(days=1)
+            for offset in np.flatnonzero(overallocated).tolist():
+                current = min_date + timedelta(days=offset)
+                total_load = from_hundredths(int(units[offset])) * capacity
+                heappush(
+                    conflicts,
+                    ResourceConflict(
+                        resource_id=resource_id,
+                        conflict_date=current,
+                        overallocation_hours=total_load - capacity,
+                        activities=[
+                            assignments[i].activity_id for i in intervals.active_on(current)
+                        ],
+                    ),
+                )
 
         return conflicts
 
@@ -495,7 +420,6 @@ class ParallelLevelingService:
         conflict: ResourceConflict,
         priority_map: dict[UUID, ActivityPriority],
         activity_dates: dict[UUID, tuple[date, date]],
-        options: LevelingOptions,
     ) -> UUID | None:
         """Select the best activity to delay based on priorities.
 
@@ -506,11 +430,11 @@ class ParallelLevelingService:
             conflict: The conflict to resolve
             priority_map: Activity priority scores
             activity_dates: Current working dates
-            options: Leveling options
 
         Returns:
             Activity ID to delay, or None if no candidate found
         """
+        options = self.options
         candidates: list[tuple[tuple[int, date, int, int], UUID]] = []
 
         for activity_id in conflict.activities:
@@ -539,7 +463,7 @@ class ParallelLevelingService:
         candidates.sort(reverse=True)
         return candidates[0][1]
 
-    async def _calculate_minimum_delay(  # noqa: PLR0912
+    def _calculate_minimum_delay(
         self,
         activity_id: UUID,
         resource_id: UUID,
@@ -548,7 +472,8 @@ class ParallelLevelingService:
     ) -> int:
         """Calculate minimum delay to resolve conflict.
 
-        Finds the next available slot for the resource and determines
+        Finds the next working-day start after the conflict date where
+        the activity fits beside the resource's other work, to determine
         how many days the activity needs to be delayed.
 
         Args:
@@ -563,126 +488,291 @@ class ParallelLevelingService:
         current_start, current_finish = activity_dates[activity_id]
         duration = (current_finish - current_start).days
 
-        # Get resource and its assignments
-        resource = await self._resource_repo.get_by_id(resource_id)
+        resource = self._resources.get(resource_id)
         if not resource:
             return 1
 
-        capacity = resource.capacity_per_day
-        assignments = await self._assignment_repo.get_assignments_with_activities(resource_id)
-
-        # Get the assignment for this activity
-        activity_assignment = None
-        for a in assignments:
-            if a.activity_id == activity_id:
-                activity_assignment = a
-                break
-
+        assignments = self._assignments[resource_id]
+        activity_assignment = next((a for a in assignments if a.activity_id == activity_id), None)
         if not activity_assignment:
             return 1
 
-        activity_units = activity_assignment.units
+        activity_units = to_hundredths(activity_assignment.units)
+        capacity_hundredths = to_hundredths(resource.capacity_per_day)
 
-        # Search forward from conflict date for available slot
-        candidate_start = conflict_date + timedelta(days=1)
-        max_search_days = 365
-
-        for _ in range(max_search_days):
-            # Skip weekends
-            while candidate_start.weekday() >= 5:
-                candidate_start += timedelta(days=1)
-
-            candidate_finish = candidate_start + timedelta(days=duration)
-
-            # Check if this slot works for the entire duration
-            slot_works = True
-            check_date = candidate_start
-
-            while check_date <= candidate_finish:
-                if check_date.weekday() >= 5:
-                    check_date += timedelta(days=1)
-                    continue
-
-                # Calculate load on this day (excluding current activity)
-                total_load = Decimal("0")
-                for assignment in assignments:
-                    if assignment.activity_id == activity_id:
-                        continue
-
-                    if assignment.activity_id not in activity_dates:
-                        continue
-
-                    act_start, act_finish = activity_dates[assignment.activity_id]
-                    if act_start <= check_date <= act_finish:
-                        total_load += assignment.units * capacity
-
-                # Check if adding this activity would exceed capacity
-                if total_load + (activity_units * capacity) > capacity:
-                    slot_works = False
-                    break
-
-                check_date += timedelta(days=1)
+        # Load of every other activity on the resource across the search window
+        others = LoadIntervals.from_ranges(
+            (*activity_dates[a.activity_id], to_hundredths(a.units))
+            for a in assignments
+            if a.activity_id != activity_id and a.activity_id in activity_dates
+        )
 
-            if slot_works:
-                return (candidate_start - current_start).days
+        # Search forward from conflict date for available slot
+        search_start = conflict_date + timedelta(days=1)
+        length = slot_window_days(duration)
+        load = others.daily_totals(search_start, search_start + timedelta(days=length - 1))
+
+        # Days where adding this activity would exceed capacity
+        working = _calendar(resource).working_mask(search_start, length)
+        blocked = working & (
+            (load + activity_units) * capacity_hundredths > FULL_ALLOCATION * capacity_hundredths
+        )
 
-            candidate_start += timedelta(days=1)
+        slot = first_fit(search_start, blocked, duration, working=working)
+        if slot is not None:
+            return (search_start + timedelta(days=slot) - current_start).days
 
         # If no slot found, return a reasonable delay
-        return max_search_days
+        return MAX_SEARCH_DAYS
 
-    async def _propagate_to_successors(
+    def _propagate_to_successors(
         self,
         activity_id: UUID,
         activity_dates: dict[UUID, tuple[date, date]],
-        activity_lookup: dict[UUID, Activity],
     ) -> None:
         """Propagate delay to successor activities.
 
-        Updates successor dates based on dependency relationships.
-        Recursively propagates changes through the network.
+        Updates successor dates based on dependency relationships,
+        walking the dependency network depth first.
 
         Args:
             activity_id: Activity that was delayed
             activity_dates: Working dates to update
-            activity_lookup: Activity lookup by ID
         """
-        # Get dependencies where this activity is predecessor
-        dependencies = await self._dependency_repo.get_successors(activity_id)
+        stack = [(activity_id, iter(self._successors[activity_id]))]
 
-        for dep in dependencies:
-            successor_id = dep.successor_id
-            if successor_id not in activity_lookup:
+        while stack:
+            predecessor_id, dependencies = stack[-1]
+            dep = next(dependencies, None)
+            if dep is None:
+                stack.pop()
                 continue
+
+            successor_id = dep.successor_id
             if successor_id not in activity_dates:
                 continue
 
-            predecessor_start, predecessor_finish = activity_dates[activity_id]
+            predecessor_start, predecessor_finish = activity_dates[predecessor_id]
             current_start, current_finish = activity_dates[successor_id]
             duration = (current_finish - current_start).days
+            lag = dep.lag
 
             # Calculate new earliest start based on dependency type
-            lag = dep.lag or 0
-            dep_type = dep.dependency_type.value if dep.dependency_type else "FS"
-
-            if dep_type == "FS":  # Finish-to-Start
-                new_earliest = predecessor_finish + timedelta(days=1 + lag)
-            elif dep_type == "SS":  # Start-to-Start
+            if dep.dependency_type == "SS":  # Start-to-Start
                 new_earliest = predecessor_start + timedelta(days=lag)
-            elif dep_type == "FF":  # Finish-to-Finish
-                new_earliest = predecessor_finish + timedelta(days=lag) - timedelta(days=duration)
-            elif dep_type == "SF":  # Start-to-Finish
-                new_earliest = predecessor_start + timedelta(days=lag) - timedelta(days=duration)
-            else:
+            elif dep.dependency_type == "FF":  # Finish-to-Finish
+                new_earliest = predecessor_finish + timedelta(days=lag - duration)
+            elif dep.dependency_type == "SF":  # Start-to-Finish
+                new_earliest = predecessor_start + timedelta(days=lag - duration)
+            else:  # Finish-to-Start and unknown types
                 new_earliest = predecessor_finish + timedelta(days=1 + lag)
 
             # Only update if new date is later
             if new_earliest > current_start:
-                new_finish = new_earliest + timedelta(days=duration)
-                activity_dates[successor_id] = (new_earliest, new_finish)
+                activity_dates[successor_id] = (
+                    new_earliest,
+                    new_earliest + timedelta(days=duration),
+                )
+                stack.append((successor_id, iter(self._successors[successor_id])))
+
+
+def _calendar(resource: LevelingResource) -> WorkingCalendar:
+    """Working calendar of a snapshot resource, at its capacity by default."""
+    return resource.calendar or standard_calendar(resource.capacity_per_day)
+
+
+def project_finish(snapshot: LevelingSnapshot) -> date:
+    """Latest early or planned finish, program end if there are no activities."""
+    if not snapshot.activities:
+        return snapshot.end_date
+
+    finishes = [a.finish for a in snapshot.activities if a.finish is not None]
+    return max(finishes) if finishes else date.today()
+
+
+def initial_dates(snapshot: LevelingSnapshot) -> dict[UUID, tuple[date, date]]:
+    """Working dates before leveling, defaulting to the program dates."""
+    return {
+        a.id: (a.start or snapshot.start_date, a.finish or snapshot.end_date)
+        for a in snapshot.activities
+    }
+
+
+def leveling_components(snapshot: LevelingSnapshot) -> list[LevelingSnapshot]:
+    """Independent components of a snapshot that can have conflicts."""
+    # Components without assignments can never conflict
+    return [c for c in split_components(snapshot) if c.assignments]
+
+
+def level_component(snapshot: LevelingSnapshot, options: LevelingOptions) -> ParallelLevelingResult:
+    """Level one component; module level so worker processes can run it."""
+    return ParallelLevelingEngine(snapshot, options).run()
 
-                # Recursively update successors
-                await self._propagate_to_successors(successor_id, activity_dates, activity_lookup)
+
+def level_snapshot(snapshot: LevelingSnapshot, options: LevelingOptions) -> ParallelLevelingResult:
+    """Level a whole program snapshot in this process, component by component."""
+    results = [level_component(c, options) for c in leveling_components(snapshot)]
+    return merge_component_results(snapshot, results)
+
+
+def merge_component_results(
+    snapshot: LevelingSnapshot,
+    results: list[ParallelLevelingResult],
+) -> ParallelLevelingResult:
+    """Combine the results of leveling a program's components.
+
+    Counts (iterations, conflicts, resources, shifted activities) are
+    summed, since components share no activity or resource; shifts and
+    warnings are concatenated in component order. Activities outside the
+    leveled components keep their initial dates for the finish date, and
+    the finish is unchanged if no component had a conflict.
+
+    Args:
+        snapshot: The whole program snapshot
+        results: One result per leveled component
+
+    Returns:
+        ParallelLevelingResult for the program
+    """
+    original_finish = project_finish(snapshot)
+    leveled = {shift.activity_id for result in results for shift in result.shifts}
+    new_finish = original_finish
+    if any(result.iterations_used for result in results):
+        new_finish = max(
+            [finish for _start, finish in initial_dates(snapshot).values()]
+            + [result.new_project_finish for result in results if result.shifts]
+        )
+    remaining = sum(r.remaining_overallocations for r in results)
+
+    return ParallelLevelingResult(
+        program_id=snapshot.program_id,
+        success=remaining == 0,
+        iterations_used=sum(r.iterations_used for r in results),
+        activities_shifted=len(leveled),
+        shifts=[shift for result in results for shift in result.shifts],
+        remaining_overallocations=remaining,
+        new_project_finish=new_finish,
+        original_project_finish=original_finish,
+        schedule_extension_days=max(0, (new_finish - original_finish).days),
+        warnings=[warning for result in results for warning in result.warnings],
+        conflicts_resolved=sum(r.conflicts_resolved for r in results),
+        resources_processed=sum(r.resources_processed for r in results),
+    )
+
+
+class ParallelLevelingService:
+    """Parallel resource leveling service.
+
+    Unlike serial leveling which processes activities one at a time,
+    parallel leveling considers all resources and activities simultaneously
+    to find a globally better (often optimal) solution.
+
+    The program is read once into a LevelingSnapshot and split into
+    independent components (activities linked by shared resources or
+    dependencies). Each component is leveled by ParallelLevelingEngine
+    with its own max_iterations budget. When the components together
+    hold at least PARALLEL_MIN_ACTIVITIES activities they are leveled in
+    the shared leveling pool, even a single component, so large programs
+    never level on the event loop; otherwise in this process.
+
+    Key Improvements over Serial:
+    - Considers multi-resource activities holistically
+    - Better handling of shared resources across activities
+    - Finds solutions serial method might miss
+
+    Example usage:
+        service = ParallelLevelingService(session)
+        options = LevelingOptions(preserve_critical_path=True)
+        result = await service.level_program(program_id, options)
+
+        if result.success:
+            print(f"Resolved {result.conflicts_resolved} conflicts")
+            print(f"Processed {result.resources_processed} resources")
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: CacheService | None = None,
+        *,
+        pool: LevelingPool | None = None,
+    ) -> None:
+        """Initialize ParallelLevelingService.
+
+        Args:
+            session: Database session for queries
+            cache: Optional cache service
+            pool: Worker pool for leveling components concurrently
+                (defaults to the shared leveling_pool)
+        """
+        self.session = session
+        self.cache = cache
+        self.pool = pool or leveling_pool
+        self._activity_repo = ActivityRepository(session)
+        self._program_repo = ProgramRepository(session)
+        self._snapshot_loader = ResourceLevelingService(session, cache)
+
+    async def level_program(
+        self,
+        program_id: UUID,
+        options: LevelingOptions | None = None,
+    ) -> ParallelLevelingResult:
+        """Execute parallel resource leveling.
+
+        Args:
+            program_id: Program to level
+            options: Leveling options
+
+        Returns:
+            ParallelLevelingResult with all changes and metrics
+        """
+        if options is None:
+            options = LevelingOptions()
+
+        # Get program and validate
+        program = await self._program_repo.get_by_id(program_id)
+        if not program:
+            return ParallelLevelingResult(
+                program_id=program_id,
+                success=False,
+                iterations_used=0,
+                activities_shifted=0,
+                shifts=[],
+                remaining_overallocations=0,
+                new_project_finish=date.today(),
+                original_project_finish=date.today(),
+                schedule_extension_days=0,
+                warnings=["Program not found"],
+            )
+
+        snapshot = await self._snapshot_loader.load_snapshot(program)
+
+        results = await self._level_components(leveling_components(snapshot), options)
+        return merge_component_results(snapshot, results)
+
+    async def _level_components(
+        self,
+        components: list[LevelingSnapshot],
+        options: LevelingOptions,
+    ) -> list[ParallelLevelingResult]:
+        """Level components, in the shared process pool when it pays off.
+
+        Args:
+            components: Independent components of one program
+            options: Leveling options
+
+        Returns:
+            One result per component, in component order
+        """
+        activity_count = sum(len(c.activities) for c in components)
+        if not self.pool.parallel or activity_count < PARALLEL_MIN_ACTIVITIES:
+            return [level_component(component, options) for component in components]
+
+        # Largest components first, so the slowest work starts earliest
+        order = sorted(range(len(components)), key=lambda i: -len(components[i].activities))
+        results = await self.pool.map(level_component, [(components[i], options) for i in order])
+        by_index = dict(zip(order, results, strict=True))
+        return [by_index[index] for index in range(len(components))]
 
     async def apply_leveling_result(
         self,
@@ -20,6 +20,7 @@ from src.repositories.resource import (
     ResourceCalendarRepository,
     ResourceRepository,
 )
+from src.services.working_calendar import resource_calendar
 
 if TYPE_CHECKING:
     from uuid import UUID
@@ -204,10 +205,8 @@ class ResourceService:
             resource_id, start_date, end_date
         )
 
-        # Build calendar lookup
-        calendar_by_date: dict[date, ResourceCalendar] = {
-            entry.calendar_date: entry for entry in calendar_entries
-        }
+        # Calendar entries override the resource's template (or Monday-Friday)
+        calendar = resource_calendar(default_capacity, resource.calendar_template, calendar_entries)
 
         # Get all assignments that might overlap this range
         assignments = await self._assignment_repo.get_by_resource(
@@ -219,19 +218,7 @@ class ResourceService:
         current_date = start_date
 
         while current_date <= end_date:
-            # Get available hours from calendar or default
-            if current_date in calendar_by_date:
-                calendar_entry = calendar_by_date[current_date]
-                available_hours = (
-                    calendar_entry.available_hours
-                    if calendar_entry.is_working_day
-                    else Decimal("0")
-                )
-            # No calendar entry - use default capacity for weekdays
-            elif current_date.weekday() < 5:  # Monday = 0, Friday = 4
-                available_hours = default_capacity
-            else:
-                available_hours = Decimal("0")
+            available_hours = calendar.hours_on(current_date)
 
             # Calculate assigned hours from active assignments
             assigned_hours = Decimal("0")
@@ -1,26 +1,43 @@
 """Resource histogram service for visualization data.
 
 Provides histogram data showing resource loading over time for capacity planning.
-Supports single-resource and program-wide histograms with daily/weekly granularity.
+Supports single-resource and program-wide histograms with daily, weekly or
+monthly granularity.
+
+All resources of a histogram are loaded with one query for assignments
+and one for calendar entries and computed as a single HistogramMatrix;
+rollups and statistics are array reductions (see histogram_kernel).
 """
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import date, timedelta
+from datetime import date
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from src.repositories.program import ProgramRepository
-from src.repositories.resource import ResourceRepository
+from src.repositories.resource import (
+    ResourceAssignmentRepository,
+    ResourceCalendarRepository,
+    ResourceRepository,
+)
+from src.services.histogram_kernel import HistogramMatrix, HistogramStatistics
+from src.services.loading_kernel import LoadIntervals, hours_from_units, to_hundredths
 from src.services.resource_loading import ResourceLoadingService
+from src.services.working_calendar import resource_calendar
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from numpy.typing import NDArray
     from sqlalchemy.ext.asyncio import AsyncSession
 
     from src.models.enums import ResourceType
+    from src.models.resource import Resource, ResourceAssignment, ResourceCalendar
     from src.services.cache_service import CacheService
 
 
@@ -99,6 +116,23 @@ class ProgramHistogramSummary:
     resources_with_overallocation: int
 
 
+@dataclass
+class ProgramHistogramMatrix:
+    """Columnar histogram data for a program.
+
+    Attributes:
+        summary: Program-wide summary
+        resources: Resources in matrix row order
+        matrix: Hours per resource and period
+        statistics: Statistics of each matrix row
+    """
+
+    summary: ProgramHistogramSummary
+    resources: list[Resource]
+    matrix: HistogramMatrix
+    statistics: HistogramStatistics
+
+
 class ResourceHistogramService:
     """Service for generating resource histogram data.
 
@@ -133,6 +167,8 @@ class ResourceHistogramService:
         self.cache = cache
         self._resource_repo = ResourceRepository(session)
         self._program_repo = ProgramRepository(session)
+        self._assignment_repo = ResourceAssignmentRepository(session)
+        self._calendar_repo = ResourceCalendarRepository(session)
         self._loading_service = ResourceLoadingService(session, cache)
 
     async def get_resource_histogram(
@@ -148,7 +184,7 @@ class ResourceHistogramService:
             resource_id: UUID of the resource
             start_date: Start of histogram period
             end_date: End of histogram period
-            granularity: "daily" or "weekly"
+            granularity: "daily", "weekly" or "monthly"
 
         Returns:
             ResourceHistogram with data points, or None if resource not found
@@ -157,62 +193,9 @@ class ResourceHistogramService:
         if not resource:
             return None
 
-        # Get daily loading data
-        loading = await self._loading_service.calculate_daily_loading(
-            resource_id, start_date, end_date
-        )
-
-        # Convert to data points
-        data_points: list[HistogramDataPoint] = []
-        current = start_date
-        while current <= end_date:
-            if current in loading:
-                day_loading = loading[current]
-                available = day_loading.available_hours
-                assigned = day_loading.assigned_hours
-                utilization = (
-                    (assigned / available * Decimal("100")) if available > 0 else Decimal("0")
-                )
-                is_over = day_loading.is_overallocated
-            else:
-                # No loading data - use resource capacity
-                available = resource.capacity_per_day
-                assigned = Decimal("0")
-                utilization = Decimal("0")
-                is_over = False
-
-            data_points.append(
-                HistogramDataPoint(
-                    date=current,
-                    available_hours=available,
-                    assigned_hours=assigned,
-                    utilization_percent=utilization,
-                    is_overallocated=is_over,
-                )
-            )
-            current += timedelta(days=1)
-
-        # Aggregate if weekly
-        if granularity == "weekly":
-            data_points = self._aggregate_to_weekly(data_points)
-
-        # Calculate statistics
-        stats = self._calculate_statistics(data_points)
-
-        return ResourceHistogram(
-            resource_id=resource.id,
-            resource_code=resource.code,
-            resource_name=resource.name,
-            resource_type=resource.resource_type,
-            start_date=start_date,
-            end_date=end_date,
-            data_points=data_points,
-            peak_utilization=stats["peak_utilization"],
-            peak_date=stats["peak_date"],
-            average_utilization=stats["average_utilization"],
-            overallocated_days=stats["overallocated_days"],
-            total_available_hours=stats["total_available_hours"],
-            total_assigned_hours=stats["total_assigned_hours"],
+        matrix = (await self._load_matrix([resource], start_date, end_date)).rollup(granularity)
+        return _to_histogram(
+            resource, matrix, matrix.statistics(), 0, start_date=start_date, end_date=end_date
         )
 
     async def get_program_histogram(
@@ -221,6 +204,7 @@ class ResourceHistogramService:
         start_date: date | None = None,
         end_date: date | None = None,
         resource_ids: list[UUID] | None = None,
+        granularity: str = "daily",
     ) -> tuple[ProgramHistogramSummary, list[ResourceHistogram]]:
         """Generate histogram data for all resources in a program.
 
@@ -229,191 +213,216 @@ class ResourceHistogramService:
             start_date: Start of period (defaults to program start)
             end_date: End of period (defaults to program end)
             resource_ids: Optional filter for specific resources
+            granularity: "daily", "weekly" or "monthly"
 
         Returns:
             Tuple of (ProgramHistogramSummary, list of ResourceHistogram)
         """
-        program = await self._program_repo.get_by_id(program_id)
-
-        if not program:
-            return (
-                ProgramHistogramSummary(
-                    program_id=program_id,
-                    start_date=start_date or date.today(),
-                    end_date=end_date or date.today(),
-                    resource_count=0,
-                    total_overallocated_days=0,
-                    resources_with_overallocation=0,
-                ),
-                [],
+        data = await self.get_program_histogram_matrix(
+            program_id, start_date, end_date, resource_ids, granularity
+        )
+        summary = data.summary
+        histograms = [
+            _to_histogram(
+                resource,
+                data.matrix,
+                data.statistics,
+                row,
+                start_date=summary.start_date,
+                end_date=summary.end_date,
             )
+            for row, resource in enumerate(data.resources)
+        ]
+        return summary, histograms
 
-        # Use program dates if not specified
-        analysis_start = start_date or program.start_date
-        analysis_end = end_date or program.end_date
-
-        # Get resources
-        resources, _ = await self._resource_repo.get_by_program(
-            program_id, is_active=True, skip=0, limit=10000
-        )
+    async def get_program_histogram_matrix(
+        self,
+        program_id: UUID,
+        start_date: date | None = None,
+        end_date: date | None = None,
+        resource_ids: list[UUID] | None = None,
+        granularity: str = "daily",
+    ) -> ProgramHistogramMatrix:
+        """Generate columnar histogram data for all resources in a program.
 
-        # Filter if specific resources requested
-        if resource_ids:
-            resource_id_set = set(resource_ids)
-            resources = [r for r in resources if r.id in resource_id_set]
+        Args:
+            program_id: UUID of the program
+            start_date: Start of period (defaults to program start)
+            end_date: End of period (defaults to program end)
+            resource_ids: Optional filter for specific resources
+            granularity: "daily", "weekly" or "monthly"
 
-        # Generate histograms for each resource
-        histograms: list[ResourceHistogram] = []
-        total_overallocated_days = 0
-        resources_with_overallocation = 0
+        Returns:
+            ProgramHistogramMatrix with one row per resource. Summary
+            over-allocation counts are in days whatever the granularity.
+        """
+        program = await self._program_repo.get_by_id(program_id)
 
-        for resource in resources:
-            histogram = await self.get_resource_histogram(
-                resource.id, analysis_start, analysis_end, granularity="daily"
+        if not program:
+            analysis_start = start_date or date.today()
+            analysis_end = end_date or date.today()
+            resources: list[Resource] = []
+        else:
+            # Use program dates if not specified
+            analysis_start = start_date or program.start_date
+            analysis_end = end_date or program.end_date
+
+            # Get resources
+            resources, _ = await self._resource_repo.get_by_program(
+                program_id, is_active=True, skip=0, limit=10000
             )
-            if histogram:
-                histograms.append(histogram)
-                total_overallocated_days += histogram.overallocated_days
-                if histogram.overallocated_days > 0:
-                    resources_with_overallocation += 1
+
+            # Filter if specific resources requested
+            if resource_ids:
+                resource_id_set = set(resource_ids)
+                resources = [r for r in resources if r.id in resource_id_set]
+
+        daily = await self._load_matrix(resources, analysis_start, analysis_end)
+        overallocated_days = daily.overallocated.sum(axis=1)
+        matrix = daily.rollup(granularity)
 
         summary = ProgramHistogramSummary(
             program_id=program_id,
             start_date=analysis_start,
             end_date=analysis_end,
-            resource_count=len(histograms),
-            total_overallocated_days=total_overallocated_days,
-            resources_with_overallocation=resources_with_overallocation,
+            resource_count=len(resources),
+            total_overallocated_days=int(overallocated_days.sum()),
+            resources_with_overallocation=int(np.count_nonzero(overallocated_days)),
         )
 
-        return summary, histograms
+        return ProgramHistogramMatrix(
+            summary=summary,
+            resources=resources,
+            matrix=matrix,
+            statistics=matrix.statistics(),
+        )
 
-    def _aggregate_to_weekly(
+    async def _load_matrix(
         self,
-        daily_data: list[HistogramDataPoint],
-    ) -> list[HistogramDataPoint]:
-        """Aggregate daily data points to weekly.
+        resources: list[Resource],
+        start_date: date,
+        end_date: date,
+    ) -> HistogramMatrix:
+        """Daily hours of several resources, loaded with two queries.
 
-        Sums hours and calculates average utilization for each week.
-        Week starts on Monday.
+        Available hours come from each resource's calendar (template and
+        calendar entries); assigned hours from one sweep over its
+        assignments, using activity dates where the assignment has none.
 
         Args:
-            daily_data: List of daily data points
+            resources: Resources, one per matrix row
+            start_date: First day (inclusive)
+            end_date: Last day (inclusive)
 
         Returns:
-            List of weekly aggregated data points
+            Daily HistogramMatrix
         """
-        if not daily_data:
-            return []
-
-        weekly_data: list[HistogramDataPoint] = []
-        week_points: list[HistogramDataPoint] = []
-        current_week_start: date | None = None
-
-        for point in daily_data:
-            # Get Monday of this week
-            week_start = point.date - timedelta(days=point.date.weekday())
-
-            if current_week_start is None:
-                current_week_start = week_start
+        days = max(0, (end_date - start_date).days + 1)
+        available = np.zeros((len(resources), days), dtype=np.int64)
+        assigned = np.zeros((len(resources), days), dtype=np.int64)
+        if not resources or not days:
+            return HistogramMatrix.from_hundredths(start_date, available, assigned)
+
+        resource_ids = [resource.id for resource in resources]
+        assignments_by_resource: dict[UUID, list[ResourceAssignment]] = defaultdict(list)
+        for assignment in await self._assignment_repo.get_assignments_for_resources(resource_ids):
+            assignments_by_resource[assignment.resource_id].append(assignment)
+        calendar_by_resource: dict[UUID, list[ResourceCalendar]] = defaultdict(list)
+        for entry in await self._calendar_repo.get_for_resources_date_range(
+            resource_ids, start_date, end_date
+        ):
+            calendar_by_resource[entry.resource_id].append(entry)
+
+        for row, resource in enumerate(resources):
+            capacity = resource.capacity_per_day
+            calendar = resource_calendar(
+                capacity, resource.calendar_template, calendar_by_resource[resource.id]
+            )
+            available[row] = calendar.hours(start_date, end_date)
 
-            if week_start != current_week_start:
-                # Aggregate previous week
-                if week_points:
-                    weekly_data.append(self._aggregate_week(week_points))
-                week_points = []
-                current_week_start = week_start
+            # Units represent allocation (1.0 = 100% = full capacity)
+            intervals = LoadIntervals.from_ranges(
+                (
+                    *self._loading_service.get_assignment_date_range(assignment),
+                    to_hundredths(assignment.units),
+                )
+                for assignment in assignments_by_resource[resource.id]
+            )
+            assigned[row] = hours_from_units(intervals.daily_totals(start_date, end_date), capacity)
 
-            week_points.append(point)
+        return HistogramMatrix.from_hundredths(start_date, available, assigned)
 
-        # Don't forget the last week
-        if week_points:
-            weekly_data.append(self._aggregate_week(week_points))
 
-        return weekly_data
+def _to_decimals(values: NDArray[np.float64]) -> list[Decimal]:
+    """Decimals rounded to hundredths, the precision of the stored hours."""
+    return [Decimal(f"{value:.2f}") for value in values.tolist()]
 
-    def _aggregate_week(
-        self,
-        points: list[HistogramDataPoint],
-    ) -> HistogramDataPoint:
-        """Aggregate a list of daily points into one weekly point.
 
-        Args:
-            points: Daily data points for one week
+def _to_histogram(
+    resource: Resource,
+    matrix: HistogramMatrix,
+    statistics: HistogramStatistics,
+    row: int,
+    *,
+    start_date: date,
+    end_date: date,
+) -> ResourceHistogram:
+    """Build the ResourceHistogram of one matrix row.
 
-        Returns:
-            Single aggregated data point for the week
-        """
-        total_available = sum((p.available_hours for p in points), Decimal("0"))
-        total_assigned = sum((p.assigned_hours for p in points), Decimal("0"))
-        is_over = any(p.is_overallocated for p in points)
-
-        utilization = (
-            (total_assigned / total_available * Decimal("100"))
-            if total_available > 0
-            else Decimal("0")
-        )
-
-        # Use Monday of the week as the date
-        week_start = points[0].date - timedelta(days=points[0].date.weekday())
+    Args:
+        resource: Resource of the row
+        matrix: Histogram matrix
+        statistics: Statistics of the matrix
+        row: Row of the resource
+        start_date: Start of histogram period
+        end_date: End of histogram period
 
-        return HistogramDataPoint(
-            date=week_start,
-            available_hours=total_available,
-            assigned_hours=total_assigned,
+    Returns:
+        ResourceHistogram with a data point per matrix period
+    """
+    dates = matrix.dates
+    data_points = [
+        HistogramDataPoint(
+            date=day,
+            available_hours=available,
+            assigned_hours=assigned,
             utilization_percent=utilization,
             is_overallocated=is_over,
         )
-
-    def _calculate_statistics(
-        self,
-        data_points: list[HistogramDataPoint],
-    ) -> dict:  # type: ignore[type-arg]
-        """Calculate summary statistics for histogram data.
-
-        Args:
-            data_points: List of data points
-
-        Returns:
-            Dictionary with peak_utilization, peak_date, average_utilization,
-            overallocated_days, total_available_hours, total_assigned_hours
-        """
-        if not data_points:
-            return {
-                "peak_utilization": Decimal("0"),
-                "peak_date": None,
-                "average_utilization": Decimal("0"),
-                "overallocated_days": 0,
-                "total_available_hours": Decimal("0"),
-                "total_assigned_hours": Decimal("0"),
-            }
-
-        peak_utilization = Decimal("0")
-        peak_date: date | None = None
-        total_utilization = Decimal("0")
-        overallocated_days = 0
-        total_available = Decimal("0")
-        total_assigned = Decimal("0")
-
-        for point in data_points:
-            if point.utilization_percent > peak_utilization:
-                peak_utilization = point.utilization_percent
-                peak_date = point.date
-
-            total_utilization += point.utilization_percent
-            total_available += point.available_hours
-            total_assigned += point.assigned_hours
-
-            if point.is_overallocated:
-                overallocated_days += 1
-
-        average_utilization = total_utilization / len(data_points)
-
-        return {
-            "peak_utilization": peak_utilization,
-            "peak_date": peak_date,
-            "average_utilization": average_utilization,
-            "overallocated_days": overallocated_days,
-            "total_available_hours": total_available,
-            "total_assigned_hours": total_assigned,
-        }
+        for day, available, assigned, utilization, is_over in zip(
+            dates,
+            _to_decimals(matrix.available[row]),
+            _to_decimals(matrix.assigned[row]),
+            _to_decimals(matrix.utilization[row]),
+            matrix.overallocated[row].tolist(),
+            strict=True,
+        )
+    ]
+
+    peak_index = int(statistics.peak_index[row])
+    (peak, average, total_available, total_assigned) = _to_decimals(
+        np.array(
+            [
+                statistics.peak_utilization[row],
+                statistics.average_utilization[row],
+                statistics.total_available[row],
+                statistics.total_assigned[row],
+            ]
+        )
+    )
+
+    return ResourceHistogram(
+        resource_id=resource.id,
+        resource_code=resource.code,
+        resource_name=resource.name,
+        resource_type=resource.resource_type,
+        start_date=start_date,
+        end_date=end_date,
+        data_points=data_points,
+        peak_utilization=peak,
+        peak_date=dates[peak_index] if peak_index >= 0 else None,
+        average_utilization=average,
+        overallocated_days=int(statistics.overallocated_periods[row]),
+        total_available_hours=total_available,
+        total_assigned_hours=total_assigned,
+    )
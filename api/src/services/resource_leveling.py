@@ -2,28 +2,56 @@
 
 Processes activities one at a time in priority order, delaying activities
 when resources are overallocated to achieve feasible resource schedules.
+
+The program is loaded once into a LevelingSnapshot and leveled in memory
+by SerialLevelingEngine, which tracks each resource's daily allocation in
+a NumPy array instead of re-querying assignments for every check.
 """
 
 from __future__ import annotations
 
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import date, timedelta
-from decimal import Decimal
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 from src.repositories.activity import ActivityRepository
 from src.repositories.dependency import DependencyRepository
 from src.repositories.program import ProgramRepository
 from src.repositories.resource import ResourceAssignmentRepository, ResourceRepository
+from src.services.leveling_snapshot import (
+    ExternalLoad,
+    LevelingActivity,
+    LevelingAssignment,
+    LevelingDependency,
+    LevelingResource,
+    LevelingSnapshot,
+)
+from src.services.loading_kernel import (
+    FULL_ALLOCATION,
+    MAX_SEARCH_DAYS,
+    first_fit,
+    slot_window_days,
+    to_hundredths,
+)
 from src.services.resource_loading import ResourceLoadingService
+from src.services.working_calendar import (
+    DEFAULT_HOURS_PER_DAY,
+    get_template_calendar,
+    standard_calendar,
+)
 
 if TYPE_CHECKING:
     from uuid import UUID
 
+    from numpy.typing import NDArray
     from sqlalchemy.ext.asyncio import AsyncSession
 
-    from src.models.activity import Activity
+    from src.models.program import Program
     from src.services.cache_service import CacheService
+    from src.services.working_calendar import WorkingCalendar
 
 
 @dataclass
@@ -97,95 +125,200 @@ class LevelingResult:
     warnings: list[str] = field(default_factory=list)
 
 
-class ResourceLevelingService:
-    """Service for serial resource leveling.
+# Days added beyond the requested range when a load array grows
+_GROWTH_DAYS = 366
 
-    Implements a priority-based serial leveling algorithm that processes
-    activities one at a time, delaying those that cause over-allocations.
 
-    Algorithm:
-    1. Sort activities by leveling priority (early_start, total_float, id)
-    2. For each activity, check if it causes over-allocation
-    3. If overallocated, find next available slot for the resource
-    4. Delay activity if allowed (respects critical path and float constraints)
-    5. Recalculate successor dates
-    6. Repeat until no more changes or max iterations reached
+class ResourceLoad:
+    """Daily allocation of one resource in hundredths of a unit.
 
-    Example usage:
-        service = ResourceLevelingService(session)
-        options = LevelingOptions(preserve_critical_path=True)
-        result = await service.level_program(program_id, options)
+    A resource with positive capacity is overallocated on a working day
+    when the sum of units * capacity exceeds capacity, which is the same
+    as the summed units exceeding 1.0 (FULL_ALLOCATION hundredths). Loads
+    are kept in an int64 array indexed by day that grows on demand;
+    days never touched carry no load. Working days come from the
+    resource's compiled calendar (Monday to Friday by default).
 
-        if result.success:
-            print(f"Leveled in {result.iterations_used} iterations")
-            for shift in result.shifts:
-                print(f"{shift.activity_code}: delayed {shift.delay_days} days")
+    A prefix count of overallocated working days is rebuilt lazily after
+    a change, so range checks are O(1) between changes.
     """
 
-    def __init__(
+    def __init__(self, calendar: WorkingCalendar | None = None) -> None:
+        """Initialize an empty load.
+
+        Args:
+            calendar: Working calendar of the resource (default Monday to
+                Friday)
+        """
+        self._calendar = calendar or standard_calendar(DEFAULT_HOURS_PER_DAY)
+        self._origin: date | None = None
+        self._units: NDArray[np.int64] = np.zeros(0, dtype=np.int64)
+        self._overallocated: NDArray[np.int64] | None = None
+
+    def add(self, start: date, finish: date, units: int) -> None:
+        """Add units to every day of [start, finish].
+
+        Args:
+            start: First day
+            finish: Last day (inclusive)
+            units: Hundredths to add (negative to remove)
+        """
+        if finish < start:
+            return
+        origin = self._cover(start, finish)
+        first = (start - origin).days
+        last = (finish - origin).days
+        self._units[first : last + 1] += units
+        self._overallocated = None
+
+    def is_overallocated(self, start: date, finish: date) -> bool:
+        """Check whether any working day in [start, finish] is overallocated.
+
+        Args:
+            start: First day
+            finish: Last day (inclusive)
+
+        Returns:
+            True if the load exceeds full allocation on any working day
+        """
+        if self._origin is None or finish < start:
+            return False
+        prefix = self._overallocated_prefix()
+        size = len(self._units)
+        first = min(max((start - self._origin).days, 0), size)
+        last = min(max((finish - self._origin).days + 1, 0), size)
+        return bool(prefix[last] > prefix[first])
+
+    def find_slot(
         self,
-        session: AsyncSession,
-        cache: CacheService | None = None,
-    ) -> None:
-        """Initialize ResourceLevelingService.
+        earliest_start: date,
+        duration: int,
+        units: int,
+        own: list[tuple[date, date, int]],
+    ) -> date | None:
+        """Find the first working-day start where an activity fits.
+
+        Candidates are the first MAX_SEARCH_DAYS working days on or after
+        earliest_start. A candidate fits when no working day of
+        [candidate, candidate + duration] would exceed full allocation
+        once the activity's own current load is replaced by units.
 
         Args:
-            session: Database session for queries
-            cache: Optional cache service
+            earliest_start: Earliest candidate start
+            duration: Calendar days from start to finish
+            units: Hundredths the activity needs
+            own: Current (start, finish, units) loads of the activity
+
+        Returns:
+            First fitting start date, or None if no candidate fits
         """
-        self.session = session
-        self.cache = cache
-        self._activity_repo = ActivityRepository(session)
-        self._resource_repo = ResourceRepository(session)
-        self._assignment_repo = ResourceAssignmentRepository(session)
-        self._dependency_repo = DependencyRepository(session)
-        self._program_repo = ProgramRepository(session)
-        self._loading_service = ResourceLoadingService(session, cache)
+        length = slot_window_days(duration)
+        window_end = earliest_start + timedelta(days=length - 1)
+        origin = self._cover(earliest_start, window_end)
+        offset = (earliest_start - origin).days
+        window = self._units[offset : offset + length].copy()
+
+        for own_start, own_finish, own_units in own:
+            first = max((own_start - earliest_start).days, 0)
+            last = min((own_finish - earliest_start).days, length - 1)
+            if first <= last:
+                window[first : last + 1] -= own_units
+
+        working = self._calendar.working_mask(earliest_start, length)
+        blocked = working & (window + units > FULL_ALLOCATION)
+        slot = first_fit(earliest_start, blocked, duration, working=working)
+        if slot is None:
+            return None
+        return earliest_start + timedelta(days=slot)
+
+    def _cover(self, start: date, finish: date) -> date:
+        """Grow the array to cover [start, finish] and return its origin."""
+        if self._origin is None:
+            self._origin = start - timedelta(days=_GROWTH_DAYS)
+            days = (finish - start).days + 2 * _GROWTH_DAYS + 1
+            self._units = np.zeros(days, dtype=np.int64)
+            return self._origin
+
+        origin = self._origin
+        end = origin + timedelta(days=len(self._units) - 1)
+        if start >= origin and finish <= end:
+            return origin
+
+        new_origin = min(origin, start - timedelta(days=_GROWTH_DAYS))
+        new_end = max(end, finish + timedelta(days=_GROWTH_DAYS))
+        units = np.zeros((new_end - new_origin).days + 1, dtype=np.int64)
+        shift = (origin - new_origin).days
+        units[shift : shift + len(self._units)] = self._units
+
+        self._origin = new_origin
+        self._units = units
+        self._overallocated = None
+        return new_origin
+
+    def _overallocated_prefix(self) -> NDArray[np.int64]:
+        """Prefix count of overallocated working days, rebuilt after changes."""
+        if self._overallocated is None:
+            assert self._origin is not None
+            working = self._calendar.working_mask(self._origin, len(self._units))
+            over = working & (self._units > FULL_ALLOCATION)
+            self._overallocated = np.concatenate(([0], np.cumsum(over, dtype=np.int64)))
+        return self._overallocated
+
+
+class SerialLevelingEngine:
+    """Serial leveling heuristic over an in-memory program snapshot.
+
+    Activities are scanned in priority order (start, total float, id).
+    The first activity whose assigned resource is overallocated during
+    its working dates is moved to the next slot where the resource has
+    capacity, if the move is allowed, its successors are pushed out, and
+    the scan restarts. Each restart counts as one iteration.
+
+    Resource usage is kept in one ResourceLoad per resource and updated
+    incrementally as activities move, so a run issues no queries.
 
-    async def level_program(  # noqa: PLR0912, PLR0915
+    Example usage:
+        snapshot = await ResourceLevelingService(session).load_snapshot(program)
+        result = SerialLevelingEngine(snapshot, LevelingOptions()).run()
+    """
+
+    def __init__(
         self,
-        program_id: UUID,
+        snapshot: LevelingSnapshot,
         options: LevelingOptions | None = None,
-    ) -> LevelingResult:
-        """Main entry point for resource leveling.
-
-        Applies serial leveling algorithm to resolve resource over-allocations
-        in the program.
+    ) -> None:
+        """Initialize the engine.
 
         Args:
-            program_id: Program to level
+            snapshot: Program data to level
             options: Leveling options (uses defaults if None)
+        """
+        self.snapshot = snapshot
+        self.options = options or LevelingOptions()
+        self._resources = {r.id: r for r in snapshot.resources}
+        self._assignments: dict[UUID, list[LevelingAssignment]] = defaultdict(list)
+        for assignment in snapshot.assignments:
+            self._assignments[assignment.activity_id].append(assignment)
+        self._successors: dict[UUID, list[LevelingDependency]] = defaultdict(list)
+        for dependency in snapshot.dependencies:
+            self._successors[dependency.predecessor_id].append(dependency)
+        self._working_dates: dict[UUID, tuple[date, date]] = {}
+        self._loads: dict[UUID, ResourceLoad] = {}
+
+    def run(self) -> LevelingResult:
+        """Level the snapshot.
 
         Returns:
             LevelingResult with details of all changes made
         """
-        if options is None:
-            options = LevelingOptions()
-
-        # Get program info
-        program = await self._program_repo.get_by_id(program_id)
-        if not program:
-            return LevelingResult(
-                program_id=program_id,
-                success=False,
-                iterations_used=0,
-                activities_shifted=0,
-                shifts=[],
-                remaining_overallocations=0,
-                new_project_finish=date.today(),
-                original_project_finish=date.today(),
-                schedule_extension_days=0,
-                warnings=["Program not found"],
-            )
+        options = self.options
+        snapshot = self.snapshot
+        original_finish = self._project_finish()
 
-        # Get original project finish
-        original_finish = await self._get_project_finish(program_id)
-
-        # Get all activities sorted by leveling priority
-        activities = await self._get_sorted_activities(program_id)
+        activities = sorted(snapshot.activities, key=self._get_leveling_priority)
         if not activities:
             return LevelingResult(
-                program_id=program_id,
+                program_id=snapshot.program_id,
                 success=True,
                 iterations_used=0,
                 activities_shifted=0,
@@ -196,126 +329,32 @@ class ResourceLevelingService:
                 schedule_extension_days=0,
             )
 
-        # Get target resources
-        target_resource_ids = await self._get_target_resources(program_id, options)
-
-        # Build activity lookup for fast access
-        activity_lookup: dict[UUID, Activity] = {a.id: a for a in activities}
+        target_resource_ids = (
+            set(options.target_resources) if options.target_resources is not None else None
+        )
+        self._build_loads()
 
-        # Track shifts and working copies of dates
         shifts: list[ActivityShift] = []
-        working_dates: dict[UUID, tuple[date, date]] = {}
-        for activity in activities:
-            start = activity.early_start or activity.planned_start or program.start_date
-            finish = activity.early_finish or activity.planned_finish or program.end_date
-            working_dates[activity.id] = (start, finish)
-
         warnings: list[str] = []
         iteration = 0
 
         while iteration < options.max_iterations:
             iteration += 1
-            made_change = False
-
-            # Process each activity in priority order
-            for activity in activities:
-                current_start, current_finish = working_dates[activity.id]
-
-                # Get assignments for this activity
-                assignments = await self._assignment_repo.get_by_activity(activity.id)
-
-                for assignment in assignments:
-                    # Skip if not a target resource
-                    if (
-                        target_resource_ids is not None
-                        and assignment.resource_id not in target_resource_ids
-                    ):
-                        continue
-
-                    # Check for over-allocation
-                    if await self._is_overallocated_on_dates(
-                        assignment.resource_id,
-                        current_start,
-                        current_finish,
-                        working_dates,
-                        activity_lookup,
-                    ):
-                        # Find next available slot
-                        new_start = await self._find_next_available_slot(
-                            activity,
-                            assignment.resource_id,
-                            current_start,
-                            working_dates,
-                            activity_lookup,
-                        )
-
-                        delay_days = (new_start - current_start).days
-                        if delay_days <= 0:
-                            continue
-
-                        # Check if we can delay
-                        if not self._can_delay_activity(
-                            activity, delay_days, options, working_dates
-                        ):
-                            if options.preserve_critical_path and activity.is_critical:
-                                warnings.append(f"Cannot delay critical activity {activity.code}")
-                            continue
-
-                        # Apply the delay
-                        new_finish = new_start + (current_finish - current_start)
-
-                        # Get resource info for reason
-                        resource = await self._resource_repo.get_by_id(assignment.resource_id)
-                        reason = (
-                            f"Resource {resource.code} overallocated"
-                            if resource
-                            else "Resource overallocated"
-                        )
-
-                        shift = ActivityShift(
-                            activity_id=activity.id,
-                            activity_code=activity.code,
-                            original_start=current_start,
-                            original_finish=current_finish,
-                            new_start=new_start,
-                            new_finish=new_finish,
-                            delay_days=delay_days,
-                            reason=reason,
-                        )
-                        shifts.append(shift)
-
-                        # Update working dates
-                        working_dates[activity.id] = (new_start, new_finish)
-
-                        # Recalculate successor dates
-                        await self._recalculate_successors(
-                            activity.id, working_dates, activity_lookup
-                        )
-
-                        made_change = True
-                        break
-
-                if made_change:
-                    break
-
-            if not made_change:
+            shift = self._level_first_conflict(activities, target_resource_ids, warnings)
+            if shift is None:
                 break
+            shifts.append(shift)
 
-        # Count remaining over-allocations
-        remaining = await self._count_remaining_overallocations(
-            program_id, target_resource_ids, working_dates, activity_lookup
-        )
+        remaining = self._count_remaining_overallocations(target_resource_ids)
 
-        # Calculate new project finish
         new_finish = original_finish
-        for _act_start, act_finish in working_dates.values():
+        for _act_start, act_finish in self._working_dates.values():
             new_finish = max(new_finish, act_finish)
 
-        extension_days = (new_finish - original_finish).days
-        extension_days = max(extension_days, 0)
+        extension_days = max((new_finish - original_finish).days, 0)
 
         return LevelingResult(
-            program_id=program_id,
+            program_id=snapshot.program_id,
             success=remaining == 0,
             iterations_used=iteration,
             activities_shifted=len({s.activity_id for s in shifts}),
@@ -327,263 +366,138 @@ class ResourceLevelingService:
             warnings=warnings,
         )
 
-    def _get_leveling_priority(
+    def _level_first_conflict(
         self,
-        activity: Activity,
-        working_dates: dict[UUID, tuple[date, date]],
-    ) -> tuple[date, int, UUID]:
-        """Get sorting key for leveling priority.
-
-        Activities are processed in order of:
-        1. Early start date (earliest first)
-        2. Total float (least float first - more constrained)
-        3. Activity ID (for deterministic ordering)
-
-        Args:
-            activity: Activity to get priority for
-            working_dates: Current working dates
-
-        Returns:
-            Tuple for sorting (early_start, total_float, id)
-        """
-        start, _ = working_dates.get(activity.id, (activity.early_start or date.max, date.max))
-        total_float = activity.total_float if activity.total_float is not None else 9999
-        return (start, total_float, activity.id)
-
-    async def _get_sorted_activities(self, program_id: UUID) -> list[Activity]:
-        """Get all activities sorted by leveling priority.
+        activities: list[LevelingActivity],
+        target_resource_ids: set[UUID] | None,
+        warnings: list[str],
+    ) -> ActivityShift | None:
+        """Delay the first activity in priority order that can be leveled.
 
         Args:
-            program_id: Program to get activities for
+            activities: Activities in priority order
+            target_resource_ids: Resources to level (None = all)
+            warnings: Warning list to append to
 
         Returns:
-            List of activities sorted by (early_start, total_float, id)
+            The shift made, or None if no activity was moved
         """
-        activities = await self._activity_repo.get_by_program(program_id, skip=0, limit=100000)
-
-        # Create working dates for sorting
-        working_dates: dict[UUID, tuple[date, date]] = {}
         for activity in activities:
-            start = activity.early_start or activity.planned_start or date.max
-            finish = activity.early_finish or activity.planned_finish or date.max
-            working_dates[activity.id] = (start, finish)
-
-        return sorted(
-            activities,
-            key=lambda a: self._get_leveling_priority(a, working_dates),
-        )
-
-    async def _get_target_resources(
-        self,
-        _program_id: UUID,
-        options: LevelingOptions,
-    ) -> set[UUID] | None:
-        """Get set of resource IDs to level.
+            current_start, current_finish = self._working_dates[activity.id]
 
-        Args:
-            program_id: Program to get resources for
-            options: Leveling options with target_resources
-
-        Returns:
-            Set of resource IDs, or None if leveling all resources
-        """
-        if options.target_resources is not None:
-            return set(options.target_resources)
-        return None  # Level all resources
-
-    async def _get_project_finish(self, program_id: UUID) -> date:
-        """Get the current project finish date.
-
-        Args:
-            program_id: Program to check
-
-        Returns:
-            Latest activity finish date in the program
-        """
-        activities = await self._activity_repo.get_by_program(program_id, skip=0, limit=100000)
+            for assignment in self._assignments[activity.id]:
+                if target_resource_ids is not None and (
+                    assignment.resource_id not in target_resource_ids
+                ):
+                    continue
 
-        if not activities:
-            program = await self._program_repo.get_by_id(program_id)
-            return program.end_date if program else date.today()
+                load = self._loads.get(assignment.resource_id)
+                if load is None or not load.is_overallocated(current_start, current_finish):
+                    continue
 
-        max_finish = date.min
-        for activity in activities:
-            finish = activity.early_finish or activity.planned_finish
-            if finish and finish > max_finish:
-                max_finish = finish
+                new_start = self._find_next_available_slot(activity, assignment.resource_id)
+                delay_days = (new_start - current_start).days
+                if delay_days <= 0:
+                    continue
 
-        return max_finish if max_finish > date.min else date.today()
+                if not self._can_delay_activity(activity, delay_days):
+                    if self.options.preserve_critical_path and activity.is_critical:
+                        warnings.append(f"Cannot delay critical activity {activity.code}")
+                    continue
 
-    async def _is_overallocated_on_dates(
-        self,
-        resource_id: UUID,
-        start_date: date,
-        end_date: date,
-        working_dates: dict[UUID, tuple[date, date]],
-        _activity_lookup: dict[UUID, Activity],
-    ) -> bool:
-        """Check if resource is overallocated during date range.
+                new_finish = new_start + (current_finish - current_start)
+                resource = self._resources[assignment.resource_id]
+                self._move(activity.id, new_start, new_finish)
+                self._recalculate_successors(activity.id)
+
+                return ActivityShift(
+                    activity_id=activity.id,
+                    activity_code=activity.code,
+                    original_start=current_start,
+                    original_finish=current_finish,
+                    new_start=new_start,
+                    new_finish=new_finish,
+                    delay_days=delay_days,
+                    reason=f"Resource {resource.code} overallocated",
+                )
+
+        return None
+
+    def _get_leveling_priority(self, activity: LevelingActivity) -> tuple[date, int, UUID]:
+        """Get sorting key for leveling priority.
 
-        Uses working dates to calculate current loading state.
+        Activities are processed in order of:
+        1. Start date (earliest first)
+        2. Total float (least float first - more constrained)
+        3. Activity ID (for deterministic ordering)
 
         Args:
-            resource_id: Resource to check
-            start_date: Start of range
-            end_date: End of range
-            working_dates: Current activity dates
-            activity_lookup: Activity lookup by ID
+            activity: Activity to get priority for
 
         Returns:
-            True if resource is overallocated on any day in range
+            Tuple for sorting (start, total_float, id)
         """
-        resource = await self._resource_repo.get_by_id(resource_id)
-        if not resource:
-            return False
-
-        capacity = resource.capacity_per_day
-
-        # Get all assignments for this resource
-        assignments = await self._assignment_repo.get_assignments_with_activities(resource_id)
-
-        # Check each day in range
-        current = start_date
-        while current <= end_date:
-            # Skip weekends (simple check)
-            if current.weekday() >= 5:
-                current += timedelta(days=1)
-                continue
-
-            total_assigned = Decimal("0")
-
-            for assignment in assignments:
-                # Get effective dates from working_dates
-                if assignment.activity_id in working_dates:
-                    act_start, act_finish = working_dates[assignment.activity_id]
-                else:
-                    maybe_start, maybe_finish = self._loading_service.get_assignment_date_range(
-                        assignment
-                    )
-                    if maybe_start is None or maybe_finish is None:
-                        continue
-                    act_start, act_finish = maybe_start, maybe_finish
-
-                # Check if assignment is active on this day
-                if act_start <= current <= act_finish:
-                    total_assigned += assignment.units * capacity
+        total_float = activity.total_float if activity.total_float is not None else 9999
+        return (activity.start or date.max, total_float, activity.id)
+
+    def _project_finish(self) -> date:
+        """Latest activity finish, program end if there are no activities."""
+        if not self.snapshot.activities:
+            return self.snapshot.end_date
+
+        finishes = [a.finish for a in self.snapshot.activities if a.finish is not None]
+        return max(finishes) if finishes else date.today()
+
+    def _build_loads(self) -> None:
+        """Initialize working dates and per-resource loads."""
+        snapshot = self.snapshot
+        for activity in snapshot.activities:
+            self._working_dates[activity.id] = (
+                activity.start or snapshot.start_date,
+                activity.finish or snapshot.end_date,
+            )
 
-            if total_assigned > capacity:
-                return True
+        # Resources without capacity can never be overallocated
+        for resource in snapshot.resources:
+            if resource.capacity_per_day > 0:
+                self._loads[resource.id] = ResourceLoad(resource.calendar)
 
-            current += timedelta(days=1)
+        for external in snapshot.external_loads:
+            load = self._loads.get(external.resource_id)
+            if load is not None:
+                load.add(external.start, external.finish, to_hundredths(external.units))
 
-        return False
+        for assignment in snapshot.assignments:
+            load = self._loads.get(assignment.resource_id)
+            if load is not None:
+                start, finish = self._working_dates[assignment.activity_id]
+                load.add(start, finish, to_hundredths(assignment.units))
 
-    async def _find_next_available_slot(  # noqa: PLR0912
-        self,
-        activity: Activity,
-        resource_id: UUID,
-        earliest_start: date,
-        working_dates: dict[UUID, tuple[date, date]],
-        _activity_lookup: dict[UUID, Activity],
-    ) -> date:
+    def _find_next_available_slot(self, activity: LevelingActivity, resource_id: UUID) -> date:
         """Find next date when resource has capacity for activity.
 
-        Searches forward from earliest_start until finding a slot where
-        the resource can accommodate the activity without over-allocation.
-
         Args:
             activity: Activity to schedule
-            resource_id: Resource to check
-            earliest_start: Earliest possible start date
-            working_dates: Current activity dates
-            activity_lookup: Activity lookup by ID
+            resource_id: Overallocated resource
 
         Returns:
             Date when activity can start without over-allocating resource
         """
-        resource = await self._resource_repo.get_by_id(resource_id)
-        if not resource:
-            return earliest_start
-
-        capacity = resource.capacity_per_day
-
-        # Get assignment for this activity/resource
-        assignments = await self._assignment_repo.get_by_activity(activity.id)
-        activity_assignment = None
-        for a in assignments:
-            if a.resource_id == resource_id:
-                activity_assignment = a
-                break
-
-        if not activity_assignment:
-            return earliest_start
-
-        activity_units = activity_assignment.units
-        _, current_finish = working_dates.get(activity.id, (earliest_start, earliest_start))
-        activity_duration = (current_finish - earliest_start).days
-
-        # Get all other assignments for this resource
-        all_assignments = await self._assignment_repo.get_assignments_with_activities(resource_id)
-
-        candidate_start = earliest_start
-        max_search_days = 365  # Limit search to 1 year
-
-        for _ in range(max_search_days):
-            # Skip weekends
-            while candidate_start.weekday() >= 5:
-                candidate_start += timedelta(days=1)
-
-            candidate_finish = candidate_start + timedelta(days=activity_duration)
-
-            # Check if this slot works
-            slot_works = True
-            current = candidate_start
-            while current <= candidate_finish:
-                if current.weekday() >= 5:
-                    current += timedelta(days=1)
-                    continue
-
-                # Calculate total load on this day (excluding current activity)
-                total_load = Decimal("0")
-                for assignment in all_assignments:
-                    if assignment.activity_id == activity.id:
-                        continue
-
-                    if assignment.activity_id in working_dates:
-                        act_start, act_finish = working_dates[assignment.activity_id]
-                    else:
-                        maybe_start, maybe_finish = self._loading_service.get_assignment_date_range(
-                            assignment
-                        )
-                        if maybe_start is None or maybe_finish is None:
-                            continue
-                        act_start, act_finish = maybe_start, maybe_finish
-
-                    if act_start <= current <= act_finish:
-                        total_load += assignment.units * capacity
-
-                # Check if adding this activity would exceed capacity
-                if total_load + (activity_units * capacity) > capacity:
-                    slot_works = False
-                    break
-
-                current += timedelta(days=1)
-
-            if slot_works:
-                return candidate_start
-
-            candidate_start += timedelta(days=1)
-
-        # If no slot found within search limit, return far future date
-        return earliest_start + timedelta(days=max_search_days)
+        earliest_start, current_finish = self._working_dates[activity.id]
+        own = [a for a in self._assignments[activity.id] if a.resource_id == resource_id]
+        own_loads = [(earliest_start, current_finish, to_hundredths(a.units)) for a in own]
+
+        slot = self._loads[resource_id].find_slot(
+            earliest_start,
+            (current_finish - earliest_start).days,
+            to_hundredths(own[0].units),
+            own_loads,
+        )
+        if slot is None:
+            return earliest_start + timedelta(days=MAX_SEARCH_DAYS)
+        return slot
 
-    def _can_delay_activity(
-        self,
-        activity: Activity,
-        delay_days: int,
-        options: LevelingOptions,
-        _working_dates: dict[UUID, tuple[date, date]],
-    ) -> bool:
+    def _can_delay_activity(self, activity: LevelingActivity, delay_days: int) -> bool:
         """Check if activity can be delayed by specified amount.
 
         Considers:
@@ -593,8 +507,6 @@ class ResourceLevelingService:
         Args:
             activity: Activity to potentially delay
             delay_days: Proposed delay in days
-            options: Leveling options
-            working_dates: Current activity dates
 
         Returns:
             True if delay is allowed
@@ -602,113 +514,261 @@ class ResourceLevelingService:
         if delay_days <= 0:
             return False
 
-        # Check critical path constraint
-        if options.preserve_critical_path and activity.is_critical:
+        if self.options.preserve_critical_path and activity.is_critical:
             return False
 
-        # Check float constraint
-        if options.level_within_float:
+        if self.options.level_within_float:
             total_float = activity.total_float or 0
             if delay_days > total_float:
                 return False
 
         return True
 
-    async def _recalculate_successors(
-        self,
-        activity_id: UUID,
-        working_dates: dict[UUID, tuple[date, date]],
-        activity_lookup: dict[UUID, Activity],
-    ) -> None:
-        """Update dates for all successor activities after a delay.
+    def _move(self, activity_id: UUID, new_start: date, new_finish: date) -> None:
+        """Set an activity's working dates and move its resource load."""
+        old_start, old_finish = self._working_dates[activity_id]
+        self._working_dates[activity_id] = (new_start, new_finish)
+
+        for assignment in self._assignments[activity_id]:
+            load = self._loads.get(assignment.resource_id)
+            if load is not None:
+                units = to_hundredths(assignment.units)
+                load.add(old_start, old_finish, -units)
+                load.add(new_start, new_finish, units)
 
-        Propagates date changes through the dependency network.
+    def _recalculate_successors(self, activity_id: UUID) -> None:
+        """Push successors out after an activity was delayed.
+
+        Walks the dependency network depth first, moving each successor
+        whose dependency now requires a later start.
 
         Args:
             activity_id: Activity that was delayed
-            working_dates: Working dates to update
-            activity_lookup: Activity lookup by ID
         """
-        # Get dependencies where this activity is predecessor
-        dependencies = await self._dependency_repo.get_successors(activity_id)
+        stack = [(activity_id, iter(self._successors[activity_id]))]
+
+        while stack:
+            predecessor_id, dependencies = stack[-1]
+            dep = next(dependencies, None)
+            if dep is None:
+                stack.pop()
+                continue
 
-        for dep in dependencies:
             successor_id = dep.successor_id
-            if successor_id not in activity_lookup:
+            if successor_id not in self._working_dates:
                 continue
 
-            predecessor_start, predecessor_finish = working_dates[activity_id]
-            current_start, current_finish = working_dates[successor_id]
+            predecessor_start, predecessor_finish = self._working_dates[predecessor_id]
+            current_start, current_finish = self._working_dates[successor_id]
             duration = (current_finish - current_start).days
+            lag = dep.lag
 
-            # Calculate new earliest start based on dependency type
-            lag = dep.lag or 0
-            dep_type = dep.dependency_type.value if dep.dependency_type else "FS"
-
-            if dep_type == "FS":  # Finish-to-Start
-                new_earliest = predecessor_finish + timedelta(days=1 + lag)
-            elif dep_type == "SS":  # Start-to-Start
+            if dep.dependency_type == "SS":
                 new_earliest = predecessor_start + timedelta(days=lag)
-            elif dep_type == "FF":  # Finish-to-Finish
-                new_earliest = predecessor_finish + timedelta(days=lag) - timedelta(days=duration)
-            elif dep_type == "SF":  # Start-to-Finish
-                new_earliest = predecessor_start + timedelta(days=lag) - timedelta(days=duration)
-            else:
+            elif dep.dependency_type == "FF":
+                new_earliest = predecessor_finish + timedelta(days=lag - duration)
+            elif dep.dependency_type == "SF":
+                new_earliest = predecessor_start + timedelta(days=lag - duration)
+            else:  # FS and unknown types
                 new_earliest = predecessor_finish + timedelta(days=1 + lag)
 
-            # Only update if new date is later
             if new_earliest > current_start:
-                new_finish = new_earliest + timedelta(days=duration)
-                working_dates[successor_id] = (new_earliest, new_finish)
-
-                # Recursively update successors
-                await self._recalculate_successors(successor_id, working_dates, activity_lookup)
+                self._move(successor_id, new_earliest, new_earliest + timedelta(days=duration))
+                stack.append((successor_id, iter(self._successors[successor_id])))
 
-    async def _count_remaining_overallocations(
-        self,
-        program_id: UUID,
-        target_resource_ids: set[UUID] | None,
-        working_dates: dict[UUID, tuple[date, date]],
-        activity_lookup: dict[UUID, Activity],
-    ) -> int:
-        """Count remaining over-allocation periods after leveling.
+    def _count_remaining_overallocations(self, target_resource_ids: set[UUID] | None) -> int:
+        """Count program resources still overallocated after leveling.
 
         Args:
-            program_id: Program to check
             target_resource_ids: Resources to check (None = all)
-            working_dates: Current activity dates
-            activity_lookup: Activity lookup by ID
 
         Returns:
-            Number of remaining over-allocation periods
+            Number of program resources overallocated on some working day
         """
-        # Get all resources for program
-        resources, _ = await self._resource_repo.get_by_program(
-            program_id, is_active=True, skip=0, limit=10000
-        )
+        min_date = min(start for start, _ in self._working_dates.values())
+        max_date = max(finish for _, finish in self._working_dates.values())
+        if min_date >= max_date:
+            return 0
 
         count = 0
-        for resource in resources:
-            if target_resource_ids is not None and resource.id not in target_resource_ids:
+        for resource_id in self.snapshot.program_resource_ids:
+            if target_resource_ids is not None and resource_id not in target_resource_ids:
                 continue
+            load = self._loads.get(resource_id)
+            if load is not None and load.is_overallocated(min_date, max_date):
+                count += 1
 
-            # Get date range from working dates
-            min_date = date.max
-            max_date = date.min
-            for act_start, act_finish in working_dates.values():
-                min_date = min(min_date, act_start)
-                max_date = max(max_date, act_finish)
+        return count
 
-            if min_date >= max_date:
-                continue
 
-            # Check for over-allocations
-            if await self._is_overallocated_on_dates(
-                resource.id, min_date, max_date, working_dates, activity_lookup
-            ):
-                count += 1
+class ResourceLevelingService:
+    """Service for serial resource leveling.
 
-        return count
+    Implements a priority-based serial leveling algorithm that processes
+    activities one at a time, delaying those that cause over-allocations.
+
+    Algorithm:
+    1. Sort activities by leveling priority (early_start, total_float, id)
+    2. For each activity, check if it causes over-allocation
+    3. If overallocated, find next available slot for the resource
+    4. Delay activity if allowed (respects critical path and float constraints)
+    5. Recalculate successor dates
+    6. Repeat until no more changes or max iterations reached
+
+    The program is read once into a LevelingSnapshot and leveled in
+    memory by SerialLevelingEngine.
+
+    Example usage:
+        service = ResourceLevelingService(session)
+        options = LevelingOptions(preserve_critical_path=True)
+        result = await service.level_program(program_id, options)
+
+        if result.success:
+            print(f"Leveled in {result.iterations_used} iterations")
+            for shift in result.shifts:
+                print(f"{shift.activity_code}: delayed {shift.delay_days} days")
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        cache: CacheService | None = None,
+    ) -> None:
+        """Initialize ResourceLevelingService.
+
+        Args:
+            session: Database session for queries
+            cache: Optional cache service
+        """
+        self.session = session
+        self.cache = cache
+        self._activity_repo = ActivityRepository(session)
+        self._resource_repo = ResourceRepository(session)
+        self._assignment_repo = ResourceAssignmentRepository(session)
+        self._dependency_repo = DependencyRepository(session)
+        self._program_repo = ProgramRepository(session)
+        self._loading_service = ResourceLoadingService(session, cache)
+
+    async def level_program(
+        self,
+        program_id: UUID,
+        options: LevelingOptions | None = None,
+    ) -> LevelingResult:
+        """Main entry point for resource leveling.
+
+        Applies serial leveling algorithm to resolve resource over-allocations
+        in the program.
+
+        Args:
+            program_id: Program to level
+            options: Leveling options (uses defaults if None)
+
+        Returns:
+            LevelingResult with details of all changes made
+        """
+        program = await self._program_repo.get_by_id(program_id)
+        if not program:
+            return LevelingResult(
+                program_id=program_id,
+                success=False,
+                iterations_used=0,
+                activities_shifted=0,
+                shifts=[],
+                remaining_overallocations=0,
+                new_project_finish=date.today(),
+                original_project_finish=date.today(),
+                schedule_extension_days=0,
+                warnings=["Program not found"],
+            )
+
+        snapshot = await self.load_snapshot(program)
+        return SerialLevelingEngine(snapshot, options).run()
+
+    async def load_snapshot(self, program: Program) -> LevelingSnapshot:
+        """Read everything leveling needs for a program in bulk.
+
+        Issues one query each for activities, assignments (including
+        other programs' assignments on shared resources), active program
+        resources and dependencies.
+
+        Args:
+            program: Program to load
+
+        Returns:
+            LevelingSnapshot of the program
+        """
+        activities = await self._activity_repo.get_by_program(program.id, skip=0, limit=100000)
+        assignments = await self._assignment_repo.get_for_program_resources(program.id)
+        program_resources, _ = await self._resource_repo.get_by_program(
+            program.id, is_active=True, skip=0, limit=10000
+        )
+        dependencies = await self._dependency_repo.get_by_program(program.id)
+
+        activity_ids = {a.id for a in activities}
+        resources: dict[UUID, LevelingResource] = {}
+        program_assignments: list[LevelingAssignment] = []
+        external_loads: list[ExternalLoad] = []
+
+        for assignment in assignments:
+            resource = assignment.resource
+            template = resource.calendar_template
+            resources[resource.id] = LevelingResource(
+                id=resource.id,
+                code=resource.code,
+                capacity_per_day=resource.capacity_per_day,
+                calendar=get_template_calendar(template) if template is not None else None,
+            )
+
+            if assignment.activity_id in activity_ids:
+                program_assignments.append(
+                    LevelingAssignment(
+                        activity_id=assignment.activity_id,
+                        resource_id=assignment.resource_id,
+                        units=assignment.units,
+                    )
+                )
+                continue
+
+            start, finish = self._loading_service.get_assignment_date_range(assignment)
+            if start is not None and finish is not None:
+                external_loads.append(
+                    ExternalLoad(
+                        resource_id=assignment.resource_id,
+                        start=start,
+                        finish=finish,
+                        units=assignment.units,
+                    )
+                )
+
+        return LevelingSnapshot(
+            program_id=program.id,
+            start_date=program.start_date,
+            end_date=program.end_date,
+            activities=tuple(
+                LevelingActivity(
+                    id=a.id,
+                    code=a.code,
+                    start=a.early_start or a.planned_start,
+                    finish=a.early_finish or a.planned_finish,
+                    total_float=a.total_float,
+                    is_critical=bool(a.is_critical),
+                )
+                for a in activities
+            ),
+            assignments=tuple(program_assignments),
+            external_loads=tuple(external_loads),
+            resources=tuple(resources.values()),
+            program_resource_ids=tuple(r.id for r in program_resources),
+            dependencies=tuple(
+                LevelingDependency(
+                    predecessor_id=d.predecessor_id,
+                    successor_id=d.successor_id,
+                    dependency_type=d.dependency_type.value if d.dependency_type else "FS",
+                    lag=d.lag or 0,
+                )
+                for d in dependencies
+            ),
+        )
 
     async def apply_leveling_result(
         self,
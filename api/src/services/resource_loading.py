@@ -15,7 +15,14 @@ from src.repositories.resource import (
     ResourceCalendarRepository,
     ResourceRepository,
 )
+from src.services.loading_kernel import (
+    LoadIntervals,
+    from_hundredths,
+    hours_from_units,
+    to_hundredths,
+)
 from src.services.resource import ResourceLoadingDay
+from src.services.working_calendar import resource_calendar
 
 if TYPE_CHECKING:
     from uuid import UUID
@@ -23,7 +30,7 @@ if TYPE_CHECKING:
     from sqlalchemy.ext.asyncio import AsyncSession
 
     from src.models.enums import ResourceType
-    from src.models.resource import Resource, ResourceAssignment, ResourceCalendar
+    from src.models.resource import Resource, ResourceAssignment
     from src.services.cache_service import CacheService
 
 
@@ -174,6 +181,8 @@ class ResourceLoadingService:
         Combines calendar availability with assignment allocations to
         calculate daily utilization and identify overallocations.
         Uses activity dates for assignments without explicit dates.
+        Assigned hours come from one sweep over the assignments, so the
+        cost is O(assignments + days).
 
         Args:
             resource_id: The resource to calculate loading for
@@ -195,55 +204,28 @@ class ResourceLoadingService:
             resource_id, start_date, end_date
         )
 
-        # Build calendar lookup
-        calendar_by_date: dict[date, ResourceCalendar] = {
-            entry.calendar_date: entry for entry in calendar_entries
-        }
+        # Calendar entries override the resource's template (or Monday-Friday)
+        calendar = resource_calendar(default_capacity, resource.calendar_template, calendar_entries)
 
         # Get all assignments with activities eagerly loaded
         assignments = await self._assignment_repo.get_assignments_with_activities(resource_id)
 
-        # Filter to only assignments that might overlap this range
-        relevant_assignments = []
-        for assignment in assignments:
-            assign_start, assign_finish = self.get_assignment_date_range(assignment)
-            # Check if assignment overlaps with our date range
-            if assign_finish is not None and assign_finish < start_date:
-                continue
-            if assign_start is not None and assign_start > end_date:
-                continue
-            relevant_assignments.append(assignment)
+        # Units represent allocation (1.0 = 100% = full capacity)
+        intervals = LoadIntervals.from_ranges(
+            (*self.get_assignment_date_range(assignment), to_hundredths(assignment.units))
+            for assignment in assignments
+        )
+        assigned = hours_from_units(intervals.daily_totals(start_date, end_date), default_capacity)
 
         # Calculate loading for each day
         loading: dict[date, ResourceLoadingDay] = {}
         current_date = start_date
 
-        while current_date <= end_date:
-            # Get available hours from calendar or default
-            if current_date in calendar_by_date:
-                calendar_entry = calendar_by_date[current_date]
-                available_hours = (
-                    calendar_entry.available_hours
-                    if calendar_entry.is_working_day
-                    else Decimal("0")
-                )
-            # No calendar entry - use default capacity for weekdays
-            elif current_date.weekday() < 5:  # Monday = 0, Friday = 4
-                available_hours = default_capacity
-            else:
-                available_hours = Decimal("0")
-
-            # Calculate assigned hours from active assignments
-            assigned_hours = Decimal("0")
-            for assignment in relevant_assignments:
-                if self._is_assignment_active_on_date(assignment, current_date):
-                    # Units represent allocation (1.0 = 100% = full capacity)
-                    assigned_hours += assignment.units * default_capacity
-
+        for assigned_hours in assigned.tolist():
             loading[current_date] = ResourceLoadingDay(
                 date=current_date,
-                available_hours=available_hours,
-                assigned_hours=assigned_hours.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+                available_hours=calendar.hours_on(current_date),
+                assigned_hours=from_hundredths(assigned_hours),
             )
 
             current_date += timedelta(days=1)
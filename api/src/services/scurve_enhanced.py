@@ -368,3 +368,58 @@ def build_simulation_metrics_from_result(result: Any) -> SimulationMetrics | Non
         )
     except (TypeError, ValueError):
         return None
+
+
+def enhanced_scurve_to_dict(result: EnhancedSCurveResponse) -> dict[str, Any]:
+    """
+    Convert an enhanced S-curve to its cached and returned JSON form.
+
+    Args:
+        result: Generated enhanced S-curve
+
+    Returns:
+        JSON-compatible dict with decimals and dates as strings
+    """
+    response: dict[str, Any] = {
+        "program_id": str(result.program_id),
+        "bac": str(result.bac),
+        "current_period": result.current_period,
+        "percent_complete": str(result.percent_complete),
+        "simulation_available": result.simulation_available,
+        "data_points": [
+            {
+                "period_number": dp.period_number,
+                "period_date": dp.period_date.isoformat(),
+                "period_name": dp.period_name,
+                "bcws": str(dp.bcws),
+                "bcwp": str(dp.bcwp),
+                "acwp": str(dp.acwp),
+                "cumulative_bcws": str(dp.cumulative_bcws),
+                "cumulative_bcwp": str(dp.cumulative_bcwp),
+                "cumulative_acwp": str(dp.cumulative_acwp),
+                "is_forecast": dp.is_forecast,
+            }
+            for dp in result.data_points
+        ],
+    }
+
+    if result.eac_range:
+        response["eac_range"] = {
+            "p10": str(result.eac_range.p10),
+            "p50": str(result.eac_range.p50),
+            "p90": str(result.eac_range.p90),
+            "method": result.eac_range.method,
+        }
+
+    if result.completion_range:
+        completion = result.completion_range
+        response["completion_range"] = {
+            "p10_days": completion.p10_days,
+            "p50_days": completion.p50_days,
+            "p90_days": completion.p90_days,
+            "p10_date": completion.p10_date.isoformat() if completion.p10_date else None,
+            "p50_date": completion.p50_date.isoformat() if completion.p50_date else None,
+            "p90_date": completion.p90_date.isoformat() if completion.p90_date else None,
+        }
+
+    return response
@@ -24,6 +24,7 @@ class SimulationCacheKeys(CacheKeys):
     SIMULATION_RESULT = "simulation:result"
     SIMULATION_TORNADO = "simulation:tornado"
     SIMULATION_HISTOGRAM = "simulation:histogram"
+    SIMULATION_CONFIG = "simulation:config"
 
     # TTLs in seconds
     RESULT_TTL = 86400  # 24 hours - simulation results are expensive to compute
@@ -73,6 +74,30 @@ class SimulationCacheKeys(CacheKeys):
         """
         return f"{SimulationCacheKeys.SIMULATION_HISTOGRAM}:{config_id}:{result_id}:{hist_type}"
 
+    @staticmethod
+    def config_tag(config_id: str) -> str:
+        """Generate tag of every cached key of a simulation config.
+
+        Args:
+            config_id: Simulation config UUID as string
+
+        Returns:
+            Tag set key
+        """
+        return f"{CacheKeys.TAG}:{SimulationCacheKeys.SIMULATION_CONFIG}:{config_id}"
+
+    @staticmethod
+    def results_tag(config_id: str) -> str:
+        """Generate tag of the cached results of a simulation config.
+
+        Args:
+            config_id: Simulation config UUID as string
+
+        Returns:
+            Tag set key
+        """
+        return f"{CacheKeys.TAG}:{SimulationCacheKeys.SIMULATION_RESULT}:{config_id}"
+
 
 class SimulationCache:
     """Cache for Monte Carlo simulation results.
@@ -101,6 +126,14 @@ class SimulationCache:
         """Check if cache is available."""
         return self._manager.is_available
 
+    @staticmethod
+    def _result_tags(config_id: UUID) -> list[str]:
+        """Tags of a cached simulation result."""
+        return [
+            SimulationCacheKeys.config_tag(str(config_id)),
+            SimulationCacheKeys.results_tag(str(config_id)),
+        ]
+
     async def get_result(
         self,
         config_id: UUID,
@@ -154,7 +187,12 @@ class SimulationCache:
         key = SimulationCacheKeys.result_key(str(config_id), str(result_id) if result_id else None)
         ttl = ttl or SimulationCacheKeys.RESULT_TTL
 
-        success = await self._manager.set(key, result, ttl=ttl)
+        success = await self._manager.set(
+            key,
+            result,
+            ttl=ttl,
+            tags=self._result_tags(config_id),
+        )
 
         if success:
             logger.debug(
@@ -185,8 +223,9 @@ class SimulationCache:
             success = await self._manager.delete(key)
         else:
             # Invalidate all results for this config
-            pattern = f"{SimulationCacheKeys.SIMULATION_RESULT}:{config_id}:*"
-            deleted = await self._manager.delete_pattern(pattern)
+            deleted = await self._manager.invalidate_tags(
+                SimulationCacheKeys.results_tag(str(config_id))
+            )
             success = deleted > 0
 
         logger.info(
@@ -208,7 +247,8 @@ class SimulationCache:
 
         If result is cached, returns it with from_cache=True.
         Otherwise, calls compute_func, caches result, and returns
-        with from_cache=False.
+        with from_cache=False. Concurrent misses for the same result,
+        in this or other workers, share one compute_func call.
 
         Args:
             config_id: Simulation config UUID
@@ -225,13 +265,23 @@ class SimulationCache:
             cached["from_cache"] = True
             return cached
 
-        # Compute fresh result
-        result = await compute_func()
+        # Compute fresh result once for all concurrent misses, and cache it
+        computed = False
 
-        # Cache the result
-        await self.set_result(config_id, result, result_id, ttl)
+        async def compute() -> dict[str, Any]:
+            nonlocal computed
+            computed = True
+            return await compute_func()
 
-        result["from_cache"] = False
+        result = await self._manager.fill(
+            SimulationCacheKeys.result_key(str(config_id), str(result_id) if result_id else None),
+            compute,
+            ttl or SimulationCacheKeys.RESULT_TTL,
+            tags=self._result_tags(config_id),
+        )
+
+        result = dict(result)
+        result["from_cache"] = not computed
         return result
 
     async def get_tornado(
@@ -275,12 +325,15 @@ class SimulationCache:
         """
         key = SimulationCacheKeys.tornado_key(str(config_id), str(result_id), top_n)
         ttl = ttl or SimulationCacheKeys.TORNADO_TTL
-        return await self._manager.set(key, data, ttl=ttl)
+        return await self._manager.set(
+            key, data, ttl=ttl, tags=[SimulationCacheKeys.config_tag(str(config_id))]
+        )
 
     async def invalidate_config(self, config_id: UUID) -> int:
         """Invalidate all caches for a simulation config.
 
-        Removes results, tornado charts, and histograms.
+        Removes results, tornado charts, and histograms registered under
+        the config's tag.
 
         Args:
             config_id: Simulation config UUID
@@ -288,16 +341,9 @@ class SimulationCache:
         Returns:
             Number of keys deleted
         """
-        patterns = [
-            f"{SimulationCacheKeys.SIMULATION_RESULT}:{config_id}:*",
-            f"{SimulationCacheKeys.SIMULATION_TORNADO}:{config_id}:*",
-            f"{SimulationCacheKeys.SIMULATION_HISTOGRAM}:{config_id}:*",
-        ]
-
-        total_deleted = 0
-        for pattern in patterns:
-            deleted = await self._manager.delete_pattern(pattern)
-            total_deleted += deleted
+        total_deleted = await self._manager.invalidate_tags(
+            SimulationCacheKeys.config_tag(str(config_id))
+        )
 
         logger.info(
             "simulation_cache_invalidate_config",
@@ -0,0 +1,508 @@
+"""Background execution of Monte Carlo simulation runs.
+
+Simulation engines are CPU bound and hold the GIL for the whole run, so
+executing them inside a request handler blocks the event loop for every
+other request. Submitted runs are instead executed in a bounded process
+pool. The endpoint only creates a pending SimulationResult and returns its
+id; the job lifecycle (pending -> running -> completed/failed) is written
+through SimulationResultRepository so clients can poll the result.
+
+Jobs are plain picklable snapshots of the config and network taken at
+submit time, so later edits to the program do not affect a queued run.
+They run in chunked mode: workers publish iterations completed after each
+chunk on a shared queue, and the runner periodically writes the latest
+count per job with SimulationResultRepository.update_progress.
+
+If a worker process dies (for example killed for running out of memory),
+the pool is broken for every job on it: those jobs fail and the next job
+starts a new pool.
+"""
+
+import asyncio
+import multiprocessing
+import queue
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Protocol
+from uuid import UUID
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.config import settings
+from src.core.database import get_session_maker
+from src.core.exceptions import ConflictError
+from src.repositories.simulation import SimulationResultRepository
+from src.services.monte_carlo import (
+    DistributionParams,
+    MonteCarloEngine,
+    SimulationInput,
+    parse_distribution_params,
+)
+from src.services.monte_carlo_optimized import OptimizedNetworkMonteCarloEngine
+from src.services.monte_carlo_streaming import (
+    DEFAULT_CHUNK_SIZE,
+    ProgressCallback,
+    SimulationProgress,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+class ProgressQueue(Protocol):
+    """Queue carrying (result id, iterations completed) from workers."""
+
+    def put(self, item: tuple[UUID, int], /) -> None:
+        """Publish a progress update."""
+
+    def get_nowait(self) -> tuple[UUID, int]:
+        """Take the next update or raise queue.Empty."""
+
+
+# Set in each worker process by init_simulation_worker
+_worker_progress_queue: ProgressQueue | None = None
+
+
+def init_simulation_worker(progress_queue: ProgressQueue | None) -> None:
+    """Executor initializer: remember the queue progress is published on."""
+    global _worker_progress_queue
+    _worker_progress_queue = progress_queue
+
+
+@dataclass
+class JobActivity:
+    """Activity snapshot passed to a worker process."""
+
+    id: UUID
+    duration: int
+
+
+@dataclass
+class JobDependency:
+    """Dependency snapshot passed to a worker process."""
+
+    predecessor_id: UUID
+    successor_id: UUID
+    dependency_type: str
+    lag: int
+
+
+@dataclass(frozen=True)
+class MonteCarloJob:
+    """Independent-activity simulation (MonteCarloEngine)."""
+
+    activity_distributions: dict[str, dict[str, Any]]
+    iterations: int
+    cost_distributions: dict[str, dict[str, Any]] | None = None
+    seed: int | None = None
+    include_activity_stats: bool = False
+    chunk_size: int | None = DEFAULT_CHUNK_SIZE
+    convergence_tolerance: float | None = None
+
+
+@dataclass(frozen=True)
+class NetworkMonteCarloJob:
+    """Network-aware simulation (OptimizedNetworkMonteCarloEngine)."""
+
+    activities: tuple[JobActivity, ...]
+    dependencies: tuple[JobDependency, ...]
+    activity_distributions: dict[str, dict[str, Any]]
+    iterations: int
+    seed: int | None = None
+    chunk_size: int | None = DEFAULT_CHUNK_SIZE
+    convergence_tolerance: float | None = None
+    workers: int = 1
+
+
+SimulationJob = MonteCarloJob | NetworkMonteCarloJob
+
+
+@dataclass
+class SimulationJobResult:
+    """Simulation output in SimulationResult storage format."""
+
+    duration_results: dict[str, float]
+    iterations: int
+    elapsed_seconds: float
+    cost_results: dict[str, float] | None = None
+    duration_histogram: dict[str, list[float]] | None = None
+    cost_histogram: dict[str, list[float]] | None = None
+    activity_results: dict[str, dict[str, Any]] | None = None
+
+
+def _parse_distributions(data: dict[str, dict[str, Any]]) -> dict[UUID, DistributionParams]:
+    """Parse stored distribution JSON keyed by activity id string."""
+    return {UUID(activity_id): parse_distribution_params(d) for activity_id, d in data.items()}
+
+
+def _histogram(bins: Any, counts: Any) -> dict[str, list[float]] | None:
+    """Convert NumPy histogram arrays to the stored JSON shape."""
+    if bins is None:
+        return None
+    return {
+        "bins": bins.tolist(),
+        "counts": counts.tolist() if counts is not None else [],
+    }
+
+
+def _run_monte_carlo(
+    job: MonteCarloJob, progress_callback: ProgressCallback | None
+) -> SimulationJobResult:
+    """Run an independent-activity simulation."""
+    sim_input = SimulationInput(
+        activity_durations=_parse_distributions(job.activity_distributions),
+        activity_costs=_parse_distributions(job.cost_distributions)
+        if job.cost_distributions
+        else None,
+        iterations=job.iterations,
+        seed=job.seed,
+        include_activity_stats=job.include_activity_stats,
+        chunk_size=job.chunk_size,
+        convergence_tolerance=job.convergence_tolerance,
+    )
+    output = MonteCarloEngine(seed=job.seed).simulate(sim_input, progress_callback)
+
+    cost_results: dict[str, float] | None = None
+    if output.cost_p50 is not None:
+        cost_results = {
+            "p10": output.cost_p10 or 0.0,
+            "p50": output.cost_p50,
+            "p80": output.cost_p80 or 0.0,
+            "p90": output.cost_p90 or 0.0,
+            "mean": output.cost_mean or 0.0,
+            "std": output.cost_std or 0.0,
+            "min": output.cost_min or 0.0,
+            "max": output.cost_max or 0.0,
+        }
+
+    return SimulationJobResult(
+        duration_results={
+            "p10": output.duration_p10,
+            "p50": output.duration_p50,
+            "p80": output.duration_p80,
+            "p90": output.duration_p90,
+            "mean": output.duration_mean,
+            "std": output.duration_std,
+            "min": output.duration_min,
+            "max": output.duration_max,
+        },
+        cost_results=cost_results,
+        duration_histogram=_histogram(
+            output.duration_histogram_bins, output.duration_histogram_counts
+        ),
+        cost_histogram=_histogram(output.cost_histogram_bins, output.cost_histogram_counts),
+        activity_results=output.activity_stats,
+        iterations=output.iterations,
+        elapsed_seconds=output.elapsed_seconds,
+    )
+
+
+def _run_network_monte_carlo(
+    job: NetworkMonteCarloJob, progress_callback: ProgressCallback | None
+) -> SimulationJobResult:
+    """Run a network-aware simulation."""
+    output = OptimizedNetworkMonteCarloEngine(seed=job.seed).simulate(
+        activities=job.activities,
+        dependencies=job.dependencies,
+        distributions=_parse_distributions(job.activity_distributions),
+        iterations=job.iterations,
+        chunk_size=job.chunk_size,
+        convergence_tolerance=job.convergence_tolerance,
+        progress_callback=progress_callback,
+        workers=job.workers if job.workers > 1 else None,
+    )
+
+    activity_results: dict[str, dict[str, Any]] = {}
+    for act_id, criticality in output.activity_criticality.items():
+        stats: dict[str, Any] = {
+            "criticality": criticality,
+            "sensitivity": output.sensitivity.get(act_id, 0.0),
+        }
+        if act_id in output.activity_finish_distributions:
+            stats["finish_distribution"] = output.activity_finish_distributions[act_id]
+        activity_results[str(act_id)] = stats
+
+    return SimulationJobResult(
+        duration_results={
+            "p10": output.project_duration_p10,
+            "p50": output.project_duration_p50,
+            "p80": output.project_duration_p80,
+            "p90": output.project_duration_p90,
+            "mean": output.project_duration_mean,
+            "std": output.project_duration_std,
+            "min": output.project_duration_min,
+            "max": output.project_duration_max,
+        },
+        duration_histogram=_histogram(
+            output.duration_histogram_bins, output.duration_histogram_counts
+        ),
+        activity_results=activity_results,
+        iterations=output.iterations,
+        elapsed_seconds=output.elapsed_seconds,
+    )
+
+
+def execute_simulation_job(
+    job: SimulationJob, progress_key: UUID | None = None
+) -> SimulationJobResult:
+    """
+    Run a simulation job to completion.
+
+    Module-level so it can be pickled into a worker process.
+
+    Args:
+        job: Job snapshot to execute
+        progress_key: Id published with progress updates, if any
+
+    Returns:
+        SimulationJobResult in storage format
+    """
+    progress_callback: ProgressCallback | None = None
+    progress_queue = _worker_progress_queue
+    if progress_key is not None and progress_queue is not None:
+
+        def progress_callback(progress: SimulationProgress) -> None:
+            progress_queue.put((progress_key, progress.iterations_completed))
+
+    if isinstance(job, NetworkMonteCarloJob):
+        return _run_network_monte_carlo(job, progress_callback)
+    return _run_monte_carlo(job, progress_callback)
+
+
+class SimulationJobRunner:
+    """
+    Runs submitted simulation jobs off the event loop.
+
+    At most ``max_concurrent_jobs`` jobs execute at once on a pool of
+    ``max_workers`` processes; further jobs wait their turn in pending
+    state. Submissions beyond ``max_queued_jobs`` are rejected so a burst
+    of requests cannot queue unbounded work. Progress published by the
+    workers is written to the database every ``progress_interval`` seconds.
+
+    Example:
+        runner = SimulationJobRunner(max_workers=2)
+        runner.submit(result.id, MonteCarloJob(...))
+        ...
+        await runner.shutdown()
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_concurrent_jobs: int | None = None,
+        max_queued_jobs: int = 32,
+        *,
+        executor: Executor | None = None,
+        progress_queue: ProgressQueue | None = None,
+        progress_interval: float = 1.0,
+        session_maker_factory: Callable[[], async_sessionmaker[AsyncSession]] = get_session_maker,
+    ) -> None:
+        """
+        Initialize the runner.
+
+        Args:
+            max_workers: Worker processes in the pool
+            max_concurrent_jobs: Jobs executing at once (defaults to max_workers)
+            max_queued_jobs: Maximum running plus waiting jobs
+            executor: Executor to use instead of a process pool; it must be
+                initialized with init_simulation_worker(progress_queue)
+                for progress to be reported
+            progress_queue: Queue the executor's workers publish progress on
+            progress_interval: Seconds between progress writes
+            session_maker_factory: Returns the session maker for status writes
+        """
+        self.max_workers = max_workers
+        self.max_concurrent_jobs = max_concurrent_jobs or max_workers
+        self.max_queued_jobs = max_queued_jobs
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._session_maker_factory = session_maker_factory
+        self._progress_queue = progress_queue
+        self.progress_interval = progress_interval
+        self._semaphore: asyncio.Semaphore | None = None
+        self._progress_task: asyncio.Task[None] | None = None
+        self._tasks: dict[UUID, asyncio.Task[None]] = {}
+
+    @property
+    def active_jobs(self) -> int:
+        """Number of jobs running or waiting to run."""
+        return len(self._tasks)
+
+    def _get_executor(self) -> Executor:
+        """Create the process pool on first use."""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=init_simulation_worker,
+                initargs=(self._progress_queue,),
+            )
+        return self._executor
+
+    async def _execute(self, job: SimulationJob, progress_key: UUID | None) -> SimulationJobResult:
+        """
+        Run a job on the executor.
+
+        A broken process pool is dropped so the next job creates a new one;
+        the error is raised for the job that hit it.
+        """
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(executor, execute_simulation_job, job, progress_key)
+        except BrokenProcessPool:
+            if self._owns_executor and self._executor is executor:
+                logger.warning("simulation_pool_broken")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            raise
+
+    def _start(self) -> None:
+        """Create loop-bound state on the first submission."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_jobs)
+        if self._progress_queue is None and self._owns_executor:
+            self._progress_queue = multiprocessing.get_context().Queue()
+        if self._progress_task is None and self._progress_queue is not None:
+            self._progress_task = asyncio.create_task(self._record_progress())
+
+    async def run(self, job: SimulationJob) -> SimulationJobResult:
+        """
+        Execute a job and wait for its result.
+
+        For endpoints that return the result in their response. The run
+        shares the pool and the concurrency limit with submitted jobs, so
+        the event loop stays free while it executes.
+
+        Args:
+            job: Job snapshot to execute
+
+        Returns:
+            SimulationJobResult in storage format
+        """
+        self._start()
+        assert self._semaphore is not None
+        async with self._semaphore:
+            return await self._execute(job, None)
+
+    def submit(self, result_id: UUID, job: SimulationJob) -> None:
+        """
+        Schedule a job for a pending SimulationResult.
+
+        The result record must already be committed; status updates are
+        written from a separate session.
+
+        Args:
+            result_id: Pending SimulationResult to fill in
+            job: Job snapshot to execute
+
+        Raises:
+            ConflictError: If the job queue is full
+        """
+        if len(self._tasks) >= self.max_queued_jobs:
+            raise ConflictError(
+                "Too many simulations queued, try again later",
+                "SIMULATION_QUEUE_FULL",
+            )
+
+        self._start()
+
+        task = asyncio.create_task(self._run(result_id, job))
+        self._tasks[result_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(result_id, None))
+
+        logger.info("simulation_job_submitted", result_id=str(result_id))
+
+    async def _run(self, result_id: UUID, job: SimulationJob) -> None:
+        """Execute one job and record its lifecycle."""
+        assert self._semaphore is not None
+        session_maker = self._session_maker_factory()
+
+        async with session_maker() as session:
+            repo = SimulationResultRepository(session)
+            try:
+                async with self._semaphore:
+                    await repo.mark_running(result_id)
+                    await session.commit()
+
+                    output = await self._execute(job, result_id)
+            except asyncio.CancelledError:
+                await repo.mark_failed(result_id, "Simulation cancelled by server shutdown")
+                await session.commit()
+                raise
+            except Exception as e:
+                logger.warning("simulation_job_failed", result_id=str(result_id), error=str(e))
+                await repo.mark_failed(result_id, str(e))
+                await session.commit()
+                return
+
+            await repo.mark_completed(
+                result_id=result_id,
+                duration_results=output.duration_results,
+                cost_results=output.cost_results,
+                duration_histogram=output.duration_histogram,
+                cost_histogram=output.cost_histogram,
+                activity_results=output.activity_results,
+                iterations_completed=output.iterations,
+            )
+            await session.commit()
+
+        logger.info(
+            "simulation_job_completed",
+            result_id=str(result_id),
+            elapsed_seconds=output.elapsed_seconds,
+        )
+
+    async def _record_progress(self) -> None:
+        """Periodically write the latest published progress of running jobs."""
+        assert self._progress_queue is not None
+        while True:
+            await asyncio.sleep(self.progress_interval)
+
+            latest: dict[UUID, int] = {}
+            while True:
+                try:
+                    result_id, iterations_completed = self._progress_queue.get_nowait()
+                except queue.Empty:
+                    break
+                # Finished jobs already recorded their final iteration count
+                if result_id in self._tasks:
+                    latest[result_id] = iterations_completed
+
+            if not latest:
+                continue
+
+            try:
+                async with self._session_maker_factory()() as session:
+                    repo = SimulationResultRepository(session)
+                    for result_id, iterations_completed in latest.items():
+                        await repo.update_progress(result_id, iterations_completed)
+                    await session.commit()
+            except Exception as e:
+                logger.warning("simulation_progress_update_failed", error=str(e))
+
+    async def shutdown(self) -> None:
+        """Cancel outstanding jobs and stop the worker pool."""
+        if self._progress_task is not None:
+            self._progress_task.cancel()
+            await asyncio.gather(self._progress_task, return_exceptions=True)
+            self._progress_task = None
+
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Global runner instance
+simulation_job_runner = SimulationJobRunner(
+    max_workers=settings.SIMULATION_MAX_WORKERS,
+    max_concurrent_jobs=settings.SIMULATION_MAX_CONCURRENT_JOBS,
+    max_queued_jobs=settings.SIMULATION_MAX_QUEUED_JOBS,
+)
@@ -0,0 +1,380 @@
+"""Compiled resource availability calendars.
+
+A WorkingCalendar turns a work pattern (hours per day, ISO working
+weekdays, one-time and yearly holidays) plus per-date ResourceCalendar
+overrides into an int64 array of available hours per day, in hundredths
+of an hour like the loading kernel. The array covers a horizon that
+grows on demand, so day lookups are O(1) and range queries are array
+slices. A prefix count of working days over the same horizon turns
+"next working day", "add N working days" and working-day offset to date
+conversion into binary searches.
+
+Template calendars are cached per template version, so a template is
+compiled once however many resources and requests use it.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import date, timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.services.loading_kernel import to_hundredths
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from datetime import datetime
+    from uuid import UUID
+
+    from numpy.typing import NDArray
+
+    from src.models.calendar_template import CalendarTemplate
+    from src.models.resource import ResourceCalendar
+
+# ISO weekdays (1=Monday, 7=Sunday) worked when no template is assigned
+STANDARD_WORKING_DAYS = (1, 2, 3, 4, 5)
+
+# Template hours per day when none is set
+DEFAULT_HOURS_PER_DAY = Decimal("8.0")
+
+# Days compiled beyond a requested date when the horizon grows
+_HORIZON_PADDING = 366
+
+# Longest span searched for working days before giving up
+_MAX_SEARCH_YEARS = 100
+
+# Compiled template calendars kept per template version
+_TEMPLATE_CACHE_SIZE = 256
+
+_ZERO_HOURS = Decimal("0")
+
+
+class WorkingCalendar:
+    """Available hours per day for one work pattern.
+
+    Days are working days when they have available hours. Without
+    overrides, a day has hours_per_day if its weekday is a working day
+    and it is not a holiday; an override replaces the pattern for its
+    date. hours_on returns the Decimal the hours came from (the pattern
+    hours or the override's available_hours), so results compare and
+    serialize like the model values.
+
+    Example usage:
+        calendar = get_template_calendar(template).with_overrides(entries)
+        if calendar.is_working_day(date(2024, 12, 25)):
+            ...
+        finish = calendar.add_working_days(date(2024, 1, 5), 10)
+    """
+
+    def __init__(
+        self,
+        hours_per_day: Decimal,
+        working_days: Iterable[int] = STANDARD_WORKING_DAYS,
+        holidays: Iterable[date] = (),
+        recurring_holidays: Iterable[tuple[int, int]] = (),
+        overrides: dict[date, Decimal] | None = None,
+    ) -> None:
+        """Initialize from a work pattern.
+
+        Args:
+            hours_per_day: Hours available on a working day
+            working_days: ISO weekdays worked (1=Monday, 7=Sunday)
+            holidays: One-time non-working dates
+            recurring_holidays: (month, day) pairs off every year
+            overrides: Available hours for specific dates, replacing the
+                pattern on those dates
+        """
+        self.hours_per_day = hours_per_day
+        self.working_days = frozenset(working_days)
+        self.holidays = frozenset(holidays)
+        self.recurring_holidays = frozenset(recurring_holidays)
+        self.overrides = dict(overrides or {})
+
+        self._weekly = np.array(
+            [
+                to_hundredths(hours_per_day) if weekday + 1 in self.working_days else 0
+                for weekday in range(7)
+            ],
+            dtype=np.int64,
+        )
+        # Source Decimal for each hours value, so lookups return model values
+        self._decimals: dict[int, Decimal] = {0: _ZERO_HOURS}
+        self._decimals.setdefault(to_hundredths(hours_per_day), hours_per_day)
+        for hours in self.overrides.values():
+            self._decimals.setdefault(to_hundredths(hours), hours)
+
+        # (origin, hours, prefix working-day count), replaced as one value so
+        # calendars shared between threads never see a half-built horizon
+        self._horizon: tuple[date, NDArray[np.int64], NDArray[np.int64]] | None = None
+
+    @classmethod
+    def from_template(cls, template: CalendarTemplate) -> WorkingCalendar:
+        """Compile a calendar template.
+
+        Args:
+            template: Template with its holidays loaded
+
+        Returns:
+            WorkingCalendar for the template's pattern
+        """
+        holidays = [h.holiday_date for h in template.holidays if not h.recurring_yearly]
+        recurring = [
+            (h.holiday_date.month, h.holiday_date.day)
+            for h in template.holidays
+            if h.recurring_yearly
+        ]
+        # Column defaults only apply on flush, so unsaved templates may lack them
+        hours_per_day = template.hours_per_day
+        if hours_per_day is None:
+            hours_per_day = DEFAULT_HOURS_PER_DAY
+        working_days = template.working_days
+        if working_days is None:
+            working_days = STANDARD_WORKING_DAYS
+        return cls(hours_per_day, working_days, holidays, recurring)
+
+    def with_overrides(self, entries: Iterable[ResourceCalendar]) -> WorkingCalendar:
+        """Copy of this calendar with resource calendar entries applied.
+
+        Args:
+            entries: Resource calendar entries; non-working entries have
+                no available hours
+
+        Returns:
+            New WorkingCalendar; this calendar is not changed
+        """
+        overrides = dict(self.overrides)
+        for entry in entries:
+            overrides[entry.calendar_date] = (
+                entry.available_hours if entry.is_working_day else _ZERO_HOURS
+            )
+        return WorkingCalendar(
+            self.hours_per_day,
+            self.working_days,
+            self.holidays,
+            self.recurring_holidays,
+            overrides,
+        )
+
+    def hours(self, start: date, end: date) -> NDArray[np.int64]:
+        """Available hours, in hundredths, for each day of [start, end].
+
+        Args:
+            start: First day (inclusive)
+            end: Last day (inclusive)
+
+        Returns:
+            Array with one value per day (empty if end < start)
+        """
+        if end < start:
+            return np.zeros(0, dtype=np.int64)
+        origin, hours, _ = self._cover(start, end)
+        first = (start - origin).days
+        return hours[first : first + (end - start).days + 1].copy()
+
+    def working_mask(self, start: date, days: int) -> NDArray[np.bool_]:
+        """Flags for the working days among days consecutive days from start."""
+        if days <= 0:
+            return np.zeros(0, dtype=bool)
+        return self.hours(start, start + timedelta(days=days - 1)) > 0
+
+    def hours_on(self, day: date) -> Decimal:
+        """Available hours on a day."""
+        origin, hours, _ = self._cover(day, day)
+        return self._decimals[int(hours[(day - origin).days])]
+
+    def is_working_day(self, day: date) -> bool:
+        """Check whether a day has available hours."""
+        origin, hours, _ = self._cover(day, day)
+        return bool(hours[(day - origin).days] > 0)
+
+    def next_working_day(self, day: date) -> date:
+        """First working day on or after day."""
+        if self.is_working_day(day):
+            return day
+        return self.add_working_days(day, 1)
+
+    def add_working_days(self, day: date, count: int) -> date:
+        """Move a number of working days from a day.
+
+        Args:
+            day: Starting day (need not be a working day)
+            count: Working days to move; negative moves backward, zero
+                returns day
+
+        Returns:
+            The count-th working day after (or before) day
+
+        Raises:
+            ValueError: If the calendar has no working days to reach
+        """
+        if count == 0:
+            return day
+        if count > 0:
+            return self.working_dates(day + timedelta(days=1), np.array([count - 1]))[0]
+        return self.working_dates(day, np.array([count]))[0]
+
+    def working_dates(self, start: date, offsets: NDArray[np.int64]) -> list[date]:
+        """Convert working-day offsets from start into dates.
+
+        Offset 0 is the first working day on or after start and offset n
+        the n-th working day after that, as CPM durations count days;
+        offset -n is the n-th working day before start.
+
+        Args:
+            start: Date offsets are counted from
+            offsets: Working-day offsets
+
+        Returns:
+            Dates of the offsets, in input order
+
+        Raises:
+            ValueError: If the calendar has no working days to reach
+        """
+        offsets = np.asarray(offsets, dtype=np.int64)
+        if len(offsets) == 0:
+            return []
+
+        reach = int(np.abs(offsets).max()) * 7 + 7
+        limit = reach + _MAX_SEARCH_YEARS * 366
+        while reach <= limit:
+            origin, _, working = self._cover(
+                start - timedelta(days=reach), start + timedelta(days=reach)
+            )
+            # Rank of each wanted day among the horizon's working days
+            targets = working[(start - origin).days] + offsets + 1
+            if targets.min() > 0 and targets.max() <= working[-1]:
+                days = np.searchsorted(working, targets, side="left") - 1
+                first = origin.toordinal()
+                return [date.fromordinal(first + day) for day in days.tolist()]
+            reach *= 2
+
+        msg = "Calendar has no working days within the search range"
+        raise ValueError(msg)
+
+    def _cover(self, start: date, end: date) -> tuple[date, NDArray[np.int64], NDArray[np.int64]]:
+        """Compile the horizon to cover [start, end] if needed and return it."""
+        horizon = self._horizon
+        if horizon is not None:
+            origin, hours, _ = horizon
+            if start >= origin and (end - origin).days < len(hours):
+                return horizon
+        horizon = self._compile(start, end, horizon)
+        self._horizon = horizon
+        return horizon
+
+    def _compile(
+        self,
+        start: date,
+        end: date,
+        previous: tuple[date, NDArray[np.int64], NDArray[np.int64]] | None,
+    ) -> tuple[date, NDArray[np.int64], NDArray[np.int64]]:
+        """Build the hours array over a padded horizon covering [start, end]."""
+        first = start - timedelta(days=_HORIZON_PADDING)
+        last = end + timedelta(days=_HORIZON_PADDING)
+        if previous is not None:
+            origin, hours, _ = previous
+            first = min(first, origin)
+            last = max(last, origin + timedelta(days=len(hours) - 1))
+        days = (last - first).days + 1
+
+        hours = self._weekly[(first.weekday() + np.arange(days)) % 7]
+        offsets = [(holiday - first).days for holiday in self.holidays if first <= holiday <= last]
+        for year in range(first.year, last.year + 1):
+            for month, day in self.recurring_holidays:
+                try:
+                    holiday = date(year, month, day)
+                except ValueError:  # February 29 outside leap years
+                    continue
+                if first <= holiday <= last:
+                    offsets.append((holiday - first).days)
+        hours[np.asarray(offsets, dtype=np.int64)] = 0
+        for override_day, value in self.overrides.items():
+            if first <= override_day <= last:
+                hours[(override_day - first).days] = to_hundredths(value)
+
+        working = np.concatenate(([0], np.cumsum(hours > 0, dtype=np.int64)))
+        return first, hours, working
+
+
+@lru_cache(maxsize=64)
+def standard_calendar(hours_per_day: Decimal) -> WorkingCalendar:
+    """Monday to Friday calendar used for resources without a template.
+
+    Args:
+        hours_per_day: Hours available on each weekday
+
+    Returns:
+        Shared WorkingCalendar; use with_overrides rather than changing it
+    """
+    return WorkingCalendar(hours_per_day)
+
+
+_template_cache: OrderedDict[
+    tuple[UUID, datetime, frozenset[tuple[date, bool]]], WorkingCalendar
+] = OrderedDict()
+
+
+def get_template_calendar(template: CalendarTemplate) -> WorkingCalendar:
+    """Compiled calendar for a template, cached by template version.
+
+    The version is the template id, its updated_at and its holiday set.
+    Adding or removing a holiday does not touch the template row, so the
+    holidays are part of the version rather than relying on updated_at.
+    Templates not yet flushed have no version and are compiled on every
+    call.
+
+    Args:
+        template: Template with its holidays loaded
+
+    Returns:
+        Shared WorkingCalendar; use with_overrides rather than changing it
+    """
+    if template.updated_at is None:
+        return WorkingCalendar.from_template(template)
+
+    holidays = frozenset((h.holiday_date, h.recurring_yearly) for h in template.holidays)
+    version = (template.id, template.updated_at, holidays)
+    calendar = _template_cache.get(version)
+    if calendar is None:
+        calendar = WorkingCalendar.from_template(template)
+        _template_cache[version] = calendar
+        if len(_template_cache) > _TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+    else:
+        _template_cache.move_to_end(version)
+    return calendar
+
+
+def clear_calendar_cache() -> None:
+    """Drop all cached template calendars."""
+    _template_cache.clear()
+
+
+def resource_calendar(
+    capacity_per_day: Decimal,
+    template: CalendarTemplate | None = None,
+    entries: Iterable[ResourceCalendar] = (),
+) -> WorkingCalendar:
+    """Calendar of one resource.
+
+    Uses the resource's template if it has one, otherwise a Monday to
+    Friday week at the resource's capacity, with the resource's own
+    calendar entries applied on top.
+
+    Args:
+        capacity_per_day: Resource capacity in hours per day
+        template: Calendar template assigned to the resource
+        entries: Resource calendar entries
+
+    Returns:
+        WorkingCalendar for the resource
+    """
+    base = get_template_calendar(template) if template else standard_calendar(capacity_per_day)
+    entries = list(entries)
+    if not entries:
+        return base
+    return base.with_overrides(entries)
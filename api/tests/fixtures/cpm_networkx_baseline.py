@@ -0,0 +1,128 @@
+"""
+networkx CPM Engine Baseline for Benchmarks.
+
+The CPM engine as it was before the compiled CSR network: a networkx
+DiGraph, a topological sort per pass and an edge-attribute lookup per
+dependency. It is kept only so the CPM benchmarks can measure the
+speedup of CPMEngine against it and check both produce the same dates.
+
+Requires networkx (a dev dependency); the application does not use it.
+"""
+
+from typing import Any
+from uuid import UUID
+
+import networkx as nx
+
+from src.models.enums import DependencyType
+from src.services.cpm import ScheduleResult
+
+
+class NetworkxCPMEngine:
+    """CPM forward/backward passes over a networkx DiGraph."""
+
+    def __init__(self, activities: list[Any], dependencies: list[Any]) -> None:
+        self.activities = {a.id: a for a in activities}
+        self.graph = nx.DiGraph()
+        for activity_id, activity in self.activities.items():
+            self.graph.add_node(activity_id, duration=activity.duration)
+        for dep in dependencies:
+            self.graph.add_edge(
+                dep.predecessor_id,
+                dep.successor_id,
+                dependency_type=dep.dependency_type,
+                lag=dep.lag,
+            )
+        self.results: dict[UUID, ScheduleResult] = {}
+
+    def calculate(self) -> dict[UUID, ScheduleResult]:
+        """Run cycle detection, both passes and float."""
+        try:
+            nx.find_cycle(self.graph)
+        except nx.NetworkXNoCycle:
+            pass
+        else:
+            raise ValueError("dependency graph contains a cycle")
+
+        self._forward_pass()
+        self._backward_pass()
+        self._calculate_float()
+        return self.results
+
+    def _forward_pass(self) -> None:
+        for activity_id, activity in self.activities.items():
+            self.results[activity_id] = ScheduleResult(
+                activity_id=activity_id,
+                early_start=0,
+                early_finish=activity.duration,
+                late_start=0,
+                late_finish=0,
+                total_float=0,
+                free_float=0,
+            )
+
+        for activity_id in nx.topological_sort(self.graph):
+            duration = self.activities[activity_id].duration
+            max_es = 0
+            for pred_id in self.graph.predecessors(activity_id):
+                edge_data = self.graph.edges[pred_id, activity_id]
+                lag = edge_data["lag"]
+                pred = self.results[pred_id]
+                match edge_data["dependency_type"]:
+                    case DependencyType.SS.value:
+                        es = pred.early_start + lag
+                    case DependencyType.FF.value:
+                        es = pred.early_finish + lag - duration
+                    case DependencyType.SF.value:
+                        es = pred.early_start + lag - duration
+                    case _:
+                        es = pred.early_finish + lag
+                max_es = max(max_es, es)
+
+            self.results[activity_id].early_start = max_es
+            self.results[activity_id].early_finish = max_es + duration
+
+    def _backward_pass(self) -> None:
+        project_end = max(r.early_finish for r in self.results.values())
+        for result in self.results.values():
+            result.late_finish = project_end
+            result.late_start = project_end - self.activities[result.activity_id].duration
+
+        for activity_id in reversed(list(nx.topological_sort(self.graph))):
+            duration = self.activities[activity_id].duration
+            min_lf = self.results[activity_id].late_finish
+            for succ_id in self.graph.successors(activity_id):
+                edge_data = self.graph.edges[activity_id, succ_id]
+                lag = edge_data["lag"]
+                succ = self.results[succ_id]
+                match edge_data["dependency_type"]:
+                    case DependencyType.SS.value:
+                        lf = succ.late_start - lag + duration
+                    case DependencyType.FF.value:
+                        lf = succ.late_finish - lag
+                    case DependencyType.SF.value:
+                        lf = succ.late_finish - lag + duration
+                    case _:
+                        lf = succ.late_start - lag
+                min_lf = min(min_lf, lf)
+
+            self.results[activity_id].late_finish = min_lf
+            self.results[activity_id].late_start = min_lf - duration
+
+    def _calculate_float(self) -> None:
+        for activity_id, result in self.results.items():
+            result.total_float = result.late_start - result.early_start
+
+            min_successor_es = float("inf")
+            for succ_id in self.graph.successors(activity_id):
+                edge_data = self.graph.edges[activity_id, succ_id]
+                if edge_data["dependency_type"] == DependencyType.FS.value:
+                    min_successor_es = min(
+                        min_successor_es,
+                        self.results[succ_id].early_start - edge_data["lag"],
+                    )
+
+            if min_successor_es == float("inf"):
+                result.free_float = result.total_float
+            else:
+                result.free_float = int(min_successor_es) - result.early_finish
@@ -0,0 +1,279 @@
+"""
+Synthetic Program Generator for Resource Benchmarks.
+
+Builds a reproducible program in a real database: activities spread over
+a horizon with CPM dates and float, resources sharing one calendar
+template, resource assignments, resource calendar entries and
+finish-to-start dependencies. Rows are written with bulk inserts, so
+building a large program takes a fraction of the time the services need
+to analyse it.
+
+The same spec and seed always produce the same program shape (ids differ).
+"""
+
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.activity import Activity
+from src.models.calendar_template import CalendarTemplate, CalendarTemplateHoliday
+from src.models.dependency import Dependency
+from src.models.enums import DependencyType, ResourceType
+from src.models.program import Program
+from src.models.resource import Resource, ResourceAssignment, ResourceCalendar
+from src.models.resource_load import refresh_resource_loads
+from src.models.user import User
+from src.models.wbs import WBSElement
+
+# Allocation units drawn for assignments
+ASSIGNMENT_UNITS = (Decimal("0.25"), Decimal("0.50"), Decimal("0.75"), Decimal("1.00"))
+
+# Fixed-date holidays of the shared calendar template, as (month, day)
+TEMPLATE_HOLIDAYS = ((1, 1), (7, 4), (11, 11), (12, 25))
+
+PROGRAM_START = date(2026, 1, 5)
+
+
+@dataclass(frozen=True)
+class SyntheticProgramSpec:
+    """Shape of a synthetic program."""
+
+    name: str
+    activities: int
+    resources: int
+    assignments_per_resource: int
+    calendar_density: float  # Share of horizon days with a calendar entry per resource
+    horizon_days: int
+    seed: int = 0
+
+
+@dataclass
+class SyntheticProgram:
+    """Identifiers of a generated program."""
+
+    spec: SyntheticProgramSpec
+    program_id: UUID
+    resource_ids: list[UUID]
+    start_date: date
+    end_date: date
+    assignment_count: int
+    calendar_entry_count: int
+
+
+# Benchmark sizes, smallest first
+SYNTHETIC_PROGRAM_SIZES = {
+    spec.name: spec
+    for spec in (
+        SyntheticProgramSpec(
+            name="small",
+            activities=100,
+            resources=10,
+            assignments_per_resource=20,
+            calendar_density=0.05,
+            horizon_days=180,
+        ),
+        SyntheticProgramSpec(
+            name="medium",
+            activities=500,
+            resources=25,
+            assignments_per_resource=40,
+            calendar_density=0.1,
+            horizon_days=365,
+        ),
+        SyntheticProgramSpec(
+            name="large",
+            activities=2000,
+            resources=60,
+            assignments_per_resource=80,
+            calendar_density=0.1,
+            horizon_days=730,
+        ),
+    )
+}
+
+
+async def build_synthetic_program(
+    session: AsyncSession, spec: SyntheticProgramSpec
+) -> SyntheticProgram:
+    """Insert a synthetic program and commit it.
+
+    Each activity runs 1-20 days inside the horizon; about half of the
+    activities get a finish-to-start successor among the activities
+    starting after they finish. Every resource is assigned to
+    assignments_per_resource distinct activities (capped at the activity
+    count) and gets calendar_density * horizon_days calendar entries,
+    half of them days off and half at reduced hours.
+    """
+    rng = random.Random(spec.seed)
+    start_date = PROGRAM_START
+    end_date = start_date + timedelta(days=spec.horizon_days - 1)
+
+    user_id, program_id, wbs_id, template_id = uuid4(), uuid4(), uuid4(), uuid4()
+    await session.execute(
+        insert(User),
+        [
+            {
+                "id": user_id,
+                "email": f"bench_{user_id.hex[:12]}@example.com",
+                "hashed_password": "hashed",
+                "full_name": "Benchmark Owner",
+            }
+        ],
+    )
+    await session.execute(
+        insert(Program),
+        [
+            {
+                "id": program_id,
+                "code": f"BENCH-{program_id.hex[:6].upper()}",
+                "name": f"Synthetic {spec.name} program",
+                "start_date": start_date,
+                "end_date": end_date,
+                "owner_id": user_id,
+            }
+        ],
+    )
+    await session.execute(
+        insert(WBSElement),
+        [
+            {
+                "id": wbs_id,
+                "program_id": program_id,
+                "wbs_code": "1",
+                "name": "Synthetic work",
+                "path": "1",
+                "level": 1,
+            }
+        ],
+    )
+    await session.execute(
+        insert(CalendarTemplate),
+        [
+            {
+                "id": template_id,
+                "program_id": program_id,
+                "name": "Synthetic calendar",
+                "hours_per_day": Decimal("8.0"),
+                "working_days": [1, 2, 3, 4, 5],
+            }
+        ],
+    )
+    await session.execute(
+        insert(CalendarTemplateHoliday),
+        [
+            {
+                "template_id": template_id,
+                "holiday_date": date(start_date.year, month, day),
+                "name": f"Holiday {month}/{day}",
+                "recurring_yearly": True,
+            }
+            for month, day in TEMPLATE_HOLIDAYS
+        ],
+    )
+
+    activities = []
+    for index in range(spec.activities):
+        duration = rng.randint(1, min(20, spec.horizon_days))
+        early_start = start_date + timedelta(days=rng.randint(0, spec.horizon_days - duration))
+        total_float = rng.choice((0, 0, 5, 10, 20, 40))
+        activities.append(
+            {
+                "id": uuid4(),
+                "program_id": program_id,
+                "wbs_id": wbs_id,
+                "code": f"A-{index:05d}",
+                "name": f"Activity {index}",
+                "duration": duration,
+                "early_start": early_start,
+                "early_finish": early_start + timedelta(days=duration - 1),
+                "total_float": total_float,
+                "is_critical": total_float == 0,
+            }
+        )
+    await session.execute(insert(Activity), activities)
+
+    by_start = sorted(activities, key=lambda a: a["early_start"])
+    dependencies = []
+    for position, predecessor in enumerate(by_start):
+        if rng.random() >= 0.5:
+            continue
+        successor = next(
+            (a for a in by_start[position + 1 :] if a["early_start"] > predecessor["early_finish"]),
+            None,
+        )
+        if successor is not None:
+            dependencies.append(
+                {
+                    "predecessor_id": predecessor["id"],
+                    "successor_id": successor["id"],
+                    "dependency_type": DependencyType.FS,
+                    "lag": 0,
+                }
+            )
+    if dependencies:
+        await session.execute(insert(Dependency), dependencies)
+
+    resource_ids = [uuid4() for _ in range(spec.resources)]
+    await session.execute(
+        insert(Resource),
+        [
+            {
+                "id": resource_id,
+                "program_id": program_id,
+                "code": f"R-{index:04d}",
+                "name": f"Resource {index}",
+                "resource_type": ResourceType.LABOR,
+                "capacity_per_day": Decimal("8.0"),
+                "calendar_template_id": template_id,
+            }
+            for index, resource_id in enumerate(resource_ids)
+        ],
+    )
+
+    assignments = [
+        {
+            "activity_id": activity["id"],
+            "resource_id": resource_id,
+            "units": rng.choice(ASSIGNMENT_UNITS),
+        }
+        for resource_id in resource_ids
+        for activity in rng.sample(activities, min(spec.assignments_per_resource, len(activities)))
+    ]
+    await session.execute(insert(ResourceAssignment), assignments)
+
+    entries_per_resource = round(spec.calendar_density * spec.horizon_days)
+    calendar_entries = []
+    for resource_id in resource_ids:
+        for offset in rng.sample(range(spec.horizon_days), entries_per_resource):
+            day_off = rng.random() < 0.5
+            calendar_entries.append(
+                {
+                    "resource_id": resource_id,
+                    "calendar_date": start_date + timedelta(days=offset),
+                    "available_hours": Decimal("0") if day_off else Decimal("4.0"),
+                    "is_working_day": not day_off,
+                }
+            )
+    if calendar_entries:
+        await session.execute(insert(ResourceCalendar), calendar_entries)
+
+    # Bulk inserts bypass the flush listener that maintains the load index
+    await session.run_sync(
+        lambda sync_session: refresh_resource_loads(sync_session.connection(), resource_ids)
+    )
+    await session.commit()
+
+    return SyntheticProgram(
+        spec=spec,
+        program_id=program_id,
+        resource_ids=resource_ids,
+        start_date=start_date,
+        end_date=end_date,
+        assignment_count=len(assignments),
+        calendar_entry_count=len(calendar_entries),
+    )
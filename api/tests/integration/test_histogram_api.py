@@ -312,3 +312,37 @@ class TestGetProgramHistogram:
         # Should use program's date range
         assert data["summary"]["start_date"] == "2024-01-01"
         assert data["summary"]["end_date"] == "2024-12-31"
+
+    @pytest.mark.asyncio
+    async def test_program_histogram_columnar(
+        self,
+        client: AsyncClient,
+        auth_headers: dict[str, str],
+        program_with_resources: dict,
+    ) -> None:
+        """Should return weekly data as parallel arrays."""
+        program_id = program_with_resources["program_id"]
+        resource1_id = program_with_resources["resource1_id"]
+
+        response = await client.get(
+            f"/api/v1/programs/{program_id}/histogram",
+            headers=auth_headers,
+            params={
+                "start_date": "2024-01-15",
+                "end_date": "2024-01-28",
+                "granularity": "weekly",
+                "layout": "columnar",
+            },
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["granularity"] == "weekly"
+        assert data["dates"] == ["2024-01-15", "2024-01-22"]
+        row = data["resource_ids"].index(resource1_id)
+        assert data["available_hours"][row] == [40.0, 40.0]
+        assert data["assigned_hours"][row] == [40.0, 0.0]
+        assert data["utilization_percent"][row] == [100.0, 0.0]
+        assert data["peak_dates"][row] == "2024-01-15"
+        assert "histograms" not in data
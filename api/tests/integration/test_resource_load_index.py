@@ -0,0 +1,275 @@
+"""Integration tests for the materialized resource load index."""
+
+from datetime import date
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.activity import Activity
+from src.models.enums import ResourceType
+from src.models.program import Program
+from src.models.resource import Resource, ResourceAssignment
+from src.models.resource_load import ResourceLoadSegment
+from src.models.user import User
+from src.models.wbs import WBSElement
+from src.services.cross_program_availability import CrossProgramAvailabilityService
+
+pytestmark = pytest.mark.asyncio
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest_asyncio.fixture
+async def test_user(db_session: AsyncSession) -> User:
+    """Create a test user."""
+    user = User(
+        id=uuid4(),
+        email=f"test_{uuid4().hex[:8]}@example.com",
+        hashed_password="hashed",
+        full_name="Test User",
+    )
+    db_session.add(user)
+    await db_session.flush()
+    return user
+
+
+async def _program_activity(
+    db_session: AsyncSession,
+    owner: User,
+    early_start: date | None = None,
+    early_finish: date | None = None,
+) -> Activity:
+    """Create a program with one activity."""
+    program = Program(
+        id=uuid4(),
+        code=f"PRG-{uuid4().hex[:6]}",
+        name="Test Program",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+        owner_id=owner.id,
+    )
+    wbs = WBSElement(
+        id=uuid4(),
+        program_id=program.id,
+        wbs_code="1.1",
+        name="Work Package 1",
+        path="1.1",
+        level=1,
+    )
+    activity = Activity(
+        id=uuid4(),
+        program_id=program.id,
+        wbs_id=wbs.id,
+        code=f"ACT-{uuid4().hex[:6]}",
+        name="Test Activity",
+        duration=5,
+        early_start=early_start,
+        early_finish=early_finish,
+    )
+    db_session.add_all([program, wbs, activity])
+    await db_session.flush()
+    return activity
+
+
+@pytest_asyncio.fixture
+async def test_activity(db_session: AsyncSession, test_user: User) -> Activity:
+    """Create an activity scheduled 2024-01-08 to 2024-01-12."""
+    return await _program_activity(db_session, test_user, date(2024, 1, 8), date(2024, 1, 12))
+
+
+@pytest_asyncio.fixture
+async def test_resource(db_session: AsyncSession, test_activity: Activity) -> Resource:
+    """Create a test resource."""
+    resource = Resource(
+        id=uuid4(),
+        program_id=test_activity.program_id,
+        code="ENG-001",
+        name="Senior Engineer",
+        resource_type=ResourceType.LABOR,
+        capacity_per_day=Decimal("8.0"),
+        cost_rate=Decimal("150.00"),
+        is_active=True,
+    )
+    db_session.add(resource)
+    await db_session.flush()
+    return resource
+
+
+async def _segments(db_session: AsyncSession, resource: Resource) -> list[tuple]:
+    """Index rows of a resource as (program, start, finish, units, count)."""
+    result = await db_session.execute(
+        select(ResourceLoadSegment)
+        .where(ResourceLoadSegment.resource_id == resource.id)
+        .order_by(ResourceLoadSegment.start_date)
+    )
+    return [
+        (s.program_id, s.start_date, s.finish_date, s.units, s.assignment_count)
+        for s in result.scalars().all()
+    ]
+
+
+# =============================================================================
+# Index maintenance
+# =============================================================================
+
+
+class TestLoadIndexMaintenance:
+    """Tests for keeping segments in step with assignments."""
+
+    async def test_new_assignment_uses_activity_dates(
+        self, db_session: AsyncSession, test_activity: Activity, test_resource: Resource
+    ) -> None:
+        """Should index an undated assignment over its activity's early dates."""
+        db_session.add(
+            ResourceAssignment(
+                activity_id=test_activity.id, resource_id=test_resource.id, units=Decimal("0.5")
+            )
+        )
+        await db_session.flush()
+
+        assert await _segments(db_session, test_resource) == [
+            (test_activity.program_id, date(2024, 1, 8), date(2024, 1, 12), Decimal("0.5"), 1)
+        ]
+
+    async def test_overlapping_assignments_split_runs(
+        self, db_session: AsyncSession, test_activity: Activity, test_resource: Resource
+    ) -> None:
+        """Should split the load into runs of constant units."""
+        second = Activity(
+            id=uuid4(),
+            program_id=test_activity.program_id,
+            wbs_id=test_activity.wbs_id,
+            code="ACT-002",
+            name="Second Activity",
+            duration=5,
+        )
+        db_session.add(second)
+        db_session.add_all(
+            [
+                ResourceAssignment(
+                    activity_id=test_activity.id,
+                    resource_id=test_resource.id,
+                    units=Decimal("0.5"),
+                    start_date=date(2024, 1, 1),
+                    finish_date=date(2024, 1, 10),
+                ),
+                ResourceAssignment(
+                    activity_id=second.id,
+                    resource_id=test_resource.id,
+                    units=Decimal("0.25"),
+                    start_date=date(2024, 1, 6),
+                    finish_date=date(2024, 1, 15),
+                ),
+            ]
+        )
+        await db_session.flush()
+
+        program_id = test_activity.program_id
+        assert await _segments(db_session, test_resource) == [
+            (program_id, date(2024, 1, 1), date(2024, 1, 5), Decimal("0.5"), 1),
+            (program_id, date(2024, 1, 6), date(2024, 1, 10), Decimal("0.75"), 2),
+            (program_id, date(2024, 1, 11), date(2024, 1, 15), Decimal("0.25"), 1),
+        ]
+
+    async def test_assignment_update_and_delete(
+        self, db_session: AsyncSession, test_activity: Activity, test_resource: Resource
+    ) -> None:
+        """Should rebuild on changed units and drop soft-deleted assignments."""
+        assignment = ResourceAssignment(
+            activity_id=test_activity.id, resource_id=test_resource.id, units=Decimal("0.5")
+        )
+        db_session.add(assignment)
+        await db_session.flush()
+
+        assignment.units = Decimal("1.0")
+        await db_session.flush()
+        assert [s[3] for s in await _segments(db_session, test_resource)] == [Decimal("1.0")]
+
+        assignment.soft_delete()
+        await db_session.flush()
+        assert await _segments(db_session, test_resource) == []
+
+    async def test_activity_dates_move_load(
+        self, db_session: AsyncSession, test_activity: Activity, test_resource: Resource
+    ) -> None:
+        """Should follow rescheduled activities for undated assignments."""
+        db_session.add(
+            ResourceAssignment(
+                activity_id=test_activity.id, resource_id=test_resource.id, units=Decimal("0.5")
+            )
+        )
+        await db_session.flush()
+
+        test_activity.early_start = date(2024, 2, 5)
+        test_activity.early_finish = date(2024, 2, 9)
+        await db_session.flush()
+
+        assert [s[1:3] for s in await _segments(db_session, test_resource)] == [
+            (date(2024, 2, 5), date(2024, 2, 9))
+        ]
+
+    async def test_unscheduled_assignment_has_no_load(
+        self, db_session: AsyncSession, test_user: User, test_resource: Resource
+    ) -> None:
+        """Should not index assignments without dates."""
+        activity = await _program_activity(db_session, test_user)
+        db_session.add(ResourceAssignment(activity_id=activity.id, resource_id=test_resource.id))
+        await db_session.flush()
+
+        assert await _segments(db_session, test_resource) == []
+
+
+# =============================================================================
+# Availability from the index
+# =============================================================================
+
+
+class TestConflictsFromIndex:
+    """Tests for conflict checks read from the index."""
+
+    async def test_cross_program_conflict(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_activity: Activity,
+        test_resource: Resource,
+    ) -> None:
+        """Should report days where another program's load plus the proposal exceeds capacity."""
+        other = await _program_activity(db_session, test_user, date(2024, 1, 10), date(2024, 1, 16))
+        db_session.add_all(
+            [
+                ResourceAssignment(
+                    activity_id=test_activity.id,
+                    resource_id=test_resource.id,
+                    units=Decimal("0.5"),
+                ),
+                ResourceAssignment(
+                    activity_id=other.id, resource_id=test_resource.id, units=Decimal("0.25")
+                ),
+            ]
+        )
+        await db_session.flush()
+
+        service = CrossProgramAvailabilityService(db_session)
+        conflicts = await service.check_resource_conflict(
+            test_resource.id,
+            uuid4(),
+            date(2024, 1, 8),
+            date(2024, 1, 14),
+            Decimal("0.5"),
+        )
+
+        # 0.5 + 0.25 + 0.5 exceeds 1.0 only on Jan 10-12
+        assert [c.conflict_date for c in conflicts] == [
+            date(2024, 1, 10),
+            date(2024, 1, 11),
+            date(2024, 1, 12),
+        ]
+        assert conflicts[0].total_assigned == Decimal("10")
@@ -459,6 +459,117 @@ class TestResourceAssignmentRepository:
         total = await repo.get_total_units_for_resource(test_resource.id, date(2024, 1, 15))
         assert total == Decimal("1.25")
 
+    async def test_get_for_program_resources(
+        self,
+        db_session: AsyncSession,
+        test_user: User,
+        test_activity: Activity,
+        test_resource: Resource,
+    ) -> None:
+        """Test loading all assignments on resources a program uses."""
+        repo = ResourceAssignmentRepository(db_session)
+
+        other_program = Program(
+            id=uuid4(),
+            code=f"PRG-{uuid4().hex[:6]}",
+            name="Other Program",
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            owner_id=test_user.id,
+        )
+        db_session.add(other_program)
+        await db_session.flush()
+        other_wbs = WBSElement(
+            id=uuid4(),
+            program_id=other_program.id,
+            wbs_code="2.1",
+            name="Other Work Package",
+            path="2.1",
+            level=1,
+        )
+        db_session.add(other_wbs)
+        await db_session.flush()
+        other_activity = Activity(
+            id=uuid4(),
+            program_id=other_program.id,
+            wbs_id=other_wbs.id,
+            code="OTH-001",
+            name="Other Activity",
+            duration=5,
+        )
+        shared, unrelated, deleted = (
+            Resource(
+                id=uuid4(),
+                program_id=other_program.id,
+                code=code,
+                name=code,
+                resource_type=ResourceType.LABOR,
+                capacity_per_day=Decimal("8.0"),
+            )
+            for code in ("SHR-001", "UNR-001", "DEL-001")
+        )
+        db_session.add_all([other_activity, shared, unrelated, deleted])
+        await db_session.flush()
+        deleted.soft_delete()
+
+        pairs = [
+            (test_activity, test_resource),  # Own resource, own activity
+            (other_activity, test_resource),  # Own resource used by another program
+            (test_activity, shared),  # Shared resource
+            (other_activity, shared),  # Another program on the shared resource
+            (other_activity, unrelated),  # Not used by the program
+            (test_activity, deleted),  # Deleted resource
+        ]
+        for activity, resource in pairs:
+            await repo.create(
+                {"activity_id": activity.id, "resource_id": resource.id, "units": Decimal("0.5")}
+            )
+
+        assignments = await repo.get_for_program_resources(test_activity.program_id)
+
+        loaded = {(a.activity_id, a.resource_id) for a in assignments}
+        assert loaded == {(a.id, r.id) for a, r in pairs[:4]}
+        assert all(a.activity is not None and a.resource is not None for a in assignments)
+
+    async def test_get_assignments_for_resources(
+        self,
+        db_session: AsyncSession,
+        test_program: Program,
+        test_activity: Activity,
+        test_resource: Resource,
+    ) -> None:
+        """Test loading assignments of several resources in one query."""
+        repo = ResourceAssignmentRepository(db_session)
+
+        second, other = (
+            Resource(
+                id=uuid4(),
+                program_id=test_program.id,
+                code=code,
+                name=code,
+                resource_type=ResourceType.LABOR,
+                capacity_per_day=Decimal("8.0"),
+            )
+            for code in ("ENG-002", "ENG-003")
+        )
+        db_session.add_all([second, other])
+        await db_session.flush()
+
+        for resource in (test_resource, second, other):
+            await repo.create(
+                {
+                    "activity_id": test_activity.id,
+                    "resource_id": resource.id,
+                    "units": Decimal("0.5"),
+                }
+            )
+
+        assignments = await repo.get_assignments_for_resources([test_resource.id, second.id])
+
+        assert {a.resource_id for a in assignments} == {test_resource.id, second.id}
+        assert all(a.activity is not None for a in assignments)
+        assert await repo.get_assignments_for_resources([]) == []
+
 
 # =============================================================================
 # ResourceCalendarRepository Tests
@@ -513,6 +624,45 @@ class TestResourceCalendarRepository:
         assert entries[0].calendar_date == date(2024, 1, 1)
         assert entries[6].calendar_date == date(2024, 1, 7)
 
+    async def test_get_for_resources_date_range(
+        self, db_session: AsyncSession, test_program: Program, test_resource: Resource
+    ) -> None:
+        """Test getting calendar entries of several resources for a date range."""
+        repo = ResourceCalendarRepository(db_session)
+
+        second = Resource(
+            id=uuid4(),
+            program_id=test_program.id,
+            code="ENG-002",
+            name="Second Engineer",
+            resource_type=ResourceType.LABOR,
+            capacity_per_day=Decimal("8.0"),
+        )
+        db_session.add(second)
+        await db_session.flush()
+
+        for resource in (second, test_resource):
+            for i in range(3):
+                await repo.create(
+                    {
+                        "resource_id": resource.id,
+                        "calendar_date": date(2024, 1, 1) + timedelta(days=i),
+                        "available_hours": Decimal("8.0"),
+                        "is_working_day": True,
+                    }
+                )
+
+        entries = await repo.get_for_resources_date_range(
+            [test_resource.id, second.id], date(2024, 1, 2), date(2024, 1, 5)
+        )
+
+        assert len(entries) == 4
+        assert [(e.resource_id, e.calendar_date) for e in entries] == sorted(
+            (e.resource_id, e.calendar_date) for e in entries
+        )
+        assert all(e.calendar_date >= date(2024, 1, 2) for e in entries)
+        assert await repo.get_for_resources_date_range([], date(2024, 1, 1), date(2024, 1, 5)) == []
+
     async def test_get_by_date(self, db_session: AsyncSession, test_resource: Resource) -> None:
         """Test getting a calendar entry by date."""
         repo = ResourceCalendarRepository(db_session)
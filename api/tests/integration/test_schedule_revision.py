@@ -0,0 +1,177 @@
+"""Integration tests for the per-program schedule revision."""
+
+from datetime import UTC, date, datetime
+from uuid import UUID, uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.activity import Activity
+from src.models.dependency import Dependency
+from src.models.enums import DependencyType
+from src.models.program import Program
+from src.models.user import User
+from src.models.wbs import WBSElement
+
+pytestmark = pytest.mark.asyncio
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+
+@pytest_asyncio.fixture
+async def test_wbs(db_session: AsyncSession) -> WBSElement:
+    """Create a program with a WBS element and no activities."""
+    user = User(
+        id=uuid4(),
+        email=f"test_{uuid4().hex[:8]}@example.com",
+        hashed_password="hashed",
+        full_name="Test User",
+    )
+    program = Program(
+        id=uuid4(),
+        code=f"PRG-{uuid4().hex[:6]}",
+        name="Test Program",
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+        owner_id=user.id,
+    )
+    wbs = WBSElement(
+        id=uuid4(),
+        program_id=program.id,
+        wbs_code="1.1",
+        name="Work Package 1",
+        path="1.1",
+        level=1,
+    )
+    db_session.add_all([user, program, wbs])
+    await db_session.flush()
+    return wbs
+
+
+async def _add_activity(db_session: AsyncSession, wbs: WBSElement) -> Activity:
+    """Add a five-day activity to a WBS element."""
+    activity = Activity(
+        id=uuid4(),
+        program_id=wbs.program_id,
+        wbs_id=wbs.id,
+        code=f"ACT-{uuid4().hex[:6]}",
+        name="Test Activity",
+        duration=5,
+    )
+    db_session.add(activity)
+    await db_session.flush()
+    return activity
+
+
+async def _revision(db_session: AsyncSession, program_id: UUID) -> int:
+    """Read the stored schedule revision of a program."""
+    result = await db_session.execute(
+        select(Program.schedule_revision).where(Program.id == program_id)
+    )
+    return result.scalar_one()
+
+
+# =============================================================================
+# Revision maintenance
+# =============================================================================
+
+
+class TestScheduleRevision:
+    """Tests for bumping the revision with network changes."""
+
+    async def test_activity_changes_bump(
+        self, db_session: AsyncSession, test_wbs: WBSElement
+    ) -> None:
+        """Should bump on new activities, duration changes and deletion."""
+        assert await _revision(db_session, test_wbs.program_id) == 0
+
+        activity = await _add_activity(db_session, test_wbs)
+        assert await _revision(db_session, test_wbs.program_id) == 1
+
+        activity.duration = 8
+        await db_session.flush()
+        assert await _revision(db_session, test_wbs.program_id) == 2
+
+        activity.deleted_at = datetime.now(UTC)
+        await db_session.flush()
+        assert await _revision(db_session, test_wbs.program_id) == 3
+
+    async def test_cpm_outputs_do_not_bump(
+        self, db_session: AsyncSession, test_wbs: WBSElement
+    ) -> None:
+        """Should keep the revision when CPM writes its results back."""
+        activity = await _add_activity(db_session, test_wbs)
+        revision = await _revision(db_session, test_wbs.program_id)
+
+        activity.name = "Renamed"
+        activity.total_float = 3
+        activity.is_critical = True
+        await db_session.flush()
+
+        assert await _revision(db_session, test_wbs.program_id) == revision
+
+    async def test_dependency_changes_bump(
+        self, db_session: AsyncSession, test_wbs: WBSElement
+    ) -> None:
+        """Should bump when dependencies are added, changed or deleted."""
+        predecessor = await _add_activity(db_session, test_wbs)
+        successor = await _add_activity(db_session, test_wbs)
+        revision = await _revision(db_session, test_wbs.program_id)
+
+        dependency = Dependency(
+            id=uuid4(),
+            predecessor_id=predecessor.id,
+            successor_id=successor.id,
+            dependency_type=DependencyType.FS,
+            lag=0,
+        )
+        db_session.add(dependency)
+        await db_session.flush()
+        assert await _revision(db_session, test_wbs.program_id) == revision + 1
+
+        dependency.lag = 2
+        await db_session.flush()
+        assert await _revision(db_session, test_wbs.program_id) == revision + 2
+
+        await db_session.delete(dependency)
+        await db_session.flush()
+        assert await _revision(db_session, test_wbs.program_id) == revision + 3
+
+    async def test_other_programs_unchanged(
+        self, db_session: AsyncSession, test_wbs: WBSElement
+    ) -> None:
+        """Should only bump the program the activity belongs to."""
+        owner_id = await db_session.scalar(
+            select(Program.owner_id).where(Program.id == test_wbs.program_id)
+        )
+        other = Program(
+            id=uuid4(),
+            code=f"PRG-{uuid4().hex[:6]}",
+            name="Other Program",
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            owner_id=owner_id,
+        )
+        db_session.add(other)
+        await db_session.flush()
+
+        await _add_activity(db_session, test_wbs)
+
+        assert await _revision(db_session, other.id) == 0
+
+    async def test_rolled_back_with_change(
+        self, db_session: AsyncSession, test_wbs: WBSElement
+    ) -> None:
+        """Should roll the revision back together with the change."""
+        revision = await _revision(db_session, test_wbs.program_id)
+
+        savepoint = await db_session.begin_nested()
+        await _add_activity(db_session, test_wbs)
+        await savepoint.rollback()
+
+        assert await _revision(db_session, test_wbs.program_id) == revision
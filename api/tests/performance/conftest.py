@@ -0,0 +1,173 @@
+"""Fixtures for database-backed performance benchmarks.
+
+Benchmarks run against a temporary SQLite database, or against the
+database in BENCHMARK_DATABASE_URL (e.g. a local Postgres) when set.
+That database must be empty and dedicated to benchmarks: the schema is
+created at the start of every benchmark and dropped at its end, so a
+database that already has tables is refused rather than touched.
+Measurements are collected during the session and written as JSON to
+BENCHMARK_RESULTS_FILE when it is set, which is how
+scripts/run_benchmarks.py records them.
+"""
+
+import contextlib
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, TypeVar
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, inspect
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.models.base import Base
+
+T = TypeVar("T")
+
+
+@dataclass
+class BenchmarkRecord:
+    """One measured service call."""
+
+    benchmark: str
+    size: str
+    wall_ms: float
+    queries: int
+    peak_memory_kb: float
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+# Records of this session, in run order
+BENCHMARK_RECORDS: list[BenchmarkRecord] = []
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Write the collected records when a results file is requested."""
+    results_file = os.environ.get("BENCHMARK_RESULTS_FILE")
+    if results_file and BENCHMARK_RECORDS:
+        Path(results_file).write_text(
+            json.dumps([asdict(record) for record in BENCHMARK_RECORDS], indent=2)
+        )
+
+
+@pytest_asyncio.fixture
+async def benchmark_engine() -> AsyncGenerator[AsyncEngine, None]:
+    """Engine on an empty benchmark database, refusing one already in use."""
+    database_url = os.environ.get("BENCHMARK_DATABASE_URL")
+    db_path = None
+    if not database_url:
+        db_fd, db_path = tempfile.mkstemp(suffix=".db")
+        os.close(db_fd)
+        database_url = f"sqlite+aiosqlite:///{db_path}"
+
+    engine = create_async_engine(database_url, echo=False)
+    async with engine.connect() as conn:
+        existing_tables = await conn.run_sync(lambda c: inspect(c).get_table_names())
+    if existing_tables:
+        await engine.dispose()
+        pytest.fail(
+            "BENCHMARK_DATABASE_URL must point to an empty database used only for "
+            f"benchmarks; found {len(existing_tables)} existing tables, which the "
+            "benchmark teardown would drop",
+            pytrace=False,
+        )
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield engine
+
+    if db_path is None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+    if db_path is not None:
+        with contextlib.suppress(OSError):
+            Path(db_path).unlink()
+
+
+@pytest.fixture
+def benchmark_session_maker(benchmark_engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    """Session factory for the benchmark database."""
+    return async_sessionmaker(benchmark_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def _measure(
+    engine: AsyncEngine,
+    operation: Callable[[AsyncSession], Awaitable[T]],
+    *,
+    benchmark: str,
+    size: str,
+    params: dict[str, Any] | None = None,
+) -> tuple[T, BenchmarkRecord]:
+    """Run an operation in fresh sessions and record its cost.
+
+    The first run measures wall time and statements executed; a second
+    run under tracemalloc measures peak Python memory, which would
+    otherwise slow down the timed run.
+    """
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    queries = 0
+
+    def count_query(*_args: Any) -> None:
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+    try:
+        async with session_maker() as session:
+            start = time.perf_counter()
+            result = await operation(session)
+            wall_ms = (time.perf_counter() - start) * 1000
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", count_query)
+
+    async with session_maker() as session:
+        tracemalloc.start()
+        try:
+            await operation(session)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    record = BenchmarkRecord(
+        benchmark=benchmark,
+        size=size,
+        wall_ms=round(wall_ms, 2),
+        queries=queries,
+        peak_memory_kb=round(peak / 1024, 1),
+        params=params or {},
+    )
+    BENCHMARK_RECORDS.append(record)
+    print(
+        f"\n{benchmark} [{size}]: {record.wall_ms:.2f}ms, "
+        f"{record.queries} queries, {record.peak_memory_kb:.0f}KB peak"
+    )
+    return result, record
+
+
+@pytest.fixture
+def measure(benchmark_engine: AsyncEngine) -> Callable[..., Awaitable[tuple[Any, BenchmarkRecord]]]:
+    """Measure an operation against the benchmark database.
+
+    Usage: result, record = await measure(operation, benchmark=..., size=...)
+    """
+
+    async def measure_operation(
+        operation: Callable[[AsyncSession], Awaitable[T]], **kwargs: Any
+    ) -> tuple[T, BenchmarkRecord]:
+        return await _measure(benchmark_engine, operation, **kwargs)
+
+    return measure_operation
@@ -1,8 +1,10 @@
 """Performance benchmark tests for baseline establishment."""
 
 import time
+from collections.abc import Callable
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import TypeVar
 from uuid import UUID, uuid4
 
 import pytest
@@ -11,6 +13,8 @@ from src.models.enums import DependencyType
 from src.services.cpm import CPMEngine
 from src.services.evms import EVMSCalculator
 
+T = TypeVar("T")
+
 
 @dataclass
 class MockActivity:
@@ -35,6 +39,17 @@ class MockDependency:
     lag: int
 
 
+# Required speedup of CPMEngine over the networkx baseline at 5000 activities
+MIN_CPM_SPEEDUP = 10
+
+
+def timed_ms(func: Callable[[], T]) -> tuple[float, T]:
+    """Run func once; return its wall time in ms and its result."""
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
 class TestPerformanceBenchmarks:
     """Performance benchmarks for Week 4 optimization baseline."""
 
@@ -175,10 +190,61 @@ class TestPerformanceBenchmarks:
         assert elapsed_ms < 1000, f"CPM 2000 took {elapsed_ms:.2f}ms, expected <1000ms"
         print(f"\nCPM 2000 activities (chain): {elapsed_ms:.2f}ms")
 
+    def assert_speedup(
+        self,
+        activities: list[MockActivity],
+        dependencies: list[MockDependency],
+        label: str,
+    ) -> None:
+        """
+        Assert CPMEngine is at least MIN_CPM_SPEEDUP times the networkx baseline.
+
+        Runs of both engines are interleaved and the fastest of each is
+        compared, so a noisy neighbour slows both sides alike. Both must
+        produce the same dates.
+        """
+        pytest.importorskip("networkx")
+        from tests.fixtures.cpm_networkx_baseline import NetworkxCPMEngine
+
+        baseline_ms = elapsed_ms = float("inf")
+        for _ in range(5):
+            ms, expected = timed_ms(lambda: NetworkxCPMEngine(activities, dependencies).calculate())
+            baseline_ms = min(baseline_ms, ms)
+            for _ in range(3):
+                ms, results = timed_ms(lambda: CPMEngine(activities, dependencies).calculate())
+                elapsed_ms = min(elapsed_ms, ms)
+
+        assert results == expected
+        speedup = baseline_ms / elapsed_ms
+        print(
+            f"\nCPM {len(activities)} activities ({label}): {elapsed_ms:.2f}ms, "
+            f"networkx {baseline_ms:.2f}ms, {speedup:.1f}x"
+        )
+        assert speedup >= MIN_CPM_SPEEDUP, (
+            f"CPM {len(activities)} {label} is {speedup:.1f}x the networkx baseline, "
+            f"expected >={MIN_CPM_SPEEDUP}x"
+        )
+
     @pytest.mark.benchmark
     def test_cpm_5000_activities_chain(self):
-        """Benchmark: CPM with 5000 activities (target <2000ms)."""
+        """Benchmark: CPM with 5000 activities in chain topology (>=10x networkx)."""
+        activities = self.create_activities(5000)
+        dependencies = self.create_chain_dependencies(activities)
+
+        self.assert_speedup(activities, dependencies, "chain")
+
+    @pytest.mark.benchmark
+    def test_cpm_5000_activities_parallel(self):
+        """Benchmark: CPM with 5000 activities in parallel topology (>=10x networkx)."""
         activities = self.create_activities(5000)
+        dependencies = self.create_parallel_dependencies(activities, parallel_count=10)
+
+        self.assert_speedup(activities, dependencies, "parallel")
+
+    @pytest.mark.benchmark
+    def test_cpm_20000_activities_chain(self):
+        """Benchmark: CPM with 20000 activities (target <1000ms)."""
+        activities = self.create_activities(20000)
         dependencies = self.create_chain_dependencies(activities)
 
         start = time.perf_counter()
@@ -186,10 +252,10 @@ class TestPerformanceBenchmarks:
         results = engine.calculate()
         elapsed_ms = (time.perf_counter() - start) * 1000
 
-        assert len(results) == 5000
-        # Target: <2000ms
-        assert elapsed_ms < 2000, f"CPM 5000 took {elapsed_ms:.2f}ms, expected <2000ms"
-        print(f"\nCPM 5000 activities (chain): {elapsed_ms:.2f}ms")
+        assert len(results) == 20000
+        # Target: <1000ms
+        assert elapsed_ms < 1000, f"CPM 20000 took {elapsed_ms:.2f}ms, expected <1000ms"
+        print(f"\nCPM 20000 activities (chain): {elapsed_ms:.2f}ms")
 
     @pytest.mark.benchmark
     def test_graph_construction_1000(self):
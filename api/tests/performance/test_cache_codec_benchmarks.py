@@ -0,0 +1,63 @@
+"""Cache codec benchmarks on large payloads.
+
+Compares the JSON and MessagePack codecs on a CPM schedule for 10,000
+activities (as cached by the schedule endpoint) and reports stored size
+and encode/decode time. Size is asserted; times are reported only.
+"""
+
+import time
+from datetime import date, timedelta
+from uuid import uuid4
+
+import pytest
+
+from src.core.cache_codec import JsonCodec, MsgpackCodec
+
+ACTIVITY_COUNT = 10_000
+
+
+def _schedule_payload() -> list[dict]:
+    start = date(2026, 1, 5)
+    return [
+        {
+            "activity_id": uuid4(),
+            "early_start": start + timedelta(days=i % 300),
+            "early_finish": start + timedelta(days=i % 300 + 5),
+            "late_start": start + timedelta(days=i % 300 + 2),
+            "late_finish": start + timedelta(days=i % 300 + 7),
+            "total_float": i % 20,
+            "free_float": 0,
+            "is_critical": i % 3 == 0,
+        }
+        for i in range(ACTIVITY_COUNT)
+    ]
+
+
+class TestCacheCodecBenchmarks:
+    """Stored size and speed of the cache codecs."""
+
+    @pytest.mark.benchmark
+    def test_schedule_payload(self):
+        """Benchmark: 10k-activity schedule through each codec.
+
+        Target: MessagePack entry at most a fifth of the JSON entry
+        """
+        payload = _schedule_payload()
+        sizes = {}
+
+        print(f"\n=== Cache codecs ({ACTIVITY_COUNT} schedule rows) ===")
+        for codec in (JsonCodec(), MsgpackCodec()):
+            start = time.perf_counter()
+            encoded = codec.encode(payload)
+            encode_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            codec.decode(encoded)
+            decode_ms = (time.perf_counter() - start) * 1000
+
+            sizes[codec.name] = len(encoded)
+            print(
+                f"  {codec.name}: {len(encoded) / 1024:.0f}KB, "
+                f"encode {encode_ms:.1f}ms, decode {decode_ms:.1f}ms"
+            )
+
+        assert sizes["msgpack"] * 5 <= sizes["json"]
@@ -10,14 +10,22 @@ Performance Targets:
 - Full Dashboard Load: <3s
 """
 
+import asyncio
+import json
+import statistics
 import time
 from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
 import pytest_asyncio
+import redis.asyncio as redis
 from httpx import AsyncClient
 
+from src.core.cache import CacheManager, LocalCache
+from src.services.dashboard_cache import DashboardCache
+
 
 class TestDashboardPerformanceBaselines:
     """Performance baseline tests for dashboard endpoints.
@@ -538,6 +546,46 @@ class TestDashboardScalePerformance:
         assert elapsed < 5.0, f"50 activity schedule exceeded 5s: {elapsed * 1000:.1f}ms"
 
 
+class TestDashboardCacheLatency:
+    """Warm-key latency of the dashboard cache with an in-process L1."""
+
+    # Simulated Redis round trip
+    REDIS_LATENCY_S = 0.005
+
+    @pytest.mark.asyncio
+    @pytest.mark.benchmark
+    async def test_warm_metrics_p50(self):
+        """Test warm dashboard metrics are served without a Redis round trip.
+
+        Target: p50 <5ms for warm keys
+        """
+        metrics = {"program_id": "prog-1", "cpi": "1.02", "spi": "0.97", "bac": "1000000.00"}
+
+        async def slow_get(key: str) -> str:
+            await asyncio.sleep(self.REDIS_LATENCY_S)
+            return json.dumps(metrics)
+
+        mock_redis = MagicMock(spec=redis.Redis)
+        mock_redis.get = AsyncMock(side_effect=slow_get)
+        cache = DashboardCache(CacheManager(mock_redis, local_cache=LocalCache()))
+        program_id = uuid4()
+
+        await cache.get_metrics(program_id)
+        timings = []
+        for _ in range(200):
+            start = time.perf_counter()
+            await cache.get_metrics(program_id)
+            timings.append(time.perf_counter() - start)
+        p50 = statistics.median(timings)
+
+        print("\n=== Dashboard Metrics (warm L1) ===")
+        print(f"  p50: {p50 * 1000:.3f}ms")
+        print("  Target: <5ms")
+
+        assert mock_redis.get.await_count == 1
+        assert p50 < 0.005, f"Warm dashboard metrics p50 exceeded 5ms: {p50 * 1000:.3f}ms"
+
+
 class TestDashboardPerformanceSummary:
     """Summary test that reports all baselines."""
 
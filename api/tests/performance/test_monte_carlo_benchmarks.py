@@ -1,5 +1,6 @@
 """Monte Carlo performance benchmarks for Week 7 optimization."""
 
+import random
 import time
 from uuid import uuid4
 
@@ -28,11 +29,11 @@ class MockActivity:
 class MockDependency:
     """Mock dependency for benchmarking."""
 
-    def __init__(self, predecessor_id, successor_id):
+    def __init__(self, predecessor_id, successor_id, dependency_type="FS", lag=0):
         self.predecessor_id = predecessor_id
         self.successor_id = successor_id
-        self.dependency_type = "FS"
-        self.lag = 0
+        self.dependency_type = dependency_type
+        self.lag = lag
 
 
 class TestMonteCarloPerformanceBenchmarks:
@@ -485,3 +486,192 @@ class TestOptimizedMonteCarloPerformance:
 
         # Optimized should be faster
         assert optimized_elapsed < original_elapsed
+
+    @pytest.mark.benchmark
+    def test_comparison_mixed_dependency_types(self):
+        """Compare engines on a network mixing FS, SS, FF and SF with lags."""
+        from src.services.monte_carlo_optimized import OptimizedNetworkMonteCarloEngine
+
+        # 100 activities, each linked to up to 3 earlier activities
+        rng = random.Random(7)
+        activities = []
+        dependencies = []
+        distributions = {}
+
+        for j in range(100):
+            act_id = uuid4()
+            activities.append(MockActivity(act_id, 10))
+            distributions[act_id] = DistributionParams(
+                distribution=DistributionType.TRIANGULAR,
+                min_value=6,
+                mode=10,
+                max_value=18,
+            )
+            for i in rng.sample(range(j), k=min(j, 3)):
+                dependencies.append(
+                    MockDependency(
+                        activities[i].id,
+                        act_id,
+                        dependency_type=rng.choice(["FS", "SS", "FF", "SF"]),
+                        lag=rng.randint(0, 3),
+                    )
+                )
+
+        # Run original engine
+        original_engine = NetworkMonteCarloEngine(seed=42)
+        original_input = NetworkSimulationInput(
+            activities=activities,
+            dependencies=dependencies,
+            duration_distributions=distributions,
+            iterations=500,
+        )
+
+        start = time.perf_counter()
+        original_output = original_engine.simulate(original_input)
+        original_elapsed = time.perf_counter() - start
+
+        # Run optimized engine
+        optimized_engine = OptimizedNetworkMonteCarloEngine(seed=42)
+
+        start = time.perf_counter()
+        optimized_output = optimized_engine.simulate(
+            activities, dependencies, distributions, iterations=500
+        )
+        optimized_elapsed = time.perf_counter() - start
+
+        print("\n=== Comparison (100 mixed-type, 500 iter) ===")
+        print(f"Original: {original_elapsed:.3f}s")
+        print(f"Optimized: {optimized_elapsed:.3f}s")
+        print(f"Speedup: {original_elapsed / optimized_elapsed:.1f}x")
+
+        # Original rounds sampled durations to whole days, so allow 2%
+        assert optimized_output.project_duration_mean == pytest.approx(
+            original_output.project_duration_mean, rel=0.02
+        )
+
+        # Optimized should be much faster
+        assert optimized_elapsed * 5 < original_elapsed
+
+    @pytest.mark.benchmark
+    def test_optimized_network_mc_10000_activities(self):
+        """Optimized: 10,000-activity mixed network, 200 iterations (target <10s)."""
+        from src.services.monte_carlo_optimized import OptimizedNetworkMonteCarloEngine
+
+        # Each activity links to two of the 50 activities before it
+        rng = random.Random(11)
+        activities = []
+        dependencies = []
+        distributions = {}
+
+        for j in range(10_000):
+            act_id = uuid4()
+            activities.append(MockActivity(act_id, 10))
+            distributions[act_id] = DistributionParams(
+                distribution=DistributionType.TRIANGULAR,
+                min_value=6,
+                mode=10,
+                max_value=18,
+            )
+            for i in {rng.randrange(max(0, j - 50), j) for _ in range(2)} if j else ():
+                dependencies.append(
+                    MockDependency(
+                        activities[i].id,
+                        act_id,
+                        dependency_type=rng.choice(["FS", "SS", "FF", "SF"]),
+                        lag=rng.randint(0, 2),
+                    )
+                )
+
+        engine = OptimizedNetworkMonteCarloEngine(seed=42)
+
+        start = time.perf_counter()
+        output = engine.simulate(activities, dependencies, distributions, iterations=200)
+        elapsed = time.perf_counter() - start
+
+        print(f"\nOptimized MC (10000 mixed, 200 iter): {elapsed:.3f}s")
+        assert len(output.activity_criticality) == 10_000
+        assert elapsed < 10.0, f"Optimized MC exceeded 10s target: {elapsed:.3f}s"
+
+    @pytest.mark.benchmark
+    def test_criticality_cost_close_to_forward_pass(self):
+        """Criticality (backward sweep + mask) costs about one forward pass."""
+        import numpy as np
+
+        from src.services.cpm_network import compile_network
+        from src.services.monte_carlo_optimized import OptimizedNetworkMonteCarloEngine
+
+        # 2,000-activity FS network, 2,000 iterations
+        rng = random.Random(5)
+        activities = [MockActivity(uuid4(), 10) for _ in range(2000)]
+        dependencies = [
+            MockDependency(activities[i].id, activities[j].id)
+            for j in range(1, len(activities))
+            for i in {rng.randrange(max(0, j - 50), j) for _ in range(2)}
+        ]
+        distributions = {
+            a.id: DistributionParams(
+                distribution=DistributionType.TRIANGULAR,
+                min_value=5,
+                mode=10,
+                max_value=20,
+            )
+            for a in activities
+        }
+        activity_ids = [a.id for a in activities]
+
+        engine = OptimizedNetworkMonteCarloEngine(seed=42)
+        network = compile_network(activity_ids, dependencies)
+        samples = engine._generate_all_samples(activities, distributions, 2000)
+        durations_t = np.ascontiguousarray(samples.T)
+        _ = network.levels
+
+        start = time.perf_counter()
+        early_start_t, early_finish_t = engine._vectorized_forward_pass(durations_t, network)
+        forward_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        late_start_t = engine._vectorized_backward_pass(
+            durations_t, early_finish_t.max(axis=0), network
+        )
+        criticality = engine._calculate_criticality_from_float(
+            late_start_t - early_start_t, activity_ids
+        )
+        criticality_elapsed = time.perf_counter() - start
+
+        print("\n=== Criticality cost (2000 FS, 2000 iter) ===")
+        print(f"Forward pass: {forward_elapsed:.3f}s")
+        print(f"Criticality: {criticality_elapsed:.3f}s")
+
+        assert len(criticality) == 2000
+        assert criticality_elapsed < forward_elapsed * 3
+
+
+class TestCorrelatedSamplerPerformance:
+    """Benchmarks for correlated sample generation."""
+
+    @pytest.mark.benchmark
+    def test_transform_1000_activities_10000_iterations(self):
+        """Batched inverse-CDF transform: 1000 PERT/triangular activities x 10,000 rows."""
+        from src.services.correlation_model import CorrelatedSampler, CorrelationMatrix
+
+        rng = random.Random(9)
+        activity_ids = [uuid4() for _ in range(1000)]
+        distributions = {}
+        for j, act_id in enumerate(activity_ids):
+            low = rng.randint(1, 10)
+            high = low + rng.randint(5, 30)
+            distributions[act_id] = (
+                "pert" if j % 2 else "triangular",
+                {"min_value": low, "mode": rng.randint(low, high), "max_value": high},
+            )
+
+        sampler = CorrelatedSampler(CorrelationMatrix.identity(activity_ids), seed=42)
+        normals = sampler.generate_correlated_samples(10_000)
+
+        start = time.perf_counter()
+        samples = sampler.transform_to_distributions(normals, distributions)
+        elapsed = time.perf_counter() - start
+
+        print(f"\nCorrelated transform (1000 activities, 10000 iter): {elapsed:.3f}s")
+        assert samples.shape == (10_000, 1000)
+        assert elapsed < 5.0, f"Correlated transform exceeded 5s target: {elapsed:.3f}s"
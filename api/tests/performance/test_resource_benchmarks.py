@@ -0,0 +1,143 @@
+"""Resource service benchmarks on synthetic programs.
+
+Benchmarks serial and parallel leveling, over-allocation detection and
+program histograms against a database populated by the synthetic
+program generator, recording wall time, statements executed and peak
+memory per size. BENCHMARK_SIZES selects the sizes (comma separated,
+default "small,medium"; "large" is opt-in).
+
+Statement counts are asserted: each service loads a program with a
+fixed number of bulk queries, so they must not grow with program size.
+"""
+
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.services.overallocation import OverallocationService
+from src.services.parallel_leveling import ParallelLevelingService
+from src.services.resource_histogram import ResourceHistogramService
+from src.services.resource_leveling import LevelingOptions, ResourceLevelingService
+from tests.fixtures.synthetic_program import (
+    SYNTHETIC_PROGRAM_SIZES,
+    SyntheticProgram,
+    build_synthetic_program,
+)
+
+BENCHMARK_SIZES = [
+    size.strip()
+    for size in os.environ.get("BENCHMARK_SIZES", "small,medium").split(",")
+    if size.strip()
+]
+
+# Most statements each benchmarked call may execute, at any size
+MAX_QUERIES = {
+    "serial_leveling": 25,
+    "parallel_leveling": 25,
+    "overallocation_detection": 25,
+    "program_histogram": 25,
+}
+
+
+@pytest_asyncio.fixture(params=BENCHMARK_SIZES)
+async def synthetic_program(
+    request: pytest.FixtureRequest,
+    benchmark_session_maker: async_sessionmaker[AsyncSession],
+) -> SyntheticProgram:
+    """Synthetic program of each selected size."""
+    async with benchmark_session_maker() as session:
+        return await build_synthetic_program(session, SYNTHETIC_PROGRAM_SIZES[request.param])
+
+
+def _params(program: SyntheticProgram) -> dict:
+    spec = program.spec
+    return {
+        "activities": spec.activities,
+        "resources": spec.resources,
+        "assignments": program.assignment_count,
+        "calendar_entries": program.calendar_entry_count,
+        "horizon_days": spec.horizon_days,
+    }
+
+
+class TestResourceServiceBenchmarks:
+    """Benchmarks for the slowest resource services."""
+
+    @pytest.mark.benchmark
+    async def test_serial_leveling(self, synthetic_program: SyntheticProgram, measure):
+        """Benchmark: ResourceLevelingService.level_program."""
+
+        async def level(session: AsyncSession):
+            return await ResourceLevelingService(session).level_program(
+                synthetic_program.program_id, LevelingOptions()
+            )
+
+        result, record = await measure(
+            level,
+            benchmark="serial_leveling",
+            size=synthetic_program.spec.name,
+            params=_params(synthetic_program),
+        )
+
+        assert result.program_id == synthetic_program.program_id
+        assert record.queries <= MAX_QUERIES["serial_leveling"]
+
+    @pytest.mark.benchmark
+    async def test_parallel_leveling(self, synthetic_program: SyntheticProgram, measure):
+        """Benchmark: ParallelLevelingService.level_program."""
+
+        async def level(session: AsyncSession):
+            return await ParallelLevelingService(session).level_program(
+                synthetic_program.program_id, LevelingOptions()
+            )
+
+        result, record = await measure(
+            level,
+            benchmark="parallel_leveling",
+            size=synthetic_program.spec.name,
+            params=_params(synthetic_program),
+        )
+
+        assert result.program_id == synthetic_program.program_id
+        assert record.queries <= MAX_QUERIES["parallel_leveling"]
+
+    @pytest.mark.benchmark
+    async def test_overallocation_detection(self, synthetic_program: SyntheticProgram, measure):
+        """Benchmark: OverallocationService.detect_program_overallocations."""
+
+        async def detect(session: AsyncSession):
+            return await OverallocationService(session).detect_program_overallocations(
+                synthetic_program.program_id
+            )
+
+        report, record = await measure(
+            detect,
+            benchmark="overallocation_detection",
+            size=synthetic_program.spec.name,
+            params=_params(synthetic_program),
+        )
+
+        assert report.program_id == synthetic_program.program_id
+        assert record.queries <= MAX_QUERIES["overallocation_detection"]
+
+    @pytest.mark.benchmark
+    async def test_program_histogram(self, synthetic_program: SyntheticProgram, measure):
+        """Benchmark: ResourceHistogramService.get_program_histogram (weekly)."""
+
+        async def histogram(session: AsyncSession):
+            return await ResourceHistogramService(session).get_program_histogram(
+                synthetic_program.program_id, granularity="weekly"
+            )
+
+        (summary, histograms), record = await measure(
+            histogram,
+            benchmark="program_histogram",
+            size=synthetic_program.spec.name,
+            params=_params(synthetic_program),
+        )
+
+        assert summary.program_id == synthetic_program.program_id
+        assert len(histograms) == synthetic_program.spec.resources
+        assert record.queries <= MAX_QUERIES["program_histogram"]
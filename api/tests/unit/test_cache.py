@@ -1,14 +1,17 @@
 """Unit tests for Redis caching utilities."""
 
+import asyncio
+import json
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 import redis.asyncio as redis
 
 from src.core.cache import (
+    INVALIDATION_CHANNEL,
     CacheKeys,
     CacheManager,
-    compute_activities_hash,
+    LocalCache,
 )
 
 
@@ -17,8 +20,8 @@ class TestCacheKeys:
 
     def test_cpm_key_generation(self) -> None:
         """Test CPM cache key generation."""
-        key = CacheKeys.cpm_key("program-123", "hash-abc")
-        assert key == "cpm:result:program-123:hash-abc"
+        key = CacheKeys.cpm_key("program-123", 7)
+        assert key == "cpm:result:program-123:7"
 
     def test_evms_summary_key_generation(self) -> None:
         """Test EVMS summary cache key generation."""
@@ -43,53 +46,6 @@ class TestCacheKeys:
         assert CacheKeys.STATS_TTL == 60  # 1 minute
 
 
-class TestComputeActivitiesHash:
-    """Tests for activities hash computation."""
-
-    def test_hash_consistency(self) -> None:
-        """Test that same data produces same hash."""
-        data = [
-            {"id": "123", "duration": 5},
-            {"id": "456", "duration": 10},
-        ]
-        hash1 = compute_activities_hash(data)
-        hash2 = compute_activities_hash(data)
-        assert hash1 == hash2
-
-    def test_hash_order_independence(self) -> None:
-        """Test that order of activities doesn't affect hash."""
-        data1 = [
-            {"id": "123", "duration": 5},
-            {"id": "456", "duration": 10},
-        ]
-        data2 = [
-            {"id": "456", "duration": 10},
-            {"id": "123", "duration": 5},
-        ]
-        hash1 = compute_activities_hash(data1)
-        hash2 = compute_activities_hash(data2)
-        assert hash1 == hash2
-
-    def test_hash_changes_with_data(self) -> None:
-        """Test that different data produces different hash."""
-        data1 = [{"id": "123", "duration": 5}]
-        data2 = [{"id": "123", "duration": 10}]
-        hash1 = compute_activities_hash(data1)
-        hash2 = compute_activities_hash(data2)
-        assert hash1 != hash2
-
-    def test_hash_length(self) -> None:
-        """Test that hash is truncated to 16 characters."""
-        data = [{"id": "123", "duration": 5}]
-        hash_value = compute_activities_hash(data)
-        assert len(hash_value) == 16
-
-    def test_empty_data(self) -> None:
-        """Test hash of empty data."""
-        hash_value = compute_activities_hash([])
-        assert len(hash_value) == 16
-
-
 class TestCacheManager:
     """Tests for CacheManager class."""
 
@@ -229,20 +185,23 @@ class TestCacheManager:
         cache_manager: CacheManager,
         mock_redis: MagicMock,
     ) -> None:
-        """Test invalidate_program deletes all program keys."""
-
-        # Mock scan_iter to return some keys
-        async def mock_scan(*args, **kwargs):
-            for key in [b"cpm:result:prog-123:hash1", b"cpm:result:prog-123:hash2"]:
-                yield key
-
-        mock_redis.scan_iter = mock_scan
-        mock_redis.delete = AsyncMock(return_value=2)
+        """Test invalidate_program deletes all program keys without scanning."""
+        pipe = _mock_pipeline(
+            mock_redis, [[{"cpm:result:prog-123:hash1", "cpm:result:prog-123:hash2"}], [2, 2]]
+        )
+        mock_redis.delete = AsyncMock(return_value=3)
 
         await cache_manager.invalidate_program("prog-123")
 
-        # Should have attempted delete operations
-        assert mock_redis.delete.call_count >= 1
+        pipe.smembers.assert_called_once_with("tag:cpm:result:prog-123")
+        assert set(pipe.delete.call_args.args) == {
+            "cpm:result:prog-123:hash1",
+            "cpm:result:prog-123:hash2",
+        }
+        mock_redis.delete.assert_awaited_once_with(
+            "evms:summary:prog-123", "wbs:tree:prog-123", "program:stats:prog-123"
+        )
+        mock_redis.scan_iter.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_invalidate_cpm(
@@ -251,16 +210,13 @@ class TestCacheManager:
         mock_redis: MagicMock,
     ) -> None:
         """Test invalidate_cpm deletes CPM keys for program."""
-
-        async def mock_scan(*args, **kwargs):
-            for key in [b"cpm:result:prog-123:hash1"]:
-                yield key
-
-        mock_redis.scan_iter = mock_scan
-        mock_redis.delete = AsyncMock(return_value=1)
+        pipe = _mock_pipeline(mock_redis, [[{"cpm:result:prog-123:hash1"}], [1, 1]])
 
         await cache_manager.invalidate_cpm("prog-123")
 
+        pipe.srem.assert_called_once_with("tag:cpm:result:prog-123", "cpm:result:prog-123:hash1")
+        pipe.delete.assert_called_once_with("cpm:result:prog-123:hash1")
+
     @pytest.mark.asyncio
     async def test_invalidate_evms(
         self,
@@ -300,3 +256,469 @@ class TestCacheManager:
         result = await cache_manager.health_check()
         assert result["status"] == "unhealthy"
         assert "error" in result
+
+
+def _mock_pipeline(mock_redis: MagicMock, results: list[list]) -> MagicMock:
+    """Give mock_redis a pipeline whose executions return results in order."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(side_effect=results)
+    mock_redis.pipeline = MagicMock(return_value=pipe)
+    return pipe
+
+
+class TestCacheManagerTags:
+    """Tests for tag-based invalidation."""
+
+    @pytest.fixture
+    def mock_redis(self) -> MagicMock:
+        """Create a mock Redis client."""
+        mock = MagicMock(spec=redis.Redis)
+        mock.setex = AsyncMock(return_value=True)
+        mock.delete = AsyncMock(return_value=2)
+        return mock
+
+    @pytest.mark.asyncio
+    async def test_set_registers_tags(self, mock_redis: MagicMock) -> None:
+        """Test tagged values are written with their tags in one transaction."""
+        pipe = _mock_pipeline(mock_redis, [[True, 1, True, True]])
+        manager = CacheManager(mock_redis)
+
+        assert await manager.set("cpm:result:p:h", [1], ttl=60, tags=["tag:cpm:result:p"])
+
+        mock_redis.pipeline.assert_called_once_with(transaction=True)
+        pipe.setex.assert_called_once_with("cpm:result:p:h", 60, "[1]")
+        pipe.sadd.assert_called_once_with("tag:cpm:result:p", "cpm:result:p:h")
+        pipe.expire.assert_any_call("tag:cpm:result:p", 60, nx=True)
+        pipe.expire.assert_any_call("tag:cpm:result:p", 60, gt=True)
+        mock_redis.setex.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_set_without_ttl_persists_tag(self, mock_redis: MagicMock) -> None:
+        """Test a tag of a key without TTL does not expire."""
+        pipe = _mock_pipeline(mock_redis, [[True, 1, True]])
+        manager = CacheManager(mock_redis)
+
+        await manager.set("key", 1, tags=["tag:t"])
+
+        pipe.set.assert_called_once_with("key", "1")
+        pipe.persist.assert_called_once_with("tag:t")
+        pipe.expire.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_deletes_members(self, mock_redis: MagicMock) -> None:
+        """Test members of every tag are deleted and untagged in one transaction."""
+        pipe = _mock_pipeline(mock_redis, [[{"a", "b"}, {"b", "c"}], [2, 1, 3]])
+        manager = CacheManager(mock_redis)
+
+        deleted = await manager.invalidate_tags("tag:1", "tag:2")
+
+        assert deleted == 3
+        assert {m for call in pipe.srem.call_args_list for m in call.args[1:]} == {"a", "b", "c"}
+        assert set(pipe.delete.call_args.args) == {"a", "b", "c"}
+        mock_redis.pipeline.assert_any_call(transaction=True)
+
+    @pytest.mark.asyncio
+    async def test_invalidate_empty_tags(self, mock_redis: MagicMock) -> None:
+        """Test nothing is deleted when the tags have no members."""
+        pipe = _mock_pipeline(mock_redis, [[set()]])
+        manager = CacheManager(mock_redis)
+
+        assert await manager.invalidate_tags("tag:1") == 0
+        assert pipe.execute.await_count == 1
+        pipe.delete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_redis_error(self, mock_redis: MagicMock) -> None:
+        """Test Redis errors are logged, not raised."""
+        pipe = _mock_pipeline(mock_redis, [])
+        pipe.execute.side_effect = redis.RedisError("Connection failed")
+        manager = CacheManager(mock_redis)
+
+        assert await manager.invalidate_tags("tag:1") == 0
+
+    @pytest.mark.asyncio
+    async def test_invalidate_tags_evicts_local_and_publishes(self, mock_redis: MagicMock) -> None:
+        """Test tagged keys are evicted from L1 in every worker."""
+        mock_redis.get = AsyncMock(return_value="1")
+        mock_redis.publish = AsyncMock(return_value=1)
+        _mock_pipeline(mock_redis, [[{"a"}], [1, 1]])
+        manager = CacheManager(mock_redis, local_cache=LocalCache())
+        await manager.get("a")
+
+        await manager.invalidate_tags("tag:1")
+
+        assert manager.local_cache is not None
+        assert manager.local_cache.get("a") is None
+        assert json.loads(mock_redis.publish.await_args.args[1])["keys"] == ["a"]
+
+    @pytest.mark.asyncio
+    async def test_delete_many(self, mock_redis: MagicMock) -> None:
+        """Test several keys are deleted in one call."""
+        manager = CacheManager(mock_redis)
+
+        assert await manager.delete_many(["a", "b"]) == 2
+        mock_redis.delete.assert_awaited_once_with("a", "b")
+        assert await manager.delete_many([]) == 0
+
+
+class TestCacheManagerFill:
+    """Tests for single-flight fills of cache misses."""
+
+    @pytest.fixture
+    def mock_redis(self) -> MagicMock:
+        """Create a mock Redis client where this worker always gets the lock."""
+        mock = MagicMock(spec=redis.Redis)
+        mock.get = AsyncMock(return_value=None)
+        mock.set = AsyncMock(return_value=True)
+        mock.setex = AsyncMock(return_value=True)
+        mock.eval = AsyncMock(return_value=1)
+        mock.exists = AsyncMock(return_value=1)
+        return mock
+
+    @pytest.fixture(autouse=True)
+    def fast_poll(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Poll other workers' fills without delay."""
+        monkeypatch.setattr("src.core.cache._FILL_POLL_SECONDS", 0)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_compute_once(self, mock_redis: MagicMock) -> None:
+        """Test concurrent misses in one worker share one computation."""
+        manager = CacheManager(mock_redis)
+
+        async def slow() -> dict:
+            await asyncio.sleep(0.01)
+            return {"v": 1}
+
+        compute = AsyncMock(side_effect=slow)
+
+        results = await asyncio.gather(
+            *(manager.get_or_set("key", compute, ttl=60) for _ in range(10))
+        )
+
+        assert results == [{"v": 1}] * 10
+        compute.assert_awaited_once()
+        mock_redis.setex.assert_awaited_once_with("key", 60, '{"v": 1}')
+        lock_key, token = mock_redis.set.await_args.args
+        assert lock_key == "lock:key"
+        mock_redis.eval.assert_awaited_once()
+        assert mock_redis.eval.await_args.args[2:] == ("lock:key", token)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_other_worker(self, mock_redis: MagicMock) -> None:
+        """Test a worker without the lock waits for the other worker's value."""
+        mock_redis.set = AsyncMock(return_value=None)
+        mock_redis.get = AsyncMock(side_effect=[None, None, '{"v": 2}'])
+        manager = CacheManager(mock_redis)
+        compute = AsyncMock(return_value={"v": 1})
+
+        assert await manager.get_or_set("key", compute, ttl=60) == {"v": 2}
+        compute.assert_not_awaited()
+        mock_redis.eval.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_computes_when_other_worker_gives_up(self, mock_redis: MagicMock) -> None:
+        """Test the value is computed when the lock goes away without one."""
+        mock_redis.set = AsyncMock(side_effect=[None, True])
+        mock_redis.exists = AsyncMock(return_value=0)
+        manager = CacheManager(mock_redis)
+        compute = AsyncMock(return_value={"v": 1})
+
+        assert await manager.get_or_set("key", compute, ttl=60) == {"v": 1}
+        compute.assert_awaited_once()
+        mock_redis.setex.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_compute_error_reaches_every_caller(self, mock_redis: MagicMock) -> None:
+        """Test a failed computation fails all waiters and releases the lock."""
+        manager = CacheManager(mock_redis)
+
+        async def fail() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(manager.fill("key", fail) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+        mock_redis.eval.assert_awaited_once()
+        assert manager._fills == {}
+
+    @pytest.mark.asyncio
+    async def test_stale_value_served_while_recomputing(self, mock_redis: MagicMock) -> None:
+        """Test the stale copy is returned and the value refreshed in the background."""
+        mock_redis.get = AsyncMock(
+            side_effect=lambda key: '{"v": 0}' if key == "stale:key" else None
+        )
+        manager = CacheManager(mock_redis)
+        refreshed = asyncio.Event()
+
+        async def compute() -> dict:
+            refreshed.set()
+            return {"v": 1}
+
+        assert await manager.get_or_set("key", compute, ttl=60, stale_ttl=600) == {"v": 0}
+        await refreshed.wait()
+        await asyncio.gather(*manager._fills.values())
+
+        mock_redis.setex.assert_any_await("key", 60, '{"v": 1}')
+        mock_redis.setex.assert_any_await("stale:key", 660, '{"v": 1}')
+
+    @pytest.mark.asyncio
+    async def test_computes_without_redis(self) -> None:
+        """Test values are computed every time when the cache is unavailable."""
+        manager = CacheManager()
+        compute = AsyncMock(return_value=1)
+
+        assert await manager.get_or_set("key", compute) == 1
+        assert await manager.get_or_set("key", compute) == 1
+        assert compute.await_count == 2
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestLocalCache:
+    """Tests for the in-process LRU cache."""
+
+    def test_get_and_set(self) -> None:
+        """Test stored values are returned until evicted."""
+        cache = LocalCache()
+        cache.set("key", {"foo": "bar"})
+        assert cache.get("key") == {"foo": "bar"}
+        assert cache.get("missing") is None
+
+    def test_returns_shallow_copies(self) -> None:
+        """Test callers setting top-level keys do not change the entry."""
+        cache = LocalCache()
+        cache.set("dict", {"foo": "bar"})
+        cache.set("list", [1, 2])
+
+        cache.get("dict")["from_cache"] = True
+        cache.get("list").append(3)
+
+        assert cache.get("dict") == {"foo": "bar"}
+        assert cache.get("list") == [1, 2]
+
+    def test_entries_expire(self) -> None:
+        """Test entries expire after the cache TTL or a shorter key TTL."""
+        clock = FakeClock()
+        cache = LocalCache(ttl=30.0, clock=clock)
+        cache.set("capped", 1, ttl=300)
+        cache.set("short", 2, ttl=5)
+
+        clock.now = 10.0
+        assert cache.get("short") is None
+        assert cache.get("capped") == 1
+
+        clock.now = 30.0
+        assert cache.get("capped") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the least recently used entry is dropped when full."""
+        cache = LocalCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_delete_pattern(self) -> None:
+        """Test glob patterns evict matching keys only."""
+        cache = LocalCache()
+        cache.set("cpm:result:prog-1:abc", 1)
+        cache.set("cpm:result:prog-2:abc", 2)
+        cache.set("evms:summary:prog-1", 3)
+
+        assert cache.delete_pattern("cpm:result:prog-1:*") == 1
+        assert cache.get("cpm:result:prog-1:abc") is None
+        assert cache.get("cpm:result:prog-2:abc") == 2
+        assert cache.get("evms:summary:prog-1") == 3
+
+    def test_stale_generation_not_stored(self) -> None:
+        """Test a value read before an eviction is not stored."""
+        cache = LocalCache()
+        generation = cache.generation
+        cache.delete("key")
+
+        cache.set("key", "stale", generation=generation)
+
+        assert cache.get("key") is None
+
+
+class TestCacheManagerLocalCache:
+    """Tests for CacheManager with an in-process cache in front of Redis."""
+
+    @pytest.fixture
+    def mock_redis(self) -> MagicMock:
+        """Create a mock Redis client that also publishes."""
+        mock = MagicMock(spec=redis.Redis)
+        mock.get = AsyncMock(return_value='{"foo": "bar"}')
+        mock.set = AsyncMock(return_value=True)
+        mock.setex = AsyncMock(return_value=True)
+        mock.delete = AsyncMock(return_value=1)
+        mock.scan_iter = MagicMock(side_effect=lambda match: _aiter([]))
+        mock.publish = AsyncMock(return_value=1)
+        return mock
+
+    @pytest.fixture
+    def cache_manager(self, mock_redis: MagicMock) -> CacheManager:
+        """Create a CacheManager with mock Redis and a local cache."""
+        return CacheManager(mock_redis, local_cache=LocalCache())
+
+    @pytest.mark.asyncio
+    async def test_get_served_locally_when_warm(
+        self,
+        cache_manager: CacheManager,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test only the first get reads Redis."""
+        assert await cache_manager.get("key") == {"foo": "bar"}
+        assert await cache_manager.get("key") == {"foo": "bar"}
+        mock_redis.get.assert_awaited_once_with("key")
+
+    @pytest.mark.asyncio
+    async def test_set_stores_locally_and_publishes(
+        self,
+        cache_manager: CacheManager,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test set fills the local cache and tells other workers."""
+        await cache_manager.set("key", {"when": 1}, ttl=60)
+
+        assert await cache_manager.get("key") == {"when": 1}
+        mock_redis.get.assert_not_awaited()
+        channel, message = mock_redis.publish.await_args.args
+        assert channel == INVALIDATION_CHANNEL
+        assert json.loads(message)["keys"] == ["key"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_program_evicts_locally_and_publishes(
+        self,
+        cache_manager: CacheManager,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test program invalidation evicts local entries and is broadcast."""
+        _mock_pipeline(mock_redis, [[{"cpm:result:prog-1:abc"}], [1, 1]])
+        await cache_manager.get("cpm:result:prog-1:abc")
+        await cache_manager.get("evms:summary:prog-1")
+
+        await cache_manager.invalidate_program("prog-1")
+        await cache_manager.get("cpm:result:prog-1:abc")
+        await cache_manager.get("evms:summary:prog-1")
+
+        assert mock_redis.get.await_count == 4
+        published = [
+            json.loads(call.args[1])["keys"] for call in mock_redis.publish.await_args_list
+        ]
+        assert ["cpm:result:prog-1:abc"] in published
+        assert "evms:summary:prog-1" in published[-1]
+
+    @pytest.mark.asyncio
+    async def test_publish_error_is_ignored(
+        self,
+        cache_manager: CacheManager,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test a failed publish does not fail the delete."""
+        mock_redis.publish.side_effect = redis.RedisError("Connection failed")
+        assert await cache_manager.delete("key") is True
+
+    @pytest.mark.asyncio
+    async def test_apply_invalidation_from_other_worker(
+        self,
+        cache_manager: CacheManager,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test messages from other workers evict keys and patterns."""
+        await cache_manager.get("dashboard:metrics:prog-1")
+        await cache_manager.get("cpm:result:prog-1:abc")
+        other = CacheManager(mock_redis, local_cache=LocalCache())
+
+        await other.delete("dashboard:metrics:prog-1")
+        await other.delete_pattern("cpm:result:prog-1:*")
+        for call in mock_redis.publish.await_args_list:
+            cache_manager.apply_invalidation(call.args[1])
+
+        assert cache_manager.local_cache is not None
+        assert len(cache_manager.local_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_apply_invalidation_ignores_own_messages(
+        self,
+        cache_manager: CacheManager,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test a worker does not evict the value it just wrote."""
+        await cache_manager.set("key", 1)
+
+        cache_manager.apply_invalidation(mock_redis.publish.await_args.args[1])
+
+        assert cache_manager.local_cache is not None
+        assert cache_manager.local_cache.get("key") == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidation_listener(
+        self,
+        cache_manager: CacheManager,
+        mock_redis: MagicMock,
+    ) -> None:
+        """Test the listener applies messages published by other workers."""
+        await cache_manager.get("key")
+        pubsub = FakePubSub()
+        mock_redis.pubsub = MagicMock(return_value=pubsub)
+
+        cache_manager.start_invalidation_listener()
+        await pubsub.subscribed.wait()
+        await cache_manager.get("key")
+        await pubsub.messages.put(json.dumps({"origin": "other", "keys": ["key"]}))
+        await pubsub.messages.join()
+        await cache_manager.get("key")
+        await cache_manager.stop_invalidation_listener()
+
+        assert pubsub.channels == [INVALIDATION_CHANNEL]
+        # Cleared on subscribe, then evicted by the message
+        assert mock_redis.get.await_count == 3
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+class FakePubSub:
+    """Pub/sub connection fed from a queue."""
+
+    def __init__(self) -> None:
+        self.channels: list[str] = []
+        self.subscribed = asyncio.Event()
+        self.messages: asyncio.Queue[str] = asyncio.Queue()
+
+    async def __aenter__(self) -> "FakePubSub":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    async def subscribe(self, channel: str) -> None:
+        self.channels.append(channel)
+
+    async def listen(self):
+        self.subscribed.set()
+        yield {"type": "subscribe", "data": 1}
+        while True:
+            data = await self.messages.get()
+            yield {"type": "message", "data": data}
+            self.messages.task_done()
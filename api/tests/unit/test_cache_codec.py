@@ -0,0 +1,170 @@
+"""Unit tests for cache value codecs."""
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+import redis.asyncio as redis
+
+from src.core.cache import CacheManager, LocalCache
+from src.core.cache_codec import (
+    COMPRESSION_NONE,
+    COMPRESSION_ZLIB,
+    FORMAT_VERSION,
+    MAGIC,
+    CodecError,
+    JsonCodec,
+    MsgpackCodec,
+    create_codec,
+)
+
+
+class TestMsgpackCodec:
+    """Tests for the MessagePack codec."""
+
+    def test_round_trip_preserves_types(self) -> None:
+        """Test UUID, Decimal, date and datetime values keep their types."""
+        codec = MsgpackCodec()
+        value = {
+            "id": uuid4(),
+            "cost": Decimal("1234.50"),
+            "start": date(2026, 1, 5),
+            "updated": datetime(2026, 1, 5, 12, 30, tzinfo=UTC),
+            "rows": [{"float": 3, "critical": True, "name": None}],
+        }
+
+        assert codec.decode(codec.encode(value)) == value
+
+    def test_round_trip_numpy(self) -> None:
+        """Test arrays keep dtype and shape; scalars become Python numbers."""
+        codec = MsgpackCodec()
+        array = np.arange(12, dtype=np.float32).reshape(3, 4)
+
+        decoded = codec.decode(codec.encode({"matrix": array, "mean": np.float64(2.5)}))
+
+        np.testing.assert_array_equal(decoded["matrix"], array)
+        assert decoded["matrix"].dtype == np.float32
+        assert decoded["mean"] == 2.5
+        assert isinstance(decoded["mean"], float)
+
+    def test_unknown_types_stored_as_strings(self) -> None:
+        """Test types without a handler fall back to str, like JSON."""
+        codec = MsgpackCodec()
+
+        assert codec.decode(codec.encode({"path": object})) == {"path": str(object)}
+
+    def test_compresses_above_threshold(self) -> None:
+        """Test only frames from the threshold up are compressed."""
+        codec = MsgpackCodec(compress_min_bytes=1024)
+        small = codec.encode("x" * 10)
+        large = codec.encode(["activity"] * 1000)
+
+        assert small[: len(MAGIC) + 2] == MAGIC + bytes((FORMAT_VERSION, COMPRESSION_NONE))
+        assert large[: len(MAGIC) + 2] == MAGIC + bytes((FORMAT_VERSION, COMPRESSION_ZLIB))
+        assert len(large) < 1024
+        assert codec.decode(large) == ["activity"] * 1000
+
+    def test_smaller_than_json(self) -> None:
+        """Test a large schedule payload is much smaller than its JSON."""
+        rows = [
+            {"activity_id": uuid4(), "early_start": date(2026, 1, 5), "total_float": i}
+            for i in range(1000)
+        ]
+
+        assert len(MsgpackCodec().encode(rows)) * 3 < len(JsonCodec().encode(rows))
+
+    @pytest.mark.parametrize(
+        "data",
+        [
+            '{"foo": "bar"}',
+            b'{"foo": "bar"}',
+            MAGIC + bytes((FORMAT_VERSION + 1, COMPRESSION_NONE)) + b"\xc0",
+            MAGIC + bytes((FORMAT_VERSION, 9)) + b"\xc0",
+            MAGIC + bytes((FORMAT_VERSION, COMPRESSION_ZLIB)) + b"not zlib",
+            MAGIC + bytes((FORMAT_VERSION, COMPRESSION_NONE)) + b"\xc7\x01\x63x",
+        ],
+        ids=["json-str", "json-bytes", "version", "compression", "corrupt", "extension"],
+    )
+    def test_rejects_foreign_entries(self, data: bytes | str) -> None:
+        """Test entries of other codecs, versions or corrupt frames raise CodecError."""
+        with pytest.raises(CodecError):
+            MsgpackCodec().decode(data)
+
+
+class TestJsonCodec:
+    """Tests for the JSON codec."""
+
+    def test_round_trip_stringifies(self) -> None:
+        """Test values round-trip with unknown types as strings."""
+        codec = JsonCodec()
+
+        assert codec.decode(codec.encode({"start": date(2026, 1, 5)})) == {"start": "2026-01-05"}
+
+    def test_rejects_binary_entries(self) -> None:
+        """Test MessagePack frames raise CodecError."""
+        with pytest.raises(CodecError):
+            JsonCodec().decode(MsgpackCodec().encode({"foo": "bar"}))
+
+
+class TestCreateCodec:
+    """Tests for create_codec."""
+
+    def test_by_name(self) -> None:
+        """Test codecs are created by name with the compression threshold."""
+        codec = create_codec("msgpack", compress_min_bytes=10)
+
+        assert isinstance(codec, MsgpackCodec)
+        assert codec.compress_min_bytes == 10
+        assert isinstance(create_codec("json"), JsonCodec)
+
+    def test_unknown(self) -> None:
+        """Test unknown names are rejected."""
+        with pytest.raises(ValueError, match="Unknown cache codec"):
+            create_codec("pickle")
+
+
+class TestCacheManagerCodec:
+    """Tests for CacheManager with the MessagePack codec."""
+
+    @pytest.fixture
+    def mock_redis(self) -> MagicMock:
+        """Create a mock Redis client."""
+        mock = MagicMock(spec=redis.Redis)
+        mock.get = AsyncMock(return_value=None)
+        mock.setex = AsyncMock(return_value=True)
+        return mock
+
+    @pytest.mark.asyncio
+    async def test_set_and_get(self, mock_redis: MagicMock) -> None:
+        """Test values are stored as frames and read back with their types."""
+        manager = CacheManager(mock_redis, codec=MsgpackCodec())
+        value = {"id": uuid4(), "cost": Decimal("10.5")}
+
+        await manager.set("key", value, ttl=60)
+        stored = mock_redis.setex.await_args.args[2]
+        mock_redis.get.return_value = stored
+
+        assert stored.startswith(MAGIC)
+        assert await manager.get("key") == value
+
+    @pytest.mark.asyncio
+    async def test_legacy_entry_is_a_miss(self, mock_redis: MagicMock) -> None:
+        """Test entries written by another codec are ignored."""
+        mock_redis.get.return_value = b'{"foo": "bar"}'
+        manager = CacheManager(mock_redis, codec=MsgpackCodec())
+
+        assert await manager.get("key") is None
+
+    @pytest.mark.asyncio
+    async def test_local_cache_holds_decoded_value(self, mock_redis: MagicMock) -> None:
+        """Test the L1 copy matches what Redis readers decode."""
+        mock_redis.publish = AsyncMock(return_value=1)
+        manager = CacheManager(mock_redis, local_cache=LocalCache(), codec=MsgpackCodec())
+
+        await manager.set("key", {"rows": (1, 2)}, ttl=60)
+
+        assert await manager.get("key") == {"rows": [1, 2]}
+        mock_redis.get.assert_not_awaited()
@@ -1,11 +1,14 @@
 """Unit tests for cache service."""
 
+import asyncio
 from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+import redis.asyncio as redis
 
+from src.core.cache import CacheManager
 from src.services.cache_service import (
     CACHE_TTL,
     CacheService,
@@ -214,13 +217,14 @@ class TestCachedDecorator:
         """Test decorator caches result on miss."""
         call_count = 0
 
-        mock_manager = MagicMock()
-        mock_manager.is_available = True
-        mock_manager.get = AsyncMock(side_effect=[None, {"result": "cached"}])
-        mock_manager.set = AsyncMock(return_value=True)
+        mock_redis = MagicMock(spec=redis.Redis)
+        mock_redis.get = AsyncMock(side_effect=[None, '{"result": "cached"}'])
+        mock_redis.set = AsyncMock(return_value=True)
+        mock_redis.setex = AsyncMock(return_value=True)
+        mock_redis.eval = AsyncMock(return_value=1)
 
         # Patch the get_cache_service to return our mock
-        mock_service = CacheService(manager=mock_manager)
+        mock_service = CacheService(manager=CacheManager(mock_redis))
 
         with patch("src.services.cache_service.get_cache_service", return_value=mock_service):
 
@@ -270,7 +274,7 @@ class TestCachedDecorator:
         mock_manager = MagicMock()
         mock_manager.is_available = True
         mock_manager.get = AsyncMock(return_value=None)
-        mock_manager.set = AsyncMock(return_value=True)
+        mock_manager.fill = AsyncMock(side_effect=_compute)
 
         mock_service = CacheService(manager=mock_manager)
 
@@ -280,13 +284,39 @@ class TestCachedDecorator:
             async def test_func(self: object) -> str:
                 return "result"
 
-            await test_func(None)
+            assert await test_func(None) == "result"
 
-            # Verify set was called (cache key generation uses our prefix)
-            mock_manager.set.assert_called_once()
-            call_args = mock_manager.set.call_args
+            # Verify fill was called (cache key generation uses our prefix)
+            mock_manager.fill.assert_called_once()
+            call_args = mock_manager.fill.call_args
             assert "custom_prefix" in call_args[0][0]
 
+    @pytest.mark.asyncio
+    async def test_cached_concurrent_misses_call_once(self) -> None:
+        """Test concurrent misses on the same key run the function once."""
+        call_count = 0
+        mock_redis = MagicMock(spec=redis.Redis)
+        mock_redis.get = AsyncMock(return_value=None)
+        mock_redis.set = AsyncMock(return_value=True)
+        mock_redis.setex = AsyncMock(return_value=True)
+        mock_redis.eval = AsyncMock(return_value=1)
+        mock_service = CacheService(manager=CacheManager(mock_redis))
+
+        with patch("src.services.cache_service.get_cache_service", return_value=mock_service):
+
+            @cached(cache_name="test_cache")
+            async def test_func(self: object, arg1: str) -> dict:
+                nonlocal call_count
+                call_count += 1
+                await asyncio.sleep(0.01)
+                return {"result": arg1}
+
+            results = await asyncio.gather(*(test_func(None, "test") for _ in range(5)))
+
+        assert results == [{"result": "test"}] * 5
+        assert call_count == 1
+        mock_redis.setex.assert_awaited_once()
+
 
 class TestCacheTTL:
     """Tests for CACHE_TTL configuration."""
@@ -309,3 +339,8 @@ class TestCacheTTL:
             # At least 1 minute, at most 1 hour
             assert value >= timedelta(minutes=1), f"{key} TTL too short"
             assert value <= timedelta(hours=1), f"{key} TTL too long"
+
+
+async def _compute(key, compute, *args, **kwargs):
+    """CacheManager.fill stand-in that always computes."""
+    return await compute()
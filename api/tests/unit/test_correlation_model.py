@@ -1,15 +1,19 @@
 """Tests for activity correlation modeling."""
 
+from unittest.mock import patch
 from uuid import uuid4
 
 import numpy as np
 import pytest
+from scipy import stats
 
 from src.services.correlation_model import (
+    CholeskyFactorCache,
     CorrelatedSampler,
     CorrelationEntry,
     CorrelationMatrix,
     _get_parent_wbs,
+    factorize_correlation,
 )
 
 
@@ -315,6 +319,79 @@ class TestCorrelationMatrixValidation:
             matrix.get_correlation(a_id, uuid4())
 
 
+class TestBlockFactorization:
+    """Tests for block-wise Cholesky factorization and its cache."""
+
+    @staticmethod
+    def _wbs_matrix() -> CorrelationMatrix:
+        ids = [uuid4() for _ in range(9)]
+        wbs = ["1.1", "2.1", "1.1", "1.2", "", "2.1", "2.2", "1.2", "3"]
+        return CorrelationMatrix.from_wbs_hierarchy(
+            ids, {aid: path for aid, path in zip(ids, wbs, strict=True) if path}
+        )
+
+    def test_blocks_follow_parent_wbs(self):
+        """WBS correlation splits into one block per parent element."""
+        blocks = [members.tolist() for members in self._wbs_matrix().blocks()]
+
+        assert blocks == [[0, 2, 3, 7], [1, 5, 6], [4], [8]]
+
+    def test_block_factor_matches_dense_cholesky(self):
+        """Assembled block factors equal the dense factorization."""
+        matrix = self._wbs_matrix()
+
+        factor = factorize_correlation(matrix, CholeskyFactorCache())
+
+        dense = np.linalg.cholesky(matrix.matrix + np.eye(9) * 1e-10)
+        np.testing.assert_allclose(factor.dense(), dense, atol=1e-9)
+        normals = np.random.default_rng(0).standard_normal((50, 9))
+        np.testing.assert_allclose(factor.apply(normals), normals @ dense.T, atol=1e-9)
+
+    def test_non_positive_definite_block_is_adjusted(self):
+        """Invalid blocks are repaired like make_positive_definite."""
+        ids = [uuid4() for _ in range(4)]
+        values = np.eye(4)
+        values[:3, :3] = [[1.0, 0.9, -0.9], [0.9, 1.0, 0.9], [-0.9, 0.9, 1.0]]
+        matrix = CorrelationMatrix(activity_ids=ids, matrix=values)
+        assert not matrix.is_positive_definite()
+
+        factor = factorize_correlation(matrix, CholeskyFactorCache())
+
+        expected = np.linalg.cholesky(matrix.make_positive_definite().matrix)
+        np.testing.assert_allclose(factor.dense(), expected, atol=1e-9)
+
+    def test_repeated_structure_is_not_refactorized(self):
+        """Equal blocks and re-runs are served from the cache."""
+        cache = CholeskyFactorCache()
+        ids = [uuid4() for _ in range(6)]
+        wbs = dict(zip(ids, ["1.1", "1.1", "1.1", "2.1", "2.1", "2.1"], strict=True))
+        matrix = CorrelationMatrix.from_wbs_hierarchy(ids, wbs)
+
+        with patch(
+            "src.services.correlation_model.np.linalg.cholesky", wraps=np.linalg.cholesky
+        ) as cholesky:
+            factorize_correlation(matrix, cache)
+            factorize_correlation(matrix, cache)
+
+        # Two identical 3x3 blocks share one factorization
+        assert cholesky.call_count == 1
+        assert len(cache) == 1
+
+    def test_cache_evicts_least_recently_used(self):
+        """Entries beyond the byte budget are evicted oldest first."""
+        factor = np.eye(4)
+        cache = CholeskyFactorCache(max_bytes=2 * factor.nbytes)
+
+        cache.put("a", factor)
+        cache.put("b", factor)
+        assert cache.get("a") is not None
+        cache.put("c", factor)
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert len(cache) == 2
+
+
 class TestCorrelatedSampler:
     """Tests for correlated sample generation."""
 
@@ -388,6 +465,26 @@ class TestCorrelatedSampler:
 
         np.testing.assert_array_equal(samples1, samples2)
 
+    def test_parallel_samples_independent_of_worker_count(self):
+        """Block-seeded sampling gives the same matrix for any worker count."""
+        ids = [uuid4(), uuid4(), uuid4()]
+        matrix = CorrelationMatrix.from_entries(ids, [CorrelationEntry(ids[0], ids[1], 0.7)])
+        distributions = {
+            ids[0]: ("pert", {"min_value": 2, "mode": 4, "max_value": 12}),
+            ids[1]: ("triangular", {"min_value": 1, "mode": 3, "max_value": 6}),
+        }
+
+        single = CorrelatedSampler(matrix, seed=8).generate_samples(
+            3000, distributions, workers=1, block_size=700
+        )
+        multi = CorrelatedSampler(matrix, seed=8).generate_samples(
+            3000, distributions, workers=2, block_size=700
+        )
+
+        np.testing.assert_array_equal(single, multi)
+        assert single.shape == (3000, 3)
+        assert abs(np.corrcoef(single[:, 0], single[:, 1])[0, 1] - 0.7) < 0.05
+
 
 class TestCorrelatedSamplerTransform:
     """Tests for distribution transformation."""
@@ -508,6 +605,73 @@ class TestCorrelatedSamplerTransform:
         # All samples should be the constant value
         np.testing.assert_array_equal(samples, 10)
 
+    def test_closed_form_transforms_match_scipy(self):
+        """Triangular, uniform and normal transforms equal scipy's ppf(cdf(z))."""
+        ids = [uuid4(), uuid4(), uuid4()]
+        sampler = CorrelatedSampler(CorrelationMatrix.identity(ids), seed=3)
+        normals = sampler.generate_correlated_samples(5000)
+
+        samples = sampler.transform_to_distributions(
+            normals,
+            {
+                ids[0]: ("triangular", {"min_value": 5, "mode": 8, "max_value": 20}),
+                ids[1]: ("uniform", {"min_value": 2, "max_value": 9}),
+                ids[2]: ("normal", {"mean": 50, "std": 5}),
+            },
+        )
+
+        uniform = stats.norm.cdf(normals)
+        np.testing.assert_allclose(
+            samples[:, 0], stats.triang.ppf(uniform[:, 0], 0.2, loc=5, scale=15), atol=1e-9
+        )
+        np.testing.assert_allclose(
+            samples[:, 1], stats.uniform.ppf(uniform[:, 1], loc=2, scale=7), atol=1e-9
+        )
+        np.testing.assert_allclose(
+            samples[:, 2], stats.norm.ppf(uniform[:, 2], loc=50, scale=5), atol=1e-6
+        )
+
+    @pytest.mark.parametrize("n_samples", [200, 5000])
+    def test_pert_within_documented_tolerance(self, n_samples):
+        """Tabulated and direct PERT quantiles stay within 2e-5 of the range."""
+        ids = [uuid4() for _ in range(4)]
+        modes = [5, 6, 12, 20]
+        sampler = CorrelatedSampler(CorrelationMatrix.identity(ids), seed=4)
+        normals = sampler.generate_correlated_samples(n_samples)
+        distributions = {
+            aid: ("pert", {"min_value": 5, "mode": mode, "max_value": 20})
+            for aid, mode in zip(ids, modes, strict=True)
+        }
+
+        samples = sampler.transform_to_distributions(normals, distributions)
+
+        uniform = stats.norm.cdf(normals)
+        for j, mode in enumerate(modes):
+            alpha = 1 + 4 * (mode - 5) / 15
+            beta = 1 + 4 * (20 - mode) / 15
+            expected = 5 + stats.beta.ppf(uniform[:, j], alpha, beta) * 15
+            np.testing.assert_allclose(samples[:, j], expected, atol=2e-5 * 15)
+
+    def test_shared_pert_shapes_and_degenerate_ranges(self):
+        """Activities with the same PERT shape share a table; empty ranges are constant."""
+        ids = [uuid4() for _ in range(3)]
+        sampler = CorrelatedSampler(CorrelationMatrix.identity(ids), seed=5)
+        normals = sampler.generate_correlated_samples(2000)
+        normals[:, 1] = normals[:, 0]
+
+        samples = sampler.transform_to_distributions(
+            normals,
+            {
+                ids[0]: ("pert", {"min_value": 0, "mode": 1, "max_value": 4}),
+                ids[1]: ("pert", {"min_value": 10, "mode": 20, "max_value": 50}),
+                ids[2]: ("pert", {"min_value": 7, "mode": 7, "max_value": 7}),
+            },
+        )
+
+        # Same (alpha, beta): columns differ only by location and scale
+        np.testing.assert_allclose((samples[:, 1] - 10) / 40, samples[:, 0] / 4, atol=2e-5)
+        np.testing.assert_array_equal(samples[:, 2], 7)
+
     def test_generate_samples_convenience(self):
         """Test the convenience method that combines steps."""
         a_id, b_id = uuid4(), uuid4()
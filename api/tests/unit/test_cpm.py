@@ -7,7 +7,7 @@ import pytest
 from src.core.exceptions import CircularDependencyError
 from src.models.activity import Activity
 from src.models.dependency import Dependency, DependencyType
-from src.services.cpm import CPMEngine
+from src.services.cpm import CPMEngine, schedule_results_to_schema
 
 
 class TestCPMForwardPass:
@@ -292,3 +292,24 @@ class TestCPMCriticalPath:
         assert len(critical_path) == 2
         assert critical_path[0] == activities[0].id
         assert critical_path[1] == activities[1].id
+
+
+class TestScheduleResultsToSchema:
+    """Tests for converting CPM results to their API form."""
+
+    def test_converts_every_result(self):
+        """Should keep dates, float and criticality of each activity."""
+        program_id = uuid4()
+        activities = [
+            Activity(id=uuid4(), program_id=program_id, name="A", code="A", duration=5),
+            Activity(id=uuid4(), program_id=program_id, name="B", code="B", duration=3),
+        ]
+        results = CPMEngine(activities, []).calculate()
+
+        schemas = {s.activity_id: s for s in schedule_results_to_schema(results)}
+
+        assert set(schemas) == set(results)
+        for activity_id, result in results.items():
+            assert schemas[activity_id].early_finish == result.early_finish
+            assert schemas[activity_id].total_float == result.total_float
+            assert schemas[activity_id].is_critical == result.is_critical
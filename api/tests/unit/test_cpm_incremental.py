@@ -0,0 +1,259 @@
+"""Unit tests for incremental CPM recalculation."""
+
+import random
+from dataclasses import dataclass
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.core.exceptions import CircularDependencyError
+from src.services.cpm import CPMEngine
+from src.services.cpm_incremental import IncrementalCPMEngine, ScheduleStateStore
+
+
+@dataclass
+class MockActivity:
+    """Minimal activity for incremental CPM tests."""
+
+    id: UUID
+    duration: int
+
+
+@dataclass
+class MockDependency:
+    """Minimal dependency for incremental CPM tests."""
+
+    predecessor_id: UUID
+    successor_id: UUID
+    dependency_type: str = "FS"
+    lag: int = 0
+
+
+def _random_network(
+    rng: random.Random, count: int = 40
+) -> tuple[list[MockActivity], dict[tuple[UUID, UUID], MockDependency]]:
+    """Build a random DAG with mixed dependency types and lags."""
+    acts = [MockActivity(uuid4(), rng.randint(0, 10)) for _ in range(count)]
+    deps: dict[tuple[UUID, UUID], MockDependency] = {}
+    for j in range(1, count):
+        for i in rng.sample(range(j), k=min(j, rng.randint(0, 3))):
+            key = (acts[i].id, acts[j].id)
+            deps[key] = MockDependency(
+                *key, rng.choice(["FS", "FS", "SS", "FF", "SF"]), rng.randint(-2, 3)
+            )
+    return acts, deps
+
+
+def _assert_matches_full(
+    engine: IncrementalCPMEngine,
+    activities: list[MockActivity],
+    dependencies: list[MockDependency],
+) -> None:
+    """Incremental state must equal a fresh CPMEngine run."""
+    expected = CPMEngine(activities, dependencies).calculate()
+    assert engine.results == expected
+    assert engine.project_duration == max(r.early_finish for r in expected.values())
+
+
+class TestIncrementalEdits:
+    """Tests for single-edit incremental updates."""
+
+    def test_duration_change_returns_only_changed(self):
+        """Only activities whose values changed are returned."""
+        a, b, c = (MockActivity(uuid4(), d) for d in (5, 3, 10))
+        deps = [MockDependency(a.id, b.id)]
+        engine = IncrementalCPMEngine([a, b, c], deps)
+
+        # C is critical and drives the project end; growing A within its float
+        changed = engine.set_duration(a.id, 6)
+
+        assert set(changed) == {a.id, b.id}
+        assert changed[b.id].early_start == 6
+        assert changed[b.id].total_float == 1
+        assert engine.project_duration == 10
+
+    def test_unchanged_duration_is_noop(self):
+        """Setting the same duration returns nothing."""
+        a = MockActivity(uuid4(), 5)
+        engine = IncrementalCPMEngine([a], [])
+
+        assert engine.set_duration(a.id, 5) == {}
+
+    def test_project_end_change_updates_all_late_dates(self):
+        """Moving the project end shifts late dates of unrelated activities."""
+        a, b, c = (MockActivity(uuid4(), d) for d in (5, 3, 2))
+        deps = [MockDependency(a.id, b.id)]
+        engine = IncrementalCPMEngine([a, b, c], deps)
+
+        changed = engine.set_duration(b.id, 6)
+
+        assert c.id in changed
+        assert changed[c.id].late_finish == 11
+        b.duration = 6
+        _assert_matches_full(engine, [a, b, c], deps)
+
+    def test_add_and_remove_dependency(self):
+        """Adding then removing an edge restores the original schedule."""
+        a, b = MockActivity(uuid4(), 4), MockActivity(uuid4(), 2)
+        engine = IncrementalCPMEngine([a, b], [])
+        original = dict(engine.results)
+
+        changed = engine.set_dependency(a.id, b.id, "SS", 1)
+        assert changed[b.id].early_start == 1
+
+        engine.remove_dependency(a.id, b.id)
+        assert engine.results == original
+
+    def test_out_of_order_edge_reorders(self):
+        """An edge against the current topological order is accepted."""
+        a, b = MockActivity(uuid4(), 4), MockActivity(uuid4(), 2)
+        engine = IncrementalCPMEngine([a, b], [])
+
+        engine.set_dependency(b.id, a.id)
+
+        _assert_matches_full(engine, [a, b], [MockDependency(b.id, a.id)])
+
+    def test_cycle_is_rejected_without_mutation(self):
+        """An edge closing a cycle raises and leaves the state unchanged."""
+        acts = [MockActivity(uuid4(), 1) for _ in range(3)]
+        a, b, c = (x.id for x in acts)
+        deps = [MockDependency(a, b), MockDependency(b, c)]
+        engine = IncrementalCPMEngine(acts, deps)
+        before = dict(engine.results)
+
+        with pytest.raises(CircularDependencyError) as exc_info:
+            engine.set_dependency(c, a)
+
+        assert exc_info.value.cycle_path == [c, a, b, c]
+        assert engine.results == before
+        with pytest.raises(CircularDependencyError):
+            engine.set_dependency(a, a)
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_edits_match_full_recalculation(self, seed):
+        """Random edit sequences agree with a full CPM run after every edit."""
+        rng = random.Random(seed)
+        acts, deps = _random_network(rng)
+        engine = IncrementalCPMEngine(acts, list(deps.values()))
+
+        for _ in range(60):
+            op = rng.random()
+            if op < 0.4:
+                act = rng.choice(acts)
+                act.duration = rng.randint(0, 12)
+                engine.set_duration(act.id, act.duration)
+            elif op < 0.7 or not deps:
+                u, v = rng.sample(acts, 2)
+                dep = MockDependency(u.id, v.id, rng.choice(["FS", "SS", "FF", "SF"]), 1)
+                try:
+                    engine.set_dependency(u.id, v.id, dep.dependency_type, dep.lag)
+                except CircularDependencyError:
+                    continue
+                deps[(u.id, v.id)] = dep
+            else:
+                key = rng.choice(list(deps))
+                del deps[key]
+                engine.remove_dependency(*key)
+
+            _assert_matches_full(engine, acts, list(deps.values()))
+
+
+class TestApplySnapshot:
+    """Tests for diffing a reloaded program against stored state."""
+
+    def test_snapshot_diff_matches_full_recalculation(self):
+        """Several edits in one snapshot are applied incrementally."""
+        rng = random.Random(42)
+        acts, deps = _random_network(rng)
+        engine = IncrementalCPMEngine(acts, list(deps.values()))
+        before = dict(engine.results)
+
+        acts[3].duration += 4
+        removed = next(iter(deps))
+        del deps[removed]
+        last = next(reversed(deps.values()))
+        last.lag += 2
+
+        changed, full = engine.apply_snapshot(acts, list(deps.values()))
+
+        assert not full
+        _assert_matches_full(engine, acts, list(deps.values()))
+        assert set(changed) == {aid for aid, r in engine.results.items() if before[aid] != r}
+
+    def test_activity_set_change_triggers_full_recalculation(self):
+        """Adding an activity solves the network from scratch."""
+        a = MockActivity(uuid4(), 3)
+        engine = IncrementalCPMEngine([a], [])
+        b = MockActivity(uuid4(), 2)
+
+        changed, full = engine.apply_snapshot([a, b], [MockDependency(a.id, b.id)])
+
+        assert full
+        assert set(changed) == {b.id}
+        assert engine.results[b.id].early_start == 3
+
+
+class TestScheduleStateStore:
+    """Tests for the per-program engine store."""
+
+    def test_first_call_is_full_then_incremental(self):
+        """The store solves once and then returns deltas."""
+        store = ScheduleStateStore()
+        program_id = uuid4()
+        a = MockActivity(uuid4(), 3)
+
+        _, changed, full = store.recalculate(program_id, [a], [])
+        assert full
+        assert set(changed) == {a.id}
+
+        _, changed, full = store.recalculate(program_id, [a], [])
+        assert not full
+        assert changed == {}
+
+    def test_get_current_matches_revision(self):
+        """Only an engine solved at the requested revision is current."""
+        store = ScheduleStateStore()
+        program_id = uuid4()
+        a = MockActivity(uuid4(), 3)
+
+        engine, _, _ = store.recalculate(program_id, [a], [], revision=4)
+
+        assert store.get_current(program_id, 4) is engine
+        assert store.get_current(program_id, 5) is None
+
+        store.recalculate(program_id, [a], [], revision=5)
+        assert store.get_current(program_id, 5) is engine
+
+        store.discard(program_id)
+        assert store.get_current(program_id, 5) is None
+
+    def test_lru_eviction(self):
+        """Least recently used programs are evicted beyond capacity."""
+        store = ScheduleStateStore(max_programs=2)
+        p1, p2, p3 = uuid4(), uuid4(), uuid4()
+        a = MockActivity(uuid4(), 1)
+
+        store.recalculate(p1, [a], [])
+        store.recalculate(p2, [a], [])
+        store.get(p1)
+        store.recalculate(p3, [a], [])
+
+        assert len(store) == 2
+        assert store.get(p2) is None
+        assert store.get(p1) is not None
+
+    def test_cycle_discards_state(self):
+        """A cyclic snapshot raises and drops the stored engine."""
+        store = ScheduleStateStore()
+        program_id = uuid4()
+        a, b = MockActivity(uuid4(), 1), MockActivity(uuid4(), 1)
+        store.recalculate(program_id, [a, b], [MockDependency(a.id, b.id)])
+
+        with pytest.raises(CircularDependencyError):
+            store.recalculate(
+                program_id,
+                [a, b],
+                [MockDependency(a.id, b.id), MockDependency(b.id, a.id)],
+            )
+
+        assert store.get(program_id) is None
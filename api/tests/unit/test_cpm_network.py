@@ -0,0 +1,231 @@
+"""Unit tests for the compiled CPM network representation."""
+
+from dataclasses import dataclass
+from itertools import pairwise
+from uuid import UUID, uuid4
+
+import numpy as np
+
+from src.models.enums import DependencyType
+from src.services.cpm import CPMEngine
+from src.services.cpm_network import (
+    DEP_FF,
+    DEP_FS,
+    DEP_SF,
+    DEP_SS,
+    compile_network,
+    dependency_type_code,
+)
+
+
+@dataclass
+class MockActivity:
+    """Minimal activity for network tests."""
+
+    id: UUID
+    duration: int
+
+
+@dataclass
+class MockDependency:
+    """Minimal dependency for network tests."""
+
+    predecessor_id: UUID
+    successor_id: UUID
+    dependency_type: str
+    lag: int = 0
+
+
+class TestDependencyTypeCode:
+    """Tests for dependency type code mapping."""
+
+    def test_maps_enum_and_string_values(self):
+        """Enum members and their string values map to the same code."""
+        assert dependency_type_code(DependencyType.FS) == DEP_FS
+        assert dependency_type_code("SS") == DEP_SS
+        assert dependency_type_code(DependencyType.FF) == DEP_FF
+        assert dependency_type_code("SF") == DEP_SF
+
+    def test_unknown_type_defaults_to_fs(self):
+        """Unknown dependency types are treated as FS."""
+        assert dependency_type_code("XX") == DEP_FS
+
+
+class TestCompileNetwork:
+    """Tests for compile_network CSR construction."""
+
+    def test_csr_arrays_group_edges_by_node(self):
+        """Predecessor and successor arrays are grouped per node."""
+        a, b, c = uuid4(), uuid4(), uuid4()
+        deps = [
+            MockDependency(a, c, "FS", 2),
+            MockDependency(b, c, "SS", 1),
+            MockDependency(a, b, "FF", 0),
+        ]
+
+        network = compile_network([a, b, c], deps)
+
+        assert network.size == 3
+        assert network.edge_count == 3
+        # C (index 2) has predecessors A and B
+        start, end = network.pred_ptr[2], network.pred_ptr[3]
+        assert sorted(network.pred_idx[start:end].tolist()) == [0, 1]
+        # A (index 0) has successors B and C
+        start, end = network.succ_ptr[0], network.succ_ptr[1]
+        succs = dict(
+            zip(
+                network.succ_idx[start:end].tolist(),
+                network.succ_lag[start:end].tolist(),
+                strict=True,
+            )
+        )
+        assert succs == {1: 0, 2: 2}
+        assert network.order.tolist() == [0, 1, 2]
+        assert not network.has_cycle
+
+    def test_duplicate_edges_keep_last_definition(self):
+        """Repeated predecessor/successor pairs collapse to the last one."""
+        a, b = uuid4(), uuid4()
+        deps = [MockDependency(a, b, "FS", 1), MockDependency(a, b, "SS", 4)]
+
+        network = compile_network([a, b], deps)
+
+        assert network.edge_count == 1
+        assert network.pred_type.tolist() == [DEP_SS]
+        assert network.pred_lag.tolist() == [4]
+
+    def test_backward_edges_are_sorted(self):
+        """Activities listed after their successors are still ordered correctly."""
+        a, b, c = uuid4(), uuid4(), uuid4()
+        deps = [MockDependency(c, b, "FS"), MockDependency(b, a, "FS")]
+
+        network = compile_network([a, b, c], deps)
+
+        assert network.order.tolist() == [2, 1, 0]
+        assert network.index == {a: 0, b: 1, c: 2}
+
+    def test_edges_to_unknown_activities_are_ignored(self):
+        """Dependencies referencing activities outside the set are dropped."""
+        a, b = uuid4(), uuid4()
+        deps = [MockDependency(a, b, "FS"), MockDependency(a, uuid4(), "FS")]
+
+        network = compile_network([a, b], deps)
+
+        assert network.edge_count == 1
+
+    def test_cycle_is_reported_in_edge_order(self):
+        """A cycle is returned as a closed path that follows edge direction."""
+        a, b, c, d = uuid4(), uuid4(), uuid4(), uuid4()
+        deps = [
+            MockDependency(d, a, "FS"),
+            MockDependency(a, b, "FS"),
+            MockDependency(b, c, "FS"),
+            MockDependency(c, a, "FS"),
+        ]
+
+        network = compile_network([a, b, c, d], deps)
+
+        assert network.has_cycle
+        cycle = network.cycle
+        assert cycle[0] == cycle[-1]
+        assert set(cycle) == {a, b, c}
+        edges = {(dep.predecessor_id, dep.successor_id) for dep in deps}
+        assert all((u, v) in edges for u, v in pairwise(cycle))
+
+    def test_empty_network(self):
+        """An empty network compiles to empty arrays."""
+        network = compile_network([], [])
+
+        assert network.size == 0
+        assert network.edge_count == 0
+        assert network.pred_ptr.tolist() == [0]
+
+
+class TestLevelSchedule:
+    """Tests for the level-scheduled view of a network."""
+
+    def test_nodes_grouped_by_longest_path_depth(self):
+        """Depth is the longest edge count from a source node."""
+        a, b, c, d = uuid4(), uuid4(), uuid4(), uuid4()
+        deps = [
+            MockDependency(a, b, "FS"),
+            MockDependency(b, c, "SS"),
+            MockDependency(a, c, "FF"),
+            MockDependency(a, d, "FS"),
+        ]
+
+        levels = compile_network([a, b, c, d], deps).levels
+
+        assert levels.depth.tolist() == [0, 1, 2, 1]
+        assert [lvl.nodes.tolist() for lvl in levels.forward] == [[1, 3], [2]]
+        # Backward skips nodes without successors and runs deepest first
+        assert [lvl.nodes.tolist() for lvl in levels.backward] == [[1], [0]]
+
+    def test_level_edges_are_segmented_per_node(self):
+        """Each node's incoming edges form one reduceat segment."""
+        a, b, c, d = uuid4(), uuid4(), uuid4(), uuid4()
+        deps = [
+            MockDependency(a, c, "FS"),
+            MockDependency(b, c, "FS"),
+            MockDependency(b, d, "FS"),
+        ]
+
+        network = compile_network([a, b, c, d], deps)
+        (level,) = network.levels.forward
+
+        assert level.nodes.tolist() == [2, 3]
+        assert level.offsets.tolist() == [0, 2]
+        assert level.edge_nodes.tolist() == [2, 2, 3]
+        assert network.pred_idx[level.edges].tolist() == [0, 1, 1]
+
+    def test_empty_network_has_no_levels(self):
+        """An empty network schedules no steps."""
+        levels = compile_network([], []).levels
+
+        assert levels.forward == []
+        assert levels.backward == []
+
+
+class TestCompiledEngineEquivalence:
+    """CPMEngine results on mixed networks match hand-computed values."""
+
+    def test_mixed_dependency_types_with_lags(self):
+        """All four dependency types with leads and lags."""
+        acts = [MockActivity(uuid4(), d) for d in (5, 3, 4, 2, 6)]
+        a, b, c, d, e = (x.id for x in acts)
+        deps = [
+            MockDependency(a, b, "SS", 2),  # B.ES >= A.ES + 2 = 2
+            MockDependency(a, c, "FF", 1),  # C.EF >= A.EF + 1 = 6 -> C.ES = 2
+            MockDependency(b, d, "SF", 6),  # D.EF >= B.ES + 6 = 8 -> D.ES = 6
+            MockDependency(c, e, "FS", -1),  # E.ES >= C.EF - 1 = 5
+            MockDependency(d, e, "FS", 0),  # E.ES >= D.EF = 8
+        ]
+
+        result = CPMEngine(acts, deps).calculate()
+
+        assert [result[x].early_start for x in (a, b, c, d, e)] == [0, 2, 2, 6, 8]
+        assert result[e].early_finish == 14
+        assert result[e].total_float == 0
+        assert result[d].total_float == 0
+        assert result[c].total_float == 3
+        # C's only FS successor is E: free float = (8 - (-1)) - 6
+        assert result[c].free_float == 3
+
+    def test_float_durations_are_preserved(self):
+        """Non-integer durations (Monte Carlo samples) flow through unchanged."""
+        acts = [MockActivity(uuid4(), 2.5), MockActivity(uuid4(), 1.25)]
+        deps = [MockDependency(acts[0].id, acts[1].id, "FS")]
+
+        result = CPMEngine(acts, deps).calculate()
+
+        assert result[acts[1].id].early_start == 2.5
+        assert result[acts[1].id].early_finish == 3.75
+        assert result[acts[0].id].is_critical
+
+    def test_network_arrays_are_numpy(self):
+        """Compiled arrays are NumPy arrays usable by vectorized engines."""
+        acts = [MockActivity(uuid4(), 1), MockActivity(uuid4(), 1)]
+        engine = CPMEngine(acts, [MockDependency(acts[0].id, acts[1].id, "FS")])
+
+        assert isinstance(engine.network.pred_idx, np.ndarray)
+        assert isinstance(engine.network.order, np.ndarray)
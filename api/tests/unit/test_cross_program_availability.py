@@ -7,6 +7,7 @@ from uuid import uuid4
 
 import pytest
 
+from src.models.resource_load import ResourceLoadSegment
 from src.services.cross_program_availability import (
     CrossProgramAvailabilityService,
     CrossProgramConflict,
@@ -14,6 +15,26 @@ from src.services.cross_program_availability import (
 )
 
 
+def _segment(
+    start_date: date,
+    finish_date: date,
+    units: Decimal,
+    program_id=None,
+    *,
+    assignment_count: int = 1,
+    resource_id=None,
+) -> ResourceLoadSegment:
+    """Create a load index segment."""
+    return ResourceLoadSegment(
+        resource_id=resource_id or uuid4(),
+        program_id=program_id or uuid4(),
+        start_date=start_date,
+        finish_date=finish_date,
+        units=units,
+        assignment_count=assignment_count,
+    )
+
+
 class TestCrossProgramConflict:
     """Tests for CrossProgramConflict dataclass."""
 
@@ -366,18 +387,14 @@ class TestCrossProgramAvailabilityServiceCheckResourceConflict:
         mock_resource.name = "Engineer"
         mock_resource.capacity_per_day = Decimal("8")
 
-        # Existing assignment using 6 hours
-        mock_activity = MagicMock()
-        mock_activity.program_id = other_program_id
-        mock_activity.early_start = date(2026, 1, 1)
-        mock_activity.early_finish = date(2026, 1, 3)
-
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = uuid4()
-        mock_assignment.activity = mock_activity
-        mock_assignment.start_date = date(2026, 1, 1)
-        mock_assignment.finish_date = date(2026, 1, 3)
-        mock_assignment.units = Decimal("0.75")  # 75% = 6 hours
+        # Existing load of 6 hours from another program
+        segment = _segment(
+            date(2026, 1, 1),
+            date(2026, 1, 3),
+            Decimal("0.75"),  # 75% = 6 hours
+            program_id=other_program_id,
+            resource_id=resource_id,
+        )
 
         # Setup db mock
         call_count = [0]
@@ -387,7 +404,7 @@ class TestCrossProgramAvailabilityServiceCheckResourceConflict:
             if call_count[0] == 0:
                 result.scalar_one_or_none.return_value = mock_resource
             else:
-                result.scalars.return_value.all.return_value = [mock_assignment]
+                result.scalars.return_value.all.return_value = [segment]
             call_count[0] += 1
             return result
 
@@ -404,6 +421,43 @@ class TestCrossProgramAvailabilityServiceCheckResourceConflict:
 
         # Should have conflicts for each day
         assert len(conflicts) == 3  # Jan 1, 2, 3
+        assert conflicts[0].total_assigned == Decimal("10")
+        assert conflicts[0].programs_involved == [
+            {"program_id": str(other_program_id), "assigned_hours": 6.0},
+            {"program_id": str(program_id), "assigned_hours": 4.0},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_check_resource_conflict_only_overlapping_days(self, service, mock_db):
+        """Test conflicts are limited to days where the existing load overlaps."""
+        resource_id = uuid4()
+
+        mock_resource = MagicMock()
+        mock_resource.id = resource_id
+        mock_resource.name = "Engineer"
+        mock_resource.capacity_per_day = Decimal("8")
+
+        segment = _segment(
+            date(2026, 1, 2), date(2026, 1, 10), Decimal("0.6"), resource_id=resource_id
+        )
+
+        first = MagicMock()
+        first.scalar_one_or_none.return_value = mock_resource
+        second = MagicMock()
+        second.scalars.return_value.all.return_value = [segment]
+        mock_db.execute = AsyncMock(side_effect=[first, second])
+
+        conflicts = await service.check_resource_conflict(
+            resource_id,
+            uuid4(),
+            date(2026, 1, 1),
+            date(2026, 1, 3),
+            Decimal("0.5"),
+        )
+
+        assert [c.conflict_date for c in conflicts] == [date(2026, 1, 2), date(2026, 1, 3)]
+        assert conflicts[0].overallocation == Decimal("0.8")
+        assert mock_db.execute.await_count == 2
 
 
 class TestCrossProgramAvailabilityServiceInternalMethods:
@@ -419,69 +473,59 @@ class TestCrossProgramAvailabilityServiceInternalMethods:
         """Create service with mock db."""
         return CrossProgramAvailabilityService(mock_db)
 
-    @pytest.mark.asyncio
-    async def test_get_cross_program_assignments(self, service, mock_db):
-        """Test fetching cross-program assignments."""
-        resource_id = uuid4()
-        program_id = uuid4()
-
-        mock_activity = MagicMock()
-        mock_activity.program_id = program_id
-        mock_activity.early_start = date(2026, 1, 5)
-        mock_activity.early_finish = date(2026, 1, 10)
+    @pytest.fixture
+    def mock_resource(self):
+        """Create mock resource with 8 hour capacity."""
+        resource = MagicMock()
+        resource.id = uuid4()
+        resource.name = "Engineer"
+        resource.capacity_per_day = Decimal("8")
+        return resource
 
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = uuid4()
-        mock_assignment.activity = mock_activity
-        mock_assignment.start_date = date(2026, 1, 5)
-        mock_assignment.finish_date = date(2026, 1, 10)
-        mock_assignment.units = Decimal("1.0")
+    @pytest.mark.asyncio
+    async def test_get_load_segments(self, service, mock_db):
+        """Test segments are grouped by resource from one query."""
+        first_id = uuid4()
+        second_id = uuid4()
+        segments = [
+            _segment(date(2026, 1, 5), date(2026, 1, 10), Decimal("1.0"), resource_id=first_id),
+            _segment(date(2026, 1, 6), date(2026, 1, 8), Decimal("0.5"), resource_id=second_id),
+            _segment(date(2026, 1, 12), date(2026, 1, 20), Decimal("0.5"), resource_id=first_id),
+        ]
 
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [mock_assignment]
+        mock_result.scalars.return_value.all.return_value = segments
         mock_db.execute.return_value = mock_result
 
-        assignments = await service._get_cross_program_assignments(
-            resource_id,
+        result = await service._get_load_segments(
+            [first_id, second_id],
             date(2026, 1, 1),
             date(2026, 1, 31),
         )
 
-        assert len(assignments) == 1
-        assert assignments[0]["program_id"] == program_id
-        assert assignments[0]["units"] == Decimal("1.0")
+        assert result[first_id] == [segments[0], segments[2]]
+        assert result[second_id] == [segments[1]]
+        mock_db.execute.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_detect_conflicts_no_overlap(self, service, mock_db):
-        """Test no conflicts when assignments don't overlap."""
-        resource_id = uuid4()
+    async def test_get_load_segments_without_resources(self, service, mock_db):
+        """Test no query is made for an empty resource list."""
+        result = await service._get_load_segments([], date(2026, 1, 1), date(2026, 1, 31))
 
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.name = "Engineer"
-        mock_resource.capacity_per_day = Decimal("8")
+        assert result == {}
+        mock_db.execute.assert_not_called()
 
-        # Two assignments on different days
-        assignments = [
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 1),
-                "end_date": date(2026, 1, 1),
-                "units": Decimal("1.0"),
-            },
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 3),
-                "end_date": date(2026, 1, 3),
-                "units": Decimal("1.0"),
-            },
+    @pytest.mark.asyncio
+    async def test_detect_conflicts_no_overlap(self, service, mock_resource):
+        """Test no conflicts when loads don't overlap."""
+        segments = [
+            _segment(date(2026, 1, 1), date(2026, 1, 1), Decimal("1.0")),
+            _segment(date(2026, 1, 3), date(2026, 1, 3), Decimal("1.0")),
         ]
 
         conflicts = await service._detect_conflicts(
             mock_resource,
-            assignments,
+            segments,
             date(2026, 1, 1),
             date(2026, 1, 5),
         )
@@ -489,36 +533,20 @@ class TestCrossProgramAvailabilityServiceInternalMethods:
         assert len(conflicts) == 0
 
     @pytest.mark.asyncio
-    async def test_detect_conflicts_with_overlap(self, service, mock_db):
-        """Test conflicts detected when assignments overlap and exceed capacity."""
-        resource_id = uuid4()
-
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.name = "Engineer"
-        mock_resource.capacity_per_day = Decimal("8")
-
-        # Two 60% assignments on same day = 120% > 100%
-        assignments = [
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 1),
-                "end_date": date(2026, 1, 1),
-                "units": Decimal("0.6"),
-            },
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 1),
-                "end_date": date(2026, 1, 1),
-                "units": Decimal("0.6"),
-            },
+    async def test_detect_conflicts_with_overlap(self, service, mock_resource):
+        """Test conflicts detected when programs overlap and exceed capacity."""
+        first_program = uuid4()
+        second_program = uuid4()
+
+        # Two 60% loads on same day = 120% > 100%
+        segments = [
+            _segment(date(2026, 1, 1), date(2026, 1, 1), Decimal("0.6"), first_program),
+            _segment(date(2026, 1, 1), date(2026, 1, 1), Decimal("0.6"), second_program),
         ]
 
         conflicts = await service._detect_conflicts(
             mock_resource,
-            assignments,
+            segments,
             date(2026, 1, 1),
             date(2026, 1, 1),
         )
@@ -528,33 +556,18 @@ class TestCrossProgramAvailabilityServiceInternalMethods:
         # 0.6 * 8 + 0.6 * 8 = 9.6 > 8
         assert conflicts[0].total_assigned == Decimal("9.6")
         assert conflicts[0].overallocation == Decimal("1.6")
+        assert conflicts[0].programs_involved == [
+            {"program_id": str(first_program), "assigned_hours": 4.8},
+            {"program_id": str(second_program), "assigned_hours": 4.8},
+        ]
 
     @pytest.mark.asyncio
-    async def test_detect_conflicts_with_allocation_percentage(self, service, mock_db):
+    async def test_detect_conflicts_with_allocation_percentage(self, service, mock_resource):
         """Test conflicts consider pool allocation percentage."""
-        resource_id = uuid4()
-
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.name = "Engineer"
-        mock_resource.capacity_per_day = Decimal("8")
-
-        # Two 40% assignments on same day
-        assignments = [
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 1),
-                "end_date": date(2026, 1, 1),
-                "units": Decimal("0.4"),
-            },
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 1),
-                "end_date": date(2026, 1, 1),
-                "units": Decimal("0.4"),
-            },
+        # Two 40% loads on same day
+        segments = [
+            _segment(date(2026, 1, 1), date(2026, 1, 1), Decimal("0.4")),
+            _segment(date(2026, 1, 1), date(2026, 1, 1), Decimal("0.4")),
         ]
 
         # Pool only has 50% allocation of this resource
@@ -562,7 +575,7 @@ class TestCrossProgramAvailabilityServiceInternalMethods:
         # Total assigned = 0.4 * 8 + 0.4 * 8 = 6.4 hours > 4 hours
         conflicts = await service._detect_conflicts(
             mock_resource,
-            assignments,
+            segments,
             date(2026, 1, 1),
             date(2026, 1, 1),
             allocation_percentage=Decimal("50.00"),
@@ -572,27 +585,32 @@ class TestCrossProgramAvailabilityServiceInternalMethods:
         assert conflicts[0].available_hours == Decimal("4.0")
 
     @pytest.mark.asyncio
-    async def test_detect_conflicts_single_assignment_no_conflict(self, service, mock_db):
-        """Test single assignment never causes conflict (needs 2+ to conflict)."""
-        mock_resource = MagicMock()
-        mock_resource.id = uuid4()
-        mock_resource.name = "Engineer"
-        mock_resource.capacity_per_day = Decimal("8")
+    async def test_detect_conflicts_at_exact_capacity(self, service, mock_resource):
+        """Test a load equal to the pool allocation is not a conflict."""
+        segments = [
+            _segment(date(2026, 1, 1), date(2026, 1, 1), Decimal("0.25")),
+            _segment(date(2026, 1, 1), date(2026, 1, 1), Decimal("0.25")),
+        ]
+
+        conflicts = await service._detect_conflicts(
+            mock_resource,
+            segments,
+            date(2026, 1, 1),
+            date(2026, 1, 1),
+            allocation_percentage=Decimal("50.00"),
+        )
+
+        assert conflicts == []
 
+    @pytest.mark.asyncio
+    async def test_detect_conflicts_single_assignment_no_conflict(self, service, mock_resource):
+        """Test single assignment never causes conflict (needs 2+ to conflict)."""
         # Single 200% assignment (shouldn't create cross-program conflict)
-        assignments = [
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 1),
-                "end_date": date(2026, 1, 1),
-                "units": Decimal("2.0"),
-            },
-        ]
+        segments = [_segment(date(2026, 1, 1), date(2026, 1, 1), Decimal("2.0"))]
 
         conflicts = await service._detect_conflicts(
             mock_resource,
-            assignments,
+            segments,
             date(2026, 1, 1),
             date(2026, 1, 1),
         )
@@ -600,6 +618,32 @@ class TestCrossProgramAvailabilityServiceInternalMethods:
         # No conflict because only 1 assignment
         assert len(conflicts) == 0
 
+    @pytest.mark.asyncio
+    async def test_detect_conflicts_counts_assignments_in_one_program(self, service, mock_resource):
+        """Test two assignments in one program segment can conflict."""
+        program_id = uuid4()
+        segments = [
+            _segment(
+                date(2026, 1, 1),
+                date(2026, 1, 1),
+                Decimal("1.5"),
+                program_id,
+                assignment_count=2,
+            )
+        ]
+
+        conflicts = await service._detect_conflicts(
+            mock_resource,
+            segments,
+            date(2026, 1, 1),
+            date(2026, 1, 1),
+        )
+
+        assert len(conflicts) == 1
+        assert conflicts[0].programs_involved == [
+            {"program_id": str(program_id), "assigned_hours": 12.0}
+        ]
+
 
 class TestCrossProgramAvailabilityServiceDateRange:
     """Tests for date range handling."""
@@ -614,35 +658,27 @@ class TestCrossProgramAvailabilityServiceDateRange:
         """Create service with mock db."""
         return CrossProgramAvailabilityService(mock_db)
 
+    @pytest.fixture
+    def mock_resource(self):
+        """Create mock resource with 8 hour capacity."""
+        resource = MagicMock()
+        resource.id = uuid4()
+        resource.name = "Engineer"
+        resource.capacity_per_day = Decimal("8")
+        return resource
+
     @pytest.mark.asyncio
-    async def test_detect_conflicts_multi_day_range(self, service, mock_db):
+    async def test_detect_conflicts_multi_day_range(self, service, mock_resource):
         """Test conflict detection across multiple days."""
-        mock_resource = MagicMock()
-        mock_resource.id = uuid4()
-        mock_resource.name = "Engineer"
-        mock_resource.capacity_per_day = Decimal("8")
-
-        # Overlapping assignments for 3 days
-        assignments = [
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 1),
-                "end_date": date(2026, 1, 3),
-                "units": Decimal("0.6"),
-            },
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 2),
-                "end_date": date(2026, 1, 4),
-                "units": Decimal("0.6"),
-            },
+        # Overlapping loads for 3 days
+        segments = [
+            _segment(date(2026, 1, 1), date(2026, 1, 3), Decimal("0.6")),
+            _segment(date(2026, 1, 2), date(2026, 1, 4), Decimal("0.6")),
         ]
 
         conflicts = await service._detect_conflicts(
             mock_resource,
-            assignments,
+            segments,
             date(2026, 1, 1),
             date(2026, 1, 5),
         )
@@ -654,38 +690,22 @@ class TestCrossProgramAvailabilityServiceDateRange:
         assert date(2026, 1, 3) in conflict_dates
 
     @pytest.mark.asyncio
-    async def test_detect_conflicts_handles_none_dates(self, service, mock_db):
-        """Test handling of assignments with None dates."""
-        mock_resource = MagicMock()
-        mock_resource.id = uuid4()
-        mock_resource.name = "Engineer"
-        mock_resource.capacity_per_day = Decimal("8")
-
-        # One assignment with None dates
-        assignments = [
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": None,
-                "end_date": None,
-                "units": Decimal("1.0"),
-            },
-            {
-                "program_id": uuid4(),
-                "activity_id": uuid4(),
-                "start_date": date(2026, 1, 1),
-                "end_date": date(2026, 1, 1),
-                "units": Decimal("0.5"),
-            },
+    async def test_detect_conflicts_clips_to_range(self, service, mock_resource):
+        """Test segments reaching past the range only count inside it."""
+        segments = [
+            _segment(date(2025, 12, 1), date(2026, 2, 28), Decimal("0.6")),
+            _segment(date(2025, 12, 1), date(2026, 2, 28), Decimal("0.6")),
         ]
 
-        # Should not crash, just skip None-dated assignments
         conflicts = await service._detect_conflicts(
             mock_resource,
-            assignments,
-            date(2026, 1, 1),
+            segments,
             date(2026, 1, 1),
+            date(2026, 1, 3),
         )
 
-        # No conflict - only 1 valid assignment
-        assert len(conflicts) == 0
+        assert [c.conflict_date for c in conflicts] == [
+            date(2026, 1, 1),
+            date(2026, 1, 2),
+            date(2026, 1, 3),
+        ]
@@ -5,8 +5,16 @@ from uuid import uuid4
 
 import pytest
 
-from src.core.cache import CacheManager
-from src.services.dashboard_cache import DashboardCache, DashboardCacheKeys
+from src.core.cache import CacheKeys, CacheManager
+from src.services.dashboard_cache import (
+    ALL_ARTIFACTS,
+    ARTIFACT_CPM,
+    ARTIFACT_EVMS_SUMMARY,
+    ARTIFACT_SCURVE,
+    ARTIFACT_WBS,
+    DashboardCache,
+    DashboardCacheKeys,
+)
 
 
 class TestDashboardCacheKeys:
@@ -315,22 +323,25 @@ class TestDashboardCacheInvalidation:
         """Should delete all dashboard caches for a program."""
         mock_manager = MagicMock(spec=CacheManager)
         mock_manager.is_available = True
-        mock_manager.delete = AsyncMock(return_value=True)
-        mock_manager.delete_pattern = AsyncMock(return_value=2)
+        mock_manager.delete_many = AsyncMock(return_value=6)
 
         cache = DashboardCache(mock_manager)
         program_id = uuid4()
 
         deleted = await cache.invalidate_program(program_id)
 
-        # Should delete multiple keys
-        assert deleted >= 4  # At least 4 component keys
-        assert mock_manager.delete.call_count >= 3
-        assert mock_manager.delete_pattern.call_count >= 1  # For S-curve pattern
+        # All component keys in one call, without a keyspace scan
+        assert deleted == 6
+        keys = mock_manager.delete_many.call_args[0][0]
+        assert DashboardCacheKeys.metrics_key(str(program_id)) in keys
+        assert DashboardCacheKeys.scurve_key(str(program_id), enhanced=True) in keys
+        assert DashboardCacheKeys.scurve_key(str(program_id), enhanced=False) in keys
+        assert len(keys) == 6
+        mock_manager.delete_pattern.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_invalidate_on_period_update(self):
-        """Should invalidate metrics and S-curve on period update."""
+        """Should invalidate EVMS summary, metrics and S-curve on period update."""
         mock_manager = MagicMock(spec=CacheManager)
         mock_manager.is_available = True
         mock_manager.delete = AsyncMock(return_value=True)
@@ -340,8 +351,9 @@ class TestDashboardCacheInvalidation:
 
         await cache.invalidate_on_period_update(program_id)
 
-        # Should delete 3 keys: metrics, basic s-curve, enhanced s-curve
-        assert mock_manager.delete.call_count == 3
+        # Should delete 4 keys: EVMS summary, metrics, basic and enhanced s-curve
+        assert mock_manager.delete.call_count == 4
+        mock_manager.delete.assert_any_await(CacheKeys.evms_summary_key(str(program_id)))
 
     @pytest.mark.asyncio
     async def test_invalidate_on_activity_update(self):
@@ -391,6 +403,63 @@ class TestDashboardCacheInvalidation:
         assert ":enhanced" in call_args
 
 
+class TestDashboardCacheListeners:
+    """Tests for invalidation listeners."""
+
+    @pytest.fixture
+    def cache(self) -> DashboardCache:
+        """Dashboard cache over a mock manager."""
+        mock_manager = MagicMock(spec=CacheManager)
+        mock_manager.is_available = True
+        mock_manager.delete = AsyncMock(return_value=True)
+        mock_manager.delete_many = AsyncMock(return_value=6)
+        return DashboardCache(mock_manager)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        ("method", "artifacts"),
+        [
+            ("invalidate_program", ALL_ARTIFACTS),
+            ("invalidate_on_period_update", {ARTIFACT_EVMS_SUMMARY, ARTIFACT_SCURVE}),
+            ("invalidate_on_activity_update", {ARTIFACT_CPM, ARTIFACT_SCURVE}),
+            ("invalidate_on_wbs_update", {ARTIFACT_WBS}),
+            ("invalidate_on_simulation_update", {ARTIFACT_SCURVE}),
+        ],
+    )
+    async def test_listener_told_stale_artifacts(self, cache, method, artifacts):
+        """Should pass the program and its stale artifacts to listeners."""
+        listener = MagicMock()
+        cache.add_invalidation_listener(listener)
+        program_id = uuid4()
+
+        await getattr(cache, method)(program_id)
+
+        listener.assert_called_once_with(program_id, frozenset(artifacts))
+
+    @pytest.mark.asyncio
+    async def test_listener_errors_do_not_fail_invalidation(self, cache):
+        """Should keep notifying after a listener raises."""
+        failing = MagicMock(side_effect=RuntimeError("boom"))
+        listener = MagicMock()
+        cache.add_invalidation_listener(failing)
+        cache.add_invalidation_listener(listener)
+
+        await cache.invalidate_on_wbs_update(uuid4())
+
+        listener.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_removed_listener_not_called(self, cache):
+        """Should stop calling a removed listener."""
+        listener = MagicMock()
+        cache.add_invalidation_listener(listener)
+        cache.remove_invalidation_listener(listener)
+
+        await cache.invalidate_on_wbs_update(uuid4())
+
+        listener.assert_not_called()
+
+
 class TestDashboardCacheIntegration:
     """Integration tests for dashboard cache workflow."""
 
@@ -0,0 +1,243 @@
+"""Unit tests for background dashboard cache warm-up."""
+
+import asyncio
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.core.cache import CacheKeys, CacheManager
+from src.models.activity import Activity
+from src.models.evms_period import EVMSPeriod, PeriodStatus
+from src.models.program import Program
+from src.repositories.program import ProgramRepository
+from src.schemas.activity import ScheduleResult
+from src.schemas.evms_period import EVMSSummaryResponse
+from src.services.dashboard_cache import (
+    ALL_ARTIFACTS,
+    ARTIFACT_CPM,
+    ARTIFACT_SCURVE,
+    ARTIFACT_WBS,
+    DashboardCache,
+    DashboardCacheKeys,
+)
+from src.services.dashboard_warmup import DashboardWarmer
+from tests.fixtures.synthetic_program import SyntheticProgramSpec, build_synthetic_program
+
+TINY_PROGRAM = SyntheticProgramSpec(
+    name="tiny",
+    activities=20,
+    resources=2,
+    assignments_per_resource=5,
+    calendar_density=0.05,
+    horizon_days=60,
+)
+
+
+def _make_warmer(session_maker=None, **kwargs) -> tuple[DashboardWarmer, MagicMock]:
+    """Warmer writing through a mock cache manager."""
+    manager = MagicMock(spec=CacheManager)
+    manager.is_available = True
+    manager.set = AsyncMock(return_value=True)
+
+    warmer = DashboardWarmer(
+        dashboard=DashboardCache(manager),
+        manager=manager,
+        session_maker_factory=lambda: session_maker or MagicMock(),
+        **kwargs,
+    )
+    return warmer, manager
+
+
+async def _wait_idle(warmer: DashboardWarmer) -> None:
+    for _ in range(500):
+        if warmer.scheduled_programs == 0:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("warm-up did not finish")
+
+
+class TestDashboardWarmerScheduling:
+    """Tests for debouncing and scheduling."""
+
+    @pytest.mark.asyncio
+    async def test_burst_is_recomputed_once(self):
+        """Should merge invalidations within the debounce window into one run."""
+        warmer, _ = _make_warmer(debounce_seconds=0.05)
+        program_id = uuid4()
+
+        with patch.object(warmer, "_warm", AsyncMock()) as mock_warm:
+            warmer.schedule(program_id, frozenset({ARTIFACT_CPM}))
+            warmer.schedule(program_id, frozenset({ARTIFACT_SCURVE}))
+            warmer.schedule(program_id, frozenset({ARTIFACT_CPM}))
+            await _wait_idle(warmer)
+
+        mock_warm.assert_awaited_once_with(program_id, {ARTIFACT_CPM, ARTIFACT_SCURVE})
+
+    @pytest.mark.asyncio
+    async def test_edit_during_run_triggers_another_run(self):
+        """Should recompute again after a run if the program changed meanwhile."""
+        warmer, _ = _make_warmer(debounce_seconds=0.01)
+        program_id = uuid4()
+        runs: list[set[str]] = []
+
+        async def warm(pid, artifacts):
+            runs.append(artifacts)
+            if len(runs) == 1:
+                warmer.schedule(pid, frozenset({ARTIFACT_WBS}))
+
+        with patch.object(warmer, "_warm", side_effect=warm):
+            warmer.schedule(program_id, frozenset({ARTIFACT_CPM}))
+            await _wait_idle(warmer)
+
+        assert runs == [{ARTIFACT_CPM}, {ARTIFACT_WBS}]
+
+    @pytest.mark.asyncio
+    async def test_failed_run_does_not_block_program(self):
+        """Should schedule the program again after a run raised."""
+        warmer, _ = _make_warmer(debounce_seconds=0.01)
+        program_id = uuid4()
+
+        with patch.object(warmer, "_warm", AsyncMock(side_effect=RuntimeError("db down"))):
+            warmer.schedule(program_id)
+            await _wait_idle(warmer)
+
+        assert warmer.scheduled_programs == 0
+
+    @pytest.mark.asyncio
+    async def test_nothing_scheduled_without_cache(self):
+        """Should skip warm-up when the cache is unavailable."""
+        warmer, manager = _make_warmer()
+        manager.is_available = False
+
+        warmer.schedule(uuid4())
+
+        assert warmer.scheduled_programs == 0
+
+    @pytest.mark.asyncio
+    async def test_start_listens_and_shutdown_cancels(self):
+        """Should react to dashboard invalidations until shut down."""
+        warmer, manager = _make_warmer(debounce_seconds=60)
+        manager.delete = AsyncMock(return_value=True)
+        dashboard = warmer._dashboard
+
+        warmer.start()
+        await dashboard.invalidate_on_wbs_update(uuid4())
+        assert warmer.scheduled_programs == 1
+
+        await warmer.shutdown()
+        await dashboard.invalidate_on_wbs_update(uuid4())
+        assert warmer.scheduled_programs == 0
+
+
+class TestDashboardWarmerArtifacts:
+    """Tests for artifact recomputation against a real database."""
+
+    @pytest.mark.asyncio
+    async def test_warms_all_artifacts(self, db_session: AsyncSession, async_engine):
+        """Should write every artifact in the format the endpoints read."""
+        program = await build_synthetic_program(db_session, TINY_PROGRAM)
+        db_session.add(
+            EVMSPeriod(
+                id=uuid4(),
+                program_id=program.program_id,
+                period_start=date(2026, 1, 1),
+                period_end=date(2026, 1, 31),
+                period_name="January 2026",
+                status=PeriodStatus.APPROVED,
+                cumulative_bcws=Decimal("1000.00"),
+                cumulative_bcwp=Decimal("900.00"),
+                cumulative_acwp=Decimal("950.00"),
+            )
+        )
+        await db_session.commit()
+
+        warmer, manager = _make_warmer(
+            async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+        )
+        await warmer._warm(program.program_id, set(ALL_ARTIFACTS))
+
+        written = {call.args[0]: call for call in manager.set.await_args_list}
+        program_key = str(program.program_id)
+
+        cpm = written[CacheKeys.cpm_key(program_key, 0)]
+        assert len(cpm.args[1]) == TINY_PROGRAM.activities
+        ScheduleResult(**cpm.args[1][0])
+        assert cpm.kwargs["tags"] == [CacheKeys.cpm_tag(program_key)]
+
+        summary = EVMSSummaryResponse(**written[CacheKeys.evms_summary_key(program_key)].args[1])
+        assert summary.bcwp == Decimal("900.00")
+        assert summary.as_of_date == date(2026, 1, 31)
+
+        scurve = written[DashboardCacheKeys.scurve_key(program_key, enhanced=True)].args[1]
+        assert scurve["program_id"] == program_key
+        assert len(scurve["data_points"]) >= 1
+
+        wbs = written[DashboardCacheKeys.wbs_key(program_key)].args[1]
+        assert len(wbs["items"]) >= 1
+
+    @pytest.mark.asyncio
+    async def test_cpm_writes_floats_back(self, db_session: AsyncSession, async_engine):
+        """Should store floats and criticality a later cache hit would skip."""
+        program = await build_synthetic_program(db_session, TINY_PROGRAM)
+        await db_session.execute(
+            update(Activity)
+            .where(Activity.program_id == program.program_id)
+            .values(total_float=None, free_float=None, is_critical=False)
+        )
+        await db_session.commit()
+
+        warmer, _ = _make_warmer(
+            async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+        )
+        await warmer._warm(program.program_id, {ARTIFACT_CPM})
+
+        db_session.expire_all()
+        activities = (
+            await db_session.scalars(
+                select(Activity).where(Activity.program_id == program.program_id)
+            )
+        ).all()
+        assert all(a.total_float is not None for a in activities)
+        assert all(a.free_float is not None for a in activities)
+        assert any(a.is_critical for a in activities)
+
+    @pytest.mark.asyncio
+    async def test_missing_program_writes_nothing(self, async_engine):
+        """Should skip deleted or unknown programs."""
+        warmer, manager = _make_warmer(
+            async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
+        )
+
+        await warmer._warm(uuid4(), set(ALL_ARTIFACTS))
+
+        manager.set.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_startup_warms_recently_active(self, db_session: AsyncSession, async_engine):
+        """Should schedule the most recently active programs at startup."""
+        older = await build_synthetic_program(db_session, TINY_PROGRAM)
+        newer = await build_synthetic_program(db_session, TINY_PROGRAM)
+        last_year = datetime(2025, 1, 1, tzinfo=UTC)
+        for model, column in ((Program, Program.id), (Activity, Activity.program_id)):
+            await db_session.execute(
+                update(model).where(column == older.program_id).values(updated_at=last_year)
+            )
+        await db_session.commit()
+
+        recent = await ProgramRepository(db_session).get_recently_active_ids(limit=1)
+        assert recent == [newer.program_id]
+
+        warmer, _ = _make_warmer(
+            async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False),
+            debounce_seconds=60,
+        )
+        warmer.start(warm_programs=2)
+        await warmer._startup_task
+
+        assert set(warmer._pending) == {older.program_id, newer.program_id}
+        await warmer.shutdown()
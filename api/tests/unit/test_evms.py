@@ -1,8 +1,11 @@
 """Unit tests for EVMS calculator."""
 
+from datetime import date
 from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import uuid4
 
-from src.services.evms import EVMethod, EVMSCalculator
+from src.services.evms import EVMethod, EVMSCalculator, build_evms_summary
 
 
 class TestEarnedValueCalculation:
@@ -325,3 +328,37 @@ class TestCalculateAllMetrics:
         assert metrics.cost_performance_index == Decimal("1.13")  # 45000 / 40000
         assert metrics.schedule_performance_index == Decimal("0.90")  # 45000 / 50000
         assert metrics.budget_at_completion == bac
+
+
+class TestBuildEVMSSummary:
+    """Tests for the EVMS summary shared by the endpoint and cache warm-up."""
+
+    def test_summary_from_latest_period(self):
+        """Should derive variances, indices and estimates from cumulative values."""
+        period = MagicMock(
+            cumulative_bcws=Decimal("50000.00"),
+            cumulative_bcwp=Decimal("45000.00"),
+            cumulative_acwp=Decimal("40000.00"),
+            period_end=date(2026, 1, 31),
+        )
+
+        summary = build_evms_summary(uuid4(), Decimal("100000.00"), period)
+
+        assert summary.as_of_date == date(2026, 1, 31)
+        assert summary.cv == Decimal("5000.00")
+        assert summary.sv == Decimal("-5000.00")
+        assert summary.cpi == Decimal("1.13")
+        assert summary.eac is not None
+        assert summary.percent_complete == Decimal("45.00")
+
+    def test_summary_without_periods(self):
+        """Should report zeros and no estimates before the first period."""
+        summary = build_evms_summary(
+            uuid4(), Decimal("100000.00"), None, as_of_date=date(2026, 3, 1)
+        )
+
+        assert summary.as_of_date == date(2026, 3, 1)
+        assert summary.bcwp == Decimal("0.00")
+        assert summary.cpi is None
+        assert summary.eac is None
+        assert summary.percent_complete == Decimal("0.00")
@@ -775,7 +775,7 @@ class TestAddPeriodData:
             patch("src.api.v1.endpoints.evms.ProgramRepository") as mock_prog_repo_cls,
             patch("src.api.v1.endpoints.evms.WBSElementRepository") as mock_wbs_repo_cls,
             patch("src.api.v1.endpoints.evms.EVMSPeriodDataRepository") as mock_data_repo_cls,
-            patch("src.api.v1.endpoints.evms.cache_manager") as mock_cache,
+            patch("src.api.v1.endpoints.evms.dashboard_cache") as mock_dash_cache,
             patch("src.api.v1.endpoints.evms.EVMSCalculator") as mock_calc,
         ):
             mock_period_repo = MagicMock()
@@ -799,7 +799,7 @@ class TestAddPeriodData:
 
             mock_calc.calculate_cpi.return_value = Decimal("0.94")
             mock_calc.calculate_spi.return_value = Decimal("0.90")
-            mock_cache.invalidate_evms = AsyncMock()
+            mock_dash_cache.invalidate_on_period_update = AsyncMock()
 
             result = await add_period_data(
                 period_id=period.id,
@@ -812,6 +812,7 @@ class TestAddPeriodData:
             mock_data_repo.create.assert_called_once()
             mock_period_repo.update_cumulative_totals.assert_called_once_with(period.id)
             mock_db.commit.assert_called_once()
+            mock_dash_cache.invalidate_on_period_update.assert_awaited_once_with(period.program_id)
 
     @pytest.mark.asyncio
     async def test_add_period_data_period_not_found(self):
@@ -1039,7 +1040,7 @@ class TestAddPeriodData:
             patch("src.api.v1.endpoints.evms.ProgramRepository") as mock_prog_repo_cls,
             patch("src.api.v1.endpoints.evms.WBSElementRepository") as mock_wbs_repo_cls,
             patch("src.api.v1.endpoints.evms.EVMSPeriodDataRepository") as mock_data_repo_cls,
-            patch("src.api.v1.endpoints.evms.cache_manager") as mock_cache,
+            patch("src.api.v1.endpoints.evms.dashboard_cache") as mock_dash_cache,
             patch("src.api.v1.endpoints.evms.EVMSCalculator") as mock_calc,
         ):
             mock_period_repo = MagicMock()
@@ -1063,7 +1064,7 @@ class TestAddPeriodData:
 
             mock_calc.calculate_cpi.return_value = Decimal("0.94")
             mock_calc.calculate_spi.return_value = Decimal("0.90")
-            mock_cache.invalidate_evms = AsyncMock()
+            mock_dash_cache.invalidate_on_period_update = AsyncMock()
 
             await add_period_data(
                 period_id=period.id,
@@ -1103,7 +1104,7 @@ class TestUpdatePeriodData:
             patch("src.api.v1.endpoints.evms.EVMSPeriodRepository") as mock_period_repo_cls,
             patch("src.api.v1.endpoints.evms.ProgramRepository") as mock_prog_repo_cls,
             patch("src.api.v1.endpoints.evms.EVMSPeriodDataRepository") as mock_data_repo_cls,
-            patch("src.api.v1.endpoints.evms.cache_manager") as mock_cache,
+            patch("src.api.v1.endpoints.evms.dashboard_cache") as mock_dash_cache,
             patch("src.api.v1.endpoints.evms.EVMSCalculator") as mock_calc,
         ):
             mock_period_repo = MagicMock()
@@ -1123,7 +1124,7 @@ class TestUpdatePeriodData:
 
             mock_calc.calculate_cpi.return_value = Decimal("1.04")
             mock_calc.calculate_spi.return_value = Decimal("1.00")
-            mock_cache.invalidate_evms = AsyncMock()
+            mock_dash_cache.invalidate_on_period_update = AsyncMock()
 
             result = await update_period_data(
                 period_id=period.id,
@@ -1136,6 +1137,7 @@ class TestUpdatePeriodData:
             assert result is not None
             mock_data_repo.update.assert_called_once()
             mock_db.commit.assert_called_once()
+            mock_dash_cache.invalidate_on_period_update.assert_awaited_once_with(period.program_id)
 
     @pytest.mark.asyncio
     async def test_update_period_data_period_not_found(self):
@@ -1292,7 +1294,7 @@ class TestUpdatePeriodData:
             patch("src.api.v1.endpoints.evms.EVMSPeriodRepository") as mock_period_repo_cls,
             patch("src.api.v1.endpoints.evms.ProgramRepository") as mock_prog_repo_cls,
             patch("src.api.v1.endpoints.evms.EVMSPeriodDataRepository") as mock_data_repo_cls,
-            patch("src.api.v1.endpoints.evms.cache_manager") as mock_cache,
+            patch("src.api.v1.endpoints.evms.dashboard_cache") as mock_dash_cache,
             patch("src.api.v1.endpoints.evms.EVMSCalculator") as mock_calc,
         ):
             mock_period_repo = MagicMock()
@@ -1312,7 +1314,7 @@ class TestUpdatePeriodData:
 
             mock_calc.calculate_cpi.return_value = Decimal("0.94")
             mock_calc.calculate_spi.return_value = Decimal("0.84")
-            mock_cache.invalidate_evms = AsyncMock()
+            mock_dash_cache.invalidate_on_period_update = AsyncMock()
 
             await update_period_data(
                 period_id=period.id,
@@ -1349,7 +1351,6 @@ class TestGetEVMSSummary:
             patch("src.api.v1.endpoints.evms.ProgramRepository") as mock_prog_repo_cls,
             patch("src.api.v1.endpoints.evms.EVMSPeriodRepository") as mock_period_repo_cls,
             patch("src.api.v1.endpoints.evms.cache_manager") as mock_cache,
-            patch("src.api.v1.endpoints.evms.EVMSCalculator") as mock_calc,
         ):
             mock_prog_repo = MagicMock()
             mock_prog_repo.get_by_id = AsyncMock(return_value=program)
@@ -1362,15 +1363,6 @@ class TestGetEVMSSummary:
             mock_cache.get = AsyncMock(return_value=None)
             mock_cache.set = AsyncMock()
 
-            mock_calc.calculate_cost_variance.return_value = Decimal("-5000.00")
-            mock_calc.calculate_schedule_variance.return_value = Decimal("-10000.00")
-            mock_calc.calculate_cpi.return_value = Decimal("0.95")
-            mock_calc.calculate_spi.return_value = Decimal("0.90")
-            mock_calc.calculate_eac.return_value = Decimal("1052631.58")
-            mock_calc.calculate_etc.return_value = Decimal("957631.58")
-            mock_calc.calculate_vac.return_value = Decimal("-52631.58")
-            mock_calc.calculate_tcpi.return_value = Decimal("1.06")
-
             result = await get_evms_summary(
                 program_id=program.id,
                 db=mock_db,
@@ -1379,6 +1371,10 @@ class TestGetEVMSSummary:
 
             assert result.program_id == program.id
             assert result.bac == program.budget_at_completion
+            assert result.cv == Decimal("-5000.00")
+            assert result.sv == Decimal("-10000.00")
+            assert result.percent_complete == Decimal("9.00")
+            mock_cache.set.assert_awaited_once()
 
     @pytest.mark.asyncio
     async def test_get_evms_summary_program_not_found(self):
@@ -1465,7 +1461,6 @@ class TestGetEVMSSummary:
             patch("src.api.v1.endpoints.evms.ProgramRepository") as mock_prog_repo_cls,
             patch("src.api.v1.endpoints.evms.EVMSPeriodRepository") as mock_period_repo_cls,
             patch("src.api.v1.endpoints.evms.cache_manager") as mock_cache,
-            patch("src.api.v1.endpoints.evms.EVMSCalculator") as mock_calc,
         ):
             mock_prog_repo = MagicMock()
             mock_prog_repo.get_by_id = AsyncMock(return_value=program)
@@ -1478,15 +1473,6 @@ class TestGetEVMSSummary:
             mock_cache.get = AsyncMock(return_value=None)
             mock_cache.set = AsyncMock()
 
-            mock_calc.calculate_cost_variance.return_value = Decimal("-5000.00")
-            mock_calc.calculate_schedule_variance.return_value = Decimal("-10000.00")
-            mock_calc.calculate_cpi.return_value = Decimal("0.95")
-            mock_calc.calculate_spi.return_value = Decimal("0.90")
-            mock_calc.calculate_eac.return_value = Decimal("1052631.58")
-            mock_calc.calculate_etc.return_value = Decimal("957631.58")
-            mock_calc.calculate_vac.return_value = Decimal("-52631.58")
-            mock_calc.calculate_tcpi.return_value = Decimal("1.06")
-
             result = await get_evms_summary(
                 program_id=program.id,
                 db=mock_db,
@@ -1510,7 +1496,6 @@ class TestGetEVMSSummary:
             patch("src.api.v1.endpoints.evms.ProgramRepository") as mock_prog_repo_cls,
             patch("src.api.v1.endpoints.evms.EVMSPeriodRepository") as mock_period_repo_cls,
             patch("src.api.v1.endpoints.evms.cache_manager") as mock_cache,
-            patch("src.api.v1.endpoints.evms.EVMSCalculator") as mock_calc,
         ):
             mock_prog_repo = MagicMock()
             mock_prog_repo.get_by_id = AsyncMock(return_value=program)
@@ -1523,15 +1508,6 @@ class TestGetEVMSSummary:
             mock_cache.get = AsyncMock(return_value=None)
             mock_cache.set = AsyncMock()
 
-            mock_calc.calculate_cost_variance.return_value = Decimal("0.00")
-            mock_calc.calculate_schedule_variance.return_value = Decimal("0.00")
-            mock_calc.calculate_cpi.return_value = None
-            mock_calc.calculate_spi.return_value = None
-            mock_calc.calculate_eac.return_value = None
-            mock_calc.calculate_etc.return_value = None
-            mock_calc.calculate_vac.return_value = None
-            mock_calc.calculate_tcpi.return_value = None
-
             result = await get_evms_summary(program_id=program.id, db=mock_db, current_user=user)
 
             assert result.bcws == Decimal("0.00")
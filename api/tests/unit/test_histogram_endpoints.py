@@ -5,6 +5,7 @@ from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+import numpy as np
 import pytest
 from fastapi import HTTPException
 
@@ -14,8 +15,10 @@ from src.api.v1.endpoints.histogram import (
     get_resource_histogram,
 )
 from src.models.enums import ResourceType
+from src.services.histogram_kernel import HistogramMatrix
 from src.services.resource_histogram import (
     HistogramDataPoint,
+    ProgramHistogramMatrix,
     ProgramHistogramSummary,
     ResourceHistogram,
 )
@@ -381,7 +384,9 @@ class TestGetProgramHistogram:
                 assert result.histograms[0].resource_id == resource_id
 
                 mock_prog_repo.get_by_id.assert_called_once_with(program_id)
-                mock_svc.get_program_histogram.assert_called_once_with(program_id, start, end, None)
+                mock_svc.get_program_histogram.assert_called_once_with(
+                    program_id, start, end, None, "daily"
+                )
 
     @pytest.mark.asyncio
     async def test_success_without_dates(self):
@@ -423,7 +428,9 @@ class TestGetProgramHistogram:
 
                 assert result.summary.resource_count == 0
                 assert len(result.histograms) == 0
-                mock_svc.get_program_histogram.assert_called_once_with(program_id, None, None, None)
+                mock_svc.get_program_histogram.assert_called_once_with(
+                    program_id, None, None, None, "daily"
+                )
 
     @pytest.mark.asyncio
     async def test_program_not_found(self):
@@ -560,7 +567,7 @@ class TestGetProgramHistogram:
 
                 assert len(result.histograms) == 2
                 mock_svc.get_program_histogram.assert_called_once_with(
-                    program_id, start, end, [r1, r2]
+                    program_id, start, end, [r1, r2], "daily"
                 )
 
     @pytest.mark.asyncio
@@ -660,3 +667,68 @@ class TestGetProgramHistogram:
 
                 assert result.summary.start_date == start
                 assert result.summary.end_date == end
+
+    @pytest.mark.asyncio
+    async def test_columnar_layout(self):
+        """Should return parallel arrays from the histogram matrix."""
+        mock_db = AsyncMock()
+        mock_user = MagicMock()
+        program_id = uuid4()
+        start = date(2025, 1, 6)
+        end = date(2025, 1, 7)
+
+        resource = MagicMock()
+        resource.id = uuid4()
+        resource.code = "ENG-001"
+
+        matrix = HistogramMatrix.from_hundredths(
+            start, np.array([[800, 800]]), np.array([[400, 1000]])
+        ).rollup("weekly")
+        data = ProgramHistogramMatrix(
+            summary=ProgramHistogramSummary(
+                program_id=program_id,
+                start_date=start,
+                end_date=end,
+                resource_count=1,
+                total_overallocated_days=1,
+                resources_with_overallocation=1,
+            ),
+            resources=[resource],
+            matrix=matrix,
+            statistics=matrix.statistics(),
+        )
+
+        with patch("src.api.v1.endpoints.histogram.ProgramRepository") as mock_prog_cls:
+            mock_prog_repo = MagicMock()
+            mock_prog_repo.get_by_id = AsyncMock(return_value=MagicMock())
+            mock_prog_cls.return_value = mock_prog_repo
+
+            with patch("src.api.v1.endpoints.histogram.ResourceHistogramService") as mock_svc_cls:
+                mock_svc = MagicMock()
+                mock_svc.get_program_histogram_matrix = AsyncMock(return_value=data)
+                mock_svc_cls.return_value = mock_svc
+
+                result = await get_program_histogram(
+                    program_id=program_id,
+                    db=mock_db,
+                    current_user=mock_user,
+                    start_date=start,
+                    end_date=end,
+                    resource_ids=None,
+                    granularity="weekly",
+                    layout="columnar",
+                )
+
+                mock_svc.get_program_histogram_matrix.assert_called_once_with(
+                    program_id, start, end, None, "weekly"
+                )
+                assert result.granularity == "weekly"
+                assert result.dates == [date(2025, 1, 6)]
+                assert result.resource_codes == ["ENG-001"]
+                assert result.available_hours == [[16.0]]
+                assert result.assigned_hours == [[14.0]]
+                assert result.utilization_percent == [[87.5]]
+                assert result.overallocated == [[True]]
+                assert result.peak_dates == [date(2025, 1, 6)]
+                assert result.overallocated_periods == [1]
+                assert result.summary.total_overallocated_days == 1
@@ -0,0 +1,131 @@
+"""Unit tests for the resource histogram array kernel."""
+
+from __future__ import annotations
+
+from datetime import date
+
+import numpy as np
+import pytest
+
+from src.services.histogram_kernel import HistogramMatrix
+
+
+def _matrix(
+    start: date,
+    available: list[list[int]],
+    assigned: list[list[int]],
+) -> HistogramMatrix:
+    """Daily matrix from hours in hundredths."""
+    return HistogramMatrix.from_hundredths(
+        start, np.array(available, dtype=np.int64), np.array(assigned, dtype=np.int64)
+    )
+
+
+class TestHistogramMatrix:
+    """Tests for daily matrices."""
+
+    def test_from_hundredths(self) -> None:
+        """Should convert hundredths to hours and flag over-allocated days."""
+        matrix = _matrix(date(2024, 1, 15), [[800, 800, 0]], [[600, 850, 100]])
+
+        assert matrix.dates == [date(2024, 1, 15), date(2024, 1, 16), date(2024, 1, 17)]
+        assert matrix.available.tolist() == [[8.0, 8.0, 0.0]]
+        assert matrix.assigned.tolist() == [[6.0, 8.5, 1.0]]
+        assert matrix.overallocated.tolist() == [[False, True, True]]
+
+    def test_utilization(self) -> None:
+        """Should give percentages, 0 where nothing is available."""
+        matrix = _matrix(date(2024, 1, 15), [[800, 0], [400, 400]], [[600, 300], [500, 0]])
+
+        assert matrix.utilization.tolist() == [[75.0, 0.0], [125.0, 0.0]]
+
+
+class TestRollup:
+    """Tests for weekly and monthly rollups."""
+
+    def test_weekly(self) -> None:
+        """Should sum each Monday-to-Sunday week."""
+        # Two full weeks starting Monday 2024-01-15
+        matrix = _matrix(date(2024, 1, 15), [[800] * 14], [[600] * 14]).rollup("weekly")
+
+        assert matrix.dates == [date(2024, 1, 15), date(2024, 1, 22)]
+        assert matrix.available.tolist() == [[56.0, 56.0]]
+        assert matrix.assigned.tolist() == [[42.0, 42.0]]
+        assert matrix.utilization.tolist() == [[75.0, 75.0]]
+
+    def test_partial_week(self) -> None:
+        """Should label a partial week with its Monday."""
+        # Wednesday 2024-01-17 to Sunday 2024-01-21, then Monday 2024-01-22
+        matrix = _matrix(date(2024, 1, 17), [[800] * 6], [[400] * 6]).rollup("weekly")
+
+        assert matrix.dates == [date(2024, 1, 15), date(2024, 1, 22)]
+        assert matrix.available.tolist() == [[40.0, 8.0]]
+
+    def test_weekly_overallocation(self) -> None:
+        """Should flag a week with any over-allocated day."""
+        assigned = [[600] * 7 + [600] * 6 + [1000]]
+        matrix = _matrix(date(2024, 1, 15), [[800] * 14], assigned).rollup("weekly")
+
+        assert matrix.overallocated.tolist() == [[False, True]]
+
+    def test_monthly(self) -> None:
+        """Should sum each calendar month and label it with the first."""
+        matrix = _matrix(date(2024, 1, 30), [[100] * 33], [[50] * 33]).rollup("monthly")
+
+        # Jan 30-31, all of February 2024 (29 days), Mar 1-2
+        assert matrix.dates == [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)]
+        assert matrix.available.tolist() == [[2.0, 29.0, 2.0]]
+
+    def test_daily_is_unchanged(self) -> None:
+        """Should return the matrix itself for daily granularity."""
+        matrix = _matrix(date(2024, 1, 15), [[800]], [[600]])
+
+        assert matrix.rollup("daily") is matrix
+
+    def test_empty(self) -> None:
+        """Should roll up a matrix without days."""
+        matrix = _matrix(date(2024, 1, 15), [[]], [[]]).rollup("weekly")
+
+        assert matrix.available.shape == (1, 0)
+        assert matrix.dates == []
+
+    def test_unsupported_granularity(self) -> None:
+        """Should reject unknown granularities."""
+        with pytest.raises(ValueError, match="Unsupported granularity"):
+            _matrix(date(2024, 1, 15), [[800]], [[600]]).rollup("yearly")
+
+
+class TestStatistics:
+    """Tests for per-resource statistics."""
+
+    def test_statistics(self) -> None:
+        """Should compute peak, average, over-allocation and totals per row."""
+        matrix = _matrix(
+            date(2024, 1, 15),
+            [[800, 800, 800], [800, 800, 800]],
+            [[400, 800, 1000], [0, 0, 0]],
+        )
+
+        stats = matrix.statistics()
+
+        assert stats.peak_utilization.tolist() == [125.0, 0.0]
+        assert stats.peak_index.tolist() == [2, -1]
+        assert stats.average_utilization[0] == pytest.approx(275.0 / 3)
+        assert stats.overallocated_periods.tolist() == [1, 0]
+        assert stats.total_available.tolist() == [24.0, 24.0]
+        assert stats.total_assigned.tolist() == [22.0, 0.0]
+
+    def test_first_peak(self) -> None:
+        """Should report the first of several equal peaks."""
+        matrix = _matrix(date(2024, 1, 15), [[800, 800, 800]], [[400, 800, 800]])
+
+        assert matrix.statistics().peak_index.tolist() == [1]
+
+    def test_empty(self) -> None:
+        """Should give zeros and no peak without days."""
+        stats = _matrix(date(2024, 1, 15), [[]], [[]]).statistics()
+
+        assert stats.peak_utilization.tolist() == [0.0]
+        assert stats.peak_index.tolist() == [-1]
+        assert stats.average_utilization.tolist() == [0.0]
+        assert stats.overallocated_periods.tolist() == [0]
@@ -0,0 +1,79 @@
+"""Unit tests for the shared leveling process pool."""
+
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pytest
+
+from src.services.leveling_pool import LevelingPool
+
+
+class _BrokenExecutor(Executor):
+    """Executor whose worker processes have died."""
+
+    def __init__(self) -> None:
+        self.shut_down = False
+
+    def submit(self, fn, /, *args, **kwargs):
+        future: Future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.shut_down = True
+
+
+class TestLevelingPool:
+    """Tests for LevelingPool."""
+
+    def test_single_worker_is_not_parallel(self):
+        """Should report that one worker means leveling inline."""
+        assert LevelingPool(max_workers=1).parallel is False
+        assert LevelingPool(max_workers=2).parallel is True
+
+    @pytest.mark.asyncio
+    async def test_map_reuses_processes(self):
+        """Should return results in order from one pool across calls."""
+        pool = LevelingPool(max_workers=2)
+        try:
+            first = await pool.map(pow, [(2, 3), (3, 2), (5, 1)])
+            executor = pool._executor
+            second = await pool.map(pow, [(4, 2)])
+
+            assert first == [8, 9, 5]
+            assert second == [16]
+            assert pool._executor is executor
+        finally:
+            pool.shutdown()
+
+        assert pool._executor is None
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_replaced(self):
+        """Should drop a pool whose worker died and retry on a new one."""
+        broken = _BrokenExecutor()
+        pool = LevelingPool(max_workers=2)
+        with patch(
+            "src.services.leveling_pool.ProcessPoolExecutor",
+            side_effect=[broken, ThreadPoolExecutor(1)],
+        ):
+            try:
+                assert await pool.map(pow, [(2, 3)]) == [8]
+                assert await pool.map(pow, [(3, 2)]) == [9]
+            finally:
+                pool.shutdown()
+
+        assert broken.shut_down
+
+    @pytest.mark.asyncio
+    async def test_pool_broken_twice_raises(self):
+        """Should raise when the replacement pool is broken as well."""
+        pool = LevelingPool(max_workers=2)
+        with patch(
+            "src.services.leveling_pool.ProcessPoolExecutor",
+            side_effect=[_BrokenExecutor(), _BrokenExecutor()],
+        ), pytest.raises(BrokenProcessPool):
+            await pool.map(pow, [(2, 3)])
+
+        assert pool._executor is None
@@ -0,0 +1,287 @@
+"""Unit tests for what-if leveling previews."""
+
+from dataclasses import replace
+from datetime import date
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from src.services.leveling_pool import LevelingPool
+from src.services.leveling_preview import (
+    LevelingPreviewService,
+    cache_snapshot,
+    clear_snapshot_cache,
+    get_cached_snapshot,
+    preview_variant,
+    snapshot_digest,
+)
+from src.services.leveling_snapshot import (
+    LevelingActivity,
+    LevelingAssignment,
+    LevelingResource,
+    LevelingSnapshot,
+)
+from src.services.parallel_leveling import ParallelLevelingEngine, ParallelLevelingResult
+from src.services.resource_leveling import LevelingOptions, SerialLevelingEngine
+from src.services.working_calendar import WorkingCalendar
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    clear_snapshot_cache()
+    yield
+    clear_snapshot_cache()
+
+
+def _snapshot(calendar: WorkingCalendar | None = None) -> LevelingSnapshot:
+    """Two activities competing for one full-time resource in the same week."""
+    resource = LevelingResource(
+        id=uuid4(), code="ENG-001", capacity_per_day=Decimal("8.0"), calendar=calendar
+    )
+    activities = [
+        LevelingActivity(
+            id=uuid4(),
+            code=f"ACT-{i}",
+            start=date(2026, 1, 5),
+            finish=date(2026, 1, 9),
+            total_float=10 * (i + 1),
+            is_critical=False,
+        )
+        for i in range(2)
+    ]
+    return LevelingSnapshot(
+        program_id=uuid4(),
+        start_date=date(2026, 1, 1),
+        end_date=date(2026, 12, 31),
+        activities=tuple(activities),
+        assignments=tuple(
+            LevelingAssignment(activity_id=a.id, resource_id=resource.id, units=Decimal("1.0"))
+            for a in activities
+        ),
+        external_loads=(),
+        resources=(resource,),
+        program_resource_ids=(resource.id,),
+        dependencies=(),
+    )
+
+
+def _service(
+    snapshot: LevelingSnapshot, pool: LevelingPool | None = None
+) -> LevelingPreviewService:
+    service = LevelingPreviewService(MagicMock(), pool=pool or LevelingPool(max_workers=1))
+    service._program_repo = MagicMock()
+    service._program_repo.get_by_id_shallow = AsyncMock(return_value=MagicMock())
+    service._snapshot_loader = MagicMock()
+    service._snapshot_loader.load_snapshot = AsyncMock(return_value=snapshot)
+    return service
+
+
+class TestSnapshotDigest:
+    """Tests for snapshot content hashing."""
+
+    def test_equal_content_same_digest(self):
+        """Should hash equal snapshots and equal calendars alike."""
+        snapshot = _snapshot(calendar=WorkingCalendar(Decimal("8.0"), holidays=[date(2026, 1, 6)]))
+        resource = replace(
+            snapshot.resources[0],
+            calendar=WorkingCalendar(Decimal("8.00"), holidays=[date(2026, 1, 6)]),
+        )
+
+        assert snapshot_digest(snapshot) == snapshot_digest(replace(snapshot))
+        assert snapshot_digest(snapshot) == snapshot_digest(
+            replace(snapshot, resources=(resource,))
+        )
+
+    def test_changed_content_new_digest(self):
+        """Should hash snapshots differing in any leveling input differently."""
+        snapshot = _snapshot()
+        assignment = replace(snapshot.assignments[0], units=Decimal("0.5"))
+        resource = replace(snapshot.resources[0], calendar=WorkingCalendar(Decimal("4.0")))
+
+        digests = {
+            snapshot_digest(snapshot),
+            snapshot_digest(replace(snapshot, assignments=(assignment, snapshot.assignments[1]))),
+            snapshot_digest(replace(snapshot, resources=(resource,))),
+            snapshot_digest(replace(snapshot, end_date=date(2026, 6, 30))),
+        }
+
+        assert len(digests) == 4
+
+
+class TestSnapshotCache:
+    """Tests for the preview snapshot cache."""
+
+    def test_cache_and_get(self):
+        """Should return a cached snapshot by its digest."""
+        snapshot = _snapshot()
+
+        snapshot_id = cache_snapshot(snapshot)
+
+        assert snapshot_id == snapshot_digest(snapshot)
+        assert get_cached_snapshot(snapshot_id) is snapshot
+        assert get_cached_snapshot("unknown") is None
+
+    def test_evicts_least_recently_used(self, monkeypatch):
+        """Should drop the least recently used snapshot when full."""
+        monkeypatch.setattr("src.services.leveling_preview._SNAPSHOT_CACHE_SIZE", 2)
+        first, second, third = _snapshot(), _snapshot(), _snapshot()
+        first_id = cache_snapshot(first)
+        second_id = cache_snapshot(second)
+        get_cached_snapshot(first_id)
+
+        cache_snapshot(third)
+
+        assert get_cached_snapshot(first_id) is first
+        assert get_cached_snapshot(second_id) is None
+
+    def test_evicts_beyond_byte_budget(self, monkeypatch):
+        """Should keep only the newest snapshot when both exceed the byte budget."""
+        monkeypatch.setattr("src.services.leveling_preview._SNAPSHOT_CACHE_MAX_BYTES", 1)
+        first, second = _snapshot(), _snapshot()
+
+        first_id = cache_snapshot(first)
+        second_id = cache_snapshot(second)
+
+        assert get_cached_snapshot(first_id) is None
+        assert get_cached_snapshot(second_id) is second
+
+
+class TestPreviewVariant:
+    """Tests for leveling one variant."""
+
+    def test_runs_requested_algorithm(self):
+        """Should match the serial and parallel engines on the same snapshot."""
+        snapshot = _snapshot()
+        options = LevelingOptions()
+
+        serial = preview_variant(snapshot, options, "serial")
+        parallel = preview_variant(snapshot, options, "parallel")
+
+        assert serial == SerialLevelingEngine(snapshot, options).run()
+        assert isinstance(parallel, ParallelLevelingResult)
+        assert parallel.shifts == ParallelLevelingEngine(snapshot, options).run().shifts
+
+    def test_unknown_algorithm(self):
+        """Should reject unknown algorithms."""
+        with pytest.raises(ValueError, match="Unknown leveling algorithm"):
+            preview_variant(_snapshot(), LevelingOptions(), "genetic")
+
+
+class TestLevelingPreviewService:
+    """Tests for LevelingPreviewService.preview."""
+
+    @pytest.mark.asyncio
+    async def test_one_result_per_variant(self):
+        """Should level every variant of the same snapshot."""
+        snapshot = _snapshot()
+        service = _service(snapshot)
+        variants = [
+            LevelingOptions(),
+            LevelingOptions(target_resources=[uuid4()]),
+            LevelingOptions(max_iterations=1),
+        ]
+
+        preview = await service.preview(snapshot.program_id, variants)
+
+        assert preview.snapshot_id == snapshot_digest(snapshot)
+        assert preview.algorithm == "parallel"
+        assert [r.activities_shifted for r in preview.results] == [1, 0, 1]
+        assert preview.results[1].remaining_overallocations == 0
+
+    @pytest.mark.asyncio
+    async def test_reuses_cached_snapshot(self):
+        """Should level a cached snapshot without reading the program again."""
+        snapshot = _snapshot()
+        service = _service(snapshot)
+        first = await service.preview(snapshot.program_id, [LevelingOptions()])
+
+        second = await service.preview(
+            snapshot.program_id,
+            [LevelingOptions(preserve_critical_path=False)],
+            algorithm="serial",
+            snapshot_id=first.snapshot_id,
+        )
+
+        assert second.snapshot_id == first.snapshot_id
+        assert service._program_repo.get_by_id_shallow.await_count == 1
+        assert service._snapshot_loader.load_snapshot.await_count == 1
+        assert service.session.method_calls == []
+
+    @pytest.mark.asyncio
+    async def test_reloads_unknown_snapshot(self):
+        """Should reload when the snapshot id is unknown or for another program."""
+        snapshot = _snapshot()
+        other_id = cache_snapshot(_snapshot())
+        service = _service(snapshot)
+
+        await service.preview(snapshot.program_id, [LevelingOptions()], snapshot_id="unknown")
+        preview = await service.preview(
+            snapshot.program_id, [LevelingOptions()], snapshot_id=other_id
+        )
+
+        assert preview.snapshot_id == snapshot_digest(snapshot)
+        assert service._snapshot_loader.load_snapshot.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_uses_loaded_program(self):
+        """Should load the snapshot from a program the caller already read."""
+        snapshot = _snapshot()
+        service = _service(snapshot)
+        program = MagicMock()
+
+        await service.preview(snapshot.program_id, [LevelingOptions()], program=program)
+
+        service._program_repo.get_by_id_shallow.assert_not_awaited()
+        service._snapshot_loader.load_snapshot.assert_awaited_once_with(program)
+
+    @pytest.mark.asyncio
+    async def test_program_not_found(self):
+        """Should reject a program that does not exist."""
+        service = _service(_snapshot())
+        service._program_repo.get_by_id_shallow = AsyncMock(return_value=None)
+
+        with pytest.raises(ValueError, match="not found"):
+            await service.preview(uuid4(), [LevelingOptions()])
+
+    @pytest.mark.asyncio
+    async def test_unknown_algorithm(self):
+        """Should reject unknown algorithms before loading anything."""
+        service = _service(_snapshot())
+
+        with pytest.raises(ValueError, match="Unknown leveling algorithm"):
+            await service.preview(uuid4(), [LevelingOptions()], algorithm="genetic")
+        service._program_repo.get_by_id_shallow.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self, monkeypatch):
+        """Should give the same results when variants run in worker processes."""
+        snapshot = _snapshot()
+        variants = [LevelingOptions(), LevelingOptions(max_iterations=1)]
+        in_process = await _service(snapshot).preview(snapshot.program_id, variants)
+        monkeypatch.setattr("src.services.leveling_preview.PARALLEL_MIN_ACTIVITIES", 1)
+
+        pool = LevelingPool(max_workers=2)
+        try:
+            pooled = await _service(snapshot, pool).preview(snapshot.program_id, variants)
+        finally:
+            pool.shutdown()
+
+        assert pooled.results == in_process.results
+
+    @pytest.mark.asyncio
+    async def test_single_large_variant_uses_pool(self, monkeypatch):
+        """Should level one variant in the pool once it is large enough."""
+        snapshot = _snapshot()
+        variants = [LevelingOptions()]
+        in_process = await _service(snapshot).preview(snapshot.program_id, variants)
+        monkeypatch.setattr("src.services.leveling_preview.PARALLEL_MIN_ACTIVITIES", 1)
+
+        pool = MagicMock(spec=LevelingPool)
+        pool.parallel = True
+        pool.map = AsyncMock(side_effect=lambda func, args: [func(*a) for a in args])
+        pooled = await _service(snapshot, pool).preview(snapshot.program_id, variants)
+
+        pool.map.assert_awaited_once()
+        assert pooled.results == in_process.results
@@ -0,0 +1,162 @@
+"""Unit tests for the sweep-line resource loading kernel."""
+
+from __future__ import annotations
+
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+
+from src.services.loading_kernel import (
+    FULL_ALLOCATION,
+    LoadIntervals,
+    first_fit,
+    from_hundredths,
+    hours_from_units,
+    slot_window_days,
+    to_hundredths,
+    weekday_mask,
+)
+
+
+class TestHundredths:
+    """Tests for hundredths conversions."""
+
+    def test_to_hundredths(self) -> None:
+        """Should convert two-decimal values exactly."""
+        assert to_hundredths(Decimal("1.00")) == FULL_ALLOCATION
+        assert to_hundredths(Decimal("0.35")) == 35
+        assert to_hundredths(Decimal("0.005")) == 1
+
+    def test_from_hundredths_keeps_two_decimals(self) -> None:
+        """Should produce values that compare and print like model Decimals."""
+        assert from_hundredths(800) == Decimal("8.00")
+        assert str(from_hundredths(800)) == "8.00"
+        assert str(from_hundredths(0)) == "0.00"
+
+    def test_hours_from_units_matches_decimal_rounding(self) -> None:
+        """Should round units * capacity half up, as Decimal.quantize does."""
+        capacity = Decimal("7.50")
+        units = np.arange(0, 400, dtype=np.int64)
+
+        hours = hours_from_units(units, capacity)
+
+        expected = [
+            to_hundredths(
+                (from_hundredths(u) * capacity).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            )
+            for u in units.tolist()
+        ]
+        assert hours.tolist() == expected
+
+
+class TestWeekdayMask:
+    """Tests for weekday_mask."""
+
+    def test_flags_monday_to_friday(self) -> None:
+        """Should flag weekdays starting from any day of the week."""
+        # 2024-01-06 is a Saturday
+        mask = weekday_mask(date(2024, 1, 6), 9)
+
+        assert mask.tolist() == [False, False, True, True, True, True, True, False, False]
+
+
+class TestLoadIntervals:
+    """Tests for LoadIntervals sweeps."""
+
+    def test_daily_totals_sums_overlaps(self) -> None:
+        """Should sum weights of overlapping intervals per day."""
+        intervals = LoadIntervals.from_ranges(
+            [
+                (date(2024, 1, 1), date(2024, 1, 3), 50),
+                (date(2024, 1, 2), date(2024, 1, 5), 100),
+            ]
+        )
+
+        totals = intervals.daily_totals(date(2024, 1, 1), date(2024, 1, 6))
+
+        assert totals.tolist() == [50, 150, 150, 100, 100, 0]
+
+    def test_clips_intervals_to_range(self) -> None:
+        """Should count intervals that start before or end after the range."""
+        intervals = LoadIntervals.from_ranges(
+            [
+                (date(2023, 12, 1), date(2024, 1, 2), 40),
+                (date(2024, 1, 3), date(2024, 3, 1), 60),
+                (date(2023, 1, 1), date(2023, 2, 1), 999),
+            ]
+        )
+
+        totals = intervals.daily_totals(date(2024, 1, 1), date(2024, 1, 4))
+
+        assert totals.tolist() == [40, 40, 60, 60]
+
+    def test_open_bounds_extend_past_range(self) -> None:
+        """Should treat None bounds as open-ended."""
+        intervals = LoadIntervals.from_ranges(
+            [(None, date(2024, 1, 2), 10), (date(2024, 1, 2), None, 20)]
+        )
+
+        totals = intervals.daily_totals(date(2024, 1, 1), date(2024, 1, 3))
+
+        assert totals.tolist() == [10, 30, 20]
+
+    def test_daily_counts(self) -> None:
+        """Should count active intervals regardless of weight."""
+        intervals = LoadIntervals.from_ranges(
+            [
+                (date(2024, 1, 1), date(2024, 1, 2), 0),
+                (date(2024, 1, 2), date(2024, 1, 2), 500),
+            ]
+        )
+
+        counts = intervals.daily_counts(date(2024, 1, 1), date(2024, 1, 3))
+
+        assert counts.tolist() == [1, 2, 0]
+
+    def test_empty_range_and_no_intervals(self) -> None:
+        """Should return empty or zero arrays without failing."""
+        empty = LoadIntervals.from_ranges([])
+
+        assert len(empty) == 0
+        assert empty.daily_totals(date(2024, 1, 1), date(2024, 1, 3)).tolist() == [0, 0, 0]
+        assert len(empty.daily_totals(date(2024, 1, 3), date(2024, 1, 1))) == 0
+
+    def test_active_on_keeps_input_order(self) -> None:
+        """Should return indices of intervals active on a day in input order."""
+        intervals = LoadIntervals.from_ranges(
+            [
+                (date(2024, 1, 5), date(2024, 1, 9), 1),
+                (date(2024, 1, 1), date(2024, 1, 2), 1),
+                (date(2024, 1, 1), date(2024, 1, 6), 1),
+            ]
+        )
+
+        assert intervals.active_on(date(2024, 1, 5)).tolist() == [0, 2]
+        assert intervals.active_on(date(2024, 1, 10)).tolist() == []
+
+
+class TestFirstFit:
+    """Tests for first_fit slot search."""
+
+    def test_first_free_start(self) -> None:
+        """Should return the first start whose whole span is free."""
+        start = date(2024, 1, 1)  # Monday
+        blocked = np.zeros(slot_window_days(1), dtype=bool)
+        blocked[1] = True
+
+        assert first_fit(start, blocked, 1) == 2
+
+    def test_skips_weekend_starts(self) -> None:
+        """Should never start on a Saturday or Sunday."""
+        start = date(2024, 1, 5)  # Friday
+        blocked = np.zeros(slot_window_days(0), dtype=bool)
+        blocked[0] = True
+
+        assert first_fit(start, blocked, 0) == 3
+
+    def test_returns_none_when_nothing_fits(self) -> None:
+        """Should return None when every candidate is blocked."""
+        blocked = np.ones(slot_window_days(2, candidates=5), dtype=bool)
+
+        assert first_fit(date(2024, 1, 1), blocked, 2, candidates=5) is None
@@ -285,6 +285,76 @@ class TestMonteCarloEngine:
         assert result["duration_results"]["p50"] > 0
 
 
+class TestChunkedSimulation:
+    """Tests for chunked (streaming) MonteCarloEngine runs."""
+
+    @staticmethod
+    def _input(**kwargs):
+        return SimulationInput(
+            activity_durations={
+                uuid4(): DistributionParams(
+                    distribution=DistributionType.PERT,
+                    min_value=float(i),
+                    mode=float(i + 3),
+                    max_value=float(i + 9),
+                )
+                for i in range(20)
+            },
+            activity_costs={
+                uuid4(): DistributionParams(
+                    distribution=DistributionType.UNIFORM,
+                    min_value=1000.0,
+                    max_value=2000.0,
+                )
+            },
+            **kwargs,
+        )
+
+    def test_chunked_statistics_close_to_full_run(self):
+        """Chunked percentiles estimate the same distribution."""
+        full = MonteCarloEngine(seed=1).simulate(self._input(iterations=20000, seed=1))
+        chunked = MonteCarloEngine(seed=1).simulate(
+            self._input(iterations=20000, seed=1, chunk_size=1000)
+        )
+
+        assert chunked.iterations == 20000
+        assert chunked.duration_samples.size == 0
+        assert chunked.duration_p80 == pytest.approx(full.duration_p80, rel=0.01)
+        assert chunked.duration_mean == pytest.approx(full.duration_mean, rel=0.01)
+        assert chunked.cost_p50 == pytest.approx(full.cost_p50, rel=0.02)
+        assert sum(chunked.duration_histogram_counts) == 20000
+
+    def test_progress_callback(self):
+        """Progress is published after every chunk."""
+        updates = []
+        MonteCarloEngine(seed=2).simulate(
+            self._input(iterations=2500, chunk_size=1000), progress_callback=updates.append
+        )
+
+        assert [u.iterations_completed for u in updates] == [1000, 2000, 2500]
+        assert updates[-1].progress_percent == 100.0
+
+    def test_early_stop(self):
+        """Convergence tolerance alone enables chunking and stops early."""
+        output = MonteCarloEngine(seed=3).simulate(
+            self._input(iterations=100000, convergence_tolerance=0.01)
+        )
+
+        assert output.converged
+        assert output.iterations < 100000
+
+    def test_activity_stats_streamed(self):
+        """Per-activity statistics are available in chunked mode."""
+        output = MonteCarloEngine(seed=4).simulate(
+            self._input(iterations=3000, chunk_size=1000, include_activity_stats=True)
+        )
+
+        assert output.activity_stats is not None
+        assert len(output.activity_stats) == 20
+        for stats in output.activity_stats.values():
+            assert stats["min"] <= stats["p10"] <= stats["p50"] <= stats["p90"] <= stats["max"]
+
+
 class TestTriangularDistribution:
     """Tests for triangular distribution sampling."""
 
@@ -1,10 +1,15 @@
 """Unit tests for optimized Monte Carlo engine."""
 
+import random
+from itertools import pairwise
 from uuid import uuid4
 
 import numpy as np
 import pytest
 
+from src.core.exceptions import CircularDependencyError
+from src.services.cpm import CPMEngine
+from src.services.cpm_network import compile_network
 from src.services.monte_carlo import DistributionParams, DistributionType
 from src.services.monte_carlo_optimized import (
     OptimizedNetworkMonteCarloEngine,
@@ -22,10 +27,10 @@ class MockActivity:
 class MockDependency:
     """Mock dependency for testing."""
 
-    def __init__(self, predecessor_id, successor_id, lag=0):
+    def __init__(self, predecessor_id, successor_id, lag=0, dependency_type="FS"):
         self.predecessor_id = predecessor_id
         self.successor_id = successor_id
-        self.dependency_type = "FS"
+        self.dependency_type = dependency_type
         self.lag = lag
 
 
@@ -475,6 +480,401 @@ class TestOptimizedMonteCarloEngineLag:
         assert output.project_duration_mean == pytest.approx(18.0, abs=0.1)
 
 
+class TestOptimizedMonteCarloEngineDependencyTypes:
+    """Tests for SS/FF/SF dependencies and float-based criticality."""
+
+    @staticmethod
+    def _fixed(value):
+        """Zero-variance triangular distribution."""
+        return DistributionParams(
+            distribution=DistributionType.TRIANGULAR,
+            min_value=value,
+            mode=value,
+            max_value=value,
+        )
+
+    @pytest.mark.parametrize(
+        ("dep_type", "lag", "expected"),
+        [
+            ("FS", 2, 17.0),  # B starts at 10 + 2
+            ("SS", 7, 12.0),  # B starts at 0 + 7
+            ("FF", 1, 11.0),  # B finishes at 10 + 1
+            ("SF", 4, 10.0),  # B finishes at 0 + 4, A drives the end
+        ],
+    )
+    def test_dependency_types_with_lag(self, dep_type, lag, expected):
+        """Each dependency type constrains the successor correctly."""
+        a_id, b_id = uuid4(), uuid4()
+        activities = [MockActivity(a_id, 10), MockActivity(b_id, 5)]
+        dependencies = [MockDependency(a_id, b_id, lag=lag, dependency_type=dep_type)]
+        distributions = {a_id: self._fixed(10), b_id: self._fixed(5)}
+
+        engine = OptimizedNetworkMonteCarloEngine(seed=42)
+        output = engine.simulate(activities, dependencies, distributions, iterations=10)
+
+        assert output.project_duration_mean == pytest.approx(expected)
+
+    def test_float_distributions_reported(self):
+        """Total float per activity is reported from the backward pass."""
+        a_id, b_id = uuid4(), uuid4()
+        activities = [MockActivity(a_id, 10), MockActivity(b_id, 5)]
+        dependencies = [MockDependency(a_id, b_id, lag=2, dependency_type="SS")]
+        distributions = {a_id: self._fixed(10), b_id: self._fixed(5)}
+
+        engine = OptimizedNetworkMonteCarloEngine(seed=42)
+        output = engine.simulate(activities, dependencies, distributions, iterations=10)
+
+        # B runs 2..7 against a project end of 10
+        assert output.activity_float_distributions[b_id]["mean"] == pytest.approx(3.0)
+        assert output.activity_float_distributions[a_id]["max"] == pytest.approx(0.0)
+        assert output.activity_criticality[a_id] == 100.0
+        assert output.activity_criticality[b_id] == 0.0
+
+    @pytest.mark.parametrize("seed", range(3))
+    def test_mixed_network_matches_cpm_engine(self, seed):
+        """Every iteration agrees with CPMEngine on duration and criticality."""
+        rng = random.Random(seed)
+        activities = [MockActivity(uuid4(), rng.randint(1, 10)) for _ in range(30)]
+        dependencies = []
+        for j in range(1, len(activities)):
+            for i in rng.sample(range(j), k=min(j, rng.randint(1, 3))):
+                dependencies.append(
+                    MockDependency(
+                        activities[i].id,
+                        activities[j].id,
+                        lag=rng.randint(-2, 3),
+                        dependency_type=rng.choice(["FS", "SS", "FF", "SF"]),
+                    )
+                )
+        distributions = {
+            a.id: DistributionParams(
+                distribution=DistributionType.TRIANGULAR,
+                min_value=a.duration * 0.5,
+                mode=a.duration,
+                max_value=a.duration * 2,
+            )
+            for a in activities
+        }
+        iterations = 50
+
+        engine = OptimizedNetworkMonteCarloEngine(seed=seed)
+        output = engine.simulate(activities, dependencies, distributions, iterations=iterations)
+
+        # Regenerate the same samples and run CPM per iteration
+        samples = OptimizedNetworkMonteCarloEngine(seed=seed)._generate_all_samples(
+            activities, distributions, iterations
+        )
+        critical_counts = dict.fromkeys((a.id for a in activities), 0)
+        for i in range(iterations):
+            sampled = [MockActivity(a.id, samples[i, j]) for j, a in enumerate(activities)]
+            results = CPMEngine(sampled, dependencies).calculate()
+            assert output.project_duration_samples[i] == pytest.approx(
+                max(r.early_finish for r in results.values())
+            )
+            for aid, result in results.items():
+                if result.total_float <= 1e-3:
+                    critical_counts[aid] += 1
+
+        for aid, count in critical_counts.items():
+            assert output.activity_criticality[aid] == pytest.approx(count / iterations * 100)
+
+
+def _legacy_trace_criticality(engine, activities, dependencies, distributions, iterations):
+    """Reference: per-iteration EF-equality trace used before float criticality."""
+    network = compile_network([a.id for a in activities], dependencies)
+    samples = engine._generate_all_samples(activities, distributions, iterations)
+    _, early_finish_t = engine._vectorized_forward_pass(np.ascontiguousarray(samples.T), network)
+    early_finish = early_finish_t.T
+    early_start = early_finish - samples
+    project_durations = early_finish.max(axis=1)
+    ptr, idx = network.pred_ptr, network.pred_idx
+
+    counts = np.zeros(len(activities))
+    for i in range(iterations):
+        stack = list(np.where(np.abs(early_finish[i] - project_durations[i]) < 0.001)[0])
+        visited = set()
+        while stack:
+            node = stack.pop()
+            if node in visited:
+                continue
+            visited.add(node)
+            counts[node] += 1
+            for pred in idx[ptr[node] : ptr[node + 1]]:
+                if abs(early_finish[i, pred] - early_start[i, node]) < 0.001:
+                    stack.append(pred)
+
+    return {a.id: float(counts[j] / iterations * 100) for j, a in enumerate(activities)}
+
+
+class TestOptimizedMonteCarloEngineCriticality:
+    """Float-based criticality matches the legacy trace on FS-only networks."""
+
+    @staticmethod
+    def _triangular(low, mode, high):
+        return DistributionParams(
+            distribution=DistributionType.TRIANGULAR,
+            min_value=low,
+            mode=mode,
+            max_value=high,
+        )
+
+    def _assert_matches_trace(self, activities, dependencies, distributions, iterations=300):
+        output = OptimizedNetworkMonteCarloEngine(seed=7).simulate(
+            activities, dependencies, distributions, iterations=iterations
+        )
+        expected = _legacy_trace_criticality(
+            OptimizedNetworkMonteCarloEngine(seed=7),
+            activities,
+            dependencies,
+            distributions,
+            iterations,
+        )
+        assert output.activity_criticality == expected
+
+    def test_chain_matches_trace(self):
+        """Chain topology: every activity critical in every iteration."""
+        activities = [MockActivity(uuid4(), 5) for _ in range(50)]
+        dependencies = [MockDependency(a.id, b.id) for a, b in pairwise(activities)]
+        distributions = {a.id: self._triangular(3, 5, 8) for a in activities}
+
+        self._assert_matches_trace(activities, dependencies, distributions)
+
+    def test_fan_out_fan_in_matches_trace(self):
+        """Parallel paths between zero-duration milestones."""
+        start, end = MockActivity(uuid4(), 0), MockActivity(uuid4(), 0)
+        middle = [MockActivity(uuid4(), 10) for _ in range(40)]
+        dependencies = [MockDependency(start.id, m.id) for m in middle]
+        dependencies += [MockDependency(m.id, end.id) for m in middle]
+        distributions = {
+            m.id: self._triangular(5 + i % 10, 10 + i % 10, 20 + i % 10)
+            for i, m in enumerate(middle)
+        }
+
+        self._assert_matches_trace([start, *middle, end], dependencies, distributions)
+
+    def test_random_fs_network_matches_trace(self):
+        """Random FS-only DAG with several sink activities."""
+        rng = random.Random(3)
+        activities = [MockActivity(uuid4(), rng.randint(2, 12)) for _ in range(80)]
+        dependencies = [
+            MockDependency(activities[i].id, activities[j].id)
+            for j in range(1, len(activities))
+            for i in {rng.randrange(max(0, j - 10), j) for _ in range(2)}
+        ]
+        distributions = {
+            a.id: self._triangular(a.duration * 0.7, a.duration, a.duration * 1.6)
+            for a in activities
+        }
+
+        self._assert_matches_trace(activities, dependencies, distributions)
+
+
+def _random_mixed_network(seed, count=60):
+    """Random DAG with mixed dependency types and triangular distributions."""
+    rng = random.Random(seed)
+    activities = [MockActivity(uuid4(), rng.randint(2, 12)) for _ in range(count)]
+    dependencies = [
+        MockDependency(
+            activities[i].id,
+            activities[j].id,
+            lag=rng.randint(0, 2),
+            dependency_type=rng.choice(["FS", "SS", "FF", "SF"]),
+        )
+        for j in range(1, count)
+        for i in {rng.randrange(max(0, j - 10), j) for _ in range(2)}
+    ]
+    distributions = {
+        a.id: DistributionParams(
+            distribution=DistributionType.TRIANGULAR,
+            min_value=a.duration * 0.7,
+            mode=a.duration,
+            max_value=a.duration * 1.8,
+        )
+        for a in activities
+    }
+    return activities, dependencies, distributions
+
+
+class TestOptimizedMonteCarloEngineChunked:
+    """Tests for chunked (streaming) execution."""
+
+    def test_single_chunk_matches_full_run_on_same_samples(self):
+        """Streaming statistics equal the in-memory ones for the same draws."""
+        activities, dependencies, distributions = _random_mixed_network(1)
+        iterations = 400
+
+        chunked = OptimizedNetworkMonteCarloEngine(seed=5).simulate(
+            activities, dependencies, distributions, iterations, chunk_size=iterations
+        )
+
+        # A chunked run draws its first chunk from the first spawned child
+        full_engine = OptimizedNetworkMonteCarloEngine(seed=5)
+        full_engine.rng = np.random.default_rng(np.random.SeedSequence(5).spawn(1)[0])
+        full = full_engine.simulate(activities, dependencies, distributions, iterations)
+
+        assert chunked.activity_criticality == full.activity_criticality
+        for aid in full.sensitivity:
+            assert chunked.sensitivity[aid] == pytest.approx(full.sensitivity[aid], abs=1e-9)
+        assert chunked.project_duration_mean == pytest.approx(full.project_duration_mean)
+        assert chunked.project_duration_std == pytest.approx(full.project_duration_std)
+        assert chunked.project_duration_max == full.project_duration_max
+
+        span = full.project_duration_max - full.project_duration_min
+        for q in ("p10", "p50", "p80", "p90"):
+            assert getattr(chunked, f"project_duration_{q}") == pytest.approx(
+                getattr(full, f"project_duration_{q}"), abs=span / 100
+            )
+
+    def test_chunked_run_is_reproducible(self):
+        """Same seed and chunk size give identical results."""
+        activities, dependencies, distributions = _random_mixed_network(2)
+
+        first, second = (
+            OptimizedNetworkMonteCarloEngine(seed=9).simulate(
+                activities, dependencies, distributions, 1000, chunk_size=300
+            )
+            for _ in range(2)
+        )
+
+        assert first.project_duration_p80 == second.project_duration_p80
+        assert first.activity_criticality == second.activity_criticality
+        assert first.project_duration_samples.size == 0
+        assert first.iterations == 1000
+        assert sum(first.duration_histogram_counts) == 1000
+
+    def test_progress_reported_after_each_chunk(self):
+        """The callback receives running estimates per chunk."""
+        activities, dependencies, distributions = _random_mixed_network(3)
+        updates = []
+
+        OptimizedNetworkMonteCarloEngine(seed=1).simulate(
+            activities,
+            dependencies,
+            distributions,
+            1000,
+            chunk_size=250,
+            progress_callback=updates.append,
+        )
+
+        assert [u.iterations_completed for u in updates] == [250, 500, 750, 1000]
+        assert updates[-1].progress_percent == 100.0
+        assert all(u.p10 <= u.p50 <= u.p80 <= u.p90 for u in updates)
+
+    def test_early_stop_on_convergence(self):
+        """A loose tolerance stops before all iterations are run."""
+        activities, dependencies, distributions = _random_mixed_network(4)
+
+        output = OptimizedNetworkMonteCarloEngine(seed=1).simulate(
+            activities,
+            dependencies,
+            distributions,
+            50_000,
+            chunk_size=500,
+            convergence_tolerance=0.05,
+        )
+
+        assert output.converged
+        assert output.iterations < 50_000
+        assert output.iterations % 500 == 0
+
+    def test_tight_tolerance_runs_all_iterations(self):
+        """An unreachable tolerance runs every requested iteration."""
+        activities, dependencies, distributions = _random_mixed_network(5)
+
+        output = OptimizedNetworkMonteCarloEngine(seed=1).simulate(
+            activities,
+            dependencies,
+            distributions,
+            2000,
+            chunk_size=500,
+            convergence_tolerance=1e-9,
+        )
+
+        assert not output.converged
+        assert output.iterations == 2000
+
+
+class TestOptimizedMonteCarloEngineParallel:
+    """Tests for process-parallel execution."""
+
+    def test_results_independent_of_worker_count(self):
+        """A seeded run gives identical output for any number of workers."""
+        activities, dependencies, distributions = _random_mixed_network(4)
+
+        outputs = [
+            OptimizedNetworkMonteCarloEngine(seed=11).simulate(
+                activities, dependencies, distributions, 1500, chunk_size=400, workers=workers
+            )
+            for workers in (1, 2, 3)
+        ]
+
+        first = outputs[0]
+        assert first.iterations == 1500
+        for other in outputs[1:]:
+            assert other.project_duration_p80 == first.project_duration_p80
+            assert other.project_duration_mean == first.project_duration_mean
+            assert other.activity_criticality == first.activity_criticality
+            assert other.sensitivity == first.sensitivity
+            assert other.activity_float_distributions == first.activity_float_distributions
+
+    def test_parallel_matches_full_run_statistically(self):
+        """Merged partial statistics agree with an in-memory run."""
+        activities, dependencies, distributions = _random_mixed_network(5)
+
+        parallel = OptimizedNetworkMonteCarloEngine(seed=3).simulate(
+            activities, dependencies, distributions, 4000, chunk_size=1000, workers=2
+        )
+        full = OptimizedNetworkMonteCarloEngine(seed=3).simulate(
+            activities, dependencies, distributions, 4000
+        )
+
+        assert parallel.project_duration_samples.size == 0
+        assert sum(parallel.duration_histogram_counts) == 4000
+        assert parallel.project_duration_mean == pytest.approx(full.project_duration_mean, rel=0.02)
+        assert parallel.project_duration_p80 == pytest.approx(full.project_duration_p80, rel=0.02)
+        for aid, criticality in full.activity_criticality.items():
+            assert parallel.activity_criticality[aid] == pytest.approx(criticality, abs=5.0)
+
+    def test_early_stop_independent_of_worker_count(self):
+        """Convergence is checked in task order, so it stops at the same task."""
+        activities, dependencies, distributions = _random_mixed_network(6)
+
+        single, multi = (
+            OptimizedNetworkMonteCarloEngine(seed=2).simulate(
+                activities,
+                dependencies,
+                distributions,
+                20_000,
+                chunk_size=500,
+                convergence_tolerance=0.01,
+                workers=workers,
+            )
+            for workers in (1, 2)
+        )
+
+        assert single.converged
+        assert single.iterations < 20_000
+        assert multi.iterations == single.iterations
+        assert multi.project_duration_p80 == single.project_duration_p80
+
+    def test_progress_reported_in_task_order(self):
+        """The callback sees iteration counts grow by one task at a time."""
+        activities, dependencies, distributions = _random_mixed_network(7)
+        updates = []
+
+        OptimizedNetworkMonteCarloEngine(seed=1).simulate(
+            activities,
+            dependencies,
+            distributions,
+            1000,
+            chunk_size=300,
+            progress_callback=updates.append,
+            workers=2,
+        )
+
+        assert [u.iterations_completed for u in updates] == [300, 600, 900, 1000]
+
+
 class TestOptimizedMonteCarloEnginePerformance:
     """Performance tests for optimized Monte Carlo simulation."""
 
@@ -688,3 +1088,14 @@ class TestOptimizedMonteCarloEngineEdgeCases:
         np.testing.assert_array_almost_equal(
             output1.project_duration_samples, output2.project_duration_samples
         )
+
+    def test_circular_dependency_raises(self):
+        """Should reject cyclic networks like CPMEngine does."""
+        a_id, b_id = uuid4(), uuid4()
+        activities = [MockActivity(a_id, 5), MockActivity(b_id, 5)]
+        dependencies = [MockDependency(a_id, b_id), MockDependency(b_id, a_id)]
+
+        engine = OptimizedNetworkMonteCarloEngine(seed=42)
+
+        with pytest.raises(CircularDependencyError):
+            engine.simulate(activities, dependencies, {}, iterations=10)
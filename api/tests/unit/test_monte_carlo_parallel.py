@@ -0,0 +1,61 @@
+"""Unit tests for process-parallel Monte Carlo helpers."""
+
+import numpy as np
+import pytest
+
+from src.services.monte_carlo_parallel import (
+    SharedArrays,
+    attach_shared_arrays,
+    resolve_workers,
+    spawn_task_seeds,
+)
+
+
+class TestSharedArrays:
+    """Tests for shared memory array packing."""
+
+    def test_round_trip(self):
+        """Attached views see the packed arrays and writes are shared."""
+        arrays = {
+            "ptr": np.arange(5, dtype=np.int64),
+            "types": np.array([0, 1, 3], dtype=np.int8),
+            "values": np.linspace(0.0, 1.0, 12).reshape(3, 4),
+        }
+
+        with SharedArrays(arrays) as shared:
+            shm, views = attach_shared_arrays(shared.spec)
+            try:
+                for name, array in arrays.items():
+                    np.testing.assert_array_equal(views[name], array)
+                    assert views[name].dtype == array.dtype
+
+                views["values"][0, 0] = 42.0
+                assert shared.arrays["values"][0, 0] == 42.0
+            finally:
+                views.clear()
+                shm.close()
+
+    def test_empty_arrays(self):
+        """Blocks holding only empty arrays can still be created."""
+        with SharedArrays({"edges": np.empty(0, dtype=np.int64)}) as shared:
+            assert shared.arrays["edges"].size == 0
+
+
+class TestSeedsAndWorkers:
+    """Tests for task seeding and worker counts."""
+
+    def test_task_seeds_match_sequential_spawning(self):
+        """Task k's stream equals the k-th child spawned one at a time."""
+        sequential = np.random.SeedSequence(5)
+        expected = [np.random.default_rng(sequential.spawn(1)[0]).random(3) for _ in range(4)]
+
+        actual = [np.random.default_rng(s).random(3) for s in spawn_task_seeds(5, 4)]
+
+        np.testing.assert_array_equal(actual, expected)
+
+    def test_resolve_workers(self):
+        """Zero means one per CPU; negative counts are rejected."""
+        assert resolve_workers(3) == 3
+        assert resolve_workers(0) >= 1
+        with pytest.raises(ValueError):
+            resolve_workers(-1)
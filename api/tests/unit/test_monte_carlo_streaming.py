@@ -0,0 +1,217 @@
+"""Unit tests for streaming Monte Carlo statistics."""
+
+import numpy as np
+import pytest
+
+from src.services.monte_carlo_streaming import (
+    MIN_ITERATIONS_BEFORE_STOP,
+    CorrelationAccumulator,
+    QuantileHistogram,
+    SimulationProgress,
+    chunk_sizes,
+    progress_from_histogram,
+)
+
+
+def _skewed_samples(size: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).gamma(3.0, 10.0, size=size) + 100.0
+
+
+class TestChunkSizes:
+    """Tests for batch splitting."""
+
+    def test_even_split(self):
+        """Iterations divisible by the chunk size give equal batches."""
+        assert chunk_sizes(3000, 1000) == [1000, 1000, 1000]
+
+    def test_remainder(self):
+        """The last batch holds the remainder."""
+        assert chunk_sizes(2500, 1000) == [1000, 1000, 500]
+
+    def test_invalid_chunk_size(self):
+        """Non-positive chunk sizes are rejected."""
+        with pytest.raises(ValueError):
+            chunk_sizes(100, 0)
+
+
+class TestQuantileHistogram:
+    """Tests for the mergeable histogram sketch."""
+
+    def test_quantiles_close_to_exact(self):
+        """Streamed quantiles agree with np.percentile within bin resolution."""
+        samples = _skewed_samples(50_000)
+        hist = QuantileHistogram()
+        for batch in np.array_split(samples, 50):
+            hist.update(batch)
+
+        estimate = hist.quantiles([0.1, 0.5, 0.8, 0.9])[0]
+        exact = np.percentile(samples, [10, 50, 80, 90])
+        span = samples.max() - samples.min()
+
+        np.testing.assert_allclose(estimate, exact, atol=span / 512)
+
+    def test_moments_are_exact(self):
+        """Mean, std, min and max do not depend on binning."""
+        samples = _skewed_samples(10_000)
+        hist = QuantileHistogram()
+        for batch in np.array_split(samples, 7):
+            hist.update(batch)
+
+        assert hist.count == 10_000
+        assert hist.mean[0] == pytest.approx(samples.mean())
+        assert hist.std[0] == pytest.approx(samples.std())
+        assert hist.minimum[0] == samples.min()
+        assert hist.maximum[0] == samples.max()
+
+    def test_range_grows_without_clipping(self):
+        """Values far outside the first batch's range are still counted."""
+        hist = QuantileHistogram(bins=64)
+        hist.update(np.full(10, 5.0))
+        hist.update(np.array([1000.0, -3.0]))
+
+        assert hist.counts.sum() == 12
+        low, high = hist.quantiles([0.0, 1.0])[0]
+        assert low == -3.0
+        assert high == 1000.0
+
+    def test_merge_matches_single_histogram(self):
+        """Merging partial histograms matches feeding one histogram."""
+        samples = _skewed_samples(20_000, seed=1)
+        whole = QuantileHistogram()
+        whole.update(samples)
+
+        left, right = QuantileHistogram(), QuantileHistogram()
+        left.update(samples[:5_000])
+        right.update(samples[5_000:] * 1.0)
+        left.merge(right)
+
+        assert left.count == whole.count
+        assert left.mean[0] == pytest.approx(whole.mean[0])
+        assert left.std[0] == pytest.approx(whole.std[0])
+        width = max(left.width[0], right.width[0], whole.width[0])
+        np.testing.assert_allclose(
+            left.quantiles([0.1, 0.5, 0.9]), whole.quantiles([0.1, 0.5, 0.9]), atol=2 * width
+        )
+
+    def test_merge_into_empty(self):
+        """Merging into an empty histogram copies the other."""
+        other = QuantileHistogram()
+        other.update(_skewed_samples(100))
+        empty = QuantileHistogram()
+        empty.merge(other)
+
+        np.testing.assert_array_equal(empty.counts, other.counts)
+        assert empty.count == 100
+
+    def test_multiple_series(self):
+        """Each series is binned on its own scale."""
+        rng = np.random.default_rng(2)
+        values = rng.normal(size=(3, 20_000)) * np.array([[1.0], [10.0], [100.0]])
+        hist = QuantileHistogram(3, bins=256)
+        for batch in np.array_split(values, 10, axis=1):
+            hist.update(batch)
+
+        estimate = hist.quantiles([0.1, 0.5, 0.9])
+        exact = np.percentile(values, [10, 50, 90], axis=1).T
+        scale = np.array([[1.0], [10.0], [100.0]])
+        np.testing.assert_allclose(estimate / scale, exact / scale, atol=0.05)
+
+    def test_histogram_output(self):
+        """Coarsened histogram keeps every observation."""
+        hist = QuantileHistogram()
+        hist.update(_skewed_samples(5_000))
+
+        edges, counts = hist.histogram(max_bins=40)
+
+        assert len(counts) <= 40
+        assert len(edges) == len(counts) + 1
+        assert counts.sum() == 5_000
+        assert edges[0] <= hist.minimum[0]
+        assert edges[-1] >= hist.maximum[0]
+
+    def test_odd_bins_rejected(self):
+        """Bin counts must be even so ranges can double."""
+        with pytest.raises(ValueError):
+            QuantileHistogram(bins=3)
+
+
+class TestCorrelationAccumulator:
+    """Tests for streaming Pearson correlation."""
+
+    def test_matches_corrcoef(self):
+        """Batched co-moments give the exact correlation."""
+        rng = np.random.default_rng(3)
+        x = rng.normal(size=(4, 3_000))
+        y = 2 * x[0] + x[1] + rng.normal(size=3_000)
+
+        acc = CorrelationAccumulator(4)
+        for cols in np.array_split(np.arange(3_000), 3):
+            acc.update(x[:, cols], y[cols])
+
+        expected = [np.corrcoef(x[j], y)[0, 1] for j in range(4)]
+        np.testing.assert_allclose(acc.correlation(), expected)
+
+    def test_merge(self):
+        """Merged accumulators equal one accumulator over all batches."""
+        rng = np.random.default_rng(4)
+        x = rng.normal(size=(2, 1_000))
+        y = x[0] + rng.normal(size=1_000)
+
+        left, right, whole = (CorrelationAccumulator(2) for _ in range(3))
+        left.update(x[:, :400], y[:400])
+        right.update(x[:, 400:], y[400:])
+        whole.update(x, y)
+        left.merge(right)
+
+        np.testing.assert_allclose(left.correlation(), whole.correlation())
+
+    def test_constant_series_is_zero(self):
+        """Series without variance have zero correlation."""
+        acc = CorrelationAccumulator(1)
+        acc.update(np.ones((1, 50)), np.arange(50.0))
+
+        assert acc.correlation()[0] == 0.0
+
+
+class TestSimulationProgress:
+    """Tests for progress summaries and convergence."""
+
+    def test_progress_from_histogram(self):
+        """Progress carries percentiles and a P80 interval around P80."""
+        hist = QuantileHistogram()
+        hist.update(_skewed_samples(2_000))
+
+        progress = progress_from_histogram(hist, 4_000)
+
+        assert progress.iterations_completed == 2_000
+        assert progress.progress_percent == 50.0
+        assert progress.p10 < progress.p50 < progress.p80 < progress.p90
+        assert progress.p80_ci_low <= progress.p80 <= progress.p80_ci_high
+
+    def test_interval_narrows_with_iterations(self):
+        """More iterations give a tighter P80 interval."""
+        samples = _skewed_samples(40_000)
+        hist = QuantileHistogram()
+        hist.update(samples[:2_000])
+        early = progress_from_histogram(hist, 40_000).p80_relative_half_width
+        hist.update(samples[2_000:])
+        late = progress_from_histogram(hist, 40_000).p80_relative_half_width
+
+        assert late < early
+
+    def test_has_converged_requires_minimum_iterations(self):
+        """Early stopping never triggers before the minimum iteration count."""
+        progress = SimulationProgress(
+            iterations_completed=MIN_ITERATIONS_BEFORE_STOP - 1,
+            total_iterations=10_000,
+            p10=1.0,
+            p50=2.0,
+            p80=3.0,
+            p90=4.0,
+            p80_ci_low=3.0,
+            p80_ci_high=3.0,
+        )
+        assert not progress.has_converged(0.01)
+
+        progress.iterations_completed = MIN_ITERATIONS_BEFORE_STOP
+        assert progress.has_converged(0.01)
@@ -9,7 +9,7 @@ Tests the over-allocation detection logic including:
 
 from __future__ import annotations
 
-from datetime import date
+from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
@@ -196,108 +196,102 @@ class TestProgramOverallocationReport:
         assert report.total_affected_days == 5
 
 
+def _resource(code: str = "ENG-001", capacity: str = "8.00") -> MagicMock:
+    """Create a mock resource with a daily capacity."""
+    resource = MagicMock()
+    resource.id = uuid4()
+    resource.code = code
+    resource.name = "Test Engineer"
+    resource.capacity_per_day = Decimal(capacity)
+    resource.calendar_template = None
+    return resource
+
+
+def _assignment(
+    resource: MagicMock,
+    start: date,
+    finish: date,
+    units: str = "1.00",
+    activity: MagicMock | None = None,
+) -> MagicMock:
+    """Create a mock assignment with explicit dates."""
+    assignment = MagicMock()
+    assignment.resource_id = resource.id
+    assignment.activity_id = activity.id if activity is not None else uuid4()
+    assignment.activity = activity
+    assignment.start_date = start
+    assignment.finish_date = finish
+    assignment.units = Decimal(units)
+    return assignment
+
+
+def _calendar_entry(
+    resource: MagicMock, day: date, hours: str, is_working_day: bool = True
+) -> MagicMock:
+    """Create a mock resource calendar entry."""
+    entry = MagicMock()
+    entry.resource_id = resource.id
+    entry.calendar_date = day
+    entry.available_hours = Decimal(hours)
+    entry.is_working_day = is_working_day
+    return entry
+
+
+def _single_resource_service(
+    resource: MagicMock | None,
+    assignments: list[MagicMock],
+    calendar_entries: list[MagicMock] | None = None,
+) -> OverallocationService:
+    """Create a service whose repositories return the given rows."""
+    service = OverallocationService(MagicMock())
+    service._resource_repo = MagicMock()
+    service._resource_repo.get_by_id = AsyncMock(return_value=resource)
+    service._assignment_repo = MagicMock()
+    service._assignment_repo.get_assignments_with_activities = AsyncMock(return_value=assignments)
+    service._calendar_repo = MagicMock()
+    service._calendar_repo.get_for_date_range = AsyncMock(return_value=calendar_entries or [])
+    return service
+
+
 class TestDetectResourceOverallocations:
     """Tests for detect_resource_overallocations method."""
 
     @pytest.mark.asyncio
     async def test_detect_single_day_overallocation(self) -> None:
         """Should detect single day over-allocation."""
-        mock_session = MagicMock()
-        service = OverallocationService(mock_session)
+        resource = _resource()
+        # 10 hours on Jan 15, 8 hours on Jan 16
+        full = _assignment(resource, date(2024, 1, 15), date(2024, 1, 16))
+        extra = _assignment(resource, date(2024, 1, 15), date(2024, 1, 15), "0.25")
+        service = _single_resource_service(resource, [full, extra])
 
-        resource_id = uuid4()
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "ENG-001"
-        mock_resource.name = "Test Engineer"
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        # Mock loading service to return over-allocation on Jan 15
-        with patch.object(
-            service._loading_service,
-            "calculate_daily_loading",
-            new_callable=AsyncMock,
-        ) as mock_loading:
-            mock_loading.return_value = {
-                date(2024, 1, 15): ResourceLoadingDay(
-                    date=date(2024, 1, 15),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("10.0"),  # Over-allocated
-                ),
-                date(2024, 1, 16): ResourceLoadingDay(
-                    date=date(2024, 1, 16),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("6.0"),  # Not over-allocated
-                ),
-            }
-
-            with patch.object(
-                service,
-                "get_affected_activities",
-                new_callable=AsyncMock,
-            ) as mock_affected:
-                mock_affected.return_value = [uuid4()]
-
-                result = await service.detect_resource_overallocations(
-                    resource_id, date(2024, 1, 15), date(2024, 1, 16)
-                )
+        result = await service.detect_resource_overallocations(
+            resource.id, date(2024, 1, 15), date(2024, 1, 16)
+        )
 
         assert len(result) == 1
         assert result[0].start_date == date(2024, 1, 15)
         assert result[0].end_date == date(2024, 1, 15)
+        assert result[0].peak_assigned == Decimal("10.0")
+        assert result[0].peak_available == Decimal("8.0")
         assert result[0].peak_excess == Decimal("2.0")
+        assert set(result[0].affected_activities) == {full.activity_id, extra.activity_id}
 
     @pytest.mark.asyncio
     async def test_detect_multi_day_overallocation(self) -> None:
         """Should detect and merge consecutive over-allocated days."""
-        mock_session = MagicMock()
-        service = OverallocationService(mock_session)
+        resource = _resource()
+        # 10, 12 and 10 hours on Jan 15-17
+        assignments = [
+            _assignment(resource, date(2024, 1, 15), date(2024, 1, 17)),
+            _assignment(resource, date(2024, 1, 15), date(2024, 1, 16), "0.25"),
+            _assignment(resource, date(2024, 1, 16), date(2024, 1, 17), "0.25"),
+        ]
+        service = _single_resource_service(resource, assignments)
 
-        resource_id = uuid4()
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "ENG-001"
-        mock_resource.name = "Test Engineer"
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        # Mock loading service to return over-allocation on Jan 15-17
-        with patch.object(
-            service._loading_service,
-            "calculate_daily_loading",
-            new_callable=AsyncMock,
-        ) as mock_loading:
-            mock_loading.return_value = {
-                date(2024, 1, 15): ResourceLoadingDay(
-                    date=date(2024, 1, 15),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("10.0"),
-                ),
-                date(2024, 1, 16): ResourceLoadingDay(
-                    date=date(2024, 1, 16),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("12.0"),  # Higher excess
-                ),
-                date(2024, 1, 17): ResourceLoadingDay(
-                    date=date(2024, 1, 17),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("9.0"),
-                ),
-            }
-
-            with patch.object(
-                service,
-                "get_affected_activities",
-                new_callable=AsyncMock,
-            ) as mock_affected:
-                mock_affected.return_value = [uuid4()]
-
-                result = await service.detect_resource_overallocations(
-                    resource_id, date(2024, 1, 15), date(2024, 1, 17)
-                )
+        result = await service.detect_resource_overallocations(
+            resource.id, date(2024, 1, 15), date(2024, 1, 17)
+        )
 
         assert len(result) == 1
         assert result[0].start_date == date(2024, 1, 15)
@@ -308,117 +302,123 @@ class TestDetectResourceOverallocations:
     @pytest.mark.asyncio
     async def test_no_overallocation_when_under_capacity(self) -> None:
         """Should return empty list when no over-allocation."""
-        mock_session = MagicMock()
-        service = OverallocationService(mock_session)
+        resource = _resource()
+        # Exactly at capacity on Jan 15-16
+        assignments = [
+            _assignment(resource, date(2024, 1, 15), date(2024, 1, 16), "0.75"),
+            _assignment(resource, date(2024, 1, 16), date(2024, 1, 16), "0.25"),
+        ]
+        service = _single_resource_service(resource, assignments)
 
-        resource_id = uuid4()
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "ENG-001"
-        mock_resource.name = "Test Engineer"
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        with patch.object(
-            service._loading_service,
-            "calculate_daily_loading",
-            new_callable=AsyncMock,
-        ) as mock_loading:
-            mock_loading.return_value = {
-                date(2024, 1, 15): ResourceLoadingDay(
-                    date=date(2024, 1, 15),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("6.0"),  # Under capacity
-                ),
-                date(2024, 1, 16): ResourceLoadingDay(
-                    date=date(2024, 1, 16),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("8.0"),  # Exactly at capacity
-                ),
-            }
-
-            result = await service.detect_resource_overallocations(
-                resource_id, date(2024, 1, 15), date(2024, 1, 16)
-            )
+        result = await service.detect_resource_overallocations(
+            resource.id, date(2024, 1, 15), date(2024, 1, 16)
+        )
 
         assert len(result) == 0
 
     @pytest.mark.asyncio
     async def test_nonexistent_resource_returns_empty(self) -> None:
         """Should return empty list for nonexistent resource."""
-        mock_session = MagicMock()
-        service = OverallocationService(mock_session)
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=None)
+        service = _single_resource_service(None, [])
 
         result = await service.detect_resource_overallocations(
             uuid4(), date(2024, 1, 15), date(2024, 1, 16)
         )
 
         assert result == []
+        service._assignment_repo.get_assignments_with_activities.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_detect_separate_periods(self) -> None:
         """Should detect multiple separate over-allocation periods."""
-        mock_session = MagicMock()
-        service = OverallocationService(mock_session)
-
-        resource_id = uuid4()
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "ENG-001"
-        mock_resource.name = "Test Engineer"
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
+        resource = _resource()
         # Over-allocation on Jan 15 and Jan 18 (not consecutive)
-        with patch.object(
-            service._loading_service,
-            "calculate_daily_loading",
-            new_callable=AsyncMock,
-        ) as mock_loading:
-            mock_loading.return_value = {
-                date(2024, 1, 15): ResourceLoadingDay(
-                    date=date(2024, 1, 15),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("10.0"),  # Over-allocated
-                ),
-                date(2024, 1, 16): ResourceLoadingDay(
-                    date=date(2024, 1, 16),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("6.0"),  # Not over-allocated
-                ),
-                date(2024, 1, 17): ResourceLoadingDay(
-                    date=date(2024, 1, 17),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("7.0"),  # Not over-allocated
-                ),
-                date(2024, 1, 18): ResourceLoadingDay(
-                    date=date(2024, 1, 18),
-                    available_hours=Decimal("8.0"),
-                    assigned_hours=Decimal("12.0"),  # Over-allocated
-                ),
-            }
-
-            with patch.object(
-                service,
-                "get_affected_activities",
-                new_callable=AsyncMock,
-            ) as mock_affected:
-                mock_affected.return_value = [uuid4()]
-
-                result = await service.detect_resource_overallocations(
-                    resource_id, date(2024, 1, 15), date(2024, 1, 18)
-                )
+        first = _assignment(resource, date(2024, 1, 15), date(2024, 1, 15), "1.25")
+        second = _assignment(resource, date(2024, 1, 18), date(2024, 1, 18), "1.50")
+        service = _single_resource_service(resource, [first, second])
+
+        result = await service.detect_resource_overallocations(
+            resource.id, date(2024, 1, 15), date(2024, 1, 18)
+        )
 
         assert len(result) == 2
         assert result[0].start_date == date(2024, 1, 15)
         assert result[0].end_date == date(2024, 1, 15)
+        assert result[0].affected_activities == [first.activity_id]
         assert result[1].start_date == date(2024, 1, 18)
         assert result[1].end_date == date(2024, 1, 18)
+        assert result[1].affected_activities == [second.activity_id]
+
+    @pytest.mark.asyncio
+    async def test_weekend_work_is_overallocated(self) -> None:
+        """Should flag any work on weekends without calendar entries."""
+        resource = _resource()
+        # Jan 13-14, 2024 is a weekend
+        assignment = _assignment(resource, date(2024, 1, 12), date(2024, 1, 15), "0.50")
+        service = _single_resource_service(resource, [assignment])
+
+        result = await service.detect_resource_overallocations(
+            resource.id, date(2024, 1, 12), date(2024, 1, 15)
+        )
+
+        assert len(result) == 1
+        assert result[0].start_date == date(2024, 1, 13)
+        assert result[0].end_date == date(2024, 1, 14)
+        assert result[0].peak_available == Decimal("0")
+        assert result[0].peak_excess == Decimal("4.0")
+
+    @pytest.mark.asyncio
+    async def test_calendar_entries_override_capacity(self) -> None:
+        """Should use calendar hours and non-working days when present."""
+        resource = _resource()
+        assignment = _assignment(resource, date(2024, 1, 15), date(2024, 1, 17))
+        calendar = [
+            _calendar_entry(resource, date(2024, 1, 15), "6.00"),
+            _calendar_entry(resource, date(2024, 1, 17), "8.00", is_working_day=False),
+        ]
+        service = _single_resource_service(resource, [assignment], calendar)
+
+        result = await service.detect_resource_overallocations(
+            resource.id, date(2024, 1, 15), date(2024, 1, 17)
+        )
+
+        assert [(p.start_date, p.end_date) for p in result] == [
+            (date(2024, 1, 15), date(2024, 1, 15)),
+            (date(2024, 1, 17), date(2024, 1, 17)),
+        ]
+        assert result[0].peak_available == Decimal("6.00")
+        assert result[1].peak_available == Decimal("0")
+        assert result[1].peak_excess == Decimal("8.00")
+
+    @pytest.mark.asyncio
+    async def test_matches_daily_loading(self) -> None:
+        """Should flag the same days as ResourceLoadingService."""
+        resource = _resource(capacity="7.50")
+        assignments = [
+            _assignment(resource, date(2024, 1, 1), date(2024, 2, 20), "0.65"),
+            _assignment(resource, date(2024, 1, 20), date(2024, 3, 10), "0.40"),
+            _assignment(resource, date(2024, 2, 1), date(2024, 2, 3), "0.33"),
+        ]
+        calendar = [_calendar_entry(resource, date(2024, 2, 5), "4.00")]
+        service = _single_resource_service(resource, assignments, calendar)
+        loading_service = service._loading_service
+        loading_service._resource_repo = service._resource_repo
+        loading_service._assignment_repo = service._assignment_repo
+        loading_service._calendar_repo = service._calendar_repo
+
+        result = await service.detect_resource_overallocations(
+            resource.id, date(2024, 1, 1), date(2024, 3, 31)
+        )
+        expected = await loading_service.get_overallocated_dates(
+            resource.id, date(2024, 1, 1), date(2024, 3, 31)
+        )
+
+        detected = [
+            period.start_date + timedelta(days=offset)
+            for period in result
+            for offset in range(period.duration_days)
+        ]
+        assert detected == expected
 
 
 class TestAffectedActivitiesIdentification:
@@ -767,76 +767,152 @@ class TestCalculatePeakExcess:
         assert peak_excess == Decimal("0")
 
 
+def _activity(is_critical: bool = False, is_deleted: bool = False) -> MagicMock:
+    """Create a mock activity without schedule dates."""
+    activity = MagicMock()
+    activity.id = uuid4()
+    activity.is_critical = is_critical
+    activity.is_deleted = is_deleted
+    activity.planned_start = None
+    activity.planned_finish = None
+    activity.early_start = None
+    activity.early_finish = None
+    return activity
+
+
+def _program_service(
+    resources: list[MagicMock],
+    assignments: list[MagicMock],
+    calendar_entries: list[MagicMock] | None = None,
+) -> OverallocationService:
+    """Create a service whose batch repository queries return the given rows."""
+    service = OverallocationService(MagicMock())
+    service._resource_repo = MagicMock()
+    service._resource_repo.get_by_program = AsyncMock(return_value=(resources, len(resources)))
+    service._resource_repo.get_by_id = AsyncMock()
+    service._assignment_repo = MagicMock()
+    service._assignment_repo.get_assignments_for_resources = AsyncMock(return_value=assignments)
+    service._assignment_repo.get_assignments_with_activities = AsyncMock()
+    service._calendar_repo = MagicMock()
+    service._calendar_repo.get_for_resources_date_range = AsyncMock(
+        return_value=calendar_entries or []
+    )
+    service._calendar_repo.get_for_date_range = AsyncMock()
+    service._activity_repo = MagicMock()
+    service._activity_repo.get_by_id = AsyncMock()
+    return service
+
+
 class TestDetectProgramOverallocations:
     """Tests for detect_program_overallocations method."""
 
+    @pytest.fixture
+    def mock_program(self) -> MagicMock:
+        """Program spanning 2024."""
+        program = MagicMock()
+        program.start_date = date(2024, 1, 1)
+        program.end_date = date(2024, 12, 31)
+        return program
+
+    async def _detect(
+        self,
+        service: OverallocationService,
+        program: MagicMock,
+        start_date: date | None = date(2024, 1, 1),
+        end_date: date | None = date(2024, 1, 31),
+    ) -> ProgramOverallocationReport:
+        with patch("src.services.overallocation.ProgramRepository") as mock_prog_repo_class:
+            mock_prog_repo = MagicMock()
+            mock_prog_repo.get_by_id = AsyncMock(return_value=program)
+            mock_prog_repo_class.return_value = mock_prog_repo
+            return await service.detect_program_overallocations(uuid4(), start_date, end_date)
+
     @pytest.mark.asyncio
-    async def test_detect_program_overallocations(self) -> None:
+    async def test_detect_program_overallocations(self, mock_program: MagicMock) -> None:
         """Should analyze all resources in program."""
-        mock_session = MagicMock()
-        service = OverallocationService(mock_session)
+        resource1 = _resource("ENG-001")
+        resource2 = _resource("ENG-002")
+        assignments = [
+            _assignment(resource1, date(2024, 1, 15), date(2024, 1, 17), "1.25"),
+            _assignment(resource2, date(2024, 1, 15), date(2024, 1, 17), "0.50"),
+        ]
+        service = _program_service([resource1, resource2], assignments)
 
-        program_id = uuid4()
-        resource1_id = uuid4()
-        resource2_id = uuid4()
+        result = await self._detect(service, mock_program)
+
+        assert result.total_overallocations == 1
+        assert result.resources_affected == 1
+        assert len(result.periods) == 1
+        assert result.periods[0].resource_id == resource1.id
+        assert result.periods[0].start_date == date(2024, 1, 15)
+        assert result.periods[0].end_date == date(2024, 1, 17)
+        assert result.critical_path_affected is False
 
-        # Mock program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2024, 1, 1)
-        mock_program.end_date = date(2024, 12, 31)
+    @pytest.mark.asyncio
+    async def test_loads_program_with_batch_queries(self, mock_program: MagicMock) -> None:
+        """Should load every resource with one query per table, not per resource."""
+        resources = [_resource(f"ENG-{i:03d}") for i in range(20)]
+        assignments = [
+            _assignment(resource, date(2024, 1, 8), date(2024, 1, 12), units)
+            for resource in resources
+            for units in ("0.75", "0.50")
+        ]
+        calendar = [_calendar_entry(resources[0], date(2024, 1, 8), "16.00")]
+        service = _program_service(resources, assignments, calendar)
 
-        # Mock resources
-        mock_resource1 = MagicMock()
-        mock_resource1.id = resource1_id
-        mock_resource2 = MagicMock()
-        mock_resource2.id = resource2_id
+        result = await self._detect(service, mock_program)
 
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_program = AsyncMock(
-            return_value=([mock_resource1, mock_resource2], 2)
+        service._assignment_repo.get_assignments_for_resources.assert_awaited_once_with(
+            [resource.id for resource in resources]
         )
+        service._calendar_repo.get_for_resources_date_range.assert_awaited_once()
+        service._resource_repo.get_by_id.assert_not_called()
+        service._assignment_repo.get_assignments_with_activities.assert_not_called()
+        service._calendar_repo.get_for_date_range.assert_not_called()
+        service._activity_repo.get_by_id.assert_not_called()
+        assert result.resources_affected == 20
+        # Calendar gives resources[0] 16 hours on Jan 8, splitting its period
+        assert result.total_overallocations == 20
+        assert result.periods[0].start_date == date(2024, 1, 9)
 
-        # Mock period for resource1 only
-        mock_period = OverallocationPeriod(
-            resource_id=resource1_id,
-            resource_code="ENG-001",
-            resource_name="Engineer",
-            start_date=date(2024, 1, 15),
-            end_date=date(2024, 1, 17),
-            peak_assigned=Decimal("10.0"),
-            peak_available=Decimal("8.0"),
-            peak_excess=Decimal("2.0"),
-            affected_activities=[],
-        )
+    @pytest.mark.asyncio
+    async def test_uses_program_dates_by_default(self, mock_program: MagicMock) -> None:
+        """Should analyze the program date range when no dates are given."""
+        service = _program_service([], [])
+
+        result = await self._detect(service, mock_program, start_date=None, end_date=None)
 
-        with patch.object(
-            service,
-            "detect_resource_overallocations",
-            new_callable=AsyncMock,
-        ) as mock_detect:
-            # Return period for resource1, empty for resource2
-            mock_detect.side_effect = [
-                [mock_period],  # resource1
-                [],  # resource2
-            ]
-
-            with patch.object(
-                service,
-                "check_critical_path_impact",
-                new_callable=AsyncMock,
-            ) as mock_critical:
-                mock_critical.return_value = False
-
-                with patch("src.services.overallocation.ProgramRepository") as mock_prog_repo_class:
-                    mock_prog_repo = MagicMock()
-                    mock_prog_repo.get_by_id = AsyncMock(return_value=mock_program)
-                    mock_prog_repo_class.return_value = mock_prog_repo
-
-                    result = await service.detect_program_overallocations(
-                        program_id, date(2024, 1, 1), date(2024, 1, 31)
-                    )
+        assert result.analysis_start == date(2024, 1, 1)
+        assert result.analysis_end == date(2024, 12, 31)
+        assert result.total_overallocations == 0
+
+    @pytest.mark.asyncio
+    async def test_critical_path_from_loaded_activities(self, mock_program: MagicMock) -> None:
+        """Should detect critical path impact from the loaded activities."""
+        resource = _resource()
+        critical = _activity(is_critical=True)
+        assignments = [
+            _assignment(resource, date(2024, 1, 15), date(2024, 1, 15), activity=critical),
+            _assignment(resource, date(2024, 1, 15), date(2024, 1, 15), "0.50"),
+        ]
+        service = _program_service([resource], assignments)
+
+        result = await self._detect(service, mock_program)
+
+        assert result.critical_path_affected is True
+
+    @pytest.mark.asyncio
+    async def test_critical_path_ignores_deleted_activities(self, mock_program: MagicMock) -> None:
+        """Should not count deleted critical activities."""
+        resource = _resource()
+        deleted = _activity(is_critical=True, is_deleted=True)
+        assignments = [
+            _assignment(resource, date(2024, 1, 15), date(2024, 1, 15), activity=deleted),
+            _assignment(resource, date(2024, 1, 15), date(2024, 1, 15), "0.50"),
+        ]
+        service = _program_service([resource], assignments)
+
+        result = await self._detect(service, mock_program)
 
         assert result.total_overallocations == 1
-        assert result.resources_affected == 1
-        assert len(result.periods) == 1
         assert result.critical_path_affected is False
@@ -2,15 +2,28 @@
 
 from datetime import date
 from decimal import Decimal
-from uuid import uuid4
+from unittest.mock import AsyncMock, MagicMock
+from uuid import UUID, uuid4
 
 import pytest
 
+from src.services.leveling_pool import LevelingPool, leveling_pool
+from src.services.leveling_snapshot import (
+    LevelingActivity,
+    LevelingAssignment,
+    LevelingDependency,
+    LevelingResource,
+    LevelingSnapshot,
+    split_components,
+)
 from src.services.parallel_leveling import (
     ActivityPriority,
+    ParallelLevelingEngine,
     ParallelLevelingResult,
+    ParallelLevelingService,
     ResourceConflict,
 )
+from src.services.resource_leveling import LevelingOptions
 
 
 class TestResourceConflict:
@@ -458,299 +471,575 @@ class TestParallelLevelingServiceInit:
 
         assert service.cache == mock_cache
 
-
-class TestParallelLevelingServiceSelectActivityToDelay:
-    """Tests for _select_activity_to_delay method."""
+    def test_service_init_pool(self):
+        """Test service uses the shared leveling pool by default."""
+        pool = LevelingPool(max_workers=1)
+        assert ParallelLevelingService(MagicMock(), pool=pool).pool is pool
+        assert ParallelLevelingService(MagicMock()).pool is leveling_pool
+
+
+def _activity(
+    code: str = "ACT-001",
+    start: date | None = date(2026, 1, 5),
+    finish: date | None = date(2026, 1, 9),
+    *,
+    total_float: int | None = 10,
+    is_critical: bool = False,
+) -> LevelingActivity:
+    return LevelingActivity(
+        id=uuid4(),
+        code=code,
+        start=start,
+        finish=finish,
+        total_float=total_float,
+        is_critical=is_critical,
+    )
+
+
+def _resource(code: str = "ENG-001", capacity: str = "8.0") -> LevelingResource:
+    return LevelingResource(id=uuid4(), code=code, capacity_per_day=Decimal(capacity))
+
+
+def _assign(
+    activity: LevelingActivity, resource: LevelingResource, units: str = "1.0"
+) -> LevelingAssignment:
+    return LevelingAssignment(
+        activity_id=activity.id, resource_id=resource.id, units=Decimal(units)
+    )
+
+
+def _dependency(
+    predecessor: LevelingActivity,
+    successor: LevelingActivity,
+    dependency_type: str = "FS",
+    lag: int = 0,
+) -> LevelingDependency:
+    return LevelingDependency(
+        predecessor_id=predecessor.id,
+        successor_id=successor.id,
+        dependency_type=dependency_type,
+        lag=lag,
+    )
+
+
+def _snapshot(
+    activities: list[LevelingActivity],
+    assignments: list[LevelingAssignment] | None = None,
+    resources: list[LevelingResource] | None = None,
+    *,
+    dependencies: list[LevelingDependency] | None = None,
+) -> LevelingSnapshot:
+    resources = resources or []
+    return LevelingSnapshot(
+        program_id=uuid4(),
+        start_date=date(2026, 1, 1),
+        end_date=date(2026, 12, 31),
+        activities=tuple(activities),
+        assignments=tuple(assignments or []),
+        external_loads=(),
+        resources=tuple(resources),
+        program_resource_ids=tuple(r.id for r in resources),
+        dependencies=tuple(dependencies or []),
+    )
+
+
+def _dates(*activities: LevelingActivity) -> dict[UUID, tuple[date, date]]:
+    return {a.id: (a.start, a.finish) for a in activities}  # type: ignore[misc]
+
+
+def _cluster(prefix: str, count: int = 2) -> tuple[list, list, list]:
+    """Activities competing for one full-time resource in the same week."""
+    resource = _resource(f"{prefix}-RES")
+    activities = [_activity(f"{prefix}-{i}", total_float=10 * (i + 1)) for i in range(count)]
+    return activities, [_assign(a, resource) for a in activities], [resource]
+
+
+class TestSelectActivityToDelay:
+    """Tests for ParallelLevelingEngine._select_activity_to_delay."""
+
+    def _priorities(self, *priorities: ActivityPriority) -> dict[UUID, ActivityPriority]:
+        return {p.activity_id: p for p in priorities}
+
+    def _conflict(self, *activity_ids: UUID) -> ResourceConflict:
+        return ResourceConflict(
+            resource_id=uuid4(),
+            conflict_date=date(2026, 1, 15),
+            overallocation_hours=Decimal("4"),
+            activities=list(activity_ids),
+        )
 
     def test_select_from_candidates(self):
-        """Test selecting activity to delay from candidates."""
-        from unittest.mock import MagicMock
+        """Should select the most flexible activity."""
+        engine = ParallelLevelingEngine(_snapshot([]))
+        activity1_id, activity2_id = uuid4(), uuid4()
+
+        result = engine._select_activity_to_delay(
+            self._conflict(activity1_id, activity2_id),
+            self._priorities(
+                ActivityPriority(activity1_id, date(2026, 1, 1), 5, False, 1),
+                ActivityPriority(activity2_id, date(2026, 1, 10), 10, False, 1),
+            ),
+            {
+                activity1_id: (date(2026, 1, 1), date(2026, 1, 5)),
+                activity2_id: (date(2026, 1, 10), date(2026, 1, 15)),
+            },
+        )
 
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import LevelingOptions
+        # Activity2 has the later start and more float
+        assert result == activity2_id
 
-        service = ParallelLevelingService(MagicMock())
+    def test_select_skips_critical_path(self):
+        """Should not delay critical activities when preserving the critical path."""
+        engine = ParallelLevelingEngine(_snapshot([]), LevelingOptions(preserve_critical_path=True))
+        critical_id, flexible_id = uuid4(), uuid4()
+
+        result = engine._select_activity_to_delay(
+            self._conflict(critical_id, flexible_id),
+            self._priorities(
+                ActivityPriority(critical_id, date(2026, 1, 20), 0, True, 1),
+                ActivityPriority(flexible_id, date(2026, 1, 1), 5, False, 1),
+            ),
+            {
+                critical_id: (date(2026, 1, 20), date(2026, 1, 25)),
+                flexible_id: (date(2026, 1, 1), date(2026, 1, 5)),
+            },
+        )
 
-        activity1_id = uuid4()
-        activity2_id = uuid4()
+        assert result == flexible_id
 
-        conflict = ResourceConflict(
-            resource_id=uuid4(),
-            conflict_date=date(2026, 1, 15),
-            overallocation_hours=Decimal("4"),
-            activities=[activity1_id, activity2_id],
+    def test_select_none_when_all_critical(self):
+        """Should return None when every candidate is critical."""
+        engine = ParallelLevelingEngine(_snapshot([]), LevelingOptions(preserve_critical_path=True))
+        activity_id = uuid4()
+
+        result = engine._select_activity_to_delay(
+            self._conflict(activity_id, uuid4()),
+            self._priorities(ActivityPriority(activity_id, date(2026, 1, 1), 0, True, 1)),
+            {activity_id: (date(2026, 1, 1), date(2026, 1, 5))},
         )
 
-        priority_map = {
-            activity1_id: ActivityPriority(
-                activity_id=activity1_id,
-                early_start=date(2026, 1, 1),
-                total_float=5,
-                is_critical=False,
-                resource_count=1,
-            ),
-            activity2_id: ActivityPriority(
-                activity_id=activity2_id,
-                early_start=date(2026, 1, 10),
-                total_float=10,
-                is_critical=False,
-                resource_count=1,
+        assert result is None
+
+    def test_select_respects_float_constraint(self):
+        """Should skip activities that have used all their float."""
+        engine = ParallelLevelingEngine(_snapshot([]), LevelingOptions(level_within_float=True))
+        activity1_id, activity2_id = uuid4(), uuid4()
+
+        result = engine._select_activity_to_delay(
+            self._conflict(activity1_id, activity2_id),
+            self._priorities(
+                ActivityPriority(activity1_id, date(2026, 1, 1), 5, False, 1),
+                ActivityPriority(activity2_id, date(2026, 1, 1), 10, False, 1),
             ),
-        }
+            {
+                # Activity1 already moved by its full float
+                activity1_id: (date(2026, 1, 6), date(2026, 1, 10)),
+                activity2_id: (date(2026, 1, 1), date(2026, 1, 5)),
+            },
+        )
 
-        activity_dates = {
-            activity1_id: (date(2026, 1, 1), date(2026, 1, 5)),
-            activity2_id: (date(2026, 1, 10), date(2026, 1, 15)),
-        }
+        assert result == activity2_id
 
-        options = LevelingOptions()
 
-        result = service._select_activity_to_delay(conflict, priority_map, activity_dates, options)
+class TestCalculatePriorities:
+    """Tests for ParallelLevelingEngine._calculate_priorities."""
 
-        # Should select activity2 (later start, more float)
-        assert result == activity2_id
+    def test_calculate_priorities(self):
+        """Should count resources and default missing dates and float."""
+        resource1, resource2 = _resource("R1"), _resource("R2")
+        activity = _activity(is_critical=True)
+        unscheduled = _activity("ACT-002", start=None, finish=None, total_float=None)
+        engine = ParallelLevelingEngine(
+            _snapshot(
+                [activity, unscheduled],
+                [_assign(activity, resource1), _assign(activity, resource2)],
+                [resource1, resource2],
+            )
+        )
 
-    def test_select_skips_critical_path(self):
-        """Test skipping critical path activities when option set."""
-        from unittest.mock import MagicMock
+        priorities = engine._calculate_priorities()
 
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import LevelingOptions
+        assert priorities[activity.id].resource_count == 2
+        assert priorities[activity.id].is_critical is True
+        assert priorities[unscheduled.id].early_start == date.max
+        assert priorities[unscheduled.id].total_float == 9999
+        assert priorities[unscheduled.id].resource_count == 0
 
-        service = ParallelLevelingService(MagicMock())
 
-        critical_id = uuid4()
-        non_critical_id = uuid4()
+class TestBuildConflictMatrix:
+    """Tests for ParallelLevelingEngine._build_conflict_matrix."""
 
-        conflict = ResourceConflict(
-            resource_id=uuid4(),
-            conflict_date=date(2026, 1, 15),
-            overallocation_hours=Decimal("4"),
-            activities=[critical_id, non_critical_id],
+    def test_empty_dates(self):
+        """Should return no conflicts without activity dates."""
+        engine = ParallelLevelingEngine(_snapshot([]))
+
+        assert engine._build_conflict_matrix({}) == []
+
+    def test_detects_overallocation(self):
+        """Should report each overallocated working day once."""
+        activities, assignments, resources = _cluster("A")
+        engine = ParallelLevelingEngine(_snapshot(activities, assignments, resources))
+
+        conflicts = engine._build_conflict_matrix(_dates(*activities))
+
+        # Monday Jan 5 to Friday Jan 9
+        assert len(conflicts) == 5
+        assert conflicts[0].resource_id == resources[0].id
+        assert conflicts[0].conflict_date == date(2026, 1, 5)
+        assert set(conflicts[0].activities) == {a.id for a in activities}
+
+    def test_skips_weekends(self):
+        """Should not report conflicts on non-working days."""
+        resource = _resource()
+        activities = [_activity(code, date(2026, 1, 3), date(2026, 1, 4)) for code in ("A", "B")]
+        engine = ParallelLevelingEngine(
+            _snapshot(activities, [_assign(a, resource) for a in activities], [resource])
         )
 
-        priority_map = {
-            critical_id: ActivityPriority(
-                activity_id=critical_id,
-                early_start=date(2026, 1, 10),
-                total_float=0,
-                is_critical=True,
-                resource_count=1,
-            ),
-            non_critical_id: ActivityPriority(
-                activity_id=non_critical_id,
-                early_start=date(2026, 1, 1),
-                total_float=5,
-                is_critical=False,
-                resource_count=1,
-            ),
-        }
+        assert engine._build_conflict_matrix(_dates(*activities)) == []
 
-        activity_dates = {
-            critical_id: (date(2026, 1, 10), date(2026, 1, 15)),
-            non_critical_id: (date(2026, 1, 1), date(2026, 1, 5)),
-        }
+    def test_target_resources(self):
+        """Should only scan the targeted resources."""
+        activities, assignments, resources = _cluster("A")
+        engine = ParallelLevelingEngine(
+            _snapshot(activities, assignments, resources),
+            LevelingOptions(target_resources=[uuid4()]),
+        )
 
-        options = LevelingOptions(preserve_critical_path=True)
+        assert engine._build_conflict_matrix(_dates(*activities)) == []
 
-        result = service._select_activity_to_delay(conflict, priority_map, activity_dates, options)
 
-        # Should select non-critical even though critical has later start
-        assert result == non_critical_id
+class TestCalculateMinimumDelay:
+    """Tests for ParallelLevelingEngine._calculate_minimum_delay."""
 
-    def test_select_none_when_all_critical(self):
-        """Test returns None when all candidates are critical."""
-        from unittest.mock import MagicMock
+    def test_resource_not_found(self):
+        """Should delay one day for an unknown resource."""
+        activity = _activity()
+        engine = ParallelLevelingEngine(_snapshot([activity]))
 
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import LevelingOptions
+        delay = engine._calculate_minimum_delay(
+            activity.id, uuid4(), date(2026, 1, 5), _dates(activity)
+        )
 
-        service = ParallelLevelingService(MagicMock())
+        assert delay == 1
 
-        activity1_id = uuid4()
-        activity2_id = uuid4()
+    def test_no_assignment(self):
+        """Should delay one day when the activity is not on the resource."""
+        activity = _activity()
+        resource = _resource()
+        engine = ParallelLevelingEngine(_snapshot([activity], [], [resource]))
 
-        conflict = ResourceConflict(
-            resource_id=uuid4(),
-            conflict_date=date(2026, 1, 15),
-            overallocation_hours=Decimal("4"),
-            activities=[activity1_id, activity2_id],
+        delay = engine._calculate_minimum_delay(
+            activity.id, resource.id, date(2026, 1, 5), _dates(activity)
         )
 
-        priority_map = {
-            activity1_id: ActivityPriority(
-                activity_id=activity1_id,
-                early_start=date(2026, 1, 1),
-                total_float=0,
-                is_critical=True,
-                resource_count=1,
-            ),
-            activity2_id: ActivityPriority(
-                activity_id=activity2_id,
-                early_start=date(2026, 1, 10),
-                total_float=0,
-                is_critical=True,
-                resource_count=1,
-            ),
-        }
+        assert delay == 1
 
-        activity_dates = {
-            activity1_id: (date(2026, 1, 1), date(2026, 1, 5)),
-            activity2_id: (date(2026, 1, 10), date(2026, 1, 15)),
-        }
+    def test_delay_past_other_activity(self):
+        """Should start after the blocking activity finishes."""
+        resource = _resource()
+        blocking = _activity("BLOCK", date(2026, 1, 5), date(2026, 1, 14))
+        activity = _activity("ACT", date(2026, 1, 5), date(2026, 1, 6))
+        engine = ParallelLevelingEngine(
+            _snapshot(
+                [blocking, activity],
+                [_assign(blocking, resource), _assign(activity, resource)],
+                [resource],
+            )
+        )
 
-        options = LevelingOptions(preserve_critical_path=True)
+        delay = engine._calculate_minimum_delay(
+            activity.id, resource.id, date(2026, 1, 5), _dates(blocking, activity)
+        )
 
-        result = service._select_activity_to_delay(conflict, priority_map, activity_dates, options)
+        # Next free working day is Thursday Jan 15
+        assert delay == 10
 
-        assert result is None
+    def test_delay_skips_weekend(self):
+        """Should start on the next working day after a Friday conflict."""
+        resource = _resource()
+        activity = _activity("ACT", date(2026, 1, 9), date(2026, 1, 13))
+        engine = ParallelLevelingEngine(
+            _snapshot([activity], [_assign(activity, resource, "0.5")], [resource])
+        )
 
-    def test_select_respects_float_constraint(self):
-        """Test respecting level_within_float option."""
-        from unittest.mock import MagicMock
+        delay = engine._calculate_minimum_delay(
+            activity.id, resource.id, date(2026, 1, 9), _dates(activity)
+        )
 
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import LevelingOptions
+        # Monday Jan 12
+        assert delay == 3
 
-        service = ParallelLevelingService(MagicMock())
 
-        activity1_id = uuid4()
-        activity2_id = uuid4()
+class TestPropagateToSuccessors:
+    """Tests for ParallelLevelingEngine._propagate_to_successors."""
 
-        conflict = ResourceConflict(
-            resource_id=uuid4(),
-            conflict_date=date(2026, 1, 20),
-            overallocation_hours=Decimal("4"),
-            activities=[activity1_id, activity2_id],
+    def _propagate(self, dependency_type: str, lag: int = 0) -> tuple[date, date]:
+        predecessor = _activity("PRED", date(2026, 1, 10), date(2026, 1, 15))
+        successor = _activity("SUCC", date(2026, 1, 1), date(2026, 1, 5))
+        engine = ParallelLevelingEngine(
+            _snapshot(
+                [predecessor, successor],
+                dependencies=[_dependency(predecessor, successor, dependency_type, lag)],
+            )
         )
+        activity_dates = _dates(predecessor, successor)
 
-        # Activity 1 has used all its float (moved 5 days, has 5 float)
-        # Activity 2 has float remaining (moved 2 days, has 10 float)
-        priority_map = {
-            activity1_id: ActivityPriority(
-                activity_id=activity1_id,
-                early_start=date(2026, 1, 1),
-                total_float=5,
-                is_critical=False,
-                resource_count=1,
-            ),
-            activity2_id: ActivityPriority(
-                activity_id=activity2_id,
-                early_start=date(2026, 1, 10),
-                total_float=10,
-                is_critical=False,
-                resource_count=1,
-            ),
-        }
+        engine._propagate_to_successors(predecessor.id, activity_dates)
 
-        activity_dates = {
-            activity1_id: (date(2026, 1, 6), date(2026, 1, 10)),  # Moved 5 days
-            activity2_id: (date(2026, 1, 12), date(2026, 1, 17)),  # Moved 2 days
-        }
+        return activity_dates[successor.id]
 
-        options = LevelingOptions(level_within_float=True)
+    @pytest.mark.parametrize(
+        ("dependency_type", "lag", "expected"),
+        [
+            ("FS", 0, (date(2026, 1, 16), date(2026, 1, 20))),
+            ("FS", 2, (date(2026, 1, 18), date(2026, 1, 22))),
+            ("SS", 0, (date(2026, 1, 10), date(2026, 1, 14))),
+            ("FF", 0, (date(2026, 1, 11), date(2026, 1, 15))),
+            ("SF", 0, (date(2026, 1, 6), date(2026, 1, 10))),
+            ("XX", 0, (date(2026, 1, 16), date(2026, 1, 20))),
+        ],
+    )
+    def test_dependency_types(self, dependency_type, lag, expected):
+        """Should move the successor to its earliest start for each type."""
+        assert self._propagate(dependency_type, lag) == expected
 
-        result = service._select_activity_to_delay(conflict, priority_map, activity_dates, options)
+    def test_chain(self):
+        """Should push the whole chain of successors."""
+        first = _activity("A", date(2026, 1, 10), date(2026, 1, 12))
+        second = _activity("B", date(2026, 1, 1), date(2026, 1, 2))
+        third = _activity("C", date(2026, 1, 3), date(2026, 1, 3))
+        engine = ParallelLevelingEngine(
+            _snapshot(
+                [first, second, third],
+                dependencies=[_dependency(first, second), _dependency(second, third)],
+            )
+        )
+        activity_dates = _dates(first, second, third)
 
-        # Should select activity2 because activity1 has used all float
-        assert result == activity2_id
+        engine._propagate_to_successors(first.id, activity_dates)
 
+        assert activity_dates[second.id] == (date(2026, 1, 13), date(2026, 1, 14))
+        assert activity_dates[third.id] == (date(2026, 1, 15), date(2026, 1, 15))
 
-class TestParallelLevelingServiceLevelProgram:
-    """Tests for level_program method."""
+    def test_no_update_if_earlier(self):
+        """Should keep a successor that already starts late enough."""
+        predecessor = _activity("PRED", date(2026, 1, 1), date(2026, 1, 5))
+        successor = _activity("SUCC", date(2026, 1, 20), date(2026, 1, 25))
+        engine = ParallelLevelingEngine(
+            _snapshot(
+                [predecessor, successor],
+                dependencies=[_dependency(predecessor, successor)],
+            )
+        )
+        activity_dates = _dates(predecessor, successor)
 
-    @pytest.mark.asyncio
-    async def test_level_program_not_found(self):
-        """Test handling program not found."""
-        from unittest.mock import AsyncMock, MagicMock
+        engine._propagate_to_successors(predecessor.id, activity_dates)
 
-        from src.services.parallel_leveling import ParallelLevelingService
+        assert activity_dates[successor.id] == (date(2026, 1, 20), date(2026, 1, 25))
 
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
 
-        # Mock program repo to return None
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=None)
+class TestParallelLevelingEngine:
+    """Tests for ParallelLevelingEngine.run."""
 
-        program_id = uuid4()
-        result = await service.level_program(program_id)
+    def test_no_activities(self):
+        """Should succeed with the program end as finish."""
+        result = ParallelLevelingEngine(_snapshot([])).run()
 
-        assert result.success is False
-        assert "Program not found" in result.warnings
+        assert result.success is True
+        assert result.new_project_finish == date(2026, 12, 31)
 
-    @pytest.mark.asyncio
-    async def test_level_program_no_activities(self):
-        """Test handling program with no activities."""
-        from unittest.mock import AsyncMock, MagicMock
+    def test_no_conflicts(self):
+        """Should succeed without shifts when nothing is overallocated."""
+        activity = _activity()
+        resource = _resource()
+        result = ParallelLevelingEngine(
+            _snapshot([activity], [_assign(activity, resource)], [resource])
+        ).run()
 
-        from src.services.parallel_leveling import ParallelLevelingService
+        assert result.success is True
+        assert result.iterations_used == 0
+        assert result.shifts == []
 
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
+    def test_resolves_conflict(self):
+        """Should delay the more flexible activity past the other."""
+        activities, assignments, resources = _cluster("A")
+        result = ParallelLevelingEngine(_snapshot(activities, assignments, resources)).run()
+
+        assert result.success is True
+        assert [s.activity_code for s in result.shifts] == ["A-1"]
+        assert result.shifts[0].new_start == date(2026, 1, 12)
+        assert result.shifts[0].reason == "Resource A-RES conflict on 2026-01-05"
+        assert result.conflicts_resolved == 5
+        assert result.resources_processed == 1
+        assert result.schedule_extension_days == 7
+
+    def test_cannot_delay_any_activity(self):
+        """Should warn when every competing activity is critical."""
+        resource = _resource()
+        activities = [_activity(code, is_critical=True) for code in ("A", "B")]
+        result = ParallelLevelingEngine(
+            _snapshot(activities, [_assign(a, resource) for a in activities], [resource])
+        ).run()
+
+        assert result.shifts == []
+        assert len(result.warnings) == 5
+        assert "ENG-001" in result.warnings[0]
+
+
+class TestSplitComponents:
+    """Tests for split_components."""
+
+    def test_independent_clusters(self):
+        """Should separate activities sharing no resource or dependency."""
+        a_activities, a_assignments, a_resources = _cluster("A")
+        b_activities, b_assignments, b_resources = _cluster("B", 3)
+        idle = _activity("IDLE")
+        snapshot = _snapshot(
+            [a_activities[0], b_activities[0], idle, a_activities[1], *b_activities[1:]],
+            a_assignments + b_assignments,
+            a_resources + b_resources,
+        )
+
+        components = split_components(snapshot)
+
+        assert [[a.code for a in c.activities] for c in components] == [
+            ["A-0", "A-1"],
+            ["B-0", "B-1", "B-2"],
+            ["IDLE"],
+        ]
+        assert components[1].resources == tuple(b_resources)
+        assert components[1].program_resource_ids == (b_resources[0].id,)
+        assert len(components[1].assignments) == 3
+        assert components[2].assignments == ()
+
+    def test_dependencies_join_components(self):
+        """Should keep activities linked by a dependency together."""
+        a_activities, a_assignments, a_resources = _cluster("A")
+        b_activities, b_assignments, b_resources = _cluster("B")
+        link = _dependency(a_activities[1], b_activities[0])
+        snapshot = _snapshot(
+            a_activities + b_activities,
+            a_assignments + b_assignments,
+            a_resources + b_resources,
+            dependencies=[link],
+        )
+
+        components = split_components(snapshot)
+
+        assert len(components) == 1
+        assert components[0].dependencies == (link,)
+        assert len(components[0].resources) == 2
+
+    def test_empty(self):
+        """Should return no components for an empty program."""
+        assert split_components(_snapshot([])) == []
 
-        # Mock program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2026, 1, 1)
-        mock_program.end_date = date(2026, 12, 31)
 
+class TestParallelLevelingServiceLevelProgram:
+    """Tests for ParallelLevelingService.level_program."""
+
+    def _service(
+        self, snapshot: LevelingSnapshot, pool: LevelingPool | None = None
+    ) -> ParallelLevelingService:
+        service = ParallelLevelingService(MagicMock(), pool=pool or LevelingPool(max_workers=1))
         service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
+        service._program_repo.get_by_id = AsyncMock(return_value=MagicMock())
+        service._snapshot_loader = MagicMock()
+        service._snapshot_loader.load_snapshot = AsyncMock(return_value=snapshot)
+        return service
 
-        # Mock empty activities
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[])
+    def _two_clusters(self) -> LevelingSnapshot:
+        a_activities, a_assignments, a_resources = _cluster("A")
+        b_activities, b_assignments, b_resources = _cluster("B", 3)
+        return _snapshot(
+            a_activities + b_activities,
+            a_assignments + b_assignments,
+            a_resources + b_resources,
+        )
+
+    @pytest.mark.asyncio
+    async def test_level_program_not_found(self):
+        """Should report a missing program."""
+        service = ParallelLevelingService(AsyncMock())
+        service._program_repo = MagicMock()
+        service._program_repo.get_by_id = AsyncMock(return_value=None)
+
+        result = await service.level_program(uuid4())
+
+        assert result.success is False
+        assert "Program not found" in result.warnings
+
+    @pytest.mark.asyncio
+    async def test_level_program_no_activities(self):
+        """Should succeed for a program without activities."""
+        service = self._service(_snapshot([]))
 
-        program_id = uuid4()
-        result = await service.level_program(program_id)
+        result = await service.level_program(uuid4())
 
         assert result.success is True
         assert result.activities_shifted == 0
+        assert result.new_project_finish == date(2026, 12, 31)
 
     @pytest.mark.asyncio
     async def test_level_program_no_conflicts(self):
-        """Test handling program with no resource conflicts."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
+        """Should keep the original finish when nothing conflicts."""
+        activity = _activity(finish=None)
+        service = self._service(_snapshot([activity, _activity("ACT-002")]))
 
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
+        result = await service.level_program(uuid4())
 
-        # Mock program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2026, 1, 1)
-        mock_program.end_date = date(2026, 12, 31)
+        assert result.success is True
+        assert result.remaining_overallocations == 0
+        assert result.new_project_finish == result.original_project_finish
 
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
+    @pytest.mark.asyncio
+    async def test_level_program_merges_components(self):
+        """Should combine the shifts and counts of independent components."""
+        snapshot = self._two_clusters()
+        service = self._service(snapshot)
 
-        # Mock activity
-        mock_activity = MagicMock()
-        mock_activity.id = uuid4()
-        mock_activity.early_start = date(2026, 1, 1)
-        mock_activity.early_finish = date(2026, 1, 5)
-        mock_activity.planned_start = None
-        mock_activity.planned_finish = None
-        mock_activity.is_critical = False
-        mock_activity.total_float = 10
+        result = await service.level_program(snapshot.program_id)
 
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[mock_activity])
+        assert result.success is True
+        assert [s.activity_code for s in result.shifts] == ["A-1", "B-2", "B-1"]
+        assert result.activities_shifted == 3
+        assert result.resources_processed == 2
+        assert result.iterations_used == 3
+        assert result.new_project_finish == max(s.new_finish for s in result.shifts)
 
-        # Mock empty assignments (no resource conflicts)
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[])
+    @pytest.mark.asyncio
+    async def test_level_program_process_pool(self, monkeypatch):
+        """Should give the same result when components run in worker processes."""
+        snapshot = self._two_clusters()
+        serial = await self._service(snapshot).level_program(snapshot.program_id)
+        monkeypatch.setattr("src.services.parallel_leveling.PARALLEL_MIN_ACTIVITIES", 1)
+
+        pool = LevelingPool(max_workers=2)
+        try:
+            result = await self._service(snapshot, pool).level_program(snapshot.program_id)
+            again = await self._service(snapshot, pool).level_program(snapshot.program_id)
+        finally:
+            pool.shutdown()
+
+        assert result == serial
+        assert again == serial
 
-        # Mock resources
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_program = AsyncMock(return_value=([], 0))
+    @pytest.mark.asyncio
+    async def test_single_large_component_uses_pool(self, monkeypatch):
+        """Should level one component in the pool once it is large enough."""
+        activities, assignments, resources = _cluster("A")
+        snapshot = _snapshot(activities, assignments, resources)
+        serial = await self._service(snapshot).level_program(snapshot.program_id)
+        monkeypatch.setattr("src.services.parallel_leveling.PARALLEL_MIN_ACTIVITIES", 1)
 
-        program_id = uuid4()
-        result = await service.level_program(program_id)
+        pool = MagicMock(spec=LevelingPool)
+        pool.parallel = True
+        pool.map = AsyncMock(side_effect=lambda func, args: [func(*a) for a in args])
+        result = await self._service(snapshot, pool).level_program(snapshot.program_id)
 
-        assert result.success is True
-        assert result.remaining_overallocations == 0
+        pool.map.assert_awaited_once()
+        assert result == serial
 
 
 class TestParallelLevelingServiceApplyResult:
@@ -833,1315 +1122,101 @@ class TestParallelLevelingServiceApplyResult:
         assert mock_activity.planned_start == date(2026, 1, 8)
         assert mock_activity.planned_finish == date(2026, 1, 12)
 
-
-class TestParallelLevelingServiceHelpers:
-    """Tests for helper methods in ParallelLevelingService."""
-
     @pytest.mark.asyncio
-    async def test_get_project_finish_no_activities(self):
-        """Test _get_project_finish with no activities."""
+    async def test_apply_result_activity_not_found(self):
+        """Test apply_leveling_result handles activity not found."""
         from unittest.mock import AsyncMock, MagicMock
 
         from src.services.parallel_leveling import ParallelLevelingService
+        from src.services.resource_leveling import ActivityShift
 
         mock_session = AsyncMock()
         service = ParallelLevelingService(mock_session)
 
-        mock_program = MagicMock()
-        mock_program.end_date = date(2026, 12, 31)
-
         service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[])
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
-
-        result = await service._get_project_finish(uuid4())
-
-        assert result == date(2026, 12, 31)
-
-    @pytest.mark.asyncio
-    async def test_get_project_finish_with_activities(self):
-        """Test _get_project_finish with activities."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        activity1 = MagicMock()
-        activity1.early_finish = date(2026, 3, 15)
-        activity1.planned_finish = None
-
-        activity2 = MagicMock()
-        activity2.early_finish = date(2026, 4, 20)
-        activity2.planned_finish = None
+        service._activity_repo.get_by_id = AsyncMock(return_value=None)
 
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[activity1, activity2])
+        shift = ActivityShift(
+            activity_id=uuid4(),
+            activity_code="ACT-001",
+            original_start=date(2026, 1, 1),
+            original_finish=date(2026, 1, 5),
+            new_start=date(2026, 1, 8),
+            new_finish=date(2026, 1, 12),
+            delay_days=7,
+            reason="Resource conflict",
+        )
 
-        result = await service._get_project_finish(uuid4())
+        result = ParallelLevelingResult(
+            program_id=uuid4(),
+            success=True,
+            iterations_used=1,
+            activities_shifted=1,
+            shifts=[shift],
+            remaining_overallocations=0,
+            new_project_finish=date(2026, 1, 12),
+            original_project_finish=date(2026, 1, 5),
+            schedule_extension_days=7,
+        )
 
-        assert result == date(2026, 4, 20)
+        success = await service.apply_leveling_result(result)
+        assert success is True
 
     @pytest.mark.asyncio
-    async def test_get_project_finish_uses_planned_finish(self):
-        """Test _get_project_finish uses planned_finish when early_finish is None."""
+    async def test_apply_result_multiple_shifts_same_activity(self):
+        """Test apply_leveling_result uses latest shift for same activity."""
         from unittest.mock import AsyncMock, MagicMock
 
         from src.services.parallel_leveling import ParallelLevelingService
+        from src.services.resource_leveling import ActivityShift
 
         mock_session = AsyncMock()
         service = ParallelLevelingService(mock_session)
 
-        activity = MagicMock()
-        activity.early_finish = None
-        activity.planned_finish = date(2026, 5, 10)
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[activity])
-
-        result = await service._get_project_finish(uuid4())
-
-        assert result == date(2026, 5, 10)
-
-    @pytest.mark.asyncio
-    async def test_get_project_finish_no_program(self):
-        """Test _get_project_finish when program not found."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
+        activity_id = uuid4()
+        mock_activity = MagicMock()
+        mock_activity.id = activity_id
 
         service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[])
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=None)
-
-        result = await service._get_project_finish(uuid4())
-
-        assert result == date.today()
-
-    @pytest.mark.asyncio
-    async def test_calculate_priorities(self):
-        """Test _calculate_priorities creates priority map."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        activity1 = MagicMock()
-        activity1.id = uuid4()
-        activity1.early_start = date(2026, 1, 5)
-        activity1.planned_start = None
-        activity1.total_float = 5
-        activity1.is_critical = True
-
-        activity2 = MagicMock()
-        activity2.id = uuid4()
-        activity2.early_start = None
-        activity2.planned_start = date(2026, 1, 10)
-        activity2.total_float = None
-        activity2.is_critical = None
-
-        mock_assignment = MagicMock()
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[mock_assignment])
-
-        result = await service._calculate_priorities([activity1, activity2])
-
-        assert len(result) == 2
-        assert result[activity1.id].is_critical is True
-        assert result[activity1.id].total_float == 5
-        assert result[activity2.id].is_critical is False
-        assert result[activity2.id].total_float == 9999  # Default when None
-        assert result[activity2.id].resource_count == 1
-
-    @pytest.mark.asyncio
-    async def test_build_conflict_matrix_empty_dates(self):
-        """Test _build_conflict_matrix with empty activity dates."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import LevelingOptions
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
+        service._activity_repo.get_by_id = AsyncMock(return_value=mock_activity)
 
-        # Need to mock repo even though it won't be called
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_program = AsyncMock(return_value=([], 0))
+        # Two shifts for same activity
+        shift1 = ActivityShift(
+            activity_id=activity_id,
+            activity_code="ACT-001",
+            original_start=date(2026, 1, 1),
+            original_finish=date(2026, 1, 5),
+            new_start=date(2026, 1, 5),
+            new_finish=date(2026, 1, 9),
+            delay_days=4,
+            reason="First delay",
+        )
+        shift2 = ActivityShift(
+            activity_id=activity_id,
+            activity_code="ACT-001",
+            original_start=date(2026, 1, 5),
+            original_finish=date(2026, 1, 9),
+            new_start=date(2026, 1, 10),
+            new_finish=date(2026, 1, 14),
+            delay_days=5,
+            reason="Second delay",
+        )
 
-        result = await service._build_conflict_matrix(uuid4(), {}, LevelingOptions())
+        result = ParallelLevelingResult(
+            program_id=uuid4(),
+            success=True,
+            iterations_used=2,
+            activities_shifted=1,
+            shifts=[shift1, shift2],
+            remaining_overallocations=0,
+            new_project_finish=date(2026, 1, 14),
+            original_project_finish=date(2026, 1, 5),
+            schedule_extension_days=9,
+        )
 
-        assert result == []
-
-    @pytest.mark.asyncio
-    async def test_build_conflict_matrix_target_resources(self):
-        """Test _build_conflict_matrix filters by target resources."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import LevelingOptions
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        target_id = uuid4()
-        other_id = uuid4()
-
-        target_resource = MagicMock()
-        target_resource.id = target_id
-        target_resource.capacity_per_day = Decimal("8.0")
-
-        other_resource = MagicMock()
-        other_resource.id = other_id
-        other_resource.capacity_per_day = Decimal("8.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_program = AsyncMock(
-            return_value=([target_resource, other_resource], 2)
-        )
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(return_value=[])
-
-        activity_dates = {uuid4(): (date(2026, 1, 6), date(2026, 1, 8))}
-        options = LevelingOptions(target_resources=[target_id])
-
-        await service._build_conflict_matrix(uuid4(), activity_dates, options)
-
-        # Should only check target resource
-        calls = service._assignment_repo.get_assignments_with_activities.call_args_list
-        resource_ids_checked = [call[0][0] for call in calls]
-        assert target_id in resource_ids_checked
-        assert other_id not in resource_ids_checked
-
-    @pytest.mark.asyncio
-    async def test_build_conflict_matrix_no_resources(self):
-        """Test _build_conflict_matrix with no resources."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import LevelingOptions
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_program = AsyncMock(return_value=([], 0))
-
-        activity_dates = {uuid4(): (date(2026, 1, 6), date(2026, 1, 8))}
-
-        result = await service._build_conflict_matrix(uuid4(), activity_dates, LevelingOptions())
-
-        assert result == []
-
-    @pytest.mark.asyncio
-    async def test_build_conflict_matrix_skips_weekends(self):
-        """Test _build_conflict_matrix skips weekend days."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import LevelingOptions
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        resource_id = uuid4()
-        activity_id = uuid4()
-
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = activity_id
-        mock_assignment.units = Decimal("1.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_program = AsyncMock(return_value=([mock_resource], 1))
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[mock_assignment]
-        )
-
-        # Saturday to Sunday range
-        activity_dates = {activity_id: (date(2026, 1, 3), date(2026, 1, 4))}  # Sat-Sun
-
-        result = await service._build_conflict_matrix(uuid4(), activity_dates, LevelingOptions())
-
-        # No conflicts on weekends
-        assert len(result) == 0
-
-    @pytest.mark.asyncio
-    async def test_build_conflict_matrix_detects_overallocation(self):
-        """Test _build_conflict_matrix detects resource overallocation."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import LevelingOptions
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        resource_id = uuid4()
-        activity1_id = uuid4()
-        activity2_id = uuid4()
-
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        # Two assignments on same resource, same dates - 100% each = overallocation
-        assignment1 = MagicMock()
-        assignment1.activity_id = activity1_id
-        assignment1.units = Decimal("1.0")
-
-        assignment2 = MagicMock()
-        assignment2.activity_id = activity2_id
-        assignment2.units = Decimal("1.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_program = AsyncMock(return_value=([mock_resource], 1))
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[assignment1, assignment2]
-        )
-
-        # Both activities on Monday
-        activity_dates = {
-            activity1_id: (date(2026, 1, 5), date(2026, 1, 5)),  # Monday
-            activity2_id: (date(2026, 1, 5), date(2026, 1, 5)),  # Monday
-        }
-
-        result = await service._build_conflict_matrix(uuid4(), activity_dates, LevelingOptions())
-
-        # Should detect overallocation on Monday
-        assert len(result) >= 1
-        assert result[0].resource_id == resource_id
-        assert result[0].conflict_date == date(2026, 1, 5)
-
-    @pytest.mark.asyncio
-    async def test_calculate_minimum_delay_resource_not_found(self):
-        """Test _calculate_minimum_delay returns 1 when resource not found."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=None)
-
-        activity_id = uuid4()
-        activity_dates = {activity_id: (date(2026, 1, 10), date(2026, 1, 15))}
-
-        result = await service._calculate_minimum_delay(
-            activity_id, uuid4(), date(2026, 1, 12), activity_dates
-        )
-
-        assert result == 1
-
-    @pytest.mark.asyncio
-    async def test_calculate_minimum_delay_no_assignment(self):
-        """Test _calculate_minimum_delay returns 1 when no assignment found."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        # Other activity has assignment, but not this one
-        other_assignment = MagicMock()
-        other_assignment.activity_id = uuid4()
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[other_assignment]
-        )
-
-        activity_id = uuid4()
-        activity_dates = {activity_id: (date(2026, 1, 10), date(2026, 1, 15))}
-
-        result = await service._calculate_minimum_delay(
-            activity_id, uuid4(), date(2026, 1, 12), activity_dates
-        )
-
-        assert result == 1
-
-    @pytest.mark.asyncio
-    async def test_propagate_to_successors_no_dependencies(self):
-        """Test _propagate_to_successors with no successors."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[])
-
-        activity_id = uuid4()
-        activity_dates = {activity_id: (date(2026, 1, 10), date(2026, 1, 15))}
-        activity_lookup = {}
-
-        await service._propagate_to_successors(activity_id, activity_dates, activity_lookup)
-
-        # No changes expected
-        assert activity_dates[activity_id] == (date(2026, 1, 10), date(2026, 1, 15))
-
-    @pytest.mark.asyncio
-    async def test_propagate_to_successors_fs_dependency(self):
-        """Test _propagate_to_successors with finish-to-start dependency."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        activity_dates = {
-            predecessor_id: (date(2026, 1, 10), date(2026, 1, 15)),
-            successor_id: (date(2026, 1, 12), date(2026, 1, 17)),  # Overlaps - invalid
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "FS"
-
-        call_count = [0]
-
-        async def get_successors_mock(aid):
-            call_count[0] += 1
-            if aid == predecessor_id and call_count[0] == 1:
-                return [mock_dep]
-            return []
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        await service._propagate_to_successors(predecessor_id, activity_dates, activity_lookup)
-
-        # Successor should start day after predecessor finish
-        assert activity_dates[successor_id][0] == date(2026, 1, 16)
-
-    @pytest.mark.asyncio
-    async def test_propagate_to_successors_ss_dependency(self):
-        """Test _propagate_to_successors with start-to-start dependency."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        activity_dates = {
-            predecessor_id: (date(2026, 1, 10), date(2026, 1, 15)),
-            successor_id: (date(2026, 1, 5), date(2026, 1, 10)),  # Starts before
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 2
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "SS"
-
-        call_count = [0]
-
-        async def get_successors_mock(aid):
-            call_count[0] += 1
-            if aid == predecessor_id and call_count[0] == 1:
-                return [mock_dep]
-            return []
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        await service._propagate_to_successors(predecessor_id, activity_dates, activity_lookup)
-
-        # Successor should start 2 days after predecessor start
-        assert activity_dates[successor_id][0] == date(2026, 1, 12)
-
-    @pytest.mark.asyncio
-    async def test_propagate_to_successors_ff_dependency(self):
-        """Test _propagate_to_successors with finish-to-finish dependency."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        activity_dates = {
-            predecessor_id: (date(2026, 1, 10), date(2026, 1, 20)),
-            successor_id: (date(2026, 1, 5), date(2026, 1, 10)),  # 5-day duration
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "FF"
-
-        call_count = [0]
-
-        async def get_successors_mock(aid):
-            call_count[0] += 1
-            if aid == predecessor_id and call_count[0] == 1:
-                return [mock_dep]
-            return []
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        await service._propagate_to_successors(predecessor_id, activity_dates, activity_lookup)
-
-        # FF: successor should finish when predecessor finishes
-        _, new_finish = activity_dates[successor_id]
-        assert new_finish == date(2026, 1, 20)
-
-    @pytest.mark.asyncio
-    async def test_propagate_to_successors_sf_dependency(self):
-        """Test _propagate_to_successors with start-to-finish dependency."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        activity_dates = {
-            predecessor_id: (date(2026, 1, 15), date(2026, 1, 20)),
-            successor_id: (date(2026, 1, 5), date(2026, 1, 10)),  # 5-day duration
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "SF"
-
-        call_count = [0]
-
-        async def get_successors_mock(aid):
-            call_count[0] += 1
-            if aid == predecessor_id and call_count[0] == 1:
-                return [mock_dep]
-            return []
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        await service._propagate_to_successors(predecessor_id, activity_dates, activity_lookup)
-
-        # SF: successor finish at predecessor start
-        _, new_finish = activity_dates[successor_id]
-        assert new_finish == date(2026, 1, 15)
-
-    @pytest.mark.asyncio
-    async def test_propagate_to_successors_default_dependency_type(self):
-        """Test _propagate_to_successors with unknown dependency type."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        activity_dates = {
-            predecessor_id: (date(2026, 1, 10), date(2026, 1, 15)),
-            successor_id: (date(2026, 1, 12), date(2026, 1, 17)),
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "UNKNOWN"
-
-        call_count = [0]
-
-        async def get_successors_mock(aid):
-            call_count[0] += 1
-            if aid == predecessor_id and call_count[0] == 1:
-                return [mock_dep]
-            return []
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        await service._propagate_to_successors(predecessor_id, activity_dates, activity_lookup)
-
-        # Unknown types default to FS behavior
-        assert activity_dates[successor_id][0] == date(2026, 1, 16)
-
-    @pytest.mark.asyncio
-    async def test_propagate_successor_not_in_lookup(self):
-        """Test _propagate_to_successors skips successors not in lookup."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        activity_dates = {
-            predecessor_id: (date(2026, 1, 10), date(2026, 1, 15)),
-            successor_id: (date(2026, 1, 12), date(2026, 1, 17)),
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            # successor_id not in lookup
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "FS"
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[mock_dep])
-
-        await service._propagate_to_successors(predecessor_id, activity_dates, activity_lookup)
-
-        # Successor dates should not change
-        assert activity_dates[successor_id] == (date(2026, 1, 12), date(2026, 1, 17))
-
-    @pytest.mark.asyncio
-    async def test_propagate_successor_not_in_dates(self):
-        """Test _propagate_to_successors skips successors not in activity_dates."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        activity_dates = {
-            predecessor_id: (date(2026, 1, 10), date(2026, 1, 15)),
-            # successor_id not in activity_dates
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "FS"
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[mock_dep])
-
-        await service._propagate_to_successors(predecessor_id, activity_dates, activity_lookup)
-
-        # Should not add successor to dates
-        assert successor_id not in activity_dates
-
-    @pytest.mark.asyncio
-    async def test_propagate_no_update_if_earlier(self):
-        """Test _propagate_to_successors does not update if new date is earlier."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        # Successor already starts after predecessor finishes
-        activity_dates = {
-            predecessor_id: (date(2026, 1, 10), date(2026, 1, 15)),
-            successor_id: (date(2026, 1, 20), date(2026, 1, 25)),  # Already later
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "FS"
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[mock_dep])
-
-        await service._propagate_to_successors(predecessor_id, activity_dates, activity_lookup)
-
-        # Successor should keep its original dates (already later)
-        assert activity_dates[successor_id] == (date(2026, 1, 20), date(2026, 1, 25))
-
-    @pytest.mark.asyncio
-    async def test_apply_result_activity_not_found(self):
-        """Test apply_leveling_result handles activity not found."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import ActivityShift
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_id = AsyncMock(return_value=None)
-
-        shift = ActivityShift(
-            activity_id=uuid4(),
-            activity_code="ACT-001",
-            original_start=date(2026, 1, 1),
-            original_finish=date(2026, 1, 5),
-            new_start=date(2026, 1, 8),
-            new_finish=date(2026, 1, 12),
-            delay_days=7,
-            reason="Resource conflict",
-        )
-
-        result = ParallelLevelingResult(
-            program_id=uuid4(),
-            success=True,
-            iterations_used=1,
-            activities_shifted=1,
-            shifts=[shift],
-            remaining_overallocations=0,
-            new_project_finish=date(2026, 1, 12),
-            original_project_finish=date(2026, 1, 5),
-            schedule_extension_days=7,
-        )
-
-        success = await service.apply_leveling_result(result)
-        assert success is True
-
-    @pytest.mark.asyncio
-    async def test_apply_result_multiple_shifts_same_activity(self):
-        """Test apply_leveling_result uses latest shift for same activity."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-        from src.services.resource_leveling import ActivityShift
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        activity_id = uuid4()
-        mock_activity = MagicMock()
-        mock_activity.id = activity_id
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_id = AsyncMock(return_value=mock_activity)
-
-        # Two shifts for same activity
-        shift1 = ActivityShift(
-            activity_id=activity_id,
-            activity_code="ACT-001",
-            original_start=date(2026, 1, 1),
-            original_finish=date(2026, 1, 5),
-            new_start=date(2026, 1, 5),
-            new_finish=date(2026, 1, 9),
-            delay_days=4,
-            reason="First delay",
-        )
-        shift2 = ActivityShift(
-            activity_id=activity_id,
-            activity_code="ACT-001",
-            original_start=date(2026, 1, 5),
-            original_finish=date(2026, 1, 9),
-            new_start=date(2026, 1, 10),
-            new_finish=date(2026, 1, 14),
-            delay_days=5,
-            reason="Second delay",
-        )
-
-        result = ParallelLevelingResult(
-            program_id=uuid4(),
-            success=True,
-            iterations_used=2,
-            activities_shifted=1,
-            shifts=[shift1, shift2],
-            remaining_overallocations=0,
-            new_project_finish=date(2026, 1, 14),
-            original_project_finish=date(2026, 1, 5),
-            schedule_extension_days=9,
-        )
-
-        success = await service.apply_leveling_result(result)
-        assert success is True
+        success = await service.apply_leveling_result(result)
+        assert success is True
 
         # Should use second shift's dates
         assert mock_activity.planned_start == date(2026, 1, 10)
         assert mock_activity.planned_finish == date(2026, 1, 14)
-
-
-class TestParallelLevelingMainLoop:
-    """Tests for the main leveling loop in level_program."""
-
-    @pytest.mark.asyncio
-    async def test_leveling_loop_with_conflict_resolution(self):
-        """Test full leveling loop with conflict detection and resolution."""
-        from heapq import heappush
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService, ResourceConflict
-        from src.services.resource_leveling import LevelingOptions
-
-        mock_session = AsyncMock()
-        mock_session.flush = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        program_id = uuid4()
-        activity1_id = uuid4()
-        activity2_id = uuid4()
-        resource_id = uuid4()
-
-        # Setup program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2026, 1, 1)
-        mock_program.end_date = date(2026, 12, 31)
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
-
-        # Setup activities
-        activity1 = MagicMock()
-        activity1.id = activity1_id
-        activity1.code = "ACT-001"
-        activity1.early_start = date(2026, 1, 6)  # Monday
-        activity1.early_finish = date(2026, 1, 10)
-        activity1.planned_start = date(2026, 1, 6)
-        activity1.planned_finish = date(2026, 1, 10)
-        activity1.total_float = 0
-        activity1.is_critical = True
-
-        activity2 = MagicMock()
-        activity2.id = activity2_id
-        activity2.code = "ACT-002"
-        activity2.early_start = date(2026, 1, 6)  # Same dates
-        activity2.early_finish = date(2026, 1, 10)
-        activity2.planned_start = date(2026, 1, 6)
-        activity2.planned_finish = date(2026, 1, 10)
-        activity2.total_float = 10
-        activity2.is_critical = False
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[activity1, activity2])
-
-        # Setup resource
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "RES-001"
-        mock_resource.capacity_per_day = Decimal("8.0")
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._resource_repo.get_by_program = AsyncMock(return_value=([mock_resource], 1))
-
-        # Setup assignments
-        assignment1 = MagicMock()
-        assignment1.activity_id = activity1_id
-        assignment1.resource_id = resource_id
-        assignment1.units = Decimal("1.0")
-
-        assignment2 = MagicMock()
-        assignment2.activity_id = activity2_id
-        assignment2.resource_id = resource_id
-        assignment2.units = Decimal("1.0")
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[MagicMock()])
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[assignment1, assignment2]
-        )
-
-        # Setup dependencies
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[])
-
-        # Create initial conflict
-        initial_conflict = ResourceConflict(
-            resource_id=resource_id,
-            conflict_date=date(2026, 1, 6),
-            overallocation_hours=Decimal("8.0"),
-            activities=[activity1_id, activity2_id],
-        )
-
-        # Mock _build_conflict_matrix to return conflict first time, then empty
-        call_count = [0]
-
-        async def mock_build_conflict_matrix(*args, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                conflicts = []
-                heappush(conflicts, initial_conflict)
-                return conflicts
-            return []  # No more conflicts after first iteration
-
-        service._build_conflict_matrix = mock_build_conflict_matrix
-
-        # Mock _calculate_minimum_delay to return 7 days
-        service._calculate_minimum_delay = AsyncMock(return_value=7)
-
-        options = LevelingOptions(preserve_critical_path=True)
-        result = await service.level_program(program_id, options)
-
-        # Should have resolved the conflict by delaying activity2 (non-critical)
-        assert result.iterations_used >= 1
-        assert result.conflicts_resolved >= 0
-
-    @pytest.mark.asyncio
-    async def test_leveling_loop_cannot_delay_any_activity(self):
-        """Test loop when no activity can be delayed."""
-        from heapq import heappush
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService, ResourceConflict
-        from src.services.resource_leveling import LevelingOptions
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        program_id = uuid4()
-        activity_id = uuid4()
-        resource_id = uuid4()
-
-        # Setup program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2026, 1, 1)
-        mock_program.end_date = date(2026, 12, 31)
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
-
-        # Setup single critical activity (can't be delayed with preserve_critical_path)
-        activity = MagicMock()
-        activity.id = activity_id
-        activity.code = "ACT-001"
-        activity.early_start = date(2026, 1, 6)
-        activity.early_finish = date(2026, 1, 10)
-        activity.planned_start = date(2026, 1, 6)
-        activity.planned_finish = date(2026, 1, 10)
-        activity.total_float = 0
-        activity.is_critical = True
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[activity])
-
-        # Setup resource
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "RES-001"
-        mock_resource.capacity_per_day = Decimal("8.0")
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._resource_repo.get_by_program = AsyncMock(return_value=([mock_resource], 1))
-
-        # Setup assignment
-        assignment = MagicMock()
-        assignment.activity_id = activity_id
-        assignment.resource_id = resource_id
-        assignment.units = Decimal("1.0")
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[MagicMock()])
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[assignment]
-        )
-
-        # Setup dependencies
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[])
-
-        # Create conflict with single critical activity
-        conflict = ResourceConflict(
-            resource_id=resource_id,
-            conflict_date=date(2026, 1, 6),
-            overallocation_hours=Decimal("4.0"),
-            activities=[activity_id],
-        )
-
-        async def mock_build_conflict_matrix(*args, **kwargs):
-            conflicts = []
-            heappush(conflicts, conflict)
-            return conflicts
-
-        service._build_conflict_matrix = mock_build_conflict_matrix
-
-        options = LevelingOptions(preserve_critical_path=True, max_iterations=5)
-        result = await service.level_program(program_id, options)
-
-        # Should have warning about not being able to resolve
-        assert len(result.warnings) > 0
-        assert "Could not resolve conflict" in result.warnings[0]
-
-    @pytest.mark.asyncio
-    async def test_leveling_loop_delay_days_zero(self):
-        """Test loop when calculated delay is zero."""
-        from heapq import heappush
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService, ResourceConflict
-        from src.services.resource_leveling import LevelingOptions
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        program_id = uuid4()
-        activity_id = uuid4()
-        resource_id = uuid4()
-
-        # Setup program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2026, 1, 1)
-        mock_program.end_date = date(2026, 12, 31)
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
-
-        # Setup activity
-        activity = MagicMock()
-        activity.id = activity_id
-        activity.code = "ACT-001"
-        activity.early_start = date(2026, 1, 6)
-        activity.early_finish = date(2026, 1, 10)
-        activity.planned_start = date(2026, 1, 6)
-        activity.planned_finish = date(2026, 1, 10)
-        activity.total_float = 10
-        activity.is_critical = False
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[activity])
-
-        # Setup resource
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "RES-001"
-        mock_resource.capacity_per_day = Decimal("8.0")
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._resource_repo.get_by_program = AsyncMock(return_value=([mock_resource], 1))
-
-        # Setup assignment
-        assignment = MagicMock()
-        assignment.activity_id = activity_id
-        assignment.resource_id = resource_id
-        assignment.units = Decimal("1.0")
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[MagicMock()])
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[assignment]
-        )
-
-        # Setup dependencies
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[])
-
-        # Create conflict
-        conflict = ResourceConflict(
-            resource_id=resource_id,
-            conflict_date=date(2026, 1, 6),
-            overallocation_hours=Decimal("4.0"),
-            activities=[activity_id],
-        )
-
-        # Build conflict once, then return empty
-        call_count = [0]
-
-        async def mock_build_conflict_matrix(*args, **kwargs):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                conflicts = []
-                heappush(conflicts, conflict)
-                return conflicts
-            return []
-
-        service._build_conflict_matrix = mock_build_conflict_matrix
-
-        # Return 0 delay
-        service._calculate_minimum_delay = AsyncMock(return_value=0)
-
-        options = LevelingOptions(max_iterations=5)
-        result = await service.level_program(program_id, options)
-
-        # Should skip activity with 0 delay
-        assert result.activities_shifted == 0
-
-
-class TestCalculateMinimumDelay:
-    """Tests for the _calculate_minimum_delay method."""
-
-    @pytest.mark.asyncio
-    async def test_delay_with_assignment_found(self):
-        """Test calculating delay when activity has assignment."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        activity_id = uuid4()
-        resource_id = uuid4()
-
-        # Mock resource
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        # Create assignment matching the activity
-        assignment = MagicMock()
-        assignment.activity_id = activity_id
-        assignment.resource_id = resource_id
-        assignment.units = Decimal("0.5")
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[assignment]
-        )
-
-        activity_dates = {
-            activity_id: (date(2026, 1, 6), date(2026, 1, 10)),
-        }
-
-        delay = await service._calculate_minimum_delay(
-            activity_id=activity_id,
-            resource_id=resource_id,
-            conflict_date=date(2026, 1, 6),
-            activity_dates=activity_dates,
-        )
-
-        # Should find a slot (delay >= 1)
-        assert delay >= 1
-
-    @pytest.mark.asyncio
-    async def test_delay_no_matching_assignment(self):
-        """Test delay when no matching assignment exists."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        activity_id = uuid4()
-        other_activity_id = uuid4()
-        resource_id = uuid4()
-
-        # Mock resource
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        # Assignment for different activity
-        assignment = MagicMock()
-        assignment.activity_id = other_activity_id
-        assignment.resource_id = resource_id
-        assignment.units = Decimal("0.5")
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[assignment]
-        )
-
-        activity_dates = {
-            activity_id: (date(2026, 1, 6), date(2026, 1, 10)),
-        }
-
-        delay = await service._calculate_minimum_delay(
-            activity_id=activity_id,
-            resource_id=resource_id,
-            conflict_date=date(2026, 1, 6),
-            activity_dates=activity_dates,
-        )
-
-        # Should return 1 when no matching assignment
-        assert delay == 1
-
-    @pytest.mark.asyncio
-    async def test_delay_resource_not_found(self):
-        """Test delay returns 1 when resource not found."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        activity_id = uuid4()
-        resource_id = uuid4()
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=None)
-
-        activity_dates = {
-            activity_id: (date(2026, 1, 6), date(2026, 1, 10)),
-        }
-
-        delay = await service._calculate_minimum_delay(
-            activity_id=activity_id,
-            resource_id=resource_id,
-            conflict_date=date(2026, 1, 6),
-            activity_dates=activity_dates,
-        )
-
-        # Should return 1 when resource not found
-        assert delay == 1
-
-    @pytest.mark.asyncio
-    async def test_delay_with_overlapping_activities(self):
-        """Test delay with other activities occupying resource."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        activity_id = uuid4()
-        other_activity_id = uuid4()
-        resource_id = uuid4()
-
-        # Mock resource with capacity
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("1.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        # Assignment for target activity
-        target_assignment = MagicMock()
-        target_assignment.activity_id = activity_id
-        target_assignment.resource_id = resource_id
-        target_assignment.units = Decimal("0.5")
-
-        # Assignment for blocking activity using high capacity
-        blocking_assignment = MagicMock()
-        blocking_assignment.activity_id = other_activity_id
-        blocking_assignment.resource_id = resource_id
-        blocking_assignment.units = Decimal("0.8")
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[target_assignment, blocking_assignment]
-        )
-
-        activity_dates = {
-            activity_id: (date(2026, 1, 6), date(2026, 1, 10)),
-            other_activity_id: (date(2026, 1, 6), date(2026, 1, 12)),
-        }
-
-        delay = await service._calculate_minimum_delay(
-            activity_id=activity_id,
-            resource_id=resource_id,
-            conflict_date=date(2026, 1, 6),
-            activity_dates=activity_dates,
-        )
-
-        # Should find a slot after the blocking activity
-        assert delay >= 1
-
-    @pytest.mark.asyncio
-    async def test_delay_with_weekend_skipping(self):
-        """Test delay calculation skips weekends."""
-        from unittest.mock import AsyncMock, MagicMock
-
-        from src.services.parallel_leveling import ParallelLevelingService
-
-        mock_session = AsyncMock()
-        service = ParallelLevelingService(mock_session)
-
-        activity_id = uuid4()
-        resource_id = uuid4()
-
-        # Mock resource
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        # Simple assignment
-        assignment = MagicMock()
-        assignment.activity_id = activity_id
-        assignment.resource_id = resource_id
-        assignment.units = Decimal("0.5")
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[assignment]
-        )
-
-        # Friday conflict - should skip weekend
-        activity_dates = {
-            activity_id: (date(2026, 1, 9), date(2026, 1, 13)),  # Friday
-        }
-
-        delay = await service._calculate_minimum_delay(
-            activity_id=activity_id,
-            resource_id=resource_id,
-            conflict_date=date(2026, 1, 9),  # Friday
-            activity_dates=activity_dates,
-        )
-
-        # Should include weekend skip in delay
-        assert delay >= 1
@@ -9,11 +9,15 @@ from fastapi import HTTPException
 
 from src.api.v1.endpoints.parallel_leveling import (
     _convert_parallel_result_to_response,
+    _convert_variant_to_response,
     _determine_recommendation,
     compare_leveling_algorithms,
+    preview_leveling_variants,
     preview_parallel_leveling,
     run_parallel_leveling,
 )
+from src.schemas.leveling import LevelingOptionsRequest, LevelingWhatIfRequest
+from src.services.leveling_preview import LevelingPreview
 from src.services.resource_leveling import ActivityShift, LevelingResult
 
 # ---------------------------------------------------------------------------
@@ -642,6 +646,94 @@ class TestDetermineRecommendation:
         assert _determine_recommendation(serial, parallel) == "serial"
 
 
+# ---------------------------------------------------------------------------
+# TestPreviewLevelingVariants
+# ---------------------------------------------------------------------------
+
+
+class TestPreviewLevelingVariants:
+    """Tests for the preview_leveling_variants endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_preview_variants_success(self):
+        """Should level every variant and return the snapshot id."""
+        program_id = uuid4()
+        resource_id = uuid4()
+        request = LevelingWhatIfRequest(
+            algorithm="serial",
+            variants=[
+                LevelingOptionsRequest(),
+                LevelingOptionsRequest(
+                    preserve_critical_path=False, target_resources=[resource_id]
+                ),
+            ],
+            snapshot_id="abc123",
+        )
+        preview = LevelingPreview(
+            snapshot_id="abc123",
+            algorithm="serial",
+            results=[_make_serial_result(program_id=program_id), _make_serial_result()],
+        )
+
+        with patch("src.api.v1.endpoints.parallel_leveling.ProgramRepository") as mock_repo_class:
+            program = MagicMock()
+            mock_repo_class.return_value.get_by_id_shallow = AsyncMock(return_value=program)
+
+            with patch(
+                "src.api.v1.endpoints.parallel_leveling.LevelingPreviewService"
+            ) as mock_service_class:
+                mock_service = MagicMock()
+                mock_service.preview = AsyncMock(return_value=preview)
+                mock_service_class.return_value = mock_service
+
+                result = await preview_leveling_variants(
+                    program_id, request, AsyncMock(), MagicMock()
+                )
+
+        assert result.snapshot_id == "abc123"
+        assert result.algorithm == "serial"
+        assert len(result.results) == 2
+        assert result.results[0].program_id == program_id
+        assert result.results[0].conflicts_resolved == 0
+
+        args, kwargs = mock_service.preview.call_args
+        assert args[0] == program_id
+        assert [v.preserve_critical_path for v in args[1]] == [True, False]
+        assert args[1][1].target_resources == [resource_id]
+        assert kwargs == {"algorithm": "serial", "snapshot_id": "abc123", "program": program}
+
+    @pytest.mark.asyncio
+    async def test_preview_variants_program_not_found(self):
+        """Should raise HTTPException 404 when program not found."""
+        request = LevelingWhatIfRequest(variants=[LevelingOptionsRequest()])
+
+        with patch("src.api.v1.endpoints.parallel_leveling.ProgramRepository") as mock_repo_class:
+            mock_repo_class.return_value.get_by_id_shallow = AsyncMock(return_value=None)
+
+            with pytest.raises(HTTPException) as exc_info:
+                await preview_leveling_variants(uuid4(), request, AsyncMock(), MagicMock())
+
+        assert exc_info.value.status_code == 404
+
+    def test_request_requires_variants(self):
+        """Should reject a request without variants."""
+        with pytest.raises(ValueError, match="variants"):
+            LevelingWhatIfRequest(variants=[])
+
+    def test_converts_serial_variant(self):
+        """Should convert serial results with zero parallel metrics."""
+        shift = _make_activity_shift(activity_code="TSK-007")
+        result = _make_serial_result(shifts=[shift], warnings=["Warning 1"])
+
+        response = _convert_variant_to_response(result)
+
+        assert response.shifts[0].activity_code == "TSK-007"
+        assert response.warnings == ["Warning 1"]
+        assert response.conflicts_resolved == 0
+        assert response.resources_processed == 0
+        assert _convert_variant_to_response(_make_parallel_result()).conflicts_resolved == 3
+
+
 # ---------------------------------------------------------------------------
 # TestConvertParallelResultToResponse
 # ---------------------------------------------------------------------------
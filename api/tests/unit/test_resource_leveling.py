@@ -6,23 +6,36 @@ Tests the serial resource leveling algorithm including:
 - Float constraints
 - Multiple resource handling
 - Successor recalculation
+- In-memory resource loads and bulk snapshot loading
 """
 
 from __future__ import annotations
 
-from datetime import date, timedelta
+import pickle
+from datetime import date
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
 
+from src.services.leveling_snapshot import (
+    ExternalLoad,
+    LevelingActivity,
+    LevelingAssignment,
+    LevelingDependency,
+    LevelingResource,
+    LevelingSnapshot,
+)
 from src.services.resource_leveling import (
     ActivityShift,
     LevelingOptions,
     LevelingResult,
     ResourceLevelingService,
+    ResourceLoad,
+    SerialLevelingEngine,
 )
+from src.services.working_calendar import WorkingCalendar
 
 
 class TestLevelingOptions:
@@ -115,903 +128,744 @@ class TestLevelingResult:
         assert len(result.warnings) == 1
 
 
+def _activity(
+    code: str = "ACT-001",
+    start: date | None = date(2024, 1, 15),
+    finish: date | None = date(2024, 1, 19),
+    *,
+    total_float: int | None = 10,
+    is_critical: bool = False,
+) -> LevelingActivity:
+    return LevelingActivity(
+        id=uuid4(),
+        code=code,
+        start=start,
+        finish=finish,
+        total_float=total_float,
+        is_critical=is_critical,
+    )
+
+
+def _resource(code: str = "ENG-001", capacity: str = "8.0") -> LevelingResource:
+    return LevelingResource(id=uuid4(), code=code, capacity_per_day=Decimal(capacity))
+
+
+def _assign(
+    activity: LevelingActivity, resource: LevelingResource, units: str
+) -> LevelingAssignment:
+    return LevelingAssignment(
+        activity_id=activity.id, resource_id=resource.id, units=Decimal(units)
+    )
+
+
+def _snapshot(
+    activities: list[LevelingActivity],
+    assignments: list[LevelingAssignment] | None = None,
+    resources: list[LevelingResource] | None = None,
+    *,
+    external_loads: list[ExternalLoad] | None = None,
+    dependencies: list[LevelingDependency] | None = None,
+) -> LevelingSnapshot:
+    resources = resources or []
+    return LevelingSnapshot(
+        program_id=uuid4(),
+        start_date=date(2024, 1, 1),
+        end_date=date(2024, 12, 31),
+        activities=tuple(activities),
+        assignments=tuple(assignments or []),
+        external_loads=tuple(external_loads or []),
+        resources=tuple(resources),
+        program_resource_ids=tuple(r.id for r in resources),
+        dependencies=tuple(dependencies or []),
+    )
+
+
+def _engine(snapshot: LevelingSnapshot, **options: object) -> SerialLevelingEngine:
+    """Engine with loads built, ready for calls to its helpers."""
+    engine = SerialLevelingEngine(snapshot, LevelingOptions(**options))  # type: ignore[arg-type]
+    engine._build_loads()
+    return engine
+
+
+def _dependency(
+    predecessor: LevelingActivity,
+    successor: LevelingActivity,
+    dependency_type: str = "FS",
+    lag: int = 0,
+) -> LevelingDependency:
+    return LevelingDependency(
+        predecessor_id=predecessor.id,
+        successor_id=successor.id,
+        dependency_type=dependency_type,
+        lag=lag,
+    )
+
+
 class TestGetLevelingPriority:
-    """Tests for _get_leveling_priority method."""
+    """Tests for leveling priority ordering."""
 
     def test_priority_by_early_start(self) -> None:
         """Should prioritize earlier start dates."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity1 = MagicMock()
-        activity1.id = uuid4()
-        activity1.early_start = date(2024, 1, 15)
-        activity1.total_float = 5
-
-        activity2 = MagicMock()
-        activity2.id = uuid4()
-        activity2.early_start = date(2024, 1, 10)
-        activity2.total_float = 5
-
-        working_dates = {
-            activity1.id: (date(2024, 1, 15), date(2024, 1, 19)),
-            activity2.id: (date(2024, 1, 10), date(2024, 1, 14)),
-        }
+        activity1 = _activity(start=date(2024, 1, 15), total_float=5)
+        activity2 = _activity(start=date(2024, 1, 10), total_float=5)
+        engine = SerialLevelingEngine(_snapshot([activity1, activity2]))
 
-        priority1 = service._get_leveling_priority(activity1, working_dates)
-        priority2 = service._get_leveling_priority(activity2, working_dates)
+        priority1 = engine._get_leveling_priority(activity1)
+        priority2 = engine._get_leveling_priority(activity2)
 
         # Activity2 should come first (earlier start)
         assert priority2 < priority1
 
     def test_priority_by_float_when_same_start(self) -> None:
         """Should prioritize less float when same start date."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity1 = MagicMock()
-        activity1.id = uuid4()
-        activity1.total_float = 10
-
-        activity2 = MagicMock()
-        activity2.id = uuid4()
-        activity2.total_float = 2
+        activity1 = _activity(total_float=10)
+        activity2 = _activity(total_float=2)
+        engine = SerialLevelingEngine(_snapshot([activity1, activity2]))
 
-        # Same start date
-        working_dates = {
-            activity1.id: (date(2024, 1, 15), date(2024, 1, 19)),
-            activity2.id: (date(2024, 1, 15), date(2024, 1, 19)),
-        }
-
-        priority1 = service._get_leveling_priority(activity1, working_dates)
-        priority2 = service._get_leveling_priority(activity2, working_dates)
+        priority1 = engine._get_leveling_priority(activity1)
+        priority2 = engine._get_leveling_priority(activity2)
 
         # Activity2 should come first (less float = more constrained)
         assert priority2 < priority1
 
+    def test_undated_activities_last(self) -> None:
+        """Should sort activities without dates or float last."""
+        dated = _activity(total_float=None)
+        undated = _activity(start=None, total_float=0)
+        engine = SerialLevelingEngine(_snapshot([dated, undated]))
+
+        assert engine._get_leveling_priority(dated) < engine._get_leveling_priority(undated)
+        assert engine._get_leveling_priority(dated)[1] == 9999
+
 
 class TestCanDelayActivity:
     """Tests for _can_delay_activity method."""
 
     def test_cannot_delay_critical_when_preserved(self) -> None:
         """Should not delay critical activities when preserve_critical_path is True."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity = MagicMock()
-        activity.is_critical = True
-        activity.total_float = 0
+        activity = _activity(is_critical=True, total_float=0)
+        engine = SerialLevelingEngine(_snapshot([activity]), LevelingOptions())
 
-        options = LevelingOptions(preserve_critical_path=True)
-        working_dates = {}
-
-        result = service._can_delay_activity(activity, 5, options, working_dates)
-
-        assert result is False
+        assert engine._can_delay_activity(activity, 5) is False
 
     def test_can_delay_critical_when_not_preserved(self) -> None:
         """Should allow delaying critical activities when preserve_critical_path is False."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity = MagicMock()
-        activity.is_critical = True
-        activity.total_float = 0
-
+        activity = _activity(is_critical=True, total_float=0)
         options = LevelingOptions(preserve_critical_path=False, level_within_float=False)
-        working_dates = {}
-
-        result = service._can_delay_activity(activity, 5, options, working_dates)
+        engine = SerialLevelingEngine(_snapshot([activity]), options)
 
-        assert result is True
+        assert engine._can_delay_activity(activity, 5) is True
 
     def test_cannot_delay_beyond_float(self) -> None:
         """Should not delay beyond total float when level_within_float is True."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity = MagicMock()
-        activity.is_critical = False
-        activity.total_float = 3
-
-        options = LevelingOptions(level_within_float=True)
-        working_dates = {}
-
-        # 5 days delay > 3 days float
-        result = service._can_delay_activity(activity, 5, options, working_dates)
+        activity = _activity(total_float=3)
+        engine = SerialLevelingEngine(_snapshot([activity]), LevelingOptions())
 
-        assert result is False
+        assert engine._can_delay_activity(activity, 5) is False
 
     def test_can_delay_within_float(self) -> None:
         """Should allow delay within total float."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+        activity = _activity(total_float=10)
+        engine = SerialLevelingEngine(_snapshot([activity]), LevelingOptions())
 
-        activity = MagicMock()
-        activity.is_critical = False
-        activity.total_float = 10
-
-        options = LevelingOptions(level_within_float=True)
-        working_dates = {}
-
-        # 5 days delay < 10 days float
-        result = service._can_delay_activity(activity, 5, options, working_dates)
-
-        assert result is True
+        assert engine._can_delay_activity(activity, 5) is True
 
     def test_can_delay_beyond_float_when_disabled(self) -> None:
         """Should allow delay beyond float when level_within_float is False."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity = MagicMock()
-        activity.is_critical = False
-        activity.total_float = 3
-
+        activity = _activity(total_float=3)
         options = LevelingOptions(level_within_float=False)
-        working_dates = {}
+        engine = SerialLevelingEngine(_snapshot([activity]), options)
 
-        # 10 days delay > 3 days float, but constraint disabled
-        result = service._can_delay_activity(activity, 10, options, working_dates)
-
-        assert result is True
+        assert engine._can_delay_activity(activity, 5) is True
 
     def test_cannot_delay_zero_days(self) -> None:
         """Should not allow zero or negative delays."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+        activity = _activity()
+        engine = SerialLevelingEngine(_snapshot([activity]), LevelingOptions())
 
-        activity = MagicMock()
-        activity.is_critical = False
-        activity.total_float = 10
+        assert engine._can_delay_activity(activity, 0) is False
 
-        options = LevelingOptions()
-        working_dates = {}
 
-        assert service._can_delay_activity(activity, 0, options, working_dates) is False
-        assert service._can_delay_activity(activity, -1, options, working_dates) is False
-
-
-class TestLevelingSimpleOverallocation:
-    """Tests for leveling simple over-allocation scenarios."""
-
-    @pytest.mark.asyncio
-    async def test_leveling_simple_overallocation(self) -> None:
-        """Should resolve simple over-allocation by delaying activity."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+class TestResourceLoad:
+    """Tests for per-resource daily load arrays."""
 
-        program_id = uuid4()
-        activity_id = uuid4()
-        resource_id = uuid4()
-
-        # Mock program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2024, 1, 1)
-        mock_program.end_date = date(2024, 12, 31)
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
-
-        # Mock activity
-        mock_activity = MagicMock()
-        mock_activity.id = activity_id
-        mock_activity.code = "ACT-001"
-        mock_activity.early_start = date(2024, 1, 15)
-        mock_activity.early_finish = date(2024, 1, 19)
-        mock_activity.planned_start = date(2024, 1, 15)
-        mock_activity.planned_finish = date(2024, 1, 19)
-        mock_activity.is_critical = False
-        mock_activity.total_float = 10
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[mock_activity])
-
-        # Mock resource
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "ENG-001"
-        mock_resource.capacity_per_day = Decimal("8.0")
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._resource_repo.get_by_program = AsyncMock(return_value=[mock_resource])
-
-        # Mock assignment
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = activity_id
-        mock_assignment.resource_id = resource_id
-        mock_assignment.units = Decimal("1.0")
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[mock_assignment])
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[mock_assignment]
-        )
-
-        # Mock no dependencies
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[])
-
-        # Mock over-allocation detection (first call: overallocated, second: not)
-        call_count = [0]
-
-        async def mock_is_overallocated(*args, **kwargs):
-            call_count[0] += 1
-            return call_count[0] == 1  # Only overallocated on first check
-
-        service._is_overallocated_on_dates = mock_is_overallocated
+    def test_overallocated_on_weekday(self) -> None:
+        """Should detect over-allocation on weekdays."""
+        load = ResourceLoad()
+        load.add(date(2024, 1, 15), date(2024, 1, 19), 150)  # Monday-Friday
 
-        # Mock finding available slot
-        service._find_next_available_slot = AsyncMock(
-            return_value=date(2024, 1, 22)  # 7 days later
-        )
+        assert load.is_overallocated(date(2024, 1, 15), date(2024, 1, 19)) is True
 
-        # Mock counting remaining
-        service._count_remaining_overallocations = AsyncMock(return_value=0)
+    def test_not_overallocated_within_capacity(self) -> None:
+        """Should return False when within capacity."""
+        load = ResourceLoad()
+        load.add(date(2024, 1, 15), date(2024, 1, 19), 50)
+        load.add(date(2024, 1, 15), date(2024, 1, 19), 50)
 
-        # Act
-        result = await service.level_program(program_id)
+        assert load.is_overallocated(date(2024, 1, 15), date(2024, 1, 19)) is False
 
-        # Assert
-        assert result.success is True
-        assert result.activities_shifted == 1
-        assert len(result.shifts) == 1
-        assert result.shifts[0].delay_days == 7
+    def test_weekends_ignored(self) -> None:
+        """Should ignore over-allocation on Saturday and Sunday."""
+        load = ResourceLoad()
+        load.add(date(2024, 1, 13), date(2024, 1, 14), 300)
 
-    @pytest.mark.asyncio
-    async def test_leveling_no_change_when_no_overallocation(self) -> None:
-        """Should not make changes when no over-allocation exists."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+        assert load.is_overallocated(date(2024, 1, 12), date(2024, 1, 15)) is False
 
-        program_id = uuid4()
-        activity_id = uuid4()
-        resource_id = uuid4()
+    def test_remove_and_grow(self) -> None:
+        """Should track removals and dates far outside the first range."""
+        load = ResourceLoad()
+        load.add(date(2024, 1, 15), date(2024, 1, 19), 150)
+        load.add(date(2024, 1, 15), date(2024, 1, 19), -150)
+        load.add(date(2027, 6, 1), date(2027, 6, 4), 200)
+        load.add(date(2020, 3, 2), date(2020, 3, 2), 101)
 
-        # Mock program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2024, 1, 1)
-        mock_program.end_date = date(2024, 12, 31)
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
+        assert load.is_overallocated(date(2024, 1, 1), date(2024, 12, 31)) is False
+        assert load.is_overallocated(date(2027, 6, 4), date(2027, 6, 4)) is True
+        assert load.is_overallocated(date(2020, 3, 2), date(2020, 3, 2)) is True
+        assert load.is_overallocated(date(2030, 1, 1), date(2030, 1, 31)) is False
 
-        # Mock activity
-        mock_activity = MagicMock()
-        mock_activity.id = activity_id
-        mock_activity.code = "ACT-001"
-        mock_activity.early_start = date(2024, 1, 15)
-        mock_activity.early_finish = date(2024, 1, 19)
-        mock_activity.planned_start = date(2024, 1, 15)
-        mock_activity.planned_finish = date(2024, 1, 19)
-        mock_activity.is_critical = False
-        mock_activity.total_float = 10
+    def test_empty_load(self) -> None:
+        """Should never report over-allocation without any load."""
+        assert ResourceLoad().is_overallocated(date(2024, 1, 1), date(2024, 1, 31)) is False
 
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[mock_activity])
-
-        # Mock resource
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "ENG-001"
-        mock_resource.capacity_per_day = Decimal("8.0")
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._resource_repo.get_by_program = AsyncMock(return_value=[mock_resource])
-
-        # Mock assignment
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = activity_id
-        mock_assignment.resource_id = resource_id
-        mock_assignment.units = Decimal("0.5")  # 50% - no over-allocation
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[mock_assignment])
-
-        # No over-allocation
-        service._is_overallocated_on_dates = AsyncMock(return_value=False)
-        service._count_remaining_overallocations = AsyncMock(return_value=0)
-
-        # Act
-        result = await service.level_program(program_id)
-
-        # Assert
-        assert result.success is True
-        assert result.activities_shifted == 0
-        assert len(result.shifts) == 0
-        assert result.iterations_used == 1
+    def test_find_slot_skips_weekends(self) -> None:
+        """Should skip weekend days when finding slot."""
+        load = ResourceLoad()
 
+        # Saturday
+        slot = load.find_slot(date(2024, 1, 13), 0, 100, [])
 
-class TestLevelingRespectsConstraints:
-    """Tests for leveling constraint handling."""
+        # Should skip to Monday
+        assert slot == date(2024, 1, 15)
 
-    @pytest.mark.asyncio
-    async def test_leveling_respects_critical_path(self) -> None:
-        """Should not delay critical path activities when preserve_critical_path is True."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+    def test_find_slot_after_other_load(self) -> None:
+        """Should start after other work when the activity does not fit beside it."""
+        load = ResourceLoad()
+        load.add(date(2024, 1, 15), date(2024, 1, 17), 50)
+        load.add(date(2024, 1, 15), date(2024, 1, 16), 100)  # The activity itself
 
-        program_id = uuid4()
-        activity_id = uuid4()
-        resource_id = uuid4()
+        slot = load.find_slot(
+            date(2024, 1, 15), 1, 100, [(date(2024, 1, 15), date(2024, 1, 16), 100)]
+        )
 
-        # Mock program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2024, 1, 1)
-        mock_program.end_date = date(2024, 12, 31)
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
+        assert slot == date(2024, 1, 18)
 
-        # Mock CRITICAL activity
-        mock_activity = MagicMock()
-        mock_activity.id = activity_id
-        mock_activity.code = "ACT-001"
-        mock_activity.early_start = date(2024, 1, 15)
-        mock_activity.early_finish = date(2024, 1, 19)
-        mock_activity.planned_start = date(2024, 1, 15)
-        mock_activity.planned_finish = date(2024, 1, 19)
-        mock_activity.is_critical = True  # Critical path!
-        mock_activity.total_float = 0
+    def test_find_slot_excludes_own_load(self) -> None:
+        """Should not count the activity's current load against itself."""
+        load = ResourceLoad()
+        load.add(date(2024, 1, 15), date(2024, 1, 19), 100)
 
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[mock_activity])
-
-        # Mock resource
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "ENG-001"
-        mock_resource.capacity_per_day = Decimal("8.0")
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._resource_repo.get_by_program = AsyncMock(return_value=[mock_resource])
-
-        # Mock assignment
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = activity_id
-        mock_assignment.resource_id = resource_id
-        mock_assignment.units = Decimal("1.5")  # Over-allocated
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[mock_assignment])
-
-        # Over-allocation exists
-        service._is_overallocated_on_dates = AsyncMock(return_value=True)
-        service._find_next_available_slot = AsyncMock(return_value=date(2024, 1, 22))
-        service._count_remaining_overallocations = AsyncMock(return_value=1)
-
-        # Act - preserve critical path
-        options = LevelingOptions(preserve_critical_path=True)
-        result = await service.level_program(program_id, options)
-
-        # Assert - should not have shifted the critical activity
-        assert result.activities_shifted == 0
-        assert result.remaining_overallocations == 1
-        assert "Cannot delay critical activity ACT-001" in result.warnings
-
-    @pytest.mark.asyncio
-    async def test_leveling_within_float_only(self) -> None:
-        """Should only delay within float when level_within_float is True."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+        slot = load.find_slot(
+            date(2024, 1, 15), 4, 100, [(date(2024, 1, 15), date(2024, 1, 19), 100)]
+        )
 
-        program_id = uuid4()
-        activity_id = uuid4()
-        resource_id = uuid4()
+        assert slot == date(2024, 1, 15)
 
-        # Mock program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2024, 1, 1)
-        mock_program.end_date = date(2024, 12, 31)
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
+    def test_find_slot_none_when_units_never_fit(self) -> None:
+        """Should return None when no candidate fits."""
+        load = ResourceLoad()
 
-        # Mock activity with LIMITED float
-        mock_activity = MagicMock()
-        mock_activity.id = activity_id
-        mock_activity.code = "ACT-001"
-        mock_activity.early_start = date(2024, 1, 15)
-        mock_activity.early_finish = date(2024, 1, 19)
-        mock_activity.planned_start = date(2024, 1, 15)
-        mock_activity.planned_finish = date(2024, 1, 19)
-        mock_activity.is_critical = False
-        mock_activity.total_float = 3  # Only 3 days of float
+        assert load.find_slot(date(2024, 1, 15), 4, 150, []) is None
 
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[mock_activity])
-
-        # Mock resource
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "ENG-001"
-        mock_resource.capacity_per_day = Decimal("8.0")
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._resource_repo.get_by_program = AsyncMock(return_value=[mock_resource])
-
-        # Mock assignment
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = activity_id
-        mock_assignment.resource_id = resource_id
-        mock_assignment.units = Decimal("1.5")
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[mock_assignment])
-
-        # Over-allocation exists, needs 7 days delay
-        service._is_overallocated_on_dates = AsyncMock(return_value=True)
-        service._find_next_available_slot = AsyncMock(
-            return_value=date(2024, 1, 22)  # 7 days later
+    def test_calendar_working_days(self) -> None:
+        """Should check and place work on the resource calendar's working days."""
+        calendar = WorkingCalendar(
+            Decimal("8.0"), working_days=[1, 2, 3, 4, 5, 6], holidays=[date(2024, 1, 15)]
         )
-        service._count_remaining_overallocations = AsyncMock(return_value=1)
-
-        # Act - level within float only
-        options = LevelingOptions(level_within_float=True)
-        result = await service.level_program(program_id, options)
+        load = ResourceLoad(calendar)
+        load.add(date(2024, 1, 13), date(2024, 1, 15), 150)
 
-        # Assert - should not shift (7 days > 3 days float)
-        assert result.activities_shifted == 0
-        assert result.remaining_overallocations == 1
+        # Saturday counts, Sunday and the Monday holiday do not
+        assert load.is_overallocated(date(2024, 1, 13), date(2024, 1, 13)) is True
+        assert load.is_overallocated(date(2024, 1, 14), date(2024, 1, 15)) is False
+        assert load.find_slot(date(2024, 1, 14), 0, 100, []) == date(2024, 1, 16)
 
 
-class TestLevelingMaxIterations:
-    """Tests for max iterations limit."""
-
-    @pytest.mark.asyncio
-    async def test_leveling_max_iterations_limit(self) -> None:
-        """Should stop after max iterations."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        program_id = uuid4()
-        activity_id = uuid4()
-        resource_id = uuid4()
+class TestFindNextAvailableSlot:
+    """Tests for _find_next_available_slot method."""
 
-        # Mock program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2024, 1, 1)
-        mock_program.end_date = date(2024, 12, 31)
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
+    def test_find_slot_with_other_assignments(self) -> None:
+        """Should find slot after other assignments release the resource."""
+        resource = _resource()
+        activity = _activity(start=date(2024, 1, 15), finish=date(2024, 1, 15))
+        other = _activity("ACT-002", start=date(2024, 1, 15), finish=date(2024, 1, 19))
+        engine = _engine(
+            _snapshot(
+                [activity, other],
+                [_assign(activity, resource, "1.0"), _assign(other, resource, "0.5")],
+                [resource],
+            )
+        )
 
-        # Mock activity
-        mock_activity = MagicMock()
-        mock_activity.id = activity_id
-        mock_activity.code = "ACT-001"
-        mock_activity.early_start = date(2024, 1, 15)
-        mock_activity.early_finish = date(2024, 1, 19)
-        mock_activity.planned_start = date(2024, 1, 15)
-        mock_activity.planned_finish = date(2024, 1, 19)
-        mock_activity.is_critical = False
-        mock_activity.total_float = 100
+        assert engine._find_next_available_slot(activity, resource.id) == date(2024, 1, 22)
+
+    def test_find_slot_beside_partial_assignments(self) -> None:
+        """Should keep the start when both assignments fit together."""
+        resource = _resource()
+        activity = _activity(start=date(2024, 1, 15), finish=date(2024, 1, 15))
+        other = _activity("ACT-002", start=date(2024, 1, 15), finish=date(2024, 1, 19))
+        engine = _engine(
+            _snapshot(
+                [activity, other],
+                [_assign(activity, resource, "0.5"), _assign(other, resource, "0.5")],
+                [resource],
+            )
+        )
 
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[mock_activity])
-
-        # Mock resource
-        mock_resource = MagicMock()
-        mock_resource.id = resource_id
-        mock_resource.code = "ENG-001"
-        mock_resource.capacity_per_day = Decimal("8.0")
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._resource_repo.get_by_program = AsyncMock(return_value=[mock_resource])
-
-        # Mock assignment
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = activity_id
-        mock_assignment.resource_id = resource_id
-        mock_assignment.units = Decimal("1.5")
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[mock_assignment])
-
-        # Always overallocated (infinite loop scenario)
-        service._is_overallocated_on_dates = AsyncMock(return_value=True)
-
-        call_count = [0]
-        original_start = date(2024, 1, 15)
-
-        async def incrementing_slot(*args, **kwargs):
-            call_count[0] += 1
-            return original_start + timedelta(days=call_count[0])
-
-        service._find_next_available_slot = incrementing_slot
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[])
-        service._count_remaining_overallocations = AsyncMock(return_value=1)
-
-        # Act - very low max iterations
-        options = LevelingOptions(max_iterations=5)
-        result = await service.level_program(program_id, options)
-
-        # Assert - should stop at max iterations
-        assert result.iterations_used == 5
-        assert result.success is False
+        assert engine._find_next_available_slot(activity, resource.id) == date(2024, 1, 15)
+
+    def test_find_slot_counts_external_loads(self) -> None:
+        """Should treat other programs' assignments as fixed load."""
+        resource = _resource()
+        activity = _activity(start=date(2024, 1, 15), finish=date(2024, 1, 16))
+        external = ExternalLoad(
+            resource_id=resource.id,
+            start=date(2024, 1, 15),
+            finish=date(2024, 1, 22),
+            units=Decimal("0.75"),
+        )
+        engine = _engine(
+            _snapshot(
+                [activity],
+                [_assign(activity, resource, "0.5")],
+                [resource],
+                external_loads=[external],
+            )
+        )
 
+        assert engine._find_next_available_slot(activity, resource.id) == date(2024, 1, 23)
 
-class TestLevelingEmptyProgram:
-    """Tests for edge cases."""
+    def test_find_slot_search_limit(self) -> None:
+        """Should fall back to a year later when no slot exists."""
+        resource = _resource()
+        activity = _activity()
+        engine = _engine(_snapshot([activity], [_assign(activity, resource, "1.5")], [resource]))
 
-    @pytest.mark.asyncio
-    async def test_leveling_empty_program(self) -> None:
-        """Should handle program with no activities."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+        assert engine._find_next_available_slot(activity, resource.id) == date(2025, 1, 14)
 
-        program_id = uuid4()
 
-        # Mock program
-        mock_program = MagicMock()
-        mock_program.start_date = date(2024, 1, 1)
-        mock_program.end_date = date(2024, 12, 31)
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
+class TestRecalculateSuccessors:
+    """Tests for _recalculate_successors method."""
 
-        # No activities
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[])
+    def _dates_after_delay(
+        self,
+        predecessor_dates: tuple[date, date],
+        successor_dates: tuple[date, date],
+        dependency_type: str,
+        lag: int = 0,
+    ) -> tuple[date, date]:
+        predecessor = _activity("ACT-001", *predecessor_dates)
+        successor = _activity("ACT-002", *successor_dates)
+        engine = _engine(
+            _snapshot(
+                [predecessor, successor],
+                dependencies=[_dependency(predecessor, successor, dependency_type, lag)],
+            )
+        )
 
-        # Act
-        result = await service.level_program(program_id)
+        engine._recalculate_successors(predecessor.id)
 
-        # Assert
-        assert result.success is True
-        assert result.activities_shifted == 0
-        assert result.iterations_used == 0
+        return engine._working_dates[successor.id]
 
-    @pytest.mark.asyncio
-    async def test_leveling_nonexistent_program(self) -> None:
-        """Should handle nonexistent program."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+    def test_recalculate_fs_dependency(self) -> None:
+        """Should recalculate successor dates for FS dependency."""
+        new_start, _ = self._dates_after_delay(
+            (date(2024, 1, 15), date(2024, 1, 19)),
+            (date(2024, 1, 18), date(2024, 1, 22)),  # Overlapping
+            "FS",
+        )
 
-        # Program not found
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=None)
+        # Successor should be pushed to start after predecessor finishes
+        assert new_start == date(2024, 1, 20)
 
-        # Act
-        result = await service.level_program(uuid4())
+    def test_recalculate_ss_dependency(self) -> None:
+        """Should recalculate successor dates for SS dependency."""
+        new_start, _ = self._dates_after_delay(
+            (date(2024, 1, 15), date(2024, 1, 19)),
+            (date(2024, 1, 14), date(2024, 1, 18)),
+            "SS",
+            lag=2,
+        )
 
-        # Assert
-        assert result.success is False
-        assert "Program not found" in result.warnings
+        # Successor should start at predecessor start + lag
+        assert new_start == date(2024, 1, 17)
+
+    def test_recalculate_ff_dependency(self) -> None:
+        """Should align successor finish with predecessor finish for FF."""
+        new_start, new_finish = self._dates_after_delay(
+            (date(2024, 1, 15), date(2024, 1, 25)),
+            (date(2024, 1, 10), date(2024, 1, 15)),
+            "FF",
+        )
 
+        assert new_finish == date(2024, 1, 25)
+        assert new_start == date(2024, 1, 20)
+
+    def test_recalculate_sf_dependency(self) -> None:
+        """Should finish successor at predecessor start for SF."""
+        new_start, new_finish = self._dates_after_delay(
+            (date(2024, 1, 15), date(2024, 1, 25)),
+            (date(2024, 1, 5), date(2024, 1, 10)),
+            "SF",
+        )
 
-class TestGetTargetResources:
-    """Tests for _get_target_resources method."""
+        assert new_finish == date(2024, 1, 15)
+        assert new_start == date(2024, 1, 10)
 
-    @pytest.mark.asyncio
-    async def test_target_resources_none(self) -> None:
-        """Should return None when no target resources specified."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+    def test_recalculate_unknown_dependency_type(self) -> None:
+        """Should treat unknown dependency types as FS."""
+        new_start, _ = self._dates_after_delay(
+            (date(2024, 1, 15), date(2024, 1, 19)),
+            (date(2024, 1, 18), date(2024, 1, 22)),
+            "XX",
+        )
 
-        options = LevelingOptions()
-        result = await service._get_target_resources(uuid4(), options)
+        assert new_start == date(2024, 1, 20)
 
-        assert result is None
+    def test_recalculate_with_lag(self) -> None:
+        """Should add lag to FS dependencies."""
+        new_start, new_finish = self._dates_after_delay(
+            (date(2024, 1, 15), date(2024, 1, 19)),
+            (date(2024, 1, 18), date(2024, 1, 22)),
+            "FS",
+            lag=3,
+        )
 
-    @pytest.mark.asyncio
-    async def test_target_resources_specified(self) -> None:
-        """Should return set of target resource IDs."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+        assert new_start == date(2024, 1, 23)
+        assert new_finish == date(2024, 1, 27)
+
+    def test_recalculate_does_not_pull_earlier(self) -> None:
+        """Should leave successors that already start late enough."""
+        dates = (date(2024, 2, 1), date(2024, 2, 5))
+        assert self._dates_after_delay((date(2024, 1, 15), date(2024, 1, 19)), dates, "FS") == dates
+
+    def test_recalculate_chain_moves_loads(self) -> None:
+        """Should propagate through chains and move successor resource load."""
+        resource = _resource()
+        first = _activity("A", date(2024, 1, 15), date(2024, 1, 16))
+        second = _activity("B", date(2024, 1, 17), date(2024, 1, 18))
+        third = _activity("C", date(2024, 1, 19), date(2024, 1, 19))
+        engine = _engine(
+            _snapshot(
+                [first, second, third],
+                [_assign(third, resource, "1.5")],
+                [resource],
+                dependencies=[_dependency(first, second), _dependency(second, third)],
+            )
+        )
 
-        resource_ids = [uuid4(), uuid4()]
-        options = LevelingOptions(target_resources=resource_ids)
-        result = await service._get_target_resources(uuid4(), options)
+        engine._move(first.id, date(2024, 1, 22), date(2024, 1, 23))
+        engine._recalculate_successors(first.id)
 
-        assert result == set(resource_ids)
+        assert engine._working_dates[second.id] == (date(2024, 1, 24), date(2024, 1, 25))
+        assert engine._working_dates[third.id] == (date(2024, 1, 26), date(2024, 1, 26))
+        load = engine._loads[resource.id]
+        assert load.is_overallocated(date(2024, 1, 19), date(2024, 1, 19)) is False
+        assert load.is_overallocated(date(2024, 1, 26), date(2024, 1, 26)) is True
 
 
-class TestGetProjectFinish:
-    """Tests for _get_project_finish method."""
+class TestProjectFinish:
+    """Tests for _project_finish method."""
 
-    @pytest.mark.asyncio
-    async def test_project_finish_with_activities(self) -> None:
+    def test_project_finish_with_activities(self) -> None:
         """Should return latest activity finish date."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity1 = MagicMock()
-        activity1.early_finish = date(2024, 2, 15)
-        activity1.planned_finish = date(2024, 2, 15)
-
-        activity2 = MagicMock()
-        activity2.early_finish = date(2024, 3, 1)
-        activity2.planned_finish = date(2024, 3, 1)
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[activity1, activity2])
-
-        result = await service._get_project_finish(uuid4())
+        engine = SerialLevelingEngine(
+            _snapshot([_activity(finish=date(2024, 2, 15)), _activity(finish=date(2024, 3, 1))])
+        )
 
-        assert result == date(2024, 3, 1)
+        assert engine._project_finish() == date(2024, 3, 1)
 
-    @pytest.mark.asyncio
-    async def test_project_finish_no_activities(self) -> None:
+    def test_project_finish_no_activities(self) -> None:
         """Should return program end date when no activities."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        mock_program = MagicMock()
-        mock_program.end_date = date(2024, 12, 31)
+        assert SerialLevelingEngine(_snapshot([]))._project_finish() == date(2024, 12, 31)
 
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[])
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
+    def test_project_finish_undated_activities(self) -> None:
+        """Should return today when no activity has a finish date."""
+        engine = SerialLevelingEngine(_snapshot([_activity(finish=None)]))
 
-        result = await service._get_project_finish(uuid4())
+        assert engine._project_finish() == date.today()
 
-        assert result == date(2024, 12, 31)
 
-    @pytest.mark.asyncio
-    async def test_project_finish_no_program(self) -> None:
-        """Should return today when no program found."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[])
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=None)
-
-        result = await service._get_project_finish(uuid4())
-
-        assert result == date.today()
-
-
-class TestIsOverallocatedOnDates:
-    """Tests for _is_overallocated_on_dates method."""
-
-    @pytest.mark.asyncio
-    async def test_not_overallocated_no_resource(self) -> None:
-        """Should return False when resource not found."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=None)
+class TestCountRemainingOverallocations:
+    """Tests for _count_remaining_overallocations method."""
 
-        result = await service._is_overallocated_on_dates(
-            uuid4(),
-            date(2024, 1, 15),
-            date(2024, 1, 19),
-            {},
-            {},
+    def test_count_with_target_resources(self) -> None:
+        """Should only count target resources."""
+        resource1 = _resource("R1")
+        resource2 = _resource("R2")
+        activity = _activity()
+        engine = _engine(
+            _snapshot(
+                [activity],
+                [_assign(activity, resource1, "1.5"), _assign(activity, resource2, "1.5")],
+                [resource1, resource2],
+            )
         )
 
-        assert result is False
+        assert engine._count_remaining_overallocations(None) == 2
+        assert engine._count_remaining_overallocations({resource1.id}) == 1
 
-    @pytest.mark.asyncio
-    async def test_overallocated_on_weekday(self) -> None:
-        """Should detect over-allocation on weekdays."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        resource_id = uuid4()
-        activity_id = uuid4()
+    def test_zero_capacity_never_overallocated(self) -> None:
+        """Should skip resources without capacity."""
+        resource = _resource(capacity="0")
+        activity = _activity()
+        engine = _engine(_snapshot([activity], [_assign(activity, resource, "2.0")], [resource]))
 
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
+        assert engine._count_remaining_overallocations(None) == 0
 
-        # Assignment with 150% allocation
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = activity_id
-        mock_assignment.units = Decimal("1.5")
 
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[mock_assignment]
-        )
+class TestSerialLevelingEngine:
+    """Tests for complete leveling runs over a snapshot."""
 
-        # Working dates that overlap with check range
-        working_dates = {
-            activity_id: (date(2024, 1, 15), date(2024, 1, 19))  # Monday-Friday
-        }
-
-        result = await service._is_overallocated_on_dates(
-            resource_id,
-            date(2024, 1, 15),
-            date(2024, 1, 19),
-            working_dates,
-            {},
+    def test_leveling_simple_overallocation(self) -> None:
+        """Should resolve simple over-allocation by delaying activity."""
+        resource = _resource()
+        first = _activity("ACT-001", total_float=0)
+        second = _activity("ACT-002", total_float=10)
+        snapshot = _snapshot(
+            [second, first],
+            [_assign(first, resource, "1.0"), _assign(second, resource, "1.0")],
+            [resource],
         )
 
-        assert result is True
+        result = SerialLevelingEngine(snapshot).run()
 
-    @pytest.mark.asyncio
-    async def test_not_overallocated_within_capacity(self) -> None:
-        """Should return False when within capacity."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+        assert result.success is True
+        assert result.activities_shifted == 1
+        assert result.iterations_used == 2
+        shift = result.shifts[0]
+        assert shift.activity_code == "ACT-002"
+        assert shift.new_start == date(2024, 1, 22)
+        assert shift.delay_days == 7
+        assert shift.reason == "Resource ENG-001 overallocated"
+        assert result.new_project_finish == date(2024, 1, 26)
+        assert result.schedule_extension_days == 7
 
-        resource_id = uuid4()
-        activity_id = uuid4()
+    def test_leveling_no_change_when_no_overallocation(self) -> None:
+        """Should not make changes when no over-allocation exists."""
+        resource = _resource()
+        activity = _activity()
+        snapshot = _snapshot([activity], [_assign(activity, resource, "0.5")], [resource])
 
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
+        result = SerialLevelingEngine(snapshot).run()
 
-        # Assignment with 50% allocation
-        mock_assignment = MagicMock()
-        mock_assignment.activity_id = activity_id
-        mock_assignment.units = Decimal("0.5")
+        assert result.success is True
+        assert result.activities_shifted == 0
+        assert len(result.shifts) == 0
+        assert result.iterations_used == 1
 
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[mock_assignment]
+    def test_leveling_respects_critical_path(self) -> None:
+        """Should not delay critical path activities when preserve_critical_path is True."""
+        resource = _resource()
+        critical = _activity("ACT-001", is_critical=True, total_float=0)
+        other = _activity("ACT-002", is_critical=True, total_float=0)
+        snapshot = _snapshot(
+            [critical, other],
+            [_assign(critical, resource, "1.0"), _assign(other, resource, "1.0")],
+            [resource],
         )
 
-        working_dates = {activity_id: (date(2024, 1, 15), date(2024, 1, 19))}
+        result = SerialLevelingEngine(snapshot, LevelingOptions(preserve_critical_path=True)).run()
 
-        result = await service._is_overallocated_on_dates(
-            resource_id,
-            date(2024, 1, 15),
-            date(2024, 1, 19),
-            working_dates,
-            {},
-        )
+        assert result.activities_shifted == 0
+        assert result.remaining_overallocations == 1
+        assert "Cannot delay critical activity ACT-001" in result.warnings
 
-        assert result is False
+    def test_leveling_within_float_only(self) -> None:
+        """Should only delay within float when level_within_float is True."""
+        resource = _resource()
+        first = _activity("ACT-001", total_float=0)
+        second = _activity("ACT-002", total_float=3)  # Needs 7 days
+        snapshot = _snapshot(
+            [first, second],
+            [_assign(first, resource, "1.0"), _assign(second, resource, "1.0")],
+            [resource],
+        )
 
+        result = SerialLevelingEngine(snapshot, LevelingOptions(level_within_float=True)).run()
 
-class TestFindNextAvailableSlot:
-    """Tests for _find_next_available_slot method."""
+        assert result.activities_shifted == 0
+        assert result.remaining_overallocations == 1
 
-    @pytest.mark.asyncio
-    async def test_find_slot_no_resource(self) -> None:
-        """Should return earliest_start when resource not found."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+    def test_leveling_max_iterations_limit(self) -> None:
+        """Should stop after max iterations."""
+        resource = _resource()
+        activities = [_activity(f"ACT-{i:03d}", total_float=100) for i in range(10)]
+        snapshot = _snapshot(
+            activities, [_assign(a, resource, "1.0") for a in activities], [resource]
+        )
 
-        mock_activity = MagicMock()
-        mock_activity.id = uuid4()
+        result = SerialLevelingEngine(snapshot, LevelingOptions(max_iterations=5)).run()
 
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=None)
+        assert result.iterations_used == 5
+        assert len(result.shifts) == 5
+        assert result.success is False
 
-        result = await service._find_next_available_slot(
-            mock_activity,
-            uuid4(),
-            date(2024, 1, 15),
-            {},
-            {},
+    def test_leveling_target_resources_only(self) -> None:
+        """Should ignore resources outside target_resources."""
+        leveled = _resource("R1")
+        ignored = _resource("R2")
+        first = _activity("ACT-001", total_float=0)
+        second = _activity("ACT-002", total_float=10)
+        snapshot = _snapshot(
+            [first, second],
+            [_assign(first, ignored, "1.0"), _assign(second, ignored, "1.0")],
+            [leveled, ignored],
         )
 
-        assert result == date(2024, 1, 15)
+        result = SerialLevelingEngine(
+            snapshot, LevelingOptions(target_resources=[leveled.id])
+        ).run()
 
-    @pytest.mark.asyncio
-    async def test_find_slot_no_assignment(self) -> None:
-        """Should return earliest_start when no assignment for activity."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+        assert result.shifts == []
+        assert result.success is True
 
-        mock_activity = MagicMock()
-        mock_activity.id = uuid4()
-
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[])
-
-        result = await service._find_next_available_slot(
-            mock_activity,
-            uuid4(),
-            date(2024, 1, 15),
-            {},
-            {},
+    def test_leveling_pushes_successors(self) -> None:
+        """Should move successors of a delayed activity."""
+        resource = _resource()
+        first = _activity("ACT-001", total_float=0)
+        second = _activity("ACT-002", total_float=20)
+        successor = _activity("ACT-003", date(2024, 1, 22), date(2024, 1, 23), total_float=20)
+        snapshot = _snapshot(
+            [first, second, successor],
+            [_assign(first, resource, "1.0"), _assign(second, resource, "1.0")],
+            [resource],
+            dependencies=[_dependency(second, successor)],
         )
 
-        assert result == date(2024, 1, 15)
-
+        result = SerialLevelingEngine(snapshot).run()
 
-class TestRecalculateSuccessors:
-    """Tests for _recalculate_successors method."""
-
-    @pytest.mark.asyncio
-    async def test_recalculate_fs_dependency(self) -> None:
-        """Should recalculate successor dates for FS dependency."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
+        assert [s.activity_code for s in result.shifts] == ["ACT-002"]
+        assert result.new_project_finish == date(2024, 1, 28)
 
-        predecessor_id = uuid4()
-        successor_id = uuid4()
+    def test_leveling_empty_program(self) -> None:
+        """Should handle program with no activities."""
+        result = SerialLevelingEngine(_snapshot([])).run()
 
-        mock_dependency = MagicMock()
-        mock_dependency.successor_id = successor_id
-        mock_dependency.lag = 0
-        mock_dependency.dependency_type = MagicMock()
-        mock_dependency.dependency_type.value = "FS"
+        assert result.success is True
+        assert result.activities_shifted == 0
+        assert result.iterations_used == 0
+        assert result.new_project_finish == date(2024, 12, 31)
 
-        mock_successor = MagicMock()
-        mock_successor.id = successor_id
+    def test_snapshot_is_picklable(self) -> None:
+        """Snapshots must cross process boundaries."""
+        resource = _resource()
+        activity = _activity()
+        snapshot = _snapshot([activity], [_assign(activity, resource, "1.0")], [resource])
 
-        # First call returns the dependency, subsequent calls return empty (to stop recursion)
-        call_count = [0]
+        assert pickle.loads(pickle.dumps(snapshot)) == snapshot
 
-        async def get_successors_mock(activity_id):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                return [mock_dependency]
-            return []
 
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
+def _mock_service() -> ResourceLevelingService:
+    """Service whose repositories return two conflicting activities."""
+    service = ResourceLevelingService(MagicMock())
 
-        working_dates = {
-            predecessor_id: (date(2024, 1, 15), date(2024, 1, 19)),
-            successor_id: (date(2024, 1, 18), date(2024, 1, 22)),  # Overlapping
-        }
-        activity_lookup = {successor_id: mock_successor}
+    program = MagicMock()
+    program.id = uuid4()
+    program.start_date = date(2024, 1, 1)
+    program.end_date = date(2024, 12, 31)
+    service._program_repo = MagicMock()
+    service._program_repo.get_by_id = AsyncMock(return_value=program)
 
-        await service._recalculate_successors(predecessor_id, working_dates, activity_lookup)
+    resource = MagicMock()
+    resource.id = uuid4()
+    resource.code = "ENG-001"
+    resource.capacity_per_day = Decimal("8.0")
+    resource.calendar_template = None
 
-        # Successor should be pushed to start after predecessor finishes
-        new_start, _ = working_dates[successor_id]
-        assert new_start == date(2024, 1, 20)  # Day after predecessor finish + 1
+    activities = []
+    assignments = []
+    for code, total_float in (("ACT-001", 0), ("ACT-002", 10)):
+        activity = MagicMock()
+        activity.id = uuid4()
+        activity.code = code
+        activity.early_start = date(2024, 1, 15)
+        activity.early_finish = date(2024, 1, 19)
+        activity.is_critical = False
+        activity.total_float = total_float
+        activities.append(activity)
+
+        assignment = MagicMock()
+        assignment.activity_id = activity.id
+        assignment.resource_id = resource.id
+        assignment.resource = resource
+        assignment.units = Decimal("1.0")
+        assignments.append(assignment)
+
+    # Another program's activity on the shared resource
+    external = MagicMock()
+    external.activity_id = uuid4()
+    external.resource_id = resource.id
+    external.resource = resource
+    external.units = Decimal("0.5")
+    external.start_date = date(2024, 1, 22)
+    external.finish_date = date(2024, 1, 23)
+    assignments.append(external)
+
+    service._activity_repo = MagicMock()
+    service._activity_repo.get_by_program = AsyncMock(return_value=activities)
+    service._assignment_repo = MagicMock()
+    service._assignment_repo.get_for_program_resources = AsyncMock(return_value=assignments)
+    service._resource_repo = MagicMock()
+    service._resource_repo.get_by_program = AsyncMock(return_value=([resource], 1))
+    service._dependency_repo = MagicMock()
+    service._dependency_repo.get_by_program = AsyncMock(return_value=[])
+    return service
+
+
+class TestLevelProgram:
+    """Tests for ResourceLevelingService.level_program."""
 
     @pytest.mark.asyncio
-    async def test_recalculate_ss_dependency(self) -> None:
-        """Should recalculate successor dates for SS dependency."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        mock_dependency = MagicMock()
-        mock_dependency.successor_id = successor_id
-        mock_dependency.lag = 2
-        mock_dependency.dependency_type = MagicMock()
-        mock_dependency.dependency_type.value = "SS"
-
-        mock_successor = MagicMock()
-        mock_successor.id = successor_id
-
-        # First call returns the dependency, subsequent calls return empty (to stop recursion)
-        call_count = [0]
-
-        async def get_successors_mock(activity_id):
-            call_count[0] += 1
-            if call_count[0] == 1:
-                return [mock_dependency]
-            return []
+    async def test_level_program_loads_once(self) -> None:
+        """Should read the program in bulk and issue no queries while leveling."""
+        service = _mock_service()
 
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        working_dates = {
-            predecessor_id: (date(2024, 1, 15), date(2024, 1, 19)),
-            successor_id: (date(2024, 1, 14), date(2024, 1, 18)),  # Before with lag
-        }
-        activity_lookup = {successor_id: mock_successor}
-
-        await service._recalculate_successors(predecessor_id, working_dates, activity_lookup)
+        result = await service.level_program(uuid4())
 
-        # Successor should start at predecessor start + lag
-        new_start, _ = working_dates[successor_id]
-        assert new_start == date(2024, 1, 17)  # 15 + 2 days lag
+        assert result.success is True
+        assert [s.activity_code for s in result.shifts] == ["ACT-002"]
+        # The external assignment keeps the resource busy until Jan 23
+        assert result.shifts[0].new_start == date(2024, 1, 24)
+        service._activity_repo.get_by_program.assert_awaited_once()
+        service._assignment_repo.get_for_program_resources.assert_awaited_once()
+        service._resource_repo.get_by_program.assert_awaited_once()
+        service._dependency_repo.get_by_program.assert_awaited_once()
+        service._assignment_repo.get_by_activity.assert_not_called()
+        service._resource_repo.get_by_id.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_recalculate_no_successors(self) -> None:
-        """Should do nothing when no successors."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = AsyncMock(return_value=[])
+    async def test_load_snapshot(self) -> None:
+        """Should split program assignments from other programs' load."""
+        service = _mock_service()
+        program = await service._program_repo.get_by_id(uuid4())
+
+        snapshot = await service.load_snapshot(program)
+
+        assert snapshot.program_id == program.id
+        assert [a.code for a in snapshot.activities] == ["ACT-001", "ACT-002"]
+        assert len(snapshot.assignments) == 2
+        assert len(snapshot.resources) == 1
+        assert snapshot.external_loads == (
+            ExternalLoad(
+                resource_id=snapshot.resources[0].id,
+                start=date(2024, 1, 22),
+                finish=date(2024, 1, 23),
+                units=Decimal("0.5"),
+            ),
+        )
 
-        working_dates = {
-            predecessor_id: (date(2024, 1, 15), date(2024, 1, 19)),
-        }
+    @pytest.mark.asyncio
+    async def test_level_program_not_found(self) -> None:
+        """Should handle nonexistent program."""
+        service = ResourceLevelingService(MagicMock())
+        service._program_repo = MagicMock()
+        service._program_repo.get_by_id = AsyncMock(return_value=None)
 
-        await service._recalculate_successors(predecessor_id, working_dates, {})
+        result = await service.level_program(uuid4())
 
-        # No changes expected
-        assert working_dates[predecessor_id] == (date(2024, 1, 15), date(2024, 1, 19))
+        assert result.success is False
+        assert "Program not found" in result.warnings
 
 
 class TestApplyLevelingResult:
@@ -1083,417 +937,6 @@ class TestApplyLevelingResult:
         assert mock_activity.planned_finish == date(2024, 1, 26)
 
 
-class TestCountRemainingOverallocations:
-    """Tests for _count_remaining_overallocations method."""
-
-    @pytest.mark.asyncio
-    async def test_count_no_resources(self) -> None:
-        """Should return 0 when no resources."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_program = AsyncMock(return_value=([], 0))
-
-        count = await service._count_remaining_overallocations(
-            uuid4(),
-            None,
-            {},
-            {},
-        )
-
-        assert count == 0
-
-    @pytest.mark.asyncio
-    async def test_count_with_target_resources(self) -> None:
-        """Should only count target resources."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        resource1_id = uuid4()
-        resource2_id = uuid4()
-
-        resource1 = MagicMock()
-        resource1.id = resource1_id
-        resource2 = MagicMock()
-        resource2.id = resource2_id
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_program = AsyncMock(return_value=([resource1, resource2], 2))
-
-        # Only check resource1
-        service._is_overallocated_on_dates = AsyncMock(return_value=True)
-
-        working_dates = {uuid4(): (date(2024, 1, 15), date(2024, 1, 19))}
-
-        count = await service._count_remaining_overallocations(
-            uuid4(),
-            {resource1_id},  # Only target resource1
-            working_dates,
-            {},
-        )
-
-        # Should only count resource1
-        assert count == 1
-
-
-class TestFindNextAvailableSlotExtended:
-    """Tests for _find_next_available_slot method."""
-
-    @pytest.mark.asyncio
-    async def test_find_slot_resource_not_found(self) -> None:
-        """Should return earliest_start when resource not found."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity = MagicMock()
-        activity.id = uuid4()
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=None)
-
-        earliest_start = date(2024, 1, 15)
-        working_dates = {}
-        activity_lookup = {activity.id: activity}
-
-        result = await service._find_next_available_slot(
-            activity, uuid4(), earliest_start, working_dates, activity_lookup
-        )
-
-        assert result == earliest_start
-
-    @pytest.mark.asyncio
-    async def test_find_slot_no_activity_assignment(self) -> None:
-        """Should return earliest_start when activity has no assignment."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity = MagicMock()
-        activity.id = uuid4()
-
-        resource_id = uuid4()
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        # Assignment is for different resource
-        other_assignment = MagicMock()
-        other_assignment.resource_id = uuid4()
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[other_assignment])
-
-        earliest_start = date(2024, 1, 15)
-        working_dates = {}
-        activity_lookup = {activity.id: activity}
-
-        result = await service._find_next_available_slot(
-            activity, resource_id, earliest_start, working_dates, activity_lookup
-        )
-
-        assert result == earliest_start
-
-    @pytest.mark.asyncio
-    async def test_find_slot_skips_weekends(self) -> None:
-        """Should skip weekend days when finding slot."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity_id = uuid4()
-        activity = MagicMock()
-        activity.id = activity_id
-
-        resource_id = uuid4()
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        mock_assignment = MagicMock()
-        mock_assignment.resource_id = resource_id
-        mock_assignment.units = Decimal("1.0")
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[mock_assignment])
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(return_value=[])
-
-        # Saturday
-        earliest_start = date(2024, 1, 13)  # Saturday
-        working_dates = {activity_id: (earliest_start, earliest_start)}
-        activity_lookup = {activity_id: activity}
-
-        result = await service._find_next_available_slot(
-            activity, resource_id, earliest_start, working_dates, activity_lookup
-        )
-
-        # Should skip to Monday
-        assert result >= date(2024, 1, 15)  # Monday
-
-    @pytest.mark.asyncio
-    async def test_find_slot_with_other_assignments(self) -> None:
-        """Should find slot when other assignments exist."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        activity_id = uuid4()
-        other_activity_id = uuid4()
-        activity = MagicMock()
-        activity.id = activity_id
-
-        resource_id = uuid4()
-        mock_resource = MagicMock()
-        mock_resource.capacity_per_day = Decimal("8.0")
-
-        service._resource_repo = MagicMock()
-        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
-
-        # This activity's assignment
-        mock_assignment = MagicMock()
-        mock_assignment.resource_id = resource_id
-        mock_assignment.activity_id = activity_id
-        mock_assignment.units = Decimal("1.0")
-
-        # Other activity's assignment
-        other_assignment = MagicMock()
-        other_assignment.resource_id = resource_id
-        other_assignment.activity_id = other_activity_id
-        other_assignment.units = Decimal("0.5")
-
-        service._assignment_repo = MagicMock()
-        service._assignment_repo.get_by_activity = AsyncMock(return_value=[mock_assignment])
-        service._assignment_repo.get_assignments_with_activities = AsyncMock(
-            return_value=[mock_assignment, other_assignment]
-        )
-
-        earliest_start = date(2024, 1, 15)  # Monday
-        working_dates = {
-            activity_id: (earliest_start, earliest_start),
-            other_activity_id: (earliest_start, date(2024, 1, 19)),
-        }
-        activity_lookup = {activity_id: activity}
-
-        result = await service._find_next_available_slot(
-            activity, resource_id, earliest_start, working_dates, activity_lookup
-        )
-
-        # Should find a slot (either same day if no conflict, or later)
-        assert result >= earliest_start
-
-
-class TestRecalculateSuccessorsExtended:
-    """Extended tests for _recalculate_successors method."""
-
-    @pytest.mark.asyncio
-    async def test_recalculate_ff_dependency(self) -> None:
-        """Should recalculate successor with FF dependency correctly."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        working_dates = {
-            predecessor_id: (date(2024, 1, 15), date(2024, 1, 25)),  # 10 days
-            successor_id: (date(2024, 1, 10), date(2024, 1, 15)),  # 5 days, finishes early
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "FF"  # Finish-to-Finish
-
-        call_count = [0]
-
-        async def get_successors_mock(aid):
-            call_count[0] += 1
-            if aid == predecessor_id and call_count[0] == 1:
-                return [mock_dep]
-            return []
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        await service._recalculate_successors(predecessor_id, working_dates, activity_lookup)
-
-        # FF: successor should finish when predecessor finishes
-        # Predecessor finishes Jan 25, successor has 5 day duration
-        _, new_finish = working_dates[successor_id]
-        assert new_finish == date(2024, 1, 25)
-
-    @pytest.mark.asyncio
-    async def test_recalculate_sf_dependency(self) -> None:
-        """Should recalculate successor with SF dependency correctly."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        working_dates = {
-            predecessor_id: (date(2024, 1, 20), date(2024, 1, 25)),
-            successor_id: (
-                date(2024, 1, 10),
-                date(2024, 1, 15),
-            ),  # 5 days, finishes before pred starts
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "SF"  # Start-to-Finish
-
-        call_count = [0]
-
-        async def get_successors_mock(aid):
-            call_count[0] += 1
-            if aid == predecessor_id and call_count[0] == 1:
-                return [mock_dep]
-            return []
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        await service._recalculate_successors(predecessor_id, working_dates, activity_lookup)
-
-        # SF: successor finish at predecessor start (Jan 20)
-        _, new_finish = working_dates[successor_id]
-        assert new_finish == date(2024, 1, 20)
-
-    @pytest.mark.asyncio
-    async def test_recalculate_unknown_dependency_type(self) -> None:
-        """Should handle unknown dependency type as FS."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        working_dates = {
-            predecessor_id: (date(2024, 1, 15), date(2024, 1, 19)),
-            successor_id: (date(2024, 1, 16), date(2024, 1, 20)),  # Overlaps
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 0
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "UNKNOWN"
-
-        call_count = [0]
-
-        async def get_successors_mock(aid):
-            call_count[0] += 1
-            if aid == predecessor_id and call_count[0] == 1:
-                return [mock_dep]
-            return []
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        await service._recalculate_successors(predecessor_id, working_dates, activity_lookup)
-
-        # Unknown should default to FS behavior
-        new_start, _ = working_dates[successor_id]
-        assert new_start == date(2024, 1, 20)  # Day after predecessor finishes
-
-    @pytest.mark.asyncio
-    async def test_recalculate_with_lag(self) -> None:
-        """Should include lag in calculation."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        predecessor_id = uuid4()
-        successor_id = uuid4()
-
-        working_dates = {
-            predecessor_id: (date(2024, 1, 15), date(2024, 1, 19)),
-            successor_id: (date(2024, 1, 16), date(2024, 1, 20)),  # Overlaps
-        }
-        activity_lookup = {
-            predecessor_id: MagicMock(id=predecessor_id),
-            successor_id: MagicMock(id=successor_id),
-        }
-
-        mock_dep = MagicMock()
-        mock_dep.successor_id = successor_id
-        mock_dep.lag = 5  # 5 day lag
-        mock_dep.dependency_type = MagicMock()
-        mock_dep.dependency_type.value = "FS"
-
-        call_count = [0]
-
-        async def get_successors_mock(aid):
-            call_count[0] += 1
-            if aid == predecessor_id and call_count[0] == 1:
-                return [mock_dep]
-            return []
-
-        service._dependency_repo = MagicMock()
-        service._dependency_repo.get_successors = get_successors_mock
-
-        await service._recalculate_successors(predecessor_id, working_dates, activity_lookup)
-
-        # FS with 5 day lag: successor starts 6 days after predecessor finish (1 + 5)
-        new_start, _ = working_dates[successor_id]
-        assert new_start == date(2024, 1, 25)  # Jan 19 + 1 + 5 = Jan 25
-
-
-class TestLevelProgramEdgeCases:
-    """Edge case tests for level_program method."""
-
-    @pytest.mark.asyncio
-    async def test_level_program_not_found(self) -> None:
-        """Should handle program not found."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=None)
-
-        result = await service.level_program(uuid4())
-
-        assert result.success is False
-        assert "Program not found" in result.warnings
-
-    @pytest.mark.asyncio
-    async def test_level_program_no_activities(self) -> None:
-        """Should handle program with no activities."""
-        mock_session = MagicMock()
-        service = ResourceLevelingService(mock_session)
-
-        mock_program = MagicMock()
-        mock_program.start_date = date(2024, 1, 1)
-        mock_program.end_date = date(2024, 12, 31)
-
-        service._program_repo = MagicMock()
-        service._program_repo.get_by_id = AsyncMock(return_value=mock_program)
-
-        service._activity_repo = MagicMock()
-        service._activity_repo.get_by_program = AsyncMock(return_value=[])
-
-        result = await service.level_program(uuid4())
-
-        assert result.success is True
-        assert result.activities_shifted == 0
-
-
 class TestApplyLevelingResultEdgeCases:
     """Edge case tests for apply_leveling_result method."""
 
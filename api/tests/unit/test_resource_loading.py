@@ -15,6 +15,7 @@ from uuid import uuid4
 
 import pytest
 
+from src.models.calendar_template import CalendarTemplate, CalendarTemplateHoliday
 from src.services.resource import ResourceLoadingDay
 from src.services.resource_loading import ResourceLoadingService
 
@@ -242,6 +243,7 @@ class TestGetLoadingForAssignment:
 
         mock_resource = MagicMock()
         mock_resource.capacity_per_day = Decimal("8.0")
+        mock_resource.calendar_template = None
 
         mock_assignment = MagicMock()
         mock_assignment.start_date = date(2024, 1, 1)
@@ -271,6 +273,7 @@ class TestGetLoadingForAssignment:
 
         mock_resource = MagicMock()
         mock_resource.capacity_per_day = Decimal("8.0")
+        mock_resource.calendar_template = None
 
         mock_assignment = MagicMock()
         mock_assignment.start_date = date(2024, 1, 1)
@@ -297,6 +300,7 @@ class TestGetLoadingForAssignment:
 
         mock_resource = MagicMock()
         mock_resource.capacity_per_day = Decimal("8.0")
+        mock_resource.calendar_template = None
 
         mock_assignment = MagicMock()
         mock_assignment.start_date = date(2024, 1, 5)
@@ -357,6 +361,7 @@ class TestCalculateDailyLoading:
         mock_resource = MagicMock()
         mock_resource.id = resource_id
         mock_resource.capacity_per_day = Decimal("8.0")
+        mock_resource.calendar_template = None
 
         # Calendar entry for Jan 2 - only 4 hours
         mock_calendar_entry = MagicMock()
@@ -394,6 +399,7 @@ class TestCalculateDailyLoading:
         mock_resource = MagicMock()
         mock_resource.id = resource_id
         mock_resource.capacity_per_day = Decimal("8.0")
+        mock_resource.calendar_template = None
 
         service._resource_repo = MagicMock()
         service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
@@ -415,6 +421,53 @@ class TestCalculateDailyLoading:
         assert result[date(2024, 1, 7)].available_hours == Decimal("0")  # Sunday
         assert result[date(2024, 1, 8)].available_hours == Decimal("8.0")  # Monday
 
+    @pytest.mark.asyncio
+    async def test_uses_calendar_template(self) -> None:
+        """Should take working days, hours and holidays from the resource's template."""
+        # Arrange
+        mock_session = MagicMock()
+        service = ResourceLoadingService(mock_session)
+
+        template = CalendarTemplate(
+            id=uuid4(),
+            program_id=uuid4(),
+            name="Six-Day Week",
+            working_days=[1, 2, 3, 4, 5, 6],
+            hours_per_day=Decimal("10.0"),
+        )
+        template.holidays = [
+            CalendarTemplateHoliday(
+                holiday_date=date(2024, 1, 8), name="Closure", recurring_yearly=False
+            )
+        ]
+
+        resource_id = uuid4()
+        mock_resource = MagicMock()
+        mock_resource.id = resource_id
+        mock_resource.capacity_per_day = Decimal("8.0")
+        mock_resource.calendar_template = template
+
+        service._resource_repo = MagicMock()
+        service._resource_repo.get_by_id = AsyncMock(return_value=mock_resource)
+        service._calendar_repo = MagicMock()
+        service._calendar_repo.get_for_date_range = AsyncMock(return_value=[])
+        service._assignment_repo = MagicMock()
+        service._assignment_repo.get_assignments_with_activities = AsyncMock(return_value=[])
+
+        # Act - Jan 6, 2024 is Saturday, Jan 8 is the holiday
+        result = await service.calculate_daily_loading(
+            resource_id,
+            date(2024, 1, 5),
+            date(2024, 1, 9),
+        )
+
+        # Assert
+        assert result[date(2024, 1, 5)].available_hours == Decimal("10.0")
+        assert result[date(2024, 1, 6)].available_hours == Decimal("10.0")
+        assert result[date(2024, 1, 7)].available_hours == Decimal("0")
+        assert result[date(2024, 1, 8)].available_hours == Decimal("0")
+        assert result[date(2024, 1, 9)].available_hours == Decimal("10.0")
+
     @pytest.mark.asyncio
     async def test_aggregates_multiple_assignments(self) -> None:
         """Should sum hours from multiple overlapping assignments."""
@@ -426,6 +479,7 @@ class TestCalculateDailyLoading:
         mock_resource = MagicMock()
         mock_resource.id = resource_id
         mock_resource.capacity_per_day = Decimal("8.0")
+        mock_resource.calendar_template = None
 
         # Two assignments, both active on Jan 2
         mock_assignment1 = MagicMock()
@@ -477,6 +531,7 @@ class TestCalculateDailyLoading:
         mock_resource = MagicMock()
         mock_resource.id = resource_id
         mock_resource.capacity_per_day = Decimal("8.0")
+        mock_resource.calendar_template = None
 
         # Assignment for 150% allocation
         mock_assignment = MagicMock()
@@ -277,6 +277,7 @@ class TestResourceServiceLoading:
         # Mock resource
         mock_resource = MagicMock()
         mock_resource.capacity_per_day = Decimal("8.0")
+        mock_resource.calendar_template = None
 
         # Mock calendar entry
         mock_calendar = MagicMock()
@@ -9,9 +9,11 @@ from src.api.v1.endpoints.schedule import (
     calculate_schedule,
     get_critical_path,
     get_project_duration,
+    recalculate_schedule,
 )
 from src.core.exceptions import AuthorizationError, NotFoundError
 from src.services.cpm import ScheduleResult as CPMScheduleResult
+from src.services.cpm_incremental import ScheduleStateStore
 
 
 def _make_mock_user(*, is_admin: bool = False, user_id=None):
@@ -119,9 +121,10 @@ class TestCalculateSchedule:
             patch("src.api.v1.endpoints.schedule.DependencyRepository") as MockDepRepo,
             patch("src.api.v1.endpoints.schedule.CPMEngine") as MockCPMEngine,
             patch("src.api.v1.endpoints.schedule.cache_manager") as mock_cache,
-            patch("src.api.v1.endpoints.schedule.compute_activities_hash", return_value="abc123"),
         ):
-            MockProgramRepo.return_value.get_by_id = AsyncMock(return_value=mock_program)
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                return_value=(mock_program.owner_id, 3)
+            )
             MockActivityRepo.return_value.get_by_program = AsyncMock(return_value=[act1, act2])
             MockDepRepo.return_value.get_by_program = AsyncMock(return_value=[dep])
             mock_cache.get = AsyncMock(return_value=None)
@@ -145,7 +148,7 @@ class TestCalculateSchedule:
 
     @pytest.mark.asyncio
     async def test_calculate_schedule_returns_cached_results(self):
-        """Should return cached results when available and not force_recalculate."""
+        """Should return cached results without loading the network."""
         mock_db = AsyncMock()
         owner_id = uuid4()
         mock_user = _make_mock_user(user_id=owner_id)
@@ -173,9 +176,10 @@ class TestCalculateSchedule:
             patch("src.api.v1.endpoints.schedule.DependencyRepository") as MockDepRepo,
             patch("src.api.v1.endpoints.schedule.CPMEngine") as MockCPMEngine,
             patch("src.api.v1.endpoints.schedule.cache_manager") as mock_cache,
-            patch("src.api.v1.endpoints.schedule.compute_activities_hash", return_value="abc123"),
         ):
-            MockProgramRepo.return_value.get_by_id = AsyncMock(return_value=mock_program)
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                return_value=(mock_program.owner_id, 3)
+            )
             MockActivityRepo.return_value.get_by_program = AsyncMock(return_value=[act1])
             MockDepRepo.return_value.get_by_program = AsyncMock(return_value=[dep])
             mock_cache.get = AsyncMock(return_value=cached_data)
@@ -187,6 +191,9 @@ class TestCalculateSchedule:
             assert result[0].is_critical is True
             MockCPMEngine.assert_not_called()
             mock_db.commit.assert_not_called()
+            mock_cache.get.assert_awaited_once_with(f"cpm:result:{program_id}:3")
+            MockActivityRepo.return_value.get_by_program.assert_not_called()
+            MockDepRepo.return_value.get_by_program.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_calculate_schedule_force_recalculate_ignores_cache(self):
@@ -214,9 +221,10 @@ class TestCalculateSchedule:
             patch("src.api.v1.endpoints.schedule.DependencyRepository") as MockDepRepo,
             patch("src.api.v1.endpoints.schedule.CPMEngine") as MockCPMEngine,
             patch("src.api.v1.endpoints.schedule.cache_manager") as mock_cache,
-            patch("src.api.v1.endpoints.schedule.compute_activities_hash", return_value="abc123"),
         ):
-            MockProgramRepo.return_value.get_by_id = AsyncMock(return_value=mock_program)
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                return_value=(mock_program.owner_id, 3)
+            )
             MockActivityRepo.return_value.get_by_program = AsyncMock(return_value=[act1])
             MockDepRepo.return_value.get_by_program = AsyncMock(return_value=[])
             mock_cache.get = AsyncMock(return_value=None)
@@ -246,7 +254,7 @@ class TestCalculateSchedule:
         program_id = uuid4()
 
         with patch("src.api.v1.endpoints.schedule.ProgramRepository") as MockProgramRepo:
-            MockProgramRepo.return_value.get_by_id = AsyncMock(return_value=None)
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(return_value=None)
 
             with pytest.raises(NotFoundError) as exc_info:
                 await calculate_schedule(program_id, mock_db, mock_user)
@@ -264,7 +272,9 @@ class TestCalculateSchedule:
         mock_program = _make_mock_program(other_owner_id)
 
         with patch("src.api.v1.endpoints.schedule.ProgramRepository") as MockProgramRepo:
-            MockProgramRepo.return_value.get_by_id = AsyncMock(return_value=mock_program)
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                return_value=(mock_program.owner_id, 3)
+            )
 
             with pytest.raises(AuthorizationError) as exc_info:
                 await calculate_schedule(program_id, mock_db, mock_user)
@@ -298,9 +308,10 @@ class TestCalculateSchedule:
             patch("src.api.v1.endpoints.schedule.DependencyRepository") as MockDepRepo,
             patch("src.api.v1.endpoints.schedule.CPMEngine") as MockCPMEngine,
             patch("src.api.v1.endpoints.schedule.cache_manager") as mock_cache,
-            patch("src.api.v1.endpoints.schedule.compute_activities_hash", return_value="def456"),
         ):
-            MockProgramRepo.return_value.get_by_id = AsyncMock(return_value=mock_program)
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                return_value=(mock_program.owner_id, 3)
+            )
             MockActivityRepo.return_value.get_by_program = AsyncMock(return_value=[act1])
             MockDepRepo.return_value.get_by_program = AsyncMock(return_value=[])
             mock_cache.get = AsyncMock(return_value=None)
@@ -328,7 +339,9 @@ class TestCalculateSchedule:
             patch("src.api.v1.endpoints.schedule.ProgramRepository") as MockProgramRepo,
             patch("src.api.v1.endpoints.schedule.ActivityRepository") as MockActivityRepo,
         ):
-            MockProgramRepo.return_value.get_by_id = AsyncMock(return_value=mock_program)
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                return_value=(mock_program.owner_id, 3)
+            )
             MockActivityRepo.return_value.get_by_program = AsyncMock(return_value=[])
 
             result = await calculate_schedule(program_id, mock_db, mock_user)
@@ -365,9 +378,10 @@ class TestCalculateSchedule:
             patch("src.api.v1.endpoints.schedule.DependencyRepository") as MockDepRepo,
             patch("src.api.v1.endpoints.schedule.CPMEngine") as MockCPMEngine,
             patch("src.api.v1.endpoints.schedule.cache_manager") as mock_cache,
-            patch("src.api.v1.endpoints.schedule.compute_activities_hash", return_value="hash1"),
         ):
-            MockProgramRepo.return_value.get_by_id = AsyncMock(return_value=mock_program)
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                return_value=(mock_program.owner_id, 3)
+            )
             MockActivityRepo.return_value.get_by_program = AsyncMock(return_value=[act1, act2])
             MockDepRepo.return_value.get_by_program = AsyncMock(return_value=[])
             mock_cache.get = AsyncMock(return_value=None)
@@ -700,3 +714,129 @@ class TestGetProjectDuration:
             assert result == {"duration": 10}
             # Verify CPMEngine was created with both activities and dependencies
             MockCPMEngine.assert_called_once_with([act1, act2], [dep])
+
+
+# ---------------------------------------------------------------------------
+# recalculate_schedule
+# ---------------------------------------------------------------------------
+
+
+class TestRecalculateSchedule:
+    """Tests for recalculate_schedule endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_recalculate_returns_only_changed_activities(self):
+        """First call solves the full network; later calls return the delta."""
+        mock_db = AsyncMock()
+        owner_id = uuid4()
+        mock_user = _make_mock_user(user_id=owner_id)
+        program_id = uuid4()
+        revision = {"value": 1}
+
+        act1 = _make_mock_activity(duration=5)
+        act2 = _make_mock_activity(duration=3)
+        act3 = _make_mock_activity(duration=2)
+        deps = [_make_mock_dependency(act1.id, act2.id)]
+
+        with (
+            patch("src.api.v1.endpoints.schedule.ProgramRepository") as MockProgramRepo,
+            patch("src.api.v1.endpoints.schedule.ActivityRepository") as MockActivityRepo,
+            patch("src.api.v1.endpoints.schedule.DependencyRepository") as MockDepRepo,
+            patch("src.api.v1.endpoints.schedule.schedule_state_store", ScheduleStateStore()),
+        ):
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                side_effect=lambda _: (owner_id, revision["value"])
+            )
+            MockActivityRepo.return_value.get_by_program = AsyncMock(
+                return_value=[act1, act2, act3]
+            )
+            MockDepRepo.return_value.get_by_program = AsyncMock(return_value=deps)
+
+            first = await recalculate_schedule(program_id, mock_db, mock_user)
+
+            assert first.full_recalculation is True
+            assert len(first.changed) == 3
+            assert first.project_duration == 8
+            assert act3.total_float == 6
+
+            # Lengthen act1: act2 moves, act3 only gains float
+            act1.duration = 7
+            revision["value"] = 2
+            second = await recalculate_schedule(program_id, mock_db, mock_user)
+
+            assert second.full_recalculation is False
+            assert second.project_duration == 10
+            changed = {r.activity_id: r for r in second.changed}
+            assert set(changed) == {act1.id, act2.id, act3.id}
+            assert changed[act2.id].early_start == 7
+            assert changed[act3.id].total_float == 8
+
+            # Revision moved without a network change: empty delta and no commit
+            mock_db.commit.reset_mock()
+            revision["value"] = 3
+            third = await recalculate_schedule(program_id, mock_db, mock_user)
+
+            assert third.changed == []
+            mock_db.commit.assert_not_called()
+
+            # Same revision: answered without loading the network
+            loads = MockActivityRepo.return_value.get_by_program.await_count
+            fourth = await recalculate_schedule(program_id, mock_db, mock_user)
+
+            assert fourth.changed == []
+            assert fourth.full_recalculation is False
+            assert fourth.project_duration == 10
+            assert fourth.total_activities == 3
+            assert MockActivityRepo.return_value.get_by_program.await_count == loads
+
+    @pytest.mark.asyncio
+    async def test_recalculate_program_not_found(self):
+        """Should raise NotFoundError when program does not exist."""
+        mock_db = AsyncMock()
+        mock_user = _make_mock_user()
+
+        with patch("src.api.v1.endpoints.schedule.ProgramRepository") as MockProgramRepo:
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(return_value=None)
+
+            with pytest.raises(NotFoundError) as exc_info:
+                await recalculate_schedule(uuid4(), mock_db, mock_user)
+
+            assert exc_info.value.code == "PROGRAM_NOT_FOUND"
+
+    @pytest.mark.asyncio
+    async def test_recalculate_not_authorized(self):
+        """Should raise AuthorizationError when user does not own the program."""
+        mock_db = AsyncMock()
+        mock_user = _make_mock_user()
+
+        with patch("src.api.v1.endpoints.schedule.ProgramRepository") as MockProgramRepo:
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                return_value=(uuid4(), 1)
+            )
+
+            with pytest.raises(AuthorizationError) as exc_info:
+                await recalculate_schedule(uuid4(), mock_db, mock_user)
+
+            assert exc_info.value.code == "NOT_AUTHORIZED"
+
+    @pytest.mark.asyncio
+    async def test_recalculate_no_activities(self):
+        """Should return an empty full result when the program has no activities."""
+        mock_db = AsyncMock()
+        owner_id = uuid4()
+        mock_user = _make_mock_user(user_id=owner_id)
+
+        with (
+            patch("src.api.v1.endpoints.schedule.ProgramRepository") as MockProgramRepo,
+            patch("src.api.v1.endpoints.schedule.ActivityRepository") as MockActivityRepo,
+        ):
+            MockProgramRepo.return_value.get_schedule_revision = AsyncMock(
+                return_value=(owner_id, 1)
+            )
+            MockActivityRepo.return_value.get_by_program = AsyncMock(return_value=[])
+
+            result = await recalculate_schedule(uuid4(), mock_db, mock_user)
+
+            assert result.changed == []
+            assert result.project_duration == 0
+            assert result.full_recalculation is True
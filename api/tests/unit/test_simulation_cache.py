@@ -163,6 +163,10 @@ class TestSimulationCacheSetResult:
         mock_manager.set.assert_called_once()
         call_args = mock_manager.set.call_args
         assert call_args[1]["ttl"] == SimulationCacheKeys.RESULT_TTL
+        assert call_args[1]["tags"] == [
+            SimulationCacheKeys.config_tag(str(config_id)),
+            SimulationCacheKeys.results_tag(str(config_id)),
+        ]
 
     @pytest.mark.asyncio
     async def test_set_result_custom_ttl(self):
@@ -219,7 +223,7 @@ class TestSimulationCacheInvalidateResult:
         """Should invalidate all results when result_id is None."""
         mock_manager = MagicMock(spec=CacheManager)
         mock_manager.is_available = True
-        mock_manager.delete_pattern = AsyncMock(return_value=5)
+        mock_manager.invalidate_tags = AsyncMock(return_value=5)
 
         cache = SimulationCache(mock_manager)
         config_id = uuid4()
@@ -227,10 +231,9 @@ class TestSimulationCacheInvalidateResult:
         success = await cache.invalidate_result(config_id, None)
 
         assert success is True
-        mock_manager.delete_pattern.assert_called_once()
-        # Verify pattern includes config_id
-        call_args = mock_manager.delete_pattern.call_args[0][0]
-        assert str(config_id) in call_args
+        mock_manager.invalidate_tags.assert_called_once_with(
+            SimulationCacheKeys.results_tag(str(config_id))
+        )
 
 
 class TestSimulationCacheGetOrCompute:
@@ -259,7 +262,7 @@ class TestSimulationCacheGetOrCompute:
         mock_manager = MagicMock(spec=CacheManager)
         mock_manager.is_available = True
         mock_manager.get = AsyncMock(return_value=None)
-        mock_manager.set = AsyncMock(return_value=True)
+        mock_manager.fill = AsyncMock(side_effect=_compute)
 
         cache = SimulationCache(mock_manager)
         config_id = uuid4()
@@ -270,7 +273,25 @@ class TestSimulationCacheGetOrCompute:
         assert result["status"] == "computed"
         assert result["from_cache"] is False
         compute_func.assert_called_once()
-        mock_manager.set.assert_called_once()
+        key, _, ttl = mock_manager.fill.call_args[0]
+        assert key == SimulationCacheKeys.result_key(str(config_id))
+        assert ttl == SimulationCacheKeys.RESULT_TTL
+
+    @pytest.mark.asyncio
+    async def test_get_or_compute_filled_elsewhere(self):
+        """Should mark a result another caller computed as cached."""
+        mock_manager = MagicMock(spec=CacheManager)
+        mock_manager.is_available = True
+        mock_manager.get = AsyncMock(return_value=None)
+        mock_manager.fill = AsyncMock(return_value={"status": "computed"})
+
+        cache = SimulationCache(mock_manager)
+        compute_func = AsyncMock(return_value={"status": "new"})
+
+        result = await cache.get_or_compute(uuid4(), compute_func)
+
+        assert result == {"status": "computed", "from_cache": True}
+        compute_func.assert_not_called()
 
 
 class TestSimulationCacheTornado:
@@ -331,34 +352,36 @@ class TestSimulationCacheInvalidateConfig:
     """Tests for invalidate_config method."""
 
     @pytest.mark.asyncio
-    async def test_invalidate_config_deletes_all_patterns(self):
+    async def test_invalidate_config_deletes_all_kinds(self):
         """Should delete results, tornado charts, and histograms."""
         mock_manager = MagicMock(spec=CacheManager)
         mock_manager.is_available = True
-        mock_manager.delete_pattern = AsyncMock(return_value=2)
+        mock_manager.invalidate_tags = AsyncMock(return_value=6)
 
         cache = SimulationCache(mock_manager)
         config_id = uuid4()
 
         deleted = await cache.invalidate_config(config_id)
 
-        # Should call delete_pattern 3 times (results, tornado, histogram)
-        assert mock_manager.delete_pattern.call_count == 3
-        assert deleted == 6  # 2 * 3 patterns
+        # Results, tornado charts and histograms share the config tag
+        mock_manager.invalidate_tags.assert_called_once_with(
+            SimulationCacheKeys.config_tag(str(config_id))
+        )
+        assert deleted == 6
 
     @pytest.mark.asyncio
-    async def test_invalidate_config_returns_total_deleted(self):
-        """Should return total count of deleted keys."""
+    async def test_invalidate_config_nothing_cached(self):
+        """Should return 0 when nothing is cached for the config."""
         mock_manager = MagicMock(spec=CacheManager)
         mock_manager.is_available = True
-        mock_manager.delete_pattern = AsyncMock(side_effect=[3, 2, 1])
+        mock_manager.invalidate_tags = AsyncMock(return_value=0)
 
         cache = SimulationCache(mock_manager)
         config_id = uuid4()
 
         deleted = await cache.invalidate_config(config_id)
 
-        assert deleted == 6  # 3 + 2 + 1
+        assert deleted == 0
 
 
 class TestSimulationCacheIntegration:
@@ -375,7 +398,7 @@ class TestSimulationCacheIntegration:
         async def mock_get(key):
             return stored_data.get(key)
 
-        async def mock_set(key, value, ttl=None):
+        async def mock_set(key, value, ttl=None, tags=()):
             stored_data[key] = value
             return True
 
@@ -425,7 +448,7 @@ class TestSimulationCacheIntegration:
         async def mock_get(key):
             return stored_data.get(key)
 
-        async def mock_set(key, value, ttl=None):
+        async def mock_set(key, value, ttl=None, tags=()):
             stored_data[key] = value
             return True
 
@@ -446,3 +469,8 @@ class TestSimulationCacheIntegration:
 
         assert result5["top_n"] == 5
         assert result10["top_n"] == 10
+
+
+async def _compute(key, compute, *args, **kwargs):
+    """CacheManager.fill stand-in that always computes."""
+    return await compute()
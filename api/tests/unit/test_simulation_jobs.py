@@ -0,0 +1,323 @@
+"""Unit tests for background simulation job execution."""
+
+import asyncio
+import pickle
+import queue
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+
+from src.core.exceptions import ConflictError
+from src.services.simulation_jobs import (
+    JobActivity,
+    JobDependency,
+    MonteCarloJob,
+    NetworkMonteCarloJob,
+    SimulationJobRunner,
+    execute_simulation_job,
+    init_simulation_worker,
+)
+
+
+def _triangular(low: float, mode: float, high: float) -> dict[str, float | str]:
+    return {"distribution": "triangular", "min": low, "mode": mode, "max": high}
+
+
+def _network_job(iterations: int = 200) -> NetworkMonteCarloJob:
+    a, b = JobActivity(uuid4(), 5), JobActivity(uuid4(), 3)
+    return NetworkMonteCarloJob(
+        activities=(a, b),
+        dependencies=(JobDependency(a.id, b.id, "FS", 0),),
+        activity_distributions={str(a.id): _triangular(4, 5, 8)},
+        iterations=iterations,
+        seed=42,
+    )
+
+
+def _make_runner(**kwargs) -> tuple[SimulationJobRunner, MagicMock]:
+    """Runner on a thread pool with a mocked session and repository."""
+    session = AsyncMock()
+    session_cm = MagicMock()
+    session_cm.__aenter__ = AsyncMock(return_value=session)
+    session_cm.__aexit__ = AsyncMock(return_value=False)
+    session_maker = MagicMock(return_value=session_cm)
+
+    kwargs.setdefault("executor", ThreadPoolExecutor(max_workers=2))
+    runner = SimulationJobRunner(session_maker_factory=lambda: session_maker, **kwargs)
+    return runner, session
+
+
+class _BrokenExecutor(Executor):
+    """Process pool whose worker died: every submission fails."""
+
+    def __init__(self) -> None:
+        self.shut_down = False
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        future: Future = Future()
+        future.set_exception(BrokenProcessPool("worker died"))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        self.shut_down = True
+
+
+async def _wait_idle(runner: SimulationJobRunner) -> None:
+    for _ in range(500):
+        if runner.active_jobs == 0:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("jobs did not finish")
+
+
+class TestExecuteSimulationJob:
+    """Tests for the worker entry point."""
+
+    def test_monte_carlo_job(self):
+        """Independent-activity jobs produce storage-format results."""
+        act_id = str(uuid4())
+        job = MonteCarloJob(
+            activity_distributions={act_id: _triangular(5, 10, 20)},
+            cost_distributions={act_id: _triangular(100, 150, 300)},
+            iterations=500,
+            seed=1,
+            include_activity_stats=True,
+        )
+
+        result = execute_simulation_job(job)
+
+        assert result.iterations == 500
+        assert 5 <= result.duration_results["p10"] <= result.duration_results["p90"] <= 20
+        assert result.cost_results is not None
+        assert result.duration_histogram is not None
+        assert sum(result.duration_histogram["counts"]) == 500
+        assert result.activity_results is not None
+
+    def test_network_job_is_reproducible(self):
+        """Network jobs with a seed give identical results."""
+        first = execute_simulation_job(_network_job())
+        second = execute_simulation_job(_network_job())
+
+        assert first.duration_results == second.duration_results
+        assert first.duration_results["min"] >= 7
+        assert first.activity_results is not None
+        assert all("criticality" in s for s in first.activity_results.values())
+
+    def test_jobs_are_picklable(self):
+        """Jobs and results must cross the process boundary."""
+        job = _network_job()
+        assert pickle.loads(pickle.dumps(job)) == job
+        pickle.dumps(execute_simulation_job(job))
+
+
+class TestSimulationJobRunner:
+    """Tests for the background job runner."""
+
+    @pytest.mark.asyncio
+    async def test_job_lifecycle(self):
+        """A job is marked running and then completed with its results."""
+        runner, session = _make_runner()
+        result_id = uuid4()
+
+        with patch("src.services.simulation_jobs.SimulationResultRepository") as MockRepo:
+            repo = MagicMock()
+            repo.mark_running = AsyncMock()
+            repo.mark_completed = AsyncMock()
+            repo.mark_failed = AsyncMock()
+            MockRepo.return_value = repo
+
+            runner.submit(result_id, _network_job())
+            assert runner.active_jobs == 1
+            await _wait_idle(runner)
+
+        repo.mark_running.assert_awaited_once_with(result_id)
+        repo.mark_failed.assert_not_called()
+        kwargs = repo.mark_completed.await_args.kwargs
+        assert kwargs["result_id"] == result_id
+        assert kwargs["iterations_completed"] == 200
+        assert session.commit.await_count == 2
+        await runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_job_failure_is_recorded(self):
+        """Engine errors mark the result failed instead of propagating."""
+        runner, _ = _make_runner()
+        a = JobActivity(uuid4(), 1)
+        job = NetworkMonteCarloJob(
+            activities=(a,),
+            dependencies=(JobDependency(a.id, a.id, "FS", 0),),
+            activity_distributions={},
+            iterations=10,
+        )
+
+        with patch("src.services.simulation_jobs.SimulationResultRepository") as MockRepo:
+            repo = MagicMock()
+            repo.mark_running = AsyncMock()
+            repo.mark_completed = AsyncMock()
+            repo.mark_failed = AsyncMock()
+            MockRepo.return_value = repo
+
+            runner.submit(uuid4(), job)
+            await _wait_idle(runner)
+
+        repo.mark_failed.assert_awaited_once()
+        repo.mark_completed.assert_not_called()
+        await runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_queue_limit(self):
+        """Submissions beyond the queue limit are rejected."""
+        runner, _ = _make_runner(max_queued_jobs=1)
+
+        with patch("src.services.simulation_jobs.SimulationResultRepository") as MockRepo:
+            repo = MagicMock()
+            repo.mark_running = AsyncMock()
+            repo.mark_completed = AsyncMock()
+            repo.mark_failed = AsyncMock()
+            MockRepo.return_value = repo
+
+            runner.submit(uuid4(), _network_job())
+            with pytest.raises(ConflictError):
+                runner.submit(uuid4(), _network_job())
+
+            await _wait_idle(runner)
+        await runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self):
+        """No more than max_concurrent_jobs run at once."""
+        runner, _ = _make_runner(max_concurrent_jobs=1)
+        running = 0
+        peak = 0
+
+        async def mark_running(_result_id):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+
+        async def mark_done(*_args, **_kwargs):
+            nonlocal running
+            running -= 1
+
+        with patch("src.services.simulation_jobs.SimulationResultRepository") as MockRepo:
+            repo = MagicMock()
+            repo.mark_running = mark_running
+            repo.mark_completed = mark_done
+            repo.mark_failed = mark_done
+            MockRepo.return_value = repo
+
+            for _ in range(3):
+                runner.submit(uuid4(), _network_job(iterations=50))
+            await _wait_idle(runner)
+
+        assert peak == 1
+        await runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_cancels_waiting_jobs(self):
+        """Shutdown marks outstanding jobs failed."""
+        runner, _ = _make_runner(max_concurrent_jobs=1)
+        release = asyncio.Event()
+
+        async def block(_result_id):
+            await release.wait()
+
+        with patch("src.services.simulation_jobs.SimulationResultRepository") as MockRepo:
+            repo = MagicMock()
+            repo.mark_running = block
+            repo.mark_completed = AsyncMock()
+            repo.mark_failed = AsyncMock()
+            MockRepo.return_value = repo
+
+            runner.submit(uuid4(), _network_job())
+            runner.submit(uuid4(), _network_job())
+            await asyncio.sleep(0)
+            await runner.shutdown()
+
+        assert runner.active_jobs == 0
+        assert repo.mark_failed.await_count == 2
+        repo.mark_completed.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_progress_is_recorded(self):
+        """Chunk progress published by workers is written while running."""
+        progress_queue: queue.SimpleQueue = queue.SimpleQueue()
+        runner, _ = _make_runner(progress_queue=progress_queue, progress_interval=0.01)
+        result_id = uuid4()
+        release = asyncio.Event()
+
+        async def hold_completion(**_kwargs):
+            await release.wait()
+
+        with patch("src.services.simulation_jobs.SimulationResultRepository") as MockRepo:
+            repo = MagicMock()
+            repo.mark_running = AsyncMock()
+            repo.mark_completed = hold_completion
+            repo.mark_failed = AsyncMock()
+            repo.update_progress = AsyncMock()
+            MockRepo.return_value = repo
+
+            init_simulation_worker(progress_queue)
+            try:
+                runner.submit(result_id, _network_job(iterations=3000))
+                for _ in range(500):
+                    if repo.update_progress.await_count:
+                        break
+                    await asyncio.sleep(0.01)
+            finally:
+                init_simulation_worker(None)
+                release.set()
+            await _wait_idle(runner)
+
+        written = [call.args for call in repo.update_progress.await_args_list]
+        assert written
+        assert all(rid == result_id for rid, _ in written)
+        assert written[-1][1] == 3000
+        await runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result(self):
+        """Awaited runs execute on the pool and return storage-format results."""
+        runner, _ = _make_runner()
+
+        result = await runner.run(_network_job())
+
+        assert result.iterations == 200
+        assert runner.active_jobs == 0
+        await runner.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_broken_pool_is_replaced(self):
+        """A job on a broken pool fails and the next job gets a new pool."""
+        runner, _ = _make_runner(executor=None)
+        broken = _BrokenExecutor()
+
+        with (
+            patch("src.services.simulation_jobs.SimulationResultRepository") as MockRepo,
+            patch(
+                "src.services.simulation_jobs.ProcessPoolExecutor",
+                side_effect=[broken, ThreadPoolExecutor(max_workers=1)],
+            ) as MockPool,
+        ):
+            repo = MagicMock()
+            repo.mark_running = AsyncMock()
+            repo.mark_completed = AsyncMock()
+            repo.mark_failed = AsyncMock()
+            MockRepo.return_value = repo
+
+            first = uuid4()
+            runner.submit(first, _network_job())
+            await _wait_idle(runner)
+
+            repo.mark_failed.assert_awaited_once()
+            assert repo.mark_failed.await_args.args[0] == first
+            assert broken.shut_down
+
+            result = await runner.run(_network_job())
+
+        assert result.iterations == 200
+        assert MockPool.call_count == 2
+        await runner.shutdown()
@@ -19,10 +19,19 @@ from src.api.v1.endpoints.simulations import (
     quick_simulation,
     run_network_simulation,
     run_simulation,
+    submit_network_simulation,
+    submit_simulation,
     update_simulation_config,
 )
-from src.core.exceptions import AuthorizationError, NotFoundError
+from src.core.exceptions import AuthorizationError, ConflictError, NotFoundError
 from src.models.simulation import SimulationStatus
+from src.schemas.simulation import SimulationRunRequest
+from src.services.simulation_jobs import (
+    JobActivity,
+    MonteCarloJob,
+    NetworkMonteCarloJob,
+    SimulationJobResult,
+)
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -125,28 +134,27 @@ def _make_mock_simulation_output() -> MagicMock:
     return output
 
 
-def _make_mock_network_output() -> MagicMock:
-    """Create a mock OptimizedNetworkMonteCarloEngine output."""
-    act_id = uuid4()
-    output = MagicMock()
-    output.project_duration_p10 = 110.0
-    output.project_duration_p50 = 145.0
-    output.project_duration_p80 = 165.0
-    output.project_duration_p90 = 180.0
-    output.project_duration_mean = 147.5
-    output.project_duration_std = 22.3
-    output.project_duration_min = 95.0
-    output.project_duration_max = 210.0
-    output.activity_criticality = {act_id: 0.85}
-    output.sensitivity = {act_id: 0.72}
-    # Use empty dict so no finish_distribution sub-dict is added to activity_stats,
-    # which avoids Pydantic validation errors (schema expects dict[str, float] leaves).
-    output.activity_finish_distributions = {}
-    output.iterations = 1000
-    output.elapsed_seconds = 3.1
-    output.duration_histogram_bins = np.array([100.0, 120.0, 140.0, 160.0, 180.0, 200.0])
-    output.duration_histogram_counts = np.array([50, 200, 400, 250, 100])
-    return output
+def _make_job_result(activity_results: dict | None = None) -> SimulationJobResult:
+    """Create a simulation job result in storage format."""
+    return SimulationJobResult(
+        duration_results={
+            "p10": 110.0,
+            "p50": 145.0,
+            "p80": 165.0,
+            "p90": 180.0,
+            "mean": 147.5,
+            "std": 22.3,
+            "min": 95.0,
+            "max": 210.0,
+        },
+        iterations=1000,
+        elapsed_seconds=1.5,
+        duration_histogram={
+            "bins": [100.0, 120.0, 140.0, 160.0, 180.0, 200.0],
+            "counts": [50, 200, 400, 250, 100],
+        },
+        activity_results=activity_results,
+    )
 
 
 # ===========================================================================
@@ -909,7 +917,6 @@ class TestRunSimulation:
         mock_db = AsyncMock()
         mock_user = _make_mock_user()
         config = _make_mock_config()
-        mock_output = _make_mock_simulation_output()
 
         mock_result = _make_mock_result(config_id=config.id)
         mock_completed_result = _make_mock_result(config_id=config.id)
@@ -917,8 +924,7 @@ class TestRunSimulation:
         with (
             patch("src.api.v1.endpoints.simulations.SimulationConfigRepository") as MockConfigRepo,
             patch("src.api.v1.endpoints.simulations.SimulationResultRepository") as MockResultRepo,
-            patch("src.api.v1.endpoints.simulations.MonteCarloEngine") as MockEngine,
-            patch("src.api.v1.endpoints.simulations.parse_distribution_params"),
+            patch("src.api.v1.endpoints.simulations.simulation_job_runner") as mock_runner,
         ):
             mock_config_repo = MagicMock()
             mock_config_repo.get_by_id = AsyncMock(return_value=config)
@@ -930,9 +936,7 @@ class TestRunSimulation:
             mock_result_repo.mark_completed = AsyncMock(return_value=mock_completed_result)
             MockResultRepo.return_value = mock_result_repo
 
-            mock_engine_instance = MagicMock()
-            mock_engine_instance.simulate.return_value = mock_output
-            MockEngine.return_value = mock_engine_instance
+            mock_runner.run = AsyncMock(return_value=_make_job_result())
 
             result = await run_simulation(
                 db=mock_db,
@@ -944,7 +948,12 @@ class TestRunSimulation:
             assert result.id == mock_completed_result.id
             assert result.status == SimulationStatus.COMPLETED
             assert result.progress_percent == 100.0
+            assert result.duration_results is not None
+            assert result.duration_results.p50 == 145.0
             mock_result_repo.mark_running.assert_called_once_with(mock_result.id)
+            job = mock_runner.run.await_args.args[0]
+            assert isinstance(job, MonteCarloJob)
+            assert job.iterations == config.iterations
 
     @pytest.mark.asyncio
     async def test_run_simulation_config_not_found(self):
@@ -979,8 +988,7 @@ class TestRunSimulation:
         with (
             patch("src.api.v1.endpoints.simulations.SimulationConfigRepository") as MockConfigRepo,
             patch("src.api.v1.endpoints.simulations.SimulationResultRepository") as MockResultRepo,
-            patch("src.api.v1.endpoints.simulations.MonteCarloEngine") as MockEngine,
-            patch("src.api.v1.endpoints.simulations.parse_distribution_params"),
+            patch("src.api.v1.endpoints.simulations.simulation_job_runner") as mock_runner,
         ):
             mock_config_repo = MagicMock()
             mock_config_repo.get_by_id = AsyncMock(return_value=config)
@@ -992,9 +1000,7 @@ class TestRunSimulation:
             mock_result_repo.mark_failed = AsyncMock()
             MockResultRepo.return_value = mock_result_repo
 
-            mock_engine_instance = MagicMock()
-            mock_engine_instance.simulate.side_effect = RuntimeError("Computation error")
-            MockEngine.return_value = mock_engine_instance
+            mock_runner.run = AsyncMock(side_effect=RuntimeError("Computation error"))
 
             with pytest.raises(HTTPException) as exc_info:
                 await run_simulation(
@@ -1023,7 +1029,6 @@ class TestRunNetworkSimulation:
         mock_user = _make_mock_user()
         program = _make_mock_program(owner_id=mock_user.id)
         config = _make_mock_config(program_id=program.id)
-        mock_output = _make_mock_network_output()
 
         mock_result = _make_mock_result(config_id=config.id)
         mock_completed = _make_mock_result(config_id=config.id)
@@ -1035,6 +1040,8 @@ class TestRunNetworkSimulation:
         mock_dependency = MagicMock()
         mock_dependency.predecessor_id = mock_activity.id
         mock_dependency.successor_id = uuid4()
+        mock_dependency.dependency_type = "FS"
+        mock_dependency.lag = 0
 
         with (
             patch("src.api.v1.endpoints.simulations.SimulationConfigRepository") as MockConfigRepo,
@@ -1042,10 +1049,7 @@ class TestRunNetworkSimulation:
             patch("src.api.v1.endpoints.simulations.SimulationResultRepository") as MockResultRepo,
             patch("src.api.v1.endpoints.simulations.ActivityRepository") as MockActRepo,
             patch("src.api.v1.endpoints.simulations.DependencyRepository") as MockDepRepo,
-            patch(
-                "src.api.v1.endpoints.simulations.OptimizedNetworkMonteCarloEngine"
-            ) as MockEngine,
-            patch("src.api.v1.endpoints.simulations.parse_distribution_params"),
+            patch("src.api.v1.endpoints.simulations.simulation_job_runner") as mock_runner,
         ):
             mock_config_repo = MagicMock()
             mock_config_repo.get_by_id = AsyncMock(return_value=config)
@@ -1070,9 +1074,11 @@ class TestRunNetworkSimulation:
             mock_dep_repo.get_by_program = AsyncMock(return_value=[mock_dependency])
             MockDepRepo.return_value = mock_dep_repo
 
-            mock_engine_instance = MagicMock()
-            mock_engine_instance.simulate.return_value = mock_output
-            MockEngine.return_value = mock_engine_instance
+            mock_runner.run = AsyncMock(
+                return_value=_make_job_result(
+                    {str(mock_activity.id): {"criticality": 0.85, "sensitivity": 0.72}}
+                )
+            )
 
             result = await run_network_simulation(
                 db=mock_db,
@@ -1084,6 +1090,12 @@ class TestRunNetworkSimulation:
             assert result.id == mock_completed.id
             assert result.status == SimulationStatus.COMPLETED
             assert result.progress_percent == 100.0
+            assert result.activity_stats == {
+                str(mock_activity.id): {"criticality": 0.85, "sensitivity": 0.72}
+            }
+            job = mock_runner.run.await_args.args[0]
+            assert isinstance(job, NetworkMonteCarloJob)
+            assert job.activities == (JobActivity(mock_activity.id, 10),)
 
     @pytest.mark.asyncio
     async def test_run_network_simulation_config_not_found(self):
@@ -1212,6 +1224,205 @@ class TestRunNetworkSimulation:
             assert "No activities found" in exc_info.value.detail
 
 
+# ===========================================================================
+# submit_simulation / submit_network_simulation
+# ===========================================================================
+
+
+class TestSubmitSimulation:
+    """Tests for submit_simulation endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_submit_simulation_returns_pending(self):
+        """Should create a pending result and hand the job to the runner."""
+        mock_db = AsyncMock()
+        mock_user = _make_mock_user()
+        config = _make_mock_config()
+        mock_result = _make_mock_result(config_id=config.id)
+
+        with (
+            patch("src.api.v1.endpoints.simulations.SimulationConfigRepository") as MockConfigRepo,
+            patch("src.api.v1.endpoints.simulations.SimulationResultRepository") as MockResultRepo,
+            patch("src.api.v1.endpoints.simulations.simulation_job_runner") as mock_runner,
+        ):
+            mock_config_repo = MagicMock()
+            mock_config_repo.get_by_id = AsyncMock(return_value=config)
+            MockConfigRepo.return_value = mock_config_repo
+
+            mock_result_repo = MagicMock()
+            mock_result_repo.create_result = AsyncMock(return_value=mock_result)
+            MockResultRepo.return_value = mock_result_repo
+
+            result = await submit_simulation(
+                db=mock_db,
+                current_user=mock_user,
+                config_id=config.id,
+                run_request=SimulationRunRequest(seed=7),
+            )
+
+            assert result.id == mock_result.id
+            assert result.status == SimulationStatus.PENDING
+            assert result.progress_percent == 0.0
+            mock_db.commit.assert_awaited_once()
+
+            result_id, job = mock_runner.submit.call_args.args
+            assert result_id == mock_result.id
+            assert isinstance(job, MonteCarloJob)
+            assert job.seed == 7
+            assert job.iterations == config.iterations
+
+    @pytest.mark.asyncio
+    async def test_submit_simulation_queue_full(self):
+        """Should mark the result failed and raise when the queue is full."""
+        mock_db = AsyncMock()
+        mock_user = _make_mock_user()
+        config = _make_mock_config()
+        mock_result = _make_mock_result(config_id=config.id)
+
+        with (
+            patch("src.api.v1.endpoints.simulations.SimulationConfigRepository") as MockConfigRepo,
+            patch("src.api.v1.endpoints.simulations.SimulationResultRepository") as MockResultRepo,
+            patch("src.api.v1.endpoints.simulations.simulation_job_runner") as mock_runner,
+        ):
+            mock_config_repo = MagicMock()
+            mock_config_repo.get_by_id = AsyncMock(return_value=config)
+            MockConfigRepo.return_value = mock_config_repo
+
+            mock_result_repo = MagicMock()
+            mock_result_repo.create_result = AsyncMock(return_value=mock_result)
+            mock_result_repo.mark_failed = AsyncMock()
+            MockResultRepo.return_value = mock_result_repo
+
+            mock_runner.submit.side_effect = ConflictError("full", "SIMULATION_QUEUE_FULL")
+
+            with pytest.raises(ConflictError):
+                await submit_simulation(
+                    db=mock_db,
+                    current_user=mock_user,
+                    config_id=config.id,
+                    run_request=None,
+                )
+
+            mock_result_repo.mark_failed.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_submit_simulation_config_not_found(self):
+        """Should raise NotFoundError when config does not exist."""
+        mock_db = AsyncMock()
+        mock_user = _make_mock_user()
+
+        with patch("src.api.v1.endpoints.simulations.SimulationConfigRepository") as MockRepo:
+            mock_repo = MagicMock()
+            mock_repo.get_by_id = AsyncMock(return_value=None)
+            MockRepo.return_value = mock_repo
+
+            with pytest.raises(NotFoundError):
+                await submit_simulation(
+                    db=mock_db,
+                    current_user=mock_user,
+                    config_id=uuid4(),
+                    run_request=None,
+                )
+
+
+class TestSubmitNetworkSimulation:
+    """Tests for submit_network_simulation endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_submit_network_simulation_snapshots_network(self):
+        """Should snapshot activities and dependencies into the job."""
+        mock_db = AsyncMock()
+        mock_user = _make_mock_user()
+        program = _make_mock_program(owner_id=mock_user.id)
+        config = _make_mock_config(program_id=program.id)
+        mock_result = _make_mock_result(config_id=config.id)
+
+        mock_activity = MagicMock()
+        mock_activity.id = uuid4()
+        mock_activity.duration = 10
+
+        mock_dependency = MagicMock()
+        mock_dependency.predecessor_id = mock_activity.id
+        mock_dependency.successor_id = uuid4()
+        mock_dependency.dependency_type = "SS"
+        mock_dependency.lag = 2
+
+        with (
+            patch("src.api.v1.endpoints.simulations.SimulationConfigRepository") as MockConfigRepo,
+            patch("src.api.v1.endpoints.simulations.ProgramRepository") as MockProgRepo,
+            patch("src.api.v1.endpoints.simulations.SimulationResultRepository") as MockResultRepo,
+            patch("src.api.v1.endpoints.simulations.ActivityRepository") as MockActRepo,
+            patch("src.api.v1.endpoints.simulations.DependencyRepository") as MockDepRepo,
+            patch("src.api.v1.endpoints.simulations.simulation_job_runner") as mock_runner,
+        ):
+            mock_config_repo = MagicMock()
+            mock_config_repo.get_by_id = AsyncMock(return_value=config)
+            MockConfigRepo.return_value = mock_config_repo
+
+            mock_prog_repo = MagicMock()
+            mock_prog_repo.get_by_id = AsyncMock(return_value=program)
+            MockProgRepo.return_value = mock_prog_repo
+
+            mock_result_repo = MagicMock()
+            mock_result_repo.create_result = AsyncMock(return_value=mock_result)
+            MockResultRepo.return_value = mock_result_repo
+
+            mock_act_repo = MagicMock()
+            mock_act_repo.get_by_program = AsyncMock(return_value=[mock_activity])
+            MockActRepo.return_value = mock_act_repo
+
+            mock_dep_repo = MagicMock()
+            mock_dep_repo.get_by_program = AsyncMock(return_value=[mock_dependency])
+            MockDepRepo.return_value = mock_dep_repo
+
+            result = await submit_network_simulation(
+                db=mock_db,
+                current_user=mock_user,
+                config_id=config.id,
+                run_request=None,
+            )
+
+            assert result.status == SimulationStatus.PENDING
+
+            _, job = mock_runner.submit.call_args.args
+            assert isinstance(job, NetworkMonteCarloJob)
+            assert job.activities[0].id == mock_activity.id
+            assert job.activities[0].duration == 10
+            assert job.dependencies[0].dependency_type == "SS"
+            assert job.dependencies[0].lag == 2
+
+    @pytest.mark.asyncio
+    async def test_submit_network_simulation_auth_denied(self):
+        """Should raise AuthorizationError when user has no access."""
+        mock_db = AsyncMock()
+        mock_user = _make_mock_user(is_admin=False)
+        program = _make_mock_program()
+        config = _make_mock_config(program_id=program.id)
+
+        with (
+            patch("src.api.v1.endpoints.simulations.SimulationConfigRepository") as MockConfigRepo,
+            patch("src.api.v1.endpoints.simulations.ProgramRepository") as MockProgRepo,
+            patch("src.api.v1.endpoints.simulations.simulation_job_runner") as mock_runner,
+        ):
+            mock_config_repo = MagicMock()
+            mock_config_repo.get_by_id = AsyncMock(return_value=config)
+            MockConfigRepo.return_value = mock_config_repo
+
+            mock_prog_repo = MagicMock()
+            mock_prog_repo.get_by_id = AsyncMock(return_value=program)
+            MockProgRepo.return_value = mock_prog_repo
+
+            with pytest.raises(AuthorizationError):
+                await submit_network_simulation(
+                    db=mock_db,
+                    current_user=mock_user,
+                    config_id=config.id,
+                    run_request=None,
+                )
+
+            mock_runner.submit.assert_not_called()
+
+
 # ===========================================================================
 # list_simulation_results
 # ===========================================================================
@@ -1442,6 +1653,50 @@ class TestGetSimulationResult:
             assert response.id == result.id
             mock_cache.set_result.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_get_result_running_not_cached(self):
+        """Should not cache results of jobs that are still running."""
+        mock_db = AsyncMock()
+        mock_user = _make_mock_user()
+        config = _make_mock_config()
+        config.iterations = 1000
+
+        result = _make_mock_result(config_id=config.id)
+        result.status = SimulationStatus.RUNNING
+        result.completed_at = None
+        result.iterations_completed = 250
+        result.duration_results = None
+        result.duration_histogram = None
+
+        with (
+            patch("src.api.v1.endpoints.simulations.simulation_cache") as mock_cache,
+            patch("src.api.v1.endpoints.simulations.SimulationResultRepository") as MockResultRepo,
+            patch("src.api.v1.endpoints.simulations.SimulationConfigRepository") as MockConfigRepo,
+        ):
+            mock_cache.is_available = True
+            mock_cache.get_result = AsyncMock(return_value=None)
+            mock_cache.set_result = AsyncMock()
+
+            mock_result_repo = MagicMock()
+            mock_result_repo.get_by_id = AsyncMock(return_value=result)
+            MockResultRepo.return_value = mock_result_repo
+
+            mock_config_repo = MagicMock()
+            mock_config_repo.get_by_id = AsyncMock(return_value=config)
+            MockConfigRepo.return_value = mock_config_repo
+
+            response = await get_simulation_result(
+                db=mock_db,
+                current_user=mock_user,
+                config_id=config.id,
+                result_id=result.id,
+                use_cache=True,
+            )
+
+            assert response.status == SimulationStatus.RUNNING
+            assert response.progress_percent == 25.0
+            mock_cache.set_result.assert_not_called()
+
 
 # ===========================================================================
 # get_tornado_chart
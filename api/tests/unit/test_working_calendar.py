@@ -0,0 +1,255 @@
+"""Unit tests for compiled resource availability calendars."""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.models.calendar_template import CalendarTemplate, CalendarTemplateHoliday
+from src.services.working_calendar import (
+    WorkingCalendar,
+    clear_calendar_cache,
+    get_template_calendar,
+    resource_calendar,
+    standard_calendar,
+)
+
+
+def _template(
+    working_days: list[int] | None = None,
+    holidays: list[CalendarTemplateHoliday] | None = None,
+    updated_at: datetime | None = None,
+) -> CalendarTemplate:
+    """Create a template with optional holidays."""
+    template = CalendarTemplate(
+        id=uuid4(),
+        program_id=uuid4(),
+        name="Test",
+        working_days=working_days or [1, 2, 3, 4, 5],
+        hours_per_day=Decimal("8.0"),
+    )
+    template.holidays = holidays or []
+    template.updated_at = updated_at
+    return template
+
+
+def _holiday(day: date, *, recurring: bool = False) -> CalendarTemplateHoliday:
+    """Create a template holiday."""
+    return CalendarTemplateHoliday(
+        id=uuid4(),
+        template_id=uuid4(),
+        holiday_date=day,
+        name="Holiday",
+        recurring_yearly=recurring,
+    )
+
+
+def _entry(day: date, hours: str, *, working: bool = True) -> MagicMock:
+    """Create a mock resource calendar entry."""
+    entry = MagicMock()
+    entry.calendar_date = day
+    entry.available_hours = Decimal(hours)
+    entry.is_working_day = working
+    return entry
+
+
+def _reference_add(calendar: WorkingCalendar, day: date, count: int) -> date:
+    """Move count working days one day at a time."""
+    step = 1 if count > 0 else -1
+    remaining = abs(count)
+    while remaining:
+        day += timedelta(days=step)
+        if calendar.is_working_day(day):
+            remaining -= 1
+    return day
+
+
+class TestWorkingCalendar:
+    """Tests for WorkingCalendar lookups."""
+
+    def test_standard_week(self) -> None:
+        """Should give hours on Monday to Friday only."""
+        calendar = WorkingCalendar(Decimal("8.0"))
+
+        # 2024-01-01 is a Monday
+        hours = calendar.hours(date(2024, 1, 1), date(2024, 1, 7))
+
+        assert hours.tolist() == [800, 800, 800, 800, 800, 0, 0]
+        assert calendar.hours_on(date(2024, 1, 1)) == Decimal("8.0")
+        assert calendar.hours_on(date(2024, 1, 6)) == Decimal("0")
+
+    def test_holidays(self) -> None:
+        """Should remove one-time and recurring holidays."""
+        calendar = WorkingCalendar(
+            Decimal("8.0"),
+            holidays=[date(2024, 7, 4)],
+            recurring_holidays=[(12, 25)],
+        )
+
+        assert not calendar.is_working_day(date(2024, 7, 4))
+        assert calendar.is_working_day(date(2025, 7, 4))
+        assert not calendar.is_working_day(date(2024, 12, 25))
+        assert not calendar.is_working_day(date(2030, 12, 25))
+
+    def test_recurring_leap_day(self) -> None:
+        """Should only apply a February 29 holiday in leap years."""
+        calendar = WorkingCalendar(
+            Decimal("8.0"), working_days=range(1, 8), recurring_holidays=[(2, 29)]
+        )
+
+        assert not calendar.is_working_day(date(2028, 2, 29))
+        assert calendar.is_working_day(date(2027, 2, 28))
+        assert calendar.is_working_day(date(2027, 3, 1))
+
+    def test_overrides_replace_pattern(self) -> None:
+        """Should use override hours on their dates, including weekends."""
+        calendar = WorkingCalendar(Decimal("8.0")).with_overrides(
+            [
+                _entry(date(2024, 1, 2), "4.00"),
+                _entry(date(2024, 1, 3), "8.00", working=False),
+                _entry(date(2024, 1, 6), "6.00"),
+            ]
+        )
+
+        assert calendar.hours_on(date(2024, 1, 2)) == Decimal("4.00")
+        assert calendar.hours_on(date(2024, 1, 3)) == Decimal("0")
+        assert calendar.hours_on(date(2024, 1, 6)) == Decimal("6.00")
+        assert calendar.hours_on(date(2024, 1, 4)) == Decimal("8.0")
+
+    def test_horizon_grows_on_demand(self) -> None:
+        """Should answer lookups far outside the first compiled range."""
+        calendar = WorkingCalendar(Decimal("8.0"))
+        calendar.hours(date(2024, 1, 1), date(2024, 1, 31))
+
+        assert calendar.is_working_day(date(1990, 1, 1))
+        assert not calendar.is_working_day(date(2100, 1, 2))
+        assert calendar.is_working_day(date(2024, 1, 31))
+
+    def test_working_mask(self) -> None:
+        """Should flag days with available hours."""
+        calendar = WorkingCalendar(Decimal("8.0"), working_days=[1, 3])
+
+        mask = calendar.working_mask(date(2024, 1, 1), 7)
+
+        assert mask.tolist() == [True, False, True, False, False, False, False]
+        assert len(calendar.working_mask(date(2024, 1, 1), 0)) == 0
+
+
+class TestWorkingDayArithmetic:
+    """Tests for working-day moves and offset conversion."""
+
+    def test_next_working_day(self) -> None:
+        """Should skip weekends and holidays."""
+        calendar = WorkingCalendar(Decimal("8.0"), holidays=[date(2024, 1, 8)])
+
+        assert calendar.next_working_day(date(2024, 1, 5)) == date(2024, 1, 5)
+        assert calendar.next_working_day(date(2024, 1, 6)) == date(2024, 1, 9)
+
+    def test_add_working_days_matches_stepping(self) -> None:
+        """Should agree with moving one day at a time, both directions."""
+        calendar = WorkingCalendar(
+            Decimal("8.0"),
+            working_days=[1, 2, 4, 6],
+            holidays=[date(2024, 3, 14)],
+            recurring_holidays=[(1, 1)],
+        )
+        start = date(2024, 2, 28)
+
+        for count in (-40, -3, -1, 0, 1, 2, 7, 300):
+            assert calendar.add_working_days(start, count) == _reference_add(calendar, start, count)
+
+    def test_working_dates(self) -> None:
+        """Should convert CPM-style offsets in input order."""
+        calendar = WorkingCalendar(Decimal("8.0"))
+
+        # 2024-01-06 is a Saturday; offset 0 is the following Monday
+        dates = calendar.working_dates(date(2024, 1, 6), np.array([5, 0, -1, 1]))
+
+        assert dates == [date(2024, 1, 15), date(2024, 1, 8), date(2024, 1, 5), date(2024, 1, 9)]
+        assert calendar.working_dates(date(2024, 1, 6), np.array([], dtype=np.int64)) == []
+
+    def test_no_working_days_raises(self) -> None:
+        """Should raise when there is no working day to reach."""
+        calendar = WorkingCalendar(Decimal("8.0"), working_days=[])
+
+        with pytest.raises(ValueError, match="no working days"):
+            calendar.add_working_days(date(2024, 1, 1), 1)
+
+
+class TestCalendarCache:
+    """Tests for template and resource calendar construction."""
+
+    def setup_method(self) -> None:
+        """Start each test with an empty cache."""
+        clear_calendar_cache()
+
+    def test_template_calendar_cached_by_version(self) -> None:
+        """Should reuse a compiled template until it is updated."""
+        template = _template(updated_at=datetime(2024, 1, 1, tzinfo=UTC))
+
+        first = get_template_calendar(template)
+        assert get_template_calendar(template) is first
+
+        template.updated_at = datetime(2024, 1, 2, tzinfo=UTC)
+        assert get_template_calendar(template) is not first
+
+    def test_template_calendar_sees_holiday_edits(self) -> None:
+        """Should compile again when holidays change without a template update."""
+        template = _template(updated_at=datetime(2024, 1, 1, tzinfo=UTC))
+        assert get_template_calendar(template).is_working_day(date(2024, 12, 25))
+
+        template.holidays.append(_holiday(date(2024, 12, 25)))
+        assert not get_template_calendar(template).is_working_day(date(2024, 12, 25))
+        assert not template.is_working_day(date(2024, 12, 25))
+
+        template.holidays.clear()
+        assert get_template_calendar(template).is_working_day(date(2024, 12, 25))
+
+    def test_unsaved_template_not_cached(self) -> None:
+        """Should compile templates without a version every time."""
+        template = _template()
+
+        assert get_template_calendar(template) is not get_template_calendar(template)
+
+    def test_template_matches_model_rules(self) -> None:
+        """Should agree with the template's working day rules."""
+        template = _template(
+            working_days=[1, 2, 3, 4, 5, 6],
+            holidays=[
+                _holiday(date(2024, 5, 27)),
+                _holiday(date(2020, 12, 25), recurring=True),
+            ],
+        )
+        calendar = get_template_calendar(template)
+
+        assert not calendar.is_working_day(date(2024, 5, 27))
+        assert not calendar.is_working_day(date(2024, 12, 25))
+        assert calendar.is_working_day(date(2024, 6, 1))
+        assert not calendar.is_working_day(date(2024, 6, 2))
+
+    def test_resource_calendar_without_template(self) -> None:
+        """Should use a shared Monday to Friday calendar at capacity."""
+        calendar = resource_calendar(Decimal("6.00"))
+
+        assert calendar is standard_calendar(Decimal("6.00"))
+        assert calendar.hours_on(date(2024, 1, 1)) == Decimal("6.00")
+
+    def test_resource_calendar_entries_override_template(self) -> None:
+        """Should apply entries on top of the template without changing it."""
+        template = _template(
+            working_days=[1, 2, 3, 4, 5, 6, 7],
+            updated_at=datetime(2024, 1, 1, tzinfo=UTC),
+        )
+
+        calendar = resource_calendar(
+            Decimal("8.00"), template, [_entry(date(2024, 1, 6), "0", working=False)]
+        )
+
+        assert not calendar.is_working_day(date(2024, 1, 6))
+        assert calendar.is_working_day(date(2024, 1, 7))
+        assert get_template_calendar(template).is_working_day(date(2024, 1, 6))